@@ -0,0 +1,43 @@
+import re
+
+
+class AnalysisSql:
+    """Analiz sorgularının ortak SQL parçaları ve numara temizleme (Qt'siz; tüm analysis modülleri kullanır)."""
+
+    @staticmethod
+    def last10(col: str) -> str:
+        """Numara kolonunun boşluk / tire / + temizlenmiş son 10 hanesi (SQL ifadesi)."""
+        return f"substr(replace(replace(replace({col}, ' ', ''), '-', ''), '+', ''), -10, 10)"
+
+    @staticmethod
+    def iso(col: str) -> str:
+        """'dd.MM.yyyy HH:mm:ss' TARIH kolonunu 'yyyy-MM-dd HH:mm:ss' metnine çeviren SQL ifadesi."""
+        return f"substr({col}, 7, 4) || '-' || substr({col}, 4, 2) || '-' || substr({col}, 1, 2) || substr({col}, 11)"
+
+    @staticmethod
+    def placeholders(values) -> str:
+        return ",".join(["?"] * len(values))
+
+    @staticmethod
+    def clean_gsm(val) -> str:
+        """Python tarafı last10: rakam dışı karakterler atılır, 10 haneden uzunsa son 10 hane."""
+        d = re.sub(r"\D", "", "" if val is None else str(val).strip())
+        return d[-10:] if len(d) >= 10 else d
+
+    PAIR_TOLERANCE_S = 3
+
+    @staticmethod
+    def pair_condition(a: str = "t1", b: str = "t2") -> str:
+        """
+        b kaydı a kaydının karşı taraftaki eşi mi: aynı proje, numaralar ters (son 10 hane)
+        ve zaman damgası ±PAIR_TOLERANCE_S saniye içinde. JOIN ... ON koşulu olarak kullanılır.
+        """
+        s = AnalysisSql
+        tol = s.PAIR_TOLERANCE_S
+        return (
+            f"{b}.ProjeID = {a}.ProjeID AND "
+            f"{s.last10(f'{b}.NUMARA')} = {s.last10(f'{a}.DIGER_NUMARA')} AND "
+            f"{s.last10(f'{b}.DIGER_NUMARA')} = {s.last10(f'{a}.NUMARA')} AND "
+            f"datetime({s.iso(f'{b}.TARIH')}) BETWEEN "
+            f"datetime({s.iso(f'{a}.TARIH')}, '-{tol} seconds') AND datetime({s.iso(f'{a}.TARIH')}, '+{tol} seconds')"
+        )
@@ -0,0 +1,120 @@
+from analysis.base import AnalysisSql
+
+
+class CommonAnalysis:
+    """
+    Ortak IMEI / isim / TC analizi: birden fazla hatta görülen cihaz ve kişiler.
+
+    Sorgu fonksiyonları düz satır listesi döner; recalculate() sonuçları hts_ortak_* tablolarına yazar.
+    Tüm fonksiyonlar açık bir DB bağlantısı alır (commit / kilit çağıranın sorumluluğundadır).
+    """
+
+    IMEI_TABLES = ("hts_gsm", "hts_gprs", "hts_wap")
+    DATA_TABLES = ("hts_gsm", "hts_gprs", "hts_wap", "hts_rehber")
+
+    TC_VALID = "TRIM(TC) GLOB '[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]'"
+
+    @staticmethod
+    def has_data(conn, project_id) -> bool:
+        for t in CommonAnalysis.DATA_TABLES:
+            if conn.execute(f"SELECT 1 FROM {t} WHERE ProjeID=? LIMIT 1", (project_id,)).fetchone():
+                return True
+        return False
+
+    @staticmethod
+    def common_imei(conn, project_id) -> list:
+        """Birden fazla numarada kullanılan IMEI'ler: [(IMEI, kullanan_sayısı, 'no1,no2', toplam_kullanım), ...]."""
+        num = AnalysisSql.last10("NUMARA")
+        parts = " UNION ALL ".join(
+            f"SELECT IMEI, {num} AS CleanNum FROM {t} WHERE ProjeID=? AND LENGTH(IMEI) > 10"
+            for t in CommonAnalysis.IMEI_TABLES
+        )
+        sql = f"""
+            SELECT IMEI,
+                   COUNT(DISTINCT CleanNum) AS KullananSayisi,
+                   GROUP_CONCAT(DISTINCT CleanNum) AS Numaralar,
+                   COUNT(*) AS ToplamKullanim
+            FROM ({parts})
+            GROUP BY IMEI
+            HAVING COUNT(DISTINCT CleanNum) > 1
+        """
+        return conn.execute(sql, (project_id,) * len(CommonAnalysis.IMEI_TABLES)).fetchall()
+
+    @staticmethod
+    def common_names(conn, project_id) -> list:
+        """Rehberde birden fazla karşı numarada geçen isimler: [(isim, hat_sayısı, 'no1,no2'), ...]."""
+        return conn.execute(f"""
+            SELECT Isim,
+                   COUNT(DISTINCT KarsiNo) AS HatSayisi,
+                   GROUP_CONCAT(DISTINCT KarsiNo) AS Numaralar
+            FROM hts_rehber
+            WHERE ProjeID=?
+              AND LENGTH(Isim) > 1
+              AND TC IS NOT NULL
+              AND {CommonAnalysis.TC_VALID}
+            GROUP BY Isim
+            HAVING COUNT(DISTINCT KarsiNo) > 1
+        """, (project_id,)).fetchall()
+
+    @staticmethod
+    def common_tc(conn, project_id) -> list:
+        """Birden fazla hatta görülen TC'ler: [('TC - İsim', hat_sayısı, 'no1,no2'), ...] (hat sayısına göre azalan)."""
+        rows = conn.execute(f"""
+            SELECT r.TC,
+                   COUNT(DISTINCT r.KarsiNo) AS HatSayisi,
+                   GROUP_CONCAT(DISTINCT r.KarsiNo) AS Numaralar,
+                   (SELECT Isim
+                    FROM hts_rehber r2
+                    WHERE r2.ProjeID=? AND r2.TC = r.TC
+                      AND r2.TC IS NOT NULL
+                      AND {CommonAnalysis.TC_VALID}
+                    LIMIT 1) AS AnyName
+            FROM hts_rehber r
+            WHERE r.ProjeID=?
+              AND r.TC IS NOT NULL
+              AND {CommonAnalysis.TC_VALID}
+            GROUP BY r.TC
+            HAVING COUNT(DISTINCT r.KarsiNo) > 1
+            ORDER BY HatSayisi DESC
+        """, (project_id, project_id)).fetchall()
+
+        out = []
+        for tc_val, count, nums, any_name in rows:
+            display = f"{tc_val} - {any_name}" if any_name else str(tc_val)
+            out.append((display, count, nums))
+        return out
+
+    @staticmethod
+    def recalculate(conn, project_id) -> dict | None:
+        """
+        hts_ortak_imei / hts_ortak_isim / hts_ortak_tc tablolarını proje için yeniden doldurur.
+        Dönüş: {"imei": n, "isim": n, "tc": n}; projede veri yoksa tablolar boşaltılır ve None döner.
+        """
+        pid = project_id
+        conn.execute("DELETE FROM hts_ortak_imei WHERE ProjeID=?", (pid,))
+        conn.execute("DELETE FROM hts_ortak_isim WHERE ProjeID=?", (pid,))
+        conn.execute("DELETE FROM hts_ortak_tc   WHERE ProjeID=?", (pid,))
+
+        if not CommonAnalysis.has_data(conn, pid):
+            return None
+
+        imei = CommonAnalysis.common_imei(conn, pid)
+        names = CommonAnalysis.common_names(conn, pid)
+        tcs = CommonAnalysis.common_tc(conn, pid)
+
+        if imei:
+            conn.executemany(
+                "INSERT INTO hts_ortak_imei (ProjeID, IMEI, KullananSayisi, Numaralar, ToplamKullanim) VALUES (?,?,?,?,?)",
+                [(pid,) + tuple(r) for r in imei]
+            )
+        if names:
+            conn.executemany(
+                "INSERT INTO hts_ortak_isim (ProjeID, AdSoyad, HatSayisi, Numaralar) VALUES (?,?,?,?)",
+                [(pid,) + tuple(r) for r in names]
+            )
+        if tcs:
+            conn.executemany(
+                "INSERT INTO hts_ortak_tc (ProjeID, TC, HatSayisi, Numaralar) VALUES (?,?,?,?)",
+                [(pid,) + tuple(r) for r in tcs]
+            )
+        return {"imei": len(imei), "isim": len(names), "tc": len(tcs)}
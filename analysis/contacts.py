@@ -0,0 +1,130 @@
+import re
+
+from analysis.base import AnalysisSql
+
+
+class ContactAnalysis:
+    """
+    Temas analizleri: seçili hatlar arası direkt temas + ortak bağlantılar (çapraz eşleşme) ve iki hat
+    arasındaki kayıtların karşı taraf kaydıyla (±3 sn) eşleştirilmesi.
+    Tarih parametreleri 'yyyy-MM-dd HH:mm:ss' metni; dönüşler düz liste / dict.
+    """
+
+    COMMON_LIMIT = 500
+    DETAIL_LIMIT = 10000
+
+    # ------------------------------------------------------------------
+    # çapraz eşleşme
+    # ------------------------------------------------------------------
+    @staticmethod
+    def direct_contacts(conn, project_id, targets) -> list:
+        """Seçili hatların birbiriyle temasları (iki yön toplamı)."""
+        out = []
+        sql = "SELECT COUNT(*) FROM hts_gsm WHERE ProjeID=? AND GSMNo=? AND DIGER_NUMARA=?"
+        for i in range(len(targets)):
+            for j in range(i + 1, len(targets)):
+                gsm1, gsm2 = targets[i], targets[j]
+                c1 = conn.execute(sql, (project_id, gsm1, gsm2)).fetchone()[0]
+                c2 = conn.execute(sql, (project_id, gsm2, gsm1)).fetchone()[0]
+                total = c1 + c2
+                if total > 0:
+                    out.append({
+                        'num': f"{gsm1} <-> {gsm2}",
+                        'name': 'Direkt Temas',
+                        'count': total,
+                        'targets': [gsm1, gsm2],
+                        'type': 'DIRECT'
+                    })
+        return out
+
+    @staticmethod
+    def common_contacts(conn, project_id, targets, limit: int = COMMON_LIMIT) -> list:
+        """
+        Birden fazla seçili hatla görüşen karşı numaralar (yalnız TR GSM: 10 hane, 5 ile başlayan).
+        Verisi olmayan hedefler atlanır.
+        """
+        sources = [
+            gsm for gsm in targets
+            if conn.execute("SELECT 1 FROM hts_gsm WHERE ProjeID=? AND GSMNo=? LIMIT 1", (project_id, gsm)).fetchone()
+        ]
+        if not sources:
+            return []
+
+        ph = AnalysisSql.placeholders(sources)
+        rows = conn.execute(f"""
+            SELECT DIGER_NUMARA,
+                   MAX(DIGER_ISIM),
+                   COUNT(DISTINCT GSMNo) as HedefSayisi,
+                   COUNT(*) as ToplamGorusme
+            FROM hts_gsm
+            WHERE ProjeID=? AND GSMNo IN ({ph})
+            GROUP BY DIGER_NUMARA
+            HAVING HedefSayisi > 1
+            ORDER BY ToplamGorusme DESC
+            LIMIT {int(limit)}
+        """, [project_id] + sources).fetchall()
+
+        sql_who = f"SELECT DISTINCT GSMNo FROM hts_gsm WHERE ProjeID=? AND DIGER_NUMARA=? AND GSMNo IN ({ph})"
+        out = []
+        for raw_no, name, _hedef, toplam in rows:
+            digits = re.sub(r"\D", "", "" if raw_no is None else str(raw_no))
+            if len(digits) >= 10:
+                digits = digits[-10:]
+            if not (len(digits) == 10 and digits.startswith("5")):
+                continue
+
+            related = [r[0] for r in conn.execute(sql_who, [project_id, raw_no] + sources).fetchall()]
+            out.append({
+                'num': digits,
+                'name': name if name else "Bilinmiyor",
+                'count': toplam,
+                'targets': related,
+                'type': 'COMMON'
+            })
+        return out
+
+    @staticmethod
+    def cross_match(conn, project_id, targets) -> list:
+        """Direkt temaslar + ortak bağlantılar: [{'num', 'name', 'count', 'targets', 'type'}, ...]."""
+        return (
+            ContactAnalysis.direct_contacts(conn, project_id, targets)
+            + ContactAnalysis.common_contacts(conn, project_id, targets)
+        )
+
+    # ------------------------------------------------------------------
+    # karşılıklı kayıt eşleştirme
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _paired(conn, select_sql, project_id, owner_gsm, other_gsm, start, end, limit):
+        s = AnalysisSql
+        sql = f"""
+            SELECT {select_sql}
+            FROM hts_gsm t1
+            LEFT JOIN hts_gsm t2 ON {s.pair_condition('t1', 't2')}
+            WHERE t1.ProjeID = ?
+              AND {s.last10('t1.NUMARA')} = ?
+              AND {s.last10('t1.DIGER_NUMARA')} = ?
+              AND ({s.iso('t1.TARIH')}) BETWEEN ? AND ?
+            ORDER BY {s.iso('t1.TARIH')} DESC
+        """
+        params = [project_id, s.clean_gsm(owner_gsm), s.clean_gsm(other_gsm), start, end]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return conn.execute(sql, params).fetchall()
+
+    @staticmethod
+    def mutual_contacts(conn, project_id, owner_gsm, other_gsm, start, end, limit: int | None = DETAIL_LIMIT + 1) -> list:
+        """[(TARIH, sahip_imei, sahip_baz, TipKodu, karşı_imei, karşı_baz), ...] (yeniden eskiye)."""
+        return ContactAnalysis._paired(
+            conn, "t1.TARIH, t1.IMEI, t1.BAZ, t1.TipKodu, t2.IMEI, t2.BAZ",
+            project_id, owner_gsm, other_gsm, start, end, limit
+        )
+
+    @staticmethod
+    def interaction_detail(conn, project_id, owner_gsm, other_gsm, start, end, limit: int | None = DETAIL_LIMIT + 1) -> list:
+        """[(TARIH, NUMARA, DIGER_NUMARA, TIP, TipKodu, SURE, sahip_baz, karşı_baz, karşı_imei), ...]."""
+        return ContactAnalysis._paired(
+            conn, "t1.TARIH, t1.NUMARA, t1.DIGER_NUMARA, t1.TIP, t1.TipKodu, t1.SURE, t1.BAZ, t2.BAZ, t2.IMEI",
+            project_id, owner_gsm, other_gsm, start, end, limit
+        )
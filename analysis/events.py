@@ -0,0 +1,123 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+from analysis.base import AnalysisSql
+
+
+class EventWindowAnalysis:
+    """
+    Olay merkezli analiz: olay anı (t0) etrafındaki kayıtların önce / kritik / sonra pencerelerine
+    ayrılması, kritik penceredeki yoğunlaşma (burst) katsayısı ve en çok temas edilen numaralar.
+
+    Satırlar hts_gsm kolonları (raw_cols sırasıyla) olarak döner; pencere satırlarının başına
+    "Delta T" metni ('+12 dk') eklenir.
+    """
+
+    TOP_N = 5
+
+    @staticmethod
+    def fetch_rows(conn, project_id, raw_cols, start: datetime, end: datetime, gsm=None) -> list:
+        """[(raw_cols..., iso_tarih), ...] (zamana göre artan). NUMARA yerine GSMNo seçilir."""
+        iso = AnalysisSql.iso("TARIH")
+        select_sql = ", ".join("GSMNo as NUMARA" if c == "NUMARA" else c for c in raw_cols)
+        params = [project_id]
+        gsm_filter = ""
+        if gsm:
+            gsm_filter = " AND GSMNo = ? "
+            params.append(gsm)
+        params.extend([start.isoformat(sep=" "), end.isoformat(sep=" ")])
+        return conn.execute(
+            f"SELECT {select_sql}, {iso} as iso_date FROM hts_gsm "
+            f"WHERE ProjeID = ?{gsm_filter} AND iso_date BETWEEN ? AND ? ORDER BY iso_date ASC",
+            params
+        ).fetchall()
+
+    @staticmethod
+    def project_numbers(conn, project_id) -> set:
+        """Projedeki hatların son 10 hanesi."""
+        return {
+            AnalysisSql.clean_gsm(g)
+            for (g,) in conn.execute("SELECT DISTINCT GSMNo FROM hts_gsm WHERE ProjeID=?", (project_id,)).fetchall()
+            if g
+        }
+
+    @staticmethod
+    def filter_rows(rows, raw_cols, project_numbers, gsm=None) -> list:
+        """
+        Kendi kendine kayıtlar (DIGER_NUMARA == NUMARA) ve proje içi diğer hatlarla olan kayıtlar çıkarılır;
+        gsm verilmişse yalnız o hattın kayıtları kalır.
+        """
+        idx_num = raw_cols.index("NUMARA")
+        idx_other = raw_cols.index("DIGER_NUMARA")
+        target = AnalysisSql.clean_gsm(gsm) if gsm else None
+
+        out = []
+        for r in rows:
+            if idx_num >= len(r) - 1 or idx_other >= len(r) - 1:
+                continue
+            num10 = AnalysisSql.clean_gsm(r[idx_num])
+            other10 = AnalysisSql.clean_gsm(r[idx_other])
+            if target and num10 != target:
+                continue
+            if num10 and other10 and num10 == other10:
+                continue
+            if project_numbers and other10 in project_numbers:
+                continue
+            out.append(r)
+        return out
+
+    @staticmethod
+    def split_windows(rows, raw_cols, t0: datetime, crit_minutes: int, before_hours: int, after_hours: int) -> dict:
+        """
+        Satırları pencerelere ayırır ve özet çıkarır:
+        {"before", "crit", "after": [("±N dk", raw...), ...], "total", "crit_count", "burst", "top": [(no, adet), ...]}.
+        """
+        idx_other = raw_cols.index("DIGER_NUMARA")
+        c_s = t0 - timedelta(minutes=crit_minutes)
+        c_e = t0 + timedelta(minutes=crit_minutes)
+
+        windows = {"before": [], "crit": [], "after": []}
+        crit_numbers = []
+        for r in rows:
+            try:
+                dt = datetime.fromisoformat(r[-1])
+            except (TypeError, ValueError):
+                continue
+
+            delta = int((dt - t0).total_seconds() / 60)
+            full_row = (f"{'+' if delta >= 0 else ''}{delta} dk",) + tuple(r[:-1])
+
+            if dt < c_s:
+                windows["before"].append(full_row)
+            elif dt <= c_e:
+                windows["crit"].append(full_row)
+                crit_numbers.append(r[idx_other])
+            else:
+                windows["after"].append(full_row)
+
+        n_crit = len(windows["crit"])
+        rate_crit = n_crit / (crit_minutes / 60.0) if crit_minutes > 0 else 0
+        n_normal = len(windows["before"]) + len(windows["after"])
+        hours = before_hours + after_hours
+        rate_normal = n_normal / hours if hours > 0 else 0
+
+        windows.update({
+            "total": len(rows),
+            "crit_count": n_crit,
+            "burst": rate_crit / rate_normal if rate_normal > 0 else n_crit,
+            "top": Counter(crit_numbers).most_common(EventWindowAnalysis.TOP_N),
+        })
+        return windows
+
+    @staticmethod
+    def run(conn, project_id, raw_cols, t0: datetime, crit_minutes: int, before_hours: int, after_hours: int, gsm=None):
+        """fetch_rows + filter_rows + split_windows; uygun kayıt yoksa None."""
+        start = t0 - timedelta(hours=before_hours)
+        end = t0 + timedelta(hours=after_hours)
+        rows = EventWindowAnalysis.fetch_rows(conn, project_id, raw_cols, start, end, gsm)
+        if not rows:
+            return None
+        rows = EventWindowAnalysis.filter_rows(rows, raw_cols, EventWindowAnalysis.project_numbers(conn, project_id), gsm)
+        if not rows:
+            return None
+        return EventWindowAnalysis.split_windows(rows, raw_cols, t0, crit_minutes, before_hours, after_hours)
@@ -0,0 +1,153 @@
+import math
+import re
+from datetime import datetime
+
+from analysis.base import AnalysisSql
+
+
+class LocationAnalysis:
+    """
+    Konum analizleri: ilişki konum eşleştirmesi (iki tarafın ±3 sn eşleşen kayıtları) ve
+    hız / mesafe ihlali (ardışık baz konumları arasında fiziksel olarak imkânsız hız).
+    Sorgu (fetch_*) ve hesap (find_*) ayrıdır; hesap fonksiyonları DB'siz, saf Python'dur.
+    """
+
+    # ------------------------------------------------------------------
+    # ilişki konum analizi
+    # ------------------------------------------------------------------
+    @staticmethod
+    def cross_location(conn, project_id, main_targets, found_contacts, start, end) -> list:
+        """
+        Hedefler arası (ve hedef <-> bulunan bağlantı) temasların iki taraflı konumu.
+        Dönüş: [(TARIH, kaynak, hedef, TipKodu, SURE, kaynak_baz, hedef_baz, kaynak_imei, hedef_imei), ...]
+        """
+        s = AnalysisSql
+        targets = list(main_targets)
+        contacts = list(found_contacts or [])
+        tph = s.placeholders(targets)
+
+        if not contacts:
+            where = f"AND t1.GSMNo IN ({tph}) AND t1.DIGER_NUMARA IN ({tph})"
+            params = targets + targets
+        else:
+            cph = s.placeholders(contacts)
+            where = f"""
+                AND (
+                    (t1.GSMNo IN ({tph}) AND t1.DIGER_NUMARA IN ({tph}))
+                    OR (t1.GSMNo IN ({tph}) AND t1.DIGER_NUMARA IN ({cph}))
+                    OR (t1.GSMNo IN ({cph}) AND t1.DIGER_NUMARA IN ({tph}))
+                )
+            """
+            params = targets + targets + targets + contacts + contacts + targets
+
+        sql = f"""
+            SELECT t1.TARIH, t1.GSMNo, t1.DIGER_NUMARA, t1.TipKodu, t1.SURE,
+                   t1.BAZ, t2.BAZ, t1.IMEI, t2.IMEI
+            FROM hts_gsm t1
+            JOIN hts_gsm t2 ON {s.pair_condition('t1', 't2')}
+            WHERE t1.ProjeID=?
+              AND ({s.iso('t1.TARIH')}) BETWEEN ? AND ?
+              {where}
+              AND t1.GSMNo != t1.DIGER_NUMARA
+            ORDER BY {s.iso('t1.TARIH')} DESC
+        """
+        return conn.execute(sql, [project_id, start, end] + params).fetchall()
+
+    # ------------------------------------------------------------------
+    # hız / mesafe ihlali
+    # ------------------------------------------------------------------
+    @staticmethod
+    def haversine(lat1, lon1, lat2, lon2) -> float:
+        """İki nokta arasındaki kuş uçuşu mesafe (km)."""
+        R = 6371.0
+        dlat = math.radians(lat2 - lat1)
+        dlon = math.radians(lon2 - lon1)
+        a = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2
+        return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    @staticmethod
+    def parse_coordinate(text):
+        """Baz metnindeki son iki 'dd.dddd' değerinden (lat, lon); Türkiye sınırlarına göre sıra düzeltilir."""
+        if not text:
+            return None
+        coords = re.findall(r"(\d{2}\.\d{4,})", str(text))
+        if len(coords) < 2:
+            return None
+        try:
+            v1, v2 = float(coords[-2]), float(coords[-1])
+        except ValueError:
+            return None
+        if 35 < v2 < 43 and 25 < v1 < 46 and not (35 < v1 < 43 and 25 < v2 < 46):
+            return (v2, v1)
+        return (v1, v2)
+
+    @staticmethod
+    def _parse_dt(t_str: str) -> datetime:
+        if "/" in t_str:
+            fmt = "%d/%m/%Y %H:%M:%S"
+        elif "." in t_str:
+            fmt = "%d.%m.%Y %H:%M:%S"
+        else:
+            fmt = "%Y-%m-%d %H:%M:%S"
+        return datetime.strptime(t_str, fmt)
+
+    @staticmethod
+    def fetch_points(conn, project_id, gsm_number) -> list:
+        """
+        Hattın koordinatlı kayıtları (GSM + GPRS + WAP), zamana göre sıralı:
+        [{'dt', 'lat', 'lon', 'baz', 't_str'}, ...]. NUMARA'sı hatla uyuşmayan satırlar atlanır.
+        """
+        rows = conn.execute("""
+            SELECT TARIH, BAZ, NUMARA FROM hts_gsm
+            WHERE ProjeID=? AND GSMNo=? AND BAZ IS NOT NULL AND length(BAZ) > 5
+            UNION ALL
+            SELECT TARIH, BAZ, NUMARA FROM hts_gprs
+            WHERE ProjeID=? AND GSMNo=? AND BAZ IS NOT NULL AND length(BAZ) > 5
+            UNION ALL
+            SELECT TARIH, BAZ, NUMARA FROM hts_wap
+            WHERE ProjeID=? AND GSMNo=? AND BAZ IS NOT NULL AND length(BAZ) > 5
+        """, (project_id, gsm_number) * 3).fetchall()
+        return LocationAnalysis.points_from_rows(rows, gsm_number)
+
+    @staticmethod
+    def points_from_rows(rows, gsm_number) -> list:
+        target = AnalysisSql.clean_gsm(gsm_number)
+        coord_cache = {}
+        points = []
+        for t_str, baz_txt, raw_num in rows:
+            if AnalysisSql.clean_gsm(raw_num) != target:
+                continue
+            coord = coord_cache.get(baz_txt)
+            if coord is None and baz_txt not in coord_cache:
+                coord = coord_cache[baz_txt] = LocationAnalysis.parse_coordinate(baz_txt)
+            if not coord:
+                continue
+            t_str = str(t_str).strip()
+            try:
+                dt = LocationAnalysis._parse_dt(t_str)
+            except ValueError:
+                continue
+            points.append({'dt': dt, 'lat': coord[0], 'lon': coord[1], 'baz': baz_txt, 't_str': t_str})
+
+        points.sort(key=lambda x: x['dt'])
+        return points
+
+    @staticmethod
+    def find_speed_anomalies(points, limit_kmh, limit_dist_km) -> list:
+        """
+        Ardışık noktalar arasında mesafe >= limit_dist_km ve hız > limit_kmh olan geçişler:
+        [{'p1', 'p2', 'dist_km', 'minutes', 'speed'}, ...] (points zamana göre sıralı olmalı).
+        """
+        out = []
+        for i in range(len(points) - 1):
+            p1, p2 = points[i], points[i + 1]
+            diff_seconds = (p2['dt'] - p1['dt']).total_seconds()
+            if diff_seconds <= 0:
+                continue
+            dist_km = LocationAnalysis.haversine(p1['lat'], p1['lon'], p2['lat'], p2['lon'])
+            if dist_km < limit_dist_km:
+                continue
+            speed = dist_km / (diff_seconds / 3600.0)
+            if speed > limit_kmh:
+                out.append({'p1': p1, 'p2': p2, 'dist_km': dist_km, 'minutes': diff_seconds / 60, 'speed': speed})
+        return out
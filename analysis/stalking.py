@@ -0,0 +1,73 @@
+from analysis.base import AnalysisSql
+from utils.tip_kodu import TipKodu
+
+
+class StalkingAnalysis:
+    """
+    Taciz / ısrarlı takip analizi: hattın sesli görüşmelerinde tek yönlü yoğun arama yapılan karşı numaralar.
+
+    Yüksek risk: karşı taraf hiç aramamış veya giden aramaların %80'inden fazlası kısa (<10 sn).
+    Şüpheli: giden / gelen oranı 5'ten büyük veya kısa arama oranı %50'nin üzerinde.
+    """
+
+    MIN_OUTGOING = 5
+    SHORT_SECONDS = 10
+
+    NORMAL, SUSPICIOUS, HIGH = 0, 2, 3
+    LABELS = {NORMAL: "🟢 Normal", SUSPICIOUS: "🟡 Şüpheli", HIGH: "🔴 YÜKSEK RİSK"}
+
+    @staticmethod
+    def fetch_counts(conn, project_id, owner_gsm, start, end) -> list:
+        """Karşı numara bazında [(numara, isim, giden, gelen, kısa_giden, toplam_süre_sn), ...] (giden > MIN_OUTGOING)."""
+        s = AnalysisSql
+        sure = "CAST(REPLACE(REPLACE(SURE, ' sn', ''), ' sec', '') as INTEGER)"
+        giden = TipKodu.sql_in(TipKodu.GIDEN)
+        gelen = TipKodu.sql_in(TipKodu.GELEN)
+        sql = f"""
+            SELECT DIGER_NUMARA,
+                   MAX(DIGER_ISIM) as Isim,
+                   SUM(TipKodu IN {giden}) as Giden,
+                   SUM(TipKodu IN {gelen}) as Gelen,
+                   SUM(CASE WHEN TipKodu IN {giden} AND {sure} < {StalkingAnalysis.SHORT_SECONDS} THEN 1 ELSE 0 END) as Kisa,
+                   SUM({sure}) as ToplamSure
+            FROM hts_gsm
+            WHERE ProjeID=?
+              AND ({s.iso('TARIH')}) BETWEEN ? AND ?
+              AND {s.last10('NUMARA')} = ?
+            GROUP BY DIGER_NUMARA
+            HAVING Giden > {StalkingAnalysis.MIN_OUTGOING}
+            ORDER BY Giden DESC
+        """
+        return conn.execute(sql, (project_id, start, end, s.clean_gsm(owner_gsm))).fetchall()
+
+    @staticmethod
+    def score(giden, gelen, kisa) -> tuple:
+        """(risk_seviyesi, kısa_arama_yüzdesi)."""
+        giden, gelen, kisa = giden or 0, gelen or 0, kisa or 0
+        reject_ratio = (kisa / (giden if giden > 0 else 1)) * 100
+        imbalance = giden / (gelen if gelen > 0 else 1)
+
+        if giden > StalkingAnalysis.MIN_OUTGOING and (gelen == 0 or reject_ratio > 80):
+            return StalkingAnalysis.HIGH, reject_ratio
+        if imbalance > 5 or reject_ratio > 50:
+            return StalkingAnalysis.SUSPICIOUS, reject_ratio
+        return StalkingAnalysis.NORMAL, reject_ratio
+
+    @staticmethod
+    def run(conn, project_id, owner_gsm, start, end) -> list:
+        """
+        Riskli karşı numaralar, risk ve giden sayısına göre azalan:
+        [{'num', 'name', 'risk', 'giden', 'gelen', 'kisa', 'reject_ratio', 'total_seconds'}, ...].
+        """
+        out = []
+        for num, name, giden, gelen, kisa, total in StalkingAnalysis.fetch_counts(conn, project_id, owner_gsm, start, end):
+            risk, ratio = StalkingAnalysis.score(giden, gelen, kisa)
+            if risk == StalkingAnalysis.NORMAL:
+                continue
+            out.append({
+                'num': num, 'name': name, 'risk': risk,
+                'giden': giden or 0, 'gelen': gelen or 0, 'kisa': kisa or 0,
+                'reject_ratio': ratio, 'total_seconds': total or 0,
+            })
+        out.sort(key=lambda r: (r['risk'], r['giden']), reverse=True)
+        return out
@@ -0,0 +1,269 @@
+"""
+HTS Mercek komut satırı aracı: arayüz açmadan toplu HTS içe aktarma ve analiz.
+
+Arayüzdeki yükleme ile aynı içe aktarma kodunu (utils.hts_import.HtsImporter) ve aynı analiz
+paketini kullanır; her dosya / analiz için süre ve satır sayılarını tablo halinde raporlar.
+Lisans ve şifreli DB arayüzdekiyle aynıdır (geçerli lisans olmadan çalışmaz).
+
+Kullanım:
+    python cli.py import D:\\HTS\\dosya_123 --project 3
+    python cli.py import D:\\HTS\\dosya_123 --create-project 2024/123 --recursive --on-duplicate overwrite
+    python cli.py analyze --project 3
+    python cli.py analyze --project 3 --start 2024-01-01 --end 2024-06-30 --json sonuc.json
+"""
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import time
+import warnings
+
+warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
+
+
+def _fmt_table(headers, rows) -> str:
+    """İlk kolon sola, diğerleri sağa hizalı düz metin tablo."""
+    table = [list(map(str, headers))] + [[str(c) for c in r] for r in rows]
+    widths = [max(len(r[i]) for r in table) for i in range(len(headers))]
+    lines = []
+    for n, r in enumerate(table):
+        cells = [r[0].ljust(widths[0])] + [c.rjust(w) for c, w in zip(r[1:], widths[1:])]
+        lines.append("  ".join(cells))
+        if n == 0:
+            lines.append("  ".join("-" * w for w in widths))
+    return "\n".join(lines)
+
+
+def _find_files(folder, pattern, recursive) -> list:
+    out = []
+    if recursive:
+        for root, _dirs, files in os.walk(folder):
+            out.extend(os.path.join(root, f) for f in files if fnmatch.fnmatch(f.lower(), pattern.lower()))
+    else:
+        out = [
+            os.path.join(folder, f) for f in os.listdir(folder)
+            if os.path.isfile(os.path.join(folder, f)) and fnmatch.fnmatch(f.lower(), pattern.lower())
+        ]
+    # Excel'in açık dosya kilitleri (~$...) atlanır
+    return sorted(p for p in out if not os.path.basename(p).startswith("~$"))
+
+
+def _bootstrap():
+    """Güvenilir zaman + lisans + DB şeması (arayüzdeki açılış sırası). Hata durumunda False."""
+    from security.security import LicenseManager
+    from time_utils.time_guard import TrustedTimeGuard
+
+    try:
+        TrustedTimeGuard.bootstrap(require_online=bool(getattr(sys, "frozen", False)))
+        LicenseManager.ensure_valid_or_raise()
+    except Exception as e:
+        print(f"❌ [cli] Lisans doğrulanamadı: {e}")
+        return False
+
+    from utils.db import setup_database
+    setup_database()
+    return True
+
+
+def _project_exists(pid) -> bool:
+    from utils.db import DB
+    with DB() as conn:
+        return conn.execute("SELECT 1 FROM projeler WHERE id=?", (pid,)).fetchone() is not None
+
+
+def _create_project(dosya_no) -> int:
+    from utils.db import DB, open_project_shard
+    with DB() as conn:
+        cur = conn.execute("""
+            INSERT INTO projeler
+            (talep_eden_birim, dosya_no_tipi, dosya_no,
+             suc_bilgisi, suc_tarihi, gorevlendirme_tarihi,
+             bilirkisi_adi, bilirkisi_unvan_sicil, olusturma_tarihi)
+            VALUES ('', '', ?, '', '', '', '', '', CURRENT_TIMESTAMP)
+        """, (dosya_no,))
+        pid = cur.lastrowid
+    open_project_shard(pid)
+    return pid
+
+
+def cmd_import(args) -> int:
+    from utils.db import DB, AnalysisUtils, open_project_shard
+    from utils.hts_import import HtsImporter, _detect_target_gsm, detect_hts_role
+    from utils.project_shards import ProjectShards
+
+    if not os.path.isdir(args.folder):
+        print(f"❌ [cli] Klasör bulunamadı: {args.folder}")
+        return 2
+
+    if args.create_project:
+        pid = _create_project(args.create_project)
+        print(f"✅ Yeni proje oluşturuldu: #{pid} ({args.create_project})")
+    else:
+        pid = args.project
+        if not _project_exists(pid):
+            print(f"❌ [cli] Proje bulunamadı: #{pid}")
+            return 2
+
+    files = _find_files(args.folder, args.pattern, args.recursive)
+    if not files:
+        print(f"⚠️ [cli] '{args.pattern}' ile eşleşen dosya yok: {args.folder}")
+        return 1
+
+    rows = []
+    failed = 0
+    t_all = time.perf_counter()
+
+    ProjectShards.pin(pid)
+    try:
+        open_project_shard(pid)
+        for i, path in enumerate(files, start=1):
+            name = os.path.basename(path)
+            print(f"[{i}/{len(files)}] {name} ...", flush=True)
+
+            try:
+                rol, gsm = detect_hts_role(path)
+            except Exception:
+                rol, gsm = "HEDEF", _detect_target_gsm(path)
+
+            with DB() as conn:
+                exists = conn.execute(
+                    "SELECT 1 FROM hts_dosyalari WHERE ProjeID=? AND GSMNo=? AND Rol=? LIMIT 1",
+                    (pid, gsm, rol)
+                ).fetchone()
+            if exists:
+                if args.on_duplicate == "skip":
+                    print(f"   ⚠️ {gsm} ({rol}) zaten yüklü, atlandı.")
+                    rows.append([name, gsm, rol, "ATLANDI", "-", "-", "-", "-"])
+                    continue
+                AnalysisUtils.delete_gsm_records_core(pid, gsm)
+                print(f"   ♻️ {gsm} eski kayıtları silindi (üzerine yazılıyor).")
+
+            importer = HtsImporter(path, pid, DB, recalc_common=False)
+            try:
+                gsm = importer.run()
+            except Exception as e:
+                failed += 1
+                print(f"   ❌ {e}")
+                rows.append([name, gsm, rol, "HATA", "-", "-", "-", "-"])
+                continue
+
+            t = importer.timings
+            rows.append([
+                name, gsm, importer.current_rol, "OK",
+                sum(importer.row_counts.values()),
+                f"{t['read'] - t['save']:.2f}", f"{t['save']:.2f}", f"{t['total']:.2f}",
+            ])
+    finally:
+        ProjectShards.unpin(pid)
+
+    # ortak analiz her dosyada değil, en sonda bir kez
+    t0 = time.perf_counter()
+    AnalysisUtils.recalculate_common_analysis_core(pid)
+    t_common = time.perf_counter() - t0
+
+    print()
+    print(_fmt_table(["Dosya", "GSM", "Rol", "Durum", "Satır", "Okuma sn", "Yazma sn", "Toplam sn"], rows))
+    print()
+    print(f"Ortak analiz: {t_common:.2f} sn   Genel toplam: {time.perf_counter() - t_all:.2f} sn   Proje: #{pid}")
+    return 1 if failed else 0
+
+
+def cmd_analyze(args) -> int:
+    from analysis.common import CommonAnalysis
+    from analysis.contacts import ContactAnalysis
+    from analysis.location import LocationAnalysis
+    from analysis.stalking import StalkingAnalysis
+    from utils.db import DB, open_project_shard
+
+    pid = args.project
+    if not _project_exists(pid):
+        print(f"❌ [cli] Proje bulunamadı: #{pid}")
+        return 2
+
+    start = f"{args.start} 00:00:00"
+    end = f"{args.end} 23:59:59"
+    open_project_shard(pid)
+
+    with DB() as conn:
+        gsms = [r[0] for r in conn.execute(
+            "SELECT DISTINCT GSMNo FROM hts_dosyalari WHERE ProjeID=? ORDER BY GSMNo", (pid,)
+        ).fetchall()]
+    if not gsms:
+        print(f"⚠️ [cli] Projede yüklü GSM yok: #{pid}")
+        return 1
+
+    rows = []
+    result = {"project": pid, "gsm": {}}
+
+    def _timed(fn):
+        t0 = time.perf_counter()
+        with DB() as conn:
+            out = fn(conn)
+        dt = time.perf_counter() - t0
+        return out, dt
+
+    counts, dt = _timed(lambda c: CommonAnalysis.recalculate(c, pid))
+    counts = counts or {"imei": 0, "isim": 0, "tc": 0}
+    rows.append(["Ortak IMEI / İsim / TC", "-", f"{counts['imei']} / {counts['isim']} / {counts['tc']}", f"{dt:.2f}"])
+    result["common"] = counts
+
+    matches, dt = _timed(lambda c: ContactAnalysis.cross_match(c, pid, gsms))
+    rows.append(["Çapraz eşleşme", f"{len(gsms)} hat", len(matches), f"{dt:.2f}"])
+    result["cross_match"] = len(matches)
+
+    for gsm in gsms:
+        stalk, dt_s = _timed(lambda c: StalkingAnalysis.run(c, pid, gsm, start, end))
+        rows.append(["Taciz / ısrarlı takip", gsm, len(stalk), f"{dt_s:.2f}"])
+
+        def _speed(c):
+            points = LocationAnalysis.fetch_points(c, pid, gsm)
+            return LocationAnalysis.find_speed_anomalies(points, args.speed_kmh, args.speed_km)
+
+        speed, dt_v = _timed(_speed)
+        rows.append(["Hız / mesafe ihlali", gsm, len(speed), f"{dt_v:.2f}"])
+        result["gsm"][gsm] = {"stalking": len(stalk), "speed": len(speed)}
+
+    print(_fmt_table(["Analiz", "Hat", "Sonuç", "Süre sn"], rows))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"✅ Sonuçlar yazıldı: {args.json}")
+    return 0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="HTS Mercek komut satırı: toplu içe aktarma ve analiz")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    ap_imp = sub.add_parser("import", help="klasördeki HTS Excel dosyalarını projeye aktar")
+    ap_imp.add_argument("folder", help="HTS dosyalarının bulunduğu klasör")
+    grp = ap_imp.add_mutually_exclusive_group(required=True)
+    grp.add_argument("--project", type=int, help="mevcut proje ID")
+    grp.add_argument("--create-project", metavar="DOSYA_NO", help="bu dosya numarasıyla yeni proje oluştur")
+    ap_imp.add_argument("--pattern", default="*.xlsx", help="dosya deseni (varsayılan: *.xlsx)")
+    ap_imp.add_argument("--recursive", action="store_true", help="alt klasörleri de tara")
+    ap_imp.add_argument("--on-duplicate", choices=["skip", "overwrite"], default="skip",
+                        help="numara zaten yüklüyse: atla (varsayılan) / eski kayıtları silip yeniden yükle")
+
+    ap_an = sub.add_parser("analyze", help="projede analizleri çalıştır ve süreleri raporla")
+    ap_an.add_argument("--project", type=int, required=True, help="proje ID")
+    ap_an.add_argument("--start", default="1900-01-01", help="başlangıç tarihi (yyyy-MM-dd)")
+    ap_an.add_argument("--end", default="2100-12-31", help="bitiş tarihi (yyyy-MM-dd)")
+    ap_an.add_argument("--speed-kmh", type=float, default=180.0, help="hız ihlali eşiği (km/sa)")
+    ap_an.add_argument("--speed-km", type=float, default=10.0, help="hız ihlali için asgari mesafe (km)")
+    ap_an.add_argument("--json", default=None, help="sonuçları JSON olarak yaz")
+
+    args = ap.parse_args(argv)
+
+    if not _bootstrap():
+        return 3
+
+    if args.command == "import":
+        return cmd_import(args)
+    return cmd_analyze(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
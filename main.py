@@ -1,8 +1,13 @@
+import multiprocessing
 import os
 import sys
 
+from utils.startup_profile import StartupProfiler
+StartupProfiler.install_from_env()
+
 from security.security import LicenseManager
 from time_utils.time_guard import TrustedTimeGuard
+from utils.ui_watchdog import UiWatchdog
 from ui.main_window import LicenseGateDialog, enforce_normal_table_fonts, apply_light_combobox_popup, TooltipManager, \
     MainWindow, _quit_app, restart_application
 from ui.dialog import ModernDialog
@@ -23,7 +28,7 @@ os.environ["PLAYWRIGHT_BROWSERS_PATH"] = os.path.join(APP_DIR, "ms-playwright")
 from PyQt6.QtWidgets import (
     QApplication, QComboBox, QMessageBox, QToolTip
 )
-from PyQt6.QtCore import (QSize, QTimer)
+from PyQt6.QtCore import (QSize, QTimer, Qt, QCoreApplication)
 from PyQt6.QtGui import (QPalette, QIcon, QColor, QFont)
 import warnings
 
@@ -34,6 +39,8 @@ warnings.filterwarnings(
 )
 
 if __name__ == "__main__":
+    # ✅ PDF render servisi ayrı process (spawn) -> frozen exe'de zorunlu
+    multiprocessing.freeze_support()
 
     if sys.platform.startswith("win"):
         try:
@@ -41,6 +48,13 @@ if __name__ == "__main__":
             ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("HTSMercek")
         except Exception:
             pass
+    StartupProfiler.mark("Modüller yüklendi")
+
+    # ✅ AÇILIŞTA ONLINE ZORUNLU (NTP bootstrap) -> arka planda; sonuç pencere açıldıktan sonra değerlendirilir
+    TrustedTimeGuard.bootstrap_async(require_online=True)
+
+    # ✅ QtWebEngine ilk harita/rapor penceresinde yükleniyor (lazy import) -> QApplication'dan önce verilmeli
+    QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
 
     assets_path = os.path.join(APP_DIR, "assets")
@@ -66,18 +80,19 @@ if __name__ == "__main__":
     app.setStyleSheet(QSS_LIGHT)
     _tooltip_mgr = TooltipManager(app)
 
-    # ✅ AÇILIŞTA ONLINE ZORUNLU (NTP bootstrap)
-    try:
-        TrustedTimeGuard.bootstrap(require_online=True)
-    except Exception as e:
+    def _show_time_error(e, parent=None):
         try:
             # ModernDialog varsa onu kullan
             if "ModernDialog" in globals():
-                ModernDialog.show_error(None, "İnternet Gerekli", f"Uygulama açılışı için internet bağlantısı gereklidir.\n\nDetay: {e}")
+                ModernDialog.show_error(parent, "İnternet Gerekli", f"Uygulama açılışı için internet bağlantısı gereklidir.\n\nDetay: {e}")
             else:
-                QMessageBox.critical(None, "İnternet Gerekli", f"Uygulama açılışı için internet bağlantısı gereklidir.\n\nDetay: {e}")
+                QMessageBox.critical(parent, "İnternet Gerekli", f"Uygulama açılışı için internet bağlantısı gereklidir.\n\nDetay: {e}")
         finally:
             _quit_app()
+
+    # NTP bu noktaya kadar başarısız olduysa lisans ekranına geçmeden kapat
+    if TrustedTimeGuard.bootstrap_error() is not None:
+        _show_time_error(TrustedTimeGuard.bootstrap_error())
         sys.exit(app.exec())  # quit timer'ı işlesin
 
     # ✅ Lisans kontrolü (yoksa kullanıcıya Lisans Yükle/Kapat seçeneği)
@@ -134,7 +149,9 @@ if __name__ == "__main__":
                 _quit_app()
             sys.exit(app.exec())
 
+    StartupProfiler.mark("Lisans doğrulandı")
     win = MainWindow()
+    StartupProfiler.mark("Ana pencere oluşturuldu")
     if not app_icon.isNull():
         win.setWindowIcon(app_icon)
 
@@ -186,7 +203,36 @@ if __name__ == "__main__":
             pass
 
     _guard_timer.timeout.connect(_tick_guard)
-    _guard_timer.start()
+
+    # ✅ Arka plan NTP sonucu: hata -> kapat; başarı -> lisansı gerçek zamanla tekrar doğrula, guard'ı başlat
+    _time_poll = QTimer(win)
+    _time_poll.setInterval(200)
+
+    def _poll_time_bootstrap():
+        if not TrustedTimeGuard.wait_ready(0):
+            return
+        _time_poll.stop()
+        StartupProfiler.mark("NTP zaman doğrulaması (arka plan)")
+
+        err = TrustedTimeGuard.bootstrap_error()
+        if err is not None:
+            _show_time_error(err, win)
+            return
+        try:
+            LicenseManager.ensure_valid_or_raise()
+        except Exception as e:
+            try:
+                if "ModernDialog" in globals():
+                    ModernDialog.show_error(win, "Lisans Hatası", f"Lisans doğrulaması başarısız.\n\nDetay: {e}")
+                else:
+                    QMessageBox.critical(win, "Lisans Hatası", f"Lisans doğrulaması başarısız.\n\nDetay: {e}")
+            finally:
+                _quit_app()
+            return
+        _guard_timer.start()
+
+    _time_poll.timeout.connect(_poll_time_bootstrap)
+    _time_poll.start()
 
     try:
         enforce_normal_table_fonts(win)
@@ -194,4 +240,6 @@ if __name__ == "__main__":
         pass
 
     win.showMaximized()
+    QTimer.singleShot(0, StartupProfiler.finish)
+    UiWatchdog.start(win)
     sys.exit(app.exec())
\ No newline at end of file
@@ -8,11 +8,8 @@ import traceback
 from dataclasses import dataclass
 from datetime import datetime
 
-from PyQt6.QtCore import QTimer
-from PyQt6.QtWidgets import QApplication, QMessageBox
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
 
-from ui.dialog import ModernDialog
 from time_utils.time_guard import TrustedTimeGuard
 
 try:
@@ -99,6 +96,7 @@ class CrashGuard:
 
         # 4. Kullanıcıya Bilgi Ver
         try:
+            from PyQt6.QtWidgets import QApplication, QMessageBox
             app = QApplication.instance()
             if app:
                 short_error = str(exc_value)
@@ -122,6 +120,12 @@ class LicenseManager:
     LICENSE_FILENAME = "license.json"
     _fingerprint_cache: str | None = None
 
+    # doğrulanmış lisans önbelleği: ((dosya stat imzası, saat kesin mi), LicenseInfo, exp tarihi)
+    _valid_cache: tuple | None = None
+
+    # kritik işlemde arka plan NTP doğrulaması en fazla bu kadar beklenir (sunucular eşzamanlı, 2 sn zaman aşımı)
+    TRUSTED_TIME_WAIT_SECONDS = 5
+
     @staticmethod
     def appdata_dir() -> str:
         base = os.environ.get("APPDATA") or os.path.expanduser("~")
@@ -200,6 +204,19 @@ class LicenseManager:
         except Exception:
             return False
 
+    @staticmethod
+    def _license_stat_sig() -> tuple | None:
+        try:
+            st = os.stat(LicenseManager.license_path())
+            return (st.st_mtime_ns, st.st_size, st.st_ino, st.st_ctime_ns)
+        except Exception:
+            return None
+
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Lisans dosyası uygulama içinden değiştirildiğinde çağır (stat aynı kalsa bile tekrar doğrulansın)."""
+        LicenseManager._valid_cache = None
+
     @staticmethod
     def load_license_from_disk() -> dict | None:
         p = LicenseManager.license_path()
@@ -265,7 +282,12 @@ class LicenseManager:
             return False
 
     @staticmethod
-    def ensure_valid_or_raise() -> "LicenseInfo":
+    def ensure_valid_or_raise(require_trusted: bool = False) -> "LicenseInfo":
+        """
+        Lisansı doğrular (geçersizse ValueError).
+        require_trusted=True: arka plan NTP sürüyorsa geçici saatle doğrulamak yerine sonucu bekler;
+        TRUSTED_TIME_WAIT_SECONDS içinde gelmezse TimeoutError yükselir.
+        """
         # --- GÜVENLİK KONTROLÜ ---
         # Sadece exe paketinde anti-debug uygula (dev/test sürecini kilitlemesin)
         if getattr(sys, "frozen", False):
@@ -277,17 +299,43 @@ class LicenseManager:
         try:
             # exe paketinde online zorunlu; dev ortamında offline'a izin ver.
             require_online = bool(getattr(sys, "frozen", False))
-            TrustedTimeGuard.bootstrap(require_online=require_online)
+            if require_trusted and TrustedTimeGuard.is_pending():
+                TrustedTimeGuard.ensure_ready(timeout=LicenseManager.TRUSTED_TIME_WAIT_SECONDS)
+            if TrustedTimeGuard.bootstrap_error() is not None:
+                raise TrustedTimeGuard.bootstrap_error()
+            # Arka plan NTP sürüyorsa (require_trusted değilse) beklenmez: geçici saatle doğrulanır,
+            # main.py bootstrap bitince lisansı tekrar doğrular.
+            if not TrustedTimeGuard.is_pending():
+                TrustedTimeGuard.bootstrap(require_online=require_online)
+        except TimeoutError:
+            raise
         except Exception as _tt_err:
             # Online zorunlu modda NTP alınamazsa bootstrap zaten hata verir.
             # Bu hatayı lisans hatası olarak yukarı taşımak istiyoruz.
             raise ValueError(str(_tt_err))
         # --------------------------------------
 
+        # Önbellek: dosya değişmediyse ve saat durumu aynıysa imza/JSON tekrar doğrulanmaz;
+        # sadece manipülasyon bayrağı ve süre sınırı (bellekteki sanal saatle) kontrol edilir.
+        sig = LicenseManager._license_stat_sig()
+        key = (sig, TrustedTimeGuard.is_trusted())
+        cached = LicenseManager._valid_cache
+        if sig is not None and cached is not None and cached[0] == key:
+            if TrustedTimeGuard.is_tampered():
+                LicenseManager._valid_cache = None
+                raise ValueError(TrustedTimeGuard.tamper_reason())
+            if TrustedTimeGuard.now().date() <= cached[2]:
+                return cached[1]
+        LicenseManager._valid_cache = None
+
         d = LicenseManager.load_license_from_disk()
         if not d:
             raise ValueError("Lisans bulunamadı.")
-        return LicenseManager.validate_license(d)
+        info = LicenseManager.validate_license(d)
+
+        if sig is not None:
+            LicenseManager._valid_cache = (key, info, datetime.strptime(info.exp, "%Y-%m-%d").date())
+        return info
 
     @staticmethod
     def require_valid(
@@ -300,6 +348,10 @@ class LicenseManager:
             LicenseManager.ensure_valid_or_raise()
             return True
         except Exception as e:
+            from PyQt6.QtCore import QTimer
+            from PyQt6.QtWidgets import QApplication, QMessageBox
+            from ui.dialog import ModernDialog
+
             if show_message:
                 try:
                     # ModernDialog varsa onu kullanalım, yoksa standart MessageBox
@@ -324,21 +376,41 @@ class LicenseManager:
 
     @staticmethod
     def require_valid_or_exit(parent=None, context: str = "") -> bool:
-        """Kritik işlemlerde kullanılan zorunlu kontrol. (DEĞİŞTİRİLMEDİ)"""
+        """
+        Kritik işlemlerde kullanılan zorunlu kontrol.
+        Güvenilir zaman (NTP) henüz gelmediyse kısa süre beklenir; gelmezse işlem yapılmaz (uygulama kapanmaz).
+        """
         try:
-            LicenseManager.ensure_valid_or_raise()
+            LicenseManager.ensure_valid_or_raise(require_trusted=True)
             return True
+        except TimeoutError as e:
+            from PyQt6.QtWidgets import QMessageBox
+            from ui.dialog import ModernDialog
+
+            extra = f"\n\nİşlem: {context}" if context else ""
+            try:
+                ModernDialog.show_warning(parent, "Zaman Doğrulanıyor", f"{e}{extra}")
+            except Exception:
+                try:
+                    QMessageBox.warning(parent, "Zaman Doğrulanıyor", f"{e}{extra}")
+                except Exception:
+                    pass
+            return False
         except Exception as e:
+            from PyQt6.QtCore import QTimer
+            from PyQt6.QtWidgets import QApplication, QMessageBox
+            from ui.dialog import ModernDialog
+
             extra = f"\n\nİşlem: {context}" if context else ""
             try:
-                # ModernDialog varsa kullan, yoksa hata vermesin
-                if 'ModernDialog' in globals():
+                # ModernDialog hata verirse standart MessageBox
+                try:
                     ModernDialog.show_error(
                         parent,
                         "Lisans Hatası",
                         f"Lisans doğrulanamadı. Uygulama kapatılacak.{extra}\n\nDetay: {e}"
                     )
-                else:
+                except Exception:
                     QMessageBox.critical(parent, "Lisans Hatası", f"Lisans geçersiz. Program kapatılıyor.\n{e}")
             finally:
                 app = QApplication.instance()
@@ -1,8 +1,11 @@
 import base64
 import hashlib
 import socket
+import statistics
 import struct
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 
 try:
@@ -13,29 +16,96 @@ class TimeVerifier:
     """
     Sistem saatine güvenmek yerine NTP sunucularından gerçek zamanı alır.
     İnternet yoksa mecburen sistem saatine döner.
+
+    Sunucular aynı anda sorgulanır (her biri kendi thread'inde; DNS çözümü de paralel):
+    toplam bekleme en yavaş sunucuya değil en hızlı geçerli yanıta bağlıdır.
     """
     NTP_SERVERS = ['pool.ntp.org', 'time.google.com', 'time.windows.com']
+    NTP_PORT = 123
+    NTP_EPOCH_OFFSET = 2208988800  # 1900 -> 1970
+
+    COLLECT_WINDOW = 0.25   # ilk geçerli yanıttan sonra diğerleri için ek bekleme (first_k > 1)
 
     @staticmethod
-    def get_network_time(timeout=2):
-        """NTP sunucularından güncel zamanı dener."""
+    def _parse_response(data: bytes, t_send: float, t_recv: float) -> float | None:
+        """Geçerli sunucu yanıtından epoch (yarım gidiş-dönüş süresi eklenmiş). Geçersizse None."""
+        if not data or len(data) < 48:
+            return None
+        mode = data[0] & 0x07
+        stratum = data[1]
+        if mode != 4 or not (1 <= stratum <= 15):
+            return None
+        secs, frac = struct.unpack('!II', data[40:48])
+        if secs == 0:
+            return None
+        tx = secs - TimeVerifier.NTP_EPOCH_OFFSET + frac / 2 ** 32
+        return tx + max(0.0, t_recv - t_send) / 2.0
+
+    @staticmethod
+    def query_server(server, timeout=2) -> float | None:
+        """Tek sunucu; server 'host' veya (host, port). Dönüş epoch (float) / None."""
+        host, port = (server if isinstance(server, (tuple, list)) else (server, TimeVerifier.NTP_PORT))
         ntp_packet = bytearray(48)
         ntp_packet[0] = 0x1B
+        try:
+            addr = socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_DGRAM)[0][4]
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client:
+                client.settimeout(timeout)
+                t_send = time.time()
+                client.sendto(ntp_packet, addr)
+                data, _ = client.recvfrom(48)
+                return TimeVerifier._parse_response(data, t_send, time.time())
+        except Exception:
+            return None
 
-        for server in TimeVerifier.NTP_SERVERS:
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client:
-                    client.settimeout(timeout)
-                    client.sendto(ntp_packet, (server, 123))
-                    data, address = client.recvfrom(48)
-
-                    if data:
-                        t = struct.unpack('!12I', data)[10]
-                        t -= 2208988800 # 1900 -> 1970 epoch
-                        return datetime.fromtimestamp(t)
-            except Exception:
-                continue
-        return None
+    @staticmethod
+    def get_network_epoch(timeout=2, servers=None, first_k: int = 1) -> float | None:
+        """
+        Tüm sunucuları eşzamanlı sorgular.
+        first_k=1: ilk geçerli yanıt; first_k>1: ilk k geçerli yanıtın medyanı
+        (ilk yanıttan sonra en fazla COLLECT_WINDOW sn daha beklenir).
+        """
+        servers = list(servers or TimeVerifier.NTP_SERVERS)
+        if not servers:
+            return None
+
+        pool = ThreadPoolExecutor(max_workers=len(servers), thread_name_prefix="HTSMercekNTP")
+        try:
+            pending = {pool.submit(TimeVerifier.query_server, s, timeout) for s in servers}
+            results = []
+            deadline = time.monotonic() + timeout + 0.5
+            collect_until = None
+
+            while pending:
+                limit = deadline if collect_until is None else min(deadline, collect_until)
+                left = limit - time.monotonic()
+                if left <= 0:
+                    break
+                done, pending = wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+                for f in done:
+                    try:
+                        r = f.result()
+                    except Exception:
+                        r = None
+                    if r is not None:
+                        results.append(r)
+                if len(results) >= max(1, first_k):
+                    break
+                if results and collect_until is None:
+                    collect_until = time.monotonic() + TimeVerifier.COLLECT_WINDOW
+
+            if not results:
+                return None
+            return statistics.median(results[:max(1, first_k)])
+        finally:
+            # yavaş sunucular kendi soket zaman aşımlarıyla biter; beklenmez
+            pool.shutdown(wait=False)
+
+    @staticmethod
+    def get_network_time(timeout=2, servers=None, first_k: int = 1):
+        """NTP sunucularından güncel zamanı dener."""
+        ep = TimeVerifier.get_network_epoch(timeout=timeout, servers=servers, first_k=first_k)
+        return datetime.fromtimestamp(int(ep)) if ep is not None else None
 
     @staticmethod
     def get_current_time():
@@ -53,7 +123,7 @@ class TrustedTimeStore:
         (winreg.HKEY_CURRENT_USER,  r"Software\Classes\.htsm"),
         (winreg.HKEY_CURRENT_USER,  r"Software\Microsoft\Windows\CurrentVersion\Explorer\Advanced"),
         (winreg.HKEY_CURRENT_USER,  r"Software\Microsoft\Windows\CurrentVersion\Run"),
-    ]
+    ] if winreg is not None else []
 
     @staticmethod
     def _k(seed: str) -> bytes:
@@ -178,8 +248,15 @@ class TrustedTimeGuard:
     - Sanal saat: trusted_start + (perf_counter delta)
     - Sistem saati geri alınırsa tespit eder ve lisansı kilitler
     - EK: Registry durumunu RAM'de checksum ile izler (geri yükleme/silme tespiti)
+    - bootstrap_async(): NTP arka planda; o sürede now() geçici saat verir
+      (max(sistem saati, registry)). Kesin zaman gereken yer ensure_ready() ile bekler
+      (LicenseManager.require_valid_or_exit: kritik işlemler geçici saatle doğrulanmaz).
     """
     _initialized = False
+    _provisional = False
+    _bootstrap_thread = None
+    _bootstrap_error = None
+    _ready = threading.Event()
     _seed = ""
     _trusted_start_epoch = 0
     _perf_start = 0.0
@@ -195,6 +272,8 @@ class TrustedTimeGuard:
     MAX_BACKWARD_SECONDS = 60         # 60 sn'den fazla geri -> manipülasyon
     PERSIST_EVERY_SECONDS = 10 * 60   # 10 dakikada bir registry tazele
     NTP_RETRY_MIN_SECONDS = 30 * 60   # 30 dakikada bir NTP dene (online ise)
+    NTP_TIMEOUT = 2                   # sunucu başına (sorgular eşzamanlı)
+    NTP_FIRST_K = 2                   # ilk 2 geçerli yanıtın medyanı
 
     @staticmethod
     def _is_online() -> bool:
@@ -211,20 +290,103 @@ class TrustedTimeGuard:
         except Exception:
             TrustedTimeGuard._mem_digest = ""
 
+    @staticmethod
+    def _init_seed() -> None:
+        from security.security import LicenseManager
+        if not TrustedTimeGuard._seed:
+            fp = LicenseManager.device_fingerprint()
+            TrustedTimeGuard._seed = hashlib.sha256(("HTSMercek|" + fp).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def bootstrap_async(require_online: bool = True) -> None:
+        """
+        Açılışta çağır: NTP sorgusu arka planda çalışır, UI beklemeden yüklenir.
+        O sürede now() geçici saat döndürür (sistem saati ile registry'deki en iyi değerin büyüğü);
+        sonuç/hata ensure_ready() / bootstrap_error() ile alınır.
+        """
+        if TrustedTimeGuard._initialized or TrustedTimeGuard.is_pending():
+            return
+
+        TrustedTimeGuard._bootstrap_error = None
+        TrustedTimeGuard._ready.clear()
+        try:
+            TrustedTimeGuard._init_seed()
+            now_epoch = int(time.time())
+            stored = TrustedTimeStore.read_best(epoch_floor=0, seed=TrustedTimeGuard._seed)
+            if stored is not None and stored > now_epoch:
+                now_epoch = stored
+            TrustedTimeGuard._trusted_start_epoch = now_epoch
+            TrustedTimeGuard._perf_start = time.perf_counter()
+            TrustedTimeGuard._provisional = True
+        except Exception as e:
+            print(f"⚠️ [TrustedTimeGuard.bootstrap_async] Geçici saat kurulamadı: {e}")
+
+        def _run():
+            try:
+                TrustedTimeGuard._bootstrap_sync(require_online)
+            except Exception as e:
+                TrustedTimeGuard._bootstrap_error = e
+            finally:
+                TrustedTimeGuard._provisional = False
+                TrustedTimeGuard._ready.set()
+
+        t = threading.Thread(target=_run, name="HTSMercekTimeBootstrap", daemon=True)
+        TrustedTimeGuard._bootstrap_thread = t
+        t.start()
+
+    @staticmethod
+    def is_pending() -> bool:
+        t = TrustedTimeGuard._bootstrap_thread
+        return t is not None and t.is_alive() and not TrustedTimeGuard._ready.is_set()
+
+    @staticmethod
+    def wait_ready(timeout: float | None = None) -> bool:
+        """Arka plan bootstrap'ı bitti mi (hiç başlatılmadıysa hemen True)."""
+        if TrustedTimeGuard._bootstrap_thread is None:
+            return True
+        return TrustedTimeGuard._ready.wait(timeout)
+
+    @staticmethod
+    def is_trusted() -> bool:
+        """NTP/registry ile kesinleşmiş saat mi (geçici saat veya bootstrap öncesi -> False)."""
+        return TrustedTimeGuard._initialized
+
+    @staticmethod
+    def bootstrap_error():
+        return TrustedTimeGuard._bootstrap_error
+
+    @staticmethod
+    def ensure_ready(timeout: float | None = None) -> None:
+        """Kesin zaman gereken işlemden önce: bootstrap'ı bekler, hata varsa yükseltir (süre aşımı: TimeoutError)."""
+        if not TrustedTimeGuard.wait_ready(timeout):
+            raise TimeoutError("Güvenilir zaman henüz doğrulanamadı (NTP yanıtı bekleniyor). Lütfen biraz sonra tekrar deneyin.")
+        if TrustedTimeGuard._bootstrap_error is not None:
+            raise TrustedTimeGuard._bootstrap_error
+
     @staticmethod
     def bootstrap(require_online: bool = True) -> None:
         """
         Program açılırken çağır: NTP al, registry yaz, sanal saati başlat.
         require_online=True ise NTP alamazsa uygulamayı açma mantığı.
+        bootstrap_async() çalışıyorsa onun sonucunu bekler.
         """
-        from security.security import LicenseManager
+        if TrustedTimeGuard._initialized:
+            return
+        if TrustedTimeGuard._bootstrap_thread is not None and threading.current_thread() is not TrustedTimeGuard._bootstrap_thread:
+            TrustedTimeGuard.ensure_ready()
+            return
+        TrustedTimeGuard._bootstrap_sync(require_online)
+
+    @staticmethod
+    def _bootstrap_sync(require_online: bool) -> None:
         if TrustedTimeGuard._initialized:
             return
 
-        fp = LicenseManager.device_fingerprint()
-        TrustedTimeGuard._seed = hashlib.sha256(("HTSMercek|" + fp).encode("utf-8")).hexdigest()
+        TrustedTimeGuard._init_seed()
 
-        net_time = TimeVerifier.get_network_time(timeout=2)
+        net_time = TimeVerifier.get_network_time(
+            timeout=TrustedTimeGuard.NTP_TIMEOUT, first_k=TrustedTimeGuard.NTP_FIRST_K
+        )
         sys_dt = datetime.now()
         if net_time is not None:
             diff = abs((sys_dt - net_time).total_seconds())
@@ -258,7 +420,7 @@ class TrustedTimeGuard:
 
     @staticmethod
     def now() -> datetime:
-        if not TrustedTimeGuard._initialized:
+        if not TrustedTimeGuard._initialized and not TrustedTimeGuard._provisional:
             return datetime.now()
         delta = time.perf_counter() - TrustedTimeGuard._perf_start
         cur_epoch = TrustedTimeGuard._trusted_start_epoch + int(delta)
@@ -320,7 +482,7 @@ class TrustedTimeGuard:
         if TrustedTimeGuard._is_online():
             if (time.perf_counter() - TrustedTimeGuard._last_ntp_try) >= TrustedTimeGuard.NTP_RETRY_MIN_SECONDS:
                 TrustedTimeGuard._last_ntp_try = time.perf_counter()
-                ntp = TimeVerifier.get_network_time(timeout=2)
+                ntp = TimeVerifier.get_network_time(timeout=TrustedTimeGuard.NTP_TIMEOUT)
                 if ntp:
                     ntp_epoch = int(ntp.timestamp())
                     if ntp_epoch > (virtual_epoch + 30):
@@ -1,43 +1,57 @@
-import copy
-import hashlib
 import html
 import io
 import json
 import math
 import os
 import re
-import shutil
 import socket
 import sqlite3
 import sys
 import tempfile
 import threading
 import time
-from collections import defaultdict, Counter, OrderedDict
+from collections import defaultdict, Counter
 from datetime import datetime, date, timedelta
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
-import folium
-import unicodedata
 from PyQt6.QtCore import Qt, QSize, QPoint, QEvent, QRect, QObject, QTimer, QRectF, QThread, pyqtSignal, QDateTime, \
-    QSortFilterProxyModel, QModelIndex, QDate, QAbstractTableModel, QUrl
+    QAbstractProxyModel, QModelIndex, QDate, QAbstractTableModel, QUrl
 from PyQt6.QtGui import QFont, QPalette, QColor, QAction, QPixmap, QPainter, QMovie, QRadialGradient, QTextDocument, \
-    QImage, QTextCharFormat
-from PyQt6.QtWebEngineWidgets import QWebEngineView
+    QImage
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QFileDialog, QStyledItemDelegate, QWidget, QMenu, \
     QComboBox, QMainWindow, QSizePolicy, QFrame, QGraphicsDropShadowEffect, QApplication, QToolTip, QProgressBar, \
     QStackedLayout, QTableWidget, QTableWidgetItem, QHeaderView, QHBoxLayout, QStyle, QStyleOptionViewItem, \
     QStackedWidget, QLineEdit, QAbstractItemView, QSplitter, QDateTimeEdit, QSpinBox, QDoubleSpinBox, QCheckBox, \
-    QButtonGroup, QTableView, QTabWidget, QGridLayout, QGroupBox, QMessageBox, QListWidget, QSlider, QScrollArea, \
-    QTextEdit, QColorDialog, QListWidgetItem
-from branca.element import MacroElement
-from jinja2 import Template
+    QButtonGroup, QTableView, QTabWidget, QGridLayout, QGroupBox, QMessageBox, QListWidget, QSlider, \
+    QScrollArea
 
+from analysis.contacts import ContactAnalysis
+from analysis.events import EventWindowAnalysis
+from analysis.location import LocationAnalysis
+from analysis.stalking import StalkingAnalysis
 from security.security import LicenseManager
 from ui.dialog import ModernDialog
 from ui.mixins import WatermarkDialogMixin
-from utils.constants import HEADER_ALIASES, TABLE_COLUMNS
-from utils.helpers import _extract_table_headers_rows, _apply_hidden_cols_to_table_html, _apply_fmt_to_table_html
+from utils.constants import TABLE_COLUMNS
+from utils.batch_delete import BatchDeleter
+from utils.chart_aggregate import ChartAggregator
+from utils.db import AnalysisUtils, DB, DatabaseManager, RAW_HTS_TABLES, create_raw_hts_schema, open_project_shard, \
+    run_all_migrations, setup_database
+from utils.db_maintenance import DbMaintenance
+from utils.db_profile import DbProfile
+from utils.evidence_store import EvidenceStore
+from utils.hts_fts import HtsFullText
+from utils.hts_import import HtsImporter, _detect_target_gsm, _norm_header, detect_hts_role
+from utils.image_trim import trim_pixmap_vertical
+from utils.project_shards import ProjectShards
+from utils.report_cache import ReportRenderCache
+from utils.search_index import RowSearchIndex
+from utils.sort_keys import ColumnKeys
+from utils.sql_trace import SqlTrace
+from utils.tip_kodu import TipKodu
+from utils.trace_spans import Tracer
+from utils.ui_watchdog import UiWatchdog
+from utils.report_table import table_struct_from_html, table_struct_from_rows, table_struct_dumps
 
 APP_DIR = os.path.dirname(os.path.abspath("file")) if not getattr(sys, "frozen", False) else sys._MEIPASS
 
@@ -87,6 +101,7 @@ class LicenseGateDialog(QDialog):
             target_path = LicenseManager.license_path()
             with open(target_path, "w", encoding="utf-8") as f:
                 json.dump(d, f, ensure_ascii=False, indent=2)
+            LicenseManager.invalidate_cache()
 
             # kaynak dosyayı sil (APPDATA'daki dosyayı ASLA silme)
             try:
@@ -110,7 +125,7 @@ class NoTooltipDelegate(QStyledItemDelegate):
         return False
 
 
-def _enable_measure_and_balloons(m: folium.Map) -> None:
+def _enable_measure_and_balloons(m: "folium.Map") -> None:
     """
     Folium haritasına:
     - Mesafe/Alan ölçme aracı (MeasureControl)
@@ -786,130 +801,6 @@ def apply_light_combobox_popup(combo: QComboBox):
     combo.setFont(QFont("Segoe UI", 10, QFont.Weight.Normal))
 
 
-class DraggableConnector(MacroElement):
-    """
-    Baloncuk sürüklenince ve harita zoom/pan olunca,
-    sabit raptiye ile baloncuk arasındaki çizgiyi sürekli günceller.
-    """
-    def __init__(self, fmap, label_marker, connector_line, fixed_lat, fixed_lon):
-        super().__init__()
-        self._name = "DraggableConnector"
-        self.fmap = fmap
-        self.label_marker = label_marker
-        self.connector_line = connector_line
-        self.fixed_lat = fixed_lat
-        self.fixed_lon = fixed_lon
-
-        self._template = Template(u"""
-        {% macro script(this, kwargs) %}
-            var map = {{ this.fmap.get_name() }};
-
-            map.whenReady(function () {
-                var label = {{ this.label_marker.get_name() }};
-                var line  = {{ this.connector_line.get_name() }};
-                var fixed = L.latLng({{ this.fixed_lat }}, {{ this.fixed_lon }});
-
-                // Drag'i garantiye al (DivIcon'da bazen otomatik açılmıyor)
-                if (label.dragging) { label.dragging.enable(); }
-
-                function syncLine() {
-                    if (!label || !line) return;
-                    var p = label.getLatLng();
-                    line.setLatLngs([fixed, p]);
-                }
-
-                // İlk yükleme sırasında baloncuk sonradan kayarsa yakala
-                syncLine();
-                var c = 0;
-                var t = setInterval(function(){
-                    syncLine();
-                    c++;
-                    if (c >= 10) clearInterval(t);  // ~1 saniye
-                }, 100);
-
-                // Drag ile lastik çizgi
-                label.on('drag', syncLine);
-                label.on('dragend', syncLine);
-
-                // Zoom/pan sonrası da doğru kalsın
-                map.on('zoomend moveend', syncLine);
-            });
-        {% endmacro %}
-        """)
-
-
-class EvidenceWebEngineView(QWebEngineView):
-    """Sağ tıklandığında 'Rapora Ekle' menüsü açan özel Web Görüntüleyici."""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.customContextMenuRequested.connect(self.show_context_menu)
-
-    def show_context_menu(self, pos):
-        menu = QMenu(self)
-        menu = apply_menu_theme(QMenu(self))
-        action_add = QAction("📸 Görüntüyü Delil Olarak Rapora Ekle", self)
-        action_add.triggered.connect(self.capture_evidence)
-        menu.addAction(action_add)
-
-        menu.exec(self.mapToGlobal(pos))
-
-    def capture_evidence(self):
-        if not LicenseManager.require_valid_or_exit(self, "Delil ekleme"):
-            return
-        """
-        Akıllı Yakalama: 
-        - Harita/Detay pencerelerinde -> TÜM PENCEREYİ (Başlık dahil) alır.
-        - Grafik pencerelerinde -> SADECE GRAFİĞİ alır.
-        """
-
-        target_widget = self
-        window_title = "Görsel Analiz"
-
-        curr = self
-        while curr:
-            if isinstance(curr, QDialog) or isinstance(curr, QMainWindow):
-                window_title = curr.windowTitle()
-                c_name = curr.__class__.__name__
-
-                if c_name in [
-                    "MapPreviewDialog", "LocationDetailDialog",
-                    "MapMultiPointDialog", "ProfileMapDialog",
-                    "StalkingAnalysisDialog", "DailyRouteDialog",
-                    "ImeiDetailDialog", "ReciprocalDetailDialog"
-                ]:
-                    target_widget = curr
-
-                break
-            curr = curr.parent()
-
-        pixmap = target_widget.grab()
-
-        # ✅ DailyRouteDialog: üst kontrol şeridini (top_frame) kırp, info kartı + harita kalsın
-        try:
-            if (hasattr(target_widget, "__class__") and target_widget.__class__.__name__ == "DailyRouteDialog"
-                    and hasattr(target_widget, "top_frame") and target_widget.top_frame is not None):
-                g = target_widget.top_frame.geometry()
-                cut_y = max(0, g.bottom() + 1)
-                if 0 < cut_y < pixmap.height():
-                    pixmap = pixmap.copy(0, cut_y, pixmap.width(), pixmap.height() - cut_y)
-        except Exception:
-            pass
-
-        # İşlemeye gönder
-        self._on_pixmap_ready(pixmap, window_title)
-
-    def _on_pixmap_ready(self, pixmap, title):
-        """Ekran görüntüsü alındığında çalışır, AnalysisCenter'a gönderir."""
-        parent = self.parent()
-        while parent:
-            if hasattr(parent, 'main') and hasattr(parent.main.page_analysis, 'add_web_view_evidence'):
-                parent.main.page_analysis.add_web_view_evidence(pixmap, title)
-                return
-            parent = parent.parent()
-            if parent is None:
-                 break
-
 class WatermarkBackground(QWidget):
     """
     Tüm uygulamanın üstünde tek bir global watermark logo.
@@ -961,198 +852,6 @@ class WatermarkBackground(QWidget):
         painter.end()
 
 
-class AnalysisUtils:
-    """Tüm sınıfların ortak kullandığı ağır analiz işlemleri."""
-
-    @staticmethod
-    def recalculate_common_analysis_core(project_id):
-        try:
-            with DB() as conn:
-                pid = project_id
-                cur = conn.cursor()
-
-                cur.execute("DELETE FROM hts_ortak_imei WHERE ProjeID=?", (pid,))
-                cur.execute("DELETE FROM hts_ortak_isim WHERE ProjeID=?", (pid,))
-                cur.execute("DELETE FROM hts_ortak_tc   WHERE ProjeID=?", (pid,))
-                conn.commit()
-
-                has_any = (
-                    cur.execute("SELECT 1 FROM hts_gsm   WHERE ProjeID=? LIMIT 1", (pid,)).fetchone()
-                    or cur.execute("SELECT 1 FROM hts_gprs  WHERE ProjeID=? LIMIT 1", (pid,)).fetchone()
-                    or cur.execute("SELECT 1 FROM hts_wap   WHERE ProjeID=? LIMIT 1", (pid,)).fetchone()
-                    or cur.execute("SELECT 1 FROM hts_rehber WHERE ProjeID=? LIMIT 1", (pid,)).fetchone()
-                )
-                if not has_any:
-                    print("ℹ️ Ortak Analiz (Core): Projede veri kalmadığı için hesaplama pas geçildi.")
-                    return
-
-                common_imei_sql = """
-                    INSERT INTO hts_ortak_imei (ProjeID, IMEI, KullananSayisi, Numaralar, ToplamKullanim)
-                    SELECT ?, IMEI,
-                           COUNT(DISTINCT CleanNum) AS KullananSayisi,
-                           GROUP_CONCAT(DISTINCT CleanNum) AS Numaralar,
-                           COUNT(*) AS ToplamKullanim
-                    FROM (
-                        SELECT IMEI,
-                               substr(replace(replace(replace(NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) AS CleanNum
-                        FROM hts_gsm
-                        WHERE ProjeID=? AND LENGTH(IMEI) > 10
-
-                        UNION ALL
-
-                        SELECT IMEI,
-                               substr(replace(replace(replace(NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) AS CleanNum
-                        FROM hts_gprs
-                        WHERE ProjeID=? AND LENGTH(IMEI) > 10
-
-                        UNION ALL
-
-                        SELECT IMEI,
-                               substr(replace(replace(replace(NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) AS CleanNum
-                        FROM hts_wap
-                        WHERE ProjeID=? AND LENGTH(IMEI) > 10
-                    )
-                    GROUP BY IMEI
-                    HAVING COUNT(DISTINCT CleanNum) > 1
-                """
-                cur.execute(common_imei_sql, (pid, pid, pid, pid))
-
-                tc_valid_expr = """
-                    TRIM(TC) GLOB '[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]'
-                """
-
-                cur.execute(f"""
-                    INSERT INTO hts_ortak_isim (ProjeID, AdSoyad, HatSayisi, Numaralar)
-                    SELECT ?, Isim,
-                           COUNT(DISTINCT KarsiNo) AS HatSayisi,
-                           GROUP_CONCAT(DISTINCT KarsiNo) AS Numaralar
-                    FROM hts_rehber
-                    WHERE ProjeID=?
-                      AND LENGTH(Isim) > 1
-                      AND TC IS NOT NULL
-                      AND {tc_valid_expr}
-                    GROUP BY Isim
-                    HAVING COUNT(DISTINCT KarsiNo) > 1
-                """, (pid, pid))
-
-                rows_tc = cur.execute(f"""
-                    SELECT r.TC,
-                           COUNT(DISTINCT r.KarsiNo) AS HatSayisi,
-                           GROUP_CONCAT(DISTINCT r.KarsiNo) AS Numaralar,
-                           (SELECT Isim
-                            FROM hts_rehber r2
-                            WHERE r2.ProjeID=? AND r2.TC = r.TC
-                              AND r2.TC IS NOT NULL
-                              AND {tc_valid_expr}
-                            LIMIT 1) AS AnyName
-                    FROM hts_rehber r
-                    WHERE r.ProjeID=?
-                      AND r.TC IS NOT NULL
-                      AND {tc_valid_expr}
-                    GROUP BY r.TC
-                    HAVING COUNT(DISTINCT r.KarsiNo) > 1
-                    ORDER BY HatSayisi DESC
-                """, (pid, pid)).fetchall()
-
-                data_tc = []
-                for tc_val, count, nums, any_name in rows_tc:
-                    display = f"{tc_val} - {any_name}" if any_name else str(tc_val)
-                    data_tc.append([pid, display, count, nums])
-
-                if data_tc:
-                    cur.executemany(
-                        "INSERT INTO hts_ortak_tc (ProjeID, TC, HatSayisi, Numaralar) VALUES (?,?,?,?)",
-                        data_tc
-                    )
-
-                conn.commit()
-                print("✅ Ortak Analiz (Core) başarıyla tamamlandı.")
-
-        except Exception as e:
-            print(f"❌ [recalculate_common_analysis_core] Kritik Hata: {e}")
-
-    @staticmethod
-    def delete_gsm_records_core(project_id, gsm_number):
-        """
-        Belirtilen GSM'e ait tüm verileri siler.
-        NOT: ozel_konumlar GSM silmede KESİNLİKLE silinmez (sadece proje silinince silinsin isteği).
-        """
-        try:
-            tabs_gsm = [
-                "hts_dosyalari",
-                "hts_abone", "hts_gsm",
-                "hts_sms", "hts_sabit", "hts_gprs", "hts_wap", "hts_sth",
-                "hts_uluslararasi", "hts_ozet", "hts_ozet_iletisim",
-                "hts_ozet_baz", "hts_ozet_imei", "hts_rehber", "hts_tum_baz",
-            ]
-
-            with DB() as conn:
-                for t in tabs_gsm:
-                    try:
-                        conn.execute(f"DELETE FROM {t} WHERE ProjeID=? AND GSMNo=?", (project_id, gsm_number))
-                    except Exception as e:
-                        print(f"⚠️ [delete_gsm_records_core] Tablo '{t}' temizlenirken hata: {e}")
-
-                conn.commit()
-            return True
-        except Exception as e:
-            print(f"❌ [delete_gsm_records_core] Genel Hata: {e}")
-            return False
-
-    @staticmethod
-    def perform_maintenance():
-        """
-        Veritabanını bakım modunda sıkıştırır.
-        WAL modunda güvenli bakım:
-        1) CHECKPOINT (WAL -> ana db)
-        2) VACUUM
-        """
-        try:
-            mgr = DatabaseManager()
-            lock = mgr.lock()
-            lock.acquire()
-            try:
-                conn = mgr.get_connection()
-                cur = conn.cursor()
-
-                try:
-                    cur.execute("PRAGMA wal_checkpoint(TRUNCATE);")
-                except Exception:
-                    cur.execute("PRAGMA wal_checkpoint(FULL);")
-
-                cur.execute("VACUUM;")
-                # !!! ÖNEMLİ: Burası singleton bağlantı. KAPATMAYIN.
-                # conn.close()
-
-                return True
-            finally:
-                lock.release()
-
-        except Exception as e:
-            print(f"❌ [perform_maintenance] Bakım Hatası: {e}")
-            return False
-
-    @staticmethod
-    def project_has_any_gsm(project_id: int) -> bool:
-        if not project_id:
-            return False
-
-        try:
-            with DB() as conn:
-                cur = conn.cursor()
-                r = cur.execute("SELECT 1 FROM hts_dosyalari WHERE ProjeID=? LIMIT 1", (project_id,)).fetchone()
-                if r:
-                    return True
-                r = cur.execute("SELECT 1 FROM hts_ozet WHERE ProjeID=? LIMIT 1", (project_id,)).fetchone()
-                if r:
-                    return True
-                r = cur.execute("SELECT 1 FROM hts_gsm WHERE ProjeID=? LIMIT 1", (project_id,)).fetchone()
-                return bool(r)
-        except Exception as e:
-            print(f"project_has_any_gsm hata: {e}")
-            return False
-
-
 class LocalTileServer:
     """
     .mbtiles dosyasını okuyup yerel ağda (localhost) harita karoları sunan sunucu.
@@ -1521,8 +1220,40 @@ class LoadingOverlay(QWidget):
         self.pbar.hide()
 
         layout.addWidget(self.pbar, 0, Qt.AlignmentFlag.AlignCenter)
+
+        # ✅ iptal edilebilir işler için (set_cancel ile görünür olur)
+        self._cancel_cb = None
+        self.btn_cancel = QPushButton("İptal")
+        self.btn_cancel.setFixedWidth(140)
+        self.btn_cancel.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_cancel.setStyleSheet("""
+            QPushButton {
+                color: white; font-weight: bold; padding: 6px;
+                background-color: rgba(192, 57, 43, 200);
+                border: 1px solid rgba(255, 255, 255, 150); border-radius: 10px;
+            }
+            QPushButton:hover { background-color: rgba(231, 76, 60, 220); }
+            QPushButton:disabled { background-color: rgba(120, 120, 120, 180); }
+        """)
+        self.btn_cancel.clicked.connect(self._on_cancel)
+        self.btn_cancel.hide()
+        layout.addWidget(self.btn_cancel, 0, Qt.AlignmentFlag.AlignCenter)
+
         main_layout.addWidget(container)
 
+    def set_cancel(self, cb=None):
+        """cb verilirse İptal düğmesi gösterilir; tıklanınca cb() çağrılır."""
+        self._cancel_cb = cb
+        self.btn_cancel.setEnabled(True)
+        self.btn_cancel.setVisible(cb is not None)
+
+    def _on_cancel(self):
+        cb = self._cancel_cb
+        self.btn_cancel.setEnabled(False)
+        self.text_label.setText("İptal ediliyor...")
+        if callable(cb):
+            cb()
+
     def update_animation_frame(self):
         """GIF'in o anki karesini alır, pürüzsüzleştirerek yeniden boyutlandırır."""
         pixmap = self.movie.currentPixmap()
@@ -1558,6 +1289,7 @@ class LoadingOverlay(QWidget):
         self.text_label.setText(text)
         self.pbar.setValue(0)
         self.pbar.hide()
+        self.set_cancel(None)
 
         if self.parent():
             self.resize(self.parent().size())
@@ -1579,6 +1311,7 @@ class LoadingOverlay(QWidget):
     def stop(self):
         if self.movie:
             self.movie.stop()
+        self.set_cancel(None)
         self.hide()
 
 
@@ -1828,62 +1561,6 @@ class NoElideDelegate(QStyledItemDelegate):
         super().paint(painter, opt, index)
 
 
-def _norm_header(h):
-    """Başlıkları standart hale getirir (Türkçe, Boşluk, Kare Karakter Temizliği)."""
-    if h is None: return ""
-    s = str(h).strip().upper()
-    s = s.replace("_X000D_", "").replace("\n", "").replace("\r", "")
-    s = s.replace("İ", "I").replace("Ş", "S").replace("Ç", "C").replace("Ö", "O").replace("Ü", "U").replace("Ğ", "G")
-    s = re.sub(r'[^A-Z0-9]', '', s)
-    return s
-
-
-def _normalize_msisdn(val: object) -> str:
-    digits = re.sub(r"\D", "", "" if val is None else str(val))
-    if len(digits) >= 10:
-        return digits[-10:]
-    return digits
-
-
-def _extract_gsm_from_filename(dosya_yolu):
-    filename = os.path.basename(dosya_yolu)
-
-    match = re.search(r"(5\d{9})", filename)
-    if match:
-        return _normalize_msisdn(match.group(1))
-
-    match_gen = re.search(r"(\d{10,})", filename)
-    return _normalize_msisdn(match_gen.group(1)) if match_gen else "BILINMIYOR"
-
-
-def _detect_target_gsm(file_path):
-    from openpyxl import load_workbook
-    found_gsm = None
-    try:
-        wb = load_workbook(file_path, read_only=True, data_only=True)
-        sheet = wb.active
-
-        for row in sheet.iter_rows(min_row=1, max_row=100, values_only=True):
-            if not row or len(row) < 2:
-                continue
-
-            col_a = str(row[0]).upper().replace("İ", "I") if row[0] else ""
-
-            if "SORGULANAN" in col_a and "NO" in col_a:
-                found_gsm = _normalize_msisdn(row[1])
-                if found_gsm and found_gsm != "BILINMIYOR" and len(found_gsm) >= 10:
-                    break
-
-        wb.close()
-    except Exception as e:
-        print(f"Excel Okuma Hatası: {e}")
-
-    if not found_gsm or found_gsm == "BILINMIYOR":
-        return _extract_gsm_from_filename(file_path)
-
-    return found_gsm
-
-
 def format_size(num_bytes: int) -> str:
     """Byte cinsinden dosya boyutunu okunur forma çevirir."""
     try:
@@ -1898,1165 +1575,505 @@ def format_size(num_bytes: int) -> str:
     return f"{n:.1f} PB"
 
 
-def detect_hts_role(path: str) -> tuple[str, str]:
-    from openpyxl import load_workbook
-    wb = load_workbook(path, read_only=True, data_only=True)
-    sheet = wb.active
+class DbMaintenanceWorker(QThread):
+    """Bakımı arka planda yürütür: checkpoint + adım adım incremental_vacuum (veya tek seferlik dönüştürme)."""
+    progress = pyqtSignal(int)
+    finished_ok = pyqtSignal(int)
+    error = pyqtSignal(str)
 
-    def norm(x):
-        if x is None:
-            return ""
-        s = str(x).strip().upper()
-        s = s.replace("İ","I").replace("Ş","S").replace("Ç","C") \
-             .replace("Ö","O").replace("Ü","U").replace("Ğ","G")
-        return s
-
-    def norm_space(s: str) -> str:
-        s = norm(s)
-        s = re.sub(r"\s+", " ", s).strip()
-        return s
-
-    sorgulanan_no = None
-
-    for row in sheet.iter_rows(min_row=1, max_row=200, values_only=True):
-        if not row or len(row) < 2:
-            continue
-        a = norm(row[0])
-        if "SORGULANAN" in a and "NO" in a:
-            raw = str(row[1]) if row[1] is not None else ""
-            clean = re.sub(r"\D", "", raw)
-            if len(clean) >= 10:
-                sorgulanan_no = clean
-                break
+    def __init__(self, convert: bool = False):
+        super().__init__()
+        self.convert = bool(convert)
+        self.is_running = True
 
-    if not sorgulanan_no:
-        wb.close()
-        raise Exception("Rol tespiti yapılamadı: 'Sorgulanan No:' bulunamadı.")
-
-    header_row_idx = None
-    for i, row in enumerate(sheet.iter_rows(min_row=1, max_row=400, values_only=True), start=1):
-        joined = " ".join([norm(c) for c in row if c is not None])
-        if "GSM GORUSME SORGU SONUCLARI" in joined:
-            header_row_idx = i
-            break
-
-    if not header_row_idx:
-        wb.close()
-        raise Exception("Rol tespiti yapılamadı: 'GSM GÖRÜŞME SORGU SONUÇLARI' başlığı bulunamadı.")
-
-    idx_numara = idx_diger = None
-    real_header_idx = None
-    for i, row in enumerate(sheet.iter_rows(min_row=header_row_idx, max_row=header_row_idx+5, values_only=True), start=header_row_idx):
-        cells = [norm(c) for c in row]
-        if any(("NUMARA" == c or "NUMARA" in c) for c in cells) and any("DIGER" in c for c in cells):
-            real_header_idx = i
-            for j, c in enumerate(cells):
-                if c == "NUMARA":
-                    idx_numara = j
-                if "DIGER" in c and "NUMARA" in c:
-                    idx_diger = j
-            break
-
-    if real_header_idx is None or idx_numara is None or idx_diger is None:
-        wb.close()
-        raise Exception("Rol tespiti yapılamadı: NUMARA / DİĞER NUMARA sütunları bulunamadı.")
-
-    first_data_row = None
-    for row in sheet.iter_rows(min_row=real_header_idx+1, max_row=real_header_idx+50, values_only=True):
-        if not row:
-            continue
-        v_num = re.sub(r"\D", "", str(row[idx_numara])) if row[idx_numara] else ""
-        v_dig = re.sub(r"\D", "", str(row[idx_diger])) if row[idx_diger] else ""
-        if len(v_num) >= 10 or len(v_dig) >= 10:
-            first_data_row = row
-            break
-
-    if not first_data_row:
-        role = None
-
-        hedef_pat = norm_space("İletişimin Tespiti (Arama - Aranma - Mesaj Atma - Mesaj Alma)")
-        karsi_pat = norm_space("İletişimin Tespiti (Aranma - Arama - Mesaj Alma - Mesaj Atma)")
-
-        for row in sheet.iter_rows(min_row=1, max_row=120, values_only=True):
-            if not row:
-                continue
+    def stop(self):
+        self.is_running = False
 
-            a0 = str(row[0]) if len(row) > 0 and row[0] is not None else ""
-            a1 = str(row[1]) if len(row) > 1 and row[1] is not None else ""
-            raw_join = f"{a0} {a1}".strip()
+    def run(self):
+        try:
+            mgr = DatabaseManager()
+            DbMaintenance.checkpoint(mgr, truncate=True)
 
-            n = norm_space(raw_join)
-            if "TESPIT" in n:
-                if hedef_pat in n:
-                    role = "HEDEF"
-                    break
-                if karsi_pat in n:
-                    role = "KARSI"
-                    break
+            if self.convert:
+                if not DbMaintenance.convert_to_incremental(mgr):
+                    self.error.emit("Artımlı sıkıştırma moduna geçilemedi.")
+                    return
+                self.progress.emit(100)
+                self.finished_ok.emit(0)
+                return
 
-        wb.close()
+            def _prog(done, total):
+                if total:
+                    self.progress.emit(int(100 * done / total))
 
-        if not role:
-            role = "HEDEF"
+            freed = DbMaintenance.reclaim(mgr, progress_cb=_prog, should_stop=lambda: not self.is_running)
+            self.progress.emit(100)
+            self.finished_ok.emit(int(freed or 0))
 
-        return role, sorgulanan_no
+        except Exception as e:
+            print(f"❌ [DbMaintenanceWorker] {e}")
+            self.error.emit(str(e))
 
-    wb.close()
 
-    numara1 = re.sub(r"\D", "", str(first_data_row[idx_numara])) if first_data_row[idx_numara] else ""
-    diger1  = re.sub(r"\D", "", str(first_data_row[idx_diger])) if first_data_row[idx_diger] else ""
+class RecordDeleteWorker(QThread):
+    """GSM / proje silmeyi arka planda, sınırlı rowid gruplarıyla yürütür (ilerleme + iptal)."""
+    progress = pyqtSignal(int)
+    status = pyqtSignal(str)
+    finished_ok = pyqtSignal(int, bool)   # silinen satır, iptal edildi mi
+    error = pyqtSignal(str)
 
-    if numara1 == sorgulanan_no:
-        return "HEDEF", sorgulanan_no
-    if diger1 == sorgulanan_no:
-        return "KARSI", sorgulanan_no
+    def __init__(self, targets, project_id=None):
+        super().__init__()
+        self.targets = list(targets)
+        self.project_id = project_id
+        self._cancel = False
 
-    return "HEDEF", sorgulanan_no
+    def cancel(self):
+        self._cancel = True
 
+    def run(self):
+        # proje dosyası yerleşiminde: silme bitene kadar bu projenin dosyası bağlı kalır
+        if self.project_id:
+            ProjectShards.pin(self.project_id)
+        try:
+            if self.project_id:
+                open_project_shard(self.project_id)
 
-def ensure_rapor_taslagi_has_id(conn: sqlite3.Connection):
-    """rapor_taslagi tablosunda 'id' yoksa ekler/düzeltir."""
-    c = conn.cursor()
-    tbl = c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='rapor_taslagi'").fetchone()
-    if not tbl: return
+            last = {"pct": -1}
 
-    cols_info = c.execute("PRAGMA table_info(rapor_taslagi)").fetchall()
-    col_names = [r[1] for r in cols_info]
-    if "id" in col_names: return
+            def _prog(done, total, table):
+                pct = int(100 * done / total) if total else 100
+                if pct != last["pct"]:
+                    last["pct"] = pct
+                    self.progress.emit(pct)
+                    self.status.emit(f"Siliniyor... {done:,} / {total:,} kayıt".replace(",", "."))
 
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS rapor_taslagi_new (
-            id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, Baslik TEXT, Icerik TEXT, 
-            Tur TEXT, Tarih TEXT, Sira INTEGER, GenislikYuzde INTEGER DEFAULT 100, YukseklikMm INTEGER,
-            Hizalama TEXT DEFAULT 'center', Aciklama TEXT DEFAULT '', HtmlIcerik TEXT, ImagePath TEXT,
-            FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE
-        )
-    """)
+            try:
+                deleted, cancelled = BatchDeleter.run(
+                    DatabaseManager(), self.targets, progress_cb=_prog, should_stop=lambda: self._cancel
+                )
+            finally:
+                # hata olsa da o ana kadar silinenler önbellekte kalmasın
+                if self.project_id:
+                    ReportRenderCache.invalidate_project(self.project_id)
+            self.finished_ok.emit(int(deleted), bool(cancelled))
 
-    existing = set(col_names)
-    copy_cols = [col for col in [
-        "ProjeID", "GSMNo", "Baslik", "Icerik", "Tur", "Tarih", "Sira",
-        "GenislikYuzde", "YukseklikMm", "Hizalama", "Aciklama",
-        "HtmlIcerik", "BaseHtmlIcerik", "HiddenColsJson", "FmtJson",
-        "ImagePath"
-    ] if col in existing]
+        except Exception as e:
+            print(f"❌ [RecordDeleteWorker] {e}")
+            self.error.emit(str(e))
+        finally:
+            if self.project_id:
+                ProjectShards.unpin(self.project_id)
 
-    if copy_cols:
-        cols_str = ", ".join(copy_cols)
-        c.execute(f"INSERT INTO rapor_taslagi_new ({cols_str}) SELECT {cols_str} FROM rapor_taslagi")
 
-    c.execute("DROP TABLE rapor_taslagi")
-    c.execute("ALTER TABLE rapor_taslagi_new RENAME TO rapor_taslagi")
-    conn.commit()
+def start_record_delete(owner, targets, project_id, title, on_done):
+    """
+    Silme işini arka planda başlatır; overlay'de ilerleme ve İptal düğmesi gösterir.
+    on_done(silinen, iptal) GUI thread'inde çağrılır. owner._delete_worker referansı tutulur.
+    """
+    prev = getattr(owner, "_delete_worker", None)
+    if prev is not None and prev.isRunning():
+        ModernDialog.show_warning(owner, "Uyarı", "Devam eden bir silme işlemi var.")
+        return None
 
+    w = RecordDeleteWorker(targets, project_id)
+    owner._delete_worker = w
+    loader = getattr(owner.main, "loader", None) if hasattr(owner, "main") else None
 
-def ensure_rapor_taslagi_tableprops_columns(conn: sqlite3.Connection):
-    cur = conn.cursor()
-    tbl = cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='rapor_taslagi'").fetchone()
-    if not tbl:
-        return
+    if loader is not None:
+        loader.start(title)
+        loader.set_cancel(w.cancel)
+        w.progress.connect(loader.set_progress)
+        w.status.connect(lambda t: setattr(loader, "text", t))
 
-    cols = [r[1] for r in cur.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
+    def _finish(deleted, cancelled):
+        try:
+            on_done(deleted, cancelled)
+        finally:
+            if loader is not None:
+                loader.stop()
 
-    if "BaseHtmlIcerik" not in cols:
-        cur.execute("ALTER TABLE rapor_taslagi ADD COLUMN BaseHtmlIcerik TEXT")
-    if "HiddenColsJson" not in cols:
-        cur.execute("ALTER TABLE rapor_taslagi ADD COLUMN HiddenColsJson TEXT")
-    if "FmtJson" not in cols:
-        cur.execute("ALTER TABLE rapor_taslagi ADD COLUMN FmtJson TEXT")
+    def _fail(err):
+        if loader is not None:
+            loader.stop()
+        ModernDialog.show_error(owner, "Silme Hatası", str(err))
 
-    conn.commit()
+    w.finished_ok.connect(_finish)
+    w.error.connect(_fail)
+    w.start()
+    return w
 
 
-def ensure_rapor_meta_ekler_columns(conn):
-    cur = conn.cursor()
-    cols = [r[1] for r in cur.execute("PRAGMA table_info(rapor_meta_ekler)").fetchall()]
+class ShardConversionWorker(QThread):
+    """Tek dosya <-> proje dosyaları yerleşim dönüşümü (proje/tablo adımlarıyla)."""
+    progress = pyqtSignal(int)
+    finished_ok = pyqtSignal()
+    error = pyqtSignal(str)
 
-    # Raporda dosya adını gizle
-    if "DosyaAdiGizle" not in cols:
-        cur.execute("ALTER TABLE rapor_meta_ekler ADD COLUMN DosyaAdiGizle INTEGER DEFAULT 0")
+    def __init__(self, to_sharded: bool):
+        super().__init__()
+        self.to_sharded = bool(to_sharded)
 
-    # Görsel genişliği (%)
-    if "GenislikYuzde" not in cols:
-        cur.execute("ALTER TABLE rapor_meta_ekler ADD COLUMN GenislikYuzde INTEGER DEFAULT 100")
+    def run(self):
+        try:
+            mgr = DatabaseManager()
+            with mgr.lock():
+                pids = [r[0] for r in mgr.get_connection().execute("SELECT id FROM projeler ORDER BY id").fetchall()]
 
-    conn.commit()
+            def _prog(done, total):
+                self.progress.emit(int(100 * done / max(1, total)))
 
+            ProjectShards.convert(mgr, self.to_sharded, pids, RAW_HTS_TABLES, create_raw_hts_schema, progress_cb=_prog)
 
-def ensure_hts_dosyalari_meta_columns(conn: sqlite3.Connection):
-    """hts_dosyalari tablosuna meta kolonları ekler."""
-    cols = [r[1] for r in conn.execute("PRAGMA table_info(hts_dosyalari)").fetchall()]
-    for col in ["TalepEdenMakam", "SorguBaslangic", "SorguBitis", "Tespit"]:
-        if col not in cols:
-            conn.execute(f"ALTER TABLE hts_dosyalari ADD COLUMN {col} TEXT")
+            if not self.to_sharded:
+                with DB() as conn:
+                    run_all_migrations(conn)
 
+            DbMaintenance.request_reclaim()
+            self.finished_ok.emit()
 
-def ensure_project_columns(conn: sqlite3.Connection):
-    """projeler tablosuna eksik kolonları ekler."""
-    cols = [r[1] for r in conn.execute("PRAGMA table_info(projeler)").fetchall()]
-    for col in ["suc_tarihi", "gorevlendirme_tarihi", "bilirkisi_adi", "bilirkisi_unvan_sicil"]:
-        if col not in cols:
-            conn.execute(f"ALTER TABLE projeler ADD COLUMN {col} TEXT")
+        except Exception as e:
+            print(f"❌ [ShardConversionWorker] {e}")
+            self.error.emit(str(e))
 
 
-def ensure_hash_columns(conn: sqlite3.Connection):
-    """hts_dosyalari tablosuna MD5 ve SHA256 ekler."""
-    cols = [r[1] for r in conn.execute("PRAGMA table_info(hts_dosyalari)").fetchall()]
-    if "MD5" not in cols: conn.execute("ALTER TABLE hts_dosyalari ADD COLUMN MD5 TEXT")
-    if "SHA256" not in cols: conn.execute("ALTER TABLE hts_dosyalari ADD COLUMN SHA256 TEXT")
+class HtsWorker(QThread):
+    """HtsImporter'ı arka plan thread'inde çalıştırır; ilerleme / log / GSM tespiti sinyallerle arayüze iletilir."""
+    progress = pyqtSignal(int)
+    log = pyqtSignal(str)
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+    gsm_detected = pyqtSignal(str)
 
+    def __init__(self, path, pid):
+        super().__init__()
+        self.path = path
+        self.pid = pid
+        self.is_running = True
+        self.file_name = os.path.basename(path)
 
-def ensure_performance_indexes(conn: sqlite3.Connection):
-    """
-    Performans indexleri (işlev/mantık değişmez).
-    Amaç: En sık filtrelenen/sıralanan alanlarda taramayı azaltmak.
-    """
-    c = conn.cursor()
+    def run(self):
+        # proje dosyası yerleşiminde: yükleme bitene kadar bu projenin dosyası bağlı kalır
+        ProjectShards.pin(self.pid)
+        try:
+            open_project_shard(self.pid)
+            importer = HtsImporter(
+                self.path, self.pid, DB,
+                on_progress=self.progress.emit,
+                on_log=self.log.emit,
+                on_gsm=self.gsm_detected.emit,
+                should_stop=lambda: not self.is_running,
+            )
+            target_gsm = importer.run()
+            self.finished.emit(f"{target_gsm} - {self.file_name} Tamamlandı.")
 
-    c.execute("CREATE INDEX IF NOT EXISTS idx_gsm_pid_gsmno_tarih  ON hts_gsm  (ProjeID, GSMNo, TARIH)")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_gsm_pid_gsmno_baz    ON hts_gsm  (ProjeID, GSMNo, BAZ)")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_gsm_pid_gsmno_diger  ON hts_gsm  (ProjeID, GSMNo, DIGER_NUMARA)")
+        except Exception as e: self.error.emit(str(e))
+        finally:
+            ProjectShards.unpin(self.pid)
 
-    c.execute("CREATE INDEX IF NOT EXISTS idx_sms_pid_gsmno_tarih  ON hts_sms  (ProjeID, GSMNo, TARIH)")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_sms_pid_gsmno_diger  ON hts_sms  (ProjeID, GSMNo, DIGER_NUMARA)")
 
-    c.execute("CREATE INDEX IF NOT EXISTS idx_gprs_pid_gsmno_tarih ON hts_gprs (ProjeID, GSMNo, TARIH)")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_gprs_pid_gsmno_baz   ON hts_gprs (ProjeID, GSMNo, BAZ)")
+class DateSortFilterProxyModel(QAbstractProxyModel):
+    """
+    Hem Akıllı Metin, Hem Tarih, Hem de SAYISAL SIRALAMA yapan model.
 
-    c.execute("CREATE INDEX IF NOT EXISTS idx_wap_pid_gsmno_tarih  ON hts_wap  (ProjeID, GSMNo, TARIH)")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_wap_pid_gsmno_baz    ON hts_wap  (ProjeID, GSMNo, BAZ)")
+    Kaynak satırlar yerinde kalır; proxy görünür satırların kaynak numaralarını (self._rows) tutar.
+    Filtre arama indeksi / tarih anahtarlarıyla, sıralama tipli anahtarlar üzerinde tek bir Python sorted
+    ile hesaplanır (karşılaştırma başına lessThan çağrısı yok). mapToSource her zaman kaynaktaki
+    (paralel listelerdeki) asıl satırı döner.
+    """
+    searchApplied = pyqtSignal()
 
-    c.execute("CREATE INDEX IF NOT EXISTS idx_gsm_pid_numara_tarih  ON hts_gsm  (ProjeID, NUMARA, TARIH)")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_gprs_pid_numara_tarih ON hts_gprs (ProjeID, NUMARA, TARIH)")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_wap_pid_numara_tarih  ON hts_wap  (ProjeID, NUMARA, TARIH)")
+    SEARCH_DEBOUNCE_MS = 250
 
-    c.execute("CREATE INDEX IF NOT EXISTS idx_hts_rehber_pid_gsm_adet ON hts_rehber (ProjeID, GSMNo, Adet)")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_hts_tum_baz_pid_gsm_sinyal ON hts_tum_baz (ProjeID, GSMNo, Sinyal)")
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending_search = ""
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(lambda: self.setSearchText(self._pending_search))
+        self.min_date = None
+        self.max_date = None
+        self._min_epoch = None
+        self._max_epoch = None   # bitiş gününün ertesi 00:00 (hariç)
+        self.date_column = -1
+        self.date_filter_active = False
+        self.search_text = ""
+        # kaynak modelin arama indeksi varsa (CustomTableModel) eşleşmeler bir kez hesaplanır
+        self._hits = None
+        self._hits_key = None
+        # görünür satır -> kaynak satır; kaynak satır -> görünür satır (ihtiyaç olunca kurulur)
+        self._rows = []
+        self._pos = None
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    # ------------------------------------------------------------------
+    # kaynak model
+    # ------------------------------------------------------------------
+    def setSourceModel(self, model):
+        old = self.sourceModel()
+        if old is not None:
+            for sig, slot in self._source_connections(old):
+                try:
+                    sig.disconnect(slot)
+                except (TypeError, RuntimeError):
+                    pass
+        self.beginResetModel()
+        super().setSourceModel(model)
+        if model is not None:
+            for sig, slot in self._source_connections(model):
+                sig.connect(slot)
+        self._rebuild()
+        self.endResetModel()
 
-    c.execute("""
-        CREATE INDEX IF NOT EXISTS idx_hts_gsm_detail_lookup
-        ON hts_gsm (
-            ProjeID,
-            substr(replace(replace(replace(NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10),
-            substr(replace(replace(replace(DIGER_NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10),
-            (substr(TARIH, 7, 4) || '-' || substr(TARIH, 4, 2) || '-' || substr(TARIH, 1, 2) || substr(TARIH, 11))
-        )
-    """)
+    def _source_connections(self, model):
+        # CustomTableModel yalnız reset / veri değişimi yayar; satır ekleme-silme de reset gibi ele alınır
+        return [
+            (model.modelAboutToBeReset, self._on_source_about_to_reset),
+            (model.modelReset, self._on_source_reset),
+            (model.layoutAboutToBeChanged, self._on_source_about_to_reset),
+            (model.layoutChanged, self._on_source_reset),
+            (model.rowsAboutToBeInserted, self._on_source_about_to_reset),
+            (model.rowsInserted, self._on_source_reset),
+            (model.rowsAboutToBeRemoved, self._on_source_about_to_reset),
+            (model.rowsRemoved, self._on_source_reset),
+            (model.columnsAboutToBeInserted, self._on_source_about_to_reset),
+            (model.columnsInserted, self._on_source_reset),
+            (model.columnsAboutToBeRemoved, self._on_source_about_to_reset),
+            (model.columnsRemoved, self._on_source_reset),
+            (model.dataChanged, self._on_source_data_changed),
+            (model.headerDataChanged, self.headerDataChanged),
+        ]
 
-    c.execute("""
-        CREATE INDEX IF NOT EXISTS idx_rehber_pid_isim_tc_trim
-        ON hts_rehber (ProjeID, Isim, TRIM(TC))
-    """)
-    c.execute("""
-        CREATE INDEX IF NOT EXISTS idx_rehber_pid_tc_trim_karsi
-        ON hts_rehber (ProjeID, TRIM(TC), KarsiNo)
-    """)
+    def _on_source_about_to_reset(self, *args):
+        self.beginResetModel()
 
-    conn.commit()
+    def _on_source_reset(self, *args):
+        self._hits = None
+        self._hits_key = None
+        self._rebuild()
+        self.endResetModel()
 
-    try:
-        c.execute("ANALYZE;")
-        conn.commit()
-    except Exception:
-        pass
+    def _on_source_data_changed(self, top_left, bottom_right, roles=None):
+        # hücre değişince anahtarlar değişmiş olabilir: filtre/sıra yeniden kurulur
+        self.invalidate()
+
+    # ------------------------------------------------------------------
+    # satır eşlemesi
+    # ------------------------------------------------------------------
+    def _source_row_count(self) -> int:
+        model = self.sourceModel()
+        return model.rowCount(QModelIndex()) if model is not None else 0
+
+    def _rebuild(self):
+        """Görünür satır listesini filtre + sıralamadan yeniden hesaplar (sinyal yaymaz)."""
+        rows = self.accepted_source_rows()
+        if rows is None:
+            rows = list(range(self._source_row_count()))
+        if self._sort_column >= 0 and len(rows) > 1:
+            keys = self._column_keys(self._sort_column)
+            if keys is not None:
+                rows = ColumnKeys.order(rows, keys, descending=(self._sort_order == Qt.SortOrder.DescendingOrder))
+        self._rows = rows
+        self._pos = None
+
+    def _column_keys(self, column):
+        """Kolonun tipli sıralama anahtarları (CustomTableModel'de önbellekli)."""
+        model = self.sourceModel()
+        if model is None or column >= model.columnCount(QModelIndex()):
+            return None
+        getter = getattr(model, "sort_keys", None)
+        if callable(getter):
+            return getter(column)
+        values = [
+            (model.data(model.index(r, column), Qt.ItemDataRole.EditRole),)
+            for r in range(model.rowCount(QModelIndex()))
+        ]
+        return ColumnKeys.column(values, 0)[1]
+
+    def _source_pos(self) -> list:
+        if self._pos is None:
+            pos = [-1] * self._source_row_count()
+            for proxy_row, src_row in enumerate(self._rows):
+                if src_row < len(pos):
+                    pos[src_row] = proxy_row
+            self._pos = pos
+        return self._pos
+
+    def _relayout(self):
+        """Satır kümesi aynı kalıp sırası değiştiğinde: seçim (persistent index) korunur."""
+        self.layoutAboutToBeChanged.emit()
+        old_rows = self._rows
+        old_persistent = self.persistentIndexList()
+        old_src = [old_rows[i.row()] if 0 <= i.row() < len(old_rows) else -1 for i in old_persistent]
+        self._rebuild()
+        pos = self._source_pos()
+        self.changePersistentIndexList(
+            old_persistent,
+            [
+                self.index(pos[s], i.column()) if 0 <= s < len(pos) and pos[s] >= 0 else QModelIndex()
+                for i, s in zip(old_persistent, old_src)
+            ]
+        )
+        self.layoutChanged.emit()
+
+    def mapToSource(self, proxy_index):
+        model = self.sourceModel()
+        if model is None or not proxy_index.isValid():
+            return QModelIndex()
+        row = proxy_index.row()
+        if row < 0 or row >= len(self._rows):
+            return QModelIndex()
+        return model.index(self._rows[row], proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        pos = self._source_pos()
+        row = source_index.row()
+        if row < 0 or row >= len(pos) or pos[row] < 0:
+            return QModelIndex()
+        return self.index(pos[row], source_index.column())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or column < 0 or row >= len(self._rows) or column >= self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return QObject.parent(self)
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        model = self.sourceModel()
+        if parent.isValid() or model is None:
+            return 0
+        return model.columnCount(QModelIndex())
 
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        model = self.sourceModel()
+        if model is None or not index.isValid() or index.row() >= len(self._rows):
+            return None
+        return model.data(model.index(self._rows[index.row()], index.column()), role)
 
-def _try_open_as_plain_sqlite(db_path: str) -> bool:
-    """
-    DB plain sqlite mı?
-    - plain ise sqlite3 ile açılıp sqlite_master okunabilir.
-    - şifreli SQLCipher ise genelde 'file is not a database' vb. hata verir.
-    """
-    import sqlite3 as _plain_sqlite
-    try:
-        conn = _plain_sqlite.connect(db_path, timeout=3)
-        try:
-            conn.execute("SELECT name FROM sqlite_master LIMIT 1;").fetchone()
-        finally:
-            conn.close()
-        return True
-    except Exception:
-        return False
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        model = self.sourceModel()
+        if model is None:
+            return None
+        if orientation == Qt.Orientation.Vertical:
+            if 0 <= section < len(self._rows):
+                return model.headerData(self._rows[section], orientation, role)
+            return None
+        return model.headerData(section, orientation, role)
+
+    # ------------------------------------------------------------------
+    # sıralama
+    # ------------------------------------------------------------------
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        # kaynak sırası korunur; görünür sıra tipli anahtarlarla tek seferde (Python sorted) hesaplanır
+        self._sort_column = column
+        self._sort_order = order
+        self._relayout()
+
+    def sortColumn(self) -> int: return self._sort_column
+    def sortOrder(self): return self._sort_order
+
+    def invalidate(self):
+        self._hits = None
+        self._hits_key = None
+        self.invalidateFilter()
 
+    def invalidateFilter(self):
+        # görünür satır sayısı değişebilir -> reset (view satır sayısını yeniden okur)
+        self.beginResetModel()
+        self._rebuild()
+        self.endResetModel()
 
-def _require_free_space_for_migration(db_path: str, multiplier: float = 2.2):
-    if not os.path.exists(db_path):
-        return
-    size = os.path.getsize(db_path)
-    drive = os.path.splitdrive(os.path.abspath(db_path))[0] + "\\"
-    total, used, free = shutil.disk_usage(drive)
-    need = int(size * multiplier)
-    if free < need:
-        raise RuntimeError(
-            f"DB şifreleme için yeterli boş alan yok.\n"
-            f"Gereken ~{need/1024/1024/1024:.2f} GB, boş ~{free/1024/1024/1024:.2f} GB."
-        )
+    # ------------------------------------------------------------------
+    # filtre
+    # ------------------------------------------------------------------
+    def setDateRange(self, min_d, max_d):
+        self.min_date = min_d; self.max_date = max_d
+        self._min_epoch = ColumnKeys.qdatetime_epoch(min_d) if min_d else None
+        self._max_epoch = ColumnKeys.qdatetime_epoch(max_d) + 86400 if max_d else None
+        self.invalidateFilter()
 
+    def setDateColumn(self, col_idx): self.date_column = col_idx
+    def setDateFilterActive(self, active): self.date_filter_active = active; self.invalidateFilter()
 
-def migrate_plain_sqlite_to_sqlcipher(db_path: str, key: str, sqlcipher_connect):
-    """
-    Plain SQLite DB'yi SQLCipher'a çevirir.
-    ÖNEMLİ: Plain dosyayı SQLCipher ile doğrudan açmıyoruz (file is not a database hatasına düşmemek için).
-    Bunun yerine:
-      - encrypted tmp DB oluştur
-      - plain DB'yi KEY '' ile attach et
-      - sqlcipher_export ile plain -> encrypted kopyala
-      - dosyaları rename ile değiştir
-    """
-    if not os.path.exists(db_path):
-        return
-
-    # WAL/SHM varsa önce plain sqlite ile checkpoint dene (zararsız)
-    try:
-        import sqlite3 as _plain_sqlite
-        conn_plain = _plain_sqlite.connect(db_path, isolation_level=None, timeout=30)
-        try:
-            cur = conn_plain.cursor()
-            try:
-                cur.execute("PRAGMA wal_checkpoint(TRUNCATE);")
-            except Exception:
-                cur.execute("PRAGMA wal_checkpoint(FULL);")
-        finally:
-            conn_plain.close()
-    except Exception:
-        pass
-
-    _require_free_space_for_migration(db_path)
-
-    tmp_enc = db_path + ".enc_tmp"
-    backup_plain = db_path + ".plain_backup"
-
-    if os.path.exists(tmp_enc):
-        try:
-            os.remove(tmp_enc)
-        except Exception:
-            pass
-
-    # 1) Encrypted tmp DB'yi SQLCipher ile oluştur
-    conn = sqlcipher_connect(tmp_enc, timeout=30, check_same_thread=False)
-    try:
-        cur = conn.cursor()
-
-        # KEY parametre bağlamayı her driver kabul etmediği için literal veriyoruz.
-        # key zaten derive_db_key() ile sha256 hexdigest (0-9a-f) olduğu için güvenli.
-        cur.execute(f"PRAGMA key = '{key}';")
-        cur.execute("PRAGMA cipher_compatibility = 4;")
-
-        # 2) Plain DB'yi attach et (plain DB'de KEY boş olmalı)
-        cur.execute("ATTACH DATABASE ? AS plain KEY '';", (db_path,))
-
-        # 3) Plain -> main(encrypted tmp) export
-        cur.execute("SELECT sqlcipher_export('main', 'plain');")
-
-        cur.execute("DETACH DATABASE plain;")
-        conn.commit()
-    finally:
-        conn.close()
-
-    # Eski plain DB'yi yedekle, tmp_enc'yi asıl dosya yap
-    if os.path.exists(backup_plain):
-        try:
-            os.remove(backup_plain)
-        except Exception:
-            pass
-
-    os.replace(db_path, backup_plain)
-
-    # Plain'in WAL/SHM kalıntılarını temizle
-    for ext in (".wal", ".shm"):
-        p = db_path + ext
-        try:
-            if os.path.exists(p):
-                os.remove(p)
-        except Exception:
-            pass
-
-    os.replace(tmp_enc, db_path)
-
-
-def ensure_encrypted_db(db_path: str, key: str, sqlcipher_connect):
-    if not os.path.exists(db_path):
-        return
-
-    is_plain = _try_open_as_plain_sqlite(db_path)
-    if is_plain:
-        migrate_plain_sqlite_to_sqlcipher(db_path, key=key, sqlcipher_connect=sqlcipher_connect)
-
-
-def run_all_migrations(conn: sqlite3.Connection):
-    try:
-        ensure_project_columns(conn)
-        ensure_hts_dosyalari_meta_columns(conn)
-        ensure_hash_columns(conn)
-        ensure_rapor_taslagi_has_id(conn)
-        ensure_rapor_taslagi_tableprops_columns(conn)
-        ensure_performance_indexes(conn)
-        ensure_rapor_meta_ekler_columns(conn)
-
-
-        conn.commit()
-    except Exception as e:
-        print(f"Migration Hatası: {e}")
-
-
-def derive_db_key() -> str:
-    info = LicenseManager.ensure_valid_or_raise()
-    fp = LicenseManager.device_fingerprint()
-    raw = f"{info.license_id}|{fp}|HTSMERCEK_DB_KEY_V1"
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
-
-
-class DatabaseManager:
-    _instance = None
-    _instance_lock = threading.Lock()
-
-    DB_PATH = os.path.join(LicenseManager.appdata_dir(), "htstakip.db")
-
-    try:
-        from pysqlcipher3 import dbapi2 as _sqlcipher
-        _USING_SQLCIPHER = True
-    except Exception:
-        try:
-            from sqlcipher3 import dbapi2 as _sqlcipher  # sqlcipher3-wheels
-            _USING_SQLCIPHER = True
-        except Exception:
-            _sqlcipher = None
-            _USING_SQLCIPHER = False
-
-    def __new__(cls):
-        if cls._instance is None:
-            with cls._instance_lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
-        return cls._instance
-
-    def __init__(self):
-        if getattr(self, "_initialized", False):
+    def queueSearchText(self, text):
+        """Yazarken her tuşta değil, kısa bir duraksamadan sonra filtreler (temizleme anında)."""
+        self._pending_search = text
+        if not text:
+            self._search_timer.stop()
+            self.setSearchText(text)
             return
+        self._search_timer.start()
 
-        self._db_lock = threading.RLock()
+    def setSearchText(self, text):
+        self._search_timer.stop()
+        self.search_text = self.normalize_turkish(text)
+        self._hits = None
+        self._hits_key = None
+        self.invalidateFilter()
+        self.searchApplied.emit()
 
-        if not self._USING_SQLCIPHER or self._sqlcipher is None:
-            raise RuntimeError(
-                "SQLCipher aktif değil. Şifreli DB için pysqlcipher3 (veya SQLCipher driver) gerekli."
-            )
-        key = derive_db_key()
-        ensure_encrypted_db(self.DB_PATH, key=key, sqlcipher_connect=self._sqlcipher.connect)
-        self._connection = self._sqlcipher.connect(
-            self.DB_PATH,
-            check_same_thread=False,
-            timeout=30
-        )
+    def normalize_turkish(self, text):
+        return RowSearchIndex.normalize(text)
 
-        self._configure_db(key)
-        self._initialized = True
+    def _search_hits(self):
+        """Kaynak modelin indeksinden satır eşleşmeleri (model verisi değişirse yeniden hesaplanır)."""
+        getter = getattr(self.sourceModel(), "search_index", None)
+        if not callable(getter):
+            return None
+        idx = getter()
+        if self._hits_key is not idx:
+            self._hits = idx.match_rows(self.search_text)
+            self._hits_key = idx
+        return self._hits
 
-    def _configure_db(self, key):
+    def accepted_source_rows(self):
         """
-        Veritabanı bağlantısını ve şifrelemeyi yapılandırır.
-        Eğer şifre anahtarı değişmişse (HWID değişimi vb.) veritabanını sıfırlar.
+        Filtreden geçen kaynak satır numaraları, kaynak sırasıyla (filtre yoksa None = tüm satırlar).
+        CustomTableModel'de arama eşleşmeleri + tarih anahtarlarından hesaplanır; Qt modeli satır satır gezilmez.
         """
-        with self._db_lock:
-            # Mevcut bağlantı üzerinden cursor al
-            cur = self._connection.cursor()
-
-            # Anahtarı ayarla
-            cur.execute(f"PRAGMA key = '{key}';")
-            cur.execute("PRAGMA cipher_compatibility = 4;")
-
-            try:
-                # Test sorgusu: Şifre doğru mu?
-                cur.execute("SELECT count(*) FROM sqlite_master;")
-                cur.fetchone()
-
-                # Başarılıysa performans ayarlarını yap
-                cur.execute("PRAGMA journal_mode=WAL;")
-                cur.execute("PRAGMA synchronous=NORMAL;")
-                cur.execute("PRAGMA foreign_keys=ON;")
-                cur.execute("PRAGMA temp_store=MEMORY;")
-                cur.execute("PRAGMA busy_timeout=5000;")
-                self._connection.commit()
-
-            except Exception as e:
-                # Hata yakalama (pysqlcipher veya sqlite3 hataları)
-                err_str = str(e)
-                err_low = (err_str or "").lower()
-
-                # SADECE gerçekten "anahtar yanlış / db bozuk" durumlarında devreye girsin
-                bad_key_markers = (
-                    "file is not a database",
-                    "not a database",
-                    "bad decrypt",
-                    "wrong key",
-                    "sqlcipher",
-                )
-
-                if any(m in err_low for m in bad_key_markers):
-                    print("⚠️ Veritabanı anahtarı uyuşmuyor veya DB bozuk. Silmek yerine yedekleniyor...")
-
-                    try:
-                        cur.close()
-                        self._connection.close()
-                    except Exception:
-                        pass
-
-                    # Silmek YOK: Yedekle
-                    try:
-                        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        base = self.DB_PATH
-
-                        if os.path.exists(base):
-                            os.replace(base, base + f".badkey_{ts}.bak")
-
-                        if os.path.exists(base + "-wal"):
-                            os.replace(base + "-wal", base + f"-wal.badkey_{ts}.bak")
-
-                        if os.path.exists(base + "-shm"):
-                            os.replace(base + "-shm", base + f"-shm.badkey_{ts}.bak")
-
-                    except Exception as bak_err:
-                        print(f"DB yedekleme hatası: {bak_err}")
-
-                    # Yeni bağlantı oluştur
-                    if self._sqlcipher:
-                        self._connection = self._sqlcipher.connect(
-                            self.DB_PATH,
-                            check_same_thread=False,
-                            timeout=30
-                        )
-                    else:
-                        import sqlite3
-                        self._connection = sqlite3.connect(
-                            self.DB_PATH,
-                            check_same_thread=False,
-                            timeout=30
-                        )
-
-                    cur = self._connection.cursor()
-                    cur.execute(f"PRAGMA key = '{key}';")
-                    cur.execute("PRAGMA cipher_compatibility = 4;")
-                    cur.execute("PRAGMA journal_mode=WAL;")
-                    self._connection.commit()
-
-                else:
-                    # Başka bir hataysa (örn: disk dolu) durdur
-                    raise e
-
-    def lock(self):
-        return self._db_lock
-
-    def get_connection(self):
-        return self._connection
-
-
-class DB:
-    def __init__(self):
-        self.manager = DatabaseManager()
-        self.conn = None
-        self._lock = self.manager.lock()
-
-    def __enter__(self):
-        self._lock.acquire()
-        self.conn = self.manager.get_connection()
-        return self.conn
-
-    def __exit__(self, exc_type, exc, tb):
-        try:
-            if not self.conn:
-                return False
-
-            if exc_type is None:
-                self.conn.commit()
-            else:
-                self.conn.rollback()
-                print(f"⚠️ DB Rollback: {exc}")
-
-            return False
-        finally:
-            self._lock.release()
-
-
-def setup_database():
-    with DB() as conn:
-        c = conn.cursor()
-
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS projeler ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
-            "talep_eden_birim TEXT, dosya_no_tipi TEXT, dosya_no TEXT, suc_bilgisi TEXT, "
-            "suc_tarihi TEXT, gorevlendirme_tarihi TEXT, bilirkisi_adi TEXT, "
-            "bilirkisi_unvan_sicil TEXT, olusturma_tarihi TEXT)"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS taraflar ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
-            "ProjeID INTEGER REFERENCES projeler(id) ON DELETE CASCADE, "
-            "sifat TEXT, ad_soyad TEXT)"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS hts_ozet ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
-            "MinDate TEXT, MaxDate TEXT, UNIQUE(ProjeID, GSMNo))"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS hts_ozet_iletisim ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
-            "KarsiNo TEXT, Adet INTEGER, Sure INTEGER, Isim TEXT)"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS hts_ozet_baz ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
-            "BazAdi TEXT, Sinyal INTEGER)"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS hts_ozet_imei ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
-            "IMEI TEXT, Adet INTEGER, MinDate TEXT, MaxDate TEXT)"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS hts_rehber ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
-            "KarsiNo TEXT, Adet INTEGER, Sure INTEGER, Isim TEXT, TC TEXT)"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS hts_tum_baz ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
-            "BazAdi TEXT, Sinyal INTEGER)"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS hts_ortak_imei ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, IMEI TEXT, "
-            "KullananSayisi INTEGER, Numaralar TEXT, ToplamKullanim INTEGER, "
-            "UNIQUE(ProjeID, IMEI))"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS hts_ortak_isim ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, AdSoyad TEXT, "
-            "HatSayisi INTEGER, Numaralar TEXT, UNIQUE(ProjeID, AdSoyad))"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS hts_ortak_tc ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, TC TEXT, "
-            "HatSayisi INTEGER, Numaralar TEXT, UNIQUE(ProjeID, TC))"
-        )
-        c.execute("CREATE INDEX IF NOT EXISTS idx_rehber ON hts_rehber (ProjeID, GSMNo)")
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS ozel_konumlar ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
-            "Lat REAL, Lon REAL, Label TEXT, "
-            "FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
-        )
-        for table_name, columns in TABLE_COLUMNS.items():
-            cols_def = ", ".join([f"[{col}] TEXT" for col in columns])
-            c.execute(
-                f"CREATE TABLE IF NOT EXISTS {table_name} ("
-                f"id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, {cols_def}, "
-                f"FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
-            )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS rapor_taslagi ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, Baslik TEXT, Icerik TEXT, "
-            "Tur TEXT, Tarih TEXT, Sira INTEGER, GenislikYuzde INTEGER DEFAULT 100, YukseklikMm INTEGER, "
-            "Hizalama TEXT DEFAULT 'center', Aciklama TEXT DEFAULT '', HtmlIcerik TEXT, ImagePath TEXT, "
-            "FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS hts_dosyalari ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, Rol TEXT, DosyaAdi TEXT, "
-            "DosyaBoyutu INTEGER, DosyaYolu TEXT, TalepEdenMakam TEXT, SorguBaslangic TEXT, SorguBitis TEXT, "
-            "Tespit TEXT, MD5 TEXT, SHA256 TEXT, YuklenmeTarihi TEXT DEFAULT CURRENT_TIMESTAMP, "
-            "UNIQUE(ProjeID, GSMNo, Rol), FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS rapor_meta ("
-            "ProjeID INTEGER PRIMARY KEY, GorevlendirmeMetni TEXT, DosyaHakkindaMetni TEXT, "
-            "GenelBilgilendirmeMetni TEXT, DegerlendirmeMetni TEXT, SonucMetni TEXT, "
-            "MarginTopMm INTEGER DEFAULT 20, MarginRightMm INTEGER DEFAULT 20, "
-            "MarginBottomMm INTEGER DEFAULT 20, MarginLeftMm INTEGER DEFAULT 20, "
-            "GuncellemeTarihi TEXT DEFAULT CURRENT_TIMESTAMP, "
-            "FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS rapor_meta_ekler ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
-            "ProjeID INTEGER, "
-            "Bolum TEXT, "                      # 'dosya_hakkinda' gibi
-            "DosyaAdi TEXT, "
-            "DosyaYolu TEXT, "                  # evidence_images altında tutulacak
-            "Aciklama TEXT DEFAULT '', "
-            "EklemeTarihi TEXT DEFAULT CURRENT_TIMESTAMP, "
-            "FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
-        )
-        c.execute("CREATE INDEX IF NOT EXISTS idx_rapor_meta_ekler_pid ON rapor_meta_ekler (ProjeID, Bolum)")
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS manuel_numaralar ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, Numara TEXT, "
-            "Aciklama TEXT DEFAULT 'Manuel Giriş', EklemeTarihi TEXT DEFAULT CURRENT_TIMESTAMP, "
-            "FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
-        )
-        c.execute(
-            "CREATE TABLE IF NOT EXISTS baz_kutuphanesi ("
-            "id INTEGER PRIMARY KEY AUTOINCREMENT, CellID TEXT, BazAdi TEXT, "
-            "Lat REAL, Lon REAL, KaynakDosya TEXT, "
-            "OgrenmeTarihi TEXT DEFAULT CURRENT_TIMESTAMP, UNIQUE(CellID, BazAdi))"
-        )
-        c.execute("CREATE INDEX IF NOT EXISTS idx_baz_cell ON baz_kutuphanesi (CellID)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_baz_ad ON baz_kutuphanesi (BazAdi)")
-
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_gsm_pid_gsmno ON hts_gsm (ProjeID, GSMNo)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_gsm_pid_gsmno_diger ON hts_gsm (ProjeID, GSMNo, DIGER_NUMARA)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_gsm_pid_imei ON hts_gsm (ProjeID, IMEI)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_gsm_pid_tarih ON hts_gsm (ProjeID, TARIH)")
-
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_sms_pid_gsmno ON hts_sms (ProjeID, GSMNo)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_sms_pid_gsmno_diger ON hts_sms (ProjeID, GSMNo, DIGER_NUMARA)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_sms_pid_tarih ON hts_sms (ProjeID, TARIH)")
-
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_gprs_pid_gsmno ON hts_gprs (ProjeID, GSMNo)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_gprs_pid_imei ON hts_gprs (ProjeID, IMEI)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_gprs_pid_tarih ON hts_gprs (ProjeID, TARIH)")
-
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_wap_pid_gsmno ON hts_wap (ProjeID, GSMNo)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_wap_pid_imei ON hts_wap (ProjeID, IMEI)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_hts_wap_pid_tarih ON hts_wap (ProjeID, TARIH)")
-
-        c.execute("CREATE INDEX IF NOT EXISTS idx_ozet_iletisim_pid_gsm_karsi ON hts_ozet_iletisim (ProjeID, GSMNo, KarsiNo)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_ozet_baz_pid_gsm_baz ON hts_ozet_baz (ProjeID, GSMNo, BazAdi)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_ozet_imei_pid_gsm_imei ON hts_ozet_imei (ProjeID, GSMNo, IMEI)")
-
-        c.execute("CREATE INDEX IF NOT EXISTS idx_manuel_numaralar_pid ON manuel_numaralar (ProjeID)")
-        for _t in ["hts_abone", "hts_gsm", "hts_sms", "hts_sabit", "hts_gprs", "hts_wap", "hts_sth", "hts_uluslararasi"]:
-            try:
-                c.execute(f"ALTER TABLE {_t} ADD COLUMN Rol TEXT")
-            except Exception:
-                pass
-            try:
-                c.execute(f"ALTER TABLE {_t} ADD COLUMN DosyaAdi TEXT")
-            except Exception:
-                pass
-        run_all_migrations(conn)
-
-
-class HtsWorker(QThread):
-    progress = pyqtSignal(int)
-    log = pyqtSignal(str)
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-    gsm_detected = pyqtSignal(str)
-
-    def __init__(self, path, pid):
-        super().__init__()
-        self.path = path
-        self.pid = pid
-        self.is_running = True
-        self.file_name = os.path.basename(path)
-
-    def clean_cell_data(self, value):
-        if value is None: return None
-        text = str(value).strip()
-        text = text.replace('_x000D_', ' ').replace('\n', ' ').replace('\r', ' ')
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
-
-    def run(self):
-        try:
-            from openpyxl import load_workbook
-            self.log.emit(f"📂 Dosya Analiz Ediliyor:\n{self.file_name}")
-            md5_hash = hashlib.md5()
-            sha256_hash = hashlib.sha256()
-
-            try:
-                with open(self.path, "rb") as f:
-                    for byte_block in iter(lambda: f.read(65536), b""):
-                        md5_hash.update(byte_block)
-                        sha256_hash.update(byte_block)
-
-                file_md5 = md5_hash.hexdigest()
-                file_sha256 = sha256_hash.hexdigest()
-                self.log.emit("🔒 Dosya İmzaları (Hash) Oluşturuldu.")
-
-            except Exception as hash_err:
-                print(f"Hash hatası: {hash_err}")
-                file_md5 = "HESAPLANAMADI"
-                file_sha256 = "HESAPLANAMADI"
-            file_size_mb = os.path.getsize(self.path) / (1024 * 1024)
-
-            wb = load_workbook(self.path, read_only=True, data_only=True)
-            sheet = wb.active
-
-            meta_data = {
-                "Talep Eden Makam": "",
-                "Sorgu Başlangıç Tarihi": "",
-                "Sorgu Bitiş Tarihi": "",
-                "Tespit": ""
-            }
-
-            target_gsm = "BILINMIYOR"
-
-            for row in sheet.iter_rows(min_row=1, max_row=50, values_only=True):
-                if not row or len(row) < 2: continue
-                val_a = row[0]; val_b = row[1]
-                if not val_a: continue
-
-                key = str(val_a).strip().upper()
-                key = key.replace("İ", "I").replace("Ş", "S").replace("Ç", "C").replace("Ö", "O").replace("Ü", "U").replace("Ğ", "G").replace(":", "").strip()
-
-                final_value = ""
-                if val_b is not None:
-                    if isinstance(val_b, datetime): final_value = val_b.strftime("%d.%m.%Y %H:%M:%S")
-                    else: final_value = str(val_b).strip()
-
-                if "TALEP EDEN" in key: meta_data["Talep Eden Makam"] = final_value
-                elif "SORGULANAN NO" in key or "GSM NO" in key:
-                    clean_gsm = re.sub(r'\D', '', final_value)
-                    if len(clean_gsm) >= 10: target_gsm = clean_gsm
-                elif "BASLANGIC" in key: meta_data["Sorgu Başlangıç Tarihi"] = final_value
-                elif "BITIS" in key: meta_data["Sorgu Bitiş Tarihi"] = final_value
-                elif "TESPIT" in key or "KONU" in key: meta_data["Tespit"] = final_value
-
-            if target_gsm == "BILINMIYOR":
-                target_gsm = _detect_target_gsm(self.path)
-
-            self.gsm_detected.emit(target_gsm)
-            self.log.emit(f"✅ Hedef Numara Tespit Edildi: {target_gsm}\nDosya: {self.file_name}")
-
-            rol, sorgulanan_no = detect_hts_role(self.path)
-            self.current_rol = rol
-
-            with DB() as conn:
-                conn.execute("""
-                    INSERT OR REPLACE INTO hts_dosyalari 
-                    (ProjeID, GSMNo, Rol, DosyaAdi, DosyaBoyutu, DosyaYolu, 
-                     TalepEdenMakam, SorguBaslangic, SorguBitis, Tespit, MD5, SHA256) 
-                    VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
-                """, (self.pid, target_gsm, rol, self.file_name, int(os.path.getsize(self.path)), self.path,
-                      meta_data["Talep Eden Makam"],
-                      meta_data["Sorgu Başlangıç Tarihi"],
-                      meta_data["Sorgu Bitiş Tarihi"],
-                      meta_data["Tespit"],
-                      file_md5, file_sha256))
-
-            is_valid_format = False; has_target_no = False
-            BLOCK_MAP_KEYS = ["ABONE BILGILERI", "GSM GORUSME", "SABIT TELEFON", "ULUSLARARASI", "MESAJ BILGILERI", "INTERNET BAGLANTI", "STH GORUSME"]
-
-            for row in sheet.iter_rows(min_row=1, max_row=100, values_only=True):
-                row_text = " ".join([str(x).strip().upper() for x in row if x is not None])
-                row_text = row_text.replace("İ", "I").replace("Ş", "S").replace("Ç", "C").replace("Ö", "O").replace("Ü", "U").replace("Ğ", "G")
-                if "SORGULANAN" in row_text and "NO" in row_text: has_target_no = True
-                for key in BLOCK_MAP_KEYS:
-                    if key in row_text: is_valid_format = True; break
-
-            if not has_target_no: raise Exception("Hatalı Format: 'Sorgulanan No' satırı bulunamadı.")
-            if not is_valid_format: raise Exception("Hatalı Format: Geçerli HTS başlıkları bulunamadı.")
-
-            BLOCK_MAP = {"ABONE BILGILERI": "hts_abone", "GSM GORUSME SORGU SONUCLARI": "hts_gsm", "SABIT TELEFON GORUSME SORGU SONUCLARI": "hts_sabit", "ULUSLARARASI GORUSME SORGU SONUCLARI": "hts_uluslararasi", "MESAJ BILGILERI": "hts_sms", "INTERNET BAGLANTI (GPRS)": "hts_gprs", "INTERNET BAGLANTI (WAP)": "hts_wap", "STH GORUSME SORGU SONUCLARI": "hts_sth"}
-
-            current_table = None; state = "SEARCHING"; column_map = {}; batch_data = []; BATCH_SIZE = 5000
-            row_count = sheet.max_row or 50000
-
-            self.log.emit(f"⏳ Veriler Okunuyor...\n{self.file_name}")
-
-            for r_idx, row in enumerate(sheet.iter_rows(values_only=True), start=1):
-                if not self.is_running: break
-
-                if r_idx % 5000 == 0:
-                    current_prog = int((r_idx / row_count) * 85)
-                    self.progress.emit(current_prog)
-                    self.log.emit(f"⏳ Okunuyor (%{current_prog})\nDosya: {self.file_name}\nSatır: {r_idx}")
-                    QThread.msleep(1)
-
-                if not row: continue
-
-                row_text_raw = " ".join([str(x).strip().upper() for x in row if x is not None])
-                row_text = row_text_raw.replace("İ", "I").replace("Ş", "S").replace("Ç", "C").replace("Ö", "O").replace("Ü", "U").replace("Ğ", "G")
-
-                if target_gsm == "BILINMIYOR" and len(row) > 1:
-                    col_a = str(row[0]).upper() if row[0] else ""
-                    if "SORGULANAN" in col_a and "NO" in col_a:
-                         clean = re.sub(r'\D', '', str(row[1]))
-                         if clean: target_gsm = clean; self.gsm_detected.emit(target_gsm)
-
-                if "KAYITBULUNAMADI" in str(row[0]).upper().replace(" ", ""):
-                    if current_table: self._save_batch(current_table, batch_data, target_gsm); batch_data = []; current_table = None; state = "SEARCHING"
-                    continue
-
-                found_new = False
-                for key, tbl in BLOCK_MAP.items():
-                    if key in row_text:
-                        if current_table: self._save_batch(current_table, batch_data, target_gsm); batch_data = []
-                        if rol == "KARSI" and tbl == "hts_abone":
-                            current_table = None; state = "SEARCHING"; found_new = True; break
-                        current_table = tbl; state = "WAITING_HEADER"; found_new = True;
-                        break
-
-                if found_new: continue
+        search = bool(self.search_text)
+        by_date = self.date_filter_active and self.date_column != -1
+        if not search and not by_date:
+            return None
 
-                if state == "WAITING_HEADER" and current_table:
-                    column_map = {}; alias_map = HEADER_ALIASES.get(current_table, {})
-                    for c_idx, cell in enumerate(row):
-                        if not cell: continue
-                        h_clean = _norm_header(str(cell))
-                        for ex_head, db_col in alias_map.items():
-                            if _norm_header(ex_head) == h_clean: column_map[c_idx] = db_col; break
-                    if column_map: state = "READING_DATA"
+        model = self.sourceModel()
+        if model is None:
+            return []
+        hits = self._search_hits() if search else None
+        getter = getattr(model, "date_keys", None)
+        n = model.rowCount(QModelIndex())
+        if (search and hits is None) or (by_date and not callable(getter)):
+            return [r for r in range(n) if self.filterAcceptsRow(r, QModelIndex())]
+
+        keys = getter(self.date_column) if by_date else None
+        lo, hi = self._min_epoch, self._max_epoch
+        out = []
+        for r in range(n):
+            if hits is not None and (r >= len(hits) or not hits[r]):
+                continue
+            if keys is not None:
+                ep = keys[r] if r < len(keys) else None
+                if ep is not None and ((lo is not None and ep < lo) or (hi is not None and ep >= hi)):
                     continue
-
-                if state == "READING_DATA" and current_table:
-                    sira_col = -1
-                    for idx, name in column_map.items():
-                        if name == "SIRA_NO": sira_col = idx; break
-                    val = row[sira_col] if (sira_col != -1 and sira_col < len(row)) else (row[0] if row else None)
-
-                    if val and str(val).strip().isdigit():
-                        entry = {}
-                        for c_idx, db_col in column_map.items():
-                            if c_idx < len(row):
-                                raw_val = row[c_idx]; clean_val = self.clean_cell_data(raw_val)
-                                if db_col == "IMEI" and clean_val:
-                                    digits_only = re.sub(r'\D', '', clean_val)
-                                    if len(digits_only) < 13: clean_val = None
-                                entry[db_col] = clean_val
-                        if "BAZ" in entry and entry["BAZ"]:
-                            baz_raw = str(entry["BAZ"]).strip()
-
-                            coords = re.findall(r"(\d{2}\.\d{4,})", baz_raw)
-
-                            if len(coords) >= 2:
-                                try:
-                                    lat, lon = float(coords[-2]), float(coords[-1])
-
-                                    final_lat, final_lon = 0, 0
-                                    if 35 < lat < 43 and 25 < lon < 46:
-                                        final_lat, final_lon = lat, lon
-                                    elif 35 < lon < 43 and 25 < lat < 46:
-                                        final_lat, final_lon = lon, lat
-
-                                    if final_lat != 0:
-                                        cell_id = None
-
-                                        match_par = re.search(r'\((\d{4,})\)', baz_raw)
-                                        if match_par:
-                                            cell_id = match_par.group(1)
-                                        else:
-                                            nums = re.findall(r'\d+', baz_raw)
-                                            candidates = [n for n in nums if n not in coords and len(n) > 3]
-                                            if candidates:
-                                                cell_id = candidates[0]
-                                        with DB() as db_conn:
-                                            db_conn.execute("""
-                                                INSERT OR IGNORE INTO baz_kutuphanesi 
-                                                (CellID, BazAdi, Lat, Lon, KaynakDosya) 
-                                                VALUES (?, ?, ?, ?, ?)
-                                            """, (cell_id, baz_raw, final_lat, final_lon, self.file_name))
-                                except:
-                                    pass
-                        entry["GSMNo"] = target_gsm; batch_data.append(entry)
-
-                        if len(batch_data) >= BATCH_SIZE:
-                            self.log.emit(f"💾 Veritabanına Yazılıyor...\n{self.file_name}")
-                            self._save_batch(current_table, batch_data, target_gsm)
-                            batch_data = []
-
-            if current_table and batch_data: self._save_batch(current_table, batch_data, target_gsm)
-            self.log.emit(f"📊 İstatistikler ve Özetler Hesaplanıyor...\n{target_gsm}")
-            self.progress.emit(86)
-
-            self.calculate_and_save_summary(target_gsm)
-
-            self.progress.emit(100)
-            self.finished.emit(f"{target_gsm} - {self.file_name} Tamamlandı.")
-
-        except Exception as e: self.error.emit(str(e))
-
-    def _save_batch(self, table, data, gsm):
-        if not data:
-            return
-
-        cols = TABLE_COLUMNS[table]
-        vals = []
-
-        # Rol + DosyaAdi (kaynak xlsx) bilgisini ham kayıtlara yazacağız
-        rol = getattr(self, "current_rol", None) or "HEDEF"
-        dosya_adi = getattr(self, "file_name", "") or ""
-
-        for item in data:
-            row = [self.pid, gsm, rol, dosya_adi]
-            for c in cols:
-                row.append(item.get(c, None))
-            vals.append(row)
-
-        with DB() as conn:
-            ph = ",".join(["?"] * (len(cols) + 4))
-            conn.executemany(
-                f"INSERT INTO {table} (ProjeID, GSMNo, Rol, DosyaAdi, {','.join(cols)}) VALUES ({ph})",
-                vals
-            )
-
-    def calculate_and_save_summary(self, gsm):
-        try:
-            with DB() as conn:
-                cur = conn.cursor()
-                all_raw_dates = []
-                tables_to_check = ["hts_gsm", "hts_sms", "hts_gprs", "hts_wap", "hts_sabit", "hts_sth"]
-
-                for t in tables_to_check:
-                    try:
-                        res = cur.execute(f"SELECT TARIH FROM {t} WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm)).fetchall()
-                        all_raw_dates.extend([r[0] for r in res if r[0]])
-                    except:
-                        pass
-                    QThread.msleep(5)
-
-                valid_dts = []
-                for idx, t_str in enumerate(all_raw_dates):
-                    if idx % 2000 == 0: QThread.msleep(1)
-                    try:
-                        cln = str(t_str).strip()
-                        fmt = "dd.MM.yyyy HH:mm:ss" if "." in cln else "dd/MM/yyyy HH:mm:ss"
-                        if " " not in cln: fmt = fmt.split(" ")[0]
-
-                        dt = QDateTime.fromString(cln, fmt)
-                        if not dt.isValid():
-                            dt = QDateTime.fromString(cln, "yyyy-MM-dd HH:mm:ss")
-
-                        if dt.isValid(): valid_dts.append(dt)
-                    except: pass
-
-                if valid_dts:
-                    min_str = min(valid_dts).toString("dd.MM.yyyy HH:mm:ss")
-                    max_str = max(valid_dts).toString("dd.MM.yyyy HH:mm:ss")
-                    cur.execute("INSERT OR REPLACE INTO hts_ozet (ProjeID, GSMNo, MinDate, MaxDate) VALUES (?, ?, ?, ?)", (self.pid, gsm, min_str, max_str))
-                else:
-                    cur.execute("INSERT OR REPLACE INTO hts_ozet (ProjeID, GSMNo, MinDate, MaxDate) VALUES (?, ?, ?, ?)", (self.pid, gsm, "", ""))
-
-                self.progress.emit(90)
-                QThread.msleep(10)
-                cur.execute("DELETE FROM hts_ozet_iletisim WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm))
-                cur.execute("DELETE FROM hts_rehber WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm))
-                all_contacts = cur.execute("""
-                    SELECT DIGER_NUMARA, COUNT(*), SUM(CAST(SURE as INTEGER)), MAX(DIGER_ISIM), MAX(DIGER_TC)
-                    FROM hts_gsm 
-                    WHERE ProjeID=? 
-                      AND GSMNo=? 
-                      AND DIGER_NUMARA != ? 
-                    GROUP BY DIGER_NUMARA 
-                    ORDER BY 2 DESC
-                """, (self.pid, gsm, gsm)).fetchall()
-
-                if all_contacts:
-                    d_full = [[self.pid, gsm, r[0], r[1], (r[2] if r[2] else 0), r[3], r[4]] for r in all_contacts]
-                    cur.executemany("""
-                        INSERT INTO hts_rehber (ProjeID, GSMNo, KarsiNo, Adet, Sure, Isim, TC) 
-                        VALUES (?,?,?,?,?,?,?)
-                    """, d_full)
-                    top_20_data = [[self.pid, gsm, r[0], r[1], (r[2] if r[2] else 0), r[3]] for r in all_contacts[:20]]
-                    cur.executemany("INSERT INTO hts_ozet_iletisim (ProjeID, GSMNo, KarsiNo, Adet, Sure, Isim) VALUES (?,?,?,?,?,?)", top_20_data)
-
-                self.progress.emit(94)
-                QThread.msleep(10)
-
-                cur.execute("DELETE FROM hts_ozet_imei WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm))
-                cur.execute("DELETE FROM hts_ozet_baz WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm))
-                cur.execute("DELETE FROM hts_tum_baz WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm))
-
-                baz_c = defaultdict(int)
-                imei_stats = defaultdict(lambda: {'count': 0, 'dates': []})
-
-                for t in ["hts_gsm", "hts_gprs", "hts_wap"]:
-                    try:
-                        rows = cur.execute(f"SELECT BAZ, IMEI, TARIH FROM {t} WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm)).fetchall()
-                        for idx, r in enumerate(rows):
-                            if idx % 2000 == 0: QThread.msleep(1)
-                            baz, imei, tarih = r
-
-                            if baz and str(baz).strip():
-                                baz_c[str(baz).strip()] += 1
-
-                            if imei and str(imei).strip():
-                                clean_imei = str(imei).strip()
-                                imei_stats[clean_imei]['count'] += 1
-                                if tarih: imei_stats[clean_imei]['dates'].append(tarih)
-                    except: pass
-
-                sb = sorted(baz_c.items(), key=lambda x:x[1], reverse=True)
-                if sb:
-                    all_baz_data = [[self.pid, gsm, k, v] for k,v in sb]
-                    cur.executemany("INSERT INTO hts_tum_baz (ProjeID, GSMNo, BazAdi, Sinyal) VALUES (?,?,?,?)", all_baz_data)
-                    cur.executemany("INSERT INTO hts_ozet_baz (ProjeID, GSMNo, BazAdi, Sinyal) VALUES (?,?,?,?)", all_baz_data[:20])
-
-                imei_data_to_save = []
-                for idx, (imei, info) in enumerate(imei_stats.items()):
-                    min_d_str = ""; max_d_str = ""
-                    if info['dates']:
-                        try:
-                            info['dates'].sort(key=lambda x: x.split()[0] if x else "")
-                            min_d_str = info['dates'][0]
-                            max_d_str = info['dates'][-1]
-                        except: pass
-
-                    imei_data_to_save.append([self.pid, gsm, imei, info['count'], min_d_str, max_d_str])
-
-                imei_data_to_save.sort(key=lambda x: x[3], reverse=True) # Adete göre sırala
-
-                if imei_data_to_save:
-                    cur.executemany("INSERT INTO hts_ozet_imei (ProjeID, GSMNo, IMEI, Adet, MinDate, MaxDate) VALUES (?,?,?,?,?,?)", imei_data_to_save)
-
-                self.progress.emit(99)
-                conn.commit()
-                self.recalculate_common_analysis()
-
-        except Exception as e:
-            print(f"Özet Hesaplama Hatası: {e}")
-
-    def recalculate_common_analysis(self):
-        # Eski uzun kodu silin, sadece bunu yazın:
-        AnalysisUtils.recalculate_common_analysis_core(self.pid)
-
-
-class DateSortFilterProxyModel(QSortFilterProxyModel):
-    """Hem Akıllı Metin, Hem Tarih, Hem de SAYISAL SIRALAMA yapan model"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.min_date = None
-        self.max_date = None
-        self.date_column = -1
-        self.date_filter_active = False
-        self.search_text = ""
-
-    def setDateRange(self, min_d, max_d):
-        self.min_date = min_d; self.max_date = max_d; self.invalidateFilter()
-
-    def setDateColumn(self, col_idx): self.date_column = col_idx
-    def setDateFilterActive(self, active): self.date_filter_active = active; self.invalidateFilter()
-
-    def setSearchText(self, text):
-        self.search_text = self.normalize_turkish(text)
-        self.invalidateFilter()
-
-    def normalize_turkish(self, text):
-        if not text: return ""
-        text = str(text)
-        tr_map = {'İ': 'i', 'I': 'ı', 'ı': 'i', 'Ş': 's', 'ş': 's', 'Ğ': 'g', 'ğ': 'g',
-                  'Ü': 'u', 'ü': 'u', 'Ö': 'o', 'ö': 'o', 'Ç': 'c', 'ç': 'c'}
-        for k, v in tr_map.items(): text = text.replace(k, v)
-        text = unicodedata.normalize('NFD', text.lower())
-        text = "".join([c for c in text if not unicodedata.category(c).startswith('M')])
-        return text.lower().strip()
-
-    def lessThan(self, left, right):
-        left_data = self.sourceModel().data(left, Qt.ItemDataRole.EditRole)
-        right_data = self.sourceModel().data(right, Qt.ItemDataRole.EditRole)
-
-        try:
-            return float(left_data) < float(right_data)
-        except (ValueError, TypeError):
-            return str(left_data).lower() < str(right_data).lower()
+            out.append(r)
+        return out
 
     def filterAcceptsRow(self, source_row, source_parent):
+        """Satır satır filtre (arama indeksi / tarih anahtarı olmayan kaynak modeller için)."""
+        model = self.sourceModel()
         if self.search_text:
             row_match = False
-            model = self.sourceModel()
             for col in range(model.columnCount(QModelIndex())):
                 data = model.data(model.index(source_row, col, source_parent), Qt.ItemDataRole.DisplayRole)
                 if data and self.search_text in self.normalize_turkish(data):
@@ -3064,7 +2081,7 @@ class DateSortFilterProxyModel(QSortFilterProxyModel):
             if not row_match: return False
 
         if self.date_filter_active and self.date_column != -1:
-            date_str = str(self.sourceModel().data(self.sourceModel().index(source_row, self.date_column, source_parent), Qt.ItemDataRole.DisplayRole))
+            date_str = str(model.data(model.index(source_row, self.date_column, source_parent), Qt.ItemDataRole.DisplayRole))
 
             try:
                 clean = date_str.split(" ")[0].strip()
@@ -3087,6 +2104,33 @@ class CustomTableModel(QAbstractTableModel):
         super().__init__()
         self._data = data or []
         self._headers = headers or []
+        self._search_index = None
+        self._search_index_key = None
+        # kolon -> tipli anahtarlar (ilk sıralama/filtrede hesaplanır, update_data'da sıfırlanır)
+        self._sort_keys = {}
+        self._date_keys = {}
+
+    def sort_keys(self, col: int) -> list:
+        keys = self._sort_keys.get(col)
+        if keys is None or len(keys) != len(self._data):
+            keys = ColumnKeys.column(self._data, col)[1]
+            self._sort_keys[col] = keys
+        return keys
+
+    def date_keys(self, col: int) -> list:
+        keys = self._date_keys.get(col)
+        if keys is None or len(keys) != len(self._data):
+            keys = ColumnKeys.date_keys(self._data, col)
+            self._date_keys[col] = keys
+        return keys
+
+    def search_index(self) -> RowSearchIndex:
+        """Arama indeksi: ilk aramada kurulur, veri/başlık değişene kadar yeniden kullanılır."""
+        key = (id(self._data), len(self._data), len(self._headers))
+        if self._search_index is None or self._search_index_key != key:
+            self._search_index = RowSearchIndex(self._data, len(self._headers))
+            self._search_index_key = key
+        return self._search_index
 
     def data(self, index, role):
         if not index.isValid(): return None
@@ -3122,17 +2166,358 @@ class CustomTableModel(QAbstractTableModel):
     def update_data(self, new_data):
         self.beginResetModel()
         self._data = new_data
+        self._search_index = None
+        self._sort_keys = {}
+        self._date_keys = {}
         self.endResetModel()
 
 
-class CrossMatchDialog(WatermarkDialogMixin, QDialog):
-    def __init__(self, parent, project_id, available_numbers):
+class SqlDiagnosticsDialog(QDialog):
+    """
+    Performans tanılama: SQL izleme (SqlTrace) sonuçları — ifade süreleri, DB kilidi beklemeleri,
+    yavaş ifadeler ve planları — ile arayüz donmaları (UiWatchdog) ve zaman çizelgesi (Tracer) kaydının dışa aktarımı.
+    """
+
+    def __init__(self, parent=None):
         super().__init__(parent)
+        self.setWindowTitle("Performans Tanılama")
+        self.resize(1200, 750)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowType.WindowMaximizeButtonHint)
 
-        self.init_watermark(opacity=0.025, scale_ratio=0.90)
+        layout = QVBoxLayout(self)
 
-        self.project_id = project_id
-        self.available_numbers = available_numbers
+        top = QHBoxLayout()
+        self.chk_enabled = QCheckBox("SQL izleme açık")
+        self.chk_enabled.setChecked(SqlTrace.enabled())
+        self.chk_enabled.toggled.connect(self.toggle_enabled)
+        top.addWidget(self.chk_enabled)
+
+        top.addWidget(QLabel("Yavaş sorgu eşiği:"))
+        self.spin_slow = QSpinBox()
+        self.spin_slow.setRange(1, 60000)
+        self.spin_slow.setSuffix(" ms")
+        self.spin_slow.setValue(int(SqlTrace.slow_ms()))
+        self.spin_slow.valueChanged.connect(SqlTrace.set_slow_ms)
+        top.addWidget(self.spin_slow)
+        top.addStretch()
+
+        btn_refresh = QPushButton("🔄 Yenile")
+        btn_refresh.clicked.connect(self.refresh)
+        top.addWidget(btn_refresh)
+        btn_reset = QPushButton("🧹 Sıfırla")
+        btn_reset.clicked.connect(self.reset_stats)
+        top.addWidget(btn_reset)
+        layout.addLayout(top)
+
+        # zaman çizelgesi (Tracer): import / analiz / rapor span'ları, Chrome trace JSON
+        trace_row = QHBoxLayout()
+        self.chk_trace = QCheckBox("⏱️ Zaman çizelgesi (span) kaydı")
+        self.chk_trace.setChecked(Tracer.enabled())
+        self.chk_trace.toggled.connect(self.toggle_trace)
+        trace_row.addWidget(self.chk_trace)
+        self.chk_profile = QCheckBox("cProfile örnekleme (en dış span)")
+        self.chk_profile.setChecked(Tracer.profiling())
+        self.chk_profile.toggled.connect(Tracer.set_profiling)
+        trace_row.addWidget(self.chk_profile)
+        self.lbl_trace = QLabel("")
+        self.lbl_trace.setStyleSheet("color:#7f8c8d;")
+        trace_row.addWidget(self.lbl_trace)
+        trace_row.addStretch()
+        btn_trace = QPushButton("💾 Trace Kaydet (JSON)")
+        btn_trace.setToolTip("chrome://tracing veya ui.perfetto.dev ile açılabilir.")
+        btn_trace.clicked.connect(self.export_trace)
+        trace_row.addWidget(btn_trace)
+        layout.addLayout(trace_row)
+
+        # arayüz donma izleyicisi (UiWatchdog)
+        stall_row = QHBoxLayout()
+        self.chk_watchdog = QCheckBox("🧊 Arayüz donma izleyicisi")
+        self.chk_watchdog.setChecked(UiWatchdog.is_running())
+        self.chk_watchdog.toggled.connect(self.toggle_watchdog)
+        stall_row.addWidget(self.chk_watchdog)
+        stall_row.addWidget(QLabel("Donma eşiği:"))
+        self.spin_stall = QSpinBox()
+        self.spin_stall.setRange(50, 60000)
+        self.spin_stall.setSuffix(" ms")
+        self.spin_stall.setValue(int(UiWatchdog.stall_ms()))
+        self.spin_stall.valueChanged.connect(UiWatchdog.set_stall_ms)
+        stall_row.addWidget(self.spin_stall)
+        stall_row.addStretch()
+        layout.addLayout(stall_row)
+
+        self.lbl_info = QLabel("")
+        self.lbl_info.setWordWrap(True)
+        self.lbl_info.setStyleSheet("color:#7f8c8d; padding:2px;")
+        layout.addWidget(self.lbl_info)
+
+        self.tabs = QTabWidget()
+        self.tbl_stmts = self._make_table(["SQL", "Adet", "Toplam (ms)", "Ort. (ms)", "Maks. (ms)", "Satır"])
+        self.tbl_waits = self._make_table(["Çağıran", "Adet", "Toplam (ms)", "Ort. (ms)", "Maks. (ms)"])
+        self.tbl_slow = self._make_table(["Zaman", "Süre (ms)", "Execute", "Fetch", "Satır", "Çağıran", "SQL"])
+        self.tbl_slow.itemSelectionChanged.connect(self.show_selected_plan)
+        self.tabs.addTab(self.tbl_stmts, "Sorgular")
+        self.tabs.addTab(self.tbl_waits, "Kilit Bekleme")
+
+        slow_page = QWidget()
+        slow_layout = QVBoxLayout(slow_page)
+        slow_layout.setContentsMargins(0, 0, 0, 0)
+        slow_layout.addWidget(self.tbl_slow, 1)
+        self.lbl_plan = QLabel("Planı görmek için bir satır seçin.")
+        self.lbl_plan.setWordWrap(True)
+        self.lbl_plan.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self.lbl_plan.setStyleSheet("font-family: Consolas, monospace; padding:6px; background:#f8f9fa; border:1px solid #dfe6e9;")
+        slow_layout.addWidget(self.lbl_plan)
+        self.tabs.addTab(slow_page, "Yavaş Sorgular")
+
+        self.tbl_stall_handlers = self._make_table(["İşleyici", "Adet", "Toplam (ms)", "Ort. (ms)", "Maks. (ms)"])
+        self.tbl_stalls = self._make_table(["Zaman", "Süre (ms)", "İşleyici", "Sıcak Satırlar"])
+        self.tbl_stalls.itemSelectionChanged.connect(self.show_selected_stall)
+        stall_page = QWidget()
+        stall_layout = QVBoxLayout(stall_page)
+        stall_layout.setContentsMargins(0, 0, 0, 0)
+        stall_layout.addWidget(self.tbl_stall_handlers, 1)
+        stall_layout.addWidget(self.tbl_stalls, 1)
+        self.lbl_stack = QLabel("Yığını görmek için bir donma seçin.")
+        self.lbl_stack.setWordWrap(True)
+        self.lbl_stack.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self.lbl_stack.setStyleSheet("font-family: Consolas, monospace; padding:6px; background:#f8f9fa; border:1px solid #dfe6e9;")
+        stack_scroll = QScrollArea()
+        stack_scroll.setWidgetResizable(True)
+        stack_scroll.setWidget(self.lbl_stack)
+        stall_layout.addWidget(stack_scroll, 1)
+        self.tabs.addTab(stall_page, "Arayüz Donmaları")
+        layout.addWidget(self.tabs, 1)
+
+        self._slow_rows = []
+        self._stall_rows = []
+        self.refresh()
+
+    @staticmethod
+    def _make_table(headers):
+        t = QTableWidget(0, len(headers))
+        t.setHorizontalHeaderLabels(headers)
+        t.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        t.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        t.verticalHeader().setVisible(False)
+        t.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
+        t.horizontalHeader().setStretchLastSection(True)
+        return t
+
+    @staticmethod
+    def _fill(table, rows):
+        table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            for j, v in enumerate(row):
+                text = f"{v:.1f}" if isinstance(v, float) else str(v)
+                item = QTableWidgetItem(text)
+                if isinstance(v, (int, float)):
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                else:
+                    item.setToolTip(text)
+                table.setItem(i, j, item)
+        table.resizeColumnsToContents()
+        if table.columnWidth(0) > 500:
+            table.setColumnWidth(0, 500)
+
+    def toggle_enabled(self, on):
+        SqlTrace.set_enabled(on)
+        self.refresh()
+
+    def toggle_trace(self, on):
+        Tracer.set_enabled(on)
+        self.refresh()
+
+    def toggle_watchdog(self, on):
+        UiWatchdog.set_enabled(on)
+        self.refresh()
+
+    def export_trace(self):
+        if Tracer.event_count() == 0:
+            ModernDialog.show_warning(self, "Trace", "Kayıtlı span yok. Kaydı açıp işlemi tekrarlayın.")
+            return
+        name = f"htsmercek_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        path, _ = QFileDialog.getSaveFileName(self, "Trace Kaydet", name, "Chrome Trace (*.json)")
+        if not path:
+            return
+        try:
+            n = Tracer.export_chrome(path)
+            ModernDialog.show_success(self, "Trace", f"{n} span kaydedildi:\n{path}")
+        except Exception as e:
+            print(f"❌ [export_trace] {e}")
+            ModernDialog.show_error(self, "Hata", str(e))
+
+    def reset_stats(self):
+        SqlTrace.reset()
+        Tracer.clear()
+        UiWatchdog.reset()
+        self.refresh()
+
+    def refresh(self):
+        snap = SqlTrace.snapshot()
+        self._fill(self.tbl_stmts, snap["statements"])
+        self._fill(self.tbl_waits, snap["lock_waits"])
+        self._slow_rows = snap["slow"]
+        self._fill(self.tbl_slow, [r[:7] for r in self._slow_rows])
+
+        self.lbl_trace.setText(f"{Tracer.event_count()} span")
+
+        stalls = UiWatchdog.snapshot()
+        self._fill(self.tbl_stall_handlers, stalls["handlers"])
+        self._stall_rows = stalls["recent"]
+        self._fill(self.tbl_stalls, [
+            (r[0], r[1], r[2], ", ".join(f"{w} x{n}" for w, n in r[3])) for r in self._stall_rows
+        ])
+        since = datetime.fromtimestamp(snap["since"]).strftime("%d.%m.%Y %H:%M:%S")
+        state = "açık" if SqlTrace.enabled() else "kapalı (istatistik toplanmıyor)"
+        self.lbl_info.setText(
+            f"İzleme {state}. Başlangıç: {since} — {len(snap['statements'])} farklı ifade, "
+            f"{len(self._slow_rows)} yavaş kayıt. Yavaş sorgu günlüğü: {SqlTrace.log_path()}"
+        )
+
+    def show_selected_plan(self):
+        r = self.tbl_slow.currentRow()
+        if 0 <= r < len(self._slow_rows):
+            row = self._slow_rows[r]
+            plan = row[7] or "(plan yok)"
+            self.lbl_plan.setText(f"{row[6]}\n\nPLAN: {plan}")
+
+    def show_selected_stall(self):
+        r = self.tbl_stalls.currentRow()
+        if 0 <= r < len(self._stall_rows):
+            row = self._stall_rows[r]
+            self.lbl_stack.setText(f"{row[2]} — {row[1]:.0f} ms\n\n{row[4] or '(Python yığını yok)'}")
+
+
+class ProjectSearchDialog(QDialog):
+    """Proje geneli arama: tüm ham HTS tablolarında numara / isim / TC / baz / IMEI / IP (FTS5 indeksi)."""
+
+    TABLE_LABELS = {
+        "hts_gsm": "GSM Görüşme", "hts_sms": "SMS", "hts_sabit": "Sabit Hat", "hts_uluslararasi": "Uluslararası",
+        "hts_sth": "STH", "hts_gprs": "GPRS", "hts_wap": "WAP", "hts_abone": "Abone",
+    }
+    ROW_LIMIT = 5000
+
+    def __init__(self, parent, project_id):
+        super().__init__(parent)
+        self.project_id = project_id
+        self._query = ""
+
+        self.setWindowTitle("Proje Geneli Arama")
+        self.resize(1300, 800)
+        self.setWindowFlags(self.windowFlags() | Qt.WindowType.WindowMaximizeButtonHint)
+
+        layout = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        self.txt_query = QLineEdit()
+        self.txt_query.setPlaceholderText(f"Numara, isim, TC, baz, IMEI veya IP (en az {HtsFullText.MIN_QUERY} karakter)...")
+        self.txt_query.setStyleSheet("padding: 6px; font-size: 13px;")
+        self.txt_query.returnPressed.connect(self.run_search)
+        top.addWidget(self.txt_query, 1)
+
+        btn = QPushButton("🔎 Ara")
+        btn.setStyleSheet("background-color:#2980b9; color:white; font-weight:bold; padding:6px 16px; border-radius:4px;")
+        btn.clicked.connect(self.run_search)
+        top.addWidget(btn)
+        layout.addLayout(top)
+
+        self.lbl_info = QLabel("Aranacak metni yazıp Enter'a basın.")
+        self.lbl_info.setStyleSheet("color:#7f8c8d; padding:2px;")
+        layout.addWidget(self.lbl_info)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+
+        self.tbl_groups = QTableWidget(0, 3)
+        self.tbl_groups.setHorizontalHeaderLabels(["GSM", "Tablo", "Kayıt"])
+        self.tbl_groups.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tbl_groups.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.tbl_groups.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tbl_groups.verticalHeader().setVisible(False)
+        self.tbl_groups.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.tbl_groups.itemSelectionChanged.connect(self.load_selected_group)
+        splitter.addWidget(self.tbl_groups)
+
+        self.rows_model = CustomTableModel([], [])
+        self.tbl_rows = QTableView()
+        self.tbl_rows.setModel(self.rows_model)
+        self.tbl_rows.setAlternatingRowColors(True)
+        self.tbl_rows.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        splitter.addWidget(self.tbl_rows)
+
+        splitter.setStretchFactor(0, 1)
+        splitter.setStretchFactor(1, 3)
+        layout.addWidget(splitter, 1)
+
+    def run_search(self):
+        text = self.txt_query.text().strip()
+        if HtsFullText.match_expr(text) is None:
+            self.lbl_info.setText(f"⚠️ En az {HtsFullText.MIN_QUERY} karakter girin.")
+            return
+
+        self.tbl_groups.setRowCount(0)
+        self.rows_model = CustomTableModel([], [])
+        self.tbl_rows.setModel(self.rows_model)
+
+        try:
+            open_project_shard(self.project_id)
+            t0 = time.perf_counter()
+            with DB() as conn:
+                if not HtsFullText.exists(conn):
+                    self.lbl_info.setText("⚠️ Arama indeksi bulunamadı (SQLite sürücüsü FTS5 desteklemiyor olabilir).")
+                    return
+                groups = HtsFullText.search_groups(conn, self.project_id, text)
+            ms = (time.perf_counter() - t0) * 1000
+        except Exception as e:
+            print(f"❌ [ProjectSearchDialog] {e}")
+            ModernDialog.show_error(self, "Hata", f"Arama hatası: {e}")
+            return
+
+        self._query = text
+        self.tbl_groups.setRowCount(len(groups))
+        for i, (gsm, table, cnt) in enumerate(groups):
+            it_gsm = QTableWidgetItem(str(gsm))
+            it_gsm.setData(Qt.ItemDataRole.UserRole, (gsm, table))
+            self.tbl_groups.setItem(i, 0, it_gsm)
+            self.tbl_groups.setItem(i, 1, QTableWidgetItem(self.TABLE_LABELS.get(table, table)))
+            it_cnt = QTableWidgetItem(str(cnt))
+            it_cnt.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.tbl_groups.setItem(i, 2, it_cnt)
+
+        total = sum(g[2] for g in groups)
+        n_gsm = len({g[0] for g in groups})
+        self.lbl_info.setText(f"{total} kayıt, {n_gsm} hat, {len(groups)} grup ({ms:.0f} ms)")
+        if groups:
+            self.tbl_groups.selectRow(0)
+
+    def load_selected_group(self):
+        row = self.tbl_groups.currentRow()
+        item = self.tbl_groups.item(row, 0) if row >= 0 else None
+        key = item.data(Qt.ItemDataRole.UserRole) if item is not None else None
+        if not key or not self._query:
+            return
+
+        gsm, table = key
+        try:
+            with DB() as conn:
+                cols, rows = HtsFullText.fetch_rows(conn, self.project_id, self._query, gsm, table, self.ROW_LIMIT)
+        except Exception as e:
+            print(f"❌ [ProjectSearchDialog] {e}")
+            return
+
+        self.rows_model = CustomTableModel(rows, cols)
+        self.tbl_rows.setModel(self.rows_model)
+        if len(rows) >= self.ROW_LIMIT:
+            self.lbl_info.setText(f"{gsm} / {self.TABLE_LABELS.get(table, table)}: ilk {self.ROW_LIMIT} kayıt gösteriliyor.")
+
+
+class CrossMatchDialog(WatermarkDialogMixin, QDialog):
+    def __init__(self, parent, project_id, available_numbers):
+        super().__init__(parent)
+
+        self.init_watermark(opacity=0.025, scale_ratio=0.90)
+
+        self.project_id = project_id
+        self.available_numbers = available_numbers
 
         self.setWindowTitle("Ortak Temas ve İlişki Analizi")
         self.resize(1300, 850)
@@ -3361,6 +2746,7 @@ class CrossMatchDialog(WatermarkDialogMixin, QDialog):
 
         splitter.addWidget(left_widget)
 
+        from ui.web_view import EvidenceWebEngineView
         self.browser = EvidenceWebEngineView()
         self.browser.setStyleSheet("background-color: white; border: 1px solid #bdc3c7;")
         splitter.addWidget(self.browser)
@@ -3522,6 +2908,7 @@ class CrossMatchDialog(WatermarkDialogMixin, QDialog):
         except Exception as e:
             ModernDialog.show_error(self, "Silme Hatası", str(e))
 
+    @Tracer.traced("analysis.cross_match")
     def start_analysis(self):
         """Seçili numaralarla analizi başlatır."""
         if not LicenseManager.require_valid_or_exit(self, "Ortak temas/ilişki analizi başlat"):
@@ -3547,92 +2934,7 @@ class CrossMatchDialog(WatermarkDialogMixin, QDialog):
 
         try:
             with DB() as conn:
-                cur = conn.cursor()
-
-                # 1) Direkt temaslar (bunu aynen koruyoruz)
-                for i in range(len(self.selected_targets)):
-                    for j in range(i + 1, len(self.selected_targets)):
-                        gsm1 = self.selected_targets[i]
-                        gsm2 = self.selected_targets[j]
-                        c1 = cur.execute(
-                            "SELECT COUNT(*) FROM hts_gsm WHERE ProjeID=? AND GSMNo=? AND DIGER_NUMARA=?",
-                            (self.project_id, gsm1, gsm2)
-                        ).fetchone()[0]
-                        c2 = cur.execute(
-                            "SELECT COUNT(*) FROM hts_gsm WHERE ProjeID=? AND GSMNo=? AND DIGER_NUMARA=?",
-                            (self.project_id, gsm2, gsm1)
-                        ).fetchone()[0]
-                        total = c1 + c2
-                        if total > 0:
-                            self.data_cache.append({
-                                'num': f"{gsm1} <-> {gsm2}",
-                                'name': 'Direkt Temas',
-                                'count': total,
-                                'targets': [gsm1, gsm2],
-                                'type': 'DIRECT'
-                            })
-
-                # 2) Seçili hedeflerden gerçekten verisi olanları bul
-                valid_sources = []
-                for gsm in self.selected_targets:
-                    if cur.execute(
-                        "SELECT 1 FROM hts_gsm WHERE ProjeID=? AND GSMNo=? LIMIT 1",
-                        (self.project_id, gsm)
-                    ).fetchone():
-                        valid_sources.append(gsm)
-
-                # 3) Ortak bağlantılar (BURADA GSM FİLTRESİ EKLİYORUZ)
-                if valid_sources:
-                    placeholders = ",".join(["?"] * len(valid_sources))
-
-                    sql_common = f"""
-                        SELECT DIGER_NUMARA,
-                               MAX(DIGER_ISIM),
-                               COUNT(DISTINCT GSMNo) as HedefSayisi,
-                               COUNT(*) as ToplamGorusme
-                        FROM hts_gsm
-                        WHERE ProjeID=? AND GSMNo IN ({placeholders})
-                        GROUP BY DIGER_NUMARA
-                        HAVING HedefSayisi > 1
-                        ORDER BY ToplamGorusme DESC
-                        LIMIT 500
-                    """
-                    params = [self.project_id] + valid_sources
-                    rows = cur.execute(sql_common, params).fetchall()
-
-                    for r in rows:
-                        raw_diger_no = r[0]
-
-                        # ---- GSM filtre: sadece 10 hane ve 5 ile başlayan kalsın ----
-                        diger_digits = re.sub(r"\D", "", "" if raw_diger_no is None else str(raw_diger_no))
-                        if len(diger_digits) >= 10:
-                            diger_digits = diger_digits[-10:]
-
-                        # İSTENEN: sadece GSM numarası (TR GSM: 5xxxxxxxxx)
-                        if not (len(diger_digits) == 10 and diger_digits.startswith("5")):
-                            continue
-                        diger_no = diger_digits
-                        # ------------------------------------------------------------
-
-                        diger_isim = r[1] if r[1] else "Bilinmiyor"
-                        toplam = r[3]
-
-                        sql_who = f"""
-                            SELECT DISTINCT GSMNo
-                            FROM hts_gsm
-                            WHERE ProjeID=? AND DIGER_NUMARA=? AND GSMNo IN ({placeholders})
-                        """
-                        t_rows = cur.execute(sql_who, [self.project_id, raw_diger_no] + valid_sources).fetchall()
-                        related = [tr[0] for tr in t_rows]
-
-                        self.data_cache.append({
-                            'num': diger_no,
-                            'name': diger_isim,
-                            'count': toplam,
-                            'targets': related,
-                            'type': 'COMMON'
-                        })
-
+                self.data_cache = ContactAnalysis.cross_match(conn, self.project_id, self.selected_targets)
         except Exception as e:
             print(f"Analiz Hatası: {e}")
 
@@ -3845,87 +3147,31 @@ class CrossLocationDialog(WatermarkDialogMixin, QDialog):
         s_date = self.dt_start.dateTime().toString("yyyy-MM-dd HH:mm:ss")
         e_date = self.dt_end.dateTime().toString("yyyy-MM-dd HH:mm:ss")
 
-        targets_ph = ','.join(['?'] * len(self.main_targets))
-
         try:
+            contacts = self.found_contacts if self.search_mode != "DIRECT_ONLY" else []
             with DB() as conn:
-                params = []
-                where_clause = ""
-
-                if self.search_mode == "DIRECT_ONLY":
-                    params.extend(self.main_targets + self.main_targets)
-                    where_clause = f"AND t1.GSMNo IN ({targets_ph}) AND t1.DIGER_NUMARA IN ({targets_ph})"
-                else:
-                    contacts_ph = ','.join(['?'] * len(self.found_contacts))
-                    params.extend(self.main_targets + self.main_targets)
-                    params.extend(self.main_targets + self.found_contacts)
-                    params.extend(self.found_contacts + self.main_targets)
-
-                    where_clause = f"""
-                        AND (
-                            (t1.GSMNo IN ({targets_ph}) AND t1.DIGER_NUMARA IN ({targets_ph}))
-                            OR
-                            (t1.GSMNo IN ({targets_ph}) AND t1.DIGER_NUMARA IN ({contacts_ph}))
-                            OR
-                            (t1.GSMNo IN ({contacts_ph}) AND t1.DIGER_NUMARA IN ({targets_ph}))
-                        )
-                    """
-
-                def to_iso(col):
-                    return f"substr({col}, 7, 4) || '-' || substr({col}, 4, 2) || '-' || substr({col}, 1, 2) || substr({col}, 11)"
+                rows = LocationAnalysis.cross_location(conn, self.project_id, self.main_targets, contacts, s_date, e_date)
 
-                sql = f"""
-                    SELECT 
-                        t1.TARIH, 
-                        t1.GSMNo as Kaynak, 
-                        t1.DIGER_NUMARA as Hedef, 
-                        t1.TIP, 
-                        t1.SURE, 
-                        t1.BAZ as KaynakBaz,
-                        t2.BAZ as HedefBaz, 
-                        t1.IMEI as KaynakIMEI,
-                        t2.IMEI as HedefIMEI
-                    FROM hts_gsm t1
-                    JOIN hts_gsm t2 ON 
-                        t1.ProjeID = t2.ProjeID AND
-                        substr(replace(replace(replace(t2.NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) = 
-                        substr(replace(replace(replace(t1.DIGER_NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) AND
-                        substr(replace(replace(replace(t2.DIGER_NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) = 
-                        substr(replace(replace(replace(t1.NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) AND
-                        datetime({to_iso('t2.TARIH')}) BETWEEN 
-                            datetime({to_iso('t1.TARIH')}, '-3 seconds') AND 
-                            datetime({to_iso('t1.TARIH')}, '+3 seconds')
-                    WHERE t1.ProjeID=?
-                      AND ({to_iso('t1.TARIH')}) BETWEEN ? AND ?
-                      {where_clause}
-                      AND t1.GSMNo != t1.DIGER_NUMARA 
-                    ORDER BY 
-                        {to_iso('t1.TARIH')} DESC
-                """
-
-                final_params = [self.project_id, s_date, e_date] + params
-                rows = conn.execute(sql, final_params).fetchall()
-
-                if not rows:
-                    self.table.set_data([])
-                    ModernDialog.show_info(self, "Sonuç Yok", "Kriterlere uygun ve zamanı eşleşen (±3 sn) kayıt bulunamadı.")
-                    return
+            if not rows:
+                self.table.set_data([])
+                ModernDialog.show_info(self, "Sonuç Yok", "Kriterlere uygun ve zamanı eşleşen (±3 sn) kayıt bulunamadı.")
+                return
 
-                display_data = []
-                for r in rows:
-                    tarih, k, h, tip, s, baz_k, baz_h, imei_k, imei_h = r
-                    yon = "Giden ->" if ("Aradı" in str(tip) or "Giden" in str(tip)) else "<- Gelen"
-                    display_data.append([
-                        tarih, k, h, yon, s,
-                        baz_k if baz_k else "",
-                        baz_h if baz_h else "",
-                        imei_k if imei_k else "",
-                        imei_h if imei_h else ""
-                    ])
+            display_data = []
+            for r in rows:
+                tarih, k, h, tip_kodu, s, baz_k, baz_h, imei_k, imei_h = r
+                yon = "Giden ->" if TipKodu.is_outgoing(tip_kodu) else "<- Gelen"
+                display_data.append([
+                    tarih, k, h, yon, s,
+                    baz_k if baz_k else "",
+                    baz_h if baz_h else "",
+                    imei_k if imei_k else "",
+                    imei_h if imei_h else ""
+                ])
 
-                self.table.set_data(display_data)
+            self.table.set_data(display_data)
 
-                self.apply_column_settings()
+            self.apply_column_settings()
 
         except Exception as e:
             print(f"Konum analizi hatası: {e}")
@@ -4057,30 +3303,7 @@ class SpeedAnomalyDialog(WatermarkDialogMixin, QDialog):
         self.lbl_status = QLabel("Analiz için 'Başlat' butonuna basınız.")
         layout.addWidget(self.lbl_status)
 
-    def calculate_haversine(self, lat1, lon1, lat2, lon2):
-        """İki nokta arasındaki kuş uçuşu mesafeyi hesaplar."""
-        R = 6371.0
-        dlat = math.radians(lat2 - lat1); dlon = math.radians(lon2 - lon1)
-        a = math.sin(dlat / 2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return R * c
-
-    def parse_coordinate(self, text):
-        if not text: return None
-        coords = re.findall(r"(\d{2}\.\d{4,})", str(text))
-        if len(coords) >= 2:
-            try:
-                v1, v2 = float(coords[-2]), float(coords[-1])
-                if 35 < v1 < 43 and 25 < v2 < 46: return (v1, v2)
-                elif 35 < v2 < 43 and 25 < v1 < 46: return (v2, v1)
-                else: return (v1, v2)
-            except: return None
-        return None
-
-    def clean_gsm(self, val):
-        s = re.sub(r'\D', '', str(val))
-        return s[-10:] if len(s) >= 10 else s
-
+    @Tracer.traced("analysis.speed_anomaly")
     def run_analysis(self):
         limit_kmh = self.spin_speed.value()
         limit_dist = self.spin_dist.value()
@@ -4090,89 +3313,30 @@ class SpeedAnomalyDialog(WatermarkDialogMixin, QDialog):
         self.lbl_status.setText("⏳ Analiz yapılıyor...")
         QApplication.processEvents()
 
-        target_clean = self.clean_gsm(self.gsm_number)
-        processed_points = []
-
         try:
             with DB() as conn:
-                sql = """
-                    SELECT TARIH, BAZ, NUMARA FROM hts_gsm 
-                    WHERE ProjeID=? AND GSMNo=? AND BAZ IS NOT NULL AND length(BAZ) > 5
-                    UNION ALL
-                    SELECT TARIH, BAZ, NUMARA FROM hts_gprs 
-                    WHERE ProjeID=? AND GSMNo=? AND BAZ IS NOT NULL AND length(BAZ) > 5
-                    UNION ALL
-                    SELECT TARIH, BAZ, NUMARA FROM hts_wap 
-                    WHERE ProjeID=? AND GSMNo=? AND BAZ IS NOT NULL AND length(BAZ) > 5
-                """
-                params = (self.project_id, self.gsm_number) * 3
-                rows = conn.execute(sql, params).fetchall()
+                points = LocationAnalysis.fetch_points(conn, self.project_id, self.gsm_number)
 
-            if not rows:
-                self.lbl_status.setText("Analiz İptal: Veri yok.")
-                return
-
-            for r in rows:
-                t_str, baz_txt, raw_num = r
-                if self.clean_gsm(raw_num) != target_clean: continue
-
-                coord = self.parse_coordinate(baz_txt)
-                if not coord: continue
-
-                try:
-                    t_str = str(t_str).strip()
-                    fmt = "%d.%m.%Y %H:%M:%S" if "." in t_str else "%Y-%m-%d %H:%M:%S"
-                    if "/" in t_str: fmt = "%d/%m/%Y %H:%M:%S"
-
-                    dt = datetime.strptime(t_str, fmt)
-
-                    processed_points.append({
-                        'dt': dt, 'lat': coord[0], 'lon': coord[1],
-                        'baz': baz_txt, 't_str': t_str
-                    })
-                except: continue
-
-            if len(processed_points) < 2:
+            if len(points) < 2:
                 self.lbl_status.setText("Yetersiz koordinatlı veri.")
                 return
 
-            processed_points.sort(key=lambda x: x['dt'])
             anomalies = []
+            for a in LocationAnalysis.find_speed_anomalies(points, limit_kmh, limit_dist):
+                p1, p2 = a['p1'], a['p2']
+                time_diff_str = f"{a['minutes']:.1f}"
+                dist_str = f"{a['dist_km']:.2f}"
+
+                anomalies.append((
+                    p1['t_str'], p1['baz'],
+                    p2['t_str'], p2['baz'],
+                    dist_str,
+                    time_diff_str,
+                    f"{a['speed']:.0f}"
+                ))
 
-            for i in range(len(processed_points) - 1):
-                p1 = processed_points[i]
-                p2 = processed_points[i+1]
-
-                diff_seconds = (p2['dt'] - p1['dt']).total_seconds()
-                if diff_seconds <= 0: continue
-
-                dist_km = self.calculate_haversine(p1['lat'], p1['lon'], p2['lat'], p2['lon'])
-
-                if dist_km < limit_dist:
-                    continue
-
-                diff_hours = diff_seconds / 3600.0
-                speed = dist_km / diff_hours
-
-                if speed > limit_kmh:
-                    time_diff_str = f"{diff_seconds/60:.1f}"
-                    dist_str = f"{dist_km:.2f}"
-
-                    row_display = (
-                        p1['t_str'], p1['baz'],
-                        p2['t_str'], p2['baz'],
-                        dist_str,
-                        time_diff_str,
-                        f"{speed:.0f}"
-                    )
-                    anomalies.append(row_display)
-
-                    bubble_text = f"📏 {dist_str} km<br>⏱️ {time_diff_str} dk<br>🚀 {speed:.0f} km/s"
-
-                    self.anomaly_cache.append({
-                        'p1': p1, 'p2': p2,
-                        'info': bubble_text
-                    })
+                bubble_text = f"📏 {dist_str} km<br>⏱️ {time_diff_str} dk<br>🚀 {a['speed']:.0f} km/s"
+                self.anomaly_cache.append({'p1': p1, 'p2': p2, 'info': bubble_text})
 
             # Tabloya Bas
             self.table.set_data(anomalies)
@@ -4308,6 +3472,7 @@ class MapDialog(WatermarkDialogMixin, QDialog):
         splitter.addWidget(left_widget)
 
         right_widget = QWidget(); r_layout = QVBoxLayout(right_widget); r_layout.setContentsMargins(0,0,0,0)
+        from ui.web_view import EvidenceWebEngineView
         self.browser = EvidenceWebEngineView(); self.browser.setStyleSheet("background-color: white;")
         r_layout.addWidget(self.browser)
         splitter.addWidget(right_widget); splitter.setSizes([400, 900])
@@ -4706,6 +3871,7 @@ class DailyRouteDialog(WatermarkDialogMixin, QDialog):
         h_info.addStretch()
         layout.addWidget(self.info_frame)
 
+        from ui.web_view import EvidenceWebEngineView
         self.browser = EvidenceWebEngineView()
         self.browser.setStyleSheet("background-color: white;")
         layout.addWidget(self.browser, 1)
@@ -4820,6 +3986,7 @@ class DailyRouteDialog(WatermarkDialogMixin, QDialog):
     def draw_route(self):
         import folium
         from folium.features import DivIcon
+        from ui.map_elements import DraggableConnector
         self.update_info_label()
         self.browser.setHtml(
             "<div style='display:flex; justify-content:center; align-items:center; height:100vh; "
@@ -5318,10 +4485,41 @@ class GraphPopupDialog(QDialog):
         layout.addWidget(self.graph_widget)
 
 
+class ChartAggregateWorker(QThread):
+    """GenericDatabaseTable grafik verisini (tüm satırlar üzerinde top-N) arka planda hesaplar."""
+    result = pyqtSignal(int, list)   # istek no, [(etiket, adet)]
+    error = pyqtSignal(int, str)
+
+    def __init__(self, request_id, rows, target_col, qty_col, name_col, row_ids=None):
+        super().__init__()
+        self.request_id = request_id
+        self.rows = rows
+        self.target_col = target_col
+        self.qty_col = qty_col
+        self.name_col = name_col
+        self.row_ids = row_ids
+
+    def run(self):
+        try:
+            data = ChartAggregator.aggregate(
+                self.rows, self.target_col, self.qty_col, self.name_col, row_ids=self.row_ids
+            )
+            self.result.emit(self.request_id, data)
+        except Exception as e:
+            print(f"❌ [ChartAggregateWorker] {e}")
+            self.error.emit(self.request_id, str(e))
+
+
 class GenericDatabaseTable(QWidget):
+    # bu kadar satıra kadar grafik verisi doğrudan (thread açmadan) hesaplanır
+    CHART_SYNC_ROWS = 20000
+
     def __init__(self, headers, enable_date_filter=False, chart_mode='embedded', info_text=None, enable_evidence_menu=True):
         super().__init__()
         self.raw_data = []
+        self._raw_date_keys = None
+        self._chart_request = 0
+        self._chart_workers = set()
         self.headers = headers
         self.chart_mode = chart_mode
         self.date_col_index = -1
@@ -5403,7 +4601,7 @@ class GenericDatabaseTable(QWidget):
         self.model = self.source_model
         self.proxy_model = DateSortFilterProxyModel()
         self.proxy_model.setSourceModel(self.source_model)
-        self.proxy_model.setFilterKeyColumn(-1)
+        self.proxy_model.searchApplied.connect(self._on_search_applied)
         self.table.setModel(self.proxy_model)
 
         t_layout.addWidget(self.table)
@@ -5557,6 +4755,8 @@ class GenericDatabaseTable(QWidget):
                 b64 = base64.b64encode(bytes(ba)).decode("ascii")
                 return f"data:image/png;base64,{b64}"
 
+            _icon_refs = {}
+
             def _index_to_html_cell(idx) -> str:
                 """
                 Hücre HTML'i:
@@ -5570,20 +4770,30 @@ class GenericDatabaseTable(QWidget):
                 data_uri = ""
 
                 try:
+                    img = None
                     if isinstance(deco, QIcon):
                         pm = deco.pixmap(18, 18)
                         if isinstance(pm, QPixmap) and not pm.isNull():
-                            data_uri = _qimage_to_data_uri(pm.toImage())
+                            img = pm.toImage()
                     elif isinstance(deco, QPixmap):
                         if not deco.isNull():
-                            data_uri = _qimage_to_data_uri(deco.toImage())
+                            img = deco.toImage()
                     elif isinstance(deco, QImage):
                         if not deco.isNull():
-                            data_uri = _qimage_to_data_uri(deco)
+                            img = deco
+
+                    if img is not None:
+                        key = deco.cacheKey()
+                        data_uri = _icon_refs.get(key)
+                        if data_uri is None:
+                            with DB() as conn:
+                                gid, _p = EvidenceStore.put_image(conn, img, "icon")
+                            data_uri = EvidenceStore.ref(gid) if gid else _qimage_to_data_uri(img)
+                            _icon_refs[key] = data_uri
                 except Exception:
                     data_uri = ""
 
-                # ikon varsa başa koy (PDF engine kaçırmasın diye inline)
+                # ikon varsa başa koy (depoya bir kez yazılır, hücrelerde id ile referans verilir)
                 if data_uri:
                     icon_html = (
                         f"<img src=\"{data_uri}\" "
@@ -5593,19 +4803,24 @@ class GenericDatabaseTable(QWidget):
 
                 return html.escape(text)
 
-            # HTML tablo üret
+            # HTML tablo üret (+ yapısal form: rapor render'ı HTML'i yeniden parse etmesin)
+            cell_rows = [[_index_to_html_cell(proxy.index(r, c)) for c in kept_cols] for r in rows]
+
             html_table = "<table class='meta-table'>"
             if include_headers:
                 html_table += "<tr>" + "".join(f"<th>{html.escape(h)}</th>" for h in kept_headers) + "</tr>"
 
-            for r in rows:
-                html_table += "<tr>"
-                for c in kept_cols:
-                    idx = proxy.index(r, c)
-                    html_table += f"<td>{_index_to_html_cell(idx)}</td>"
-                html_table += "</tr>"
+            for cells in cell_rows:
+                html_table += "<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>"
             html_table += "</table>"
 
+            tablo_json = None
+            if include_headers:
+                tbl = table_struct_from_rows(
+                    [html.escape(h) for h in kept_headers], cell_rows, cls=["meta-table"], escape=False
+                )
+                tablo_json = table_struct_dumps(tbl)
+
             # Düz metin (ikonlar metne gömülmez; sadece görüntüye gömülür)
             selected_text_lines = []
             for r in rows:
@@ -5678,8 +4893,8 @@ class GenericDatabaseTable(QWidget):
                 c.execute(
                     """
                     INSERT INTO rapor_taslagi
-                    (ProjeID, GSMNo, Baslik, Icerik, Tur, Tarih, Sira, GenislikYuzde, YukseklikMm, Hizalama, Aciklama, HtmlIcerik, ImagePath)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    (ProjeID, GSMNo, Baslik, Icerik, Tur, Tarih, Sira, GenislikYuzde, YukseklikMm, Hizalama, Aciklama, HtmlIcerik, ImagePath, TabloJson)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
                     (
                         self.project_id,
@@ -5694,7 +4909,8 @@ class GenericDatabaseTable(QWidget):
                         "LEFT",
                         "",
                         html_table,
-                        None
+                        None,
+                        tablo_json
                     )
                 )
                 conn.commit()
@@ -5732,84 +4948,60 @@ class GenericDatabaseTable(QWidget):
         self.owner_label = text
 
     def prepare_chart_data(self, target_widget):
-        """Veriyi hazırlar: İsim ve Adet bilgisini etikete gömer."""
-        rows_count = self.proxy_model.rowCount()
-        scan_limit = min(rows_count, 2000)
-
-        target_col_idx = -1
-        qty_col_idx = -1
-        name_col_idx = -1
+        """
+        Grafik listesini tablonun TÜM (filtreden geçen) satırları üzerinden hazırlar: İsim ve Adet etikete gömülür.
+        Büyük tablolarda toplama arka planda yapılır; sonuç gelene kadar 'Hesaplanıyor' gösterilir.
+        """
+        target_col_idx, qty_col_idx, name_col_idx = ChartAggregator.detect_columns(self.headers)
         center_name = self.owner_label
 
-        for i, header in enumerate(self.headers):
-            h_clean = str(header).upper().replace('İ','I').replace('Ğ','G').replace('Ü','U').replace('Ş','S').replace('Ö','O').replace('Ç','C')
-
-            if "BAZ" in h_clean or "KONUM" in h_clean:
-                if target_col_idx == -1: target_col_idx = i
-            elif "KARSI" in h_clean or "DIGER NUMARA" in h_clean or "ARANAN" in h_clean or "GSM NUMARASI" in h_clean:
-                if target_col_idx == -1: target_col_idx = i
-            elif "IMEI" in h_clean:
-                if target_col_idx == -1: target_col_idx = i
-
-            if "ADET" in h_clean or "SINYAL" in h_clean or "SAYI" in h_clean or "KULLANIM" in h_clean:
-                qty_col_idx = i
-
-            if "ISIM" in h_clean or "AD SOYAD" in h_clean or "KISI ADI" in h_clean:
-                name_col_idx = i
-
-        if target_col_idx != -1:
-            final_data = []
-
-            if qty_col_idx != -1:
-                for r in range(scan_limit):
-                    idx_target = self.proxy_model.index(r, target_col_idx)
-                    val_target = str(self.proxy_model.data(idx_target, Qt.ItemDataRole.EditRole))
-
-                    idx_qty = self.proxy_model.index(r, qty_col_idx)
-                    val_qty = self.proxy_model.data(idx_qty, Qt.ItemDataRole.EditRole)
-                    try: count = int(val_qty)
-                    except: count = 1
-
-                    display_label = val_target
-
-                    if name_col_idx != -1:
-                        idx_name = self.proxy_model.index(r, name_col_idx)
-                        val_name = str(self.proxy_model.data(idx_name, Qt.ItemDataRole.EditRole))
-                        if val_name and val_name not in ["", "None", "Unknown"]:
-                            display_label = f"{val_target}\n{val_name}"
-
-                    display_label += f"\n({count} Adet)"
-
-                    final_data.append((display_label, count))
-
-            else:
-                raw_items = []
-                for r in range(scan_limit):
-                    idx = self.proxy_model.index(r, target_col_idx)
-                    val = self.proxy_model.data(idx, Qt.ItemDataRole.EditRole)
+        self._chart_request += 1
+        request_id = self._chart_request
 
-                    val_name = ""
-                    if name_col_idx != -1:
-                        idx_n = self.proxy_model.index(r, name_col_idx)
-                        val_name = str(self.proxy_model.data(idx_n, Qt.ItemDataRole.EditRole))
+        if target_col_idx == -1:
+            target_widget.browser.setHtml("<h3 style='text-align:center; margin-top:50px; color:#e74c3c'>Uygun Sütun Bulunamadı</h3>")
+            return
 
-                    if val and str(val).strip() not in ['', 'None', '---', 'nan']:
-                        if val_name: raw_items.append(f"{val}\n{val_name}")
-                        else: raw_items.append(str(val))
+        def _show(rid, final_data):
+            if rid != self._chart_request:
+                return  # daha yeni bir istek var
+            try:
+                if final_data:
+                    target_widget.load_list_data(center_name, final_data)
+                else:
+                    target_widget.load_list_data(center_name, [])
+                    target_widget.browser.setHtml("<h3 style='text-align:center; margin-top:50px; color:#7f8c8d'>Veri Yok</h3>")
+            except RuntimeError:
+                pass  # pencere kapatılmış
+
+        # model verisi değişince yeni liste atanır (update_data) -> referans thread için güvenli anlık görüntü
+        rows = self.source_model._data
+        row_ids = self.proxy_model.accepted_source_rows()
+        n = len(rows) if row_ids is None else len(row_ids)
+
+        if n <= self.CHART_SYNC_ROWS:
+            _show(request_id, ChartAggregator.aggregate(rows, target_col_idx, qty_col_idx, name_col_idx, row_ids=row_ids))
+            return
 
-                counts = Counter(raw_items).most_common(500)
+        target_widget.load_list_data(center_name, [])
+        target_widget.browser.setHtml(
+            f"<h3 style='text-align:center; margin-top:50px; color:#7f8c8d'>Hesaplanıyor... ({n:,} kayıt)</h3>".replace(",", ".")
+        )
 
-                # [DÜZELTME] Sayım bittikten sonra etiketlere adet ekle
-                for item, cnt in counts:
-                    label_with_count = f"{item}\n({cnt} Adet)"
-                    final_data.append((label_with_count, cnt))
+        def _fail(rid, err):
+            if rid != self._chart_request:
+                return
+            try:
+                target_widget.browser.setHtml(f"<h3 style='text-align:center; margin-top:50px; color:#e74c3c'>Grafik hazırlanamadı: {html.escape(err)}</h3>")
+            except RuntimeError:
+                pass
 
-            if final_data:
-                target_widget.load_list_data(center_name, final_data)
-            else:
-                target_widget.browser.setHtml("<h3 style='text-align:center; margin-top:50px; color:#7f8c8d'>Veri Yok</h3>")
-        else:
-            target_widget.browser.setHtml("<h3 style='text-align:center; margin-top:50px; color:#e74c3c'>Uygun Sütun Bulunamadı</h3>")
+        w = ChartAggregateWorker(request_id, rows, target_col_idx, qty_col_idx, name_col_idx, row_ids)
+        self._chart_workers.add(w)
+        w.result.connect(_show)
+        w.error.connect(_fail)
+        w.finished.connect(lambda: self._chart_workers.discard(w))
+        w.start()
 
     def switch_view(self, index):
         """Gömülü modda sekme değiştirir."""
@@ -5829,6 +5021,7 @@ class GenericDatabaseTable(QWidget):
 
     def set_data(self, data):
         self.raw_data = data
+        self._raw_date_keys = None
         self.source_model.update_data(data)
         self.lbl_count.setText(f"Kayıt: {len(data)}")
 
@@ -5892,31 +5085,30 @@ class GenericDatabaseTable(QWidget):
         if self.chart_mode == 'embedded' and self.stack.currentIndex() == 1:
             self.switch_view(1)
 
-    def filter_text(self, text):
-        self.proxy_model.setSearchText(text)
-        self.lbl_count.setText(f"Kayıt: {self.proxy_model.rowCount()}")
-
     def set_date_range(self, min_dt, max_dt):
         if hasattr(self, 'dt_start') and self.date_col_index != -1:
             self.dt_start.setDateTime(min_dt)
             self.dt_end.setDateTime(max_dt)
 
     def filter_text(self, text):
-        self.proxy_model.setSearchText(text)
+        self.proxy_model.queueSearchText(text)
+
+    def _on_search_applied(self):
         self.lbl_count.setText(f"Kayıt: {self.proxy_model.rowCount()}")
 
     def apply_date_filter(self):
         if self.date_col_index == -1 or not self.raw_data: return
-        min_val = self.dt_start.dateTime(); max_val = self.dt_end.dateTime()
-        filtered_data = []
-        for row in self.raw_data:
-            date_str = str(row[self.date_col_index])
-            try:
-                fmt = "dd.MM.yyyy HH:mm:ss" if "." in date_str else "dd/MM/yyyy HH:mm:ss"
-                if " " not in date_str: fmt = fmt.split(" ")[0]
-                row_dt = QDateTime.fromString(date_str, fmt)
-                if row_dt.isValid() and min_val <= row_dt <= max_val: filtered_data.append(row)
-            except: pass
+        min_ep = ColumnKeys.qdatetime_epoch(self.dt_start.dateTime())
+        max_ep = ColumnKeys.qdatetime_epoch(self.dt_end.dateTime())
+
+        # tarih anahtarları veri başına bir kez çözülür (filtre her değiştiğinde yeniden parse yok)
+        if self._raw_date_keys is None or len(self._raw_date_keys) != len(self.raw_data):
+            self._raw_date_keys = ColumnKeys.date_keys(self.raw_data, self.date_col_index)
+
+        filtered_data = [
+            row for row, ep in zip(self.raw_data, self._raw_date_keys)
+            if ep is not None and min_ep <= ep <= max_ep
+        ]
         self.source_model.update_data(filtered_data)
         self.lbl_count.setText(f"Kayıt: {len(filtered_data)}")
 
@@ -6081,6 +5273,43 @@ class ProjectManager(QWidget):
         h_sub_btns.addWidget(btn_vac)
 
         btn_layout.addLayout(h_sub_btns)
+
+        # ✅ DB doluluk / boş sayfa / WAL bilgisi
+        self.lbl_db_stats = QLabel("")
+        self.lbl_db_stats.setWordWrap(True)
+        self.lbl_db_stats.setStyleSheet("color: #6b7280; font-size: 11px; border: none; padding: 2px 4px;")
+        btn_layout.addWidget(self.lbl_db_stats)
+        self._maint_worker = None
+
+        self.btn_shards = QPushButton()
+        self.btn_shards.setStyleSheet("QPushButton { background-color: #ecf0f1; color: #2c3e50; padding: 6px; border-radius: 5px; border: 1px solid #d0d7de; } QPushButton:hover { background-color: #dfe6e9; }")
+        self.btn_shards.clicked.connect(self.toggle_project_shards)
+        btn_layout.addWidget(self.btn_shards)
+        self._shard_worker = None
+        self._update_shard_button()
+
+        # ✅ SQLCipher performans profili (settings.json; bağlantı açılışında uygulanır)
+        h_profile = QHBoxLayout()
+        lbl_profile = QLabel("⚙️ DB Profili:")
+        lbl_profile.setStyleSheet("color: #2c3e50; font-size: 11px; border: none;")
+        h_profile.addWidget(lbl_profile)
+        self.cmb_db_profile = QComboBox()
+        for name, prof in DbProfile.PROFILES.items():
+            self.cmb_db_profile.addItem(prof["label"], name)
+        self.cmb_db_profile.setCurrentIndex(max(0, self.cmb_db_profile.findData(DbProfile.current_name())))
+        self.cmb_db_profile.setToolTip(DbProfile.describe(DbProfile.current_name()))
+        self.cmb_db_profile.currentIndexChanged.connect(self.change_db_profile)
+        h_profile.addWidget(self.cmb_db_profile, 1)
+        btn_layout.addLayout(h_profile)
+
+        btn_sql_diag = QPushButton("🩺 Performans Tanılama")
+        btn_sql_diag.setStyleSheet("QPushButton { background-color: #ecf0f1; color: #2c3e50; padding: 6px; border-radius: 5px; border: 1px solid #d0d7de; } QPushButton:hover { background-color: #dfe6e9; }")
+        btn_sql_diag.setToolTip("Sorgu süreleri, DB kilidi beklemeleri, yavaş sorgu planları ve zaman çizelgesi (trace) kaydı.")
+        btn_sql_diag.clicked.connect(self.open_sql_diagnostics)
+        btn_layout.addWidget(btn_sql_diag)
+
+        QTimer.singleShot(0, self.refresh_db_stats)
+
         left_layout.addLayout(btn_layout)
         self.main_splitter.addWidget(left_widget)
 
@@ -6554,6 +5783,13 @@ class ProjectManager(QWidget):
         try:
             src = self.p_table.proxy_model.mapToSource(idx)
             p_id = self.p_table.source_model._data[src.row()][0]
+
+            try:
+                open_project_shard(p_id)
+            except RuntimeError as e:
+                ModernDialog.show_warning(self, "Uyarı", str(e))
+                return
+
             self.selected_project_id = p_id
 
             with DB() as conn:
@@ -6659,6 +5895,9 @@ class ProjectManager(QWidget):
 
                 conn.commit()
 
+            if self.selected_project_id:
+                open_project_shard(self.selected_project_id)
+
             self.load_projects()
 
         except Exception as e:
@@ -6671,84 +5910,221 @@ class ProjectManager(QWidget):
 
         if ModernDialog.show_question(self, "Projeyi Sil", "Bu projeyi ve içerisindeki TÜM verileri (HTS, Raporlar, Konumlar) silmek istediğinize emin misiniz?"):
 
-            if hasattr(self.main, 'loader'): self.main.loader.start("Proje Siliniyor...")
-            QApplication.processEvents()
+            pid = self.selected_project_id
+            all_tables = [
+                "hts_gsm", "hts_gprs", "hts_wap", "hts_sms", "hts_sabit",
+                "hts_sth", "hts_uluslararasi", "hts_abone",
+                "hts_tum_baz", "hts_rehber",
+                "hts_ozet_iletisim", "hts_ozet_baz", "hts_ozet_imei", "hts_ozet",
+                "hts_ortak_imei", "hts_ortak_isim", "hts_ortak_tc",
+                "ozel_konumlar", "rapor_taslagi", "taraflar", "hts_dosyalari",
+            ]
 
             try:
-                with DB() as conn:
-                    all_tables = [
-                        "taraflar", "hts_abone", "hts_gsm", "hts_sms", "hts_sabit",
-                        "hts_gprs", "hts_wap", "hts_sth", "hts_uluslararasi",
-                        "hts_ozet", "hts_ozet_iletisim", "hts_ozet_baz", "hts_ozet_imei",
-                        "hts_rehber", "hts_tum_baz", "ozel_konumlar",
-                        "hts_ortak_imei", "hts_ortak_isim", "hts_ortak_tc", "rapor_taslagi"
-                    ]
-
-                    for t in all_tables:
-                        try: conn.execute(f"DELETE FROM {t} WHERE ProjeID=?", (self.selected_project_id,))
-                        except: pass
+                # proje dosyası yerleşiminde ham HTS verisi = tek dosya -> silme dosya silmektir
+                if ProjectShards.enabled():
+                    with DB() as conn:
+                        ProjectShards.delete_shard(conn, pid, create_raw_hts_schema)
+                    all_tables = [t for t in all_tables if t not in RAW_HTS_TABLES]
+            except Exception as e:
+                ModernDialog.show_error(self, "Hata", str(e))
+                return
 
-                    conn.execute("DELETE FROM projeler WHERE id=?", (self.selected_project_id,))
-                    conn.commit()
+            # proje kaydı en son: iptal edilirse proje listede kalır, silme tekrarlanabilir
+            targets = [(t, "ProjeID=?", (pid,)) for t in all_tables]
+            targets.append(("projeler", "id=?", (pid,)))
 
+            def _done(deleted, cancelled):
+                ReportRenderCache.invalidate_project(pid)
                 AnalysisUtils.perform_maintenance()
-                self.clear_form()
+                self.refresh_db_stats()
+                if not cancelled:
+                    self.clear_form()
                 self.load_projects()
                 self.load_project_gsms()
-                ModernDialog.show_success(self, "Silindi", "Proje tamamen silindi ve bakım yapıldı.")
-
-            except Exception as e:
-                ModernDialog.show_error(self, "Hata", str(e))
-            finally:
-                if hasattr(self.main, 'loader'): self.main.loader.stop()
+                if cancelled:
+                    ModernDialog.show_warning(self, "İptal Edildi", "Silme yarıda kesildi. Kalan kayıtlar için işlemi tekrarlayabilirsiniz.")
+                else:
+                    ModernDialog.show_success(self, "Silindi", "Proje tamamen silindi ve bakım yapıldı.")
 
-    def vacuum_db(self):
-        if ModernDialog.show_question(self, "Bakım", "Veritabanı sıkıştırılacak. Devam edilsin mi?"):
-            if AnalysisUtils.perform_maintenance():
-                ModernDialog.show_success(self, "Bakım", "Veritabanı sıkıştırıldı.")
-            else:
-                ModernDialog.show_error(self, "Hata", "Bakım yapılamadı.")
+            start_record_delete(self, targets, None, "Proje Siliniyor...", _done)
 
-    def add_taraf(self):
-        if not self.selected_project_id:
-            ModernDialog.show_warning(self, "Uyarı", "Önce projeyi kaydedin veya seçin.")
+    def change_db_profile(self, _idx=None):
+        name = self.cmb_db_profile.currentData()
+        if not name or name == DbProfile.current_name():
             return
-
-        ad_soyad = self.inp_adsoyad.text().strip()
-        if not ad_soyad: return
-
         try:
-            with DB() as conn:
-                conn.execute("INSERT INTO taraflar (ProjeID, sifat, ad_soyad) VALUES (?,?,?)",
-                             (self.selected_project_id, self.cmb_sifat.currentText(), ad_soyad))
+            DatabaseManager().apply_profile(name)
+            self.cmb_db_profile.setToolTip(DbProfile.describe(name))
+            fmt = DbProfile.stored_format()
+            if DbProfile.format_of(DbProfile.PROFILES[name]) != fmt:
+                ModernDialog.show_info(
+                    self, "DB Profili",
+                    "Önbellek ayarları hemen uygulandı.\n"
+                    "Şifreli sayfa boyutu / KDF mevcut veritabanında değişmez "
+                    f"({fmt['page_size']} B / {fmt['kdf_iter']}); yeni oluşturulan veritabanında geçerli olur."
+                )
+        except Exception as e:
+            print(f"❌ [change_db_profile] {e}")
+            ModernDialog.show_error(self, "Hata", str(e))
 
-            self.inp_adsoyad.clear()
-            self.load_parties()
-            ModernDialog.show_success(self, "Başarılı", "Taraf eklendi.")
+    def open_sql_diagnostics(self):
+        dlg = SqlDiagnosticsDialog(self)
+        dlg.exec()
 
+    def refresh_db_stats(self):
+        try:
+            st = DbMaintenance.stats(DatabaseManager(), DatabaseManager.DB_PATH)
+            self.lbl_db_stats.setText(DbMaintenance.format_stats(st))
         except Exception as e:
-            print(f"Ekleme Hatası: {e}")
+            print(f"⚠️ [refresh_db_stats] {e}")
+
+    def _update_shard_button(self):
+        on = ProjectShards.enabled()
+        self.btn_shards.setText("🗂️ Proje Başına Veri Dosyası: " + ("Açık" if on else "Kapalı"))
+        self.btn_shards.setToolTip(
+            "Açıkken her projenin ham HTS kayıtları ayrı şifreli dosyada tutulur ve proje açılınca bağlanır.\n"
+            "Proje silme dosya silmeye dönüşür; yedek/bakım proje boyutunda kalır."
+        )
 
-    def delete_taraf(self):
-        """Seçili tarafı siler ve listeyi ANINDA günceller."""
-        idx = self.party_table.table.currentIndex()
-        if not idx.isValid():
-            ModernDialog.show_warning(self, "Seçim Yok", "Lütfen silinecek kişiyi listeden seçiniz.")
+    def toggle_project_shards(self):
+        if self.is_uploading:
+            ModernDialog.show_warning(self, "Uyarı", "Yükleme sürerken veri yerleşimi değiştirilemez.")
+            return
+        if self._shard_worker is not None and self._shard_worker.isRunning():
             return
 
-        if ModernDialog.show_question(self, "Silme Onayı", "Seçili tarafı listeden silmek istediğinize emin misiniz?"):
-            try:
-                src = self.party_table.proxy_model.mapToSource(idx)
-                rid = self.party_table.source_model._data[src.row()][0]
+        to_sharded = not ProjectShards.enabled()
+        if to_sharded:
+            msg = ("Her projenin ham HTS kayıtları ayrı şifreli dosyaya taşınacak. "
+                   "Büyük veritabanlarında bu işlem uzun sürebilir.\nDevam edilsin mi?")
+        else:
+            msg = ("Proje dosyalarındaki kayıtlar tek veritabanına geri taşınacak.\nDevam edilsin mi?")
+        if not ModernDialog.show_question(self, "Veri Yerleşimi", msg):
+            return
 
-                with DB() as conn:
-                    conn.execute("DELETE FROM taraflar WHERE id=?", (rid,))
-                self.load_parties()
+        w = ShardConversionWorker(to_sharded)
+        self._shard_worker = w
 
-                ModernDialog.show_success(self, "Başarılı", "Kayıt silindi.")
+        if hasattr(self.main, 'loader'):
+            self.main.loader.start("Veri yerleşimi dönüştürülüyor...")
+            w.progress.connect(self.main.loader.set_progress)
 
-            except Exception as e:
-                ModernDialog.show_error(self, "Hata", str(e))
+        def _done():
+            if hasattr(self.main, 'loader'): self.main.loader.stop()
+            if self.selected_project_id:
+                try:
+                    open_project_shard(self.selected_project_id)
+                except Exception as e:
+                    print(f"⚠️ [toggle_project_shards] {e}")
+            self._update_shard_button()
+            self.refresh_db_stats()
+            self.load_project_gsms()
+            ModernDialog.show_success(self, "Veri Yerleşimi", "Dönüşüm tamamlandı.")
+
+        def _fail(err):
+            if hasattr(self.main, 'loader'): self.main.loader.stop()
+            self._update_shard_button()
+            ModernDialog.show_error(self, "Hata", f"Dönüşüm yapılamadı.\n{err}")
+
+        w.finished_ok.connect(_done)
+        w.error.connect(_fail)
+        w.start()
+
+    def vacuum_db(self):
+        if self._maint_worker is not None and self._maint_worker.isRunning():
+            ModernDialog.show_warning(self, "Bakım", "Bakım zaten devam ediyor.")
+            return
+
+        try:
+            st = DbMaintenance.stats(DatabaseManager(), DatabaseManager.DB_PATH)
+        except Exception as e:
+            ModernDialog.show_error(self, "Hata", f"Veritabanı bilgisi okunamadı:\n{e}")
+            return
+
+        convert = False
+        if st["incremental"]:
+            msg = (
+                f"{DbMaintenance.format_stats(st)}\n\n"
+                "Boş alan arka planda küçük adımlarla geri kazanılacak; bu sırada çalışmaya devam edebilirsiniz.\n"
+                "Devam edilsin mi?"
+            )
+        else:
+            convert = True
+            msg = (
+                f"{DbMaintenance.format_stats(st)}\n\n"
+                "Veritabanı henüz artımlı sıkıştırma modunda değil. Tek seferlik tam sıkıştırma yapılacak "
+                "(büyük veritabanlarında uzun sürebilir). Sonraki bakımlar arka planda ve beklemeden yapılır.\n"
+                "Devam edilsin mi?"
+            )
+
+        if not ModernDialog.show_question(self, "Bakım", msg):
+            return
+
+        w = DbMaintenanceWorker(convert=convert)
+        self._maint_worker = w
+
+        if convert and hasattr(self.main, 'loader'):
+            self.main.loader.start("Veritabanı sıkıştırılıyor (tek seferlik)...")
+            w.progress.connect(self.main.loader.set_progress)
+        else:
+            self.lbl_db_stats.setText("🛠️ Bakım sürüyor...")
+            w.progress.connect(lambda p: self.lbl_db_stats.setText(f"🛠️ Bakım sürüyor... %{p}"))
+
+        def _done(freed_pages):
+            if hasattr(self.main, 'loader'): self.main.loader.stop()
+            self.refresh_db_stats()
+            ModernDialog.show_success(self, "Bakım", "Veritabanı bakımı tamamlandı.")
+
+        def _fail(err):
+            if hasattr(self.main, 'loader'): self.main.loader.stop()
+            self.refresh_db_stats()
+            ModernDialog.show_error(self, "Hata", f"Bakım yapılamadı.\n{err}")
+
+        w.finished_ok.connect(_done)
+        w.error.connect(_fail)
+        w.start()
+
+    def add_taraf(self):
+        if not self.selected_project_id:
+            ModernDialog.show_warning(self, "Uyarı", "Önce projeyi kaydedin veya seçin.")
+            return
+
+        ad_soyad = self.inp_adsoyad.text().strip()
+        if not ad_soyad: return
+
+        try:
+            with DB() as conn:
+                conn.execute("INSERT INTO taraflar (ProjeID, sifat, ad_soyad) VALUES (?,?,?)",
+                             (self.selected_project_id, self.cmb_sifat.currentText(), ad_soyad))
+
+            self.inp_adsoyad.clear()
+            self.load_parties()
+            ModernDialog.show_success(self, "Başarılı", "Taraf eklendi.")
+
+        except Exception as e:
+            print(f"Ekleme Hatası: {e}")
+
+    def delete_taraf(self):
+        """Seçili tarafı siler ve listeyi ANINDA günceller."""
+        idx = self.party_table.table.currentIndex()
+        if not idx.isValid():
+            ModernDialog.show_warning(self, "Seçim Yok", "Lütfen silinecek kişiyi listeden seçiniz.")
+            return
+
+        if ModernDialog.show_question(self, "Silme Onayı", "Seçili tarafı listeden silmek istediğinize emin misiniz?"):
+            try:
+                src = self.party_table.proxy_model.mapToSource(idx)
+                rid = self.party_table.source_model._data[src.row()][0]
+
+                with DB() as conn:
+                    conn.execute("DELETE FROM taraflar WHERE id=?", (rid,))
+                self.load_parties()
+
+                ModernDialog.show_success(self, "Başarılı", "Kayıt silindi.")
+
+            except Exception as e:
+                ModernDialog.show_error(self, "Hata", str(e))
 
     def load_project_gsms(self):
         gsm_table = getattr(self, "pm_gsm_table", None)
@@ -6871,43 +6247,27 @@ class ProjectManager(QWidget):
 
         if ModernDialog.show_question(self, "Silme Onayı", f"{len(gsms_to_delete)} adet numara silinecek.\nOnaylıyor musunuz?"):
 
-            if hasattr(self.main, 'loader'): self.main.loader.start("Siliniyor...")
-            QApplication.processEvents()
-
-            try:
-                with DB() as conn:
-                    tabs_gsm = [
-                        "hts_dosyalari", "hts_abone", "hts_gsm", "hts_sms",
-                        "hts_sabit", "hts_gprs", "hts_wap", "hts_sth", "hts_uluslararasi",
-                        "hts_ozet", "hts_ozet_iletisim", "hts_ozet_baz", "hts_ozet_imei",
-                        "hts_rehber", "hts_tum_baz"
-                    ]
-
-                    for gsm in gsms_to_delete:
-                        for t in tabs_gsm:
-                            try:
-                                conn.execute(f"DELETE FROM {t} WHERE ProjeID=? AND GSMNo=?", (self.selected_project_id, gsm))
-                            except Exception as e:
-                                print(f"⚠️ [PM Delete] '{t}' tablosu silinirken hata: {e}")
-
-                    tabs_common = ["hts_ortak_imei", "hts_ortak_isim", "hts_ortak_tc"]
-                    for t in tabs_common:
-                        conn.execute(f"DELETE FROM {t} WHERE ProjeID=?", (self.selected_project_id,))
-
-                    conn.commit()
+            pid = self.selected_project_id
+            targets = AnalysisUtils.gsm_delete_targets(pid, gsms_to_delete)
+            for t in ("hts_ortak_imei", "hts_ortak_isim", "hts_ortak_tc"):
+                targets.append((t, "ProjeID=?", (pid,)))
 
-                self.recalculate_common_analysis()
+            def _done(deleted, cancelled):
+                try:
+                    self.recalculate_common_analysis()
+                except Exception as e:
+                    print(f"❌ [PM Delete] Ortak analiz güncellenemedi: {e}")
                 AnalysisUtils.perform_maintenance()
                 self.load_project_gsms()
                 self.file_table.setRowCount(0)
+                self.refresh_db_stats()
 
-                ModernDialog.show_success(self, "Başarılı", "Numaralar silindi.")
+                if cancelled:
+                    ModernDialog.show_warning(self, "İptal Edildi", "Silme yarıda kesildi. Kalan numaralar için işlemi tekrarlayabilirsiniz.")
+                else:
+                    ModernDialog.show_success(self, "Başarılı", "Numaralar silindi.")
 
-            except Exception as e:
-                print(f"❌ [PM Delete] Kritik Hata: {e}")
-                ModernDialog.show_error(self, "Hata", str(e))
-            finally:
-                if hasattr(self.main, 'loader'): self.main.loader.stop()
+            start_record_delete(self, targets, pid, "Siliniyor...", _done)
 
     def recalculate_common_analysis(self):
         if not self.selected_project_id:
@@ -7143,6 +6503,7 @@ class InteractiveGraphWidget(QWidget):
         self.splitter.addWidget(left_widget)
 
         right_widget = QWidget(); r_layout = QVBoxLayout(right_widget); r_layout.setContentsMargins(0,0,0,0)
+        from ui.web_view import EvidenceWebEngineView
         self.browser = EvidenceWebEngineView(); self.browser.setStyleSheet("background-color: white; border-left: 1px solid #bdc3c7;")
         self.browser.setHtml("<div style='display:flex; justify-content:center; align-items:center; height:100vh; flex-direction:column; font-family:Segoe UI; background-color:#f9f9f9;'><h2 style='color:#7f8c8d;'>👈 Analiz Verisi Seçin</h2><p style='color:#95a5a6;'>Soldaki listeden verileri seçip <b>'Diyagramı Çiz'</b> butonuna basın.</p></div>")
         r_layout.addWidget(self.browser)
@@ -7289,6 +6650,7 @@ class MapPreviewDialog(WatermarkDialogMixin, QDialog):
 
         self.layout.addWidget(info_frame, 0)
 
+        from ui.web_view import EvidenceWebEngineView
         self.browser = EvidenceWebEngineView()
         self.browser.setStyleSheet("border: 1px solid #bdc3c7;")
         self.layout.addWidget(self.browser, 1)
@@ -7463,87 +6825,22 @@ class StalkingAnalysisDialog(WatermarkDialogMixin, QDialog):
 
         QTimer.singleShot(100, self.run_analysis)
 
+    @Tracer.traced("analysis.stalking")
     def run_analysis(self):
         try:
-            def clean_gsm(n): return re.sub(r'\D', '', str(n))[-10:]
-            short_owner = clean_gsm(self.owner_gsm)
-
             s_str = self.start_dt.toString("yyyy-MM-dd HH:mm:ss")
             e_str = self.end_dt.toString("yyyy-MM-dd HH:mm:ss")
 
-            sql = f"""
-                SELECT 
-                    DIGER_NUMARA,
-                    MAX(DIGER_ISIM) as Isim,
-                    
-                    -- GİDEN (Biz Aradık)
-                    SUM(CASE 
-                        WHEN TIP LIKE '%Aradı%' OR TIP LIKE '%Giden%' OR TIP LIKE '%Gönder%' OR TIP LIKE '%Çıkış%' OR TIP LIKE '%Out%' 
-                        THEN 1 ELSE 0 
-                    END) as Giden,
-                    
-                    -- GELEN (O Aradı)
-                    SUM(CASE 
-                        WHEN TIP LIKE '%Arandı%' OR TIP LIKE '%Gelen%' OR TIP LIKE '%Aldı%' OR TIP LIKE '%Giriş%' OR TIP LIKE '%In%' 
-                        THEN 1 ELSE 0 
-                    END) as Gelen,
-                    
-                    -- KISA/REDDEDİLEN (Sadece Giden ve <10sn)
-                    SUM(CASE 
-                        WHEN (TIP LIKE '%Aradı%' OR TIP LIKE '%Giden%' OR TIP LIKE '%Gönder%') 
-                             AND CAST(REPLACE(REPLACE(SURE, ' sn', ''), ' sec', '') as INTEGER) < 10 
-                        THEN 1 ELSE 0 
-                    END) as Kisa,
-                    
-                    SUM(CAST(REPLACE(REPLACE(SURE, ' sn', ''), ' sec', '') as INTEGER)) as ToplamSure
-                    
-                FROM hts_gsm
-                WHERE ProjeID=? 
-                  AND (substr(TARIH, 7, 4) || '-' || substr(TARIH, 4, 2) || '-' || substr(TARIH, 1, 2) || substr(TARIH, 11)) BETWEEN ? AND ?
-                  
-                  -- Sadece analiz edilen numaranın kayıtlarını al (Dosya karışıklığını önlemek için)
-                  AND substr(replace(replace(replace(NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) = ?
-                  
-                GROUP BY DIGER_NUMARA
-                HAVING Giden > 5 -- Gürültü önlemek için en az 5 arama
-                ORDER BY Giden DESC
-            """
-
             with DB() as conn:
-                rows = conn.execute(sql, (self.project_id, s_str, e_str, short_owner)).fetchall()
+                results = StalkingAnalysis.run(conn, self.project_id, self.owner_gsm, s_str, e_str)
 
             analyzed_data = []
-
-            for row in rows:
-                num, name, giden, gelen, kisa, total_sure = row
-
-                risk_label = "🟢 Normal"
-                risk_val = 0
-
-                denom_gelen = gelen if gelen > 0 else 1
-                denom_giden = giden if giden > 0 else 1
-
-                reject_ratio = (kisa / denom_giden) * 100
-                imbalance = giden / denom_gelen
-
-                if (gelen == 0 and giden > 5) or (reject_ratio > 80 and giden > 5):
-                    risk_label = "🔴 YÜKSEK RİSK"
-                    risk_val = 3
-
-                elif imbalance > 5 or reject_ratio > 50:
-                    risk_label = "🟡 Şüpheli"
-                    risk_val = 2
-
-                if risk_val > 0:
-                    m, s = divmod(total_sure, 60)
-                    sure_fmt = f"{m} dk {s} sn"
-
-                    analyzed_data.append([
-                        risk_label, num, name if name else "Bilinmiyor",
-                        giden, gelen, f"{kisa} ({int(reject_ratio)}%)", sure_fmt
-                    ])
-
-            analyzed_data.sort(key=lambda x: (x[0], x[3]), reverse=True)
+            for r in results:
+                m, sec = divmod(r['total_seconds'], 60)
+                analyzed_data.append([
+                    StalkingAnalysis.LABELS[r['risk']], r['num'], r['name'] if r['name'] else "Bilinmiyor",
+                    r['giden'], r['gelen'], f"{r['kisa']} ({int(r['reject_ratio'])}%)", f"{m} dk {sec} sn"
+                ])
 
             if not analyzed_data:
                 ModernDialog.show_info(self, "Temiz", "Sesli görüşmeler içinde şüpheli/tek yönlü yoğun arama tespit edilemedi.")
@@ -7803,9 +7100,9 @@ class ReciprocalDetailDialog(WatermarkDialogMixin, QDialog):
                 my_short = get_last_10(my_gsm)
                 other_short = get_last_10(other_gsm)
 
-                sql = """SELECT TARIH,
+                sql = f"""SELECT TARIH,
                                 CASE
-                                    WHEN TIP LIKE '%Arand%' OR TIP LIKE '%Gelen%' OR TIP LIKE '%Mesaj aldı%'
+                                    WHEN TipKodu IN {TipKodu.sql_in(TipKodu.GELEN)}
                                     THEN NUMARA || ' -> ' || DIGER_NUMARA
                                     ELSE DIGER_NUMARA || ' -> ' || NUMARA
                                 END as Yon,
@@ -7986,96 +7283,31 @@ class MutualContactsMatchDialog(WatermarkDialogMixin, QDialog):
         map_dlg.activateWindow()
 
 
+    @Tracer.traced("analysis.mutual_contacts")
     def load_data(self, q_start, q_end):
         try:
             s_date = q_start.toString("yyyy-MM-dd HH:mm:ss")
             e_date = q_end.toString("yyyy-MM-dd HH:mm:ss")
 
-            def clean_gsm(val):
-                d = re.sub(r'\D', '', str(val).strip())
-                return d[-10:] if len(d) >= 10 else d
-
-            short_owner = clean_gsm(self.owner_gsm)
-            short_other = clean_gsm(self.other_gsm)
-
             with DB() as conn:
-                cur = conn.cursor()
-
-                date_filter = (
-                    " AND (substr(t1.TARIH, 7, 4) || '-' || substr(t1.TARIH, 4, 2) || '-' || substr(t1.TARIH, 1, 2) || substr(t1.TARIH, 11)) "
-                    " BETWEEN ? AND ? "
+                rows = ContactAnalysis.mutual_contacts(
+                    conn, self.project_id, self.owner_gsm, self.other_gsm, s_date, e_date
                 )
 
-                sql = f"""
-                    SELECT
-                        t1.TARIH,
-                        t1.IMEI as SahipIMEI,
-                        t1.BAZ  as SahipBaz,
-
-                        CASE
-                            WHEN (t1.TIP LIKE '%Mesaj%' OR t1.TIP LIKE '%SMS%')
-                                 AND (t1.TIP LIKE '%att%' OR t1.TIP LIKE '%gönder%') THEN 'SMS_OUT'
-                            WHEN (t1.TIP LIKE '%Mesaj%' OR t1.TIP LIKE '%SMS%')
-                                 AND (t1.TIP LIKE '%ald%' OR t1.TIP LIKE '%al%') THEN 'SMS_IN'
-                            WHEN (t1.TIP LIKE '%Arad%' OR t1.TIP LIKE '%Aradı%') THEN 'CALL_OUT'
-                            WHEN (t1.TIP LIKE '%Arand%' OR t1.TIP LIKE '%Arandı%') THEN 'CALL_IN'
-                            ELSE 'OTHER'
-                        END as TipKod,
-
-                        t2.IMEI as KarsiIMEI,
-                        t2.BAZ  as KarsiBaz
-                    FROM hts_gsm t1
-                    LEFT JOIN hts_gsm t2 ON
-                        t2.ProjeID = t1.ProjeID AND
-
-                        substr(replace(replace(replace(t2.NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) =
-                        substr(replace(replace(replace(t1.DIGER_NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) AND
-
-                        substr(replace(replace(replace(t2.DIGER_NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) =
-                        substr(replace(replace(replace(t1.NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) AND
-
-                        datetime(
-                            substr(t2.TARIH, 7, 4) || '-' || substr(t2.TARIH, 4, 2) || '-' || substr(t2.TARIH, 1, 2) || substr(t2.TARIH, 11)
-                        ) BETWEEN
-                            datetime(
-                                substr(t1.TARIH, 7, 4) || '-' || substr(t1.TARIH, 4, 2) || '-' || substr(t1.TARIH, 1, 2) || substr(t1.TARIH, 11),
-                                '-3 seconds'
-                            )
-                            AND
-                            datetime(
-                                substr(t1.TARIH, 7, 4) || '-' || substr(t1.TARIH, 4, 2) || '-' || substr(t1.TARIH, 1, 2) || substr(t1.TARIH, 11),
-                                '+3 seconds'
-                            )
-
-                    WHERE
-                        t1.ProjeID = ? AND
-                        substr(replace(replace(replace(t1.NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) = ? AND
-                        substr(replace(replace(replace(t1.DIGER_NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) = ?
-                        {date_filter}
-                    ORDER BY
-                        datetime(
-                            substr(t1.TARIH, 7, 4) || '-' || substr(t1.TARIH, 4, 2) || '-' || substr(t1.TARIH, 1, 2) || substr(t1.TARIH, 11)
-                        ) DESC
-                    LIMIT 10001
-                """
-
-                params = [self.project_id, short_owner, short_other, s_date, e_date]
-                rows = cur.execute(sql, params).fetchall()
-
             data = []
-            for tarih, sahip_imei, sahip_baz, tip_kod, karsi_imei, karsi_baz in rows:
+            for tarih, sahip_imei, sahip_baz, tip_kodu, karsi_imei, karsi_baz in rows:
                 data.append([
                     tarih or "",
                     sahip_imei or "",
                     sahip_baz or "",
-                    tip_kod or "OTHER",
+                    TipKodu.label(tip_kodu),
                     karsi_imei or "",
                     karsi_baz or ""
                 ])
 
-            if len(data) > 10000:
+            if len(data) > ContactAnalysis.DETAIL_LIMIT:
                 ModernDialog.show_warning(self, "Veri Limiti", "Performans için ilk 10.000 kayıt gösteriliyor.")
-                data = data[:10000]
+                data = data[:ContactAnalysis.DETAIL_LIMIT]
 
             self.table_widget.set_data(data)
 
@@ -8209,75 +7441,22 @@ class InteractionDetailDialog(WatermarkDialogMixin, QDialog):
 
         QTimer.singleShot(100, lambda: self.load_data_exact(start_dt, end_dt))
 
+    @Tracer.traced("analysis.interaction_detail")
     def load_data_exact(self, q_start, q_end):
         try:
             s_date = q_start.toString("yyyy-MM-dd HH:mm:ss")
             e_date = q_end.toString("yyyy-MM-dd HH:mm:ss")
 
-            def clean_gsm(val):
-                s = str(val).strip()
-                d = re.sub(r'\D', '', s)
-                return d[-10:] if len(d) >= 10 else d
-
-            short_owner = clean_gsm(self.owner_gsm)
-            short_target = clean_gsm(self.target_gsm)
-
             with DB() as conn:
-                cur = conn.cursor()
-
-                date_filter = " AND (substr(t1.TARIH, 7, 4) || '-' || substr(t1.TARIH, 4, 2) || '-' || substr(t1.TARIH, 1, 2) || substr(t1.TARIH, 11)) BETWEEN ? AND ? "
-
-                sql = f"""
-                    SELECT
-                        t1.TARIH,
-                        t1.NUMARA,
-                        t1.DIGER_NUMARA,
-                        t1.TIP,
-                        t1.SURE,
-                        t1.BAZ as SahipBaz,
-                        t2.BAZ as KarsiBaz,
-                        t2.IMEI as KarsiIMEI
-                    FROM hts_gsm t1
-                    LEFT JOIN hts_gsm t2 ON
-                        t2.ProjeID = t1.ProjeID AND
-
-                        substr(replace(replace(replace(t2.NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) =
-                        substr(replace(replace(replace(t1.DIGER_NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) AND
-
-                        substr(replace(replace(replace(t2.DIGER_NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) =
-                        substr(replace(replace(replace(t1.NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) AND
-
-                        datetime(
-                            substr(t2.TARIH, 7, 4) || '-' || substr(t2.TARIH, 4, 2) || '-' || substr(t2.TARIH, 1, 2) || substr(t2.TARIH, 11)
-                        ) BETWEEN
-                            datetime(
-                                substr(t1.TARIH, 7, 4) || '-' || substr(t1.TARIH, 4, 2) || '-' || substr(t1.TARIH, 1, 2) || substr(t1.TARIH, 11),
-                                '-3 seconds'
-                            )
-                            AND
-                            datetime(
-                                substr(t1.TARIH, 7, 4) || '-' || substr(t1.TARIH, 4, 2) || '-' || substr(t1.TARIH, 1, 2) || substr(t1.TARIH, 11),
-                                '+3 seconds'
-                            )
-
-                    WHERE
-                        t1.ProjeID = ? AND
-                        substr(replace(replace(replace(t1.NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) = ? AND
-                        substr(replace(replace(replace(t1.DIGER_NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10) = ?
-                        {date_filter}
-                    ORDER BY
-                        substr(t1.TARIH, 7, 4) || substr(t1.TARIH, 4, 2) || substr(t1.TARIH, 1, 2) || substr(t1.TARIH, 11) DESC
-                """
-
-                params = (self.project_id, short_owner, short_target, s_date, e_date)
-                rows = cur.execute(sql, params).fetchall()
+                rows = ContactAnalysis.interaction_detail(
+                    conn, self.project_id, self.owner_gsm, self.target_gsm, s_date, e_date
+                )
 
             final_data = []
-            for tarih_str, numara, diger, tip, sure, sahip_baz, karsi_baz, karsi_imei in rows:
-                tip_upper = str(tip).upper()
-                if "ARADI" in tip_upper or "GONDER" in tip_upper or "ÇIKIŞ" in tip_upper or "OUT" in tip_upper:
+            for tarih_str, numara, diger, tip, tip_kodu, sure, sahip_baz, karsi_baz, karsi_imei in rows:
+                if TipKodu.is_outgoing(tip_kodu):
                     yon_str = "Giden (->)"
-                elif "ARANDI" in tip_upper or "ALDI" in tip_upper or "GİRİŞ" in tip_upper or "IN" in tip_upper:
+                elif TipKodu.is_incoming(tip_kodu):
                     yon_str = "Gelen (<-)"
                 else:
                     yon_str = "Diğer"
@@ -8292,9 +7471,9 @@ class InteractionDetailDialog(WatermarkDialogMixin, QDialog):
                     karsi_imei if karsi_imei else ""
                 ])
 
-            if len(final_data) > 10000:
+            if len(final_data) > ContactAnalysis.DETAIL_LIMIT:
                 ModernDialog.show_warning(self, "Veri Limiti", "Performans için ilk 10.000 kayıt gösteriliyor.")
-                final_data = final_data[:10000]
+                final_data = final_data[:ContactAnalysis.DETAIL_LIMIT]
 
             self.table_widget.set_data(final_data)
 
@@ -8480,6 +7659,7 @@ class LocationDetailDialog(WatermarkDialogMixin, QDialog):
 
         QTimer.singleShot(200, _fix_columns)
 
+    @Tracer.traced("analysis.location_detail")
     def load_data(self, pid, owner, baz, min_dt, max_dt):
         self.loader.start("Konum Verileri Taranıyor...")
         QApplication.processEvents()
@@ -8563,6 +7743,7 @@ class MapMultiPointDialog(WatermarkDialogMixin, QDialog):
 
         self.layout.addWidget(info_frame, 0)
 
+        from ui.web_view import EvidenceWebEngineView
         self.browser = EvidenceWebEngineView()
         self.browser.setStyleSheet("border: 1px solid #bdc3c7;")
         self.layout.addWidget(self.browser, 1)
@@ -8751,6 +7932,7 @@ class ImeiDetailDialog(WatermarkDialogMixin, QDialog):
         self.loader = LoadingOverlay(self)
         QTimer.singleShot(50, lambda: self.load_data(project_id, owner_gsm, target_imei, start_date, end_date))
 
+    @Tracer.traced("analysis.imei_detail")
     def load_data(self, pid, owner, imei, min_dt, max_dt):
         self.loader.start("IMEI Verileri İşleniyor...")
         QApplication.processEvents()
@@ -8775,7 +7957,7 @@ class ImeiDetailDialog(WatermarkDialogMixin, QDialog):
                         t1.TARIH, 
                         t1.NUMARA, 
                         t1.DIGER_NUMARA, 
-                        t1.TIP, 
+                        t1.TipKodu, 
                         t1.SURE, 
                         t1.BAZ as KullananBaz, 
                         t2.BAZ as DigerBaz
@@ -8811,8 +7993,8 @@ class ImeiDetailDialog(WatermarkDialogMixin, QDialog):
 
                 formatted_gsm = []
                 for r in gsm_rows:
-                    tarih, num, diger, tip, sure, k_baz, d_baz = r
-                    yon = "Giden (->)" if any(x in str(tip).upper() for x in ["ARADI", "GONDER", "ÇIKIŞ", "OUT"]) else "Gelen (<-)"
+                    tarih, num, diger, tip_kodu, sure, k_baz, d_baz = r
+                    yon = "Giden (->)" if TipKodu.is_outgoing(tip_kodu) else "Gelen (<-)"
                     formatted_gsm.append([tarih, num, diger, yon, f"{sure} sn" if sure else "", k_baz if k_baz else "", d_baz if d_baz else ""])
 
                 self.gsm_table.set_data(formatted_gsm)
@@ -9068,6 +8250,7 @@ class ProfileMapDialog(WatermarkDialogMixin, QDialog):
 
         self.layout.addWidget(info_frame, 0)
 
+        from ui.web_view import EvidenceWebEngineView
         self.browser = EvidenceWebEngineView()
         self.browser.setStyleSheet("border: 1px solid #bdc3c7;")
         self.layout.addWidget(self.browser, 1)
@@ -9333,11 +8516,10 @@ class EventTabTableWidget(QWidget):
         self.source_model = CustomTableModel([], headers)
         self.proxy_model = DateSortFilterProxyModel(self)
         self.proxy_model.setSourceModel(self.source_model)
-        self.proxy_model.setFilterKeyColumn(-1)
         self.table.setModel(self.proxy_model)
 
         # Filtre bağla
-        self.search_bar.textChanged.connect(self.proxy_model.setSearchText)
+        self.search_bar.textChanged.connect(self.proxy_model.queueSearchText)
 
         main_layout.addWidget(self.table, 1)
 
@@ -9726,6 +8908,7 @@ class EventCenteredAnalysisPanel(QWidget):
 
         # Alt: Harita alanı (varsa daha önce oluşturulmuş map_view kullanılır)
         if not hasattr(self, "map_view"):
+            from ui.web_view import EvidenceWebEngineView
             self.map_view = EvidenceWebEngineView(self)
             self.map_view.setMinimumHeight(350)
 
@@ -10390,123 +9573,28 @@ class EventCenteredAnalysisPanel(QWidget):
 
         dlg.exec()
 
+    @Tracer.traced("analysis.event_centered")
     def run_analysis(self):
         if not self.project_id:
             ModernDialog.show_warning(self, "Uyarı", "Önce bir proje seçiniz.")
             return
 
         t0 = self.dt_t0.dateTime().toPyDateTime()
-        c_m = int(self.spin_c.value())
-        c_s, c_e = t0 - timedelta(minutes=c_m), t0 + timedelta(minutes=c_m)
-        w_s = t0 - timedelta(hours=int(self.spin_b.value()))
-        w_e = t0 + timedelta(hours=int(self.spin_a.value()))
-
-        iso_sql = "substr(TARIH, 7, 4) || '-' || substr(TARIH, 4, 2) || '-' || substr(TARIH, 1, 2) || substr(TARIH, 11)"
-
-        params = [self.project_id]
-        gsm_filter = ""
-        if self.cmb_gsm.currentText() != "Tüm Kayıtlar":
-            gsm_filter = " AND GSMNo = ? "
-            params.append(self.cmb_gsm.currentText())
-        params.extend([w_s.isoformat(sep=" "), w_e.isoformat(sep=" ")])
-
-        select_cols = []
-        for c in self.raw_cols:
-            if c == "NUMARA":
-                select_cols.append("GSMNo as NUMARA")
-            else:
-                select_cols.append(c)
-        select_sql = ", ".join(select_cols)
-
-        query = (
-            f"SELECT {select_sql}, {iso_sql} as iso_date "
-            f"FROM hts_gsm "
-            f"WHERE ProjeID = ?{gsm_filter} "
-            f"AND iso_date BETWEEN ? AND ? "
-            f"ORDER BY iso_date ASC"
-        )
-
-        with DB() as conn:
-            rows = conn.execute(query, params).fetchall()
-
-        if not rows:
-            ModernDialog.show_info(self, "Bilgi", "Seçilen kriterlere uygun veri bulunamadı.")
-            self.lbl_total.setText("0")
-            self.lbl_crit.setText("0")
-            self.lbl_burst.setText("-")
-            self.list_top5.clear()
-            self.map_slider.setEnabled(False)
-            return
-
-        # ---------------------------------------------------------
-        # ✅ DOĞRU FİLTRE: Analiz tablolarında
-        # - self kayıt (DIGER_NUMARA==NUMARA) yok
-        # - proje içi diğer GSM'lerle olan kayıtlar yok
-        # - seçili GSM varsa sadece onun kayıtları var
-        # ---------------------------------------------------------
-        selected_gsm = self.cmb_gsm.currentText().strip() if hasattr(self, "cmb_gsm") else "Tüm Kayıtlar"
-
-        def _last10(x):
-            s = re.sub(r"\D", "", str(x or "")).strip()
-            return s[-10:] if len(s) >= 10 else s
-
-        try:
-            idx_num = self.raw_cols.index("NUMARA")
-        except ValueError:
-            idx_num = None
-
-        try:
-            idx_other = self.raw_cols.index("DIGER_NUMARA")
-        except ValueError:
-            idx_other = None
+        selected_gsm = self.cmb_gsm.currentText().strip()
+        gsm = selected_gsm if selected_gsm != "Tüm Kayıtlar" else None
 
-        if idx_num is None or idx_other is None:
+        if "NUMARA" not in self.raw_cols or "DIGER_NUMARA" not in self.raw_cols:
             ModernDialog.show_error(self, "Hata", "NUMARA veya DIGER_NUMARA kolonu bulunamadı.")
             return
 
-        # Proje GSM seti: projedeki tüm GSMNo'ların son 10 hanesi
-        proj_set = set()
-        try:
-            with DB() as c:
-                for (gsmno,) in c.execute(
-                    "SELECT DISTINCT GSMNo FROM hts_gsm WHERE ProjeID=?",
-                    (self.project_id,)
-                ).fetchall():
-                    if gsmno:
-                        proj_set.add(_last10(gsmno))
-        except Exception:
-            proj_set = set()
-
-        target10 = _last10(selected_gsm) if selected_gsm != "Tüm Kayıtlar" else None
-
-        filtered = []
-        for r in rows:
-            raw = r[:-1]
-            if idx_num >= len(raw) or idx_other >= len(raw):
-                continue
-
-            num10 = _last10(raw[idx_num])
-            other10 = _last10(raw[idx_other])
-
-            # 1) Seçili GSM modunda sadece o numaraya ait kayıtlar
-            if target10 and num10 != target10:
-                continue
-
-            # 2) Self kayıtlar (DIGER_NUMARA == NUMARA) -> daima çıkar
-            if num10 and other10 and num10 == other10:
-                continue
-
-            # 3) Proje içi diğer GSM'ler -> daima çıkar
-            # (analiz tablolarında "karşı baz/karşı kayıt" görünmesin)
-            if proj_set and other10 in proj_set:
-                continue
-
-            filtered.append(r)
-
-        rows = filtered
+        # self kayıtlar ve proje içi diğer GSM'lerle olan kayıtlar analiz tablolarına girmez (EventWindowAnalysis.filter_rows)
+        with DB() as conn:
+            result = EventWindowAnalysis.run(
+                conn, self.project_id, self.raw_cols, t0,
+                int(self.spin_c.value()), int(self.spin_b.value()), int(self.spin_a.value()), gsm
+            )
 
-        # Filtre sonrası boş kaldıysa aynı "veri yok" davranışı
-        if not rows:
+        if not result:
             ModernDialog.show_info(self, "Bilgi", "Seçilen kriterlere uygun veri bulunamadı.")
             self.lbl_total.setText("0")
             self.lbl_crit.setText("0")
@@ -10514,61 +9602,23 @@ class EventCenteredAnalysisPanel(QWidget):
             self.list_top5.clear()
             self.map_slider.setEnabled(False)
             return
-        # ---------------------------------------------------------
-
-        self.data_store = {"before": [], "crit": [], "after": []}
-        disp_data = {"before": [], "crit": [], "after": []}
-        c_nums = []
-
-        # idx_other zaten var ve doğru; tekrar aramaya gerek yok
-        for r in rows:
-            try:
-                dt = datetime.fromisoformat(r[-1])
-            except Exception:
-                continue
-
-            delta = int((dt - t0).total_seconds() / 60)
-            delta_str = f"{'+' if delta >= 0 else ''}{delta} dk"
 
-            full_row = (delta_str,) + r[:-1]
-
-            visible_row = [delta_str]
-            for i, col_name in enumerate(self.raw_cols):
-                if col_name in self.display_cols:
-                    visible_row.append(r[i])
-
-            if dt < c_s:
-                self.data_store["before"].append(full_row)
-                disp_data["before"].append(visible_row)
-            elif c_s <= dt <= c_e:
-                self.data_store["crit"].append(full_row)
-                disp_data["crit"].append(visible_row)
-                try:
-                    c_nums.append(r[idx_other])
-                except Exception:
-                    pass
-            else:
-                self.data_store["after"].append(full_row)
-                disp_data["after"].append(visible_row)
+        self.data_store = {k: result[k] for k in ("before", "crit", "after")}
+        visible_idx = [i + 1 for i, col_name in enumerate(self.raw_cols) if col_name in self.display_cols]
+        disp_data = {
+            k: [[r[0]] + [r[i] for i in visible_idx] for r in rows]
+            for k, rows in self.data_store.items()
+        }
 
         self.t_before.set_data(disp_data["before"])
         self.t_crit.set_data(disp_data["crit"])
         self.t_after.set_data(disp_data["after"])
         self.disp_store = disp_data
 
-        n_total = len(rows)
-        n_crit = len(disp_data["crit"])
-
-        h_before = int(self.spin_b.value())
-        h_after = int(self.spin_a.value())
-        m_crit = int(self.spin_c.value())
+        n_crit = result["crit_count"]
+        burst_idx = result["burst"]
 
-        rate_crit = n_crit / (m_crit / 60.0) if m_crit > 0 else 0
-        n_normal = len(disp_data["before"]) + len(disp_data["after"])
-        rate_normal = n_normal / (h_before + h_after) if (h_before + h_after) > 0 else 0
-        burst_idx = rate_crit / rate_normal if rate_normal > 0 else n_crit
-
-        self.lbl_total.setText(str(n_total))
+        self.lbl_total.setText(str(result["total"]))
         self.lbl_crit.setText(str(n_crit))
         burst_text = f"x{burst_idx:.1f} Artış"
         self.lbl_burst.setText(burst_text)
@@ -10577,10 +9627,10 @@ class EventCenteredAnalysisPanel(QWidget):
         )
 
         self.list_top5.clear()
-        for n, c in Counter(c_nums).most_common(5):
+        for n, c in result["top"]:
             self.list_top5.addItem(f"📞 {n} ({c} İşlem)")
 
-        self.idx_other = idx_other
+        self.idx_other = self.raw_cols.index("DIGER_NUMARA")
 
         if n_crit > 0:
             self.map_slider.setEnabled(True)
@@ -10891,6 +9941,15 @@ class AnalysisCenter(QWidget):
         btn_cross.clicked.connect(self.open_cross_match)
         left_layout.addWidget(btn_cross)
 
+        btn_search = QPushButton("🔎 Proje Geneli Arama")
+        btn_search.setStyleSheet(
+            btn_style_base + "background-color: #2980b9 !important; } "
+            "QPushButton:hover { background-color: #3498db !important; } "
+            "QPushButton:pressed { background-color: #2471a3 !important; }"
+        )
+        btn_search.clicked.connect(self.open_project_search)
+        left_layout.addWidget(btn_search)
+
         btn_heat = QPushButton("🔥 Aktivite Isı Haritası(Yoğunluk Analizi)")
         btn_heat.setStyleSheet(
             btn_style_base + "background-color: #e67e22 !important; } "
@@ -10989,6 +10048,8 @@ class AnalysisCenter(QWidget):
 
         create_top_btn("🔗 Ortak Temas ve İlişki Analizi", self.open_cross_match, "#8e44ad")
 
+        create_top_btn("🔎 Proje Geneli Arama", self.open_project_search, "#2980b9")
+
         create_top_btn("🔥 Isı Haritası (Yoğunluk Analizi)", self.open_heatmap_popup, "#e67e22")
 
         create_top_btn("🚀 Hız/Mesafe İhlali (Imp. Travel)", self.open_speed_anomaly, "#c0392b")
@@ -11420,6 +10481,7 @@ class AnalysisCenter(QWidget):
                 pass
 
             # ✅ 2) Parent verme (minimize olmasın)
+            from ui.report_center import ReportCenterDialog
             dlg = ReportCenterDialog(None, self.current_project_id)
             dlg.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose, True)
 
@@ -11645,24 +10707,18 @@ class AnalysisCenter(QWidget):
         gsm_info = self.current_gsm_number if self.current_gsm_number else "Genel"
         final_title = f"{gsm_info} - {title}" if gsm_info not in title else title
 
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        evidence_dir = os.path.join(base_dir, "evidence_images")
-        if not os.path.exists(evidence_dir):
-            os.makedirs(evidence_dir)
-
         if pixmap.width() > 2200:
             pixmap = pixmap.scaledToWidth(2200, Qt.TransformationMode.SmoothTransformation)
         if "Coğrafi Konum Analizi" in (title or ""):
             pixmap = self._trim_pixmap_vertical(pixmap, tol=18, pad=4, empty_ratio=0.990, inset=2)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         prefix = "geo_map" if "Coğrafi Konum Analizi" in (title or "") else "event_map"
-        filename = f"{prefix}_{timestamp}.png"
-        file_path = os.path.join(evidence_dir, filename)
 
-        success = pixmap.save(file_path, "PNG", 90)
+        # ✅ içerik adresli depo: aynı görüntü tekrar yazılmaz, optimize edilir, thumbnail üretilir
+        with DB() as conn:
+            gorsel_id, file_path = EvidenceStore.put_image(conn, pixmap.toImage(), prefix)
 
-        if success:
-            self.add_evidence_to_report(final_title, file_path, "IMAGE")
+        if file_path:
+            self.add_evidence_to_report(final_title, file_path, "IMAGE", gorsel_id=gorsel_id)
         else:
             ModernDialog.show_error(self, "Hata", "Resim kaydedilemedi.")
 
@@ -11671,61 +10727,10 @@ class AnalysisCenter(QWidget):
         Üst-alt boşluğu kırpar.
         empty_ratio: satırın bu oranı BG ise satır "boş" kabul edilir.
         inset: kenar çerçevesini hesaba katmamak için x taramasını içeri alır.
+        (satır taraması utils.image_trim içinde, NumPy ile vektörel)
         """
-        if pixmap.isNull():
-            return pixmap
-
-        img = pixmap.toImage().convertToFormat(QImage.Format.Format_RGBA8888)
-        w, h = img.width(), img.height()
-        if w <= 0 or h <= 0:
-            return pixmap
-
-        sx = min(max(sample_xy[0], 0), w - 1)
-        sy = min(max(sample_xy[1], 0), h - 1)
-        bg = QColor(img.pixel(sx, sy))
-
-        x0 = min(max(inset, 0), w - 1)
-        x1 = max(x0 + 1, w - inset)
-
-        step = max(1, (x1 - x0) // 260)
-
-        def row_is_empty(y):
-            total = 0
-            diff = 0
-            for x in range(x0, x1, step):
-                total += 1
-                c = QColor(img.pixel(x, y))
-                if (
-                    abs(c.red()   - bg.red())   > tol or
-                    abs(c.green() - bg.green()) > tol or
-                    abs(c.blue()  - bg.blue())  > tol
-                ):
-                    diff += 1
-
-            # satırın büyük kısmı BG ise boş say
-            if total == 0:
-                return True
-            return (diff / total) <= (1.0 - empty_ratio)
-
-        # üstten boş satırları kes
-        top = 0
-        while top < h and row_is_empty(top):
-            top += 1
-
-        # alttan boş satırları kes
-        bottom = h - 1
-        while bottom > top and row_is_empty(bottom):
-            bottom -= 1
-
-        # pay
-        top = max(0, top - pad)
-        bottom = min(h - 1, bottom + pad)
-
-        new_h = bottom - top + 1
-        if new_h <= 0:
-            return pixmap
-
-        return pixmap.copy(0, top, w, new_h)
+        return trim_pixmap_vertical(pixmap, sample_xy=sample_xy, tol=tol, pad=pad,
+                                    empty_ratio=empty_ratio, inset=inset)
 
     def capture_chart_screenshot(self, widget, title="Grafik Analizi"):
         """Grafiği boyutlandırıp DOSYAYA kaydeder."""
@@ -11744,23 +10749,15 @@ class AnalysisCenter(QWidget):
         # ✅ SADECE diagramlar için üst-alt boşluk kırp
         pixmap = self._trim_pixmap_vertical(pixmap, tol=18, pad=6, empty_ratio=0.985, inset=2)
 
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        evidence_dir = os.path.join(base_dir, "evidence_images")
-        if not os.path.exists(evidence_dir):
-            os.makedirs(evidence_dir)
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        filename = f"chart_{timestamp}.png"
-        file_path = os.path.join(evidence_dir, filename)
-
-        success = pixmap.save(file_path, "PNG", 90)
+        with DB() as conn:
+            gorsel_id, file_path = EvidenceStore.put_image(conn, pixmap.toImage(), "chart")
 
-        if success:
-            self.add_evidence_to_report(final_title, file_path, "IMAGE")
+        if file_path:
+            self.add_evidence_to_report(final_title, file_path, "IMAGE", gorsel_id=gorsel_id)
         else:
             ModernDialog.show_error(self, "Hata", "Grafik kaydedilemedi.")
 
-    def add_evidence_to_report(self, title, content, type_):
+    def add_evidence_to_report(self, title, content, type_, gorsel_id=None):
         """Delili veritabanına kaydeder (width hatası giderildi)."""
         if not getattr(self, "current_project_id", None):
             return
@@ -11811,6 +10808,11 @@ class AnalysisCenter(QWidget):
                 if "Aciklama"      in cols: keys.append("Aciklama");      vals.append(row_data[10])
                 if "HtmlIcerik"    in cols: keys.append("HtmlIcerik");    vals.append(row_data[11])
                 if "ImagePath"     in cols: keys.append("ImagePath");     vals.append(row_data[12])
+                if "GorselID" in cols and gorsel_id:
+                    keys.append("GorselID"); vals.append(int(gorsel_id))
+                if "TabloJson" in cols and type_ == "TABLE":
+                    tbl = table_struct_from_html(html_val)
+                    keys.append("TabloJson"); vals.append(table_struct_dumps(tbl) if tbl else "")
 
                 q_marks = ",".join(["?"] * len(keys))
                 col_names = ",".join(keys)
@@ -12034,6 +11036,14 @@ class AnalysisCenter(QWidget):
         dlg = CrossMatchDialog(self, self.current_project_id, numbers)
         self.open_window_safe(dlg)
 
+    def open_project_search(self):
+        """Projenin tüm hatlarında / ham tablolarında arama penceresi."""
+        if not self.current_project_id:
+            ModernDialog.show_warning(self, "Proje Yok", "Lütfen önce bir proje seçin.")
+            return
+        dlg = ProjectSearchDialog(self, self.current_project_id)
+        self.open_window_safe(dlg)
+
     def open_heatmap_popup(self):
         """Isı haritasını ANLIK HESAPLAR ve açar."""
         if not self.current_project_id or not self.current_gsm_number:
@@ -12264,6 +11274,10 @@ class AnalysisCenter(QWidget):
             self.tabs.setUpdatesEnabled(True)
 
     def set_project(self, pid):
+        try:
+            open_project_shard(pid)
+        except Exception as e:
+            print(f"⚠️ [set_project] Proje veri dosyası bağlanamadı: {e}")
         self.current_project_id = pid
         self.current_gsm_number = None
 
@@ -12641,27 +11655,31 @@ class AnalysisCenter(QWidget):
         count = len(gsms_to_delete)
         if ModernDialog.show_question(self, "Silme Onayı", f"{count} adet numara silinecek ve analizler güncellenecek.\nOnaylıyor musunuz?"):
 
-            if hasattr(self.main, 'loader'):
-                self.main.loader.start(f"{count} Kayıt Siliniyor...")
-            QApplication.processEvents()
+            pid = getattr(self, "current_project_id", None)
+            if not pid:
+                ModernDialog.show_warning(self, "Proje Seçilmedi", "Önce bir proje seçmelisiniz.")
+                return
 
-            try:
-                for gsm in gsms_to_delete:
-                    self.delete_gsm_database_records(gsm)
+            targets = AnalysisUtils.gsm_delete_targets(pid, gsms_to_delete)
 
-                self.clear_all_widgets()
+            def _done(deleted, cancelled):
+                try:
+                    AnalysisUtils.recalculate_common_analysis_core(pid)
+                except Exception as e:
+                    print(f"❌ [delete_current_gsm] Ortak analiz güncellenemedi: {e}")
+                AnalysisUtils.perform_maintenance()
 
+                self.clear_all_widgets()
                 self.load_numbers()
 
-                if self.num_table.source_model.rowCount(QModelIndex()) > 0:
+                if cancelled:
+                    ModernDialog.show_warning(self, "İptal Edildi", "Silme yarıda kesildi. Kalan numaralar için işlemi tekrarlayabilirsiniz.")
+                elif self.num_table.source_model.rowCount(QModelIndex()) > 0:
                     QTimer.singleShot(50, self.select_first_after_delete)
                 else:
                     ModernDialog.show_success(self, "Tamamlandı", "Tüm numaralar silindi.")
 
-            except Exception as e:
-                ModernDialog.show_error(self, "Hata", str(e))
-            finally:
-                if hasattr(self.main, 'loader'): self.main.loader.stop()
+            start_record_delete(self, targets, pid, f"{count} Kayıt Siliniyor...", _done)
 
     def select_first_after_delete(self):
         """Silme işleminden sonra listedeki ilk numarayı seçer."""
@@ -13891,4696 +12909,6 @@ class MultiNumberDetailDialog(QDialog):
         layout.addWidget(btn_close)
 
 
-class ReportHtmlBuilder:
-    def __init__(self, project_id: int):
-        self.project_id = project_id
-
-    def _ensure_meta_row(self):
-        """
-        rapor_meta satırı yoksa default metinlerle oluşturur.
-        Satır varsa ama eski sürümden kalma şekilde bütün metin kolonları NULL ise
-        (yani hiç initialize edilmemişse) yine defaultları yazar.
-        Kullanıcı bilerek metni silip "" yaptıysa dokunmaz.
-        """
-        pid = self.project_id
-        try:
-            pid = int(pid)
-        except Exception:
-            pid = str(pid).strip()
-
-        with DB() as conn:
-            row = conn.execute("""
-                SELECT
-                    GorevlendirmeMetni,
-                    DosyaHakkindaMetni,
-                    GenelBilgilendirmeMetni,
-                    DegerlendirmeMetni,
-                    SonucMetni
-                FROM rapor_meta
-                WHERE ProjeID=?
-            """, (pid,)).fetchone()
-
-            # hiç satır yoksa: defaultlarla INSERT
-            if not row:
-                gorev = self.build_default_gorevlendirme()
-                genel = self.build_default_genel_bilgi()
-                conn.execute("""
-                    INSERT INTO rapor_meta (
-                        ProjeID,
-                        GorevlendirmeMetni,
-                        DosyaHakkindaMetni,
-                        GenelBilgilendirmeMetni,
-                        DegerlendirmeMetni,
-                        SonucMetni,
-                        GuncellemeTarihi
-                    ) VALUES (?,?,?,?,?,?,CURRENT_TIMESTAMP)
-                """, (pid, gorev, "", genel, "", ""))
-                conn.commit()
-                return
-
-            # satır var ama eski bozuk sürümden kalma: tüm metinler NULL ise initialize et
-            gorev_db, dosya_db, genel_db, deg_db, sonuc_db = row
-            if (gorev_db is None and dosya_db is None and genel_db is None and deg_db is None and sonuc_db is None):
-                gorev = self.build_default_gorevlendirme()
-                genel = self.build_default_genel_bilgi()
-                conn.execute("""
-                    UPDATE rapor_meta SET
-                        GorevlendirmeMetni=?,
-                        DosyaHakkindaMetni=?,
-                        GenelBilgilendirmeMetni=?,
-                        DegerlendirmeMetni=?,
-                        SonucMetni=?,
-                        GuncellemeTarihi=CURRENT_TIMESTAMP
-                    WHERE ProjeID=?
-                """, (gorev, "", genel, "", "", pid))
-                conn.commit()
-
-    def _meta_desc_to_text(self, acik) -> str:
-        import re, html as _html
-        if not acik:
-            return ""
-        s = str(acik).strip()
-        if not s:
-            return ""
-
-        # RichDescriptionDialog -> toHtml() çıktısı gelirse düz metne indir.
-        if "<" in s and ">" in s:
-            s = re.sub(r"(?is)<!doctype.*?>", "", s)
-            s = re.sub(r"(?is)<head.*?>.*?</head>", "", s)
-            s = re.sub(r"(?is)<(script|style).*?>.*?</\1>", "", s)
-            s = re.sub(r"(?is)</?html.*?>", "", s)
-            s = re.sub(r"(?is)</?body.*?>", "", s)
-            s = re.sub(r"(?is)<br\s*/?>", "\n", s)
-            s = re.sub(r"(?is)</p\s*>", "\n", s)
-            s = re.sub(r"(?is)<[^>]+>", "", s)
-            s = _html.unescape(s)
-
-        return s.strip()
-
-    def _sanitize_rich_html(self, s: str) -> str:
-        """
-        RichDescriptionDialog.toHtml() gibi tam HTML dönen içeriklerde:
-        - DOCTYPE/html/head/body dış kabuğunu temizle
-        - sadece body içini al (varsa)
-        - <style>/<script>/<meta> temizle
-        """
-        if not s:
-            return ""
-        txt = str(s)
-
-        # DOCTYPE temizle
-        txt = re.sub(r"<!DOCTYPE[^>]*>", "", txt, flags=re.IGNORECASE | re.DOTALL)
-
-        # body içini çek (varsa)
-        m = re.search(r"<body[^>]*>(.*?)</body>", txt, flags=re.IGNORECASE | re.DOTALL)
-        if m:
-            txt = m.group(1)
-
-        # style/script/meta/head/html temizle
-        txt = re.sub(r"<style[^>]*>.*?</style>", "", txt, flags=re.IGNORECASE | re.DOTALL)
-        txt = re.sub(r"<script[^>]*>.*?</script>", "", txt, flags=re.IGNORECASE | re.DOTALL)
-        txt = re.sub(r"<meta[^>]*>", "", txt, flags=re.IGNORECASE | re.DOTALL)
-        txt = re.sub(r"</?head[^>]*>", "", txt, flags=re.IGNORECASE | re.DOTALL)
-        txt = re.sub(r"</?html[^>]*>", "", txt, flags=re.IGNORECASE | re.DOTALL)
-
-        return txt.strip()
-
-    def _strip_tags_len(self, html_text: str) -> int:
-        if not html_text:
-            return 0
-        t = re.sub(r"<[^>]+>", "", str(html_text), flags=re.DOTALL)
-        t = re.sub(r"\s+", " ", t).strip()
-        return len(t)
-
-    def _render_meta_ekler_html(self, bolum: str, baslik: str) -> str:
-        """
-        Dosya eklerini a., b., c. şeklinde listeler.
-        HATA ÇÖZÜMÜ: 'ek_no' değişkeni kaldırıldı, enumerate kullanıldı.
-        """
-        rows = self._fetch_meta_ekler(bolum)
-        if str(bolum) == "delil_cekmece":
-            return ""
-
-        parts = [f"<h2>{html.escape(baslik)}</h2>"]
-
-        # enumerate(rows) ile otomatik sayaç: 0, 1, 2...
-        for i, (db_id, dosya_adi, dosya_yolu, aciklama, dosya_adi_gizle, gen_pct) in enumerate(rows):
-
-            # 0 -> a, 1 -> b...
-            harf = chr(97 + i)
-
-            fname = (dosya_adi or (os.path.basename(dosya_yolu or "") if dosya_yolu else "")).strip()
-            gen_pct = int(gen_pct or 100)
-            gen_pct = max(10, min(100, gen_pct))
-
-            safe_desc_html = self._sanitize_rich_html(aciklama or "")
-            desc_len = self._strip_tags_len(safe_desc_html)
-            desc_is_long = desc_len >= 700
-
-            # İsim satırı (a. DosyaAdı)
-            if int(dosya_adi_gizle or 0) == 0:
-                name_line = (
-                    f"<div class='metaek-name'>"
-                    f"<span class='metaek-no'>{harf}.</span> "
-                    f"<span class='metaek-fname'>{html.escape(fname)}</span>"
-                    f"</div>"
-                )
-            else:
-                name_line = f"<div class='metaek-name'><span class='metaek-no'>{harf}.</span></div>"
-
-            # Resim
-            if dosya_yolu and os.path.exists(dosya_yolu):
-                src = QUrl.fromLocalFile(dosya_yolu).toString()
-                img_html = (
-                    f"<div class='metaek-imgwrap'>"
-                    f" <img class='metaek-img' "
-                    f" src='{src}' "
-                    f" style='width:{gen_pct}%;' "
-                    f" onclick=\"openImgModal('{src}')\" />"
-                    f"</div>"
-                )
-            else:
-                img_html = "<div class='metaek-missing'>[Dosya bulunamadı]</div>"
-
-            desc_html = ""
-            if safe_desc_html.strip():
-                desc_html = f"<div class='metaek-desc'>{safe_desc_html}</div>"
-
-            # DİKKAT: ID olarak veritabanı ID'sini (db_id) kullanıyoruz
-            parts.append(
-                f"<div class='metaek-block' id='metaek-{db_id}'>"
-                f" {name_line}"
-                f" {img_html}"
-                f" {desc_html}"
-                f"</div>"
-            )
-
-        return "\n".join(parts)
-
-    def _fetch_meta_ekler_files(self, bolum: str):
-        """
-        rapor_meta_ekler tablosundan Dosya Hakkında / Delil Çekmecesi eklerini çeker.
-        Kolonlar eski sürümlerde yoksa (DosyaAdiGizle, GenislikYuzde) fallback uygular.
-        Dönen: [(id, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle, GenislikYuzde), ...]
-        """
-        with DB() as conn:
-            cols = {r[1] for r in conn.execute("PRAGMA table_info(rapor_meta_ekler)").fetchall()}
-
-            id_expr = "id" if "id" in cols else "rowid AS id"
-            name_expr = "DosyaAdi" if "DosyaAdi" in cols else "NULL AS DosyaAdi"
-            path_expr = "DosyaYolu" if "DosyaYolu" in cols else "NULL AS DosyaYolu"
-            desc_expr = "Aciklama" if "Aciklama" in cols else "'' AS Aciklama"
-            hide_expr = "DosyaAdiGizle" if "DosyaAdiGizle" in cols else "0 AS DosyaAdiGizle"
-            w_expr = "GenislikYuzde" if "GenislikYuzde" in cols else "100 AS GenislikYuzde"
-
-            rows = conn.execute(
-                f"""
-                SELECT {id_expr},
-                       {name_expr},
-                       {path_expr},
-                       {desc_expr},
-                       {hide_expr},
-                       {w_expr}
-                FROM rapor_meta_ekler
-                WHERE ProjeID=? AND Bolum=?
-                ORDER BY id ASC
-                """,
-                (self.project_id, bolum)
-            ).fetchall()
-
-        return rows
-
-    def _fetch_meta_ekler(self, bolum: str):
-        """
-        rapor_meta_ekler:
-          id, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle, GenislikYuzde
-        """
-        # ✅ ZORUNLU: sqlcipher param bağlama hatasını engeller
-        pid = self.project_id
-        try:
-            pid = int(pid)
-        except Exception:
-            # yine de güvenli fallback
-            pid = str(pid)
-
-        bolum = str(bolum)
-
-        with DB() as conn:
-            rows = conn.execute(
-                "SELECT id, DosyaAdi, DosyaYolu, Aciklama, "
-                "COALESCE(DosyaAdiGizle,0) as DosyaAdiGizle, "
-                "COALESCE(GenislikYuzde,100) as GenislikYuzde "
-                "FROM rapor_meta_ekler "
-                "WHERE ProjeID=? AND Bolum=? "
-                "ORDER BY id ASC",
-                (pid, bolum),
-            ).fetchall()
-        return rows
-
-    def _fetch_meta(self):
-        pid = self.project_id
-        try:
-            pid = int(pid)
-        except Exception:
-            pid = str(pid)
-        with DB() as conn:
-            return conn.execute("""
-                SELECT ProjeID AS id,
-                       GorevlendirmeMetni,
-                       DosyaHakkindaMetni,
-                       GenelBilgilendirmeMetni,
-                       DegerlendirmeMetni,
-                       SonucMetni,
-                       MarginTopMm,
-                       MarginRightMm,
-                       MarginBottomMm,
-                       MarginLeftMm
-                FROM rapor_meta WHERE ProjeID=?
-            """, (pid,)).fetchone()
-
-    def _fetch_blocks(self):
-        with DB() as conn:
-            cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
-
-            if "id" in cols:
-                id_expr = "id"
-            else:
-                id_expr = "rowid AS id"
-
-            gen_expr  = "GenislikYuzde" if "GenislikYuzde" in cols else "100 AS GenislikYuzde"
-            acik_expr = "Aciklama"      if "Aciklama"      in cols else "'' AS Aciklama"
-            html_expr = "HtmlIcerik"    if "HtmlIcerik"    in cols else "NULL AS HtmlIcerik"
-            base_expr = "BaseHtmlIcerik" if "BaseHtmlIcerik" in cols else "NULL AS BaseHtmlIcerik"
-            hid_expr  = "HiddenColsJson" if "HiddenColsJson" in cols else "NULL AS HiddenColsJson"
-            fmt_expr  = "FmtJson"        if "FmtJson"        in cols else "NULL AS FmtJson"
-            img_expr  = "ImagePath"     if "ImagePath"     in cols else "NULL AS ImagePath"
-
-            # [DÜZELTME] Icerik sütununu da çekiyoruz (Eski kayıtlar veya fallback için)
-            raw_icerik_expr = "Icerik" if "Icerik" in cols else "NULL AS Icerik"
-
-            return conn.execute(f"""
-                SELECT {id_expr},
-                       Sira,
-                       Baslik,
-                       Tur,
-                       {gen_expr},
-                       {acik_expr},
-                       {html_expr},
-                       {base_expr},
-                       {hid_expr},
-                       {fmt_expr},
-                       {img_expr},
-                       {raw_icerik_expr}
-                FROM rapor_taslagi
-                WHERE ProjeID=?
-                ORDER BY Sira ASC, id ASC
-            """, (self.project_id,)).fetchall()
-
-    def _fetch_project_info(self):
-        """
-        Proje tablosundan:
-        birim, dosya no tipi, dosya no, suç, suç tarihi, görevlendirme tarihi,
-        bilirkişi adı, bilirkişi ünvan/sicil
-
-        ayrıca taraflar:
-        [(sifat, adsoyad), ...]
-        """
-        with DB() as conn:
-            p = conn.execute("""
-                SELECT talep_eden_birim,
-                       dosya_no_tipi,
-                       dosya_no,
-                       suc_bilgisi,
-                       suc_tarihi,
-                       gorevlendirme_tarihi,
-                       bilirkisi_adi,
-                       bilirkisi_unvan_sicil
-                FROM projeler WHERE id=?
-            """, (self.project_id,)).fetchone()
-
-            parties = conn.execute("""
-                SELECT sifat, ad_soyad
-                FROM taraflar
-                WHERE ProjeID=?
-                ORDER BY id ASC
-            """, (self.project_id,)).fetchall()
-
-        return p, parties
-
-    def _wrap_as_block(self, title: str, inner_html: str, genislik_yuzde: int = 100, aciklama: str = "") -> str:
-        """
-        Delil çekmecesi blok temasıyla aynı görünecek şekilde HTML'i sarar.
-        DB'ye yazmaz; sadece raporda kullanılır.
-        """
-        w = int(genislik_yuzde or 100)
-        t = html.escape(title or "")
-        a = html.escape(aciklama or "")
-
-        out = []
-        out.append(f"<div class='block' style='width:{w}% !important;'>")  # ✅ genişlik kesin uygula
-        out.append(f"<div class='block-title'>{t}</div>")
-        out.append("<div class='block-inner'>")
-        out.append(inner_html or "")
-        out.append("</div>")  # block-inner
-        if aciklama:
-            out.append(f"<div class='block-desc'>Delil Açıklaması: {a}</div>")
-        out.append("</div>")
-        return "\n".join(out)
-
-    # -------------------------
-    # Defaults
-    # -------------------------
-    def build_default_gorevlendirme(self) -> str:
-        """
-        Yeni şablon:
-        ("Mahkeme Adı" "Dosya No" "Dosya Tipi" sayılı dosyasından "Talep Tarihi"
-         tarihli yazısı ile talep edilen, talebe istinaden BTK tarafından sunulan
-         HTS kayıtlarını incelemek ve ..... bilirkişi raporunu bildirmek üzere
-         bilirkişi olarak tayin edildim.
-         İş bu raporla yukarıda belirtilen talep gereği incelemeler yapılmış olup;
-         gerekli açıklamalar ilgili bölümlerdedir.)
-
-        Talep Tarihi kullanıcı girişi olacak -> placeholder bırakıyoruz.
-        Diğer alanlar projeler tablosundan geliyor.
-        """
-        p, _ = self._fetch_project_info()
-        birim, tip, dosya_no, suc, suc_t, gorev_t, bilirkisi_adi, bilirkisi_unvan = (
-            p or ("","","","","","","","")
-        )
-
-        dosya_tip_ve_no = f"{dosya_no} {tip}".strip()
-        mahkeme_adi = (birim or "").strip()
-
-        talep_tarihi_placeholder = "../../20.."
-
-        return (
-            f'{mahkeme_adi} {dosya_tip_ve_no} sayılı dosyasından '
-            f'{talep_tarihi_placeholder} tarihli yazısı ile talep edilen, '
-            f'talebe istinaden Bilgi Teknolojileri ve İletişim Kurumu tarafından sunulan '
-            f'HTS kayıtlarını incelemek ve ilgili hususlarda bilirkişi raporunu bildirmek üzere '
-            f'bilirkişi olarak tayin edildim.'
-            f'<br><br>'
-            f'<p>İş bu raporla yukarıda belirtilen talep gereği incelemeler yapılmış olup; '
-            f'gerekli açıklamalar ilgili bölümlerdedir.</p>'
-        )
-
-    def build_auto_hts_dosya_abone_details(self) -> str:
-        """
-        HTS DOSYA VE ABONE BİLGİLERİ altında,
-        delil çekmecesi temasıyla aynı blok görünümünde otomatik detay basar.
-        - Daha kompakt tablo
-        - MD5 / SHA-256 değerleri italik
-        - GSM başlığı + bloklar aynı sayfada kalmaya zorlanır
-        """
-        pid = self.project_id
-
-        label_map = {
-            "GSMNo": "Numara",
-            "Numara": "Numara",
-            "Durum": "Durum",
-            "Ad": "Ad",
-            "Soyad": "Soyad",
-            "Adres": "Adres",
-            "DogumTarihi": "Doğum Tarihi",
-            "DogumYeri": "Doğum Yeri",
-            "Ilce": "İlçe",
-            "Il": "İl",
-            "TCKimlikNo": "TC Kimlik No",
-            "AnneAdi": "Anne Adı",
-            "BabaAdi": "Baba Adı",
-            "AboneSorguAraligi": "Abone Sorgu Aralığı",
-            "AboneBaslangic": "Abone Başlangıç",
-            "AboneBitis": "Abone Bitiş",
-            "Operator": "Operatör",
-            "dogum_tarihi": "Doğum Tarihi",
-            "dogum_yeri": "Doğum Yeri",
-            "tc_kimlik_no": "TC Kimlik No",
-            "anne_adi": "Anne Adı",
-            "baba_adi": "Baba Adı",
-            "abone_sorgu_araligi": "Abone Sorgu Aralığı",
-            "abone_baslangic": "Abone Başlangıç",
-            "abone_bitis": "Abone Bitiş",
-            "operator": "Operatör",
-            "ilce": "İlçe",
-            "il": "İl",
-            "ad": "Ad",
-            "soyad": "Soyad",
-            "adres": "Adres",
-            "durum": "Durum",
-        }
-        abone_skip = {
-            "id", "ID", "projeid", "ProjeID", "gsmno", "GSMNo",
-            "SiraNo", "SIRA_NO", "sira_no",
-            # EKLE:
-            "Rol", "rol",
-            "DosyaAdi", "dosyaadi", "dosya_adi", "DosyaAdı"
-        }
-
-        dosya_label = {
-            "DosyaAdi": "Dosya Adı",
-            "DosyaBoyutu": "Boyut",
-            "TalepEdenMakam": "Talep Eden Makam",
-            "SorguBaslangic": "Sorgu Başlangıç",
-            "SorguBitis": "Sorgu Bitiş",
-            "Tespit": "Tespit",
-            "YuklemeTarihi": "Yükleme",
-            "MD5": "MD5",
-            "SHA256": "SHA-256",
-        }
-
-        def meta_table(rows):
-            """
-            rows: [(label, value), ...]
-            MD5/SHA değerlerini italik basar.
-            Font ve punto CSS'ten (table_head/table_body) gelir.
-            """
-            out = []
-            out.append("<table class='meta-table' style='table-layout:fixed; width:100%;'>")
-            out.append("<colgroup><col style='width:30%;'><col style='width:70%;'></colgroup>")
-            out.append("<tr><th>ÖZELLİK</th><th>DEĞER</th></tr>")
-            for k, v in rows:
-                key_txt = html.escape(str(k))
-                val_txt = html.escape(str(v or ""))
-
-                if str(k).upper() in ("MD5", "SHA256", "SHA-256", "SHA_256"):
-                    val_txt = f"<i>{val_txt}</i>"
-
-                out.append(
-                    "<tr>"
-                    f"<td class='key'>{key_txt}</td>"
-                    f"<td>{val_txt}</td>"
-                    "</tr>"
-                )
-            out.append("</table>")
-            return "\n".join(out)
-
-        html_parts = []
-
-        with DB() as conn:
-            gsms = []
-            try:
-                rows = conn.execute(
-                    "SELECT DISTINCT GSMNo FROM hts_dosyalari WHERE ProjeID=? ORDER BY GSMNo",
-                    (pid,)
-                ).fetchall()
-                gsms += [r[0] for r in rows if r and r[0]]
-            except Exception:
-                pass
-            try:
-                rows = conn.execute(
-                    "SELECT DISTINCT GSMNo FROM hts_ozet WHERE ProjeID=? ORDER BY GSMNo",
-                    (pid,)
-                ).fetchall()
-                gsms += [r[0] for r in rows if r and r[0]]
-            except Exception:
-                pass
-            seen = set()
-            gsms = [g for g in gsms if not (g in seen or seen.add(g))]
-
-            dosya_cols = []
-            try:
-                dosya_cols = [r[1] for r in conn.execute("PRAGMA table_info(hts_dosyalari)").fetchall()]
-            except Exception:
-                dosya_cols = []
-
-            def col_exists(c): return c in dosya_cols
-
-            select_cols = ["Rol", "DosyaAdi", "DosyaBoyutu", "TalepEdenMakam", "SorguBaslangic", "SorguBitis"]
-            if col_exists("Tespit"): select_cols.append("Tespit")
-            if col_exists("YuklemeTarihi"): select_cols.append("YuklemeTarihi")
-            if col_exists("MD5"): select_cols.append("MD5")
-            if col_exists("SHA256"): select_cols.append("SHA256")
-
-            for gsm in gsms:
-                gsm_esc = html.escape(gsm)
-
-                section_buf = []
-                section_buf.append(
-                    f"<h3 style='margin:0 0 2mm 0; text-decoration:underline; text-underline-offset:0.8mm; font-size:13pt; font-weight:700;'> "
-                    f"GSM Hattı: {gsm_esc}</h3>"
-                )
-
-                file_rows = []
-                try:
-                    col_sql = ", ".join(select_cols)
-                    file_rows = conn.execute(
-                        f"SELECT {col_sql} FROM hts_dosyalari "
-                        "WHERE ProjeID=? AND GSMNo=? ORDER BY id",
-                        (pid, gsm)
-                    ).fetchall()
-                except Exception:
-                    file_rows = []
-
-                if file_rows:
-                    grouped = {}
-                    for row in file_rows:
-                        rol = (row[0] or "").strip().upper() or "DIGER"
-                        grouped.setdefault(rol, []).append(row)
-
-                    rol_order = ["HEDEF", "KARSI", "KARŞI", "DIGER"]
-                    def rk(r):
-                        try: return rol_order.index(r)
-                        except ValueError: return 99
-
-                    for rol in sorted(grouped.keys(), key=rk):
-                        rol_title = "HEDEF HTS DOSYASI" if rol == "HEDEF" else \
-                                    "KARŞI HTS DOSYASI" if rol in ("KARSI", "KARŞI") else \
-                                    f"{rol} HTS DOSYASI"
-
-                        for idx_f, row in enumerate(grouped[rol], start=1):
-                            kv_rows = []
-                            for i, col in enumerate(select_cols[1:], start=1):
-                                val = row[i] if i < len(row) else ""
-                                if col.lower() == "dosyaboyutu" and val not in (None, ""):
-                                    try:
-                                        b = int(val)
-                                        if b >= 1024*1024:
-                                            val = f"{round(b/(1024*1024),2)} MB"
-                                        elif b >= 1024:
-                                            val = f"{round(b/1024,2)} KB"
-                                        else:
-                                            val = f"{b} B"
-                                    except Exception:
-                                        pass
-                                kv_rows.append((dosya_label.get(col, col), val))
-
-                            inner = meta_table(kv_rows)
-                            title = rol_title if len(grouped[rol]) == 1 else f"{rol_title} ({idx_f})"
-                            section_buf.append(self._wrap_as_block(title, inner, 100))
-                else:
-                    section_buf.append(self._wrap_as_block(
-                        "Dosya Bilgileri",
-                        "<p><i>Bu GSM hattı için kayıtlı dosya bilgisi bulunamadı.</i></p>"
-                    ))
-
-                abone_dict = {}
-                try:
-                    abone_cols = [r[1] for r in conn.execute("PRAGMA table_info(hts_abone)").fetchall()]
-                    row = conn.execute(
-                        "SELECT * FROM hts_abone WHERE ProjeID=? AND GSMNo=? LIMIT 1",
-                        (pid, gsm)
-                    ).fetchone()
-                    if abone_cols and row:
-                        abone_dict = {abone_cols[i]: row[i] for i in range(min(len(abone_cols), len(row)))}
-                except Exception:
-                    abone_dict = {}
-
-                if abone_dict:
-                    kv_rows = []
-                    for k, v in abone_dict.items():
-                        if (k or "") in abone_skip:
-                            continue
-                        label = label_map.get(k, k)
-                        kv_rows.append((label, v))
-                    inner = meta_table(kv_rows) if kv_rows else "<p><i>Abone bilgisi bulunamadı.</i></p>"
-                    section_buf.append(self._wrap_as_block("ABONE BİLGİLERİ", inner, 100))
-                else:
-                    section_buf.append(self._wrap_as_block(
-                        "ABONE BİLGİLERİ",
-                        "<p><i>Bu GSM hattı için abone bilgisi bulunamadı.</i></p>"
-                    ))
-
-                html_parts.append("<div class='gsm-section'>")
-                html_parts.append("\n".join(section_buf))
-                html_parts.append("</div><br>")
-
-        return "\n".join(html_parts)
-
-    def build_default_genel_bilgi(self) -> str:
-        """
-        Rapor Merkezi "Genel Bilgilendirme" metni.
-        HEDEF/KARSI ayrımı: ham kayıtlarda Rol + DosyaAdi tutuluyorsa doğru sayım yapılır.
-        """
-        pid = self.project_id
-        all_totals: list[int] = []
-
-        def fmt_int(v):
-            try:
-                return f"{int(v):,}".replace(",", ".")
-            except Exception:
-                return str(v or "0")
-
-        def _table_count(cur, table: str, pid_: int, gsm_: str, rol_: str, dosya_adi_: str) -> int:
-            """
-            Önce Rol+DosyaAdi ile dener.
-            Eski DB'lerde Rol/DosyaAdi kolonu yoksa fallback: sadece ProjeID+GSMNo sayar (ayırt edemez).
-            """
-            # 1) Rol + DosyaAdi
-            try:
-                row = cur.execute(
-                    f"SELECT COUNT(*) FROM {table} WHERE ProjeID=? AND GSMNo=? AND Rol=? AND DosyaAdi=?",
-                    (pid_, gsm_, rol_, dosya_adi_)
-                ).fetchone()
-                return int(row[0] or 0) if row else 0
-            except Exception:
-                pass
-
-            # 2) Rol
-            try:
-                row = cur.execute(
-                    f"SELECT COUNT(*) FROM {table} WHERE ProjeID=? AND GSMNo=? AND Rol=?",
-                    (pid_, gsm_, rol_)
-                ).fetchone()
-                return int(row[0] or 0) if row else 0
-            except Exception:
-                pass
-
-            # 3) Fallback (ayırt edemez)
-            try:
-                row = cur.execute(
-                    f"SELECT COUNT(*) FROM {table} WHERE ProjeID=? AND GSMNo=?",
-                    (pid_, gsm_)
-                ).fetchone()
-                return int(row[0] or 0) if row else 0
-            except Exception:
-                return 0
-
-        def line(css_class: str, indent_level: int, bullet: str, html_text: str) -> str:
-            """
-            Qt tarafı mm'yi stabil uygulamadığı için px kullanıyoruz.
-            indent_level eski kodda mm gibi düşünülüyordu.
-            1mm ≈ 3.78px -> pratikte 4px çarpanı yeterli ve stabil.
-            """
-            b = html.escape(str(bullet or ""))
-            px = int(round(int(indent_level) * 4))  # mm -> px yaklaşık dönüşüm
-
-            return (
-                f"<div class='gb-line {html.escape(css_class)}' style='margin-left:{px}px;'>"
-                f"<span class='gb-bullet'>{b}</span>"
-                f"<span class='gb-text'>{html_text}</span>"
-                f"</div>"
-            )
-
-        with DB() as conn:
-            cur = conn.cursor()
-
-            gsm_rows = cur.execute(
-                "SELECT DISTINCT GSMNo FROM hts_dosyalari WHERE ProjeID=? ORDER BY GSMNo",
-                (pid,)
-            ).fetchall()
-            gsms = [r[0] for r in gsm_rows if r and r[0]]
-
-            out = []
-            out.append("<div class='gb-block'>")
-
-            out.append(line("gb-intro", 0, "", "Bilgi Teknolojileri ve İletişim Kurumu tarafından gönderilen yazı ekinde,"))
-            out.append("<br>")
-
-            for gsm in gsms:
-                file_rows = cur.execute(
-                    "SELECT Rol, DosyaAdi FROM hts_dosyalari WHERE ProjeID=? AND GSMNo=?",
-                    (pid, gsm)
-                ).fetchall()
-
-                hedef_files = [r[1] for r in file_rows if r and (r[0] == "HEDEF") and r[1]]
-                karsi_files = [r[1] for r in file_rows if r and (r[0] == "KARSI") and r[1]]
-
-                # (sende tek dosya varsayımı vardı; aynen korudum)
-                hedef_file = hedef_files[0] if hedef_files else None
-                karsi_file = karsi_files[0] if karsi_files else None
-
-                # GSM satırı
-                out.append(line(
-                    "gb-gsm", 0, "•",
-                    f'<b>"{html.escape(gsm)}"</b> GSM numaralı hatta ait olduğu belirtilen,'
-                ))
-
-                def get_counts(rol, dosya):
-                    if not dosya:
-                        return None
-                    gsm_c = _table_count(cur, "hts_gsm", pid, gsm, rol, dosya)
-                    sms_c = _table_count(cur, "hts_sms", pid, gsm, rol, dosya)
-                    gprs_c = _table_count(cur, "hts_gprs", pid, gsm, rol, dosya)
-                    wap_c = _table_count(cur, "hts_wap", pid, gsm, rol, dosya)
-                    sth_c = _table_count(cur, "hts_sth", pid, gsm, rol, dosya)
-                    ulus_c = _table_count(cur, "hts_uluslararasi", pid, gsm, rol, dosya)
-                    sabit_c = _table_count(cur, "hts_sabit", pid, gsm, rol, dosya)
-
-                    internet_c = int(gprs_c or 0) + int(wap_c or 0)
-                    total = int(gsm_c or 0) + int(sms_c or 0) + int(internet_c or 0) + int(sth_c or 0) + int(ulus_c or 0) + int(sabit_c or 0)
-
-                    return {
-                        "gsm": gsm_c,
-                        "sms": sms_c,
-                        "internet": internet_c,
-                        "sth": sth_c,
-                        "ulus": ulus_c,
-                        "sabit": sabit_c,
-                        "total": total
-                    }
-
-                hedef_counts = get_counts("HEDEF", hedef_file) if hedef_file else None
-                karsi_counts = get_counts("KARSI", karsi_file) if karsi_file else None
-
-                hedef_total = int(hedef_counts["total"]) if hedef_counts else 0
-                karsi_total = int(karsi_counts["total"]) if karsi_counts else 0
-
-                if hedef_file and karsi_file and hedef_total == 0 and karsi_total == 0:
-                    out.append(line(
-                        "gb-file", 6, "○",
-                        f'<b>"{html.escape(hedef_file)}"</b>, <b>"{html.escape(karsi_file)}"</b> isimli dosyalar içerisinde kayıt bulunamamıştır.'
-                    ))
-                    out.append("<br>")
-                    continue
-
-                def emit_file_block(file_name: str, counts: dict | None):
-                    if not file_name:
-                        return
-                    total = int((counts or {}).get("total", 0) or 0)
-                    all_totals.append(total)
-
-                    if total == 0:
-                        out.append(line(
-                            "gb-file", 12, "○",
-                            f'<b>"{html.escape(file_name)}"</b> isimli dosya içerisinde kayıt bulunamamıştır.'
-                        ))
-                        return
-
-                    # dosya satırı
-                    out.append(line(
-                        "gb-file", 6, "○",
-                        f'<b>"{html.escape(file_name)}"</b> isimli dosya içerisinde,'
-                    ))
-
-                    def add_stat(key, label):
-                        val = int((counts or {}).get(key, 0) or 0)
-                        if val > 0:
-                            out.append(line("gb-stat", 24, "▪", f'"{fmt_int(val)}" adet {label}'))
-
-                    add_stat("gsm", "GSM görüşme")
-                    add_stat("sms", "SMS gönderme")
-                    add_stat("internet", "İnternet bağlantısı")
-                    add_stat("sth", "STH görüşmesi")
-                    add_stat("ulus", "Uluslararası görüşme")
-                    add_stat("sabit", "Sabit Hat görüşmesi")
-
-                    out.append(line(
-                        "gb-total", 0, "",
-                        f'olmak üzere toplamda "<b>{fmt_int(total)}</b>" kayıt olduğu görülmüştür.'
-                    ))
-
-                # HEDEF
-                emit_file_block(hedef_file, hedef_counts)
-
-                # KARSI (varsa)
-                emit_file_block(karsi_file, karsi_counts)
-
-                out.append("<br>")
-
-            grand_total = sum(all_totals) if all_totals else 0
-            out.append(
-                line(
-                    "gb-grand-total",
-                    0,
-                    "",
-                    f'Bu haliyle toplam "<b>{fmt_int(grand_total)}</b>" kayıt incelenerek rapora devam olunmuştur.'
-                )
-            )
-            out.append("<br>")
-
-            out.append("</div>")
-            return "\n".join(out)
-
-    def _file_uri(self, path: str) -> str:
-        """Windows/local path -> file:/// URI"""
-        if not path:
-            return ""
-        p = path.replace("\\", "/")
-        if re.match(r"^[A-Za-z]:/", p):
-            return "file:///" + p
-        return p
-    def _postprocess_report_tables(self, html_content: str, title: str) -> str:
-        """
-        - Chromium PDF'de tablo bölünmelerini azaltmak için THEAD'i garanti eder
-        - Delil başlığına göre istenmeyen sütunları kaldırır
-        - Sütunları daraltan colgroup/width enjekte etmez (auto layout)
-        - Sadece çok uzun tek-parça değerlerde (IMEI/ID/IP/URL) kırılmayı açar
-        """
-
-        if title and any(k in title.upper() for k in [
-            "HEDEF HTS",
-            "KARŞI HTS",
-            "ABONE BİLGİLERİ"
-        ]):
-            try:
-                soup = BeautifulSoup(html, "html.parser")
-
-                table = soup.find("table")
-                if table:
-                    thead = table.find("thead")
-                    tbody = table.find("tbody")
-
-                    if thead and tbody:
-                        ths = thead.find_all("th")
-                        oz_idx = None
-                        for i, th in enumerate(ths):
-                            if "ÖZELLİK" in th.get_text().upper():
-                                oz_idx = i
-                                break
-
-                        if oz_idx is not None:
-                            for tr in tbody.find_all("tr"):
-                                tds = tr.find_all("td")
-                                if len(tds) > oz_idx:
-                                    tds[oz_idx]["style"] = (
-                                        tds[oz_idx].get("style", "")
-                                        + " font-weight:700 !important;"
-                                    )
-
-                html_content = str(soup)
-            except Exception:
-                pass
-        try:
-            from bs4 import BeautifulSoup
-        except Exception:
-            return html_content
-
-        def tr_norm(s: str) -> str:
-            s = (s or "").strip()
-            s = s.casefold()
-            # Türkçe karakterleri sadeleştir (eşleşme kaçmasın)
-            s = (s.replace("ı", "i").replace("İ", "i")
-                   .replace("ş", "s").replace("ğ", "g").replace("ç", "c")
-                   .replace("ö", "o").replace("ü", "u"))
-            s = " ".join(s.split())
-            return s
-
-        soup = BeautifulSoup(html_content, "html.parser")
-
-        t = tr_norm(title or "")
-
-        hide_cols = set()
-        # GSM: "SIRA NO" görünmesin
-        if "gsm" in t:
-            hide_cols |= {tr_norm("SIRA NO")}
-
-        # Internet / MutualContactsMatchDialog: belirtilen kolonlar görünmesin
-        if ("internet" in t) or ("mutualcontactsmatchdialog" in t) or ("mutual contacts" in t):
-            hide_cols |= {
-                tr_norm("TUR"),
-                tr_norm("SIRA NO"),
-                tr_norm("HEDEF IP"),
-                tr_norm("GÖNDERME"),
-                tr_norm("İNDİRME"),
-            }
-
-        for table in soup.find_all("table"):
-            # varsa önceki colgroup'ları sök (daraltmayı bitir)
-            cg = table.find("colgroup")
-            if cg:
-                cg.decompose()
-
-            # sınıf ekle
-            existing_cls = table.get("class", [])
-            if "report-table" not in existing_cls:
-                table["class"] = existing_cls + ["report-table"]
-
-            # THEAD yoksa: ilk tr'deki th'leri THEAD'e al
-            thead = table.find("thead")
-            if not thead:
-                first_tr = table.find("tr")
-                if first_tr and first_tr.find("th"):
-                    thead = soup.new_tag("thead")
-                    tr_new = soup.new_tag("tr")
-                    for th in first_tr.find_all("th", recursive=False):
-                        tr_new.append(th.extract())
-                    thead.append(tr_new)
-                    table.insert(0, thead)
-
-            # Başlık hücrelerinden index bul
-            header_tr = table.find("thead").find("tr") if table.find("thead") else None
-            headers = header_tr.find_all(["th", "td"], recursive=False) if header_tr else []
-            header_names = [tr_norm(h.get_text(" ", strip=True)) for h in headers]
-
-            drop_idx = set()
-            if hide_cols and header_names:
-                for i, hn in enumerate(header_names):
-                    if not hn:  # "" ise
-                        drop_idx.add(i)
-
-            # İstenen kolonları kaldır
-            if drop_idx:
-                # header
-                if header_tr:
-                    for i in sorted(drop_idx, reverse=True):
-                        cells = header_tr.find_all(["th", "td"], recursive=False)
-                        if i < len(cells):
-                            cells[i].decompose()
-
-                # body rows
-                for tr in table.find_all("tr"):
-                    tds = tr.find_all(["td", "th"], recursive=False)
-                    for i in sorted(drop_idx, reverse=True):
-                        if i < len(tds):
-                            tds[i].decompose()
-
-            # Çok uzun tek parça token kırılabilsin (geri kalan kelimeler bölünmesin)
-            for td in table.find_all("td"):
-                text = td.get_text(" ", strip=True) or ""
-                # en uzun “boşluksuz” parça
-                max_token = max((len(x) for x in text.split()), default=0)
-                if max_token >= 26:
-                    cls = td.get("class", [])
-                    if "cell-break-anywhere" not in cls:
-                        td["class"] = cls + ["cell-break-anywhere"]
-
-        return str(soup)
-
-    def build_html(self, disabled_sections=None) -> str:
-        """
-        SQL Ayarlı ve Güvenli HTML Oluşturucu
-        - Tüm metinler Segoe UI
-        - Görevlendirme / Dosya Hakkında / HTS Dosya+Abone / Değerlendirme / Sonuç: iki yana yaslı
-        - Otomatik üretilen tablolar justify içine sokulmaz (HTML bozulmasını engeller)
-        - Kapak watermark HTML ile basılmaz, PDF post-process ile basılır
-        """
-        # ✅ disabled_sections her durumda set olsun (işlev aynı)
-        disabled_sections = set(disabled_sections or [])
-        self._ensure_meta_row()
-
-        s = StyleConfig.load()
-        if not isinstance(s, dict):
-            s = StyleConfig.DEFAULTS.copy()
-
-        margins = s.get("margins", StyleConfig.DEFAULTS["margins"])
-
-        def css_gen(key: str) -> str:
-            val = s.get(key)
-            if not isinstance(val, dict):
-                return ""
-            css = f"font-size: {val.get('size', 11)}pt !important;"
-            if val.get("bold"):
-                css += " font-weight: bold !important;"
-            if val.get("italic"):
-                css += " font-style: italic !important;"
-            if val.get("under"):
-                css += " text-decoration: underline !important;"
-            return css
-
-        body_cfg = s.get('body', {})
-        if not isinstance(body_cfg, dict):
-            body_cfg = {}
-
-        justify_size = body_cfg.get('size', 12)
-        justify_bold = "bold" if body_cfg.get('bold') else "normal"
-        justify_italic = "italic" if body_cfg.get('italic') else "normal"
-        justify_under = "underline" if body_cfg.get('under') else "none"
-
-        p, parties = self._fetch_project_info()
-        meta = self._fetch_meta()
-        blocks = self._fetch_blocks()
-
-        (birim, tip, dosya_no, suc, suc_t, gorev_t, bilirkisi_adi, bilirkisi_unvan) = p or ("", "", "", "", "", "", "", "")
-        dosya_numarasi = f"{dosya_no} {tip}".strip()
-
-        def mget(idx, default=""):
-            # ✅ sınır + tip güvenliği (işlev aynı; sadece patlamayı engeller)
-            if not meta or idx >= len(meta):
-                val = default
-            else:
-                val = meta[idx] if meta[idx] is not None else default
-
-            if not isinstance(val, str):
-                val = "" if val is None else str(val)
-
-            val = val.replace('align="left"', '').replace("align='left'", '')
-            val = val.replace('text-align:left', '').replace('text-align: left', '')
-            val = val.replace('text-align:start', '').replace('text-align: start', '')
-            val = val.replace('white-space:nowrap', '').replace('white-space: pre', '')
-            return val
-
-        gorev_metin = mget(1, self.build_default_gorevlendirme())
-
-        dosya_ekler_html = self._render_meta_ekler_html("dosya_hakkinda", "")
-        dosya_metin = (mget(2, "") or "") + (dosya_ekler_html or "")
-
-        genel_metin = mget(3, self.build_default_genel_bilgi())
-        deger_metin = mget(4, "")
-        sonuc_metin = mget(5, "")
-
-        cover_parties_rows = ""
-        if "taraflar" not in disabled_sections and parties:
-            grouped = OrderedDict()  # sıralamayı korur
-
-            for s_val, n_val in parties:
-                sifat = (s_val or "").strip()
-                adsoyad = (n_val or "").strip()
-                if not sifat or not adsoyad:
-                    continue
-                grouped.setdefault(sifat, []).append(adsoyad)
-
-            r_buf = []
-            for sifat, names in grouped.items():
-                joined = ", ".join(html.escape(x) for x in names)
-                r_buf.append(
-                    f"<tr>"
-                    f"<td class='k'>{html.escape(sifat)}</td>"
-                    f"<td class='c'>:</td>"
-                    f"<td class='v party-v'>{joined}</td>"
-                    f"</tr>"
-                )
-            cover_parties_rows = "\n".join(r_buf)
-
-        mt = margins.get("top", 25)
-        mr = margins.get("right", 20)
-        mb = margins.get("bottom", 20)
-        ml = margins.get("left", 25)
-
-        html_out = [f"""<!DOCTYPE html>
-    <html>
-    <head>
-    <meta charset="utf-8">
-    <style>
-    @page {{ size: A4; margin: {mt}mm {mr}mm {mb}mm {ml}mm; }}
-    * {{ box-sizing: border-box; }}
-
-    body {{
-        font-family: "Segoe UI", "DejaVu Sans", Arial, sans-serif;
-        color: #111;
-        {css_gen('body')}
-        width: 100% !important;
-        margin: 0 !important;
-        padding: 0 !important;
-    }}
-
-    h2 {{ margin: 6mm 0 3mm 0; {css_gen('section_title')} }}
-    .center {{ text-align:center; }}
-
-    .page-break{{
-      page-break-after: always;
-      height: 0 !important;
-      line-height: 0 !important;
-      margin: 0 !important;
-      padding: 0 !important;
-      border: 0 !important;
-    }}
-
-    .kv-table {{ width: 100%; border-collapse: collapse; margin-top: 4mm; }}
-    .kv-table td {{ padding: 1.2mm 0; vertical-align: top; {css_gen('kv_values')} }}
-    .kv-table .k {{ width: 30%; text-align: left; padding-right: 2mm; {css_gen('kv_keys')} }}
-    .kv-table .c {{ width: 2%; text-align: left; font-weight:bold; }}
-    .kv-table .v {{ width: 68%; text-align: left; }}
-
-    table {{
-        width: 100% !important;
-        border-collapse: collapse !important;
-        table-layout: auto !important;
-        border-spacing: 0;
-    }}
-
-    .party-v {{
-      text-align: justify;
-      text-align-last: left;
-      white-space: normal;
-      word-break: break-word;
-    }}
-
-    /* -------------------------------------------------------
-       ✅ TABLO STANDARDI
-       - HTS/Abone tabloları (.meta-table)
-       - Delil tabloları (.block-inner table)
-       Hepsi StyleConfig table_head + table_body ile aynı olsun
-    ------------------------------------------------------- */
-
-    /* Genel tablo hücreleri */
-    .meta-table th{{
-        white-space: nowrap !important;
-    }}
-    .block-inner th {{
-        background: #e9eef3 !important;
-        color: #111 !important;
-        text-align: center !important;
-        border: 1px solid #555 !important;
-        white-space: normal !important;
-        overflow-wrap: anywhere !important;
-        word-break: break-word !important;
-        padding: 4px !important;
-        {css_gen('table_head')}
-    }}
-
-    .meta-table td,
-    .block-inner td {{
-        border: 1px solid #555 !important;
-        padding: 3px !important;
-        color: #111 !important;
-        text-align: left !important;
-        white-space: normal !important;
-        word-break: normal !important;
-        overflow-wrap: normal !important;
-        hyphens: none !important;
-        {css_gen('table_body')}
-    }}
-
-    .meta-table td.key {{ font-weight: 700 !important; }}
-
-    /* Delil içi tablo konteyneri: hardcode font-size KALDIRILDI */
-    .block-inner table {{
-      width: 100%;
-      border-collapse: collapse;
-      table-layout: fixed !important;
-      border: 1px solid #555;
-      box-sizing: border-box;
-    }}
-
-    /* Son kolon taşmasın */
-    .block-inner th:last-child,
-    .block-inner td:last-child{{
-        white-space: normal !important;
-        overflow-wrap: anywhere !important;
-        word-break: break-word !important;
-    }}
-
-    .block-inner td.cell-break-anywhere {{
-        overflow-wrap: anywhere !important;
-    }}
-
-    @media print {{
-      thead {{ display: table-header-group; break-inside: avoid !important; }}
-      tfoot {{ display: table-footer-group; break-inside: avoid !important; }}
-      tr {{ break-inside: avoid !important; page-break-inside: avoid !important; }}
-      thead tr {{ break-after: avoid !important; page-break-after: avoid !important; }}
-      tbody tr:first-child {{ break-before: avoid !important; page-break-before: avoid !important; }}
-    }}
-
-    /* -------------------------------------------------------
-       ✅ GÖVDE METNİ STANDARDI
-       QTextEdit’in inline font-size/span stilleri bile ezilsin:
-       - Sabit metin + kullanıcı metni = body ayarları
-    ------------------------------------------------------- */
-    .justify {{
-        width: 100%;
-        text-align: justify !important;
-        white-space: normal !important;
-    }}
-
-    /* p/li ana kural */
-    .justify p,
-    .justify li {{
-        font-size: {justify_size}pt !important;
-        font-weight: {justify_bold} !important;
-        font-style: {justify_italic} !important;
-        text-decoration: {justify_under} !important;
-        color: #111 !important;
-
-        text-align: justify !important;
-        white-space: normal !important;
-
-        line-height: 1.5 !important;   /* ✅ 1,5 SATIR ARALIĞI */
-
-        text-indent: 1.25cm !important;
-
-        margin-top: 0 !important;
-        margin-bottom: 3mm !important; /* satır aralığına uygun */
-    }}
-
-    /* QTextEdit’in ürettiği span/div/font gibi inline stilleri de gövdeye kilitle */
-    .justify span,
-    .justify div,
-    .justify font {{
-        font-size: {justify_size}pt !important;
-        color: inherit !important;
-    }}
-
-    /* QTextEdit inline stilleri KORUNSUN */
-    .justify b,
-    .justify strong {{
-        font-weight: bold !important;
-    }}
-
-    .justify i,
-    .justify em {{
-        font-style: italic !important;
-    }}
-
-    .justify u {{
-        text-decoration: underline !important;
-    }}
-
-    .justify b, .justify strong {{ font-weight: bold !important; }}
-    .justify i, .justify em {{ font-style: italic !important; }}
-    .justify u {{ text-decoration: underline !important; }}
-
-    /* --- DELİL BLOKLARI --- */
-    .block {{
-        margin: 4mm auto;
-        text-indent: 0 !important;
-        page-break-inside: avoid;
-        break-inside: avoid;
-    }}
-    .block-splittable {{
-        page-break-inside: auto !important;
-        break-inside: auto !important;
-    }}
-    .block-title {{
-        margin-bottom: 1.5mm;
-        color: #2c3e50;
-        display: block;
-        width: 100%;
-        {css_gen('evidence_title')}
-        text-align: left !important;
-        text-indent: 0 !important;
-        page-break-after: avoid;
-    }}
-    .block-desc {{
-        margin-top: 1.2mm;
-        text-align: justify;
-        {css_gen('evidence_desc')}
-        text-indent: 0 !important;
-        white-space: pre-wrap !important;
-    }}
-    .block-desc-full{{
-        width: 100% !important;
-        margin: 1.6mm 0 0 0 !important;
-    }}
-    .block img {{
-        max-width: 100% !important;
-        height: auto !important;
-        display: block !important;
-        margin: 0 auto !important;
-    }}
-
-    .map-wrap{{ width:100%; text-align:center; }}
-    .block img.map-img,
-    .block img.geo-map-img {{
-        width: 100% !important;
-        height: auto !important;
-        max-height: 150mm !important;
-        object-fit: contain !important;
-        display: block !important;
-        margin: 0 auto !important;
-        border: none !important;
-        border-radius: 0 !important;
-        background: transparent !important;
-        box-shadow: none !important;
-    }}
-
-    h2 {{
-        page-break-after: avoid;
-        break-after: avoid-page;
-        page-break-inside: avoid;
-        break-inside: avoid;
-    }}
-    h2 + div, h2 + p, h2 + table, h3 + div, h3 + p, h3 + table {{
-        page-break-before: avoid;
-        break-before: avoid-page;
-    }}
-    h2, h3 {{
-        page-break-after: avoid !important;
-        break-after: avoid-page !important;
-    }}
-
-    .cover {{
-        position: relative;
-        height: calc(297mm - {mt}mm - {mb}mm);
-        background: #fff;
-        overflow: hidden;
-        display: flex;
-        flex-direction: column;
-        align-items: center;
-        justify-content: center;
-        padding-top: 0mm;
-    }}
-    .cover-content {{
-        width: 100%;
-        max-width: 100%;
-        padding: 0 6mm;
-        text-align: center;
-    }}
-    .cover-kv {{
-        width: 100%;
-        margin: 0 auto;
-        table-layout: fixed;
-        border-collapse: collapse;
-    }}
-    .cover-kv td {{
-        padding: 1.2mm 0 !important;
-        vertical-align: middle !important;
-    }}
-    .cover-kv .k {{
-        width: 52mm !important;
-        white-space: nowrap !important;
-        font-weight: 700 !important;
-    }}
-    .cover-title {{
-        {css_gen('main_title')}
-        text-align: center;
-        margin-bottom: 8mm;
-        text-decoration: underline;
-        text-underline-offset: 2mm;
-    }}
-    </style>
-    </head>
-    <body>
-    """]
-
-        # --- KAPAK ---
-        html_out.append(f"""
-        <div class="cover">
-          <div class="cover-content">
-            <div class="cover-title">BİLİRKİŞİ RAPORU</div>
-
-            <table class="kv-table cover-kv">
-              <tr><td class='k'>Birim Adı</td><td class='c'>:</td><td class='v'>{html.escape((birim or '').strip())}</td></tr>
-              <tr><td class='k'>Dosya Numarası</td><td class='c'>:</td><td class='v'>{html.escape((str(dosya_numarasi) or '').strip())}</td></tr>
-              <tr><td class='k'>Bilirkişi</td><td class='c'>:</td><td class='v'>{html.escape((bilirkisi_adi or '').strip())}</td></tr>
-              <tr><td class='k'>Ünvanı ve Sicili</td><td class='c'>:</td><td class='v'>{html.escape((bilirkisi_unvan or '').strip())}</td></tr>
-              <tr><td class='k'>Görevlendirme Tarihi</td><td class='c'>:</td><td class='v'>{html.escape((gorev_t or '').strip())}</td></tr>
-
-              <tr><td colspan="3" style="padding:4mm 0 0 0;"></td></tr>
-
-              <tr>
-                <td colspan="3" style="text-decoration: underline; text-underline-offset: 2mm; font-size: 18pt; font-weight: 800; padding:0 !important; margin:0 !important;">
-                  TARAF BİLGİLERİ
-                </td>
-              </tr>
-
-              {cover_parties_rows if cover_parties_rows else ""}
-
-              <tr><td colspan="3" style="padding:2mm 0 0 0;"></td></tr>
-
-              <tr><td class='k'>Suç</td><td class='c'>:</td><td class='v'>{html.escape((suc or '').strip())}</td></tr>
-              <tr><td class='k'>Suç Tarihi</td><td class='c'>:</td><td class='v'>{html.escape((suc_t or '').strip())}</td></tr>
-            </table>
-
-          </div>
-        </div>
-        <div class="page-break"></div>
-        """)
-
-        section_no = 1
-
-        if "gorev" not in disabled_sections:
-            html_out.append(f"<h2>{section_no}. GÖREVLENDİRME</h2><div class='justify'>{gorev_metin}</div>")
-            section_no += 1
-
-        if "dosya" not in disabled_sections:
-            html_out.append(f"<h2>{section_no}. DOSYA HAKKINDA</h2><div class='justify'>{dosya_metin}</div>")
-            section_no += 1
-
-        if "genel" not in disabled_sections:
-            auto = self.build_auto_hts_dosya_abone_details()
-            if isinstance(auto, str) and "GSM Hattı:" in auto:
-                auto = re.sub(
-                    r"(<h3[^>]*>\s*GSM\s*Hattı:\s*[^<]+</h3>)",
-                    r"<div class='keep-with-next'>\1",
-                    auto,
-                    count=1
-                )
-                auto = auto.replace("<div class='block", "</div><div class='block", 1)
-
-            html_out.append(f"<h2>{section_no}. HTS DOSYA VE ABONE BİLGİLERİ</h2>")
-            html_out.append(f"<div class='justify'>{genel_metin}</div>")
-            html_out.append(auto)
-            section_no += 1
-
-        # ✅ DELİLLER BURAYA ALINDI (4. BÖLÜM)
-        if "deliller" not in disabled_sections:
-            html_out.append(f"<h2>{section_no}. DELİLLER</h2>")
-
-            for idx, (bid, sira, baslik, tur, gen, acik, htm, base_html, hidden_json, fmt_json, img, raw) in enumerate(blocks or []):
-                row_char = chr(97 + idx)
-                unique_html_id = f"evidence-{bid}"
-
-                w = int(gen or 100)
-                btitle = baslik or tur or "Delil"
-                src_probe = (img or raw or "")
-
-                block_cls = "block"
-                if tur in ("HTML", "TABLE"):
-                    block_cls = "block block-splittable"
-
-                html_out.append(f"<div id='{unique_html_id}' class='{block_cls}'>")
-                html_out.append(f"<div class='block-title'>{row_char}. {html.escape(btitle)}</div>")
-
-                # ✅ sadece içerik (resim/tablo/html) width ile hareket edecek
-                html_out.append(f"<div class='block-inner' style='width:{w}%; margin:0 auto;'>")
-
-                if tur == "IMAGE":
-                    src = img or raw
-                    if src:
-                        if not src.startswith("data:") and not src.startswith("http"):
-                            src = self._file_uri(src)
-
-                        is_event_map = ("event_map_" in (img or "") or "event_map_" in (raw or ""))
-                        is_geo_map = ("geo_map_" in (img or "") or "geo_map_" in (raw or ""))
-                        is_map = is_event_map or is_geo_map
-
-                        if is_geo_map:
-                            cls = "block-img geo-map-img"
-                        elif is_event_map:
-                            cls = "block-img map-img"
-                        else:
-                            cls = "block-img"
-
-                        if is_map:
-                            html_out.append("<div class='map-wrap'>")
-                            html_out.append(f"<img class='{cls}' src='{src}'>")
-                            html_out.append("</div>")
-                        else:
-                            html_out.append(f"<img class='{cls}' src='{src}'>")
-
-                elif tur in ("HTML", "TABLE"):
-                    # ✅ her zaman tam tabloyu kaynak al ki hem gizleme hem geri getirme çalışsın
-                    content = (base_html or htm or raw)
-
-                    if content:
-                        try:
-                            # hidden list
-                            hidden_list = []
-                            if hidden_json:
-                                hidden_list = json.loads(hidden_json) if isinstance(hidden_json, str) else (hidden_json or [])
-
-                            # fmt dict
-                            fmt = {}
-                            if fmt_json:
-                                fmt = json.loads(fmt_json) if isinstance(fmt_json, str) else (fmt_json or {})
-
-                            # ✅ sadece TABLE için uygula
-                            if tur == "TABLE":
-                                if hidden_list:
-                                    content = _apply_hidden_cols_to_table_html(content, hidden_list)
-                                if isinstance(fmt, dict) and fmt:
-                                    content = _apply_fmt_to_table_html(content, fmt)
-
-                        except Exception:
-                            pass
-
-                        if hasattr(self, "_postprocess_report_tables"):
-                            content = self._postprocess_report_tables(content, btitle)
-
-                        html_out.append(content)
-
-                html_out.append("</div>")  # ✅ block-inner kapanır (açıklama artık etkilenmez)
-
-                # ✅ AÇIKLAMA FULL-WIDTH: resimle birlikte daralıp genişlemez
-                if acik:
-                    html_out.append(f"<div class='block-desc block-desc-full'>{acik}</div>")
-
-                html_out.append("</div>")  # block
-
-            section_no += 1
-
-        # ✅ DEĞERLENDİRME 5
-        if "deg" not in disabled_sections:
-            html_out.append(f"<h2>{section_no}. DEĞERLENDİRME</h2><div class='justify'>{deger_metin}</div>")
-            section_no += 1
-
-        # ✅ SONUÇ 6
-        if "sonuc" not in disabled_sections:
-            html_out.append(f"<h2>{section_no}. SONUÇ</h2><div class='justify'>{sonuc_metin}</div>")
-            section_no += 1
-        html_out.append("</body></html>")
-        return "\n".join(html_out)
-
-
-class PDFExporter:
-
-    @staticmethod
-    def export_pdf(
-        html_string: str,
-        out_path: str,
-        margin_top_mm: int = 20,
-        margin_right_mm: int = 20,
-        margin_bottom_mm: int = 20,
-        margin_left_mm: int = 20,
-        zoom: float = 0.96,
-        footer_font_size: int = 10,
-        footer_right_text: str = "",
-        # ÇERÇEVE
-        draw_frame: bool = True,
-        frame_inset_mm: float = 8.0,
-        frame_radius_pt: float = 8.0,
-        frame_stroke_rgb=(0.90, 0.90, 0.90),
-        frame_line_width: float = 1.3,
-        # KAPAK WATERMARK
-        draw_cover_watermark: bool = True,
-        cover_watermark_size_mm: float = 210.0,
-        cover_watermark_opacity: float = 0.10,
-        cover_watermark_blur_px: float = 2.2,
-        # DAMGA (kapak hariç sol üst)
-        draw_stamp: bool = True,
-        stamp_size_mm: float = 20.0,          # büyüttük (12 -> 14)
-        stamp_opacity: float = 0.18,
-        stamp_offset_mm: float = 1.5,         # çerçeveye daha yakın (yazıya değmesin diye kontrol bizde)
-        **_ignored_kwargs,
-    ):
-        import os, io, tempfile, shutil
-
-        status_cb = _ignored_kwargs.pop("status_cb", None)      # callable(str)
-        progress_cb = _ignored_kwargs.pop("progress_cb", None)  # callable(int) 0-100
-
-        def _status(msg: str):
-            try:
-                if callable(status_cb):
-                    status_cb(str(msg))
-            except Exception:
-                pass
-
-        def _progress(pct: int):
-            try:
-                if callable(progress_cb):
-                    progress_cb(int(pct))
-            except Exception:
-                pass
-
-        try:
-            out_path = os.path.abspath(out_path)
-            out_dir = os.path.dirname(out_path)
-            os.makedirs(out_dir, exist_ok=True)
-
-            # PDF açık/kitli mi?
-            if os.path.exists(out_path):
-                lock_test = out_path + ".~locktest"
-                try:
-                    os.replace(out_path, lock_test)
-                    os.replace(lock_test, out_path)
-                except Exception:
-                    raise RuntimeError(
-                        "PDF dosyası şu anda AÇIK veya KİLİTLİ görünüyor.\n\n"
-                        "Lütfen PDF'i kapatın ve tekrar deneyin."
-                    )
-
-            app_dir = APP_DIR
-            logo_path = os.path.join(app_dir, "assets", "logo.png")
-            if not os.path.exists(logo_path):
-                logo_path = ""
-
-            tmp_pdf_path = out_path + ".tmp.pdf"
-
-            # ========== 1) CHROMIUM (Playwright) ile PDF render ==========
-            _status("PDF oluşturuluyor... (Chromium render)")
-            _progress(5)
-
-            try:
-                from playwright.sync_api import sync_playwright
-            except Exception as e:
-                raise RuntimeError(
-                    "Chromium PDF motoru için Playwright gerekli.\n"
-                    "Kurulum:\n"
-                    "  pip install playwright\n"
-                    "  playwright install chromium\n\n"
-                    f"Detay: {e}"
-                )
-
-            with tempfile.TemporaryDirectory() as td:
-                html_path = os.path.join(td, "report.html")
-                with open(html_path, "w", encoding="utf-8") as f:
-                    f.write(html_string)
-                _progress(15)
-
-                file_url = "file:///" + os.path.abspath(html_path).replace("\\", "/")
-
-                with sync_playwright() as p:
-                    browser = p.chromium.launch()
-                    page = browser.new_page()
-                    page.goto(file_url, wait_until="networkidle")
-                    _progress(35)
-
-                    page.pdf(
-                        path=tmp_pdf_path,
-                        format="A4",
-                        print_background=True,
-                        scale=float(zoom),
-                        margin={
-                            "top": f"{int(margin_top_mm)}mm",
-                            "right": f"{int(margin_right_mm)}mm",
-                            "bottom": f"{int(margin_bottom_mm)}mm",
-                            "left": f"{int(margin_left_mm)}mm",
-                        },
-                    )
-                    browser.close()
-
-                _status("PDF düzenleniyor... (overlay/çerçeve/damga)")
-                _progress(65)
-
-                # ========== 2) POST-PROCESS OVERLAY ==========
-                try:
-                    try:
-                        from pypdf import PdfReader, PdfWriter
-                        _HAS_OVER_PARAM = True
-                    except Exception:
-                        from PyPDF2 import PdfReader, PdfWriter
-                        _HAS_OVER_PARAM = False
-
-                    from reportlab.pdfgen import canvas
-                    from reportlab.lib.utils import ImageReader
-                    from reportlab.pdfbase import pdfmetrics
-                    from reportlab.pdfbase.ttfonts import TTFont
-
-                    mm_to_pt = 2.83464567
-                    inset_pt = float(frame_inset_mm) * mm_to_pt
-                    wm_size_pt = float(cover_watermark_size_mm) * mm_to_pt
-                    stamp_size_pt = float(stamp_size_mm) * mm_to_pt
-                    stamp_pad_pt = float(stamp_offset_mm) * mm_to_pt
-
-                    # Footer font: Segoe UI varsa yakala (yoksa Helvetica)
-                    footer_font_name = "Helvetica"
-                    font_candidates = [
-                        os.path.join(app_dir, "assets", "fonts", "segoeui.ttf"),
-                        os.path.join(app_dir, "assets", "fonts", "SegoeUI.ttf"),
-                        os.path.join(app_dir, "assets", "segoeui.ttf"),
-                        os.path.join(app_dir, "assets", "SegoeUI.ttf"),
-                        os.path.join(app_dir, "assets", "fonts", "DejaVuSans.ttf"),
-                        os.path.join(app_dir, "assets", "DejaVuSans.ttf"),
-                    ]
-                    for fp in font_candidates:
-                        if os.path.exists(fp):
-                            try:
-                                pdfmetrics.registerFont(TTFont("HTSReportFont", fp))
-                                footer_font_name = "HTSReportFont"
-                                break
-                            except Exception:
-                                pass
-
-                    wm_img_path = None
-                    if draw_cover_watermark and logo_path:
-                        try:
-                            from PIL import Image, ImageFilter, ImageEnhance
-                            im = Image.open(logo_path).convert("RGBA")
-                            gray = im.convert("L")
-                            im = Image.merge("RGBA", (gray, gray, gray, im.split()[-1]))
-                            im = im.filter(ImageFilter.GaussianBlur(radius=float(cover_watermark_blur_px)))
-                            r, g, b, a = im.split()
-                            a = ImageEnhance.Brightness(a).enhance(float(cover_watermark_opacity))
-                            im = Image.merge("RGBA", (r, g, b, a))
-                            wm_img_path = os.path.join(td, "wm_cover.png")
-                            im.save(wm_img_path, "PNG")
-                        except Exception:
-                            wm_img_path = None
-
-                    stamp_img_path = None
-                    if draw_stamp and logo_path:
-                        try:
-                            from PIL import Image, ImageEnhance
-                            im = Image.open(logo_path).convert("RGBA")
-                            gray = im.convert("L")
-                            im = Image.merge("RGBA", (gray, gray, gray, im.split()[-1]))
-                            r, g, b, a = im.split()
-                            a = ImageEnhance.Brightness(a).enhance(float(stamp_opacity))
-                            im = Image.merge("RGBA", (r, g, b, a))
-                            stamp_img_path = os.path.join(td, "stamp.png")
-                            im.save(stamp_img_path, "PNG")
-                        except Exception:
-                            stamp_img_path = None
-
-                    reader = PdfReader(tmp_pdf_path)
-                    writer = PdfWriter()
-
-                    footer_y = inset_pt * 0.55
-
-                    total_pages = len(reader.pages) if hasattr(reader, "pages") else 0
-                    for i, page in enumerate(reader.pages):
-                        if total_pages > 0:
-                            _progress(65 + int(25 * (i / max(1, total_pages - 1))))
-
-                        w = float(page.mediabox.width)
-                        h = float(page.mediabox.height)
-
-                        # 2.1 Kapak watermark (1. sayfa)
-                        if draw_cover_watermark and i == 0 and wm_img_path and os.path.exists(wm_img_path):
-                            packet = io.BytesIO()
-                            c = canvas.Canvas(packet, pagesize=(w, h))
-                            x = (w - wm_size_pt) / 2.0
-                            y = (h - wm_size_pt) / 2.0
-                            c.drawImage(
-                                ImageReader(wm_img_path),
-                                x, y,
-                                width=wm_size_pt, height=wm_size_pt,
-                                preserveAspectRatio=True,
-                                mask="auto",
-                            )
-                            c.showPage()
-                            c.save()
-                            packet.seek(0)
-                            ov = PdfReader(packet).pages[0]
-                            if _HAS_OVER_PARAM:
-                                page.merge_page(ov, over=True)
-                            else:
-                                page.merge_page(ov)
-
-                        # 2.2 Damga (kapak hariç)
-                        if draw_stamp and i >= 1 and stamp_img_path and os.path.exists(stamp_img_path):
-                            packet = io.BytesIO()
-                            c = canvas.Canvas(packet, pagesize=(w, h))
-                            x = inset_pt + stamp_pad_pt
-                            y = h - inset_pt - stamp_pad_pt - stamp_size_pt
-                            c.drawImage(
-                                ImageReader(stamp_img_path),
-                                x, y,
-                                width=stamp_size_pt, height=stamp_size_pt,
-                                preserveAspectRatio=True,
-                                mask="auto",
-                            )
-                            c.showPage()
-                            c.save()
-                            packet.seek(0)
-                            ov = PdfReader(packet).pages[0]
-                            if _HAS_OVER_PARAM:
-                                page.merge_page(ov, over=True)
-                            else:
-                                page.merge_page(ov)
-
-                        # 2.3 Footer
-                        packet = io.BytesIO()
-                        c = canvas.Canvas(packet, pagesize=(w, h))
-                        c.setFont(footer_font_name, int(footer_font_size))
-                        c.setFillColorRGB(0.60, 0.63, 0.66)
-
-                        pno = str(i + 1)
-                        c.drawCentredString(w / 2.0, footer_y, pno)
-
-                        if footer_right_text:
-                            c.drawRightString(w - inset_pt, footer_y, str(footer_right_text))
-
-                        c.showPage()
-                        c.save()
-                        packet.seek(0)
-                        ov = PdfReader(packet).pages[0]
-                        if _HAS_OVER_PARAM:
-                            page.merge_page(ov, over=True)
-                        else:
-                            page.merge_page(ov)
-
-                        # 2.4 Çerçeve (en son)
-                        if draw_frame:
-                            packet = io.BytesIO()
-                            c = canvas.Canvas(packet, pagesize=(w, h))
-                            c.setLineWidth(float(frame_line_width))
-                            rr, gg, bb = frame_stroke_rgb
-                            c.setStrokeColorRGB(float(rr), float(gg), float(bb))
-                            c.roundRect(
-                                inset_pt, inset_pt,
-                                w - 2 * inset_pt, h - 2 * inset_pt,
-                                float(frame_radius_pt),
-                                stroke=1, fill=0
-                            )
-                            c.showPage()
-                            c.save()
-                            packet.seek(0)
-                            ov = PdfReader(packet).pages[0]
-                            if _HAS_OVER_PARAM:
-                                page.merge_page(ov, over=True)
-                            else:
-                                page.merge_page(ov)
-
-                        writer.add_page(page)
-
-                    post_path = tmp_pdf_path + ".post.pdf"
-                    with open(post_path, "wb") as f:
-                        writer.write(f)
-                    os.replace(post_path, tmp_pdf_path)
-
-                except Exception as e:
-                    raise RuntimeError(f"PDF post-process başarısız: {e}")
-
-                shutil.move(tmp_pdf_path, out_path)
-                _progress(100)
-                _status("PDF hazır.")
-
-            try:
-                if os.path.exists(tmp_pdf_path):
-                    os.remove(tmp_pdf_path)
-            except Exception:
-                pass
-
-        finally:
-            _status("")
-
-
-class StyleConfig:
-    """
-    Rapor stillerini veritabanından (sütunlu yapıdan) okur.
-    JSON kullanmaz, doğrudan SQL sütunlarını sözlüğe çevirir.
-    """
-
-    DEFAULTS = {
-        "main_title": {"label": "Rapor Ana Başlığı", "size": 18, "bold": True, "italic": False, "under": False},
-        "section_title": {"label": "Bölüm Başlıkları", "size": 14, "bold": True, "italic": False, "under": False},
-        "kv_keys": {"label": "Kapak Bilgi Başlıkları", "size": 12, "bold": True, "italic": False, "under": False},
-        "kv_values": {"label": "Kapak Bilgi Değerleri", "size": 12, "bold": False, "italic": False, "under": False},
-        "body": {"label": "Gövde Metinleri", "size": 12, "bold": False, "italic": False, "under": False},
-        "table_head": {"label": "Tablo Başlıkları", "size": 14, "bold": True, "italic": False, "under": False},
-        "table_body": {"label": "Tablo İçeriği", "size": 9, "bold": False, "italic": False, "under": False},
-        "evidence_title": {"label": "Delil Başlıkları", "size": 14, "bold": True, "italic": False, "under": True},
-        "evidence_desc": {"label": "Delil Açıklamaları", "size": 12, "bold": False, "italic": True, "under": False},
-        "margins": {"top": 25, "right": 20, "bottom": 20, "left": 25}
-    }
-
-    @staticmethod
-    def _init_tables(conn):
-        """Tablolar yoksa oluşturur + eksik kolonları migrasyonla ekler."""
-        try:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS rapor_font_ayarlari (
-                    Anahtar TEXT PRIMARY KEY,
-                    Etiket TEXT,
-                    Boyut INTEGER,
-                    Kalin INTEGER DEFAULT 0,
-                    Italik INTEGER DEFAULT 0,
-                    AltiCizili INTEGER DEFAULT 0
-                )
-            """)
-
-            # Esas tablo (TR kolonlar)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS rapor_sayfa_duzeni (
-                    id INTEGER PRIMARY KEY CHECK (id = 1),
-                    MarginUst INTEGER DEFAULT 25,
-                    MarginSag INTEGER DEFAULT 20,
-                    MarginAlt INTEGER DEFAULT 20,
-                    MarginSol INTEGER DEFAULT 25
-                )
-            """)
-
-            cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_sayfa_duzeni)").fetchall()]
-
-            def _add_col(col_name: str, default_val: int):
-                nonlocal cols
-                if col_name not in cols:
-                    conn.execute(f"ALTER TABLE rapor_sayfa_duzeni ADD COLUMN {col_name} INTEGER DEFAULT {int(default_val)}")
-                    cols.append(col_name)
-
-            # TR + EN kolonları garanti etmeye çalış
-            _add_col("MarginUst", 25)
-            _add_col("MarginSag", 20)
-            _add_col("MarginAlt", 20)
-            _add_col("MarginSol", 25)
-
-            _add_col("TopMargin", 25)
-            _add_col("RightMargin", 20)
-            _add_col("BottomMargin", 20)
-            _add_col("LeftMargin", 25)
-
-            # id=1 satırı garanti
-            conn.execute("INSERT OR IGNORE INTO rapor_sayfa_duzeni (id) VALUES (1)")
-
-            # ✅ Güvenli NULL->default: sadece mevcut kolonlar için UPDATE üret
-            cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_sayfa_duzeni)").fetchall()]
-            sets = []
-            if "MarginUst" in cols:    sets.append("MarginUst    = COALESCE(MarginUst, 25)")
-            if "MarginSag" in cols:    sets.append("MarginSag    = COALESCE(MarginSag, 20)")
-            if "MarginAlt" in cols:    sets.append("MarginAlt    = COALESCE(MarginAlt, 20)")
-            if "MarginSol" in cols:    sets.append("MarginSol    = COALESCE(MarginSol, 25)")
-            if "TopMargin" in cols:    sets.append("TopMargin    = COALESCE(TopMargin, 25)")
-            if "RightMargin" in cols:  sets.append("RightMargin  = COALESCE(RightMargin, 20)")
-            if "BottomMargin" in cols: sets.append("BottomMargin = COALESCE(BottomMargin, 20)")
-            if "LeftMargin" in cols:   sets.append("LeftMargin   = COALESCE(LeftMargin, 25)")
-
-            if sets:
-                conn.execute(f"UPDATE rapor_sayfa_duzeni SET {', '.join(sets)} WHERE id=1")
-
-            conn.commit()
-
-        except Exception as e:
-            print(f"Tablo kontrol hatası: {e}")
-
-    @staticmethod
-    def load():
-        """Veritabanından ayarları okur ve Dict döndürür."""
-        try:
-            config = copy.deepcopy(StyleConfig.DEFAULTS)
-        except Exception:
-            config = StyleConfig.DEFAULTS.copy()
-
-        try:
-            with DB() as conn:
-                StyleConfig._init_tables(conn)
-
-                cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_sayfa_duzeni)").fetchall()]
-
-                # Öncelik: TR kolonlar; yoksa EN kolonlar
-                if all(c in cols for c in ("MarginUst", "MarginSag", "MarginAlt", "MarginSol")):
-                    row = conn.execute(
-                        "SELECT MarginUst, MarginSag, MarginAlt, MarginSol FROM rapor_sayfa_duzeni WHERE id=1"
-                    ).fetchone()
-                    if row:
-                        config["margins"] = {"top": int(row[0]), "right": int(row[1]), "bottom": int(row[2]), "left": int(row[3])}
-
-                elif all(c in cols for c in ("TopMargin", "RightMargin", "BottomMargin", "LeftMargin")):
-                    row = conn.execute(
-                        "SELECT TopMargin, RightMargin, BottomMargin, LeftMargin FROM rapor_sayfa_duzeni WHERE id=1"
-                    ).fetchone()
-                    if row:
-                        config["margins"] = {"top": int(row[0]), "right": int(row[1]), "bottom": int(row[2]), "left": int(row[3])}
-
-                rows = conn.execute(
-                    "SELECT Anahtar, Etiket, Boyut, Kalin, Italik, AltiCizili FROM rapor_font_ayarlari"
-                ).fetchall()
-
-                for r in rows:
-                    key = r[0]
-                    if key in config and key != "margins":
-                        config[key] = {
-                            "label": str(r[1]),
-                            "size": int(r[2]),
-                            "bold": bool(r[3]),
-                            "italic": bool(r[4]),
-                            "under": bool(r[5])
-                        }
-
-        except Exception as e:
-            print(f"Stil yükleme hatası: {e}")
-            return config
-
-        return config
-
-    @staticmethod
-    def save(data):
-        """Verileri DB'ye yazar."""
-        try:
-            with DB() as conn:
-                StyleConfig._init_tables(conn)
-
-                for key, val in data.items():
-                    if key == "margins":
-                        continue
-                    if isinstance(val, dict):
-                        conn.execute("""
-                            INSERT OR REPLACE INTO rapor_font_ayarlari
-                            (Anahtar, Etiket, Boyut, Kalin, Italik, AltiCizili)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        """, (
-                            key,
-                            val.get("label", ""),
-                            int(val.get("size", 12)),
-                            1 if val.get("bold") else 0,
-                            1 if val.get("italic") else 0,
-                            1 if val.get("under") else 0
-                        ))
-
-                margins = data.get("margins", {}) if isinstance(data.get("margins", {}), dict) else {}
-                top = int(margins.get("top", 25))
-                right = int(margins.get("right", 20))
-                bottom = int(margins.get("bottom", 20))
-                left = int(margins.get("left", 25))
-
-                cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_sayfa_duzeni)").fetchall()]
-                conn.execute("INSERT OR IGNORE INTO rapor_sayfa_duzeni (id) VALUES (1)")
-
-                sets = []
-                params = []
-
-                # TR kolonlara yaz
-                if "MarginUst" in cols:  sets.append("MarginUst=?");  params.append(top)
-                if "MarginSag" in cols:  sets.append("MarginSag=?");  params.append(right)
-                if "MarginAlt" in cols:  sets.append("MarginAlt=?");  params.append(bottom)
-                if "MarginSol" in cols:  sets.append("MarginSol=?");  params.append(left)
-
-                # EN kolonlara da yaz (TopMargin kullanan sürümlerle uyum)
-                if "TopMargin" in cols:   sets.append("TopMargin=?");   params.append(top)
-                if "RightMargin" in cols: sets.append("RightMargin=?"); params.append(right)
-                if "BottomMargin" in cols:sets.append("BottomMargin=?");params.append(bottom)
-                if "LeftMargin" in cols:  sets.append("LeftMargin=?");  params.append(left)
-
-                if sets:
-                    conn.execute(f"UPDATE rapor_sayfa_duzeni SET {', '.join(sets)} WHERE id=1", params)
-
-                conn.commit()
-
-        except Exception as e:
-            print(f"Stil Kayıt Hatası: {e}")
-
-
-class StyleEditorDialog(QDialog):
-    """Gelişmiş Stil ve Düzen Editörü (Tablo Görünümlü - Başlıklı)"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Rapor Biçim ve Düzen Ayarları")
-        self.resize(700, 750)
-
-        self.current_styles = StyleConfig.load()
-        if isinstance(self.current_styles, str):
-            try: self.current_styles = json.loads(self.current_styles)
-            except: self.current_styles = None
-        if not isinstance(self.current_styles, dict):
-            self.current_styles = StyleConfig.DEFAULTS.copy()
-
-        self.style_inputs = {}
-
-        layout = QVBoxLayout(self)
-
-        tabs = QTabWidget()
-
-        tab_fonts = QWidget()
-        l_fonts = QVBoxLayout(tab_fonts)
-
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.Shape.NoFrame)
-        content_widget = QWidget()
-
-        grid = QGridLayout(content_widget)
-        grid.setSpacing(15)
-        grid.setContentsMargins(15, 20, 15, 20)
-
-        headers = ["Düzenlenecek Alan", "Boyut (pt)", "Kalın", "İtalik", "Altı Çizili"]
-        for col, text in enumerate(headers):
-            lbl = QLabel(text)
-            lbl.setStyleSheet("font-weight: bold; color: #555; text-transform: uppercase; font-size: 11px;")
-            if col > 0:
-                lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            grid.addWidget(lbl, 0, col)
-
-        line = QFrame()
-        line.setFrameShape(QFrame.Shape.HLine)
-        line.setStyleSheet("color: #ccc;")
-        grid.addWidget(line, 1, 0, 1, 5)
-
-        style_keys = [k for k in StyleConfig.DEFAULTS.keys() if k != "margins"]
-
-        btn_style = """
-            QPushButton { 
-                background-color: #f9f9f9; 
-                border: 1px solid #ccc; 
-                border-radius: 4px; 
-                font-size: 13px; font-weight: bold; color: #444;
-            }
-            QPushButton:checked { 
-                background-color: #3498db; 
-                color: white; 
-                border: 1px solid #2980b9; 
-            }
-            QPushButton:hover { background-color: #e6e6e6; }
-        """
-
-        row = 2
-        for key in style_keys:
-            def_val = StyleConfig.DEFAULTS[key]
-            curr_val = self.current_styles.get(key, def_val)
-            if not isinstance(curr_val, dict): curr_val = def_val
-
-            label_text = curr_val.get("label", def_val["label"])
-
-            lbl_name = QLabel(label_text)
-            lbl_name.setStyleSheet("font-weight: bold; color: #2c3e50; font-size: 13px;")
-            grid.addWidget(lbl_name, row, 0)
-
-            sb = QSpinBox()
-            sb.setRange(6, 72)
-            sb.setValue(int(curr_val.get("size", 12)))
-            sb.setSuffix(" pt")
-            sb.setFixedWidth(90)
-            sb.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            grid.addWidget(sb, row, 1, alignment=Qt.AlignmentFlag.AlignCenter)
-
-            btn_bold = QPushButton("K")
-            btn_bold.setCheckable(True)
-            btn_bold.setChecked(bool(curr_val.get("bold", False)))
-            btn_bold.setFixedSize(40, 30)
-            btn_bold.setStyleSheet(btn_style)
-            grid.addWidget(btn_bold, row, 2, alignment=Qt.AlignmentFlag.AlignCenter)
-
-            btn_italic = QPushButton("I")
-            btn_italic.setCheckable(True)
-            btn_italic.setChecked(bool(curr_val.get("italic", False)))
-            btn_italic.setFixedSize(40, 30)
-            btn_italic.setStyleSheet(btn_style + "QPushButton { font-style: italic; font-family: serif; }")
-            grid.addWidget(btn_italic, row, 3, alignment=Qt.AlignmentFlag.AlignCenter)
-
-            btn_under = QPushButton("A")
-            btn_under.setCheckable(True)
-            btn_under.setChecked(bool(curr_val.get("under", False)))
-            btn_under.setFixedSize(40, 30)
-            btn_under.setStyleSheet(btn_style + "QPushButton { text-decoration: underline; }")
-            grid.addWidget(btn_under, row, 4, alignment=Qt.AlignmentFlag.AlignCenter)
-
-            self.style_inputs[key] = (sb, btn_bold, btn_italic, btn_under)
-            row += 1
-
-        spacer = QWidget()
-        spacer.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Expanding)
-        grid.addWidget(spacer, row, 0)
-
-        scroll.setWidget(content_widget)
-        l_fonts.addWidget(scroll)
-        tabs.addTab(tab_fonts, "🔤 Yazı Tipi ve Stiller")
-
-        tab_page = QWidget()
-        l_page = QVBoxLayout(tab_page)
-
-        grp_margin = QGroupBox("Sayfa Kenar Boşlukları (mm)")
-        grid_margin = QGridLayout(grp_margin)
-
-        margins_curr = self.current_styles.get("margins", StyleConfig.DEFAULTS["margins"])
-
-        self.sb_top = self._create_margin_spin(margins_curr.get("top", 25))
-        self.sb_bottom = self._create_margin_spin(margins_curr.get("bottom", 20))
-        self.sb_left = self._create_margin_spin(margins_curr.get("left", 25))
-        self.sb_right = self._create_margin_spin(margins_curr.get("right", 20))
-
-        grid_margin.setHorizontalSpacing(25)
-        grid_margin.setVerticalSpacing(15)
-
-        grid_margin.addWidget(QLabel("Üst"), 0, 1, Qt.AlignmentFlag.AlignCenter)
-        grid_margin.addWidget(self.sb_top, 1, 1, Qt.AlignmentFlag.AlignCenter)
-
-        grid_margin.addWidget(QLabel("Sol"), 2, 0, Qt.AlignmentFlag.AlignRight)
-        grid_margin.addWidget(self.sb_left, 3, 0, Qt.AlignmentFlag.AlignRight)
-
-        page_icon = QLabel("📄")
-        page_icon.setStyleSheet("font-size: 48px; color: #bdc3c7;")
-        page_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        grid_margin.addWidget(page_icon, 2, 1, 2, 1, Qt.AlignmentFlag.AlignCenter)
-
-        grid_margin.addWidget(QLabel("Sağ"), 2, 2, Qt.AlignmentFlag.AlignLeft)
-        grid_margin.addWidget(self.sb_right, 3, 2, Qt.AlignmentFlag.AlignLeft)
-
-        grid_margin.addWidget(self.sb_bottom, 4, 1, Qt.AlignmentFlag.AlignCenter)
-        grid_margin.addWidget(QLabel("Alt"), 5, 1, Qt.AlignmentFlag.AlignCenter)
-
-        l_page.addWidget(grp_margin)
-        l_page.addStretch()
-        tabs.addTab(tab_page, "📐 Sayfa Düzeni")
-
-        layout.addWidget(tabs)
-
-        btn_box = QHBoxLayout()
-        btn_reset = QPushButton("Varsayılanlara Dön")
-        btn_reset.setStyleSheet("background-color: #95a5a6; color: white; padding: 8px;")
-        btn_reset.clicked.connect(self.reset_defaults)
-
-        btn_save = QPushButton("💾 Kaydet ve Uygula")
-        btn_save.setStyleSheet("background-color: #27ae60; color: white; font-weight: bold; padding: 10px; font-size: 14px;")
-        btn_save.clicked.connect(self.save_settings)
-
-        btn_box.addWidget(btn_reset)
-        btn_box.addStretch()
-        btn_box.addWidget(btn_save)
-        layout.addLayout(btn_box)
-
-    def _create_margin_spin(self, val):
-        sb = QSpinBox()
-        sb.setRange(0, 100)
-        sb.setValue(int(val))
-        sb.setSuffix(" mm")
-        sb.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        sb.setFixedWidth(80)
-        return sb
-
-    def save_settings(self):
-        new_data = {}
-        for key, (sb, b, i, u) in self.style_inputs.items():
-            orig_label = self.current_styles.get(key, {}).get("label", "")
-            if not orig_label: orig_label = StyleConfig.DEFAULTS[key]["label"]
-
-            new_data[key] = {
-                "label": orig_label,
-                "size": sb.value(),
-                "bold": b.isChecked(),
-                "italic": i.isChecked(),
-                "under": u.isChecked()
-            }
-
-        new_data["margins"] = {
-            "top": self.sb_top.value(),
-            "bottom": self.sb_bottom.value(),
-            "left": self.sb_left.value(),
-            "right": self.sb_right.value()
-        }
-
-        if "body" not in new_data: new_data["body"] = StyleConfig.DEFAULTS["body"]
-        StyleConfig.save(new_data)
-        ModernDialog.show_success(self, "Kaydedildi", "Ayarlar kaydedildi.")
-        self.accept()
-
-    def reset_defaults(self):
-        if ModernDialog.show_question(self, "Sıfırla", "Varsayılanlara dönülsün mü?"):
-            StyleConfig.save(StyleConfig.DEFAULTS)
-            self.accept()
-
-
-class RichDescriptionDialog(QDialog):
-    """Açıklama düzenlemek için özel Zengin Metin (Kalın/İtalik/Altı Çizili) penceresi."""
-    def __init__(self, parent=None, text="", title="Açıklama Düzenle"):
-        super().__init__(parent)
-        self.setWindowTitle(title)
-        self.resize(800, 450)
-
-        layout = QVBoxLayout(self)
-
-        toolbar = QHBoxLayout()
-        toolbar.setSpacing(5)
-
-        btn_style = """
-            QPushButton { 
-                background-color: #f0f0f0; border: 1px solid #ccc; 
-                border-radius: 3px; font-weight: bold; width: 28px; height: 28px;
-                font-family: 'Times New Roman'; font-size: 14px; color: #333;
-            }
-            QPushButton:hover { background-color: #e0e0e0; }
-            QPushButton:checked { background-color: #3498db; color: white; border: 1px solid #2980b9; }
-        """
-
-        def set_fmt(fmt_type):
-            cursor = self.editor.textCursor()
-            fmt = QTextCharFormat()
-            if fmt_type == 'bold':
-                fmt.setFontWeight(QFont.Weight.Bold if cursor.charFormat().fontWeight() != QFont.Weight.Bold else QFont.Weight.Normal)
-            elif fmt_type == 'italic':
-                fmt.setFontItalic(not cursor.charFormat().fontItalic())
-            elif fmt_type == 'under':
-                fmt.setFontUnderline(not cursor.charFormat().fontUnderline())
-            self.editor.mergeCurrentCharFormat(fmt)
-            self.editor.setFocus()
-
-        btn_b = QPushButton("K"); btn_b.setToolTip("Kalın"); btn_b.setStyleSheet(btn_style); btn_b.clicked.connect(lambda: set_fmt('bold'))
-        btn_i = QPushButton("I"); btn_i.setToolTip("İtalik"); btn_i.setStyleSheet(btn_style + "QPushButton { font-style: italic; }"); btn_i.clicked.connect(lambda: set_fmt('italic'))
-        btn_u = QPushButton("A"); btn_u.setToolTip("Altı Çizili"); btn_u.setStyleSheet(btn_style + "QPushButton { text-decoration: underline; }"); btn_u.clicked.connect(lambda: set_fmt('under'))
-
-        toolbar.addWidget(btn_b); toolbar.addWidget(btn_i); toolbar.addWidget(btn_u); toolbar.addStretch()
-        layout.addLayout(toolbar)
-
-        self.editor = QTextEdit()
-        if "<" in text and ">" in text:
-            self.editor.setHtml(text)
-        else:
-            self.editor.setPlainText(text)
-
-        layout.addWidget(self.editor)
-
-        btn_box = QHBoxLayout()
-        btn_cancel = QPushButton("İptal"); btn_cancel.clicked.connect(self.reject)
-        btn_save = QPushButton("Kaydet"); btn_save.setStyleSheet("background-color:#27ae60; color:white; font-weight:bold;"); btn_save.clicked.connect(self.accept)
-        btn_box.addStretch(); btn_box.addWidget(btn_cancel); btn_box.addWidget(btn_save)
-        layout.addLayout(btn_box)
-
-    def get_html(self):
-        return self.editor.toHtml()
-
-
-class MetaEkRowWidget(QWidget):
-    clicked = pyqtSignal(int)          # db_id
-    edit_desc = pyqtSignal(int)        # db_id
-    edit_props = pyqtSignal(int)       # db_id
-    deleted = pyqtSignal(int)          # db_id
-
-    def __init__(self, db_id: int, title: str, has_desc: bool, parent=None):
-        super().__init__(parent)
-        self.db_id = int(db_id)
-
-        lay = QHBoxLayout(self)
-        lay.setContentsMargins(8, 2, 8, 2)
-        lay.setSpacing(8)
-
-        self.lbl = QLabel(title)
-        self.lbl.setStyleSheet("font-weight:600;")
-        self.lbl.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.lbl.mousePressEvent = lambda e: self.clicked.emit(self.db_id)
-        lay.addWidget(self.lbl, 1)
-
-        self.btn_desc = QPushButton("Açıklama" + (" ✅" if has_desc else ""))
-        self.btn_desc.clicked.connect(lambda: self.edit_desc.emit(self.db_id))
-        lay.addWidget(self.btn_desc)
-
-        self.btn_props = QPushButton("Ayarlar")
-        self.btn_props.clicked.connect(lambda: self.edit_props.emit(self.db_id))
-        lay.addWidget(self.btn_props)
-
-        self.btn_del = QPushButton("Sil")
-        self.btn_del.clicked.connect(lambda: self.deleted.emit(self.db_id))
-        lay.addWidget(self.btn_del)
-
-
-class EvidenceRowWidget(QWidget):
-    clicked = pyqtSignal(int)       # ✅ eid (önizlemede delile git)
-    edit_desc = pyqtSignal(int)     # eid
-    edit_props = pyqtSignal(int)    # eid
-    move_up = pyqtSignal(int)       # eid
-    move_down = pyqtSignal(int)     # eid
-    deleted = pyqtSignal(int)
-
-    def __init__(self, eid: int, title: str, has_desc: bool, parent=None):
-        super().__init__(parent)
-        self.eid = int(eid)
-
-        lay = QHBoxLayout(self)
-        lay.setContentsMargins(8, 2, 8, 2)
-        lay.setSpacing(8)
-
-        lbl = QLabel(title)
-        lbl.setStyleSheet("font-weight:600;")
-        lbl.setCursor(Qt.CursorShape.PointingHandCursor)  # ✅
-        lbl.mousePressEvent = lambda e: self.clicked.emit(self.eid)  # ✅
-        lay.addWidget(lbl, 1)
-
-        btn_up = QPushButton("↑")
-        btn_up.setFixedWidth(36)
-        btn_up.clicked.connect(lambda: self.move_up.emit(self.eid))
-        lay.addWidget(btn_up)
-
-        btn_down = QPushButton("↓")
-        btn_down.setFixedWidth(36)
-        btn_down.clicked.connect(lambda: self.move_down.emit(self.eid))
-        lay.addWidget(btn_down)
-
-        btn_desc = QPushButton("Açıklama" + (" ✅" if has_desc else ""))
-        btn_desc.clicked.connect(lambda: self.edit_desc.emit(self.eid))
-        lay.addWidget(btn_desc)
-
-        btn_props = QPushButton("Ayarlar")
-        btn_props.clicked.connect(lambda: self.edit_props.emit(self.eid))
-        lay.addWidget(btn_props)
-
-        btn_del = QPushButton("Sil")
-        btn_del.clicked.connect(lambda: self.deleted.emit(self.eid))
-        lay.addWidget(btn_del)
-
-
-class TableFormatEditorDialog(QDialog):
-    """
-    Hücre/Satır/Sütun renklendirme editörü (delile özel).
-    Değişiklikler fmt dict olarak döner.
-    fmt:
-      {"rows": {"0":"#.."}, "cols":{"1":"#.."}, "cells":{"2,3":"#.."}}
-    """
-    def __init__(self, parent, headers: list[str], rows: list[list[str]], initial_fmt: dict | None = None):
-        super().__init__(parent)
-        self.setWindowTitle("Tablo Düzenle (Renklendir)")
-        self.setMinimumSize(860, 540)
-
-        self._fmt = initial_fmt if isinstance(initial_fmt, dict) else {"rows": {}, "cols": {}, "cells": {}}
-        for k in ("rows", "cols", "cells"):
-            if k not in self._fmt or not isinstance(self._fmt[k], dict):
-                self._fmt[k] = {}
-
-        # history
-        self._history = [copy.deepcopy(self._fmt)]
-        self._hist_i = 0
-
-        lay = QVBoxLayout(self)
-
-        # üst bar
-        tools = QHBoxLayout()
-        btn_color = QPushButton("Renk Seç")
-        btn_cells = QPushButton("Seçili Hücrelere Uygula")
-        btn_row = QPushButton("Seçili Satıra Uygula")
-        btn_col = QPushButton("Seçili Sütuna Uygula")
-        btn_clear = QPushButton("Temizle")
-        btn_undo = QPushButton("↩ Geri Al")
-        btn_redo = QPushButton("↪ İleri Al")
-
-        tools.addWidget(btn_color)
-        tools.addWidget(btn_cells)
-        tools.addWidget(btn_row)
-        tools.addWidget(btn_col)
-        tools.addWidget(btn_clear)
-        tools.addWidget(btn_undo)
-        tools.addWidget(btn_redo)
-        tools.addStretch(1)
-        lay.addLayout(tools)
-
-        # tablo
-        self.tbl = QTableWidget()
-        self.table = self.tbl  # eski çağrılar için alias (güvenlik)
-        self.tbl.setColumnCount(len(headers))
-        self.tbl.setRowCount(len(rows))
-        self.tbl.setHorizontalHeaderLabels([str(h) for h in headers])
-
-        # ✅ EDIT KAPAT: çift tıkla düzenleme bitsin
-        self.tbl.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.tbl.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
-        self.tbl.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectItems)
-
-        for r, row in enumerate(rows):
-            for c, val in enumerate(row):
-                it = QTableWidgetItem(str(val))
-                it.setFlags(it.flags() & ~Qt.ItemFlag.ItemIsEditable)  # ekstra garanti
-                self.tbl.setItem(r, c, it)
-
-        self.tbl.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
-        self.tbl.verticalHeader().setVisible(True)
-        lay.addWidget(self.tbl, 1)
-
-        # alt butonlar
-        row_btns = QHBoxLayout()
-        row_btns.addStretch(1)
-        btn_cancel = QPushButton("Vazgeç")
-        btn_ok = QPushButton("Kaydet")
-        row_btns.addWidget(btn_cancel)
-        row_btns.addWidget(btn_ok)
-        lay.addLayout(row_btns)
-
-        self._selected_color = "#ff0000"
-
-        def _push_history():
-            # aynı state tekrar eklenmesin
-            cur = copy.deepcopy(self._fmt)
-            if self._history and self._history[self._hist_i] == cur:
-                return
-            self._history = self._history[: self._hist_i + 1]
-            self._history.append(cur)
-            self._hist_i += 1
-
-        def pick_color():
-            c = QColorDialog.getColor(QColor(self._selected_color), self, "Renk Seç")
-            if c.isValid():
-                self._selected_color = c.name()
-
-        def apply_cells():
-            sels = self.tbl.selectedIndexes()
-            if not sels:
-                return
-            for ix in sels:
-                self._fmt["cells"][f"{ix.row()},{ix.column()}"] = self._selected_color
-            _push_history()
-            self._apply_preview_colors()
-
-        def apply_row():
-            sels = self.tbl.selectedIndexes()
-            if not sels:
-                return
-            r = sels[0].row()
-            self._fmt["rows"][str(r)] = self._selected_color
-            _push_history()
-            self._apply_preview_colors()
-
-        def apply_col():
-            sels = self.tbl.selectedIndexes()
-            if not sels:
-                return
-            c = sels[0].column()
-            self._fmt["cols"][str(c)] = self._selected_color
-            _push_history()
-            self._apply_preview_colors()
-
-        def clear_all():
-            self._fmt = {"rows": {}, "cols": {}, "cells": {}}
-            _push_history()
-            self._apply_preview_colors()
-
-        def undo():
-            if self._hist_i <= 0:
-                return
-            self._hist_i -= 1
-            self._fmt = copy.deepcopy(self._history[self._hist_i])
-            self._apply_preview_colors()
-
-        def redo():
-            if self._hist_i >= len(self._history) - 1:
-                return
-            self._hist_i += 1
-            self._fmt = copy.deepcopy(self._history[self._hist_i])
-            self._apply_preview_colors()
-
-        btn_color.clicked.connect(pick_color)
-        btn_cells.clicked.connect(apply_cells)
-        btn_row.clicked.connect(apply_row)
-        btn_col.clicked.connect(apply_col)
-        btn_clear.clicked.connect(clear_all)
-        btn_undo.clicked.connect(undo)
-        btn_redo.clicked.connect(redo)
-
-        btn_cancel.clicked.connect(self.reject)
-        btn_ok.clicked.connect(self.accept)
-
-        # ilk boya
-        self._apply_preview_colors()
-
-    def _apply_preview_colors(self):
-        """✅ Daha önce çağrılıp bulunamadığı için eklendi."""
-        # önce temizle
-        for r in range(self.tbl.rowCount()):
-            for c in range(self.tbl.columnCount()):
-                it = self.tbl.item(r, c)
-                if it:
-                    it.setBackground(QColor("#ffffff"))
-
-        rows_map = self._fmt.get("rows", {}) or {}
-        cols_map = self._fmt.get("cols", {}) or {}
-        cells_map = self._fmt.get("cells", {}) or {}
-
-        # row/col/cell (cell en baskın)
-        for r in range(self.tbl.rowCount()):
-            row_color = rows_map.get(str(r))
-            for c in range(self.tbl.columnCount()):
-                color = cells_map.get(f"{r},{c}") or row_color or cols_map.get(str(c))
-                if not color:
-                    continue
-                it = self.tbl.item(r, c)
-                if it:
-                    it.setBackground(QColor(color))
-
-    def get_fmt(self) -> dict:
-        return copy.deepcopy(self._fmt)
-
-    def _push_history(self):
-        cur = copy.deepcopy(self.fmt)
-        # aynı state’i iki kere basma
-        if self._history and json.dumps(self._history[self._hist_i], sort_keys=True, ensure_ascii=False) == json.dumps(cur, sort_keys=True, ensure_ascii=False):
-            return
-        # ileri geçmişi kırp
-        self._history = self._history[: self._hist_i + 1]
-        self._history.append(cur)
-        self._hist_i += 1
-
-    def undo(self):
-        if self._hist_i <= 0:
-            return
-        self._hist_i -= 1
-        self.fmt = copy.deepcopy(self._history[self._hist_i])
-        self._repaint_from_fmt()
-
-    def redo(self):
-        if self._hist_i >= len(self._history) - 1:
-            return
-        self._hist_i += 1
-        self.fmt = copy.deepcopy(self._history[self._hist_i])
-        self._repaint_from_fmt()
-
-    def _repaint_from_fmt(self):
-        # tablo widget’ındaki tüm hücrelerin arkaplanını temizle
-        for r in range(self.table.rowCount()):
-            for c in range(self.table.columnCount()):
-                item = self.table.item(r, c)
-                if item:
-                    item.setBackground(QColor("white"))
-
-        cols  = self.fmt.get("cols", {})  if isinstance(self.fmt.get("cols"), dict)  else {}
-        rows  = self.fmt.get("rows", {})  if isinstance(self.fmt.get("rows"), dict)  else {}
-        cells = self.fmt.get("cells", {}) if isinstance(self.fmt.get("cells"), dict) else {}
-
-        # row + col
-        for r in range(self.table.rowCount()):
-            row_color = rows.get(str(r))
-            for c in range(self.table.columnCount()):
-                color = cells.get(f"{r},{c}") or row_color or cols.get(str(c))
-                if not color:
-                    continue
-                item = self.table.item(r, c)
-                if item:
-                    item.setBackground(QColor(color))
-
-
-class EvidencePropsDialog(QDialog):
-    """
-    Delil (rapor_taslagi) için: Başlık + Genişlik(%) + (TABLE ise) Kolon seçimi + Tablo renklendirme.
-    """
-    def __init__(
-        self,
-        parent,
-        title: str,
-        width_pct: int,
-        is_table: bool = False,
-        table_html: str = "",
-        base_html: str = "",
-        hidden_json: str = "",
-        fmt_json: str = "",
-    ):
-        super().__init__(parent)
-        self.setWindowTitle("Delil Ayarları")
-        self.setModal(True)
-        self.resize(520, 420)
-
-        lay = QVBoxLayout(self)
-
-        # --- başlık
-        row1 = QHBoxLayout()
-        row1.addWidget(QLabel("Başlık:"))
-        self.edt_title = QLineEdit(title or "")
-        row1.addWidget(self.edt_title)
-        lay.addLayout(row1)
-
-        # --- genişlik
-        row2 = QHBoxLayout()
-        w0 = int(width_pct) if width_pct else 100
-        w0 = max(10, min(100, w0))
-
-        self.lbl_w = QLabel(f"Genişlik: %{w0}")
-        row2.addWidget(self.lbl_w)
-
-        self.sld = QSlider(Qt.Orientation.Horizontal)
-        self.sld.setMinimum(10)
-        self.sld.setMaximum(100)
-        self.sld.setValue(w0)
-        self.sld.valueChanged.connect(lambda v: self.lbl_w.setText(f"Genişlik: %{v}"))
-        row2.addWidget(self.sld)
-        lay.addLayout(row2)
-
-        # --- TABLE özel
-        self._is_table = bool(is_table)
-        self._table_html_in = str(table_html or "")
-        self.base_html = (str(base_html or "").strip() or self._table_html_in)  # ✅ base öncelikli
-
-        # hidden_json -> list
-        try:
-            hidden_list = json.loads(hidden_json) if hidden_json else []
-            if not isinstance(hidden_list, list):
-                hidden_list = []
-        except Exception:
-            hidden_list = []
-        self._hidden_init = set(str(x) for x in hidden_list)
-
-        # fmt_json -> dict
-        try:
-            fmt_obj = json.loads(fmt_json) if fmt_json else {}
-            if not isinstance(fmt_obj, dict):
-                fmt_obj = {}
-        except Exception:
-            fmt_obj = {}
-
-        self._fmt = fmt_obj if isinstance(fmt_obj, dict) else {"rows": {}, "cols": {}, "cells": {}}
-        if "rows" not in self._fmt or not isinstance(self._fmt["rows"], dict): self._fmt["rows"] = {}
-        if "cols" not in self._fmt or not isinstance(self._fmt["cols"], dict): self._fmt["cols"] = {}
-        if "cells" not in self._fmt or not isinstance(self._fmt["cells"], dict): self._fmt["cells"] = {}
-
-        if self._is_table and self.base_html.strip():
-            # ✅ kolonları base_html’den çıkar (kaldırılan kolon geri gelebilsin)
-            headers, _rows = _extract_table_headers_rows(self.base_html)
-
-            grp = QGroupBox("Tablo Kolonları (Bu delile özel)")
-            g_lay = QVBoxLayout(grp)
-
-            info = QLabel("Önizlemede görünen kolonlar işaretli gelir. İstemediğinizi kaldırın.")
-            info.setStyleSheet("color:#444;")
-            g_lay.addWidget(info)
-
-            wrap = QWidget()
-            v = QVBoxLayout(wrap)
-            v.setContentsMargins(6, 6, 6, 6)
-
-            self._col_checks: list[tuple[str, QCheckBox]] = []
-            for h in headers:
-                h_str = str(h)
-                cb = QCheckBox(h_str)
-                # ✅ daha önce gizlenmişse unchecked başlasın
-                cb.setChecked(h_str not in self._hidden_init)
-                self._col_checks.append((h_str, cb))
-                v.addWidget(cb)
-
-            scr = QScrollArea()
-            scr.setWidgetResizable(True)
-            scr.setMinimumHeight(160)
-            scr.setWidget(wrap)
-            g_lay.addWidget(scr)
-
-            btn_edit = QPushButton("Tablo Düzenle (Renklendir)")
-            g_lay.addWidget(btn_edit)
-
-            def open_editor():
-                # editor her zaman "güncel görünür kolonlar" üzerinden açılsın
-                hidden = set(self.hidden_cols_list())
-                html1 = _apply_hidden_cols_to_table_html(self.base_html, list(hidden))
-                hdr2, rows2 = _extract_table_headers_rows(html1)
-
-                dlg2 = TableFormatEditorDialog(self, hdr2, rows2, self._fmt)
-                if dlg2.exec() == 1:
-                    self._fmt = dlg2.get_fmt()
-
-            btn_edit.clicked.connect(open_editor)
-
-            lay.addWidget(grp)
-
-        # --- butonlar
-        btns = QHBoxLayout()
-        btns.addStretch(1)
-        b_no = QPushButton("Vazgeç")
-        b_ok = QPushButton("Kaydet")
-        b_ok.clicked.connect(self.accept)
-        b_no.clicked.connect(self.reject)
-        btns.addWidget(b_no)
-        btns.addWidget(b_ok)
-        lay.addLayout(btns)
-
-    def hidden_cols_list(self) -> list[str]:
-        """
-        Checkbox’ta unchecked olan kolonlar = hidden.
-        """
-        if not getattr(self, "_is_table", False):
-            return []
-        if not hasattr(self, "_col_checks"):
-            return []
-        hidden = []
-        for h, cb in self._col_checks:
-            if not cb.isChecked():
-                hidden.append(h)
-        return hidden
-
-    def get_fmt(self) -> dict:
-        return self._fmt
-
-    def values(self):
-        """
-        Dönüş: (title, width, hidden_list_or_None, fmt_or_None)
-        """
-        title = self.edt_title.text().strip()
-        w = int(self.sld.value())
-
-        if not self._is_table:
-            return (title, w, None, None)
-
-        return (title, w, self.hidden_cols_list(), self.get_fmt())
-
-
-class MetaEkPropsDialog(QDialog):
-    def __init__(self, parent, file_name: str, hide_name: bool, width_pct: int):
-        super().__init__(parent)
-        self.setWindowTitle("Ek Ayarları")
-        self.setModal(True)
-        self.resize(420, 180)
-
-        lay = QVBoxLayout(self)
-
-        row1 = QHBoxLayout()
-        row1.addWidget(QLabel("Dosya Adı:"))
-        self.edt_name = QLineEdit(file_name or "")
-        row1.addWidget(self.edt_name)
-        lay.addLayout(row1)
-
-        self.chk_hide = QCheckBox("Raporda dosya adını gizle")
-        self.chk_hide.setChecked(bool(hide_name))
-        lay.addWidget(self.chk_hide)
-
-        row2 = QHBoxLayout()
-        self.lbl_w = QLabel(f"Genişlik: %{int(width_pct) if width_pct else 80}")
-        row2.addWidget(self.lbl_w)
-
-        self.sld = QSlider(Qt.Orientation.Horizontal)
-        self.sld.setMinimum(30)
-        self.sld.setMaximum(100)
-        self.sld.setValue(int(width_pct) if width_pct else 80)
-        self.sld.valueChanged.connect(lambda v: self.lbl_w.setText(f"Genişlik: %{v}"))
-        row2.addWidget(self.sld)
-        lay.addLayout(row2)
-
-        btns = QHBoxLayout()
-        btns.addStretch(1)
-        b_ok = QPushButton("Kaydet")
-        b_no = QPushButton("Vazgeç")
-        b_ok.clicked.connect(self.accept)
-        b_no.clicked.connect(self.reject)
-        btns.addWidget(b_no)
-        btns.addWidget(b_ok)
-        lay.addLayout(btns)
-
-    def values(self):
-        return (self.edt_name.text().strip(), bool(self.chk_hide.isChecked()), int(self.sld.value()))
-
-
-class ReorderableListWidget(QListWidget):
-    def __init__(self, on_reorder, parent=None):
-        super().__init__(parent)
-        self._on_reorder = on_reorder
-
-    def dropEvent(self, event):
-        super().dropEvent(event)
-        try:
-            if callable(self._on_reorder):
-                self._on_reorder()
-        except Exception:
-            pass
-
-
-class MetaEkPanel(QWidget):
-    changed_any = pyqtSignal()
-
-    def __init__(self, project_id: int, bolum: str, parent=None):
-        super().__init__(parent)
-        try:
-            self.project_id = int(project_id)
-        except Exception:
-            self.project_id = 0
-        self.bolum = str(bolum)
-
-        root = QVBoxLayout(self)
-        root.setContentsMargins(0, 0, 0, 0)
-
-        # Üst bar
-        top = QHBoxLayout()
-
-        self.btn_add = QPushButton("Resim Ekle (Yerel Disk)")
-        self.btn_add.clicked.connect(self.add_from_disk)
-        top.addWidget(self.btn_add)
-
-        # delil_cekmece: swap KALDIRILDI (tek liste)
-        self.btn_swap = None
-
-        top.addStretch(1)
-        root.addLayout(top)
-
-        if self.bolum == "delil_cekmece":
-            # ✅ TEK LİSTE: rapor_taslagi tablosundaki tüm deliller (resim/tablo/görsel/html)
-            self.lbl_evi = QLabel("Deliller (Resim / Tablo / Görsel / HTML)")
-            self.lbl_evi.setStyleSheet("font-weight:700; padding:4px 0;")
-            root.addWidget(self.lbl_evi)
-
-            self.listw_evidence = QListWidget()
-            self.listw_evidence.setSpacing(6)
-            self.listw_evidence.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
-            root.addWidget(self.listw_evidence, 1)
-
-            # ✅ Eski sürümden kalan meta_ekler/delil_cekmece kayıtlarını bir kere taşımak için
-            self._migrate_delil_cekmece_meta_to_taslak()
-
-        else:
-            # ✅ Diğer bölümler: mevcut davranış (rapor_meta_ekler listesi)
-            self.lbl_meta = QLabel("Çekmeceye Eklenen Resimler")
-            self.lbl_meta.setStyleSheet("font-weight:700; padding:4px 0;")
-            root.addWidget(self.lbl_meta)
-
-            self.listw = QListWidget()
-            self.listw.setSpacing(6)
-            root.addWidget(self.listw, 1)
-
-        self.reload()
-
-        try:
-            if hasattr(self.parent(), "refresh_preview"):
-                self.parent().refresh_preview()
-        except Exception:
-            pass
-
-    def _migrate_delil_cekmece_meta_to_taslak(self):
-        """
-        Eski yapıda delil_cekmece resimleri rapor_meta_ekler(Bolum='delil_cekmece') içinde duruyordu.
-        Yeni yapıda hepsi rapor_taslagi içinde olmalı (tek sıra/tek liste için).
-        Bu fonksiyon varsa eski kayıtları rapor_taslagi'na taşır ve meta_ekler tarafını temizler.
-        """
-        if self.bolum != "delil_cekmece":
-            return
-
-        try:
-            with DB() as conn:
-                # meta_ekler tablosu yoksa/kolonlar farklıysa sessiz geç
-                try:
-                    cols = {r[1] for r in conn.execute("PRAGMA table_info(rapor_meta_ekler)").fetchall()}
-                    if not cols:
-                        return
-                except Exception:
-                    return
-
-                # delil_cekmece kayıtlarını çek
-                try:
-                    rows = conn.execute("""
-                        SELECT id, DosyaAdi, DosyaYolu, Aciklama
-                        FROM rapor_meta_ekler
-                        WHERE ProjeID=? AND Bolum='delil_cekmece'
-                        ORDER BY id ASC
-                    """, (int(self.project_id),)).fetchall()
-                except Exception:
-                    return
-
-                if not rows:
-                    return
-
-                # rapor_taslagi'nda en sona eklemek için max sıra
-                cur = conn.cursor()
-                last_order = cur.execute(
-                    "SELECT MAX(Sira) FROM rapor_taslagi WHERE ProjeID=?",
-                    (int(self.project_id),)
-                ).fetchone()[0]
-                new_order = (last_order or 0)
-
-                # rapor_taslagi kolonlarını dinamik oku (eski db sürümleriyle uyumlu)
-                tcols = [r[1] for r in cur.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
-
-                for mid, fname, fpath, mdesc in rows:
-                    if not fpath:
-                        continue
-
-                    new_order += 1
-                    title = str(fname or os.path.basename(str(fpath)) or "Delil")
-
-                    # rapor_taslagi insert (add_evidence_to_report mantığına paralel)
-                    keys = ["ProjeID", "GSMNo", "Baslik", "Icerik", "Tur", "Tarih", "Sira"]
-                    vals = [
-                        int(self.project_id), "", title, str(fpath), "IMAGE",
-                        datetime.now().strftime("%d.%m.%Y %H:%M"), int(new_order)
-                    ]
-
-                    # genişlik default 80 (delil resimleri için)
-                    if "GenislikYuzde" in tcols:
-                        keys.append("GenislikYuzde"); vals.append(100)
-                    if "YukseklikMm" in tcols:
-                        keys.append("YukseklikMm"); vals.append(0)
-                    if "Hizalama" in tcols:
-                        keys.append("Hizalama"); vals.append("center")
-                    if "Aciklama" in tcols:
-                        keys.append("Aciklama"); vals.append(str(mdesc or ""))
-                    if "HtmlIcerik" in tcols:
-                        keys.append("HtmlIcerik"); vals.append(None)
-                    if "ImagePath" in tcols:
-                        keys.append("ImagePath"); vals.append(str(fpath))
-
-                    q_marks = ",".join(["?"] * len(keys))
-                    col_names = ",".join(keys)
-                    cur.execute(f"INSERT INTO rapor_taslagi ({col_names}) VALUES ({q_marks})", vals)
-
-                    # meta_ekler kaydını sil
-                    cur.execute("DELETE FROM rapor_meta_ekler WHERE id=?", (int(mid),))
-
-                conn.commit()
-
-        except Exception:
-            # migration hata verirse UI'yı kilitlemeyelim
-            return
-
-    def _ensure_evidence_dir(self) -> str:
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        evidence_dir = os.path.join(base_dir, "evidence_images")
-        if not os.path.exists(evidence_dir):
-            os.makedirs(evidence_dir)
-        return evidence_dir
-
-    def _edit_evidence_props(self, eid: int):
-        """
-        rapor_taslagi için delil başlığı + genişlik ayarı.
-        UI: MetaEkPropsDialog ile aynı stile çekildi (slider + Kaydet/Vazgeç).
-        """
-        try:
-            eid = int(eid)
-        except Exception:
-            return
-
-        # Mevcut değerleri oku
-        with DB() as conn:
-            row = conn.execute(
-                "SELECT id, Baslik, COALESCE(GenislikYuzde, 100), COALESCE(Tur,''), "
-                "COALESCE(HtmlIcerik,''), COALESCE(BaseHtmlIcerik,''), "
-                "COALESCE(HiddenColsJson,''), COALESCE(FmtJson,'') "
-                "FROM rapor_taslagi WHERE id=? AND ProjeID=?",
-                (eid, int(self.project_id))
-            ).fetchone()
-
-        if not row:
-            return
-
-        rid, cur_title, cur_w, cur_tur, cur_html, base_html, hidden_json, fmt_json = row
-
-        cur_tur = str(cur_tur or "")
-        is_table = (cur_tur.upper() == "TABLE")
-
-        try:
-            cur_w = int(cur_w or 100)
-        except Exception:
-            cur_w = 100
-
-        # ✅ base boşsa backfill (senin örnek verdiğin “base boşsa backfill” tam burası)
-        if (not base_html) and cur_html:
-            base_html = cur_html
-        is_table = (cur_tur.upper() == "TABLE")
-        try:
-            cur_w = int(cur_w or 100)
-        except Exception:
-            cur_w = 100
-
-        # ✅ Ekler ile aynı UI yaklaşımı
-        dlg = EvidencePropsDialog(
-            self,
-            str(cur_title or ""),
-            int(cur_w),
-            is_table=is_table,
-            table_html=str(cur_html or ""),
-            base_html=str(base_html or ""),
-            hidden_json=str(hidden_json or ""),
-            fmt_json=str(fmt_json or ""),
-        )
-        if dlg.exec() != 1:
-            return
-
-        new_title, new_w, hidden_cols, fmt = dlg.values()
-
-        # DB güncelle
-        with DB() as conn:
-            if is_table and isinstance(cur_html, str) and cur_html.strip():
-                # 1) kolon gizleme (checkbox’a göre)
-                hidden = hidden_cols or set()
-                html1 = _apply_hidden_cols_to_table_html(cur_html, hidden)
-
-                # 2) renklendirme (hücre/satır/sütun)
-                if isinstance(fmt, dict) and fmt:
-                    html2 = _apply_fmt_to_table_html(html1, fmt)
-                else:
-                    html2 = html1
-
-                hidden_list = dlg.hidden_cols_list()
-                hidden_json_out = json.dumps(hidden_list, ensure_ascii=False)
-
-                # BaseHtmlIcerik'i sakla; HtmlIcerik'i artık base olarak tut (istersen aynı bırak)
-                conn.execute(
-                    "UPDATE rapor_taslagi SET Baslik=?, GenislikYuzde=?, "
-                    "BaseHtmlIcerik=?, HtmlIcerik=?, HiddenColsJson=?, FmtJson=? "
-                    "WHERE id=? AND ProjeID=?",
-                    (
-                        new_title, int(new_w),
-                        dlg.base_html,            # base sabit kalsın
-                        html2,                    # ✅ preview'e uygulanmış sonuç HtmlIcerik'e yazılsın
-                        hidden_json_out,
-                        (json.dumps(fmt, ensure_ascii=False) if isinstance(fmt, dict) else ""),
-                        rid, int(self.project_id)
-                    )
-                )
-            else:
-                conn.execute(
-                    "UPDATE rapor_taslagi SET Baslik=?, GenislikYuzde=? WHERE id=? AND ProjeID=?",
-                    (new_title, int(new_w), eid, int(self.project_id))
-                )
-            conn.commit()
-
-        # Yenile
-        self.reload()
-        self.changed_any.emit()
-        try:
-            if hasattr(self.parent(), "refresh_preview"):
-                self.parent().refresh_preview()
-        except Exception:
-            pass
-
-    def _edit_props(self, db_id: int):
-        with DB() as conn:
-            row = conn.execute(
-                "SELECT DosyaAdi, COALESCE(DosyaAdiGizle,0), COALESCE(GenislikYuzde,80) "
-                "FROM rapor_meta_ekler WHERE id=? AND ProjeID=?",
-                (int(db_id), self.project_id)
-            ).fetchone()
-
-        if not row:
-            return
-
-        cur_name, hide_name, width_pct = row
-        dlg = MetaEkPropsDialog(self, cur_name or "", bool(hide_name), int(width_pct) if width_pct else 80)
-        if dlg.exec() != 1:
-            return
-
-        new_name, new_hide, new_width = dlg.values()
-
-        with DB() as conn:
-            conn.execute(
-                "UPDATE rapor_meta_ekler SET DosyaAdi=?, DosyaAdiGizle=?, GenislikYuzde=? "
-                "WHERE id=? AND ProjeID=?",
-                (new_name, 1 if new_hide else 0, int(new_width), int(db_id), self.project_id)
-            )
-            conn.commit()
-
-        self.reload()
-        self.changed_any.emit()
-        # rapor önizleme yenilemen hangi fonksiyonsa onu çağır:
-        try:
-            if hasattr(self.parent(), "refresh_preview"):
-                self.parent().refresh_preview()
-        except Exception:
-            pass
-
-    def reload(self):
-        if self.bolum == "delil_cekmece":
-            # ✅ Tek liste: rapor_taslagi
-            if not hasattr(self, "listw_evidence") or self.listw_evidence is None:
-                return
-
-            self.listw_evidence.clear()
-
-            with DB() as conn:
-                rows = conn.execute("""
-                    SELECT id, COALESCE(Sira, 999999) AS S, Baslik, Tur, Aciklama
-                    FROM rapor_taslagi
-                    WHERE ProjeID=?
-                    ORDER BY COALESCE(Sira, 999999) ASC, id ASC
-                """, (int(self.project_id),)).fetchall()
-
-            ek_no = 1
-            for (eid, sira, baslik, tur, acik) in rows:
-                title = f"Ek-{ek_no} - {str(baslik or '').strip()}"
-                if not str(baslik or "").strip():
-                    # Baslik boşsa en azından türü göster
-                    title = f"Ek-{ek_no} - {str(tur or 'DELIL')}"
-
-                has_desc = bool(str(acik or "").strip())
-
-                item = QListWidgetItem()
-                roww = EvidenceRowWidget(int(eid), title, has_desc, self)
-
-                # sinyaller (mevcut fonksiyonlarını kullanıyoruz)
-                roww.clicked.connect(lambda eid: self._focus_item(eid, "delil_cekmece"))
-                roww.edit_desc.connect(self._edit_evidence_desc)
-                roww.edit_props.connect(self._edit_evidence_props)
-                roww.move_up.connect(lambda _eid, self=self: self._move_evidence(_eid, -1))
-                roww.move_down.connect(lambda _eid, self=self: self._move_evidence(_eid, +1))
-                roww.deleted.connect(self._delete_evidence)
-
-                item.setSizeHint(QSize(10, 44))
-                self.listw_evidence.addItem(item)
-                self.listw_evidence.setItemWidget(item, roww)
-
-                ek_no += 1
-
-            return
-
-        # ✅ Diğer bölümler: mevcut davranış (rapor_meta_ekler)
-        self.listw.clear()
-
-        with DB() as conn:
-            cols = {r[1] for r in conn.execute("PRAGMA table_info(rapor_meta_ekler)").fetchall()}
-
-            select_cols = ["id", "DosyaAdi", "DosyaYolu", "Aciklama"]
-            if "DosyaAdiGizle" in cols:
-                select_cols.append("DosyaAdiGizle")
-            else:
-                select_cols.append("0 AS DosyaAdiGizle")
-
-            if "GenislikYuzde" in cols:
-                select_cols.append("GenislikYuzde")
-            else:
-                select_cols.append("100 AS GenislikYuzde")
-
-            sql = f"""
-                SELECT {",".join(select_cols)}
-                FROM rapor_meta_ekler
-                WHERE ProjeID=? AND Bolum=?
-                ORDER BY id ASC
-            """
-            rows = conn.execute(sql, (int(self.project_id), str(self.bolum))).fetchall()
-
-        ek_no = 1
-        for row in rows:
-            # row: id, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle, GenislikYuzde
-            db_id, fname, fpath, desc, gizle, w = row
-
-            has_desc = bool(str(desc or "").strip())
-            if int(gizle or 0) == 1:
-                title = f"Ek-{ek_no}"
-            else:
-                title = f"Ek-{ek_no} - {fname}"
-
-            item = QListWidgetItem()
-            roww = MetaEkRowWidget(int(db_id), title, has_desc, self)
-
-            roww.clicked.connect(lambda mid: self._focus_item(mid, "dosya_ek"))
-            roww.edit_desc.connect(self._edit_desc)
-            roww.edit_props.connect(self._edit_props)
-            roww.deleted.connect(self._delete_item)
-
-            item.setSizeHint(QSize(10, 44))
-            self.listw.addItem(item)
-            self.listw.setItemWidget(item, roww)
-
-            ek_no += 1
-
-    def _delete_evidence(self, eid: int):
-        title_txt = ""
-        try:
-            with DB() as conn:
-                row = conn.execute(
-                    "SELECT Baslik FROM rapor_taslagi WHERE id=? AND ProjeID=?",
-                    (eid, self.project_id)
-                ).fetchone()
-                if row and row[0]:
-                    title_txt = str(row[0]).strip()
-        except Exception:
-            title_txt = ""
-
-        msg = f"Bu delili ({title_txt}) silmek istiyor musunuz?" if title_txt else "Bu delili silmek istiyor musunuz?"
-
-        ok = ModernDialog.show_question(
-            self,
-            "Sil",
-            msg,
-            "Evet",
-            "Hayır"
-        )
-        if not ok:
-            return
-
-        with DB() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "DELETE FROM rapor_taslagi WHERE id=? AND ProjeID=?",
-                (eid, self.project_id)
-            )
-            conn.commit()
-
-        self.reload()
-        self.changed_any.emit()
-
-    def _persist_delil_order(self):
-        if self.bolum != "delil_cekmece":
-            return
-
-        with DB() as conn:
-            s = 10
-            for i in range(self.listw.count()):
-                it = self.listw.item(i)
-                kind, _id = it.data(Qt.ItemDataRole.UserRole) or (None, None)
-                if kind == "meta":
-                    conn.execute("UPDATE rapor_meta_ekler SET Sira=? WHERE id=? AND ProjeID=?",
-                                 (s, int(_id), int(self.project_id)))
-                elif kind == "taslak":
-                    conn.execute("UPDATE rapor_taslagi SET Sira=? WHERE id=? AND ProjeID=?",
-                                 (s, int(_id), int(self.project_id)))
-                s += 10
-            conn.commit()
-
-        self.changed_any.emit()
-        try:
-            if hasattr(self.parent(), "refresh_preview"):
-                self.parent().refresh_preview()
-        except Exception:
-            pass
-
-    def _move_evidence(self, eid: int, direction: int):
-        """
-        rapor_taslagi.Sira swap ile yukarı/aşağı taşır.
-        direction: -1 (yukarı), +1 (aşağı)
-        """
-        try:
-            eid = int(eid)
-            direction = -1 if int(direction) < 0 else 1
-        except Exception:
-            return
-
-        with DB() as conn:
-            rows = conn.execute("""
-                SELECT id, COALESCE(Sira, 999999) AS S
-                FROM rapor_taslagi
-                WHERE ProjeID=?
-                ORDER BY S ASC, id ASC
-            """, (int(self.project_id),)).fetchall()
-
-            ids = [r[0] for r in rows]
-            sira_map = {r[0]: r[1] for r in rows}
-
-            if eid not in ids:
-                return
-
-            idx = ids.index(eid)
-            j = idx + direction
-            if j < 0 or j >= len(ids):
-                return
-
-            other_id = ids[j]
-
-            s1 = sira_map.get(eid, 999999)
-            s2 = sira_map.get(other_id, 999999)
-
-            conn.execute("UPDATE rapor_taslagi SET Sira=? WHERE id=?", (int(s2), int(eid)))
-            conn.execute("UPDATE rapor_taslagi SET Sira=? WHERE id=?", (int(s1), int(other_id)))
-            conn.commit()
-
-        self.reload()
-        self.changed_any.emit()
-        try:
-            if hasattr(self.parent(), "refresh_preview"):
-                self.parent().refresh_preview()
-        except Exception:
-            pass
-
-    def _edit_evidence_desc(self, eid: int):
-        try:
-            eid = int(eid)
-        except Exception:
-            return
-
-        with DB() as conn:
-            row = conn.execute(
-                "SELECT Aciklama FROM rapor_taslagi WHERE id=? AND ProjeID=?",
-                (eid, int(self.project_id))
-            ).fetchone()
-            current_text = row[0] if row else ""
-
-        # ✅ Ekler bölümündekiyle aynı: Zengin metin editörü
-        dlg = RichDescriptionDialog(self, current_text, "Delil Açıklaması Düzenle")
-        if not dlg.exec():
-            return
-
-        new_text = dlg.get_html()
-
-        with DB() as conn:
-            conn.execute(
-                "UPDATE rapor_taslagi SET Aciklama=? WHERE id=? AND ProjeID=?",
-                (new_text, eid, int(self.project_id))
-            )
-            conn.commit()
-
-        self.reload()
-        self.changed_any.emit()
-        try:
-            if hasattr(self.parent(), "refresh_preview"):
-                self.parent().refresh_preview()
-        except Exception:
-            pass
-
-
-    def _focus_item(self, db_id: int, bolum: str):
-        dlg = self.parent()
-        while dlg and not hasattr(dlg, "scroll_to_meta_ek"):
-            dlg = dlg.parent()
-
-        if not dlg:
-            return
-
-        # ✅ DELİL ÇEKMECESİ
-        if bolum == "delil_cekmece":
-            dlg.scroll_to_meta_ek(db_id)
-
-        # ✅ DOSYA HAKKINDAKİ EKLER (SADECE META-EK)
-        else:
-            dlg.scroll_to_metaek_only(db_id)
-
-    def _edit_desc(self, db_id: int):
-        with DB() as conn:
-            row = conn.execute(
-                "SELECT Aciklama FROM rapor_meta_ekler WHERE id=? AND ProjeID=?",
-                (db_id, self.project_id)
-            ).fetchone()
-        current_text = row[0] if row else ""
-
-        dlg = RichDescriptionDialog(self, current_text, "Ek Açıklaması Düzenle")
-        if dlg.exec():
-            new_text = dlg.get_html()
-            with DB() as conn:
-                conn.execute(
-                    "UPDATE rapor_meta_ekler SET Aciklama=? WHERE id=? AND ProjeID=?",
-                    (new_text, db_id, self.project_id)
-                )
-                conn.commit()
-            self.reload()
-            self.changed_any.emit()
-
-    def add_from_disk(self):
-        file_path, _ = QFileDialog.getOpenFileName(
-            self,
-            "Delil Resmi Seç",
-            "",
-            "Resimler (*.png *.jpg *.jpeg *.bmp *.webp)"
-        )
-        if not file_path:
-            return
-
-        # sadece delil_cekmece için: resimleri evidence_images altına kopyala ve rapor_taslagi'na ekle
-        if self.bolum == "delil_cekmece":
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            evidence_dir = os.path.join(base_dir, "evidence_images")
-            if not os.path.exists(evidence_dir):
-                os.makedirs(evidence_dir)
-
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            ext = os.path.splitext(file_path)[1].lower() or ".png"
-            safe_name = f"delil_{ts}{ext}"
-            dest = os.path.join(evidence_dir, safe_name)
-
-            try:
-                shutil.copy2(file_path, dest)
-            except Exception as e:
-                ModernDialog.show_error(self, "Hata", f"Resim kopyalanamadı:\n{e}")
-                return
-
-            try:
-                with DB() as conn:
-                    cur = conn.cursor()
-
-                    last_order = cur.execute(
-                        "SELECT MAX(Sira) FROM rapor_taslagi WHERE ProjeID=?",
-                        (int(self.project_id),)
-                    ).fetchone()[0]
-                    new_order = (last_order or 0) + 1
-
-                    # başlık: dosya adı (istersen burada başka kural koyabilirsin)
-                    title = os.path.basename(dest)
-
-                    cols = [r[1] for r in cur.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
-
-                    keys = ["ProjeID", "GSMNo", "Baslik", "Icerik", "Tur", "Tarih", "Sira"]
-                    vals = [
-                        int(self.project_id), "", title, dest, "IMAGE",
-                        datetime.now().strftime("%d.%m.%Y %H:%M"),
-                        int(new_order)
-                    ]
-
-                    # delil resimleri için varsayılanlar
-                    if "GenislikYuzde" in cols: keys.append("GenislikYuzde"); vals.append(80)
-                    if "YukseklikMm" in cols:   keys.append("YukseklikMm");   vals.append(0)
-                    if "Hizalama" in cols:      keys.append("Hizalama");      vals.append("center")
-                    if "Aciklama" in cols:      keys.append("Aciklama");      vals.append("")
-                    if "HtmlIcerik" in cols:    keys.append("HtmlIcerik");    vals.append(None)
-                    if "ImagePath" in cols:     keys.append("ImagePath");     vals.append(dest)
-
-                    q_marks = ",".join(["?"] * len(keys))
-                    col_names = ",".join(keys)
-                    cur.execute(f"INSERT INTO rapor_taslagi ({col_names}) VALUES ({q_marks})", vals)
-
-                    conn.commit()
-
-                self.reload()
-                self.changed_any.emit()
-                try:
-                    if hasattr(self.parent(), "refresh_preview"):
-                        self.parent().refresh_preview()
-                except Exception:
-                    pass
-
-                ModernDialog.show_success(self, "Eklendi", "Delil resim dosyası delil listesine eklendi.")
-                return
-
-            except Exception as e:
-                ModernDialog.show_error(self, "Hata", str(e))
-                return
-
-        # diğer bölümler: mevcut davranış (rapor_meta_ekler)
-        try:
-            self._ensure_evidence_dir()
-
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-            evidence_dir = os.path.join(base_dir, "evidence_images")
-            if not os.path.exists(evidence_dir):
-                os.makedirs(evidence_dir)
-
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            ext = os.path.splitext(file_path)[1].lower() or ".png"
-            safe_name = f"ek_{ts}{ext}"
-            dest = os.path.join(evidence_dir, safe_name)
-
-            shutil.copy2(file_path, dest)
-
-            with DB() as conn:
-                cols = {r[1] for r in conn.execute("PRAGMA table_info(rapor_meta_ekler)").fetchall()}
-                has_hide = "DosyaAdiGizle" in cols
-                has_w = "GenislikYuzde" in cols
-
-                if has_hide and has_w:
-                    conn.execute(
-                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle, GenislikYuzde) "
-                        "VALUES (?,?,?,?,?,?,?)",
-                        (int(self.project_id), str(self.bolum), os.path.basename(dest), dest, "", 0, 100),
-                    )
-                elif has_hide and (not has_w):
-                    conn.execute(
-                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle) "
-                        "VALUES (?,?,?,?,?,?)",
-                        (int(self.project_id), str(self.bolum), os.path.basename(dest), dest, "", 0),
-                    )
-                elif (not has_hide) and has_w:
-                    conn.execute(
-                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama, GenislikYuzde) "
-                        "VALUES (?,?,?,?,?,?)",
-                        (int(self.project_id), str(self.bolum), os.path.basename(dest), dest, "", 100),
-                    )
-                else:
-                    conn.execute(
-                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama) "
-                        "VALUES (?,?,?,?,?)",
-                        (int(self.project_id), str(self.bolum), os.path.basename(dest), dest, ""),
-                    )
-                conn.commit()
-
-            self.reload()
-            self.changed_any.emit()
-
-            try:
-                if hasattr(self.parent(), "refresh_preview"):
-                    self.parent().refresh_preview()
-            except Exception:
-                pass
-
-        except Exception as e:
-            ModernDialog.show_error(self, "Hata", str(e))
-
-
-    def _delete_item(self, db_id: int):
-        # ✅ Silmeden önce program tarzı onay sor (dosya adını da göster)
-        try:
-            bolum = (getattr(self, "bolum", "") or "").strip()
-            if not bolum:
-                bolum = "Ek"
-
-            dosya_adi = ""
-            dosya_yolu = ""
-
-            with DB() as conn:
-                row = conn.execute(
-                    "SELECT COALESCE(DosyaAdi,''), COALESCE(DosyaYolu,''), COALESCE(Bolum,'') "
-                    "FROM rapor_meta_ekler WHERE id=?",
-                    (db_id,)
-                ).fetchone()
-
-            if row:
-                dosya_adi = (row[0] or "").strip()
-                dosya_yolu = (row[1] or "").strip()
-                if not bolum:
-                    bolum = (row[2] or "").strip() or "Ek"
-
-            # DosyaAdi boşsa dosya yolundan türet
-            if not dosya_adi and dosya_yolu:
-                try:
-                    dosya_adi = os.path.basename(dosya_yolu)
-                except Exception:
-                    dosya_adi = ""
-
-            # Kullanıcıya gösterilecek isim
-            shown = dosya_adi if dosya_adi else bolum
-
-            ok = ModernDialog.show_question(
-                self,
-                f"{bolum} Sil",
-                f"Seçili kayıt ({shown}) silinecek. Emin misiniz?",
-                yes_btn="Evet",
-                no_btn="Hayır"
-            )
-            if not ok:
-                return
-
-        except Exception:
-            return
-
-        # ✅ Silme işlemi
-        row = None
-        with DB() as conn:
-            row = conn.execute(
-                "SELECT DosyaYolu FROM rapor_meta_ekler WHERE id=?",
-                (db_id,)
-            ).fetchone()
-            conn.execute("DELETE FROM rapor_meta_ekler WHERE id=?", (db_id,))
-
-        try:
-            if row and row[0] and os.path.exists(row[0]):
-                os.remove(row[0])
-        except Exception:
-            pass
-
-        self.reload()
-        self.changed_any.emit()
-
-
-    def _update_desc(self, db_id: int, desc: str):
-        with DB() as conn:
-            conn.execute("UPDATE rapor_meta_ekler SET Aciklama=? WHERE id=?", (desc, db_id))
-        self.changed_any.emit()
-
-
-class ReportCenterDialog(QDialog):
-    """
-    Rapor ve Tasarım Merkezi
-    - Sol: metin editörleri + delil çekmecesi + devre dışı checkbox’lar + marginler
-    - Sağ: QWebEngineView canlı önizleme
-    """
-
-    def __init__(self, parent, project_id: int):
-        super().__init__(parent)
-        self.setWindowTitle("Rapor ve Tasarım Merkezi")
-        self.setWindowState(Qt.WindowState.WindowMaximized)
-
-        project_id = int(project_id)  # burada patlaması doğru
-        self.project_id = project_id
-        self.builder = ReportHtmlBuilder(project_id)
-
-        self.preview = None
-        self.ed_gorev = None
-        self.ed_dosya = None
-        self.ed_genel = None
-        self.ed_deg = None
-        self.ed_sonuc = None
-        self.blocks_table = None
-
-        self.cb_gorev = None
-        self.cb_dosya = None
-        self.cb_genel = None
-        self.cb_delillers = None
-        self.cb_deg = None
-        self.cb_sonuc = None
-        self.cb_taraflar = None
-
-        # ✅ KRİTİK: açılışta DB’ye yazmayı kilitle
-        self._loading_meta = True
-        self._meta_ready = False
-
-        self._build_ui()
-        self._load_meta_to_ui()          # editörler burada dolar
-        self.load_blocks_into_table()
-
-        # autosave bağlantılarını meta yüklendikten SONRA bağla
-        self._wire_meta_autosave()
-
-        self._loading_meta = False
-        self._meta_ready = True
-
-        self.refresh_preview()           # artık güvenli
-        self.loader = LoadingOverlay(self)
-
-    def _wire_meta_autosave(self):
-        if getattr(self, "_meta_autosave_wired", False):
-            return
-        self._meta_autosave_wired = True
-
-        for ed in (self.ed_gorev, self.ed_dosya, self.ed_genel, self.ed_deg, self.ed_sonuc):
-            if ed is None:
-                continue
-            ed.textChanged.connect(self.save_meta_silent)
-
-    def closeEvent(self, event):
-        try:
-            self.save_meta_silent()   # son değişiklik DB’ye gitsin
-        except Exception:
-            pass
-        super().closeEvent(event)
-
-    def _norm_pid(self):
-        pid = getattr(self, "project_id", None)
-        if pid is None:
-            return None
-        # her yerde aynı: önce int dene
-        try:
-            return int(str(pid).strip())
-        except Exception:
-            return str(pid).strip()
-
-    def _build_ui(self):
-        # --- Ana yerleşim ---
-        main = QHBoxLayout(self)
-        main.setContentsMargins(10, 10, 10, 10)
-
-        splitter = QSplitter(Qt.Orientation.Horizontal)
-        main.addWidget(splitter)
-
-        # --- SOL PANEL ---
-        left_panel = QWidget()
-        left_panel.setMinimumWidth(520)
-
-        left_outer = QVBoxLayout(left_panel)
-        left_outer.setContentsMargins(0, 0, 0, 0)
-        left_outer.setSpacing(10)
-
-        # Sol içerik scroll içinde olsun
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.Shape.NoFrame)
-
-        left_container = QWidget()
-        left = QVBoxLayout(left_container)              # ✅ left artık TANIMLI
-        left.setContentsMargins(0, 0, 0, 0)
-        left.setSpacing(10)
-
-        scroll.setWidget(left_container)
-        left_outer.addWidget(scroll)
-
-        # --- Sağ panel (önizleme) ---
-        right_panel = QWidget()
-        right = QVBoxLayout(right_panel)
-        right.setContentsMargins(0, 0, 0, 0)
-        right.setSpacing(10)
-
-        splitter.addWidget(left_panel)
-        splitter.addWidget(right_panel)
-        splitter.setStretchFactor(0, 0)
-        splitter.setStretchFactor(1, 1)
-        try:
-            splitter.setSizes([560, 1200])
-        except Exception:
-            pass
-
-        # --- Meta editörleri (veri deposu) ---
-        self.ed_gorev = QTextEdit()
-        self.ed_dosya = QTextEdit()
-        self.ed_genel = QTextEdit()
-        self.ed_deg = QTextEdit()
-        self.ed_sonuc = QTextEdit()
-
-        # --- Kompakt kart üreticisi ---
-        def _make_card(title: str, cb_attr_name: str, on_edit, on_reset=None):
-            card = QFrame()
-            card.setStyleSheet(
-                "QFrame{background:#ffffff;border:1px solid #dcdcdc;border-radius:8px;}"
-            )
-            lay = QVBoxLayout(card)
-            lay.setContentsMargins(10, 8, 10, 8)
-            lay.setSpacing(6)
-
-            header = QHBoxLayout()
-            header.setContentsMargins(0, 0, 0, 0)
-            header.setSpacing(8)
-
-            lbl = QLabel(title)
-            lbl.setStyleSheet("font-weight:800; color:#2c3e50; font-size:12px; text-transform:uppercase;")
-            header.addWidget(lbl)
-            header.addStretch(1)
-
-            btn_edit = QPushButton("📝 Düzenle")
-            btn_edit.setCursor(Qt.CursorShape.PointingHandCursor)
-            btn_edit.setStyleSheet(
-                "QPushButton{background:#ecf0f1;border:1px solid #bdc3c7;border-radius:6px;padding:6px 10px;font-weight:700;color:#7f8c8d;}"
-                "QPushButton:hover{background:#dfe6e9;}"
-            )
-            btn_edit.clicked.connect(on_edit)
-            header.addWidget(btn_edit)
-
-            if on_reset is not None:
-                btn_reset = QPushButton("↩ Varsayılan")
-                btn_reset.setCursor(Qt.CursorShape.PointingHandCursor)
-                btn_reset.setStyleSheet(
-                    "QPushButton{background:transparent;border:none;color:#7f8c8d;font-weight:700;}"
-                    "QPushButton:hover{color:#2c3e50;}"
-                )
-                btn_reset.clicked.connect(on_reset)
-                header.addWidget(btn_reset)
-
-            cb = QCheckBox("Gizle")
-            setattr(self, cb_attr_name, cb)
-            cb.stateChanged.connect(self.refresh_preview)
-            header.addWidget(cb)
-
-            lay.addLayout(header)
-
-            summary = QLabel("-")
-            summary.setWordWrap(True)
-            summary.setStyleSheet("color:#7f8c8d; font-size:11px;")
-            lay.addWidget(summary)
-            return card, summary
-
-        # --- Taraflar ---
-        card_taraf = QFrame()
-        card_taraf.setStyleSheet("QFrame{background:#ffffff;border:1px solid #dcdcdc;border-radius:8px;}")
-        l_tar = QHBoxLayout(card_taraf)
-        l_tar.setContentsMargins(10, 8, 10, 8)
-        lbl_tar = QLabel("TARAFLAR")
-        lbl_tar.setStyleSheet("font-weight:800; color:#2c3e50; font-size:12px; text-transform:uppercase;")
-        l_tar.addWidget(lbl_tar)
-        l_tar.addStretch(1)
-        self.cb_taraflar = QCheckBox("Gizle")
-        self.cb_taraflar.stateChanged.connect(self.refresh_preview)
-        l_tar.addWidget(self.cb_taraflar)
-        left.addWidget(card_taraf)
-
-        # --- Bölüm kartları ---
-        self.lbl_sum_gorev = None
-        self.lbl_sum_dosya = None
-        self.lbl_sum_genel = None
-        self.lbl_sum_deg = None
-        self.lbl_sum_sonuc = None
-
-        card_g, self.lbl_sum_gorev = _make_card(
-            "1. GÖREVLENDİRME", "cb_gorev",
-            on_edit=lambda: self._open_meta_editor("gorev"),
-            on_reset=self.reset_default_gorev,
-        )
-        left.addWidget(card_g)
-
-        card_d, self.lbl_sum_dosya = _make_card(
-            "2. DOSYA HAKKINDA", "cb_dosya",
-            on_edit=lambda: self._open_meta_editor("dosya"),
-            on_reset=self.reset_default_dosya,
-        )
-        left.addWidget(card_d)
-
-        # --- 2. DOSYA HAKKINDA EKLER ---
-        dosya_ek_frame = QFrame()
-        dosya_ek_frame.setStyleSheet("QFrame{background:#ffffff;border:1px solid #dcdcdc;border-radius:8px;}")
-        dosya_ek_lay = QVBoxLayout(dosya_ek_frame)
-        dosya_ek_lay.setContentsMargins(10, 8, 10, 8)
-        dosya_ek_lay.setSpacing(6)
-
-        lbl_ek = QLabel("DOSYA HAKKINDA EKLER")
-        lbl_ek.setStyleSheet("font-weight:800; color:#2c3e50; font-size:12px; text-transform:uppercase;")
-        dosya_ek_lay.addWidget(lbl_ek)
-
-        self.pnl_dosya_ekler = MetaEkPanel(self.project_id, "dosya_hakkinda", self)
-        self.pnl_dosya_ekler.changed_any.connect(self.refresh_preview)
-        dosya_ek_lay.addWidget(self.pnl_dosya_ekler, 1)
-
-        left.addWidget(dosya_ek_frame)
-
-        card_genel, self.lbl_sum_genel = _make_card(
-            "3. HTS DOSYA VE ABONE BİLGİLERİ", "cb_genel",
-            on_edit=lambda: self._open_meta_editor("genel"),
-            on_reset=self.reset_default_genel,
-        )
-        left.addWidget(card_genel)
-
-        # --- 4. DELİL ÇEKMECESİ (MetaEkPanel) ---
-        card_delil = QFrame()
-        card_delil.setStyleSheet("QFrame{background:#ffffff;border:1px solid #dcdcdc;border-radius:8px;}")
-        l_delil = QVBoxLayout(card_delil)
-        l_delil.setContentsMargins(10, 8, 10, 8)
-        l_delil.setSpacing(6)
-
-        head_delil = QHBoxLayout()
-        head_delil.setContentsMargins(0, 0, 0, 0)
-        lbl_delil = QLabel("4. DELİL ÇEKMECESİ")
-        lbl_delil.setStyleSheet("font-weight:800; color:#2c3e50; font-size:12px; text-transform:uppercase;")
-        head_delil.addWidget(lbl_delil)
-        head_delil.addStretch(1)
-
-        self.cb_delillers = QCheckBox("Gizle")
-        self.cb_delillers.stateChanged.connect(self.refresh_preview)
-        head_delil.addWidget(self.cb_delillers)
-
-        l_delil.addLayout(head_delil)
-
-        # ✅ TEK panel: delil_cekmece (deliller diye ikinci kez ezme yok)
-        self.pnl_delil_ekler = MetaEkPanel(self.project_id, "delil_cekmece", self)
-        self.pnl_delil_ekler.changed_any.connect(self.refresh_preview)
-        l_delil.addWidget(self.pnl_delil_ekler)
-
-        left.addWidget(card_delil)
-
-        card_deg, self.lbl_sum_deg = _make_card(
-            "5. DEĞERLENDİRME", "cb_deg",
-            on_edit=lambda: self._open_meta_editor("deg"),
-        )
-        left.addWidget(card_deg)
-
-        card_s, self.lbl_sum_sonuc = _make_card(
-            "6. SONUÇ", "cb_sonuc",
-            on_edit=lambda: self._open_meta_editor("sonuc"),
-        )
-        left.addWidget(card_s)
-
-        left.addStretch(1)
-
-        # --- Sol alt aksiyon barı (scroll DIŞI) ---
-        action_layout = QHBoxLayout()
-        action_layout.setSpacing(10)
-        action_layout.setContentsMargins(0, 0, 0, 0)
-
-        btn_reset_all = QPushButton("Sıfırla")
-        btn_reset_all.setCursor(Qt.CursorShape.PointingHandCursor)
-        btn_reset_all.setStyleSheet("background-color:#c0392b; color:white; font-weight:bold; border-radius:6px; padding:10px;")
-        btn_reset_all.clicked.connect(self.reset_all_defaults)
-        action_layout.addWidget(btn_reset_all)
-
-        btn_save_text = QPushButton("💾 Kaydet")
-        btn_save_text.setCursor(Qt.CursorShape.PointingHandCursor)
-        btn_save_text.setToolTip("Manuel Kaydet")
-        btn_save_text.setStyleSheet("background-color:#2980b9; color:white; font-weight:bold; border-radius:6px; padding:10px;")
-        btn_save_text.clicked.connect(self.save_meta)
-        action_layout.addWidget(btn_save_text)
-
-        btn_style = QPushButton("🎨 Ayarlar")
-        btn_style.setCursor(Qt.CursorShape.PointingHandCursor)
-        btn_style.setStyleSheet("background-color:#8e44ad; color: white; font-weight: bold; border-radius: 6px; padding: 10px;")
-        btn_style.clicked.connect(self.open_style_editor)
-        action_layout.addWidget(btn_style)
-
-        left_outer.addLayout(action_layout)
-
-        # --- SAĞ: Önizleme ---
-        if getattr(self, "preview", None) is None:
-            self.preview = QWebEngineView()
-        self.preview.setStyleSheet("border: 1px solid #bdc3c7; background:#ffffff;")
-        right.addWidget(self.preview, 1)
-        self.web = self.preview  # uyumluluk
-
-        right_btn_layout = QHBoxLayout()
-        self.btn_refresh_preview = QPushButton("🔄 Önizlemeyi Güncelle")
-        self.btn_refresh_preview.setStyleSheet("font-weight:bold; padding:10px; border-radius:6px;")
-        self.btn_refresh_preview.clicked.connect(self.refresh_preview)
-        right_btn_layout.addWidget(self.btn_refresh_preview)
-
-        btn_pdf = QPushButton("📄 PDF Olarak Kaydet")
-        btn_pdf.setStyleSheet("background-color:#27ae60; color:white; font-weight:bold; padding:10px; border-radius:6px;")
-        btn_pdf.clicked.connect(self.export_pdf)
-        right_btn_layout.addWidget(btn_pdf)
-
-        right.addLayout(right_btn_layout)
-
-    def scroll_to_metaek_only(self, metaek_id: int):
-        js = f"""
-        var el = document.getElementById('metaek-{metaek_id}');
-        if (el) {{
-            el.scrollIntoView({{ behavior: 'smooth', block: 'center' }});
-            el.style.outline = '3px solid #4CAF50';
-            setTimeout(() => el.style.outline = '', 1200);
-        }}
-        """
-        self.web.page().runJavaScript(js)
-
-    def add_evidence_image_from_disk(self):
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Delil Resmi Seç", "", "Resimler (*.png *.jpg *.jpeg *.bmp *.webp)"
-        )
-        if not file_path:
-            return
-
-        # kopyala
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        evidence_dir = os.path.join(base_dir, "evidence_images")
-        if not os.path.exists(evidence_dir):
-            os.makedirs(evidence_dir)
-
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        ext = os.path.splitext(file_path)[1].lower() or ".png"
-        safe_name = f"delil_{ts}{ext}"
-        dest = os.path.join(evidence_dir, safe_name)
-
-        try:
-            shutil.copy2(file_path, dest)
-        except Exception as e:
-            ModernDialog.show_error(self, "Hata", f"Resim kopyalanamadı:\n{e}")
-            return
-
-        # rapor_taslagi insert
-        try:
-            with DB() as conn:
-                cols = {r[1] for r in conn.execute("PRAGMA table_info(rapor_meta_ekler)").fetchall()}
-
-                # Kolonlar eski sürümde yoksa yine de insert edebilmek için
-                has_hide = "DosyaAdiGizle" in cols
-                has_w    = "GenislikYuzde" in cols
-
-                if has_hide and has_w:
-                    conn.execute(
-                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle, GenislikYuzde) "
-                        "VALUES (?,?,?,?,?,?,?)",
-                        (int(self.project_id), "delil_cekmece", os.path.basename(dest), dest, "", 0, 80),
-                    )
-                elif has_hide and (not has_w):
-                    conn.execute(
-                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle) "
-                        "VALUES (?,?,?,?,?,?)",
-                        (int(self.project_id), "delil_cekmece", os.path.basename(dest), dest, "", 0),
-                    )
-                elif (not has_hide) and has_w:
-                    conn.execute(
-                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama, GenislikYuzde) "
-                        "VALUES (?,?,?,?,?,?)",
-                        (int(self.project_id), "delil_cekmece", os.path.basename(dest), dest, "", 80),
-                    )
-                else:
-                    conn.execute(
-                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama) "
-                        "VALUES (?,?,?,?,?)",
-                        (int(self.project_id), "delil_cekmece", os.path.basename(dest), dest, ""),
-                    )
-
-                conn.commit()
-
-            # Delil çekmecesi panelini yenile (varsa)
-            try:
-                if hasattr(self, "meta_ek_panel") and self.meta_ek_panel:
-                    self.meta_ek_panel.reload()
-            except Exception:
-                pass
-
-            self.refresh_preview()
-            ModernDialog.show_success(self, "Eklendi", "Delil dosyası delil çekmecesine eklendi.")
-        except Exception as e:
-            ModernDialog.show_error(self, "Hata", str(e))
-
-    def scroll_to_meta_ek(self, db_id: int):
-        try:
-            target = getattr(self, "web", None) or getattr(self, "preview", None)
-            if target is None:
-                return
-
-            js = f"""
-            (function() {{
-                var id = {int(db_id)};
-                var el = document.getElementById('evidence-' + id);
-                if(!el) el = document.getElementById('metaek-' + id);  // ✅ fallback
-                if(!el) return;
-                el.scrollIntoView({{behavior:'smooth', block:'center'}});
-                el.style.outline='2px solid #e74c3c';
-                setTimeout(function(){{ el.style.outline=''; }}, 1200);
-            }})();"""
-
-            target.page().runJavaScript(js)
-        except Exception as e:
-            print("scroll_to_meta_ek hata:", e)
-
-    def create_rich_editor(self, min_height=80):
-        """Üzerinde Kalın/İtalik/AltıÇizili butonları olan editör döndürür."""
-        container = QWidget()
-        layout = QVBoxLayout(container)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(2)
-
-        toolbar = QHBoxLayout()
-        toolbar.setSpacing(5)
-        toolbar.setContentsMargins(0, 0, 0, 0)
-
-        btn_style = """
-            QPushButton { 
-                background-color: #ecf0f1; border: 1px solid #bdc3c7; 
-                border-radius: 3px; font-weight: bold; width: 24px; height: 24px;
-                font-family: 'Times New Roman'; font-size: 14px;
-            }
-            QPushButton:hover { background-color: #dfe6e9; }
-            QPushButton:checked { background-color: #3498db; color: white; border: 1px solid #2980b9; }
-        """
-
-        editor = QTextEdit()
-        editor.setMinimumHeight(min_height)
-        editor.setStyleSheet("background-color: white; border: 1px solid #bdc3c7;")
-
-        def set_bold():
-            fmt = editor.currentCharFormat()
-            fmt.setFontWeight(QFont.Weight.Bold if fmt.fontWeight() != QFont.Weight.Bold else QFont.Weight.Normal)
-            editor.mergeCurrentCharFormat(fmt)
-            editor.setFocus()
-
-        def set_italic():
-            fmt = editor.currentCharFormat()
-            fmt.setFontItalic(not fmt.fontItalic())
-            editor.mergeCurrentCharFormat(fmt)
-            editor.setFocus()
-
-        def set_underline():
-            fmt = editor.currentCharFormat()
-            fmt.setFontUnderline(not fmt.fontUnderline())
-            editor.mergeCurrentCharFormat(fmt)
-            editor.setFocus()
-
-        btn_b = QPushButton("K")
-        btn_b.setToolTip("Kalın (Bold)")
-        btn_b.setStyleSheet(btn_style)
-        btn_b.clicked.connect(set_bold)
-
-        btn_i = QPushButton("I")
-        btn_i.setToolTip("İtalik")
-        btn_i.setStyleSheet(btn_style + "QPushButton { font-style: italic; }")
-        btn_i.clicked.connect(set_italic)
-
-        btn_u = QPushButton("A")
-        btn_u.setToolTip("Altı Çizili")
-        btn_u.setStyleSheet(btn_style + "QPushButton { text-decoration: underline; }")
-        btn_u.clicked.connect(set_underline)
-
-        toolbar.addWidget(btn_b)
-        toolbar.addWidget(btn_i)
-        toolbar.addWidget(btn_u)
-        toolbar.addStretch()
-
-        layout.addLayout(toolbar)
-        layout.addWidget(editor)
-
-        return container, editor
-
-    def _build_blocks_table(self, left_layout: QVBoxLayout):
-        self.blocks_table = QTableWidget()
-        self.blocks_table.setColumnCount(5)
-        self.blocks_table.setHorizontalHeaderLabels(["SIRA", "BAŞLIK", "TÜR", "GENİŞLİK %", "AÇIKLAMA"])
-
-        h = self.blocks_table.horizontalHeader()
-        h.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed); self.blocks_table.setColumnWidth(0, 50)
-        h.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        h.setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed); self.blocks_table.setColumnWidth(2, 70)
-        h.setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed); self.blocks_table.setColumnWidth(3, 100)
-        h.setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed); self.blocks_table.setColumnWidth(4, 110)
-
-        self.blocks_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.blocks_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self.blocks_table.setMinimumHeight(180)
-        self.blocks_table.itemClicked.connect(self.scroll_to_evidence)
-        left_layout.addWidget(self.blocks_table)
-
-        btn_row = QHBoxLayout()
-        btn_row.setSpacing(5)
-
-        mini_btn_style = """
-            QPushButton {
-                background-color: #ecf0f1; border: 1px solid #bdc3c7; border-radius: 4px;
-                padding: 5px 10px; font-weight: bold; color: #2c3e50; font-size: 12px;
-            }
-            QPushButton:hover { background-color: #d5dbdb; }
-        """
-
-        btn_up = QPushButton("▲"); btn_up.setToolTip("Yukarı Taşı"); btn_up.setFixedWidth(40)
-        btn_up.setStyleSheet(mini_btn_style); btn_up.clicked.connect(lambda: self.move_block(-1))
-        btn_row.addWidget(btn_up)
-
-        btn_down = QPushButton("▼"); btn_down.setToolTip("Aşağı Taşı"); btn_down.setFixedWidth(40)
-        btn_down.setStyleSheet(mini_btn_style); btn_down.clicked.connect(lambda: self.move_block(1))
-        btn_row.addWidget(btn_down)
-
-        btn_save = QPushButton("Kaydet")
-        btn_save.setStyleSheet(mini_btn_style + "QPushButton { color: #2980b9; }")
-        btn_save.clicked.connect(self.save_block_edits)
-        btn_row.addWidget(btn_save)
-
-        self.btn_delete_block = QPushButton("Sil")
-        self.btn_delete_block.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.btn_delete_block.setMinimumHeight(30)
-        self.btn_delete_block.setStyleSheet(mini_btn_style + "QPushButton { color: #c0392b; }")
-        self.btn_delete_block.clicked.connect(self.delete_selected_block)
-        btn_row.addWidget(self.btn_delete_block)
-
-        btn_add_img = QPushButton("Delil Resmi Ekle (Yerel Disk)")
-        btn_add_img.clicked.connect(self.add_evidence_image_from_disk)
-        left_layout.addLayout(btn_row)
-
-    def reset_default_dosya(self):
-        self.ed_dosya.setHtml("")
-        self.refresh_preview()
-
-    def reset_default_genel(self):
-        self.ed_genel.setHtml(self.builder.build_default_genel_bilgi())
-        self.refresh_preview()
-
-    def reset_all_defaults(self):
-        self.ed_gorev.setHtml(self.builder.build_default_gorevlendirme())
-        self.ed_dosya.setHtml("")
-        self.ed_genel.setHtml(self.builder.build_default_genel_bilgi())
-        self.ed_deg.setHtml("")
-        self.ed_sonuc.setHtml("")
-        self._refresh_meta_summaries()
-        self.refresh_preview()
-
-    def _html_to_summary(self, html_text: str, max_len: int = 180) -> str:
-        try:
-            doc = QTextDocument()
-            doc.setHtml(html_text or "")
-            plain = doc.toPlainText()
-        except Exception:
-            plain = re.sub(r"<[^>]+>", " ", html_text or "")
-
-        plain = re.sub(r"\s+", " ", plain).strip()
-        if not plain:
-            return "(Metin boş)"
-        if len(plain) <= max_len:
-            return plain
-        return plain[:max_len].rstrip() + "…"
-
-    def _refresh_meta_summaries(self):
-        if getattr(self, "lbl_sum_gorev", None):
-            self.lbl_sum_gorev.setText(self._html_to_summary(self.ed_gorev.toHtml()))
-        if getattr(self, "lbl_sum_dosya", None):
-            self.lbl_sum_dosya.setText(self._html_to_summary(self.ed_dosya.toHtml()))
-        if getattr(self, "lbl_sum_genel", None):
-            self.lbl_sum_genel.setText(self._html_to_summary(self.ed_genel.toHtml()))
-        if getattr(self, "lbl_sum_deg", None):
-            self.lbl_sum_deg.setText(self._html_to_summary(self.ed_deg.toHtml()))
-        if getattr(self, "lbl_sum_sonuc", None):
-            self.lbl_sum_sonuc.setText(self._html_to_summary(self.ed_sonuc.toHtml()))
-
-    def _open_meta_editor(self, key: str):
-        mapping = {
-            "gorev": ("1. GÖREVLENDİRME", self.ed_gorev),
-            "dosya": ("2. DOSYA HAKKINDA", self.ed_dosya),
-            "genel": ("3. HTS DOSYA VE ABONE BİLGİLERİ", self.ed_genel),
-            "deg": ("5. DEĞERLENDİRME", self.ed_deg),
-            "sonuc": ("6. SONUÇ", self.ed_sonuc),
-        }
-        if key not in mapping:
-            return
-
-        title, editor = mapping[key]
-        dlg = RichDescriptionDialog(self, editor.toHtml(), f"{title} Metni Düzenle")
-        if dlg.exec():
-            editor.setHtml(dlg.get_html())
-            self.save_meta_silent()
-            self._refresh_meta_summaries()
-            self.refresh_preview()
-
-    def _normalize_html_for_store(self, html: str) -> str:
-        """
-        QTextEdit.toHtml() boşken bile 600+ karakterlik HTML iskeleti üretir.
-        DB'ye bunu yazarsan açılışta 'boş' gibi davranıp standart metinlere dönme / kaybolma olur.
-        Bu fonksiyon boş içeriği gerçekten "" yapar.
-        """
-        try:
-            doc = QTextDocument()
-            doc.setHtml(html or "")
-            if doc.toPlainText().strip() == "":
-                return ""
-        except Exception:
-            if (html or "").strip() == "":
-                return ""
-        return html or ""
-
-    def _load_meta_to_ui(self):
-        self._loading_meta = True
-        try:
-            meta = self.builder._fetch_meta()
-            if not meta:
-                self.builder._ensure_meta_row()
-                meta = self.builder._fetch_meta()
-
-            def _html_is_effectively_empty(h: str) -> bool:
-                try:
-                    doc = QTextDocument()
-                    doc.setHtml(h or "")
-                    return doc.toPlainText().strip() == ""
-                except Exception:
-                    return (h or "").strip() == ""
-
-            def mget(idx, default=""):
-                if not meta or idx >= len(meta):
-                    return default
-                v = meta[idx]
-                return default if v is None else v
-
-            gorev_db = mget(1, "")
-            dosya_db = mget(2, "")
-            genel_db = mget(3, "")
-            deg_db   = mget(4, "")
-            sonuc_db = mget(5, "")
-
-            gorev_html = self.builder.build_default_gorevlendirme() if _html_is_effectively_empty(gorev_db) else gorev_db
-            genel_html = self.builder.build_default_genel_bilgi()     if _html_is_effectively_empty(genel_db) else genel_db
-
-            # setHtml sırasında autosave tetiklenmesin
-            for ed in (self.ed_gorev, self.ed_dosya, self.ed_genel, self.ed_deg, self.ed_sonuc):
-                ed.blockSignals(True)
-            try:
-                self.ed_gorev.setHtml(gorev_html)
-                self.ed_dosya.setHtml(dosya_db or "")
-                self.ed_genel.setHtml(genel_html)
-                self.ed_deg.setHtml(deg_db or "")
-                self.ed_sonuc.setHtml(sonuc_db or "")
-            finally:
-                for ed in (self.ed_gorev, self.ed_dosya, self.ed_genel, self.ed_deg, self.ed_sonuc):
-                    ed.blockSignals(False)
-
-            self._refresh_meta_summaries()
-            try:
-                self.pnl_dosya_ekler.reload()
-            except Exception:
-                pass
-
-        finally:
-            self._loading_meta = False
-
-    def save_meta(self):
-        pid = self._norm_pid()
-        if pid is None:
-            return
-
-        try:
-            self.builder._ensure_meta_row()
-
-            g  = self._normalize_html_for_store(self.ed_gorev.toHtml())
-            d  = self._normalize_html_for_store(self.ed_dosya.toHtml())
-            ge = self._normalize_html_for_store(self.ed_genel.toHtml())
-            de = self._normalize_html_for_store(self.ed_deg.toHtml())
-            s  = self._normalize_html_for_store(self.ed_sonuc.toHtml())
-
-            with DB() as conn:
-                conn.execute("""
-                    UPDATE rapor_meta SET
-                        GorevlendirmeMetni=?,
-                        DosyaHakkindaMetni=?,
-                        GenelBilgilendirmeMetni=?,
-                        DegerlendirmeMetni=?,
-                        SonucMetni=?,
-                        GuncellemeTarihi=CURRENT_TIMESTAMP
-                    WHERE ProjeID=?
-                """, (g, d, ge, de, s, pid))
-                conn.commit()
-
-            ModernDialog.show_success(self, "Kaydedildi", "Rapor metinleri kaydedildi.")
-            self.refresh_preview()
-
-        except Exception as e:
-            ModernDialog.show_error(self, "Hata", str(e))
-
-    def _on_dosya_ek_changed(self):
-        # metin değişmiyor ama rapor HTML değişecek
-        self.refresh_preview()
-
-    def reset_default_gorev(self):
-        self.ed_gorev.setHtml(self.builder.build_default_gorevlendirme())
-        self.refresh_preview()
-
-    def _rapor_taslagi_pk_col(self, conn):
-        cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
-        return "id" if "id" in cols else "rowid"
-
-    def _rt_select_id_expr(self, conn):
-        return "id" if self._rapor_taslagi_pk_col(conn) == "id" else "rowid AS id"
-
-    def load_blocks_into_table(self):
-        if getattr(self, "blocks_table", None) is None:
-            return
-        # Tabloyu temizle
-        self.blocks_table.setRowCount(0)
-
-        # Verileri çek
-        with DB() as conn:
-            # Sira'ya göre sıralı çekiyoruz
-            rows = conn.execute(
-                "SELECT id, Sira, Baslik, Tur, GenislikYuzde, Aciklama FROM rapor_taslagi WHERE ProjeID=? ORDER BY Sira ASC",
-                (self.project_id,)
-            ).fetchall()
-
-        self.blocks_table.setRowCount(len(rows))
-
-        for i, r in enumerate(rows):
-            bid, sira, baslik, tur, gen, acik = r
-
-            # Harf sıralaması (Görsel)
-            harf = chr(97 + i)
-
-            # --- KRİTİK DÜZELTME: ID'yi gizli bir veriye (UserRole) saklıyoruz ---
-            # 0. Kolon (Sıra) hücresini oluştururken ID'yi içine gömüyoruz.
-            item_sira = QTableWidgetItem(f"{harf}.")
-            item_sira.setData(Qt.ItemDataRole.UserRole, bid) # <-- GİZLİ ID BURADA
-            # --------------------------------------------------------------------
-
-            self.blocks_table.setItem(i, 0, item_sira)
-            self.blocks_table.setItem(i, 1, QTableWidgetItem(str(baslik)))
-            self.blocks_table.setItem(i, 2, QTableWidgetItem(str(tur)))
-            self.blocks_table.setItem(i, 3, QTableWidgetItem(f"%{gen}"))
-            self.blocks_table.setItem(i, 4, QTableWidgetItem(str(acik)[:50]))
-
-    def save_meta_silent(self):
-        """Kullanıcı yazı yazdıkça arka planda sessizce kaydeder."""
-        if getattr(self, "_loading_meta", False):
-            return
-        if not getattr(self, "_meta_ready", False):
-            return
-
-        pid = self._norm_pid()
-        if pid is None:
-            return
-
-        try:
-            # satır yoksa defaultlarla oluştur
-            self.builder._ensure_meta_row()
-
-            with DB() as conn:
-                cur = conn.cursor()
-
-                # ✅ AÇILIŞ KORUMASI:
-                # Editörler tamamen boşsa, default satırı "boş" ile ezmeyelim.
-                # (Kullanıcı zaten yazınca dolacak ve kaydolacak.)
-                gorev_html = self.ed_gorev.toHtml() or ""
-                genel_html = self.ed_genel.toHtml() or ""
-
-                # QTextEdit boşken "<p></p>" gibi dönebilir; düz metin kontrolü yapalım
-                def _plain_len(ed: QTextEdit) -> int:
-                    return len((ed.toPlainText() or "").strip())
-
-                if _plain_len(self.ed_gorev) == 0 and _plain_len(self.ed_genel) == 0 and \
-                   _plain_len(self.ed_dosya) == 0 and _plain_len(self.ed_deg) == 0 and _plain_len(self.ed_sonuc) == 0:
-                    return
-
-                cur.execute("""
-                    UPDATE rapor_meta SET
-                        GorevlendirmeMetni=?,
-                        DosyaHakkindaMetni=?,
-                        GenelBilgilendirmeMetni=?,
-                        DegerlendirmeMetni=?,
-                        SonucMetni=?,
-                        GuncellemeTarihi=CURRENT_TIMESTAMP
-                    WHERE ProjeID=?
-                """, (
-                    self.ed_gorev.toHtml(),
-                    self.ed_dosya.toHtml(),
-                    self.ed_genel.toHtml(),
-                    self.ed_deg.toHtml(),
-                    self.ed_sonuc.toHtml(),
-                    pid
-                ))
-
-                if cur.rowcount == 0:
-                    raise RuntimeError(f"rapor_meta UPDATE 0 satır etkiledi. ProjeID eşleşmiyor olabilir. pid={pid!r}")
-
-                conn.commit()
-
-        except Exception:
-            import traceback
-            print("save_meta_silent HATA:")
-            print(traceback.format_exc())
-
-    def open_aciklama_editor(self, bid, current_text):
-        """Delil açıklamasını düzenlemek için ZENGİN METİN editörünü açar."""
-
-        dlg = RichDescriptionDialog(self, current_text, "Delil Açıklaması Düzenle")
-
-        if dlg.exec():
-            new_text = dlg.get_html()
-
-            try:
-                with DB() as conn:
-                    pk = self._rapor_taslagi_pk_col(conn)
-                    conn.execute(f"UPDATE rapor_taslagi SET Aciklama=? WHERE {pk}=? AND ProjeID=?",
-                                 (new_text, bid, self.project_id))
-                    conn.commit()
-
-                self.load_blocks_into_table()
-                self.refresh_preview()
-                ModernDialog.show_success(self, "Güncellendi", "Açıklama kaydedildi.")
-
-            except Exception as e:
-                ModernDialog.show_error(self, "Hata", str(e))
-
-    def scroll_to_evidence(self, item):
-        """Tablodan tıklanan satırın ID'sini alıp HTML'de o ID'ye scroll eder."""
-        row = item.row()
-
-        # 0. Kolondaki (Sıra) hücreye erişip gizli ID'yi (UserRole) alıyoruz
-        sira_item = self.blocks_table.item(row, 0)
-        if not sira_item:
-            return
-
-        # Gizli ID'yi çek
-        db_id = sira_item.data(Qt.ItemDataRole.UserRole)
-
-        if not db_id:
-            return
-
-        # JavaScript ile o ID'ye git
-        # Hem 'evidence-ID' hem 'metaek-ID' dener (garanti olsun diye)
-        js = f"""
-        (function() {{
-            var el = document.getElementById('evidence-{db_id}');
-            if (!el) el = document.getElementById('metaek-{db_id}');
-            
-            if (el) {{
-                el.scrollIntoView({{behavior: 'smooth', block: 'center'}});
-                
-                // Vurgu efekti (kırmızı çerçeve)
-                var oldOutline = el.style.outline;
-                el.style.outline = '3px solid #e74c3c';
-                el.style.transition = 'outline 0.3s';
-                
-                setTimeout(function(){{
-                    el.style.outline = oldOutline;
-                }}, 1500);
-            }} else {{
-                console.log('Element bulunamadı: evidence-{db_id}');
-            }}
-        }})();
-        """
-
-        # Web görünümü nesnesini bul (self.preview veya self.web olabilir)
-        target_web = getattr(self, "preview", None) or getattr(self, "web", None)
-        if target_web:
-            target_web.page().runJavaScript(js)
-
-    def _rapor_taslagi_pk_col(self, conn):
-        cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
-        return "id" if "id" in cols else "rowid"
-
-    def _rt_select_id_expr(self, conn):
-        return "id" if self._rapor_taslagi_pk_col(conn) == "id" else "rowid AS id"
-
-    def save_block_edits(self):
-        try:
-            with DB() as conn:
-                pk = self._rapor_taslagi_pk_col(conn)
-
-                for r in range(self.blocks_table.rowCount()):
-                    item_sira = self.blocks_table.item(r, 0)
-                    if not item_sira:
-                        continue
-
-                    bid = item_sira.data(Qt.ItemDataRole.UserRole)
-                    if bid is None:
-                        continue
-
-                    sira = int(item_sira.text() or (r + 1))
-                    baslik = self.blocks_table.item(r, 1).text() if self.blocks_table.item(r, 1) else ""
-                    gen = int(self.blocks_table.item(r, 3).text() or 100) if self.blocks_table.item(r, 3) else 100
-                    conn.execute(f"""
-                        UPDATE rapor_taslagi
-                        SET Sira=?, Baslik=?, GenislikYuzde=?
-                        WHERE {pk}=? AND ProjeID=?
-                    """, (sira, baslik, gen, bid, self.project_id))
-
-                conn.commit()
-
-            ModernDialog.show_success(self, "Kaydedildi", "Blok ayarları güncellendi.")
-            self.load_blocks_into_table()
-            self.refresh_preview()
-
-        except Exception as e:
-            ModernDialog.show_error(self, "Rapor Hatası", str(e))
-
-    def _normalize_block_order(self):
-        """Delil silme/taşıma sonrası Sira’yı 1..n yap."""
-        with DB() as conn:
-            id_expr = self._rt_select_id_expr(conn)
-            pk = self._rapor_taslagi_pk_col(conn)
-
-            rows = conn.execute(f"""
-                SELECT {id_expr}
-                FROM rapor_taslagi
-                WHERE ProjeID=?
-                ORDER BY Sira ASC, id ASC
-            """, (self.project_id,)).fetchall()
-
-            for idx, (bid,) in enumerate(rows, start=1):
-                conn.execute(f"""
-                    UPDATE rapor_taslagi SET Sira=?
-                    WHERE {pk}=? AND ProjeID=?
-                """, (idx, bid, self.project_id))
-
-            conn.commit()
-
-    def move_block(self, delta):
-        row = self.blocks_table.currentRow()
-        if row < 0: return
-
-        target_row = row + delta
-        if target_row < 0 or target_row >= self.blocks_table.rowCount(): return
-
-        item_current = self.blocks_table.item(row, 0)
-        item_target = self.blocks_table.item(target_row, 0)
-        if not item_current or not item_target: return
-
-        bid_current = item_current.data(Qt.ItemDataRole.UserRole)
-        bid_target = item_target.data(Qt.ItemDataRole.UserRole)
-
-        try:
-            sira_current = int(item_current.text())
-            sira_target = int(item_target.text())
-        except: return
-
-        try:
-            with DB() as conn:
-                pk = self._rapor_taslagi_pk_col(conn)
-
-                conn.execute(f"UPDATE rapor_taslagi SET Sira=-999 WHERE {pk}=?", (bid_current,))
-                conn.execute(f"UPDATE rapor_taslagi SET Sira=? WHERE {pk}=?", (sira_current, bid_target))
-                conn.execute(f"UPDATE rapor_taslagi SET Sira=? WHERE {pk}=?", (sira_target, bid_current))
-                conn.execute(f"UPDATE rapor_taslagi SET Sira=? WHERE {pk}=? AND Sira=-999", (sira_target, bid_current))
-
-                conn.commit()
-
-            self.load_blocks_into_table()
-
-            self.blocks_table.selectRow(target_row)
-
-        except Exception as e:
-            ModernDialog.show_error(self, "Hata", f"Sıralama hatası: {e}")
-
-    def delete_selected_block(self):
-        try:
-            row = self.blocks_table.currentRow()
-            if row < 0:
-                ModernDialog.show_warning(self, "Delil Sil", "Silinecek delili seçiniz.")
-                return
-
-            ok = ModernDialog.show_question(
-                self, "Delili Sil",
-                "Seçili delil rapor taslağından silinecek. Emin misiniz?",
-                yes_btn="Evet", no_btn="Hayır"
-            )
-            if not ok:
-                return
-
-            item_sira = self.blocks_table.item(row, 0)
-            bid = item_sira.data(Qt.ItemDataRole.UserRole)
-
-            with DB() as conn:
-                pk = self._rapor_taslagi_pk_col(conn)
-                conn.execute(f"DELETE FROM rapor_taslagi WHERE {pk}=? AND ProjeID=?",
-                             (bid, self.project_id))
-                conn.commit()
-
-            self._normalize_block_order()
-            self.load_blocks_into_table()
-            self.refresh_preview()
-
-        except Exception as e:
-            ModernDialog.show_error(self, "Rapor Hatası", str(e))
-
-    def _disabled_sections_set(self):
-        s = set()
-        if self.cb_taraflar.isChecked(): s.add("taraflar")
-        if self.cb_gorev.isChecked(): s.add("gorev")
-        if self.cb_dosya.isChecked(): s.add("dosya")
-        if self.cb_genel.isChecked(): s.add("genel")
-        if self.cb_delillers.isChecked(): s.add("deliller")
-        if self.cb_deg.isChecked(): s.add("deg")
-        if self.cb_sonuc.isChecked(): s.add("sonuc")
-        return s
-
-    def refresh_preview(self):
-        # ✅ meta hazır değilken DB'ye yazma
-        if getattr(self, "_meta_ready", False):
-            self.save_meta_silent()
-
-        disabled = self._disabled_sections_set()
-        try:
-            html_doc = self.builder.build_html(disabled_sections=disabled)
-            base_url = QUrl.fromLocalFile(os.path.join(APP_DIR, ""))
-            self.preview.setHtml(html_doc, base_url)
-        except Exception as e:
-            import traceback
-            print(traceback.format_exc())
-            self.preview.setHtml(f"<h3 style='color:red'>Rapor Oluşturma Hatası: {e}</h3>")
-
-        try:
-            self.preview.setZoomFactor(0.92)
-        except Exception:
-            pass
-
-    def open_style_editor(self):
-        dlg = StyleEditorDialog(self)
-        if dlg.exec():
-            self.refresh_preview()
-
-    def export_pdf(self):
-        try:
-            if hasattr(self, "loader"):
-                self.loader.start("PDF oluşturuluyor.")
-                QApplication.processEvents()
-
-            styles = StyleConfig.load()
-            if not isinstance(styles, dict):
-                styles = StyleConfig.DEFAULTS.copy()
-
-            m = styles.get("margins", {"top": 25, "right": 20, "bottom": 20, "left": 25})
-
-            disabled = self._disabled_sections_set()
-            html_doc = self.builder.build_html(disabled_sections=disabled)
-
-            out_path, _ = QFileDialog.getSaveFileName(self, "PDF Kaydet", "", "PDF (*.pdf)")
-            if not out_path:
-                return
-            if not out_path.lower().endswith(".pdf"):
-                out_path += ".pdf"
-
-            def _status_cb(msg: str):
-                try:
-                    if hasattr(self, "loader"):
-                        self.loader.setText(str(msg))
-                        QApplication.processEvents()
-                except Exception:
-                    pass
-
-            def _progress_cb(p: int):
-                try:
-                    if hasattr(self, "loader"):
-                        self.loader.setProgress(int(p))
-                        QApplication.processEvents()
-                except Exception:
-                    pass
-
-            PDFExporter.export_pdf(
-                html_string=html_doc,
-                out_path=out_path,
-                margin_top_mm=int(m.get("top", 25)),
-                margin_right_mm=int(m.get("right", 20)),
-                margin_bottom_mm=int(m.get("bottom", 20)),
-                margin_left_mm=int(m.get("left", 25)),
-                zoom=1.0,
-                footer_font_size=10,
-                status_cb=_status_cb,
-                progress_cb=_progress_cb,
-            )
-
-            ModernDialog.show_success(self, "Başarılı", "PDF oluşturuldu.")
-
-        except Exception as e:
-            ModernDialog.show_error(self, "Hata", str(e))
-
-        finally:
-            try:
-                if hasattr(self, "loader"):
-                    self.loader.stop()
-                    QApplication.processEvents()
-            except Exception:
-                pass
-
-
 def _quit_app():
     """sys.exit yerine: Qt event loop'tan temiz çıkış."""
     try:
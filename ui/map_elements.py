@@ -0,0 +1,57 @@
+"""
+Folium haritalarına eklenen özel Leaflet öğeleri (folium/branca/jinja2 ilk harita çiziminde yüklenir).
+"""
+from branca.element import MacroElement
+from jinja2 import Template
+
+
+class DraggableConnector(MacroElement):
+    """
+    Baloncuk sürüklenince ve harita zoom/pan olunca,
+    sabit raptiye ile baloncuk arasındaki çizgiyi sürekli günceller.
+    """
+    def __init__(self, fmap, label_marker, connector_line, fixed_lat, fixed_lon):
+        super().__init__()
+        self._name = "DraggableConnector"
+        self.fmap = fmap
+        self.label_marker = label_marker
+        self.connector_line = connector_line
+        self.fixed_lat = fixed_lat
+        self.fixed_lon = fixed_lon
+
+        self._template = Template(u"""
+        {% macro script(this, kwargs) %}
+            var map = {{ this.fmap.get_name() }};
+
+            map.whenReady(function () {
+                var label = {{ this.label_marker.get_name() }};
+                var line  = {{ this.connector_line.get_name() }};
+                var fixed = L.latLng({{ this.fixed_lat }}, {{ this.fixed_lon }});
+
+                // Drag'i garantiye al (DivIcon'da bazen otomatik açılmıyor)
+                if (label.dragging) { label.dragging.enable(); }
+
+                function syncLine() {
+                    if (!label || !line) return;
+                    var p = label.getLatLng();
+                    line.setLatLngs([fixed, p]);
+                }
+
+                // İlk yükleme sırasında baloncuk sonradan kayarsa yakala
+                syncLine();
+                var c = 0;
+                var t = setInterval(function(){
+                    syncLine();
+                    c++;
+                    if (c >= 10) clearInterval(t);  // ~1 saniye
+                }, 100);
+
+                // Drag ile lastik çizgi
+                label.on('drag', syncLine);
+                label.on('dragend', syncLine);
+
+                // Zoom/pan sonrası da doğru kalsın
+                map.on('zoomend moveend', syncLine);
+            });
+        {% endmacro %}
+        """)
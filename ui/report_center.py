@@ -0,0 +1,4772 @@
+"""
+Rapor Merkezi: rapor HTML üretimi, PDF dışa aktarma, stil / delil / meta ek düzenleyicileri.
+
+Ana pencere modülünden ayrıdır; ilk "Rapor Merkezi" açılışında yüklenir (QtWebEngine önizleme,
+PDF servisi, bs4 tablo yardımcıları açılış süresine eklenmesin).
+"""
+import copy
+import html
+import json
+import os
+import re
+import shutil
+import tempfile
+from collections import OrderedDict
+from datetime import datetime
+
+from PyQt6.QtCore import Qt, QSize, QTimer, QUrl, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPixmap, QTextCharFormat, QTextDocument
+from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtWidgets import QAbstractItemView, QApplication, QCheckBox, QColorDialog, QDialog, QFileDialog, QFrame, \
+    QGridLayout, QGroupBox, QHBoxLayout, QHeaderView, QLabel, QLineEdit, QListWidget, QListWidgetItem, QPushButton, \
+    QScrollArea, QSizePolicy, QSlider, QSpinBox, QSplitter, QTableWidget, QTableWidgetItem, QTabWidget, QTextEdit, \
+    QVBoxLayout, QWidget
+
+from ui.dialog import ModernDialog
+from ui.main_window import APP_DIR, LoadingOverlay
+from utils.constants import TABLE_COLUMNS
+from utils.db import DB
+from utils.evidence_store import EvidenceStore
+from utils.helpers import _extract_table_headers_rows, _apply_hidden_cols_to_table_html, _apply_fmt_to_table_html
+from utils.pdf_overlay import PdfOverlayStamper, prepare_logo_png
+from utils.pdf_render_service import ChromiumRenderService, RenderServiceUnavailable
+from utils.report_cache import ReportRenderCache
+from utils.trace_spans import Tracer
+from utils.report_table import render_table_html, table_struct_dumps, table_struct_from_html, \
+    table_struct_headers_rows, table_struct_loads
+
+
+class ReportHtmlBuilder:
+    def __init__(self, project_id: int):
+        self.project_id = project_id
+
+    def _ensure_meta_row(self):
+        """
+        rapor_meta satırı yoksa default metinlerle oluşturur.
+        Satır varsa ama eski sürümden kalma şekilde bütün metin kolonları NULL ise
+        (yani hiç initialize edilmemişse) yine defaultları yazar.
+        Kullanıcı bilerek metni silip "" yaptıysa dokunmaz.
+        """
+        pid = self.project_id
+        try:
+            pid = int(pid)
+        except Exception:
+            pid = str(pid).strip()
+
+        with DB() as conn:
+            row = conn.execute("""
+                SELECT
+                    GorevlendirmeMetni,
+                    DosyaHakkindaMetni,
+                    GenelBilgilendirmeMetni,
+                    DegerlendirmeMetni,
+                    SonucMetni
+                FROM rapor_meta
+                WHERE ProjeID=?
+            """, (pid,)).fetchone()
+
+            # hiç satır yoksa: defaultlarla INSERT
+            if not row:
+                gorev = self.build_default_gorevlendirme()
+                genel = self.build_default_genel_bilgi()
+                conn.execute("""
+                    INSERT INTO rapor_meta (
+                        ProjeID,
+                        GorevlendirmeMetni,
+                        DosyaHakkindaMetni,
+                        GenelBilgilendirmeMetni,
+                        DegerlendirmeMetni,
+                        SonucMetni,
+                        GuncellemeTarihi
+                    ) VALUES (?,?,?,?,?,?,CURRENT_TIMESTAMP)
+                """, (pid, gorev, "", genel, "", ""))
+                conn.commit()
+                return
+
+            # satır var ama eski bozuk sürümden kalma: tüm metinler NULL ise initialize et
+            gorev_db, dosya_db, genel_db, deg_db, sonuc_db = row
+            if (gorev_db is None and dosya_db is None and genel_db is None and deg_db is None and sonuc_db is None):
+                gorev = self.build_default_gorevlendirme()
+                genel = self.build_default_genel_bilgi()
+                conn.execute("""
+                    UPDATE rapor_meta SET
+                        GorevlendirmeMetni=?,
+                        DosyaHakkindaMetni=?,
+                        GenelBilgilendirmeMetni=?,
+                        DegerlendirmeMetni=?,
+                        SonucMetni=?,
+                        GuncellemeTarihi=CURRENT_TIMESTAMP
+                    WHERE ProjeID=?
+                """, (gorev, "", genel, "", "", pid))
+                conn.commit()
+
+    def _meta_desc_to_text(self, acik) -> str:
+        import re, html as _html
+        if not acik:
+            return ""
+        s = str(acik).strip()
+        if not s:
+            return ""
+
+        # RichDescriptionDialog -> toHtml() çıktısı gelirse düz metne indir.
+        if "<" in s and ">" in s:
+            s = re.sub(r"(?is)<!doctype.*?>", "", s)
+            s = re.sub(r"(?is)<head.*?>.*?</head>", "", s)
+            s = re.sub(r"(?is)<(script|style).*?>.*?</\1>", "", s)
+            s = re.sub(r"(?is)</?html.*?>", "", s)
+            s = re.sub(r"(?is)</?body.*?>", "", s)
+            s = re.sub(r"(?is)<br\s*/?>", "\n", s)
+            s = re.sub(r"(?is)</p\s*>", "\n", s)
+            s = re.sub(r"(?is)<[^>]+>", "", s)
+            s = _html.unescape(s)
+
+        return s.strip()
+
+    def _sanitize_rich_html(self, s: str) -> str:
+        """
+        RichDescriptionDialog.toHtml() gibi tam HTML dönen içeriklerde:
+        - DOCTYPE/html/head/body dış kabuğunu temizle
+        - sadece body içini al (varsa)
+        - <style>/<script>/<meta> temizle
+        """
+        if not s:
+            return ""
+        txt = str(s)
+
+        # DOCTYPE temizle
+        txt = re.sub(r"<!DOCTYPE[^>]*>", "", txt, flags=re.IGNORECASE | re.DOTALL)
+
+        # body içini çek (varsa)
+        m = re.search(r"<body[^>]*>(.*?)</body>", txt, flags=re.IGNORECASE | re.DOTALL)
+        if m:
+            txt = m.group(1)
+
+        # style/script/meta/head/html temizle
+        txt = re.sub(r"<style[^>]*>.*?</style>", "", txt, flags=re.IGNORECASE | re.DOTALL)
+        txt = re.sub(r"<script[^>]*>.*?</script>", "", txt, flags=re.IGNORECASE | re.DOTALL)
+        txt = re.sub(r"<meta[^>]*>", "", txt, flags=re.IGNORECASE | re.DOTALL)
+        txt = re.sub(r"</?head[^>]*>", "", txt, flags=re.IGNORECASE | re.DOTALL)
+        txt = re.sub(r"</?html[^>]*>", "", txt, flags=re.IGNORECASE | re.DOTALL)
+
+        return txt.strip()
+
+    def _strip_tags_len(self, html_text: str) -> int:
+        if not html_text:
+            return 0
+        t = re.sub(r"<[^>]+>", "", str(html_text), flags=re.DOTALL)
+        t = re.sub(r"\s+", " ", t).strip()
+        return len(t)
+
+    def _render_meta_ekler_html(self, bolum: str, baslik: str) -> str:
+        """
+        Dosya eklerini a., b., c. şeklinde listeler.
+        HATA ÇÖZÜMÜ: 'ek_no' değişkeni kaldırıldı, enumerate kullanıldı.
+        """
+        rows = self._fetch_meta_ekler(bolum)
+        if str(bolum) == "delil_cekmece":
+            return ""
+
+        parts = [f"<h2>{html.escape(baslik)}</h2>"]
+
+        # enumerate(rows) ile otomatik sayaç: 0, 1, 2...
+        for i, (db_id, dosya_adi, dosya_yolu, aciklama, dosya_adi_gizle, gen_pct) in enumerate(rows):
+
+            # 0 -> a, 1 -> b...
+            harf = chr(97 + i)
+
+            fname = (dosya_adi or (os.path.basename(dosya_yolu or "") if dosya_yolu else "")).strip()
+            gen_pct = int(gen_pct or 100)
+            gen_pct = max(10, min(100, gen_pct))
+
+            safe_desc_html = self._sanitize_rich_html(aciklama or "")
+            desc_len = self._strip_tags_len(safe_desc_html)
+            desc_is_long = desc_len >= 700
+
+            # İsim satırı (a. DosyaAdı)
+            if int(dosya_adi_gizle or 0) == 0:
+                name_line = (
+                    f"<div class='metaek-name'>"
+                    f"<span class='metaek-no'>{harf}.</span> "
+                    f"<span class='metaek-fname'>{html.escape(fname)}</span>"
+                    f"</div>"
+                )
+            else:
+                name_line = f"<div class='metaek-name'><span class='metaek-no'>{harf}.</span></div>"
+
+            # Resim
+            if dosya_yolu and os.path.exists(dosya_yolu):
+                src = QUrl.fromLocalFile(dosya_yolu).toString()
+                img_html = (
+                    f"<div class='metaek-imgwrap'>"
+                    f" <img class='metaek-img' "
+                    f" src='{src}' "
+                    f" style='width:{gen_pct}%;' "
+                    f" onclick=\"openImgModal('{src}')\" />"
+                    f"</div>"
+                )
+            else:
+                img_html = "<div class='metaek-missing'>[Dosya bulunamadı]</div>"
+
+            desc_html = ""
+            if safe_desc_html.strip():
+                desc_html = f"<div class='metaek-desc'>{safe_desc_html}</div>"
+
+            # DİKKAT: ID olarak veritabanı ID'sini (db_id) kullanıyoruz
+            parts.append(
+                f"<div class='metaek-block' id='metaek-{db_id}'>"
+                f" {name_line}"
+                f" {img_html}"
+                f" {desc_html}"
+                f"</div>"
+            )
+
+        return "\n".join(parts)
+
+    def _fetch_meta_ekler_files(self, bolum: str):
+        """
+        rapor_meta_ekler tablosundan Dosya Hakkında / Delil Çekmecesi eklerini çeker.
+        Kolonlar eski sürümlerde yoksa (DosyaAdiGizle, GenislikYuzde) fallback uygular.
+        Dönen: [(id, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle, GenislikYuzde), ...]
+        """
+        with DB() as conn:
+            cols = {r[1] for r in conn.execute("PRAGMA table_info(rapor_meta_ekler)").fetchall()}
+
+            id_expr = "id" if "id" in cols else "rowid AS id"
+            name_expr = "DosyaAdi" if "DosyaAdi" in cols else "NULL AS DosyaAdi"
+            path_expr = "DosyaYolu" if "DosyaYolu" in cols else "NULL AS DosyaYolu"
+            desc_expr = "Aciklama" if "Aciklama" in cols else "'' AS Aciklama"
+            hide_expr = "DosyaAdiGizle" if "DosyaAdiGizle" in cols else "0 AS DosyaAdiGizle"
+            w_expr = "GenislikYuzde" if "GenislikYuzde" in cols else "100 AS GenislikYuzde"
+
+            rows = conn.execute(
+                f"""
+                SELECT {id_expr},
+                       {name_expr},
+                       {path_expr},
+                       {desc_expr},
+                       {hide_expr},
+                       {w_expr}
+                FROM rapor_meta_ekler
+                WHERE ProjeID=? AND Bolum=?
+                ORDER BY id ASC
+                """,
+                (self.project_id, bolum)
+            ).fetchall()
+
+        return rows
+
+    def _fetch_meta_ekler(self, bolum: str):
+        """
+        rapor_meta_ekler:
+          id, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle, GenislikYuzde
+        """
+        # ✅ ZORUNLU: sqlcipher param bağlama hatasını engeller
+        pid = self.project_id
+        try:
+            pid = int(pid)
+        except Exception:
+            # yine de güvenli fallback
+            pid = str(pid)
+
+        bolum = str(bolum)
+
+        with DB() as conn:
+            rows = conn.execute(
+                "SELECT id, DosyaAdi, DosyaYolu, Aciklama, "
+                "COALESCE(DosyaAdiGizle,0) as DosyaAdiGizle, "
+                "COALESCE(GenislikYuzde,100) as GenislikYuzde "
+                "FROM rapor_meta_ekler "
+                "WHERE ProjeID=? AND Bolum=? "
+                "ORDER BY id ASC",
+                (pid, bolum),
+            ).fetchall()
+        return rows
+
+    def _fetch_meta(self):
+        pid = self.project_id
+        try:
+            pid = int(pid)
+        except Exception:
+            pid = str(pid)
+        with DB() as conn:
+            return conn.execute("""
+                SELECT ProjeID AS id,
+                       GorevlendirmeMetni,
+                       DosyaHakkindaMetni,
+                       GenelBilgilendirmeMetni,
+                       DegerlendirmeMetni,
+                       SonucMetni,
+                       MarginTopMm,
+                       MarginRightMm,
+                       MarginBottomMm,
+                       MarginLeftMm
+                FROM rapor_meta WHERE ProjeID=?
+            """, (pid,)).fetchone()
+
+    def _fetch_blocks(self):
+        with DB() as conn:
+            cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
+
+            if "id" in cols:
+                id_expr = "id"
+            else:
+                id_expr = "rowid AS id"
+
+            gen_expr  = "GenislikYuzde" if "GenislikYuzde" in cols else "100 AS GenislikYuzde"
+            acik_expr = "Aciklama"      if "Aciklama"      in cols else "'' AS Aciklama"
+            html_expr = "HtmlIcerik"    if "HtmlIcerik"    in cols else "NULL AS HtmlIcerik"
+            base_expr = "BaseHtmlIcerik" if "BaseHtmlIcerik" in cols else "NULL AS BaseHtmlIcerik"
+            hid_expr  = "HiddenColsJson" if "HiddenColsJson" in cols else "NULL AS HiddenColsJson"
+            fmt_expr  = "FmtJson"        if "FmtJson"        in cols else "NULL AS FmtJson"
+            img_expr  = "ImagePath"     if "ImagePath"     in cols else "NULL AS ImagePath"
+            tbl_expr  = "TabloJson"      if "TabloJson"      in cols else "NULL AS TabloJson"
+            gid_expr  = "GorselID"       if "GorselID"       in cols else "NULL AS GorselID"
+
+            # [DÜZELTME] Icerik sütununu da çekiyoruz (Eski kayıtlar veya fallback için)
+            raw_icerik_expr = "Icerik" if "Icerik" in cols else "NULL AS Icerik"
+
+            return conn.execute(f"""
+                SELECT {id_expr},
+                       Sira,
+                       Baslik,
+                       Tur,
+                       {gen_expr},
+                       {acik_expr},
+                       {html_expr},
+                       {base_expr},
+                       {hid_expr},
+                       {fmt_expr},
+                       {img_expr},
+                       {raw_icerik_expr},
+                       {tbl_expr},
+                       {gid_expr}
+                FROM rapor_taslagi
+                WHERE ProjeID=?
+                ORDER BY Sira ASC, id ASC
+            """, (self.project_id,)).fetchall()
+
+    def _fetch_project_info(self):
+        """
+        Proje tablosundan:
+        birim, dosya no tipi, dosya no, suç, suç tarihi, görevlendirme tarihi,
+        bilirkişi adı, bilirkişi ünvan/sicil
+
+        ayrıca taraflar:
+        [(sifat, adsoyad), ...]
+        """
+        with DB() as conn:
+            p = conn.execute("""
+                SELECT talep_eden_birim,
+                       dosya_no_tipi,
+                       dosya_no,
+                       suc_bilgisi,
+                       suc_tarihi,
+                       gorevlendirme_tarihi,
+                       bilirkisi_adi,
+                       bilirkisi_unvan_sicil
+                FROM projeler WHERE id=?
+            """, (self.project_id,)).fetchone()
+
+            parties = conn.execute("""
+                SELECT sifat, ad_soyad
+                FROM taraflar
+                WHERE ProjeID=?
+                ORDER BY id ASC
+            """, (self.project_id,)).fetchall()
+
+        return p, parties
+
+    def _wrap_as_block(self, title: str, inner_html: str, genislik_yuzde: int = 100, aciklama: str = "") -> str:
+        """
+        Delil çekmecesi blok temasıyla aynı görünecek şekilde HTML'i sarar.
+        DB'ye yazmaz; sadece raporda kullanılır.
+        """
+        w = int(genislik_yuzde or 100)
+        t = html.escape(title or "")
+        a = html.escape(aciklama or "")
+
+        out = []
+        out.append(f"<div class='block' style='width:{w}% !important;'>")  # ✅ genişlik kesin uygula
+        out.append(f"<div class='block-title'>{t}</div>")
+        out.append("<div class='block-inner'>")
+        out.append(inner_html or "")
+        out.append("</div>")  # block-inner
+        if aciklama:
+            out.append(f"<div class='block-desc'>Delil Açıklaması: {a}</div>")
+        out.append("</div>")
+        return "\n".join(out)
+
+    # -------------------------
+    # Defaults
+    # -------------------------
+    def build_default_gorevlendirme(self) -> str:
+        """
+        Yeni şablon:
+        ("Mahkeme Adı" "Dosya No" "Dosya Tipi" sayılı dosyasından "Talep Tarihi"
+         tarihli yazısı ile talep edilen, talebe istinaden BTK tarafından sunulan
+         HTS kayıtlarını incelemek ve ..... bilirkişi raporunu bildirmek üzere
+         bilirkişi olarak tayin edildim.
+         İş bu raporla yukarıda belirtilen talep gereği incelemeler yapılmış olup;
+         gerekli açıklamalar ilgili bölümlerdedir.)
+
+        Talep Tarihi kullanıcı girişi olacak -> placeholder bırakıyoruz.
+        Diğer alanlar projeler tablosundan geliyor.
+        """
+        p, _ = self._fetch_project_info()
+        birim, tip, dosya_no, suc, suc_t, gorev_t, bilirkisi_adi, bilirkisi_unvan = (
+            p or ("","","","","","","","")
+        )
+
+        dosya_tip_ve_no = f"{dosya_no} {tip}".strip()
+        mahkeme_adi = (birim or "").strip()
+
+        talep_tarihi_placeholder = "../../20.."
+
+        return (
+            f'{mahkeme_adi} {dosya_tip_ve_no} sayılı dosyasından '
+            f'{talep_tarihi_placeholder} tarihli yazısı ile talep edilen, '
+            f'talebe istinaden Bilgi Teknolojileri ve İletişim Kurumu tarafından sunulan '
+            f'HTS kayıtlarını incelemek ve ilgili hususlarda bilirkişi raporunu bildirmek üzere '
+            f'bilirkişi olarak tayin edildim.'
+            f'<br><br>'
+            f'<p>İş bu raporla yukarıda belirtilen talep gereği incelemeler yapılmış olup; '
+            f'gerekli açıklamalar ilgili bölümlerdedir.</p>'
+        )
+
+    def _project_data_signature(self) -> str:
+        """
+        Otomatik bölümlerin (Genel Bilgilendirme / HTS Dosya+Abone) dayandığı
+        proje verisinin ucuz imzası. Ham tablolarda MAX(id) rowid üzerinden O(1) okunur;
+        silme işlemleri ayrıca ReportRenderCache.invalidate_project ile nesli artırır.
+        """
+        pid = self.project_id
+        parts = [pid, ReportRenderCache.project_generation(pid)]
+        try:
+            with DB() as conn:
+                parts.append(conn.execute(
+                    "SELECT * FROM hts_dosyalari WHERE ProjeID=? ORDER BY GSMNo, DosyaAdi", (pid,)
+                ).fetchall())
+                parts.append(conn.execute(
+                    "SELECT GSMNo, MinDate, MaxDate FROM hts_ozet WHERE ProjeID=? ORDER BY GSMNo", (pid,)
+                ).fetchall())
+                for t in TABLE_COLUMNS.keys():
+                    try:
+                        parts.append((t, conn.execute(f"SELECT MAX(id) FROM {t}").fetchone()))
+                    except Exception:
+                        parts.append((t, None))
+        except Exception as e:
+            # imza üretilemezse önbellek atlanır (her seferinde yeniden hesap)
+            print(f"⚠️ [_project_data_signature] {e}")
+            return ""
+        return ReportRenderCache.make_key(*parts)
+
+    def build_auto_hts_dosya_abone_details(self) -> str:
+        sig = self._project_data_signature()
+        if not sig:
+            return self._render_auto_hts_dosya_abone_details()
+        key = ReportRenderCache.make_key("auto_hts_dosya_abone", sig)
+        return ReportRenderCache.get_or_render(key, self._render_auto_hts_dosya_abone_details)
+
+    def _render_auto_hts_dosya_abone_details(self) -> str:
+        """
+        HTS DOSYA VE ABONE BİLGİLERİ altında,
+        delil çekmecesi temasıyla aynı blok görünümünde otomatik detay basar.
+        - Daha kompakt tablo
+        - MD5 / SHA-256 değerleri italik
+        - GSM başlığı + bloklar aynı sayfada kalmaya zorlanır
+        """
+        pid = self.project_id
+
+        label_map = {
+            "GSMNo": "Numara",
+            "Numara": "Numara",
+            "Durum": "Durum",
+            "Ad": "Ad",
+            "Soyad": "Soyad",
+            "Adres": "Adres",
+            "DogumTarihi": "Doğum Tarihi",
+            "DogumYeri": "Doğum Yeri",
+            "Ilce": "İlçe",
+            "Il": "İl",
+            "TCKimlikNo": "TC Kimlik No",
+            "AnneAdi": "Anne Adı",
+            "BabaAdi": "Baba Adı",
+            "AboneSorguAraligi": "Abone Sorgu Aralığı",
+            "AboneBaslangic": "Abone Başlangıç",
+            "AboneBitis": "Abone Bitiş",
+            "Operator": "Operatör",
+            "dogum_tarihi": "Doğum Tarihi",
+            "dogum_yeri": "Doğum Yeri",
+            "tc_kimlik_no": "TC Kimlik No",
+            "anne_adi": "Anne Adı",
+            "baba_adi": "Baba Adı",
+            "abone_sorgu_araligi": "Abone Sorgu Aralığı",
+            "abone_baslangic": "Abone Başlangıç",
+            "abone_bitis": "Abone Bitiş",
+            "operator": "Operatör",
+            "ilce": "İlçe",
+            "il": "İl",
+            "ad": "Ad",
+            "soyad": "Soyad",
+            "adres": "Adres",
+            "durum": "Durum",
+        }
+        abone_skip = {
+            "id", "ID", "projeid", "ProjeID", "gsmno", "GSMNo",
+            "SiraNo", "SIRA_NO", "sira_no",
+            # EKLE:
+            "Rol", "rol",
+            "DosyaAdi", "dosyaadi", "dosya_adi", "DosyaAdı"
+        }
+
+        dosya_label = {
+            "DosyaAdi": "Dosya Adı",
+            "DosyaBoyutu": "Boyut",
+            "TalepEdenMakam": "Talep Eden Makam",
+            "SorguBaslangic": "Sorgu Başlangıç",
+            "SorguBitis": "Sorgu Bitiş",
+            "Tespit": "Tespit",
+            "YuklemeTarihi": "Yükleme",
+            "MD5": "MD5",
+            "SHA256": "SHA-256",
+        }
+
+        def meta_table(rows):
+            """
+            rows: [(label, value), ...]
+            MD5/SHA değerlerini italik basar.
+            Font ve punto CSS'ten (table_head/table_body) gelir.
+            """
+            out = []
+            out.append("<table class='meta-table' style='table-layout:fixed; width:100%;'>")
+            out.append("<colgroup><col style='width:30%;'><col style='width:70%;'></colgroup>")
+            out.append("<tr><th>ÖZELLİK</th><th>DEĞER</th></tr>")
+            for k, v in rows:
+                key_txt = html.escape(str(k))
+                val_txt = html.escape(str(v or ""))
+
+                if str(k).upper() in ("MD5", "SHA256", "SHA-256", "SHA_256"):
+                    val_txt = f"<i>{val_txt}</i>"
+
+                out.append(
+                    "<tr>"
+                    f"<td class='key'>{key_txt}</td>"
+                    f"<td>{val_txt}</td>"
+                    "</tr>"
+                )
+            out.append("</table>")
+            return "\n".join(out)
+
+        html_parts = []
+
+        with DB() as conn:
+            gsms = []
+            try:
+                rows = conn.execute(
+                    "SELECT DISTINCT GSMNo FROM hts_dosyalari WHERE ProjeID=? ORDER BY GSMNo",
+                    (pid,)
+                ).fetchall()
+                gsms += [r[0] for r in rows if r and r[0]]
+            except Exception:
+                pass
+            try:
+                rows = conn.execute(
+                    "SELECT DISTINCT GSMNo FROM hts_ozet WHERE ProjeID=? ORDER BY GSMNo",
+                    (pid,)
+                ).fetchall()
+                gsms += [r[0] for r in rows if r and r[0]]
+            except Exception:
+                pass
+            seen = set()
+            gsms = [g for g in gsms if not (g in seen or seen.add(g))]
+
+            dosya_cols = []
+            try:
+                dosya_cols = [r[1] for r in conn.execute("PRAGMA table_info(hts_dosyalari)").fetchall()]
+            except Exception:
+                dosya_cols = []
+
+            def col_exists(c): return c in dosya_cols
+
+            select_cols = ["Rol", "DosyaAdi", "DosyaBoyutu", "TalepEdenMakam", "SorguBaslangic", "SorguBitis"]
+            if col_exists("Tespit"): select_cols.append("Tespit")
+            if col_exists("YuklemeTarihi"): select_cols.append("YuklemeTarihi")
+            if col_exists("MD5"): select_cols.append("MD5")
+            if col_exists("SHA256"): select_cols.append("SHA256")
+
+            for gsm in gsms:
+                gsm_esc = html.escape(gsm)
+
+                section_buf = []
+                section_buf.append(
+                    f"<h3 style='margin:0 0 2mm 0; text-decoration:underline; text-underline-offset:0.8mm; font-size:13pt; font-weight:700;'> "
+                    f"GSM Hattı: {gsm_esc}</h3>"
+                )
+
+                file_rows = []
+                try:
+                    col_sql = ", ".join(select_cols)
+                    file_rows = conn.execute(
+                        f"SELECT {col_sql} FROM hts_dosyalari "
+                        "WHERE ProjeID=? AND GSMNo=? ORDER BY id",
+                        (pid, gsm)
+                    ).fetchall()
+                except Exception:
+                    file_rows = []
+
+                if file_rows:
+                    grouped = {}
+                    for row in file_rows:
+                        rol = (row[0] or "").strip().upper() or "DIGER"
+                        grouped.setdefault(rol, []).append(row)
+
+                    rol_order = ["HEDEF", "KARSI", "KARŞI", "DIGER"]
+                    def rk(r):
+                        try: return rol_order.index(r)
+                        except ValueError: return 99
+
+                    for rol in sorted(grouped.keys(), key=rk):
+                        rol_title = "HEDEF HTS DOSYASI" if rol == "HEDEF" else \
+                                    "KARŞI HTS DOSYASI" if rol in ("KARSI", "KARŞI") else \
+                                    f"{rol} HTS DOSYASI"
+
+                        for idx_f, row in enumerate(grouped[rol], start=1):
+                            kv_rows = []
+                            for i, col in enumerate(select_cols[1:], start=1):
+                                val = row[i] if i < len(row) else ""
+                                if col.lower() == "dosyaboyutu" and val not in (None, ""):
+                                    try:
+                                        b = int(val)
+                                        if b >= 1024*1024:
+                                            val = f"{round(b/(1024*1024),2)} MB"
+                                        elif b >= 1024:
+                                            val = f"{round(b/1024,2)} KB"
+                                        else:
+                                            val = f"{b} B"
+                                    except Exception:
+                                        pass
+                                kv_rows.append((dosya_label.get(col, col), val))
+
+                            inner = meta_table(kv_rows)
+                            title = rol_title if len(grouped[rol]) == 1 else f"{rol_title} ({idx_f})"
+                            section_buf.append(self._wrap_as_block(title, inner, 100))
+                else:
+                    section_buf.append(self._wrap_as_block(
+                        "Dosya Bilgileri",
+                        "<p><i>Bu GSM hattı için kayıtlı dosya bilgisi bulunamadı.</i></p>"
+                    ))
+
+                abone_dict = {}
+                try:
+                    abone_cols = [r[1] for r in conn.execute("PRAGMA table_info(hts_abone)").fetchall()]
+                    row = conn.execute(
+                        "SELECT * FROM hts_abone WHERE ProjeID=? AND GSMNo=? LIMIT 1",
+                        (pid, gsm)
+                    ).fetchone()
+                    if abone_cols and row:
+                        abone_dict = {abone_cols[i]: row[i] for i in range(min(len(abone_cols), len(row)))}
+                except Exception:
+                    abone_dict = {}
+
+                if abone_dict:
+                    kv_rows = []
+                    for k, v in abone_dict.items():
+                        if (k or "") in abone_skip:
+                            continue
+                        label = label_map.get(k, k)
+                        kv_rows.append((label, v))
+                    inner = meta_table(kv_rows) if kv_rows else "<p><i>Abone bilgisi bulunamadı.</i></p>"
+                    section_buf.append(self._wrap_as_block("ABONE BİLGİLERİ", inner, 100))
+                else:
+                    section_buf.append(self._wrap_as_block(
+                        "ABONE BİLGİLERİ",
+                        "<p><i>Bu GSM hattı için abone bilgisi bulunamadı.</i></p>"
+                    ))
+
+                html_parts.append("<div class='gsm-section'>")
+                html_parts.append("\n".join(section_buf))
+                html_parts.append("</div><br>")
+
+        return "\n".join(html_parts)
+
+    def build_default_genel_bilgi(self) -> str:
+        sig = self._project_data_signature()
+        if not sig:
+            return self._render_default_genel_bilgi()
+        key = ReportRenderCache.make_key("default_genel_bilgi", sig)
+        return ReportRenderCache.get_or_render(key, self._render_default_genel_bilgi)
+
+    def _render_default_genel_bilgi(self) -> str:
+        """
+        Rapor Merkezi "Genel Bilgilendirme" metni.
+        HEDEF/KARSI ayrımı: ham kayıtlarda Rol + DosyaAdi tutuluyorsa doğru sayım yapılır.
+        """
+        pid = self.project_id
+        all_totals: list[int] = []
+
+        def fmt_int(v):
+            try:
+                return f"{int(v):,}".replace(",", ".")
+            except Exception:
+                return str(v or "0")
+
+        def _table_count(cur, table: str, pid_: int, gsm_: str, rol_: str, dosya_adi_: str) -> int:
+            """
+            Önce Rol+DosyaAdi ile dener.
+            Eski DB'lerde Rol/DosyaAdi kolonu yoksa fallback: sadece ProjeID+GSMNo sayar (ayırt edemez).
+            """
+            # 1) Rol + DosyaAdi
+            try:
+                row = cur.execute(
+                    f"SELECT COUNT(*) FROM {table} WHERE ProjeID=? AND GSMNo=? AND Rol=? AND DosyaAdi=?",
+                    (pid_, gsm_, rol_, dosya_adi_)
+                ).fetchone()
+                return int(row[0] or 0) if row else 0
+            except Exception:
+                pass
+
+            # 2) Rol
+            try:
+                row = cur.execute(
+                    f"SELECT COUNT(*) FROM {table} WHERE ProjeID=? AND GSMNo=? AND Rol=?",
+                    (pid_, gsm_, rol_)
+                ).fetchone()
+                return int(row[0] or 0) if row else 0
+            except Exception:
+                pass
+
+            # 3) Fallback (ayırt edemez)
+            try:
+                row = cur.execute(
+                    f"SELECT COUNT(*) FROM {table} WHERE ProjeID=? AND GSMNo=?",
+                    (pid_, gsm_)
+                ).fetchone()
+                return int(row[0] or 0) if row else 0
+            except Exception:
+                return 0
+
+        def line(css_class: str, indent_level: int, bullet: str, html_text: str) -> str:
+            """
+            Qt tarafı mm'yi stabil uygulamadığı için px kullanıyoruz.
+            indent_level eski kodda mm gibi düşünülüyordu.
+            1mm ≈ 3.78px -> pratikte 4px çarpanı yeterli ve stabil.
+            """
+            b = html.escape(str(bullet or ""))
+            px = int(round(int(indent_level) * 4))  # mm -> px yaklaşık dönüşüm
+
+            return (
+                f"<div class='gb-line {html.escape(css_class)}' style='margin-left:{px}px;'>"
+                f"<span class='gb-bullet'>{b}</span>"
+                f"<span class='gb-text'>{html_text}</span>"
+                f"</div>"
+            )
+
+        with DB() as conn:
+            cur = conn.cursor()
+
+            gsm_rows = cur.execute(
+                "SELECT DISTINCT GSMNo FROM hts_dosyalari WHERE ProjeID=? ORDER BY GSMNo",
+                (pid,)
+            ).fetchall()
+            gsms = [r[0] for r in gsm_rows if r and r[0]]
+
+            out = []
+            out.append("<div class='gb-block'>")
+
+            out.append(line("gb-intro", 0, "", "Bilgi Teknolojileri ve İletişim Kurumu tarafından gönderilen yazı ekinde,"))
+            out.append("<br>")
+
+            for gsm in gsms:
+                file_rows = cur.execute(
+                    "SELECT Rol, DosyaAdi FROM hts_dosyalari WHERE ProjeID=? AND GSMNo=?",
+                    (pid, gsm)
+                ).fetchall()
+
+                hedef_files = [r[1] for r in file_rows if r and (r[0] == "HEDEF") and r[1]]
+                karsi_files = [r[1] for r in file_rows if r and (r[0] == "KARSI") and r[1]]
+
+                # (sende tek dosya varsayımı vardı; aynen korudum)
+                hedef_file = hedef_files[0] if hedef_files else None
+                karsi_file = karsi_files[0] if karsi_files else None
+
+                # GSM satırı
+                out.append(line(
+                    "gb-gsm", 0, "•",
+                    f'<b>"{html.escape(gsm)}"</b> GSM numaralı hatta ait olduğu belirtilen,'
+                ))
+
+                def get_counts(rol, dosya):
+                    if not dosya:
+                        return None
+                    gsm_c = _table_count(cur, "hts_gsm", pid, gsm, rol, dosya)
+                    sms_c = _table_count(cur, "hts_sms", pid, gsm, rol, dosya)
+                    gprs_c = _table_count(cur, "hts_gprs", pid, gsm, rol, dosya)
+                    wap_c = _table_count(cur, "hts_wap", pid, gsm, rol, dosya)
+                    sth_c = _table_count(cur, "hts_sth", pid, gsm, rol, dosya)
+                    ulus_c = _table_count(cur, "hts_uluslararasi", pid, gsm, rol, dosya)
+                    sabit_c = _table_count(cur, "hts_sabit", pid, gsm, rol, dosya)
+
+                    internet_c = int(gprs_c or 0) + int(wap_c or 0)
+                    total = int(gsm_c or 0) + int(sms_c or 0) + int(internet_c or 0) + int(sth_c or 0) + int(ulus_c or 0) + int(sabit_c or 0)
+
+                    return {
+                        "gsm": gsm_c,
+                        "sms": sms_c,
+                        "internet": internet_c,
+                        "sth": sth_c,
+                        "ulus": ulus_c,
+                        "sabit": sabit_c,
+                        "total": total
+                    }
+
+                hedef_counts = get_counts("HEDEF", hedef_file) if hedef_file else None
+                karsi_counts = get_counts("KARSI", karsi_file) if karsi_file else None
+
+                hedef_total = int(hedef_counts["total"]) if hedef_counts else 0
+                karsi_total = int(karsi_counts["total"]) if karsi_counts else 0
+
+                if hedef_file and karsi_file and hedef_total == 0 and karsi_total == 0:
+                    out.append(line(
+                        "gb-file", 6, "○",
+                        f'<b>"{html.escape(hedef_file)}"</b>, <b>"{html.escape(karsi_file)}"</b> isimli dosyalar içerisinde kayıt bulunamamıştır.'
+                    ))
+                    out.append("<br>")
+                    continue
+
+                def emit_file_block(file_name: str, counts: dict | None):
+                    if not file_name:
+                        return
+                    total = int((counts or {}).get("total", 0) or 0)
+                    all_totals.append(total)
+
+                    if total == 0:
+                        out.append(line(
+                            "gb-file", 12, "○",
+                            f'<b>"{html.escape(file_name)}"</b> isimli dosya içerisinde kayıt bulunamamıştır.'
+                        ))
+                        return
+
+                    # dosya satırı
+                    out.append(line(
+                        "gb-file", 6, "○",
+                        f'<b>"{html.escape(file_name)}"</b> isimli dosya içerisinde,'
+                    ))
+
+                    def add_stat(key, label):
+                        val = int((counts or {}).get(key, 0) or 0)
+                        if val > 0:
+                            out.append(line("gb-stat", 24, "▪", f'"{fmt_int(val)}" adet {label}'))
+
+                    add_stat("gsm", "GSM görüşme")
+                    add_stat("sms", "SMS gönderme")
+                    add_stat("internet", "İnternet bağlantısı")
+                    add_stat("sth", "STH görüşmesi")
+                    add_stat("ulus", "Uluslararası görüşme")
+                    add_stat("sabit", "Sabit Hat görüşmesi")
+
+                    out.append(line(
+                        "gb-total", 0, "",
+                        f'olmak üzere toplamda "<b>{fmt_int(total)}</b>" kayıt olduğu görülmüştür.'
+                    ))
+
+                # HEDEF
+                emit_file_block(hedef_file, hedef_counts)
+
+                # KARSI (varsa)
+                emit_file_block(karsi_file, karsi_counts)
+
+                out.append("<br>")
+
+            grand_total = sum(all_totals) if all_totals else 0
+            out.append(
+                line(
+                    "gb-grand-total",
+                    0,
+                    "",
+                    f'Bu haliyle toplam "<b>{fmt_int(grand_total)}</b>" kayıt incelenerek rapora devam olunmuştur.'
+                )
+            )
+            out.append("<br>")
+
+            out.append("</div>")
+            return "\n".join(out)
+
+    def _file_uri(self, path: str) -> str:
+        """Windows/local path -> file:/// URI"""
+        if not path:
+            return ""
+        p = path.replace("\\", "/")
+        if re.match(r"^[A-Za-z]:/", p):
+            return "file:///" + p
+        return p
+    @staticmethod
+    def _title_drops_empty_cols(title: str) -> bool:
+        """
+        GSM / Internet / MutualContactsMatchDialog başlıklı tablolarda
+        boş başlıklı kolonlar rapordan atılır.
+        """
+        t = (title or "").strip().casefold()
+        t = (t.replace("ı", "i").replace("İ", "i")
+              .replace("ş", "s").replace("ğ", "g").replace("ç", "c")
+              .replace("ö", "o").replace("ü", "u"))
+        t = " ".join(t.split())
+        return ("gsm" in t) or ("internet" in t) or ("mutualcontactsmatchdialog" in t) or ("mutual contacts" in t)
+
+    def _postprocess_report_tables(self, html_content: str, title: str) -> str:
+        """
+        - Chromium PDF'de tablo bölünmelerini azaltmak için THEAD'i garanti eder
+        - Delil başlığına göre istenmeyen sütunları kaldırır
+        - Sütunları daraltan colgroup/width enjekte etmez (auto layout)
+        - Sadece çok uzun tek-parça değerlerde (IMEI/ID/IP/URL) kırılmayı açar
+        """
+
+        if title and any(k in title.upper() for k in [
+            "HEDEF HTS",
+            "KARŞI HTS",
+            "ABONE BİLGİLERİ"
+        ]):
+            try:
+                soup = BeautifulSoup(html, "html.parser")
+
+                table = soup.find("table")
+                if table:
+                    thead = table.find("thead")
+                    tbody = table.find("tbody")
+
+                    if thead and tbody:
+                        ths = thead.find_all("th")
+                        oz_idx = None
+                        for i, th in enumerate(ths):
+                            if "ÖZELLİK" in th.get_text().upper():
+                                oz_idx = i
+                                break
+
+                        if oz_idx is not None:
+                            for tr in tbody.find_all("tr"):
+                                tds = tr.find_all("td")
+                                if len(tds) > oz_idx:
+                                    tds[oz_idx]["style"] = (
+                                        tds[oz_idx].get("style", "")
+                                        + " font-weight:700 !important;"
+                                    )
+
+                html_content = str(soup)
+            except Exception:
+                pass
+        try:
+            from bs4 import BeautifulSoup
+        except Exception:
+            return html_content
+
+        def tr_norm(s: str) -> str:
+            s = (s or "").strip()
+            s = s.casefold()
+            # Türkçe karakterleri sadeleştir (eşleşme kaçmasın)
+            s = (s.replace("ı", "i").replace("İ", "i")
+                   .replace("ş", "s").replace("ğ", "g").replace("ç", "c")
+                   .replace("ö", "o").replace("ü", "u"))
+            s = " ".join(s.split())
+            return s
+
+        soup = BeautifulSoup(html_content, "html.parser")
+
+        # başlığa göre boş başlıklı kolonlar atılır (yapısal tablo render'ı da aynı kuralı kullanır)
+        hide_cols = self._title_drops_empty_cols(title)
+
+        for table in soup.find_all("table"):
+            # varsa önceki colgroup'ları sök (daraltmayı bitir)
+            cg = table.find("colgroup")
+            if cg:
+                cg.decompose()
+
+            # sınıf ekle
+            existing_cls = table.get("class", [])
+            if "report-table" not in existing_cls:
+                table["class"] = existing_cls + ["report-table"]
+
+            # THEAD yoksa: ilk tr'deki th'leri THEAD'e al
+            thead = table.find("thead")
+            if not thead:
+                first_tr = table.find("tr")
+                if first_tr and first_tr.find("th"):
+                    thead = soup.new_tag("thead")
+                    tr_new = soup.new_tag("tr")
+                    for th in first_tr.find_all("th", recursive=False):
+                        tr_new.append(th.extract())
+                    thead.append(tr_new)
+                    table.insert(0, thead)
+
+            # Başlık hücrelerinden index bul
+            header_tr = table.find("thead").find("tr") if table.find("thead") else None
+            headers = header_tr.find_all(["th", "td"], recursive=False) if header_tr else []
+            header_names = [tr_norm(h.get_text(" ", strip=True)) for h in headers]
+
+            drop_idx = set()
+            if hide_cols and header_names:
+                for i, hn in enumerate(header_names):
+                    if not hn:  # "" ise
+                        drop_idx.add(i)
+
+            # İstenen kolonları kaldır
+            if drop_idx:
+                # header
+                if header_tr:
+                    for i in sorted(drop_idx, reverse=True):
+                        cells = header_tr.find_all(["th", "td"], recursive=False)
+                        if i < len(cells):
+                            cells[i].decompose()
+
+                # body rows
+                for tr in table.find_all("tr"):
+                    tds = tr.find_all(["td", "th"], recursive=False)
+                    for i in sorted(drop_idx, reverse=True):
+                        if i < len(tds):
+                            tds[i].decompose()
+
+            # Çok uzun tek parça token kırılabilsin (geri kalan kelimeler bölünmesin)
+            for td in table.find_all("td"):
+                text = td.get_text(" ", strip=True) or ""
+                # en uzun “boşluksuz” parça
+                max_token = max((len(x) for x in text.split()), default=0)
+                if max_token >= 26:
+                    cls = td.get("class", [])
+                    if "cell-break-anywhere" not in cls:
+                        td["class"] = cls + ["cell-break-anywhere"]
+
+        return str(soup)
+
+    def _render_block_content(self, tur, btitle, content, hidden_json, fmt_json, tbl_json=None) -> str:
+        """
+        TABLE/HTML delil içeriğini (gizli kolon + format + tablo postprocess) render eder.
+        Sonuç içerik hash'i ile önbelleğe alınır; açıklama/sıra değişikliği yeniden render ettirmez.
+        TABLE için yapısal form (TabloJson) varsa HTML hiç parse edilmez.
+        """
+        tbl = table_struct_loads(tbl_json) if tur == "TABLE" else None
+        key = ReportRenderCache.make_key(
+            "block", tur, btitle, (tbl_json if tbl else content), hidden_json, fmt_json
+        )
+
+        def _render_struct():
+            try:
+                hidden_list = json.loads(hidden_json) if hidden_json else []
+                if not isinstance(hidden_list, list):
+                    hidden_list = []
+            except Exception:
+                hidden_list = []
+            return render_table_html(
+                tbl, hidden_list, fmt_json,
+                report=True,
+                drop_empty_headers=self._title_drops_empty_cols(btitle)
+            )
+
+        def _render():
+            out = content
+            try:
+                # hidden list
+                hidden_list = []
+                if hidden_json:
+                    hidden_list = json.loads(hidden_json) if isinstance(hidden_json, str) else (hidden_json or [])
+
+                # fmt dict
+                fmt = {}
+                if fmt_json:
+                    fmt = json.loads(fmt_json) if isinstance(fmt_json, str) else (fmt_json or {})
+
+                # ✅ sadece TABLE için uygula
+                if tur == "TABLE":
+                    if hidden_list:
+                        out = _apply_hidden_cols_to_table_html(out, hidden_list)
+                    if isinstance(fmt, dict) and fmt:
+                        out = _apply_fmt_to_table_html(out, fmt)
+
+            except Exception:
+                pass
+
+            if hasattr(self, "_postprocess_report_tables"):
+                out = self._postprocess_report_tables(out, btitle)
+            return out
+
+        return ReportRenderCache.get_or_render(key, _render_struct if tbl else _render)
+
+    @Tracer.traced("report.build_html")
+    def build_html(self, disabled_sections=None) -> str:
+        """
+        SQL Ayarlı ve Güvenli HTML Oluşturucu
+        - Tüm metinler Segoe UI
+        - Görevlendirme / Dosya Hakkında / HTS Dosya+Abone / Değerlendirme / Sonuç: iki yana yaslı
+        - Otomatik üretilen tablolar justify içine sokulmaz (HTML bozulmasını engeller)
+        - Kapak watermark HTML ile basılmaz, PDF post-process ile basılır
+        """
+        # ✅ disabled_sections her durumda set olsun (işlev aynı)
+        disabled_sections = set(disabled_sections or [])
+        self._ensure_meta_row()
+
+        s = StyleConfig.load()
+        if not isinstance(s, dict):
+            s = StyleConfig.DEFAULTS.copy()
+
+        margins = s.get("margins", StyleConfig.DEFAULTS["margins"])
+
+        def css_gen(key: str) -> str:
+            val = s.get(key)
+            if not isinstance(val, dict):
+                return ""
+            css = f"font-size: {val.get('size', 11)}pt !important;"
+            if val.get("bold"):
+                css += " font-weight: bold !important;"
+            if val.get("italic"):
+                css += " font-style: italic !important;"
+            if val.get("under"):
+                css += " text-decoration: underline !important;"
+            return css
+
+        body_cfg = s.get('body', {})
+        if not isinstance(body_cfg, dict):
+            body_cfg = {}
+
+        justify_size = body_cfg.get('size', 12)
+        justify_bold = "bold" if body_cfg.get('bold') else "normal"
+        justify_italic = "italic" if body_cfg.get('italic') else "normal"
+        justify_under = "underline" if body_cfg.get('under') else "none"
+
+        p, parties = self._fetch_project_info()
+        meta = self._fetch_meta()
+        blocks = self._fetch_blocks()
+
+        (birim, tip, dosya_no, suc, suc_t, gorev_t, bilirkisi_adi, bilirkisi_unvan) = p or ("", "", "", "", "", "", "", "")
+        dosya_numarasi = f"{dosya_no} {tip}".strip()
+
+        def mget(idx, default=""):
+            # ✅ sınır + tip güvenliği (işlev aynı; sadece patlamayı engeller)
+            # default callable ise sadece gerçekten gerektiğinde üretilir (lazy)
+            if not meta or idx >= len(meta) or meta[idx] is None:
+                val = default() if callable(default) else default
+            else:
+                val = meta[idx]
+
+            if not isinstance(val, str):
+                val = "" if val is None else str(val)
+
+            val = val.replace('align="left"', '').replace("align='left'", '')
+            val = val.replace('text-align:left', '').replace('text-align: left', '')
+            val = val.replace('text-align:start', '').replace('text-align: start', '')
+            val = val.replace('white-space:nowrap', '').replace('white-space: pre', '')
+            return val
+
+        gorev_metin = mget(1, self.build_default_gorevlendirme)
+
+        dosya_ekler_html = self._render_meta_ekler_html("dosya_hakkinda", "")
+        dosya_metin = (mget(2, "") or "") + (dosya_ekler_html or "")
+
+        genel_metin = mget(3, self.build_default_genel_bilgi)
+        deger_metin = mget(4, "")
+        sonuc_metin = mget(5, "")
+
+        cover_parties_rows = ""
+        if "taraflar" not in disabled_sections and parties:
+            grouped = OrderedDict()  # sıralamayı korur
+
+            for s_val, n_val in parties:
+                sifat = (s_val or "").strip()
+                adsoyad = (n_val or "").strip()
+                if not sifat or not adsoyad:
+                    continue
+                grouped.setdefault(sifat, []).append(adsoyad)
+
+            r_buf = []
+            for sifat, names in grouped.items():
+                joined = ", ".join(html.escape(x) for x in names)
+                r_buf.append(
+                    f"<tr>"
+                    f"<td class='k'>{html.escape(sifat)}</td>"
+                    f"<td class='c'>:</td>"
+                    f"<td class='v party-v'>{joined}</td>"
+                    f"</tr>"
+                )
+            cover_parties_rows = "\n".join(r_buf)
+
+        mt = margins.get("top", 25)
+        mr = margins.get("right", 20)
+        mb = margins.get("bottom", 20)
+        ml = margins.get("left", 25)
+
+        html_out = [f"""<!DOCTYPE html>
+    <html>
+    <head>
+    <meta charset="utf-8">
+    <style>
+    @page {{ size: A4; margin: {mt}mm {mr}mm {mb}mm {ml}mm; }}
+    * {{ box-sizing: border-box; }}
+
+    body {{
+        font-family: "Segoe UI", "DejaVu Sans", Arial, sans-serif;
+        color: #111;
+        {css_gen('body')}
+        width: 100% !important;
+        margin: 0 !important;
+        padding: 0 !important;
+    }}
+
+    h2 {{ margin: 6mm 0 3mm 0; {css_gen('section_title')} }}
+    .center {{ text-align:center; }}
+
+    .page-break{{
+      page-break-after: always;
+      height: 0 !important;
+      line-height: 0 !important;
+      margin: 0 !important;
+      padding: 0 !important;
+      border: 0 !important;
+    }}
+
+    .kv-table {{ width: 100%; border-collapse: collapse; margin-top: 4mm; }}
+    .kv-table td {{ padding: 1.2mm 0; vertical-align: top; {css_gen('kv_values')} }}
+    .kv-table .k {{ width: 30%; text-align: left; padding-right: 2mm; {css_gen('kv_keys')} }}
+    .kv-table .c {{ width: 2%; text-align: left; font-weight:bold; }}
+    .kv-table .v {{ width: 68%; text-align: left; }}
+
+    table {{
+        width: 100% !important;
+        border-collapse: collapse !important;
+        table-layout: auto !important;
+        border-spacing: 0;
+    }}
+
+    .party-v {{
+      text-align: justify;
+      text-align-last: left;
+      white-space: normal;
+      word-break: break-word;
+    }}
+
+    /* -------------------------------------------------------
+       ✅ TABLO STANDARDI
+       - HTS/Abone tabloları (.meta-table)
+       - Delil tabloları (.block-inner table)
+       Hepsi StyleConfig table_head + table_body ile aynı olsun
+    ------------------------------------------------------- */
+
+    /* Genel tablo hücreleri */
+    .meta-table th{{
+        white-space: nowrap !important;
+    }}
+    .block-inner th {{
+        background: #e9eef3 !important;
+        color: #111 !important;
+        text-align: center !important;
+        border: 1px solid #555 !important;
+        white-space: normal !important;
+        overflow-wrap: anywhere !important;
+        word-break: break-word !important;
+        padding: 4px !important;
+        {css_gen('table_head')}
+    }}
+
+    .meta-table td,
+    .block-inner td {{
+        border: 1px solid #555 !important;
+        padding: 3px !important;
+        color: #111 !important;
+        text-align: left !important;
+        white-space: normal !important;
+        word-break: normal !important;
+        overflow-wrap: normal !important;
+        hyphens: none !important;
+        {css_gen('table_body')}
+    }}
+
+    .meta-table td.key {{ font-weight: 700 !important; }}
+
+    /* Delil içi tablo konteyneri: hardcode font-size KALDIRILDI */
+    .block-inner table {{
+      width: 100%;
+      border-collapse: collapse;
+      table-layout: fixed !important;
+      border: 1px solid #555;
+      box-sizing: border-box;
+    }}
+
+    /* Son kolon taşmasın */
+    .block-inner th:last-child,
+    .block-inner td:last-child{{
+        white-space: normal !important;
+        overflow-wrap: anywhere !important;
+        word-break: break-word !important;
+    }}
+
+    .block-inner td.cell-break-anywhere {{
+        overflow-wrap: anywhere !important;
+    }}
+
+    @media print {{
+      thead {{ display: table-header-group; break-inside: avoid !important; }}
+      tfoot {{ display: table-footer-group; break-inside: avoid !important; }}
+      tr {{ break-inside: avoid !important; page-break-inside: avoid !important; }}
+      thead tr {{ break-after: avoid !important; page-break-after: avoid !important; }}
+      tbody tr:first-child {{ break-before: avoid !important; page-break-before: avoid !important; }}
+    }}
+
+    /* -------------------------------------------------------
+       ✅ GÖVDE METNİ STANDARDI
+       QTextEdit’in inline font-size/span stilleri bile ezilsin:
+       - Sabit metin + kullanıcı metni = body ayarları
+    ------------------------------------------------------- */
+    .justify {{
+        width: 100%;
+        text-align: justify !important;
+        white-space: normal !important;
+    }}
+
+    /* p/li ana kural */
+    .justify p,
+    .justify li {{
+        font-size: {justify_size}pt !important;
+        font-weight: {justify_bold} !important;
+        font-style: {justify_italic} !important;
+        text-decoration: {justify_under} !important;
+        color: #111 !important;
+
+        text-align: justify !important;
+        white-space: normal !important;
+
+        line-height: 1.5 !important;   /* ✅ 1,5 SATIR ARALIĞI */
+
+        text-indent: 1.25cm !important;
+
+        margin-top: 0 !important;
+        margin-bottom: 3mm !important; /* satır aralığına uygun */
+    }}
+
+    /* QTextEdit’in ürettiği span/div/font gibi inline stilleri de gövdeye kilitle */
+    .justify span,
+    .justify div,
+    .justify font {{
+        font-size: {justify_size}pt !important;
+        color: inherit !important;
+    }}
+
+    /* QTextEdit inline stilleri KORUNSUN */
+    .justify b,
+    .justify strong {{
+        font-weight: bold !important;
+    }}
+
+    .justify i,
+    .justify em {{
+        font-style: italic !important;
+    }}
+
+    .justify u {{
+        text-decoration: underline !important;
+    }}
+
+    .justify b, .justify strong {{ font-weight: bold !important; }}
+    .justify i, .justify em {{ font-style: italic !important; }}
+    .justify u {{ text-decoration: underline !important; }}
+
+    /* --- DELİL BLOKLARI --- */
+    .block {{
+        margin: 4mm auto;
+        text-indent: 0 !important;
+        page-break-inside: avoid;
+        break-inside: avoid;
+    }}
+    .block-splittable {{
+        page-break-inside: auto !important;
+        break-inside: auto !important;
+    }}
+    .block-title {{
+        margin-bottom: 1.5mm;
+        color: #2c3e50;
+        display: block;
+        width: 100%;
+        {css_gen('evidence_title')}
+        text-align: left !important;
+        text-indent: 0 !important;
+        page-break-after: avoid;
+    }}
+    .block-desc {{
+        margin-top: 1.2mm;
+        text-align: justify;
+        {css_gen('evidence_desc')}
+        text-indent: 0 !important;
+        white-space: pre-wrap !important;
+    }}
+    .block-desc-full{{
+        width: 100% !important;
+        margin: 1.6mm 0 0 0 !important;
+    }}
+    .block img {{
+        max-width: 100% !important;
+        height: auto !important;
+        display: block !important;
+        margin: 0 auto !important;
+    }}
+
+    .map-wrap{{ width:100%; text-align:center; }}
+    .block img.map-img,
+    .block img.geo-map-img {{
+        width: 100% !important;
+        height: auto !important;
+        max-height: 150mm !important;
+        object-fit: contain !important;
+        display: block !important;
+        margin: 0 auto !important;
+        border: none !important;
+        border-radius: 0 !important;
+        background: transparent !important;
+        box-shadow: none !important;
+    }}
+
+    h2 {{
+        page-break-after: avoid;
+        break-after: avoid-page;
+        page-break-inside: avoid;
+        break-inside: avoid;
+    }}
+    h2 + div, h2 + p, h2 + table, h3 + div, h3 + p, h3 + table {{
+        page-break-before: avoid;
+        break-before: avoid-page;
+    }}
+    h2, h3 {{
+        page-break-after: avoid !important;
+        break-after: avoid-page !important;
+    }}
+
+    .cover {{
+        position: relative;
+        height: calc(297mm - {mt}mm - {mb}mm);
+        background: #fff;
+        overflow: hidden;
+        display: flex;
+        flex-direction: column;
+        align-items: center;
+        justify-content: center;
+        padding-top: 0mm;
+    }}
+    .cover-content {{
+        width: 100%;
+        max-width: 100%;
+        padding: 0 6mm;
+        text-align: center;
+    }}
+    .cover-kv {{
+        width: 100%;
+        margin: 0 auto;
+        table-layout: fixed;
+        border-collapse: collapse;
+    }}
+    .cover-kv td {{
+        padding: 1.2mm 0 !important;
+        vertical-align: middle !important;
+    }}
+    .cover-kv .k {{
+        width: 52mm !important;
+        white-space: nowrap !important;
+        font-weight: 700 !important;
+    }}
+    .cover-title {{
+        {css_gen('main_title')}
+        text-align: center;
+        margin-bottom: 8mm;
+        text-decoration: underline;
+        text-underline-offset: 2mm;
+    }}
+    </style>
+    </head>
+    <body>
+    """]
+
+        # --- KAPAK ---
+        html_out.append(f"""
+        <div class="cover">
+          <div class="cover-content">
+            <div class="cover-title">BİLİRKİŞİ RAPORU</div>
+
+            <table class="kv-table cover-kv">
+              <tr><td class='k'>Birim Adı</td><td class='c'>:</td><td class='v'>{html.escape((birim or '').strip())}</td></tr>
+              <tr><td class='k'>Dosya Numarası</td><td class='c'>:</td><td class='v'>{html.escape((str(dosya_numarasi) or '').strip())}</td></tr>
+              <tr><td class='k'>Bilirkişi</td><td class='c'>:</td><td class='v'>{html.escape((bilirkisi_adi or '').strip())}</td></tr>
+              <tr><td class='k'>Ünvanı ve Sicili</td><td class='c'>:</td><td class='v'>{html.escape((bilirkisi_unvan or '').strip())}</td></tr>
+              <tr><td class='k'>Görevlendirme Tarihi</td><td class='c'>:</td><td class='v'>{html.escape((gorev_t or '').strip())}</td></tr>
+
+              <tr><td colspan="3" style="padding:4mm 0 0 0;"></td></tr>
+
+              <tr>
+                <td colspan="3" style="text-decoration: underline; text-underline-offset: 2mm; font-size: 18pt; font-weight: 800; padding:0 !important; margin:0 !important;">
+                  TARAF BİLGİLERİ
+                </td>
+              </tr>
+
+              {cover_parties_rows if cover_parties_rows else ""}
+
+              <tr><td colspan="3" style="padding:2mm 0 0 0;"></td></tr>
+
+              <tr><td class='k'>Suç</td><td class='c'>:</td><td class='v'>{html.escape((suc or '').strip())}</td></tr>
+              <tr><td class='k'>Suç Tarihi</td><td class='c'>:</td><td class='v'>{html.escape((suc_t or '').strip())}</td></tr>
+            </table>
+
+          </div>
+        </div>
+        <div class="page-break"></div>
+        """)
+
+        section_no = 1
+
+        if "gorev" not in disabled_sections:
+            html_out.append(f"<h2>{section_no}. GÖREVLENDİRME</h2><div class='justify'>{gorev_metin}</div>")
+            section_no += 1
+
+        if "dosya" not in disabled_sections:
+            html_out.append(f"<h2>{section_no}. DOSYA HAKKINDA</h2><div class='justify'>{dosya_metin}</div>")
+            section_no += 1
+
+        if "genel" not in disabled_sections:
+            auto = self.build_auto_hts_dosya_abone_details()
+            if isinstance(auto, str) and "GSM Hattı:" in auto:
+                auto = re.sub(
+                    r"(<h3[^>]*>\s*GSM\s*Hattı:\s*[^<]+</h3>)",
+                    r"<div class='keep-with-next'>\1",
+                    auto,
+                    count=1
+                )
+                auto = auto.replace("<div class='block", "</div><div class='block", 1)
+
+            html_out.append(f"<h2>{section_no}. HTS DOSYA VE ABONE BİLGİLERİ</h2>")
+            html_out.append(f"<div class='justify'>{genel_metin}</div>")
+            html_out.append(auto)
+            section_no += 1
+
+        # ✅ DELİLLER BURAYA ALINDI (4. BÖLÜM)
+        if "deliller" not in disabled_sections:
+            html_out.append(f"<h2>{section_no}. DELİLLER</h2>")
+
+            # GorselID -> depo yolu (tek bağlantı; yol önbelleklidir)
+            store_paths = {}
+            store_kinds = {}
+            gids = [b[13] for b in (blocks or []) if b[13]]
+            if gids:
+                try:
+                    with DB() as conn:
+                        store_paths = {g: EvidenceStore.path_for_id(conn, g) for g in gids}
+                        store_kinds = {g: EvidenceStore.kind_for_id(conn, g) for g in gids}
+                except Exception as e:
+                    print(f"⚠️ [build_html] delil deposu okunamadı: {e}")
+
+            for idx, (bid, sira, baslik, tur, gen, acik, htm, base_html, hidden_json, fmt_json, img, raw, tbl_json, gorsel_id) in enumerate(blocks or []):
+                row_char = chr(97 + idx)
+                unique_html_id = f"evidence-{bid}"
+
+                w = int(gen or 100)
+                btitle = baslik or tur or "Delil"
+                src_probe = (img or raw or "")
+
+                block_cls = "block"
+                if tur in ("HTML", "TABLE"):
+                    block_cls = "block block-splittable"
+
+                html_out.append(f"<div id='{unique_html_id}' class='{block_cls}'>")
+                html_out.append(f"<div class='block-title'>{row_char}. {html.escape(btitle)}</div>")
+
+                # ✅ sadece içerik (resim/tablo/html) width ile hareket edecek
+                html_out.append(f"<div class='block-inner' style='width:{w}%; margin:0 auto;'>")
+
+                if tur == "IMAGE":
+                    store_path = store_paths.get(gorsel_id)
+                    if store_path and os.path.exists(store_path):
+                        img = store_path
+                    src = img or raw
+                    if src:
+                        if not src.startswith("data:") and not src.startswith("http"):
+                            src = self._file_uri(src)
+
+                        # tür depodaki kayıttan; depo dışı (eski evidence_images) görsellerde dosya adından
+                        kind = store_kinds.get(gorsel_id) if store_path else None
+                        if kind:
+                            is_event_map = kind == "event_map"
+                            is_geo_map = kind == "geo_map"
+                        else:
+                            is_event_map = ("event_map_" in (img or "") or "event_map_" in (raw or ""))
+                            is_geo_map = ("geo_map_" in (img or "") or "geo_map_" in (raw or ""))
+                        is_map = is_event_map or is_geo_map
+
+                        if is_geo_map:
+                            cls = "block-img geo-map-img"
+                        elif is_event_map:
+                            cls = "block-img map-img"
+                        else:
+                            cls = "block-img"
+
+                        if is_map:
+                            html_out.append("<div class='map-wrap'>")
+                            html_out.append(f"<img class='{cls}' src='{src}'>")
+                            html_out.append("</div>")
+                        else:
+                            html_out.append(f"<img class='{cls}' src='{src}'>")
+
+                elif tur in ("HTML", "TABLE"):
+                    # ✅ her zaman tam tabloyu kaynak al ki hem gizleme hem geri getirme çalışsın
+                    content = (base_html or htm or raw)
+
+                    if content or tbl_json:
+                        html_out.append(self._render_block_content(tur, btitle, content, hidden_json, fmt_json, tbl_json))
+
+                html_out.append("</div>")  # ✅ block-inner kapanır (açıklama artık etkilenmez)
+
+                # ✅ AÇIKLAMA FULL-WIDTH: resimle birlikte daralıp genişlemez
+                if acik:
+                    html_out.append(f"<div class='block-desc block-desc-full'>{acik}</div>")
+
+                html_out.append("</div>")  # block
+
+            section_no += 1
+
+        # ✅ DEĞERLENDİRME 5
+        if "deg" not in disabled_sections:
+            html_out.append(f"<h2>{section_no}. DEĞERLENDİRME</h2><div class='justify'>{deger_metin}</div>")
+            section_no += 1
+
+        # ✅ SONUÇ 6
+        if "sonuc" not in disabled_sections:
+            html_out.append(f"<h2>{section_no}. SONUÇ</h2><div class='justify'>{sonuc_metin}</div>")
+            section_no += 1
+        html_out.append("</body></html>")
+        html_doc = "\n".join(html_out)
+
+        # ✅ tablo hücrelerindeki ikon referansları (hts-evidence://id) -> dosya yolu
+        if EvidenceStore.REF_SCHEME in html_doc:
+            try:
+                with DB() as conn:
+                    html_doc = EvidenceStore.resolve_refs(conn, html_doc, self._file_uri)
+            except Exception as e:
+                print(f"⚠️ [build_html] delil referansları çözülemedi: {e}")
+        return html_doc
+
+
+class PDFExporter:
+
+    @staticmethod
+    @Tracer.traced("report.export_pdf")
+    def export_pdf(
+        html_string: str,
+        out_path: str,
+        margin_top_mm: int = 20,
+        margin_right_mm: int = 20,
+        margin_bottom_mm: int = 20,
+        margin_left_mm: int = 20,
+        zoom: float = 0.96,
+        footer_font_size: int = 10,
+        footer_right_text: str = "",
+        # ÇERÇEVE
+        draw_frame: bool = True,
+        frame_inset_mm: float = 8.0,
+        frame_radius_pt: float = 8.0,
+        frame_stroke_rgb=(0.90, 0.90, 0.90),
+        frame_line_width: float = 1.3,
+        # KAPAK WATERMARK
+        draw_cover_watermark: bool = True,
+        cover_watermark_size_mm: float = 210.0,
+        cover_watermark_opacity: float = 0.10,
+        cover_watermark_blur_px: float = 2.2,
+        # DAMGA (kapak hariç sol üst)
+        draw_stamp: bool = True,
+        stamp_size_mm: float = 20.0,          # büyüttük (12 -> 14)
+        stamp_opacity: float = 0.18,
+        stamp_offset_mm: float = 1.5,         # çerçeveye daha yakın (yazıya değmesin diye kontrol bizde)
+        **_ignored_kwargs,
+    ):
+        import os, io, tempfile, shutil
+
+        status_cb = _ignored_kwargs.pop("status_cb", None)      # callable(str)
+        progress_cb = _ignored_kwargs.pop("progress_cb", None)  # callable(int) 0-100
+        idle_cb = _ignored_kwargs.pop("idle_cb", None)          # callable() render beklerken (GUI)
+
+        def _status(msg: str):
+            try:
+                if callable(status_cb):
+                    status_cb(str(msg))
+            except Exception:
+                pass
+
+        def _progress(pct: int):
+            try:
+                if callable(progress_cb):
+                    progress_cb(int(pct))
+            except Exception:
+                pass
+
+        try:
+            out_path = os.path.abspath(out_path)
+            out_dir = os.path.dirname(out_path)
+            os.makedirs(out_dir, exist_ok=True)
+
+            # PDF açık/kitli mi?
+            if os.path.exists(out_path):
+                lock_test = out_path + ".~locktest"
+                try:
+                    os.replace(out_path, lock_test)
+                    os.replace(lock_test, out_path)
+                except Exception:
+                    raise RuntimeError(
+                        "PDF dosyası şu anda AÇIK veya KİLİTLİ görünüyor.\n\n"
+                        "Lütfen PDF'i kapatın ve tekrar deneyin."
+                    )
+
+            app_dir = APP_DIR
+            logo_path = os.path.join(app_dir, "assets", "logo.png")
+            if not os.path.exists(logo_path):
+                logo_path = ""
+
+            tmp_pdf_path = out_path + ".tmp.pdf"
+
+            # ========== 1) CHROMIUM (Playwright) ile PDF render ==========
+            _status("PDF oluşturuluyor... (Chromium render)")
+            _progress(5)
+
+            try:
+                from playwright.sync_api import sync_playwright
+            except Exception as e:
+                raise RuntimeError(
+                    "Chromium PDF motoru için Playwright gerekli.\n"
+                    "Kurulum:\n"
+                    "  pip install playwright\n"
+                    "  playwright install chromium\n\n"
+                    f"Detay: {e}"
+                )
+
+            with tempfile.TemporaryDirectory() as td:
+                html_path = os.path.join(td, "report.html")
+                with open(html_path, "w", encoding="utf-8") as f:
+                    f.write(html_string)
+                _progress(15)
+
+                file_url = "file:///" + os.path.abspath(html_path).replace("\\", "/")
+
+                pdf_options = {
+                    "format": "A4",
+                    "print_background": True,
+                    "scale": float(zoom),
+                    "margin": {
+                        "top": f"{int(margin_top_mm)}mm",
+                        "right": f"{int(margin_right_mm)}mm",
+                        "bottom": f"{int(margin_bottom_mm)}mm",
+                        "left": f"{int(margin_left_mm)}mm",
+                    },
+                }
+
+                def _render_progress(pct: int, msg: str):
+                    if msg:
+                        _status(msg)
+                    _progress(15 + int(max(0, min(100, pct)) * 0.5))
+
+                # ✅ Sıcak render servisi (ayrı process, tarayıcı açık tutulur)
+                try:
+                    ChromiumRenderService.render_pdf(
+                        html_path, tmp_pdf_path, pdf_options,
+                        progress_cb=_render_progress,
+                        idle_cb=idle_cb,
+                    )
+                except RenderServiceUnavailable as e:
+                    # servis yoksa eski yol: bu process içinde tek seferlik Chromium
+                    print(f"⚠️ [PDFExporter] Render servisi kullanılamadı, in-process render: {e}")
+                    with sync_playwright() as p:
+                        browser = p.chromium.launch()
+                        page = browser.new_page()
+                        page.goto(file_url, wait_until="networkidle")
+                        _progress(35)
+
+                        page.pdf(path=tmp_pdf_path, **pdf_options)
+                        browser.close()
+
+                _status("PDF düzenleniyor... (overlay/çerçeve/damga)")
+                _progress(65)
+
+                # ========== 2) POST-PROCESS OVERLAY ==========
+                try:
+                    from reportlab.pdfbase import pdfmetrics
+                    from reportlab.pdfbase.ttfonts import TTFont
+
+                    mm_to_pt = 2.83464567
+                    inset_pt = float(frame_inset_mm) * mm_to_pt
+                    wm_size_pt = float(cover_watermark_size_mm) * mm_to_pt
+                    stamp_size_pt = float(stamp_size_mm) * mm_to_pt
+                    stamp_pad_pt = float(stamp_offset_mm) * mm_to_pt
+
+                    # Footer font: Segoe UI varsa yakala (yoksa Helvetica)
+                    footer_font_name = "Helvetica"
+                    font_candidates = [
+                        os.path.join(app_dir, "assets", "fonts", "segoeui.ttf"),
+                        os.path.join(app_dir, "assets", "fonts", "SegoeUI.ttf"),
+                        os.path.join(app_dir, "assets", "segoeui.ttf"),
+                        os.path.join(app_dir, "assets", "SegoeUI.ttf"),
+                        os.path.join(app_dir, "assets", "fonts", "DejaVuSans.ttf"),
+                        os.path.join(app_dir, "assets", "DejaVuSans.ttf"),
+                    ]
+                    for fp in font_candidates:
+                        if os.path.exists(fp):
+                            try:
+                                if "HTSReportFont" not in pdfmetrics.getRegisteredFontNames():
+                                    pdfmetrics.registerFont(TTFont("HTSReportFont", fp))
+                                footer_font_name = "HTSReportFont"
+                                break
+                            except Exception:
+                                pass
+
+                    # ✅ logo türevleri (blur/saydamlık) süreç içinde önbellekli
+                    wm_png = None
+                    if draw_cover_watermark and logo_path:
+                        wm_png = prepare_logo_png(logo_path, cover_watermark_opacity, cover_watermark_blur_px)
+
+                    stamp_png = None
+                    if draw_stamp and logo_path:
+                        stamp_png = prepare_logo_png(logo_path, stamp_opacity)
+
+                    stamper = PdfOverlayStamper(
+                        inset_pt=inset_pt,
+                        footer_font_name=footer_font_name,
+                        footer_font_size=int(footer_font_size),
+                        footer_right_text=footer_right_text,
+                        draw_frame=draw_frame,
+                        frame_radius_pt=frame_radius_pt,
+                        frame_stroke_rgb=frame_stroke_rgb,
+                        frame_line_width=frame_line_width,
+                        wm_image=wm_png,
+                        wm_size_pt=wm_size_pt,
+                        stamp_image=stamp_png,
+                        stamp_size_pt=stamp_size_pt,
+                        stamp_pad_pt=stamp_pad_pt,
+                    )
+
+                    post_path = tmp_pdf_path + ".post.pdf"
+                    stamper.stamp(
+                        tmp_pdf_path, post_path,
+                        progress_cb=lambda f: _progress(65 + int(25 * f)),
+                    )
+                    os.replace(post_path, tmp_pdf_path)
+
+                except Exception as e:
+                    raise RuntimeError(f"PDF post-process başarısız: {e}")
+
+                shutil.move(tmp_pdf_path, out_path)
+                _progress(100)
+                _status("PDF hazır.")
+
+            try:
+                if os.path.exists(tmp_pdf_path):
+                    os.remove(tmp_pdf_path)
+            except Exception:
+                pass
+
+        finally:
+            _status("")
+
+
+class StyleConfig:
+    """
+    Rapor stillerini veritabanından (sütunlu yapıdan) okur.
+    JSON kullanmaz, doğrudan SQL sütunlarını sözlüğe çevirir.
+    """
+
+    DEFAULTS = {
+        "main_title": {"label": "Rapor Ana Başlığı", "size": 18, "bold": True, "italic": False, "under": False},
+        "section_title": {"label": "Bölüm Başlıkları", "size": 14, "bold": True, "italic": False, "under": False},
+        "kv_keys": {"label": "Kapak Bilgi Başlıkları", "size": 12, "bold": True, "italic": False, "under": False},
+        "kv_values": {"label": "Kapak Bilgi Değerleri", "size": 12, "bold": False, "italic": False, "under": False},
+        "body": {"label": "Gövde Metinleri", "size": 12, "bold": False, "italic": False, "under": False},
+        "table_head": {"label": "Tablo Başlıkları", "size": 14, "bold": True, "italic": False, "under": False},
+        "table_body": {"label": "Tablo İçeriği", "size": 9, "bold": False, "italic": False, "under": False},
+        "evidence_title": {"label": "Delil Başlıkları", "size": 14, "bold": True, "italic": False, "under": True},
+        "evidence_desc": {"label": "Delil Açıklamaları", "size": 12, "bold": False, "italic": True, "under": False},
+        "margins": {"top": 25, "right": 20, "bottom": 20, "left": 25}
+    }
+
+    @staticmethod
+    def _init_tables(conn):
+        """Tablolar yoksa oluşturur + eksik kolonları migrasyonla ekler."""
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rapor_font_ayarlari (
+                    Anahtar TEXT PRIMARY KEY,
+                    Etiket TEXT,
+                    Boyut INTEGER,
+                    Kalin INTEGER DEFAULT 0,
+                    Italik INTEGER DEFAULT 0,
+                    AltiCizili INTEGER DEFAULT 0
+                )
+            """)
+
+            # Esas tablo (TR kolonlar)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rapor_sayfa_duzeni (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    MarginUst INTEGER DEFAULT 25,
+                    MarginSag INTEGER DEFAULT 20,
+                    MarginAlt INTEGER DEFAULT 20,
+                    MarginSol INTEGER DEFAULT 25
+                )
+            """)
+
+            cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_sayfa_duzeni)").fetchall()]
+
+            def _add_col(col_name: str, default_val: int):
+                nonlocal cols
+                if col_name not in cols:
+                    conn.execute(f"ALTER TABLE rapor_sayfa_duzeni ADD COLUMN {col_name} INTEGER DEFAULT {int(default_val)}")
+                    cols.append(col_name)
+
+            # TR + EN kolonları garanti etmeye çalış
+            _add_col("MarginUst", 25)
+            _add_col("MarginSag", 20)
+            _add_col("MarginAlt", 20)
+            _add_col("MarginSol", 25)
+
+            _add_col("TopMargin", 25)
+            _add_col("RightMargin", 20)
+            _add_col("BottomMargin", 20)
+            _add_col("LeftMargin", 25)
+
+            # id=1 satırı garanti
+            conn.execute("INSERT OR IGNORE INTO rapor_sayfa_duzeni (id) VALUES (1)")
+
+            # ✅ Güvenli NULL->default: sadece mevcut kolonlar için UPDATE üret
+            cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_sayfa_duzeni)").fetchall()]
+            sets = []
+            if "MarginUst" in cols:    sets.append("MarginUst    = COALESCE(MarginUst, 25)")
+            if "MarginSag" in cols:    sets.append("MarginSag    = COALESCE(MarginSag, 20)")
+            if "MarginAlt" in cols:    sets.append("MarginAlt    = COALESCE(MarginAlt, 20)")
+            if "MarginSol" in cols:    sets.append("MarginSol    = COALESCE(MarginSol, 25)")
+            if "TopMargin" in cols:    sets.append("TopMargin    = COALESCE(TopMargin, 25)")
+            if "RightMargin" in cols:  sets.append("RightMargin  = COALESCE(RightMargin, 20)")
+            if "BottomMargin" in cols: sets.append("BottomMargin = COALESCE(BottomMargin, 20)")
+            if "LeftMargin" in cols:   sets.append("LeftMargin   = COALESCE(LeftMargin, 25)")
+
+            if sets:
+                conn.execute(f"UPDATE rapor_sayfa_duzeni SET {', '.join(sets)} WHERE id=1")
+
+            conn.commit()
+
+        except Exception as e:
+            print(f"Tablo kontrol hatası: {e}")
+
+    @staticmethod
+    def load():
+        """Veritabanından ayarları okur ve Dict döndürür."""
+        try:
+            config = copy.deepcopy(StyleConfig.DEFAULTS)
+        except Exception:
+            config = StyleConfig.DEFAULTS.copy()
+
+        try:
+            with DB() as conn:
+                StyleConfig._init_tables(conn)
+
+                cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_sayfa_duzeni)").fetchall()]
+
+                # Öncelik: TR kolonlar; yoksa EN kolonlar
+                if all(c in cols for c in ("MarginUst", "MarginSag", "MarginAlt", "MarginSol")):
+                    row = conn.execute(
+                        "SELECT MarginUst, MarginSag, MarginAlt, MarginSol FROM rapor_sayfa_duzeni WHERE id=1"
+                    ).fetchone()
+                    if row:
+                        config["margins"] = {"top": int(row[0]), "right": int(row[1]), "bottom": int(row[2]), "left": int(row[3])}
+
+                elif all(c in cols for c in ("TopMargin", "RightMargin", "BottomMargin", "LeftMargin")):
+                    row = conn.execute(
+                        "SELECT TopMargin, RightMargin, BottomMargin, LeftMargin FROM rapor_sayfa_duzeni WHERE id=1"
+                    ).fetchone()
+                    if row:
+                        config["margins"] = {"top": int(row[0]), "right": int(row[1]), "bottom": int(row[2]), "left": int(row[3])}
+
+                rows = conn.execute(
+                    "SELECT Anahtar, Etiket, Boyut, Kalin, Italik, AltiCizili FROM rapor_font_ayarlari"
+                ).fetchall()
+
+                for r in rows:
+                    key = r[0]
+                    if key in config and key != "margins":
+                        config[key] = {
+                            "label": str(r[1]),
+                            "size": int(r[2]),
+                            "bold": bool(r[3]),
+                            "italic": bool(r[4]),
+                            "under": bool(r[5])
+                        }
+
+        except Exception as e:
+            print(f"Stil yükleme hatası: {e}")
+            return config
+
+        return config
+
+    @staticmethod
+    def save(data):
+        """Verileri DB'ye yazar."""
+        try:
+            with DB() as conn:
+                StyleConfig._init_tables(conn)
+
+                for key, val in data.items():
+                    if key == "margins":
+                        continue
+                    if isinstance(val, dict):
+                        conn.execute("""
+                            INSERT OR REPLACE INTO rapor_font_ayarlari
+                            (Anahtar, Etiket, Boyut, Kalin, Italik, AltiCizili)
+                            VALUES (?, ?, ?, ?, ?, ?)
+                        """, (
+                            key,
+                            val.get("label", ""),
+                            int(val.get("size", 12)),
+                            1 if val.get("bold") else 0,
+                            1 if val.get("italic") else 0,
+                            1 if val.get("under") else 0
+                        ))
+
+                margins = data.get("margins", {}) if isinstance(data.get("margins", {}), dict) else {}
+                top = int(margins.get("top", 25))
+                right = int(margins.get("right", 20))
+                bottom = int(margins.get("bottom", 20))
+                left = int(margins.get("left", 25))
+
+                cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_sayfa_duzeni)").fetchall()]
+                conn.execute("INSERT OR IGNORE INTO rapor_sayfa_duzeni (id) VALUES (1)")
+
+                sets = []
+                params = []
+
+                # TR kolonlara yaz
+                if "MarginUst" in cols:  sets.append("MarginUst=?");  params.append(top)
+                if "MarginSag" in cols:  sets.append("MarginSag=?");  params.append(right)
+                if "MarginAlt" in cols:  sets.append("MarginAlt=?");  params.append(bottom)
+                if "MarginSol" in cols:  sets.append("MarginSol=?");  params.append(left)
+
+                # EN kolonlara da yaz (TopMargin kullanan sürümlerle uyum)
+                if "TopMargin" in cols:   sets.append("TopMargin=?");   params.append(top)
+                if "RightMargin" in cols: sets.append("RightMargin=?"); params.append(right)
+                if "BottomMargin" in cols:sets.append("BottomMargin=?");params.append(bottom)
+                if "LeftMargin" in cols:  sets.append("LeftMargin=?");  params.append(left)
+
+                if sets:
+                    conn.execute(f"UPDATE rapor_sayfa_duzeni SET {', '.join(sets)} WHERE id=1", params)
+
+                conn.commit()
+
+        except Exception as e:
+            print(f"Stil Kayıt Hatası: {e}")
+
+
+class StyleEditorDialog(QDialog):
+    """Gelişmiş Stil ve Düzen Editörü (Tablo Görünümlü - Başlıklı)"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Rapor Biçim ve Düzen Ayarları")
+        self.resize(700, 750)
+
+        self.current_styles = StyleConfig.load()
+        if isinstance(self.current_styles, str):
+            try: self.current_styles = json.loads(self.current_styles)
+            except: self.current_styles = None
+        if not isinstance(self.current_styles, dict):
+            self.current_styles = StyleConfig.DEFAULTS.copy()
+
+        self.style_inputs = {}
+
+        layout = QVBoxLayout(self)
+
+        tabs = QTabWidget()
+
+        tab_fonts = QWidget()
+        l_fonts = QVBoxLayout(tab_fonts)
+
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.Shape.NoFrame)
+        content_widget = QWidget()
+
+        grid = QGridLayout(content_widget)
+        grid.setSpacing(15)
+        grid.setContentsMargins(15, 20, 15, 20)
+
+        headers = ["Düzenlenecek Alan", "Boyut (pt)", "Kalın", "İtalik", "Altı Çizili"]
+        for col, text in enumerate(headers):
+            lbl = QLabel(text)
+            lbl.setStyleSheet("font-weight: bold; color: #555; text-transform: uppercase; font-size: 11px;")
+            if col > 0:
+                lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            grid.addWidget(lbl, 0, col)
+
+        line = QFrame()
+        line.setFrameShape(QFrame.Shape.HLine)
+        line.setStyleSheet("color: #ccc;")
+        grid.addWidget(line, 1, 0, 1, 5)
+
+        style_keys = [k for k in StyleConfig.DEFAULTS.keys() if k != "margins"]
+
+        btn_style = """
+            QPushButton { 
+                background-color: #f9f9f9; 
+                border: 1px solid #ccc; 
+                border-radius: 4px; 
+                font-size: 13px; font-weight: bold; color: #444;
+            }
+            QPushButton:checked { 
+                background-color: #3498db; 
+                color: white; 
+                border: 1px solid #2980b9; 
+            }
+            QPushButton:hover { background-color: #e6e6e6; }
+        """
+
+        row = 2
+        for key in style_keys:
+            def_val = StyleConfig.DEFAULTS[key]
+            curr_val = self.current_styles.get(key, def_val)
+            if not isinstance(curr_val, dict): curr_val = def_val
+
+            label_text = curr_val.get("label", def_val["label"])
+
+            lbl_name = QLabel(label_text)
+            lbl_name.setStyleSheet("font-weight: bold; color: #2c3e50; font-size: 13px;")
+            grid.addWidget(lbl_name, row, 0)
+
+            sb = QSpinBox()
+            sb.setRange(6, 72)
+            sb.setValue(int(curr_val.get("size", 12)))
+            sb.setSuffix(" pt")
+            sb.setFixedWidth(90)
+            sb.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            grid.addWidget(sb, row, 1, alignment=Qt.AlignmentFlag.AlignCenter)
+
+            btn_bold = QPushButton("K")
+            btn_bold.setCheckable(True)
+            btn_bold.setChecked(bool(curr_val.get("bold", False)))
+            btn_bold.setFixedSize(40, 30)
+            btn_bold.setStyleSheet(btn_style)
+            grid.addWidget(btn_bold, row, 2, alignment=Qt.AlignmentFlag.AlignCenter)
+
+            btn_italic = QPushButton("I")
+            btn_italic.setCheckable(True)
+            btn_italic.setChecked(bool(curr_val.get("italic", False)))
+            btn_italic.setFixedSize(40, 30)
+            btn_italic.setStyleSheet(btn_style + "QPushButton { font-style: italic; font-family: serif; }")
+            grid.addWidget(btn_italic, row, 3, alignment=Qt.AlignmentFlag.AlignCenter)
+
+            btn_under = QPushButton("A")
+            btn_under.setCheckable(True)
+            btn_under.setChecked(bool(curr_val.get("under", False)))
+            btn_under.setFixedSize(40, 30)
+            btn_under.setStyleSheet(btn_style + "QPushButton { text-decoration: underline; }")
+            grid.addWidget(btn_under, row, 4, alignment=Qt.AlignmentFlag.AlignCenter)
+
+            self.style_inputs[key] = (sb, btn_bold, btn_italic, btn_under)
+            row += 1
+
+        spacer = QWidget()
+        spacer.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Expanding)
+        grid.addWidget(spacer, row, 0)
+
+        scroll.setWidget(content_widget)
+        l_fonts.addWidget(scroll)
+        tabs.addTab(tab_fonts, "🔤 Yazı Tipi ve Stiller")
+
+        tab_page = QWidget()
+        l_page = QVBoxLayout(tab_page)
+
+        grp_margin = QGroupBox("Sayfa Kenar Boşlukları (mm)")
+        grid_margin = QGridLayout(grp_margin)
+
+        margins_curr = self.current_styles.get("margins", StyleConfig.DEFAULTS["margins"])
+
+        self.sb_top = self._create_margin_spin(margins_curr.get("top", 25))
+        self.sb_bottom = self._create_margin_spin(margins_curr.get("bottom", 20))
+        self.sb_left = self._create_margin_spin(margins_curr.get("left", 25))
+        self.sb_right = self._create_margin_spin(margins_curr.get("right", 20))
+
+        grid_margin.setHorizontalSpacing(25)
+        grid_margin.setVerticalSpacing(15)
+
+        grid_margin.addWidget(QLabel("Üst"), 0, 1, Qt.AlignmentFlag.AlignCenter)
+        grid_margin.addWidget(self.sb_top, 1, 1, Qt.AlignmentFlag.AlignCenter)
+
+        grid_margin.addWidget(QLabel("Sol"), 2, 0, Qt.AlignmentFlag.AlignRight)
+        grid_margin.addWidget(self.sb_left, 3, 0, Qt.AlignmentFlag.AlignRight)
+
+        page_icon = QLabel("📄")
+        page_icon.setStyleSheet("font-size: 48px; color: #bdc3c7;")
+        page_icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        grid_margin.addWidget(page_icon, 2, 1, 2, 1, Qt.AlignmentFlag.AlignCenter)
+
+        grid_margin.addWidget(QLabel("Sağ"), 2, 2, Qt.AlignmentFlag.AlignLeft)
+        grid_margin.addWidget(self.sb_right, 3, 2, Qt.AlignmentFlag.AlignLeft)
+
+        grid_margin.addWidget(self.sb_bottom, 4, 1, Qt.AlignmentFlag.AlignCenter)
+        grid_margin.addWidget(QLabel("Alt"), 5, 1, Qt.AlignmentFlag.AlignCenter)
+
+        l_page.addWidget(grp_margin)
+        l_page.addStretch()
+        tabs.addTab(tab_page, "📐 Sayfa Düzeni")
+
+        layout.addWidget(tabs)
+
+        btn_box = QHBoxLayout()
+        btn_reset = QPushButton("Varsayılanlara Dön")
+        btn_reset.setStyleSheet("background-color: #95a5a6; color: white; padding: 8px;")
+        btn_reset.clicked.connect(self.reset_defaults)
+
+        btn_save = QPushButton("💾 Kaydet ve Uygula")
+        btn_save.setStyleSheet("background-color: #27ae60; color: white; font-weight: bold; padding: 10px; font-size: 14px;")
+        btn_save.clicked.connect(self.save_settings)
+
+        btn_box.addWidget(btn_reset)
+        btn_box.addStretch()
+        btn_box.addWidget(btn_save)
+        layout.addLayout(btn_box)
+
+    def _create_margin_spin(self, val):
+        sb = QSpinBox()
+        sb.setRange(0, 100)
+        sb.setValue(int(val))
+        sb.setSuffix(" mm")
+        sb.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        sb.setFixedWidth(80)
+        return sb
+
+    def save_settings(self):
+        new_data = {}
+        for key, (sb, b, i, u) in self.style_inputs.items():
+            orig_label = self.current_styles.get(key, {}).get("label", "")
+            if not orig_label: orig_label = StyleConfig.DEFAULTS[key]["label"]
+
+            new_data[key] = {
+                "label": orig_label,
+                "size": sb.value(),
+                "bold": b.isChecked(),
+                "italic": i.isChecked(),
+                "under": u.isChecked()
+            }
+
+        new_data["margins"] = {
+            "top": self.sb_top.value(),
+            "bottom": self.sb_bottom.value(),
+            "left": self.sb_left.value(),
+            "right": self.sb_right.value()
+        }
+
+        if "body" not in new_data: new_data["body"] = StyleConfig.DEFAULTS["body"]
+        StyleConfig.save(new_data)
+        ModernDialog.show_success(self, "Kaydedildi", "Ayarlar kaydedildi.")
+        self.accept()
+
+    def reset_defaults(self):
+        if ModernDialog.show_question(self, "Sıfırla", "Varsayılanlara dönülsün mü?"):
+            StyleConfig.save(StyleConfig.DEFAULTS)
+            self.accept()
+
+
+class RichDescriptionDialog(QDialog):
+    """Açıklama düzenlemek için özel Zengin Metin (Kalın/İtalik/Altı Çizili) penceresi."""
+    def __init__(self, parent=None, text="", title="Açıklama Düzenle"):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(800, 450)
+
+        layout = QVBoxLayout(self)
+
+        toolbar = QHBoxLayout()
+        toolbar.setSpacing(5)
+
+        btn_style = """
+            QPushButton { 
+                background-color: #f0f0f0; border: 1px solid #ccc; 
+                border-radius: 3px; font-weight: bold; width: 28px; height: 28px;
+                font-family: 'Times New Roman'; font-size: 14px; color: #333;
+            }
+            QPushButton:hover { background-color: #e0e0e0; }
+            QPushButton:checked { background-color: #3498db; color: white; border: 1px solid #2980b9; }
+        """
+
+        def set_fmt(fmt_type):
+            cursor = self.editor.textCursor()
+            fmt = QTextCharFormat()
+            if fmt_type == 'bold':
+                fmt.setFontWeight(QFont.Weight.Bold if cursor.charFormat().fontWeight() != QFont.Weight.Bold else QFont.Weight.Normal)
+            elif fmt_type == 'italic':
+                fmt.setFontItalic(not cursor.charFormat().fontItalic())
+            elif fmt_type == 'under':
+                fmt.setFontUnderline(not cursor.charFormat().fontUnderline())
+            self.editor.mergeCurrentCharFormat(fmt)
+            self.editor.setFocus()
+
+        btn_b = QPushButton("K"); btn_b.setToolTip("Kalın"); btn_b.setStyleSheet(btn_style); btn_b.clicked.connect(lambda: set_fmt('bold'))
+        btn_i = QPushButton("I"); btn_i.setToolTip("İtalik"); btn_i.setStyleSheet(btn_style + "QPushButton { font-style: italic; }"); btn_i.clicked.connect(lambda: set_fmt('italic'))
+        btn_u = QPushButton("A"); btn_u.setToolTip("Altı Çizili"); btn_u.setStyleSheet(btn_style + "QPushButton { text-decoration: underline; }"); btn_u.clicked.connect(lambda: set_fmt('under'))
+
+        toolbar.addWidget(btn_b); toolbar.addWidget(btn_i); toolbar.addWidget(btn_u); toolbar.addStretch()
+        layout.addLayout(toolbar)
+
+        self.editor = QTextEdit()
+        if "<" in text and ">" in text:
+            self.editor.setHtml(text)
+        else:
+            self.editor.setPlainText(text)
+
+        layout.addWidget(self.editor)
+
+        btn_box = QHBoxLayout()
+        btn_cancel = QPushButton("İptal"); btn_cancel.clicked.connect(self.reject)
+        btn_save = QPushButton("Kaydet"); btn_save.setStyleSheet("background-color:#27ae60; color:white; font-weight:bold;"); btn_save.clicked.connect(self.accept)
+        btn_box.addStretch(); btn_box.addWidget(btn_cancel); btn_box.addWidget(btn_save)
+        layout.addLayout(btn_box)
+
+    def get_html(self):
+        return self.editor.toHtml()
+
+
+class MetaEkRowWidget(QWidget):
+    clicked = pyqtSignal(int)          # db_id
+    edit_desc = pyqtSignal(int)        # db_id
+    edit_props = pyqtSignal(int)       # db_id
+    deleted = pyqtSignal(int)          # db_id
+
+    def __init__(self, db_id: int, title: str, has_desc: bool, parent=None):
+        super().__init__(parent)
+        self.db_id = int(db_id)
+
+        lay = QHBoxLayout(self)
+        lay.setContentsMargins(8, 2, 8, 2)
+        lay.setSpacing(8)
+
+        self.lbl = QLabel(title)
+        self.lbl.setStyleSheet("font-weight:600;")
+        self.lbl.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.lbl.mousePressEvent = lambda e: self.clicked.emit(self.db_id)
+        lay.addWidget(self.lbl, 1)
+
+        self.btn_desc = QPushButton("Açıklama" + (" ✅" if has_desc else ""))
+        self.btn_desc.clicked.connect(lambda: self.edit_desc.emit(self.db_id))
+        lay.addWidget(self.btn_desc)
+
+        self.btn_props = QPushButton("Ayarlar")
+        self.btn_props.clicked.connect(lambda: self.edit_props.emit(self.db_id))
+        lay.addWidget(self.btn_props)
+
+        self.btn_del = QPushButton("Sil")
+        self.btn_del.clicked.connect(lambda: self.deleted.emit(self.db_id))
+        lay.addWidget(self.btn_del)
+
+
+class EvidenceRowWidget(QWidget):
+    clicked = pyqtSignal(int)       # ✅ eid (önizlemede delile git)
+    edit_desc = pyqtSignal(int)     # eid
+    edit_props = pyqtSignal(int)    # eid
+    move_up = pyqtSignal(int)       # eid
+    move_down = pyqtSignal(int)     # eid
+    deleted = pyqtSignal(int)
+
+    def __init__(self, eid: int, title: str, has_desc: bool, parent=None, thumb_path: str | None = None):
+        super().__init__(parent)
+        self.eid = int(eid)
+
+        lay = QHBoxLayout(self)
+        lay.setContentsMargins(8, 2, 8, 2)
+        lay.setSpacing(8)
+
+        # ✅ görsel delillerde küçük önizleme (depodaki hazır thumbnail; orijinal resim açılmaz)
+        if thumb_path:
+            pm = QPixmap(thumb_path)
+            if not pm.isNull():
+                thumb = QLabel()
+                thumb.setPixmap(pm.scaledToHeight(36, Qt.TransformationMode.SmoothTransformation))
+                thumb.setFixedHeight(38)
+                thumb.setCursor(Qt.CursorShape.PointingHandCursor)
+                thumb.mousePressEvent = lambda e: self.clicked.emit(self.eid)
+                lay.addWidget(thumb)
+
+        lbl = QLabel(title)
+        lbl.setStyleSheet("font-weight:600;")
+        lbl.setCursor(Qt.CursorShape.PointingHandCursor)  # ✅
+        lbl.mousePressEvent = lambda e: self.clicked.emit(self.eid)  # ✅
+        lay.addWidget(lbl, 1)
+
+        btn_up = QPushButton("↑")
+        btn_up.setFixedWidth(36)
+        btn_up.clicked.connect(lambda: self.move_up.emit(self.eid))
+        lay.addWidget(btn_up)
+
+        btn_down = QPushButton("↓")
+        btn_down.setFixedWidth(36)
+        btn_down.clicked.connect(lambda: self.move_down.emit(self.eid))
+        lay.addWidget(btn_down)
+
+        btn_desc = QPushButton("Açıklama" + (" ✅" if has_desc else ""))
+        btn_desc.clicked.connect(lambda: self.edit_desc.emit(self.eid))
+        lay.addWidget(btn_desc)
+
+        btn_props = QPushButton("Ayarlar")
+        btn_props.clicked.connect(lambda: self.edit_props.emit(self.eid))
+        lay.addWidget(btn_props)
+
+        btn_del = QPushButton("Sil")
+        btn_del.clicked.connect(lambda: self.deleted.emit(self.eid))
+        lay.addWidget(btn_del)
+
+
+class TableFormatEditorDialog(QDialog):
+    """
+    Hücre/Satır/Sütun renklendirme editörü (delile özel).
+    Değişiklikler fmt dict olarak döner.
+    fmt:
+      {"rows": {"0":"#.."}, "cols":{"1":"#.."}, "cells":{"2,3":"#.."}}
+    """
+    def __init__(self, parent, headers: list[str], rows: list[list[str]], initial_fmt: dict | None = None):
+        super().__init__(parent)
+        self.setWindowTitle("Tablo Düzenle (Renklendir)")
+        self.setMinimumSize(860, 540)
+
+        self._fmt = initial_fmt if isinstance(initial_fmt, dict) else {"rows": {}, "cols": {}, "cells": {}}
+        for k in ("rows", "cols", "cells"):
+            if k not in self._fmt or not isinstance(self._fmt[k], dict):
+                self._fmt[k] = {}
+
+        # history
+        self._history = [copy.deepcopy(self._fmt)]
+        self._hist_i = 0
+
+        lay = QVBoxLayout(self)
+
+        # üst bar
+        tools = QHBoxLayout()
+        btn_color = QPushButton("Renk Seç")
+        btn_cells = QPushButton("Seçili Hücrelere Uygula")
+        btn_row = QPushButton("Seçili Satıra Uygula")
+        btn_col = QPushButton("Seçili Sütuna Uygula")
+        btn_clear = QPushButton("Temizle")
+        btn_undo = QPushButton("↩ Geri Al")
+        btn_redo = QPushButton("↪ İleri Al")
+
+        tools.addWidget(btn_color)
+        tools.addWidget(btn_cells)
+        tools.addWidget(btn_row)
+        tools.addWidget(btn_col)
+        tools.addWidget(btn_clear)
+        tools.addWidget(btn_undo)
+        tools.addWidget(btn_redo)
+        tools.addStretch(1)
+        lay.addLayout(tools)
+
+        # tablo
+        self.tbl = QTableWidget()
+        self.table = self.tbl  # eski çağrılar için alias (güvenlik)
+        self.tbl.setColumnCount(len(headers))
+        self.tbl.setRowCount(len(rows))
+        self.tbl.setHorizontalHeaderLabels([str(h) for h in headers])
+
+        # ✅ EDIT KAPAT: çift tıkla düzenleme bitsin
+        self.tbl.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tbl.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.tbl.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectItems)
+
+        for r, row in enumerate(rows):
+            for c, val in enumerate(row):
+                it = QTableWidgetItem(str(val))
+                it.setFlags(it.flags() & ~Qt.ItemFlag.ItemIsEditable)  # ekstra garanti
+                self.tbl.setItem(r, c, it)
+
+        self.tbl.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.tbl.verticalHeader().setVisible(True)
+        lay.addWidget(self.tbl, 1)
+
+        # alt butonlar
+        row_btns = QHBoxLayout()
+        row_btns.addStretch(1)
+        btn_cancel = QPushButton("Vazgeç")
+        btn_ok = QPushButton("Kaydet")
+        row_btns.addWidget(btn_cancel)
+        row_btns.addWidget(btn_ok)
+        lay.addLayout(row_btns)
+
+        self._selected_color = "#ff0000"
+
+        def _push_history():
+            # aynı state tekrar eklenmesin
+            cur = copy.deepcopy(self._fmt)
+            if self._history and self._history[self._hist_i] == cur:
+                return
+            self._history = self._history[: self._hist_i + 1]
+            self._history.append(cur)
+            self._hist_i += 1
+
+        def pick_color():
+            c = QColorDialog.getColor(QColor(self._selected_color), self, "Renk Seç")
+            if c.isValid():
+                self._selected_color = c.name()
+
+        def apply_cells():
+            sels = self.tbl.selectedIndexes()
+            if not sels:
+                return
+            for ix in sels:
+                self._fmt["cells"][f"{ix.row()},{ix.column()}"] = self._selected_color
+            _push_history()
+            self._apply_preview_colors()
+
+        def apply_row():
+            sels = self.tbl.selectedIndexes()
+            if not sels:
+                return
+            r = sels[0].row()
+            self._fmt["rows"][str(r)] = self._selected_color
+            _push_history()
+            self._apply_preview_colors()
+
+        def apply_col():
+            sels = self.tbl.selectedIndexes()
+            if not sels:
+                return
+            c = sels[0].column()
+            self._fmt["cols"][str(c)] = self._selected_color
+            _push_history()
+            self._apply_preview_colors()
+
+        def clear_all():
+            self._fmt = {"rows": {}, "cols": {}, "cells": {}}
+            _push_history()
+            self._apply_preview_colors()
+
+        def undo():
+            if self._hist_i <= 0:
+                return
+            self._hist_i -= 1
+            self._fmt = copy.deepcopy(self._history[self._hist_i])
+            self._apply_preview_colors()
+
+        def redo():
+            if self._hist_i >= len(self._history) - 1:
+                return
+            self._hist_i += 1
+            self._fmt = copy.deepcopy(self._history[self._hist_i])
+            self._apply_preview_colors()
+
+        btn_color.clicked.connect(pick_color)
+        btn_cells.clicked.connect(apply_cells)
+        btn_row.clicked.connect(apply_row)
+        btn_col.clicked.connect(apply_col)
+        btn_clear.clicked.connect(clear_all)
+        btn_undo.clicked.connect(undo)
+        btn_redo.clicked.connect(redo)
+
+        btn_cancel.clicked.connect(self.reject)
+        btn_ok.clicked.connect(self.accept)
+
+        # ilk boya
+        self._apply_preview_colors()
+
+    def _apply_preview_colors(self):
+        """✅ Daha önce çağrılıp bulunamadığı için eklendi."""
+        # önce temizle
+        for r in range(self.tbl.rowCount()):
+            for c in range(self.tbl.columnCount()):
+                it = self.tbl.item(r, c)
+                if it:
+                    it.setBackground(QColor("#ffffff"))
+
+        rows_map = self._fmt.get("rows", {}) or {}
+        cols_map = self._fmt.get("cols", {}) or {}
+        cells_map = self._fmt.get("cells", {}) or {}
+
+        # row/col/cell (cell en baskın)
+        for r in range(self.tbl.rowCount()):
+            row_color = rows_map.get(str(r))
+            for c in range(self.tbl.columnCount()):
+                color = cells_map.get(f"{r},{c}") or row_color or cols_map.get(str(c))
+                if not color:
+                    continue
+                it = self.tbl.item(r, c)
+                if it:
+                    it.setBackground(QColor(color))
+
+    def get_fmt(self) -> dict:
+        return copy.deepcopy(self._fmt)
+
+    def _push_history(self):
+        cur = copy.deepcopy(self.fmt)
+        # aynı state’i iki kere basma
+        if self._history and json.dumps(self._history[self._hist_i], sort_keys=True, ensure_ascii=False) == json.dumps(cur, sort_keys=True, ensure_ascii=False):
+            return
+        # ileri geçmişi kırp
+        self._history = self._history[: self._hist_i + 1]
+        self._history.append(cur)
+        self._hist_i += 1
+
+    def undo(self):
+        if self._hist_i <= 0:
+            return
+        self._hist_i -= 1
+        self.fmt = copy.deepcopy(self._history[self._hist_i])
+        self._repaint_from_fmt()
+
+    def redo(self):
+        if self._hist_i >= len(self._history) - 1:
+            return
+        self._hist_i += 1
+        self.fmt = copy.deepcopy(self._history[self._hist_i])
+        self._repaint_from_fmt()
+
+    def _repaint_from_fmt(self):
+        # tablo widget’ındaki tüm hücrelerin arkaplanını temizle
+        for r in range(self.table.rowCount()):
+            for c in range(self.table.columnCount()):
+                item = self.table.item(r, c)
+                if item:
+                    item.setBackground(QColor("white"))
+
+        cols  = self.fmt.get("cols", {})  if isinstance(self.fmt.get("cols"), dict)  else {}
+        rows  = self.fmt.get("rows", {})  if isinstance(self.fmt.get("rows"), dict)  else {}
+        cells = self.fmt.get("cells", {}) if isinstance(self.fmt.get("cells"), dict) else {}
+
+        # row + col
+        for r in range(self.table.rowCount()):
+            row_color = rows.get(str(r))
+            for c in range(self.table.columnCount()):
+                color = cells.get(f"{r},{c}") or row_color or cols.get(str(c))
+                if not color:
+                    continue
+                item = self.table.item(r, c)
+                if item:
+                    item.setBackground(QColor(color))
+
+
+class EvidencePropsDialog(QDialog):
+    """
+    Delil (rapor_taslagi) için: Başlık + Genişlik(%) + (TABLE ise) Kolon seçimi + Tablo renklendirme.
+    """
+    def __init__(
+        self,
+        parent,
+        title: str,
+        width_pct: int,
+        is_table: bool = False,
+        table_html: str = "",
+        base_html: str = "",
+        hidden_json: str = "",
+        fmt_json: str = "",
+        table_struct: dict | None = None,
+    ):
+        super().__init__(parent)
+        self.setWindowTitle("Delil Ayarları")
+        self.setModal(True)
+        self.resize(520, 420)
+
+        lay = QVBoxLayout(self)
+
+        # --- başlık
+        row1 = QHBoxLayout()
+        row1.addWidget(QLabel("Başlık:"))
+        self.edt_title = QLineEdit(title or "")
+        row1.addWidget(self.edt_title)
+        lay.addLayout(row1)
+
+        # --- genişlik
+        row2 = QHBoxLayout()
+        w0 = int(width_pct) if width_pct else 100
+        w0 = max(10, min(100, w0))
+
+        self.lbl_w = QLabel(f"Genişlik: %{w0}")
+        row2.addWidget(self.lbl_w)
+
+        self.sld = QSlider(Qt.Orientation.Horizontal)
+        self.sld.setMinimum(10)
+        self.sld.setMaximum(100)
+        self.sld.setValue(w0)
+        self.sld.valueChanged.connect(lambda v: self.lbl_w.setText(f"Genişlik: %{v}"))
+        row2.addWidget(self.sld)
+        lay.addLayout(row2)
+
+        # --- TABLE özel
+        self._is_table = bool(is_table)
+        self._table_html_in = str(table_html or "")
+        self.base_html = (str(base_html or "").strip() or self._table_html_in)  # ✅ base öncelikli
+        self.table_struct = table_struct if isinstance(table_struct, dict) else None
+
+        # hidden_json -> list
+        try:
+            hidden_list = json.loads(hidden_json) if hidden_json else []
+            if not isinstance(hidden_list, list):
+                hidden_list = []
+        except Exception:
+            hidden_list = []
+        self._hidden_init = set(str(x) for x in hidden_list)
+
+        # fmt_json -> dict
+        try:
+            fmt_obj = json.loads(fmt_json) if fmt_json else {}
+            if not isinstance(fmt_obj, dict):
+                fmt_obj = {}
+        except Exception:
+            fmt_obj = {}
+
+        self._fmt = fmt_obj if isinstance(fmt_obj, dict) else {"rows": {}, "cols": {}, "cells": {}}
+        if "rows" not in self._fmt or not isinstance(self._fmt["rows"], dict): self._fmt["rows"] = {}
+        if "cols" not in self._fmt or not isinstance(self._fmt["cols"], dict): self._fmt["cols"] = {}
+        if "cells" not in self._fmt or not isinstance(self._fmt["cells"], dict): self._fmt["cells"] = {}
+
+        if self._is_table and (self.table_struct or self.base_html.strip()):
+            # ✅ kolonları base’den çıkar (kaldırılan kolon geri gelebilsin)
+            if self.table_struct:
+                headers, _rows = table_struct_headers_rows(self.table_struct)
+            else:
+                headers, _rows = _extract_table_headers_rows(self.base_html)
+
+            grp = QGroupBox("Tablo Kolonları (Bu delile özel)")
+            g_lay = QVBoxLayout(grp)
+
+            info = QLabel("Önizlemede görünen kolonlar işaretli gelir. İstemediğinizi kaldırın.")
+            info.setStyleSheet("color:#444;")
+            g_lay.addWidget(info)
+
+            wrap = QWidget()
+            v = QVBoxLayout(wrap)
+            v.setContentsMargins(6, 6, 6, 6)
+
+            self._col_checks: list[tuple[str, QCheckBox]] = []
+            for h in headers:
+                h_str = str(h)
+                cb = QCheckBox(h_str)
+                # ✅ daha önce gizlenmişse unchecked başlasın
+                cb.setChecked(h_str not in self._hidden_init)
+                self._col_checks.append((h_str, cb))
+                v.addWidget(cb)
+
+            scr = QScrollArea()
+            scr.setWidgetResizable(True)
+            scr.setMinimumHeight(160)
+            scr.setWidget(wrap)
+            g_lay.addWidget(scr)
+
+            btn_edit = QPushButton("Tablo Düzenle (Renklendir)")
+            g_lay.addWidget(btn_edit)
+
+            def open_editor():
+                # editor her zaman "güncel görünür kolonlar" üzerinden açılsın
+                hidden = set(self.hidden_cols_list())
+                if self.table_struct:
+                    hdr2, rows2 = table_struct_headers_rows(self.table_struct, list(hidden))
+                else:
+                    html1 = _apply_hidden_cols_to_table_html(self.base_html, list(hidden))
+                    hdr2, rows2 = _extract_table_headers_rows(html1)
+
+                dlg2 = TableFormatEditorDialog(self, hdr2, rows2, self._fmt)
+                if dlg2.exec() == 1:
+                    self._fmt = dlg2.get_fmt()
+
+            btn_edit.clicked.connect(open_editor)
+
+            lay.addWidget(grp)
+
+        # --- butonlar
+        btns = QHBoxLayout()
+        btns.addStretch(1)
+        b_no = QPushButton("Vazgeç")
+        b_ok = QPushButton("Kaydet")
+        b_ok.clicked.connect(self.accept)
+        b_no.clicked.connect(self.reject)
+        btns.addWidget(b_no)
+        btns.addWidget(b_ok)
+        lay.addLayout(btns)
+
+    def hidden_cols_list(self) -> list[str]:
+        """
+        Checkbox’ta unchecked olan kolonlar = hidden.
+        """
+        if not getattr(self, "_is_table", False):
+            return []
+        if not hasattr(self, "_col_checks"):
+            return []
+        hidden = []
+        for h, cb in self._col_checks:
+            if not cb.isChecked():
+                hidden.append(h)
+        return hidden
+
+    def get_fmt(self) -> dict:
+        return self._fmt
+
+    def values(self):
+        """
+        Dönüş: (title, width, hidden_list_or_None, fmt_or_None)
+        """
+        title = self.edt_title.text().strip()
+        w = int(self.sld.value())
+
+        if not self._is_table:
+            return (title, w, None, None)
+
+        return (title, w, self.hidden_cols_list(), self.get_fmt())
+
+
+class MetaEkPropsDialog(QDialog):
+    def __init__(self, parent, file_name: str, hide_name: bool, width_pct: int):
+        super().__init__(parent)
+        self.setWindowTitle("Ek Ayarları")
+        self.setModal(True)
+        self.resize(420, 180)
+
+        lay = QVBoxLayout(self)
+
+        row1 = QHBoxLayout()
+        row1.addWidget(QLabel("Dosya Adı:"))
+        self.edt_name = QLineEdit(file_name or "")
+        row1.addWidget(self.edt_name)
+        lay.addLayout(row1)
+
+        self.chk_hide = QCheckBox("Raporda dosya adını gizle")
+        self.chk_hide.setChecked(bool(hide_name))
+        lay.addWidget(self.chk_hide)
+
+        row2 = QHBoxLayout()
+        self.lbl_w = QLabel(f"Genişlik: %{int(width_pct) if width_pct else 80}")
+        row2.addWidget(self.lbl_w)
+
+        self.sld = QSlider(Qt.Orientation.Horizontal)
+        self.sld.setMinimum(30)
+        self.sld.setMaximum(100)
+        self.sld.setValue(int(width_pct) if width_pct else 80)
+        self.sld.valueChanged.connect(lambda v: self.lbl_w.setText(f"Genişlik: %{v}"))
+        row2.addWidget(self.sld)
+        lay.addLayout(row2)
+
+        btns = QHBoxLayout()
+        btns.addStretch(1)
+        b_ok = QPushButton("Kaydet")
+        b_no = QPushButton("Vazgeç")
+        b_ok.clicked.connect(self.accept)
+        b_no.clicked.connect(self.reject)
+        btns.addWidget(b_no)
+        btns.addWidget(b_ok)
+        lay.addLayout(btns)
+
+    def values(self):
+        return (self.edt_name.text().strip(), bool(self.chk_hide.isChecked()), int(self.sld.value()))
+
+
+class ReorderableListWidget(QListWidget):
+    def __init__(self, on_reorder, parent=None):
+        super().__init__(parent)
+        self._on_reorder = on_reorder
+
+    def dropEvent(self, event):
+        super().dropEvent(event)
+        try:
+            if callable(self._on_reorder):
+                self._on_reorder()
+        except Exception:
+            pass
+
+
+class MetaEkPanel(QWidget):
+    changed_any = pyqtSignal()
+
+    def __init__(self, project_id: int, bolum: str, parent=None):
+        super().__init__(parent)
+        try:
+            self.project_id = int(project_id)
+        except Exception:
+            self.project_id = 0
+        self.bolum = str(bolum)
+
+        root = QVBoxLayout(self)
+        root.setContentsMargins(0, 0, 0, 0)
+
+        # Üst bar
+        top = QHBoxLayout()
+
+        self.btn_add = QPushButton("Resim Ekle (Yerel Disk)")
+        self.btn_add.clicked.connect(self.add_from_disk)
+        top.addWidget(self.btn_add)
+
+        # delil_cekmece: swap KALDIRILDI (tek liste)
+        self.btn_swap = None
+
+        top.addStretch(1)
+        root.addLayout(top)
+
+        if self.bolum == "delil_cekmece":
+            # ✅ TEK LİSTE: rapor_taslagi tablosundaki tüm deliller (resim/tablo/görsel/html)
+            self.lbl_evi = QLabel("Deliller (Resim / Tablo / Görsel / HTML)")
+            self.lbl_evi.setStyleSheet("font-weight:700; padding:4px 0;")
+            root.addWidget(self.lbl_evi)
+
+            self.listw_evidence = QListWidget()
+            self.listw_evidence.setSpacing(6)
+            self.listw_evidence.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+            root.addWidget(self.listw_evidence, 1)
+
+            # ✅ Eski sürümden kalan meta_ekler/delil_cekmece kayıtlarını bir kere taşımak için
+            self._migrate_delil_cekmece_meta_to_taslak()
+
+        else:
+            # ✅ Diğer bölümler: mevcut davranış (rapor_meta_ekler listesi)
+            self.lbl_meta = QLabel("Çekmeceye Eklenen Resimler")
+            self.lbl_meta.setStyleSheet("font-weight:700; padding:4px 0;")
+            root.addWidget(self.lbl_meta)
+
+            self.listw = QListWidget()
+            self.listw.setSpacing(6)
+            root.addWidget(self.listw, 1)
+
+        self.reload()
+
+        try:
+            if hasattr(self.parent(), "refresh_preview"):
+                self.parent().refresh_preview()
+        except Exception:
+            pass
+
+    def _migrate_delil_cekmece_meta_to_taslak(self):
+        """
+        Eski yapıda delil_cekmece resimleri rapor_meta_ekler(Bolum='delil_cekmece') içinde duruyordu.
+        Yeni yapıda hepsi rapor_taslagi içinde olmalı (tek sıra/tek liste için).
+        Bu fonksiyon varsa eski kayıtları rapor_taslagi'na taşır ve meta_ekler tarafını temizler.
+        """
+        if self.bolum != "delil_cekmece":
+            return
+
+        try:
+            with DB() as conn:
+                # meta_ekler tablosu yoksa/kolonlar farklıysa sessiz geç
+                try:
+                    cols = {r[1] for r in conn.execute("PRAGMA table_info(rapor_meta_ekler)").fetchall()}
+                    if not cols:
+                        return
+                except Exception:
+                    return
+
+                # delil_cekmece kayıtlarını çek
+                try:
+                    rows = conn.execute("""
+                        SELECT id, DosyaAdi, DosyaYolu, Aciklama
+                        FROM rapor_meta_ekler
+                        WHERE ProjeID=? AND Bolum='delil_cekmece'
+                        ORDER BY id ASC
+                    """, (int(self.project_id),)).fetchall()
+                except Exception:
+                    return
+
+                if not rows:
+                    return
+
+                # rapor_taslagi'nda en sona eklemek için max sıra
+                cur = conn.cursor()
+                last_order = cur.execute(
+                    "SELECT MAX(Sira) FROM rapor_taslagi WHERE ProjeID=?",
+                    (int(self.project_id),)
+                ).fetchone()[0]
+                new_order = (last_order or 0)
+
+                # rapor_taslagi kolonlarını dinamik oku (eski db sürümleriyle uyumlu)
+                tcols = [r[1] for r in cur.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
+
+                for mid, fname, fpath, mdesc in rows:
+                    if not fpath:
+                        continue
+
+                    new_order += 1
+                    title = str(fname or os.path.basename(str(fpath)) or "Delil")
+
+                    # rapor_taslagi insert (add_evidence_to_report mantığına paralel)
+                    keys = ["ProjeID", "GSMNo", "Baslik", "Icerik", "Tur", "Tarih", "Sira"]
+                    vals = [
+                        int(self.project_id), "", title, str(fpath), "IMAGE",
+                        datetime.now().strftime("%d.%m.%Y %H:%M"), int(new_order)
+                    ]
+
+                    # genişlik default 80 (delil resimleri için)
+                    if "GenislikYuzde" in tcols:
+                        keys.append("GenislikYuzde"); vals.append(100)
+                    if "YukseklikMm" in tcols:
+                        keys.append("YukseklikMm"); vals.append(0)
+                    if "Hizalama" in tcols:
+                        keys.append("Hizalama"); vals.append("center")
+                    if "Aciklama" in tcols:
+                        keys.append("Aciklama"); vals.append(str(mdesc or ""))
+                    if "HtmlIcerik" in tcols:
+                        keys.append("HtmlIcerik"); vals.append(None)
+                    if "ImagePath" in tcols:
+                        keys.append("ImagePath"); vals.append(str(fpath))
+
+                    q_marks = ",".join(["?"] * len(keys))
+                    col_names = ",".join(keys)
+                    cur.execute(f"INSERT INTO rapor_taslagi ({col_names}) VALUES ({q_marks})", vals)
+
+                    # meta_ekler kaydını sil
+                    cur.execute("DELETE FROM rapor_meta_ekler WHERE id=?", (int(mid),))
+
+                conn.commit()
+
+        except Exception:
+            # migration hata verirse UI'yı kilitlemeyelim
+            return
+
+    def _ensure_evidence_dir(self) -> str:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+        evidence_dir = os.path.join(base_dir, "evidence_images")
+        if not os.path.exists(evidence_dir):
+            os.makedirs(evidence_dir)
+        return evidence_dir
+
+    def _edit_evidence_props(self, eid: int):
+        """
+        rapor_taslagi için delil başlığı + genişlik ayarı.
+        UI: MetaEkPropsDialog ile aynı stile çekildi (slider + Kaydet/Vazgeç).
+        """
+        try:
+            eid = int(eid)
+        except Exception:
+            return
+
+        # Mevcut değerleri oku
+        with DB() as conn:
+            row = conn.execute(
+                "SELECT id, Baslik, COALESCE(GenislikYuzde, 100), COALESCE(Tur,''), "
+                "COALESCE(HtmlIcerik,''), COALESCE(BaseHtmlIcerik,''), "
+                "COALESCE(HiddenColsJson,''), COALESCE(FmtJson,''), TabloJson "
+                "FROM rapor_taslagi WHERE id=? AND ProjeID=?",
+                (eid, int(self.project_id))
+            ).fetchone()
+
+        if not row:
+            return
+
+        rid, cur_title, cur_w, cur_tur, cur_html, base_html, hidden_json, fmt_json, tablo_json = row
+
+        cur_tur = str(cur_tur or "")
+        is_table = (cur_tur.upper() == "TABLE")
+
+        try:
+            cur_w = int(cur_w or 100)
+        except Exception:
+            cur_w = 100
+
+        # ✅ base boşsa backfill (senin örnek verdiğin “base boşsa backfill” tam burası)
+        if (not base_html) and cur_html:
+            base_html = cur_html
+
+        # ✅ yapısal tablo: yoksa (migration öncesi kayıt) bir kez üret, kaydederken yazılır
+        table_struct = table_struct_loads(tablo_json) if is_table else None
+        if is_table and table_struct is None and tablo_json is None:
+            table_struct = table_struct_from_html(base_html)
+        is_table = (cur_tur.upper() == "TABLE")
+        try:
+            cur_w = int(cur_w or 100)
+        except Exception:
+            cur_w = 100
+
+        # ✅ Ekler ile aynı UI yaklaşımı
+        dlg = EvidencePropsDialog(
+            self,
+            str(cur_title or ""),
+            int(cur_w),
+            is_table=is_table,
+            table_html=str(cur_html or ""),
+            base_html=str(base_html or ""),
+            hidden_json=str(hidden_json or ""),
+            fmt_json=str(fmt_json or ""),
+            table_struct=table_struct,
+        )
+        if dlg.exec() != 1:
+            return
+
+        new_title, new_w, hidden_cols, fmt = dlg.values()
+
+        # DB güncelle
+        with DB() as conn:
+            if is_table and table_struct:
+                # ✅ yapısal tablo: gizleme + renk tek geçişte (HTML parse yok)
+                hidden_list = dlg.hidden_cols_list()
+                html_out = render_table_html(table_struct, hidden_list, fmt if isinstance(fmt, dict) else None)
+
+                conn.execute(
+                    "UPDATE rapor_taslagi SET Baslik=?, GenislikYuzde=?, "
+                    "BaseHtmlIcerik=?, HtmlIcerik=?, HiddenColsJson=?, FmtJson=?, TabloJson=? "
+                    "WHERE id=? AND ProjeID=?",
+                    (
+                        new_title, int(new_w),
+                        dlg.base_html,
+                        html_out,
+                        json.dumps(hidden_list, ensure_ascii=False),
+                        (json.dumps(fmt, ensure_ascii=False) if isinstance(fmt, dict) else ""),
+                        table_struct_dumps(table_struct),
+                        rid, int(self.project_id)
+                    )
+                )
+            elif is_table and isinstance(cur_html, str) and cur_html.strip():
+                # 1) kolon gizleme (checkbox’a göre)
+                hidden = hidden_cols or set()
+                html1 = _apply_hidden_cols_to_table_html(cur_html, hidden)
+
+                # 2) renklendirme (hücre/satır/sütun)
+                if isinstance(fmt, dict) and fmt:
+                    html2 = _apply_fmt_to_table_html(html1, fmt)
+                else:
+                    html2 = html1
+
+                hidden_list = dlg.hidden_cols_list()
+                hidden_json_out = json.dumps(hidden_list, ensure_ascii=False)
+
+                # BaseHtmlIcerik'i sakla; HtmlIcerik'i artık base olarak tut (istersen aynı bırak)
+                conn.execute(
+                    "UPDATE rapor_taslagi SET Baslik=?, GenislikYuzde=?, "
+                    "BaseHtmlIcerik=?, HtmlIcerik=?, HiddenColsJson=?, FmtJson=? "
+                    "WHERE id=? AND ProjeID=?",
+                    (
+                        new_title, int(new_w),
+                        dlg.base_html,            # base sabit kalsın
+                        html2,                    # ✅ preview'e uygulanmış sonuç HtmlIcerik'e yazılsın
+                        hidden_json_out,
+                        (json.dumps(fmt, ensure_ascii=False) if isinstance(fmt, dict) else ""),
+                        rid, int(self.project_id)
+                    )
+                )
+            else:
+                conn.execute(
+                    "UPDATE rapor_taslagi SET Baslik=?, GenislikYuzde=? WHERE id=? AND ProjeID=?",
+                    (new_title, int(new_w), eid, int(self.project_id))
+                )
+            conn.commit()
+
+        # Yenile
+        self.reload()
+        self.changed_any.emit()
+        try:
+            if hasattr(self.parent(), "refresh_preview"):
+                self.parent().refresh_preview()
+        except Exception:
+            pass
+
+    def _edit_props(self, db_id: int):
+        with DB() as conn:
+            row = conn.execute(
+                "SELECT DosyaAdi, COALESCE(DosyaAdiGizle,0), COALESCE(GenislikYuzde,80) "
+                "FROM rapor_meta_ekler WHERE id=? AND ProjeID=?",
+                (int(db_id), self.project_id)
+            ).fetchone()
+
+        if not row:
+            return
+
+        cur_name, hide_name, width_pct = row
+        dlg = MetaEkPropsDialog(self, cur_name or "", bool(hide_name), int(width_pct) if width_pct else 80)
+        if dlg.exec() != 1:
+            return
+
+        new_name, new_hide, new_width = dlg.values()
+
+        with DB() as conn:
+            conn.execute(
+                "UPDATE rapor_meta_ekler SET DosyaAdi=?, DosyaAdiGizle=?, GenislikYuzde=? "
+                "WHERE id=? AND ProjeID=?",
+                (new_name, 1 if new_hide else 0, int(new_width), int(db_id), self.project_id)
+            )
+            conn.commit()
+
+        self.reload()
+        self.changed_any.emit()
+        # rapor önizleme yenilemen hangi fonksiyonsa onu çağır:
+        try:
+            if hasattr(self.parent(), "refresh_preview"):
+                self.parent().refresh_preview()
+        except Exception:
+            pass
+
+    def reload(self):
+        if self.bolum == "delil_cekmece":
+            # ✅ Tek liste: rapor_taslagi
+            if not hasattr(self, "listw_evidence") or self.listw_evidence is None:
+                return
+
+            self.listw_evidence.clear()
+
+            with DB() as conn:
+                tcols = {r[1] for r in conn.execute("PRAGMA table_info(rapor_taslagi)").fetchall()}
+                gid_expr = "GorselID" if "GorselID" in tcols else "NULL AS GorselID"
+                rows = conn.execute(f"""
+                    SELECT id, COALESCE(Sira, 999999) AS S, Baslik, Tur, Aciklama, {gid_expr}
+                    FROM rapor_taslagi
+                    WHERE ProjeID=?
+                    ORDER BY COALESCE(Sira, 999999) ASC, id ASC
+                """, (int(self.project_id),)).fetchall()
+
+                try:
+                    thumbs = EvidenceStore.thumb_paths(conn, [r[5] for r in rows])
+                except Exception:
+                    thumbs = {}
+
+            ek_no = 1
+            for (eid, sira, baslik, tur, acik, gorsel_id) in rows:
+                title = f"Ek-{ek_no} - {str(baslik or '').strip()}"
+                if not str(baslik or "").strip():
+                    # Baslik boşsa en azından türü göster
+                    title = f"Ek-{ek_no} - {str(tur or 'DELIL')}"
+
+                has_desc = bool(str(acik or "").strip())
+
+                item = QListWidgetItem()
+                roww = EvidenceRowWidget(int(eid), title, has_desc, self, thumb_path=thumbs.get(gorsel_id))
+
+                # sinyaller (mevcut fonksiyonlarını kullanıyoruz)
+                roww.clicked.connect(lambda eid: self._focus_item(eid, "delil_cekmece"))
+                roww.edit_desc.connect(self._edit_evidence_desc)
+                roww.edit_props.connect(self._edit_evidence_props)
+                roww.move_up.connect(lambda _eid, self=self: self._move_evidence(_eid, -1))
+                roww.move_down.connect(lambda _eid, self=self: self._move_evidence(_eid, +1))
+                roww.deleted.connect(self._delete_evidence)
+
+                item.setSizeHint(QSize(10, 44))
+                self.listw_evidence.addItem(item)
+                self.listw_evidence.setItemWidget(item, roww)
+
+                ek_no += 1
+
+            return
+
+        # ✅ Diğer bölümler: mevcut davranış (rapor_meta_ekler)
+        self.listw.clear()
+
+        with DB() as conn:
+            cols = {r[1] for r in conn.execute("PRAGMA table_info(rapor_meta_ekler)").fetchall()}
+
+            select_cols = ["id", "DosyaAdi", "DosyaYolu", "Aciklama"]
+            if "DosyaAdiGizle" in cols:
+                select_cols.append("DosyaAdiGizle")
+            else:
+                select_cols.append("0 AS DosyaAdiGizle")
+
+            if "GenislikYuzde" in cols:
+                select_cols.append("GenislikYuzde")
+            else:
+                select_cols.append("100 AS GenislikYuzde")
+
+            sql = f"""
+                SELECT {",".join(select_cols)}
+                FROM rapor_meta_ekler
+                WHERE ProjeID=? AND Bolum=?
+                ORDER BY id ASC
+            """
+            rows = conn.execute(sql, (int(self.project_id), str(self.bolum))).fetchall()
+
+        ek_no = 1
+        for row in rows:
+            # row: id, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle, GenislikYuzde
+            db_id, fname, fpath, desc, gizle, w = row
+
+            has_desc = bool(str(desc or "").strip())
+            if int(gizle or 0) == 1:
+                title = f"Ek-{ek_no}"
+            else:
+                title = f"Ek-{ek_no} - {fname}"
+
+            item = QListWidgetItem()
+            roww = MetaEkRowWidget(int(db_id), title, has_desc, self)
+
+            roww.clicked.connect(lambda mid: self._focus_item(mid, "dosya_ek"))
+            roww.edit_desc.connect(self._edit_desc)
+            roww.edit_props.connect(self._edit_props)
+            roww.deleted.connect(self._delete_item)
+
+            item.setSizeHint(QSize(10, 44))
+            self.listw.addItem(item)
+            self.listw.setItemWidget(item, roww)
+
+            ek_no += 1
+
+    def _delete_evidence(self, eid: int):
+        title_txt = ""
+        try:
+            with DB() as conn:
+                row = conn.execute(
+                    "SELECT Baslik FROM rapor_taslagi WHERE id=? AND ProjeID=?",
+                    (eid, self.project_id)
+                ).fetchone()
+                if row and row[0]:
+                    title_txt = str(row[0]).strip()
+        except Exception:
+            title_txt = ""
+
+        msg = f"Bu delili ({title_txt}) silmek istiyor musunuz?" if title_txt else "Bu delili silmek istiyor musunuz?"
+
+        ok = ModernDialog.show_question(
+            self,
+            "Sil",
+            msg,
+            "Evet",
+            "Hayır"
+        )
+        if not ok:
+            return
+
+        with DB() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "DELETE FROM rapor_taslagi WHERE id=? AND ProjeID=?",
+                (eid, self.project_id)
+            )
+            conn.commit()
+
+        self.reload()
+        self.changed_any.emit()
+
+    def _persist_delil_order(self):
+        if self.bolum != "delil_cekmece":
+            return
+
+        with DB() as conn:
+            s = 10
+            for i in range(self.listw.count()):
+                it = self.listw.item(i)
+                kind, _id = it.data(Qt.ItemDataRole.UserRole) or (None, None)
+                if kind == "meta":
+                    conn.execute("UPDATE rapor_meta_ekler SET Sira=? WHERE id=? AND ProjeID=?",
+                                 (s, int(_id), int(self.project_id)))
+                elif kind == "taslak":
+                    conn.execute("UPDATE rapor_taslagi SET Sira=? WHERE id=? AND ProjeID=?",
+                                 (s, int(_id), int(self.project_id)))
+                s += 10
+            conn.commit()
+
+        self.changed_any.emit()
+        try:
+            if hasattr(self.parent(), "refresh_preview"):
+                self.parent().refresh_preview()
+        except Exception:
+            pass
+
+    def _move_evidence(self, eid: int, direction: int):
+        """
+        rapor_taslagi.Sira swap ile yukarı/aşağı taşır.
+        direction: -1 (yukarı), +1 (aşağı)
+        """
+        try:
+            eid = int(eid)
+            direction = -1 if int(direction) < 0 else 1
+        except Exception:
+            return
+
+        with DB() as conn:
+            rows = conn.execute("""
+                SELECT id, COALESCE(Sira, 999999) AS S
+                FROM rapor_taslagi
+                WHERE ProjeID=?
+                ORDER BY S ASC, id ASC
+            """, (int(self.project_id),)).fetchall()
+
+            ids = [r[0] for r in rows]
+            sira_map = {r[0]: r[1] for r in rows}
+
+            if eid not in ids:
+                return
+
+            idx = ids.index(eid)
+            j = idx + direction
+            if j < 0 or j >= len(ids):
+                return
+
+            other_id = ids[j]
+
+            s1 = sira_map.get(eid, 999999)
+            s2 = sira_map.get(other_id, 999999)
+
+            conn.execute("UPDATE rapor_taslagi SET Sira=? WHERE id=?", (int(s2), int(eid)))
+            conn.execute("UPDATE rapor_taslagi SET Sira=? WHERE id=?", (int(s1), int(other_id)))
+            conn.commit()
+
+        self.reload()
+        self.changed_any.emit()
+        try:
+            if hasattr(self.parent(), "refresh_preview"):
+                self.parent().refresh_preview()
+        except Exception:
+            pass
+
+    def _edit_evidence_desc(self, eid: int):
+        try:
+            eid = int(eid)
+        except Exception:
+            return
+
+        with DB() as conn:
+            row = conn.execute(
+                "SELECT Aciklama FROM rapor_taslagi WHERE id=? AND ProjeID=?",
+                (eid, int(self.project_id))
+            ).fetchone()
+            current_text = row[0] if row else ""
+
+        # ✅ Ekler bölümündekiyle aynı: Zengin metin editörü
+        dlg = RichDescriptionDialog(self, current_text, "Delil Açıklaması Düzenle")
+        if not dlg.exec():
+            return
+
+        new_text = dlg.get_html()
+
+        with DB() as conn:
+            conn.execute(
+                "UPDATE rapor_taslagi SET Aciklama=? WHERE id=? AND ProjeID=?",
+                (new_text, eid, int(self.project_id))
+            )
+            conn.commit()
+
+        self.reload()
+        self.changed_any.emit()
+        try:
+            if hasattr(self.parent(), "refresh_preview"):
+                self.parent().refresh_preview()
+        except Exception:
+            pass
+
+
+    def _focus_item(self, db_id: int, bolum: str):
+        dlg = self.parent()
+        while dlg and not hasattr(dlg, "scroll_to_meta_ek"):
+            dlg = dlg.parent()
+
+        if not dlg:
+            return
+
+        # ✅ DELİL ÇEKMECESİ
+        if bolum == "delil_cekmece":
+            dlg.scroll_to_meta_ek(db_id)
+
+        # ✅ DOSYA HAKKINDAKİ EKLER (SADECE META-EK)
+        else:
+            dlg.scroll_to_metaek_only(db_id)
+
+    def _edit_desc(self, db_id: int):
+        with DB() as conn:
+            row = conn.execute(
+                "SELECT Aciklama FROM rapor_meta_ekler WHERE id=? AND ProjeID=?",
+                (db_id, self.project_id)
+            ).fetchone()
+        current_text = row[0] if row else ""
+
+        dlg = RichDescriptionDialog(self, current_text, "Ek Açıklaması Düzenle")
+        if dlg.exec():
+            new_text = dlg.get_html()
+            with DB() as conn:
+                conn.execute(
+                    "UPDATE rapor_meta_ekler SET Aciklama=? WHERE id=? AND ProjeID=?",
+                    (new_text, db_id, self.project_id)
+                )
+                conn.commit()
+            self.reload()
+            self.changed_any.emit()
+
+    def add_from_disk(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Delil Resmi Seç",
+            "",
+            "Resimler (*.png *.jpg *.jpeg *.bmp *.webp)"
+        )
+        if not file_path:
+            return
+
+        # sadece delil_cekmece için: resmi delil deposuna al ve rapor_taslagi'na ekle
+        if self.bolum == "delil_cekmece":
+            with DB() as conn:
+                gorsel_id, dest = EvidenceStore.put_file(conn, file_path, "delil")
+            if not dest:
+                ModernDialog.show_error(self, "Hata", "Resim kopyalanamadı.")
+                return
+
+            try:
+                with DB() as conn:
+                    cur = conn.cursor()
+
+                    last_order = cur.execute(
+                        "SELECT MAX(Sira) FROM rapor_taslagi WHERE ProjeID=?",
+                        (int(self.project_id),)
+                    ).fetchone()[0]
+                    new_order = (last_order or 0) + 1
+
+                    # başlık: dosya adı (istersen burada başka kural koyabilirsin)
+                    title = os.path.basename(dest)
+
+                    cols = [r[1] for r in cur.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
+
+                    keys = ["ProjeID", "GSMNo", "Baslik", "Icerik", "Tur", "Tarih", "Sira"]
+                    vals = [
+                        int(self.project_id), "", title, dest, "IMAGE",
+                        datetime.now().strftime("%d.%m.%Y %H:%M"),
+                        int(new_order)
+                    ]
+
+                    # delil resimleri için varsayılanlar
+                    if "GenislikYuzde" in cols: keys.append("GenislikYuzde"); vals.append(80)
+                    if "YukseklikMm" in cols:   keys.append("YukseklikMm");   vals.append(0)
+                    if "Hizalama" in cols:      keys.append("Hizalama");      vals.append("center")
+                    if "Aciklama" in cols:      keys.append("Aciklama");      vals.append("")
+                    if "HtmlIcerik" in cols:    keys.append("HtmlIcerik");    vals.append(None)
+                    if "ImagePath" in cols:     keys.append("ImagePath");     vals.append(dest)
+                    if "GorselID" in cols and gorsel_id:
+                        keys.append("GorselID"); vals.append(int(gorsel_id))
+
+                    q_marks = ",".join(["?"] * len(keys))
+                    col_names = ",".join(keys)
+                    cur.execute(f"INSERT INTO rapor_taslagi ({col_names}) VALUES ({q_marks})", vals)
+
+                    conn.commit()
+
+                self.reload()
+                self.changed_any.emit()
+                try:
+                    if hasattr(self.parent(), "refresh_preview"):
+                        self.parent().refresh_preview()
+                except Exception:
+                    pass
+
+                ModernDialog.show_success(self, "Eklendi", "Delil resim dosyası delil listesine eklendi.")
+                return
+
+            except Exception as e:
+                ModernDialog.show_error(self, "Hata", str(e))
+                return
+
+        # diğer bölümler: mevcut davranış (rapor_meta_ekler)
+        try:
+            self._ensure_evidence_dir()
+
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            evidence_dir = os.path.join(base_dir, "evidence_images")
+            if not os.path.exists(evidence_dir):
+                os.makedirs(evidence_dir)
+
+            ts = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            ext = os.path.splitext(file_path)[1].lower() or ".png"
+            safe_name = f"ek_{ts}{ext}"
+            dest = os.path.join(evidence_dir, safe_name)
+
+            shutil.copy2(file_path, dest)
+
+            with DB() as conn:
+                cols = {r[1] for r in conn.execute("PRAGMA table_info(rapor_meta_ekler)").fetchall()}
+                has_hide = "DosyaAdiGizle" in cols
+                has_w = "GenislikYuzde" in cols
+
+                if has_hide and has_w:
+                    conn.execute(
+                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle, GenislikYuzde) "
+                        "VALUES (?,?,?,?,?,?,?)",
+                        (int(self.project_id), str(self.bolum), os.path.basename(dest), dest, "", 0, 100),
+                    )
+                elif has_hide and (not has_w):
+                    conn.execute(
+                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle) "
+                        "VALUES (?,?,?,?,?,?)",
+                        (int(self.project_id), str(self.bolum), os.path.basename(dest), dest, "", 0),
+                    )
+                elif (not has_hide) and has_w:
+                    conn.execute(
+                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama, GenislikYuzde) "
+                        "VALUES (?,?,?,?,?,?)",
+                        (int(self.project_id), str(self.bolum), os.path.basename(dest), dest, "", 100),
+                    )
+                else:
+                    conn.execute(
+                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama) "
+                        "VALUES (?,?,?,?,?)",
+                        (int(self.project_id), str(self.bolum), os.path.basename(dest), dest, ""),
+                    )
+                conn.commit()
+
+            self.reload()
+            self.changed_any.emit()
+
+            try:
+                if hasattr(self.parent(), "refresh_preview"):
+                    self.parent().refresh_preview()
+            except Exception:
+                pass
+
+        except Exception as e:
+            ModernDialog.show_error(self, "Hata", str(e))
+
+
+    def _delete_item(self, db_id: int):
+        # ✅ Silmeden önce program tarzı onay sor (dosya adını da göster)
+        try:
+            bolum = (getattr(self, "bolum", "") or "").strip()
+            if not bolum:
+                bolum = "Ek"
+
+            dosya_adi = ""
+            dosya_yolu = ""
+
+            with DB() as conn:
+                row = conn.execute(
+                    "SELECT COALESCE(DosyaAdi,''), COALESCE(DosyaYolu,''), COALESCE(Bolum,'') "
+                    "FROM rapor_meta_ekler WHERE id=?",
+                    (db_id,)
+                ).fetchone()
+
+            if row:
+                dosya_adi = (row[0] or "").strip()
+                dosya_yolu = (row[1] or "").strip()
+                if not bolum:
+                    bolum = (row[2] or "").strip() or "Ek"
+
+            # DosyaAdi boşsa dosya yolundan türet
+            if not dosya_adi and dosya_yolu:
+                try:
+                    dosya_adi = os.path.basename(dosya_yolu)
+                except Exception:
+                    dosya_adi = ""
+
+            # Kullanıcıya gösterilecek isim
+            shown = dosya_adi if dosya_adi else bolum
+
+            ok = ModernDialog.show_question(
+                self,
+                f"{bolum} Sil",
+                f"Seçili kayıt ({shown}) silinecek. Emin misiniz?",
+                yes_btn="Evet",
+                no_btn="Hayır"
+            )
+            if not ok:
+                return
+
+        except Exception:
+            return
+
+        # ✅ Silme işlemi
+        row = None
+        with DB() as conn:
+            row = conn.execute(
+                "SELECT DosyaYolu FROM rapor_meta_ekler WHERE id=?",
+                (db_id,)
+            ).fetchone()
+            conn.execute("DELETE FROM rapor_meta_ekler WHERE id=?", (db_id,))
+
+        try:
+            if row and row[0] and os.path.exists(row[0]):
+                os.remove(row[0])
+        except Exception:
+            pass
+
+        self.reload()
+        self.changed_any.emit()
+
+
+    def _update_desc(self, db_id: int, desc: str):
+        with DB() as conn:
+            conn.execute("UPDATE rapor_meta_ekler SET Aciklama=? WHERE id=?", (desc, db_id))
+        self.changed_any.emit()
+
+
+class ReportCenterDialog(QDialog):
+    """
+    Rapor ve Tasarım Merkezi
+    - Sol: metin editörleri + delil çekmecesi + devre dışı checkbox’lar + marginler
+    - Sağ: QWebEngineView canlı önizleme
+    """
+
+    def __init__(self, parent, project_id: int):
+        super().__init__(parent)
+        self.setWindowTitle("Rapor ve Tasarım Merkezi")
+        self.setWindowState(Qt.WindowState.WindowMaximized)
+
+        project_id = int(project_id)  # burada patlaması doğru
+        self.project_id = project_id
+        self.builder = ReportHtmlBuilder(project_id)
+
+        self.preview = None
+        self.ed_gorev = None
+        self.ed_dosya = None
+        self.ed_genel = None
+        self.ed_deg = None
+        self.ed_sonuc = None
+        self.blocks_table = None
+
+        self.cb_gorev = None
+        self.cb_dosya = None
+        self.cb_genel = None
+        self.cb_delillers = None
+        self.cb_deg = None
+        self.cb_sonuc = None
+        self.cb_taraflar = None
+
+        # ✅ KRİTİK: açılışta DB’ye yazmayı kilitle
+        self._loading_meta = True
+        self._meta_ready = False
+
+        self._build_ui()
+        self._load_meta_to_ui()          # editörler burada dolar
+        self.load_blocks_into_table()
+
+        # autosave bağlantılarını meta yüklendikten SONRA bağla
+        self._wire_meta_autosave()
+
+        self._loading_meta = False
+        self._meta_ready = True
+
+        self.refresh_preview()           # artık güvenli
+        self.loader = LoadingOverlay(self)
+
+        # ✅ PDF motorunu arka planda ısıt (ilk dışa aktarımda Chromium açılışı beklenmesin)
+        QTimer.singleShot(1500, ChromiumRenderService.warm_up)
+
+    def _wire_meta_autosave(self):
+        if getattr(self, "_meta_autosave_wired", False):
+            return
+        self._meta_autosave_wired = True
+
+        for ed in (self.ed_gorev, self.ed_dosya, self.ed_genel, self.ed_deg, self.ed_sonuc):
+            if ed is None:
+                continue
+            ed.textChanged.connect(self.save_meta_silent)
+
+    def closeEvent(self, event):
+        try:
+            self.save_meta_silent()   # son değişiklik DB’ye gitsin
+        except Exception:
+            pass
+        super().closeEvent(event)
+
+    def _norm_pid(self):
+        pid = getattr(self, "project_id", None)
+        if pid is None:
+            return None
+        # her yerde aynı: önce int dene
+        try:
+            return int(str(pid).strip())
+        except Exception:
+            return str(pid).strip()
+
+    def _build_ui(self):
+        # --- Ana yerleşim ---
+        main = QHBoxLayout(self)
+        main.setContentsMargins(10, 10, 10, 10)
+
+        splitter = QSplitter(Qt.Orientation.Horizontal)
+        main.addWidget(splitter)
+
+        # --- SOL PANEL ---
+        left_panel = QWidget()
+        left_panel.setMinimumWidth(520)
+
+        left_outer = QVBoxLayout(left_panel)
+        left_outer.setContentsMargins(0, 0, 0, 0)
+        left_outer.setSpacing(10)
+
+        # Sol içerik scroll içinde olsun
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.Shape.NoFrame)
+
+        left_container = QWidget()
+        left = QVBoxLayout(left_container)              # ✅ left artık TANIMLI
+        left.setContentsMargins(0, 0, 0, 0)
+        left.setSpacing(10)
+
+        scroll.setWidget(left_container)
+        left_outer.addWidget(scroll)
+
+        # --- Sağ panel (önizleme) ---
+        right_panel = QWidget()
+        right = QVBoxLayout(right_panel)
+        right.setContentsMargins(0, 0, 0, 0)
+        right.setSpacing(10)
+
+        splitter.addWidget(left_panel)
+        splitter.addWidget(right_panel)
+        splitter.setStretchFactor(0, 0)
+        splitter.setStretchFactor(1, 1)
+        try:
+            splitter.setSizes([560, 1200])
+        except Exception:
+            pass
+
+        # --- Meta editörleri (veri deposu) ---
+        self.ed_gorev = QTextEdit()
+        self.ed_dosya = QTextEdit()
+        self.ed_genel = QTextEdit()
+        self.ed_deg = QTextEdit()
+        self.ed_sonuc = QTextEdit()
+
+        # --- Kompakt kart üreticisi ---
+        def _make_card(title: str, cb_attr_name: str, on_edit, on_reset=None):
+            card = QFrame()
+            card.setStyleSheet(
+                "QFrame{background:#ffffff;border:1px solid #dcdcdc;border-radius:8px;}"
+            )
+            lay = QVBoxLayout(card)
+            lay.setContentsMargins(10, 8, 10, 8)
+            lay.setSpacing(6)
+
+            header = QHBoxLayout()
+            header.setContentsMargins(0, 0, 0, 0)
+            header.setSpacing(8)
+
+            lbl = QLabel(title)
+            lbl.setStyleSheet("font-weight:800; color:#2c3e50; font-size:12px; text-transform:uppercase;")
+            header.addWidget(lbl)
+            header.addStretch(1)
+
+            btn_edit = QPushButton("📝 Düzenle")
+            btn_edit.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn_edit.setStyleSheet(
+                "QPushButton{background:#ecf0f1;border:1px solid #bdc3c7;border-radius:6px;padding:6px 10px;font-weight:700;color:#7f8c8d;}"
+                "QPushButton:hover{background:#dfe6e9;}"
+            )
+            btn_edit.clicked.connect(on_edit)
+            header.addWidget(btn_edit)
+
+            if on_reset is not None:
+                btn_reset = QPushButton("↩ Varsayılan")
+                btn_reset.setCursor(Qt.CursorShape.PointingHandCursor)
+                btn_reset.setStyleSheet(
+                    "QPushButton{background:transparent;border:none;color:#7f8c8d;font-weight:700;}"
+                    "QPushButton:hover{color:#2c3e50;}"
+                )
+                btn_reset.clicked.connect(on_reset)
+                header.addWidget(btn_reset)
+
+            cb = QCheckBox("Gizle")
+            setattr(self, cb_attr_name, cb)
+            cb.stateChanged.connect(self.refresh_preview)
+            header.addWidget(cb)
+
+            lay.addLayout(header)
+
+            summary = QLabel("-")
+            summary.setWordWrap(True)
+            summary.setStyleSheet("color:#7f8c8d; font-size:11px;")
+            lay.addWidget(summary)
+            return card, summary
+
+        # --- Taraflar ---
+        card_taraf = QFrame()
+        card_taraf.setStyleSheet("QFrame{background:#ffffff;border:1px solid #dcdcdc;border-radius:8px;}")
+        l_tar = QHBoxLayout(card_taraf)
+        l_tar.setContentsMargins(10, 8, 10, 8)
+        lbl_tar = QLabel("TARAFLAR")
+        lbl_tar.setStyleSheet("font-weight:800; color:#2c3e50; font-size:12px; text-transform:uppercase;")
+        l_tar.addWidget(lbl_tar)
+        l_tar.addStretch(1)
+        self.cb_taraflar = QCheckBox("Gizle")
+        self.cb_taraflar.stateChanged.connect(self.refresh_preview)
+        l_tar.addWidget(self.cb_taraflar)
+        left.addWidget(card_taraf)
+
+        # --- Bölüm kartları ---
+        self.lbl_sum_gorev = None
+        self.lbl_sum_dosya = None
+        self.lbl_sum_genel = None
+        self.lbl_sum_deg = None
+        self.lbl_sum_sonuc = None
+
+        card_g, self.lbl_sum_gorev = _make_card(
+            "1. GÖREVLENDİRME", "cb_gorev",
+            on_edit=lambda: self._open_meta_editor("gorev"),
+            on_reset=self.reset_default_gorev,
+        )
+        left.addWidget(card_g)
+
+        card_d, self.lbl_sum_dosya = _make_card(
+            "2. DOSYA HAKKINDA", "cb_dosya",
+            on_edit=lambda: self._open_meta_editor("dosya"),
+            on_reset=self.reset_default_dosya,
+        )
+        left.addWidget(card_d)
+
+        # --- 2. DOSYA HAKKINDA EKLER ---
+        dosya_ek_frame = QFrame()
+        dosya_ek_frame.setStyleSheet("QFrame{background:#ffffff;border:1px solid #dcdcdc;border-radius:8px;}")
+        dosya_ek_lay = QVBoxLayout(dosya_ek_frame)
+        dosya_ek_lay.setContentsMargins(10, 8, 10, 8)
+        dosya_ek_lay.setSpacing(6)
+
+        lbl_ek = QLabel("DOSYA HAKKINDA EKLER")
+        lbl_ek.setStyleSheet("font-weight:800; color:#2c3e50; font-size:12px; text-transform:uppercase;")
+        dosya_ek_lay.addWidget(lbl_ek)
+
+        self.pnl_dosya_ekler = MetaEkPanel(self.project_id, "dosya_hakkinda", self)
+        self.pnl_dosya_ekler.changed_any.connect(self.refresh_preview)
+        dosya_ek_lay.addWidget(self.pnl_dosya_ekler, 1)
+
+        left.addWidget(dosya_ek_frame)
+
+        card_genel, self.lbl_sum_genel = _make_card(
+            "3. HTS DOSYA VE ABONE BİLGİLERİ", "cb_genel",
+            on_edit=lambda: self._open_meta_editor("genel"),
+            on_reset=self.reset_default_genel,
+        )
+        left.addWidget(card_genel)
+
+        # --- 4. DELİL ÇEKMECESİ (MetaEkPanel) ---
+        card_delil = QFrame()
+        card_delil.setStyleSheet("QFrame{background:#ffffff;border:1px solid #dcdcdc;border-radius:8px;}")
+        l_delil = QVBoxLayout(card_delil)
+        l_delil.setContentsMargins(10, 8, 10, 8)
+        l_delil.setSpacing(6)
+
+        head_delil = QHBoxLayout()
+        head_delil.setContentsMargins(0, 0, 0, 0)
+        lbl_delil = QLabel("4. DELİL ÇEKMECESİ")
+        lbl_delil.setStyleSheet("font-weight:800; color:#2c3e50; font-size:12px; text-transform:uppercase;")
+        head_delil.addWidget(lbl_delil)
+        head_delil.addStretch(1)
+
+        self.cb_delillers = QCheckBox("Gizle")
+        self.cb_delillers.stateChanged.connect(self.refresh_preview)
+        head_delil.addWidget(self.cb_delillers)
+
+        l_delil.addLayout(head_delil)
+
+        # ✅ TEK panel: delil_cekmece (deliller diye ikinci kez ezme yok)
+        self.pnl_delil_ekler = MetaEkPanel(self.project_id, "delil_cekmece", self)
+        self.pnl_delil_ekler.changed_any.connect(self.refresh_preview)
+        l_delil.addWidget(self.pnl_delil_ekler)
+
+        left.addWidget(card_delil)
+
+        card_deg, self.lbl_sum_deg = _make_card(
+            "5. DEĞERLENDİRME", "cb_deg",
+            on_edit=lambda: self._open_meta_editor("deg"),
+        )
+        left.addWidget(card_deg)
+
+        card_s, self.lbl_sum_sonuc = _make_card(
+            "6. SONUÇ", "cb_sonuc",
+            on_edit=lambda: self._open_meta_editor("sonuc"),
+        )
+        left.addWidget(card_s)
+
+        left.addStretch(1)
+
+        # --- Sol alt aksiyon barı (scroll DIŞI) ---
+        action_layout = QHBoxLayout()
+        action_layout.setSpacing(10)
+        action_layout.setContentsMargins(0, 0, 0, 0)
+
+        btn_reset_all = QPushButton("Sıfırla")
+        btn_reset_all.setCursor(Qt.CursorShape.PointingHandCursor)
+        btn_reset_all.setStyleSheet("background-color:#c0392b; color:white; font-weight:bold; border-radius:6px; padding:10px;")
+        btn_reset_all.clicked.connect(self.reset_all_defaults)
+        action_layout.addWidget(btn_reset_all)
+
+        btn_save_text = QPushButton("💾 Kaydet")
+        btn_save_text.setCursor(Qt.CursorShape.PointingHandCursor)
+        btn_save_text.setToolTip("Manuel Kaydet")
+        btn_save_text.setStyleSheet("background-color:#2980b9; color:white; font-weight:bold; border-radius:6px; padding:10px;")
+        btn_save_text.clicked.connect(self.save_meta)
+        action_layout.addWidget(btn_save_text)
+
+        btn_style = QPushButton("🎨 Ayarlar")
+        btn_style.setCursor(Qt.CursorShape.PointingHandCursor)
+        btn_style.setStyleSheet("background-color:#8e44ad; color: white; font-weight: bold; border-radius: 6px; padding: 10px;")
+        btn_style.clicked.connect(self.open_style_editor)
+        action_layout.addWidget(btn_style)
+
+        left_outer.addLayout(action_layout)
+
+        # --- SAĞ: Önizleme ---
+        if getattr(self, "preview", None) is None:
+            self.preview = QWebEngineView()
+        self.preview.setStyleSheet("border: 1px solid #bdc3c7; background:#ffffff;")
+        right.addWidget(self.preview, 1)
+        self.web = self.preview  # uyumluluk
+
+        right_btn_layout = QHBoxLayout()
+        self.btn_refresh_preview = QPushButton("🔄 Önizlemeyi Güncelle")
+        self.btn_refresh_preview.setStyleSheet("font-weight:bold; padding:10px; border-radius:6px;")
+        self.btn_refresh_preview.clicked.connect(self.refresh_preview)
+        right_btn_layout.addWidget(self.btn_refresh_preview)
+
+        btn_pdf = QPushButton("📄 PDF Olarak Kaydet")
+        btn_pdf.setStyleSheet("background-color:#27ae60; color:white; font-weight:bold; padding:10px; border-radius:6px;")
+        btn_pdf.clicked.connect(self.export_pdf)
+        right_btn_layout.addWidget(btn_pdf)
+
+        right.addLayout(right_btn_layout)
+
+    def scroll_to_metaek_only(self, metaek_id: int):
+        js = f"""
+        var el = document.getElementById('metaek-{metaek_id}');
+        if (el) {{
+            el.scrollIntoView({{ behavior: 'smooth', block: 'center' }});
+            el.style.outline = '3px solid #4CAF50';
+            setTimeout(() => el.style.outline = '', 1200);
+        }}
+        """
+        self.web.page().runJavaScript(js)
+
+    def add_evidence_image_from_disk(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Delil Resmi Seç", "", "Resimler (*.png *.jpg *.jpeg *.bmp *.webp)"
+        )
+        if not file_path:
+            return
+
+        # depoya al (aynı resim ikinci kez kopyalanmaz)
+        with DB() as conn:
+            _gid, dest = EvidenceStore.put_file(conn, file_path, "delil")
+        if not dest:
+            ModernDialog.show_error(self, "Hata", "Resim kopyalanamadı.")
+            return
+
+        # rapor_taslagi insert
+        try:
+            with DB() as conn:
+                cols = {r[1] for r in conn.execute("PRAGMA table_info(rapor_meta_ekler)").fetchall()}
+
+                # Kolonlar eski sürümde yoksa yine de insert edebilmek için
+                has_hide = "DosyaAdiGizle" in cols
+                has_w    = "GenislikYuzde" in cols
+
+                if has_hide and has_w:
+                    conn.execute(
+                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle, GenislikYuzde) "
+                        "VALUES (?,?,?,?,?,?,?)",
+                        (int(self.project_id), "delil_cekmece", os.path.basename(dest), dest, "", 0, 80),
+                    )
+                elif has_hide and (not has_w):
+                    conn.execute(
+                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama, DosyaAdiGizle) "
+                        "VALUES (?,?,?,?,?,?)",
+                        (int(self.project_id), "delil_cekmece", os.path.basename(dest), dest, "", 0),
+                    )
+                elif (not has_hide) and has_w:
+                    conn.execute(
+                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama, GenislikYuzde) "
+                        "VALUES (?,?,?,?,?,?)",
+                        (int(self.project_id), "delil_cekmece", os.path.basename(dest), dest, "", 80),
+                    )
+                else:
+                    conn.execute(
+                        "INSERT INTO rapor_meta_ekler (ProjeID, Bolum, DosyaAdi, DosyaYolu, Aciklama) "
+                        "VALUES (?,?,?,?,?)",
+                        (int(self.project_id), "delil_cekmece", os.path.basename(dest), dest, ""),
+                    )
+
+                conn.commit()
+
+            # Delil çekmecesi panelini yenile (varsa)
+            try:
+                if hasattr(self, "meta_ek_panel") and self.meta_ek_panel:
+                    self.meta_ek_panel.reload()
+            except Exception:
+                pass
+
+            self.refresh_preview()
+            ModernDialog.show_success(self, "Eklendi", "Delil dosyası delil çekmecesine eklendi.")
+        except Exception as e:
+            ModernDialog.show_error(self, "Hata", str(e))
+
+    def scroll_to_meta_ek(self, db_id: int):
+        try:
+            target = getattr(self, "web", None) or getattr(self, "preview", None)
+            if target is None:
+                return
+
+            js = f"""
+            (function() {{
+                var id = {int(db_id)};
+                var el = document.getElementById('evidence-' + id);
+                if(!el) el = document.getElementById('metaek-' + id);  // ✅ fallback
+                if(!el) return;
+                el.scrollIntoView({{behavior:'smooth', block:'center'}});
+                el.style.outline='2px solid #e74c3c';
+                setTimeout(function(){{ el.style.outline=''; }}, 1200);
+            }})();"""
+
+            target.page().runJavaScript(js)
+        except Exception as e:
+            print("scroll_to_meta_ek hata:", e)
+
+    def create_rich_editor(self, min_height=80):
+        """Üzerinde Kalın/İtalik/AltıÇizili butonları olan editör döndürür."""
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(2)
+
+        toolbar = QHBoxLayout()
+        toolbar.setSpacing(5)
+        toolbar.setContentsMargins(0, 0, 0, 0)
+
+        btn_style = """
+            QPushButton { 
+                background-color: #ecf0f1; border: 1px solid #bdc3c7; 
+                border-radius: 3px; font-weight: bold; width: 24px; height: 24px;
+                font-family: 'Times New Roman'; font-size: 14px;
+            }
+            QPushButton:hover { background-color: #dfe6e9; }
+            QPushButton:checked { background-color: #3498db; color: white; border: 1px solid #2980b9; }
+        """
+
+        editor = QTextEdit()
+        editor.setMinimumHeight(min_height)
+        editor.setStyleSheet("background-color: white; border: 1px solid #bdc3c7;")
+
+        def set_bold():
+            fmt = editor.currentCharFormat()
+            fmt.setFontWeight(QFont.Weight.Bold if fmt.fontWeight() != QFont.Weight.Bold else QFont.Weight.Normal)
+            editor.mergeCurrentCharFormat(fmt)
+            editor.setFocus()
+
+        def set_italic():
+            fmt = editor.currentCharFormat()
+            fmt.setFontItalic(not fmt.fontItalic())
+            editor.mergeCurrentCharFormat(fmt)
+            editor.setFocus()
+
+        def set_underline():
+            fmt = editor.currentCharFormat()
+            fmt.setFontUnderline(not fmt.fontUnderline())
+            editor.mergeCurrentCharFormat(fmt)
+            editor.setFocus()
+
+        btn_b = QPushButton("K")
+        btn_b.setToolTip("Kalın (Bold)")
+        btn_b.setStyleSheet(btn_style)
+        btn_b.clicked.connect(set_bold)
+
+        btn_i = QPushButton("I")
+        btn_i.setToolTip("İtalik")
+        btn_i.setStyleSheet(btn_style + "QPushButton { font-style: italic; }")
+        btn_i.clicked.connect(set_italic)
+
+        btn_u = QPushButton("A")
+        btn_u.setToolTip("Altı Çizili")
+        btn_u.setStyleSheet(btn_style + "QPushButton { text-decoration: underline; }")
+        btn_u.clicked.connect(set_underline)
+
+        toolbar.addWidget(btn_b)
+        toolbar.addWidget(btn_i)
+        toolbar.addWidget(btn_u)
+        toolbar.addStretch()
+
+        layout.addLayout(toolbar)
+        layout.addWidget(editor)
+
+        return container, editor
+
+    def _build_blocks_table(self, left_layout: QVBoxLayout):
+        self.blocks_table = QTableWidget()
+        self.blocks_table.setColumnCount(5)
+        self.blocks_table.setHorizontalHeaderLabels(["SIRA", "BAŞLIK", "TÜR", "GENİŞLİK %", "AÇIKLAMA"])
+
+        h = self.blocks_table.horizontalHeader()
+        h.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed); self.blocks_table.setColumnWidth(0, 50)
+        h.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        h.setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed); self.blocks_table.setColumnWidth(2, 70)
+        h.setSectionResizeMode(3, QHeaderView.ResizeMode.Fixed); self.blocks_table.setColumnWidth(3, 100)
+        h.setSectionResizeMode(4, QHeaderView.ResizeMode.Fixed); self.blocks_table.setColumnWidth(4, 110)
+
+        self.blocks_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.blocks_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.blocks_table.setMinimumHeight(180)
+        self.blocks_table.itemClicked.connect(self.scroll_to_evidence)
+        left_layout.addWidget(self.blocks_table)
+
+        btn_row = QHBoxLayout()
+        btn_row.setSpacing(5)
+
+        mini_btn_style = """
+            QPushButton {
+                background-color: #ecf0f1; border: 1px solid #bdc3c7; border-radius: 4px;
+                padding: 5px 10px; font-weight: bold; color: #2c3e50; font-size: 12px;
+            }
+            QPushButton:hover { background-color: #d5dbdb; }
+        """
+
+        btn_up = QPushButton("▲"); btn_up.setToolTip("Yukarı Taşı"); btn_up.setFixedWidth(40)
+        btn_up.setStyleSheet(mini_btn_style); btn_up.clicked.connect(lambda: self.move_block(-1))
+        btn_row.addWidget(btn_up)
+
+        btn_down = QPushButton("▼"); btn_down.setToolTip("Aşağı Taşı"); btn_down.setFixedWidth(40)
+        btn_down.setStyleSheet(mini_btn_style); btn_down.clicked.connect(lambda: self.move_block(1))
+        btn_row.addWidget(btn_down)
+
+        btn_save = QPushButton("Kaydet")
+        btn_save.setStyleSheet(mini_btn_style + "QPushButton { color: #2980b9; }")
+        btn_save.clicked.connect(self.save_block_edits)
+        btn_row.addWidget(btn_save)
+
+        self.btn_delete_block = QPushButton("Sil")
+        self.btn_delete_block.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.btn_delete_block.setMinimumHeight(30)
+        self.btn_delete_block.setStyleSheet(mini_btn_style + "QPushButton { color: #c0392b; }")
+        self.btn_delete_block.clicked.connect(self.delete_selected_block)
+        btn_row.addWidget(self.btn_delete_block)
+
+        btn_add_img = QPushButton("Delil Resmi Ekle (Yerel Disk)")
+        btn_add_img.clicked.connect(self.add_evidence_image_from_disk)
+        left_layout.addLayout(btn_row)
+
+    def reset_default_dosya(self):
+        self.ed_dosya.setHtml("")
+        self.refresh_preview()
+
+    def reset_default_genel(self):
+        self.ed_genel.setHtml(self.builder.build_default_genel_bilgi())
+        self.refresh_preview()
+
+    def reset_all_defaults(self):
+        self.ed_gorev.setHtml(self.builder.build_default_gorevlendirme())
+        self.ed_dosya.setHtml("")
+        self.ed_genel.setHtml(self.builder.build_default_genel_bilgi())
+        self.ed_deg.setHtml("")
+        self.ed_sonuc.setHtml("")
+        self._refresh_meta_summaries()
+        self.refresh_preview()
+
+    def _html_to_summary(self, html_text: str, max_len: int = 180) -> str:
+        try:
+            doc = QTextDocument()
+            doc.setHtml(html_text or "")
+            plain = doc.toPlainText()
+        except Exception:
+            plain = re.sub(r"<[^>]+>", " ", html_text or "")
+
+        plain = re.sub(r"\s+", " ", plain).strip()
+        if not plain:
+            return "(Metin boş)"
+        if len(plain) <= max_len:
+            return plain
+        return plain[:max_len].rstrip() + "…"
+
+    def _refresh_meta_summaries(self):
+        if getattr(self, "lbl_sum_gorev", None):
+            self.lbl_sum_gorev.setText(self._html_to_summary(self.ed_gorev.toHtml()))
+        if getattr(self, "lbl_sum_dosya", None):
+            self.lbl_sum_dosya.setText(self._html_to_summary(self.ed_dosya.toHtml()))
+        if getattr(self, "lbl_sum_genel", None):
+            self.lbl_sum_genel.setText(self._html_to_summary(self.ed_genel.toHtml()))
+        if getattr(self, "lbl_sum_deg", None):
+            self.lbl_sum_deg.setText(self._html_to_summary(self.ed_deg.toHtml()))
+        if getattr(self, "lbl_sum_sonuc", None):
+            self.lbl_sum_sonuc.setText(self._html_to_summary(self.ed_sonuc.toHtml()))
+
+    def _open_meta_editor(self, key: str):
+        mapping = {
+            "gorev": ("1. GÖREVLENDİRME", self.ed_gorev),
+            "dosya": ("2. DOSYA HAKKINDA", self.ed_dosya),
+            "genel": ("3. HTS DOSYA VE ABONE BİLGİLERİ", self.ed_genel),
+            "deg": ("5. DEĞERLENDİRME", self.ed_deg),
+            "sonuc": ("6. SONUÇ", self.ed_sonuc),
+        }
+        if key not in mapping:
+            return
+
+        title, editor = mapping[key]
+        dlg = RichDescriptionDialog(self, editor.toHtml(), f"{title} Metni Düzenle")
+        if dlg.exec():
+            editor.setHtml(dlg.get_html())
+            self.save_meta_silent()
+            self._refresh_meta_summaries()
+            self.refresh_preview()
+
+    def _normalize_html_for_store(self, html: str) -> str:
+        """
+        QTextEdit.toHtml() boşken bile 600+ karakterlik HTML iskeleti üretir.
+        DB'ye bunu yazarsan açılışta 'boş' gibi davranıp standart metinlere dönme / kaybolma olur.
+        Bu fonksiyon boş içeriği gerçekten "" yapar.
+        """
+        try:
+            doc = QTextDocument()
+            doc.setHtml(html or "")
+            if doc.toPlainText().strip() == "":
+                return ""
+        except Exception:
+            if (html or "").strip() == "":
+                return ""
+        return html or ""
+
+    def _load_meta_to_ui(self):
+        self._loading_meta = True
+        try:
+            meta = self.builder._fetch_meta()
+            if not meta:
+                self.builder._ensure_meta_row()
+                meta = self.builder._fetch_meta()
+
+            def _html_is_effectively_empty(h: str) -> bool:
+                try:
+                    doc = QTextDocument()
+                    doc.setHtml(h or "")
+                    return doc.toPlainText().strip() == ""
+                except Exception:
+                    return (h or "").strip() == ""
+
+            def mget(idx, default=""):
+                if not meta or idx >= len(meta):
+                    return default
+                v = meta[idx]
+                return default if v is None else v
+
+            gorev_db = mget(1, "")
+            dosya_db = mget(2, "")
+            genel_db = mget(3, "")
+            deg_db   = mget(4, "")
+            sonuc_db = mget(5, "")
+
+            gorev_html = self.builder.build_default_gorevlendirme() if _html_is_effectively_empty(gorev_db) else gorev_db
+            genel_html = self.builder.build_default_genel_bilgi()     if _html_is_effectively_empty(genel_db) else genel_db
+
+            # setHtml sırasında autosave tetiklenmesin
+            for ed in (self.ed_gorev, self.ed_dosya, self.ed_genel, self.ed_deg, self.ed_sonuc):
+                ed.blockSignals(True)
+            try:
+                self.ed_gorev.setHtml(gorev_html)
+                self.ed_dosya.setHtml(dosya_db or "")
+                self.ed_genel.setHtml(genel_html)
+                self.ed_deg.setHtml(deg_db or "")
+                self.ed_sonuc.setHtml(sonuc_db or "")
+            finally:
+                for ed in (self.ed_gorev, self.ed_dosya, self.ed_genel, self.ed_deg, self.ed_sonuc):
+                    ed.blockSignals(False)
+
+            self._refresh_meta_summaries()
+            try:
+                self.pnl_dosya_ekler.reload()
+            except Exception:
+                pass
+
+        finally:
+            self._loading_meta = False
+
+    def save_meta(self):
+        pid = self._norm_pid()
+        if pid is None:
+            return
+
+        try:
+            self.builder._ensure_meta_row()
+
+            g  = self._normalize_html_for_store(self.ed_gorev.toHtml())
+            d  = self._normalize_html_for_store(self.ed_dosya.toHtml())
+            ge = self._normalize_html_for_store(self.ed_genel.toHtml())
+            de = self._normalize_html_for_store(self.ed_deg.toHtml())
+            s  = self._normalize_html_for_store(self.ed_sonuc.toHtml())
+
+            with DB() as conn:
+                conn.execute("""
+                    UPDATE rapor_meta SET
+                        GorevlendirmeMetni=?,
+                        DosyaHakkindaMetni=?,
+                        GenelBilgilendirmeMetni=?,
+                        DegerlendirmeMetni=?,
+                        SonucMetni=?,
+                        GuncellemeTarihi=CURRENT_TIMESTAMP
+                    WHERE ProjeID=?
+                """, (g, d, ge, de, s, pid))
+                conn.commit()
+
+            ModernDialog.show_success(self, "Kaydedildi", "Rapor metinleri kaydedildi.")
+            self.refresh_preview()
+
+        except Exception as e:
+            ModernDialog.show_error(self, "Hata", str(e))
+
+    def _on_dosya_ek_changed(self):
+        # metin değişmiyor ama rapor HTML değişecek
+        self.refresh_preview()
+
+    def reset_default_gorev(self):
+        self.ed_gorev.setHtml(self.builder.build_default_gorevlendirme())
+        self.refresh_preview()
+
+    def _rapor_taslagi_pk_col(self, conn):
+        cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
+        return "id" if "id" in cols else "rowid"
+
+    def _rt_select_id_expr(self, conn):
+        return "id" if self._rapor_taslagi_pk_col(conn) == "id" else "rowid AS id"
+
+    def load_blocks_into_table(self):
+        if getattr(self, "blocks_table", None) is None:
+            return
+        # Tabloyu temizle
+        self.blocks_table.setRowCount(0)
+
+        # Verileri çek
+        with DB() as conn:
+            # Sira'ya göre sıralı çekiyoruz
+            rows = conn.execute(
+                "SELECT id, Sira, Baslik, Tur, GenislikYuzde, Aciklama FROM rapor_taslagi WHERE ProjeID=? ORDER BY Sira ASC",
+                (self.project_id,)
+            ).fetchall()
+
+        self.blocks_table.setRowCount(len(rows))
+
+        for i, r in enumerate(rows):
+            bid, sira, baslik, tur, gen, acik = r
+
+            # Harf sıralaması (Görsel)
+            harf = chr(97 + i)
+
+            # --- KRİTİK DÜZELTME: ID'yi gizli bir veriye (UserRole) saklıyoruz ---
+            # 0. Kolon (Sıra) hücresini oluştururken ID'yi içine gömüyoruz.
+            item_sira = QTableWidgetItem(f"{harf}.")
+            item_sira.setData(Qt.ItemDataRole.UserRole, bid) # <-- GİZLİ ID BURADA
+            # --------------------------------------------------------------------
+
+            self.blocks_table.setItem(i, 0, item_sira)
+            self.blocks_table.setItem(i, 1, QTableWidgetItem(str(baslik)))
+            self.blocks_table.setItem(i, 2, QTableWidgetItem(str(tur)))
+            self.blocks_table.setItem(i, 3, QTableWidgetItem(f"%{gen}"))
+            self.blocks_table.setItem(i, 4, QTableWidgetItem(str(acik)[:50]))
+
+    def save_meta_silent(self):
+        """Kullanıcı yazı yazdıkça arka planda sessizce kaydeder."""
+        if getattr(self, "_loading_meta", False):
+            return
+        if not getattr(self, "_meta_ready", False):
+            return
+
+        pid = self._norm_pid()
+        if pid is None:
+            return
+
+        try:
+            # satır yoksa defaultlarla oluştur
+            self.builder._ensure_meta_row()
+
+            with DB() as conn:
+                cur = conn.cursor()
+
+                # ✅ AÇILIŞ KORUMASI:
+                # Editörler tamamen boşsa, default satırı "boş" ile ezmeyelim.
+                # (Kullanıcı zaten yazınca dolacak ve kaydolacak.)
+                gorev_html = self.ed_gorev.toHtml() or ""
+                genel_html = self.ed_genel.toHtml() or ""
+
+                # QTextEdit boşken "<p></p>" gibi dönebilir; düz metin kontrolü yapalım
+                def _plain_len(ed: QTextEdit) -> int:
+                    return len((ed.toPlainText() or "").strip())
+
+                if _plain_len(self.ed_gorev) == 0 and _plain_len(self.ed_genel) == 0 and \
+                   _plain_len(self.ed_dosya) == 0 and _plain_len(self.ed_deg) == 0 and _plain_len(self.ed_sonuc) == 0:
+                    return
+
+                cur.execute("""
+                    UPDATE rapor_meta SET
+                        GorevlendirmeMetni=?,
+                        DosyaHakkindaMetni=?,
+                        GenelBilgilendirmeMetni=?,
+                        DegerlendirmeMetni=?,
+                        SonucMetni=?,
+                        GuncellemeTarihi=CURRENT_TIMESTAMP
+                    WHERE ProjeID=?
+                """, (
+                    self.ed_gorev.toHtml(),
+                    self.ed_dosya.toHtml(),
+                    self.ed_genel.toHtml(),
+                    self.ed_deg.toHtml(),
+                    self.ed_sonuc.toHtml(),
+                    pid
+                ))
+
+                if cur.rowcount == 0:
+                    raise RuntimeError(f"rapor_meta UPDATE 0 satır etkiledi. ProjeID eşleşmiyor olabilir. pid={pid!r}")
+
+                conn.commit()
+
+        except Exception:
+            import traceback
+            print("save_meta_silent HATA:")
+            print(traceback.format_exc())
+
+    def open_aciklama_editor(self, bid, current_text):
+        """Delil açıklamasını düzenlemek için ZENGİN METİN editörünü açar."""
+
+        dlg = RichDescriptionDialog(self, current_text, "Delil Açıklaması Düzenle")
+
+        if dlg.exec():
+            new_text = dlg.get_html()
+
+            try:
+                with DB() as conn:
+                    pk = self._rapor_taslagi_pk_col(conn)
+                    conn.execute(f"UPDATE rapor_taslagi SET Aciklama=? WHERE {pk}=? AND ProjeID=?",
+                                 (new_text, bid, self.project_id))
+                    conn.commit()
+
+                self.load_blocks_into_table()
+                self.refresh_preview()
+                ModernDialog.show_success(self, "Güncellendi", "Açıklama kaydedildi.")
+
+            except Exception as e:
+                ModernDialog.show_error(self, "Hata", str(e))
+
+    def scroll_to_evidence(self, item):
+        """Tablodan tıklanan satırın ID'sini alıp HTML'de o ID'ye scroll eder."""
+        row = item.row()
+
+        # 0. Kolondaki (Sıra) hücreye erişip gizli ID'yi (UserRole) alıyoruz
+        sira_item = self.blocks_table.item(row, 0)
+        if not sira_item:
+            return
+
+        # Gizli ID'yi çek
+        db_id = sira_item.data(Qt.ItemDataRole.UserRole)
+
+        if not db_id:
+            return
+
+        # JavaScript ile o ID'ye git
+        # Hem 'evidence-ID' hem 'metaek-ID' dener (garanti olsun diye)
+        js = f"""
+        (function() {{
+            var el = document.getElementById('evidence-{db_id}');
+            if (!el) el = document.getElementById('metaek-{db_id}');
+            
+            if (el) {{
+                el.scrollIntoView({{behavior: 'smooth', block: 'center'}});
+                
+                // Vurgu efekti (kırmızı çerçeve)
+                var oldOutline = el.style.outline;
+                el.style.outline = '3px solid #e74c3c';
+                el.style.transition = 'outline 0.3s';
+                
+                setTimeout(function(){{
+                    el.style.outline = oldOutline;
+                }}, 1500);
+            }} else {{
+                console.log('Element bulunamadı: evidence-{db_id}');
+            }}
+        }})();
+        """
+
+        # Web görünümü nesnesini bul (self.preview veya self.web olabilir)
+        target_web = getattr(self, "preview", None) or getattr(self, "web", None)
+        if target_web:
+            target_web.page().runJavaScript(js)
+
+    def _rapor_taslagi_pk_col(self, conn):
+        cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
+        return "id" if "id" in cols else "rowid"
+
+    def _rt_select_id_expr(self, conn):
+        return "id" if self._rapor_taslagi_pk_col(conn) == "id" else "rowid AS id"
+
+    def save_block_edits(self):
+        try:
+            with DB() as conn:
+                pk = self._rapor_taslagi_pk_col(conn)
+
+                for r in range(self.blocks_table.rowCount()):
+                    item_sira = self.blocks_table.item(r, 0)
+                    if not item_sira:
+                        continue
+
+                    bid = item_sira.data(Qt.ItemDataRole.UserRole)
+                    if bid is None:
+                        continue
+
+                    sira = int(item_sira.text() or (r + 1))
+                    baslik = self.blocks_table.item(r, 1).text() if self.blocks_table.item(r, 1) else ""
+                    gen = int(self.blocks_table.item(r, 3).text() or 100) if self.blocks_table.item(r, 3) else 100
+                    conn.execute(f"""
+                        UPDATE rapor_taslagi
+                        SET Sira=?, Baslik=?, GenislikYuzde=?
+                        WHERE {pk}=? AND ProjeID=?
+                    """, (sira, baslik, gen, bid, self.project_id))
+
+                conn.commit()
+
+            ModernDialog.show_success(self, "Kaydedildi", "Blok ayarları güncellendi.")
+            self.load_blocks_into_table()
+            self.refresh_preview()
+
+        except Exception as e:
+            ModernDialog.show_error(self, "Rapor Hatası", str(e))
+
+    def _normalize_block_order(self):
+        """Delil silme/taşıma sonrası Sira’yı 1..n yap."""
+        with DB() as conn:
+            id_expr = self._rt_select_id_expr(conn)
+            pk = self._rapor_taslagi_pk_col(conn)
+
+            rows = conn.execute(f"""
+                SELECT {id_expr}
+                FROM rapor_taslagi
+                WHERE ProjeID=?
+                ORDER BY Sira ASC, id ASC
+            """, (self.project_id,)).fetchall()
+
+            for idx, (bid,) in enumerate(rows, start=1):
+                conn.execute(f"""
+                    UPDATE rapor_taslagi SET Sira=?
+                    WHERE {pk}=? AND ProjeID=?
+                """, (idx, bid, self.project_id))
+
+            conn.commit()
+
+    def move_block(self, delta):
+        row = self.blocks_table.currentRow()
+        if row < 0: return
+
+        target_row = row + delta
+        if target_row < 0 or target_row >= self.blocks_table.rowCount(): return
+
+        item_current = self.blocks_table.item(row, 0)
+        item_target = self.blocks_table.item(target_row, 0)
+        if not item_current or not item_target: return
+
+        bid_current = item_current.data(Qt.ItemDataRole.UserRole)
+        bid_target = item_target.data(Qt.ItemDataRole.UserRole)
+
+        try:
+            sira_current = int(item_current.text())
+            sira_target = int(item_target.text())
+        except: return
+
+        try:
+            with DB() as conn:
+                pk = self._rapor_taslagi_pk_col(conn)
+
+                conn.execute(f"UPDATE rapor_taslagi SET Sira=-999 WHERE {pk}=?", (bid_current,))
+                conn.execute(f"UPDATE rapor_taslagi SET Sira=? WHERE {pk}=?", (sira_current, bid_target))
+                conn.execute(f"UPDATE rapor_taslagi SET Sira=? WHERE {pk}=?", (sira_target, bid_current))
+                conn.execute(f"UPDATE rapor_taslagi SET Sira=? WHERE {pk}=? AND Sira=-999", (sira_target, bid_current))
+
+                conn.commit()
+
+            self.load_blocks_into_table()
+
+            self.blocks_table.selectRow(target_row)
+
+        except Exception as e:
+            ModernDialog.show_error(self, "Hata", f"Sıralama hatası: {e}")
+
+    def delete_selected_block(self):
+        try:
+            row = self.blocks_table.currentRow()
+            if row < 0:
+                ModernDialog.show_warning(self, "Delil Sil", "Silinecek delili seçiniz.")
+                return
+
+            ok = ModernDialog.show_question(
+                self, "Delili Sil",
+                "Seçili delil rapor taslağından silinecek. Emin misiniz?",
+                yes_btn="Evet", no_btn="Hayır"
+            )
+            if not ok:
+                return
+
+            item_sira = self.blocks_table.item(row, 0)
+            bid = item_sira.data(Qt.ItemDataRole.UserRole)
+
+            with DB() as conn:
+                pk = self._rapor_taslagi_pk_col(conn)
+                conn.execute(f"DELETE FROM rapor_taslagi WHERE {pk}=? AND ProjeID=?",
+                             (bid, self.project_id))
+                conn.commit()
+
+            self._normalize_block_order()
+            self.load_blocks_into_table()
+            self.refresh_preview()
+
+        except Exception as e:
+            ModernDialog.show_error(self, "Rapor Hatası", str(e))
+
+    def _disabled_sections_set(self):
+        s = set()
+        if self.cb_taraflar.isChecked(): s.add("taraflar")
+        if self.cb_gorev.isChecked(): s.add("gorev")
+        if self.cb_dosya.isChecked(): s.add("dosya")
+        if self.cb_genel.isChecked(): s.add("genel")
+        if self.cb_delillers.isChecked(): s.add("deliller")
+        if self.cb_deg.isChecked(): s.add("deg")
+        if self.cb_sonuc.isChecked(): s.add("sonuc")
+        return s
+
+    def refresh_preview(self):
+        # ✅ meta hazır değilken DB'ye yazma
+        if getattr(self, "_meta_ready", False):
+            self.save_meta_silent()
+
+        disabled = self._disabled_sections_set()
+        try:
+            html_doc = self.builder.build_html(disabled_sections=disabled)
+            base_url = QUrl.fromLocalFile(os.path.join(APP_DIR, ""))
+            self.preview.setHtml(html_doc, base_url)
+        except Exception as e:
+            import traceback
+            print(traceback.format_exc())
+            self.preview.setHtml(f"<h3 style='color:red'>Rapor Oluşturma Hatası: {e}</h3>")
+
+        try:
+            self.preview.setZoomFactor(0.92)
+        except Exception:
+            pass
+
+    def open_style_editor(self):
+        dlg = StyleEditorDialog(self)
+        if dlg.exec():
+            self.refresh_preview()
+
+    def export_pdf(self):
+        try:
+            if hasattr(self, "loader"):
+                self.loader.start("PDF oluşturuluyor.")
+                QApplication.processEvents()
+
+            styles = StyleConfig.load()
+            if not isinstance(styles, dict):
+                styles = StyleConfig.DEFAULTS.copy()
+
+            m = styles.get("margins", {"top": 25, "right": 20, "bottom": 20, "left": 25})
+
+            disabled = self._disabled_sections_set()
+            html_doc = self.builder.build_html(disabled_sections=disabled)
+
+            out_path, _ = QFileDialog.getSaveFileName(self, "PDF Kaydet", "", "PDF (*.pdf)")
+            if not out_path:
+                return
+            if not out_path.lower().endswith(".pdf"):
+                out_path += ".pdf"
+
+            def _status_cb(msg: str):
+                try:
+                    if hasattr(self, "loader"):
+                        self.loader.setText(str(msg))
+                        QApplication.processEvents()
+                except Exception:
+                    pass
+
+            def _progress_cb(p: int):
+                try:
+                    if hasattr(self, "loader"):
+                        self.loader.setProgress(int(p))
+                        QApplication.processEvents()
+                except Exception:
+                    pass
+
+            PDFExporter.export_pdf(
+                html_string=html_doc,
+                out_path=out_path,
+                margin_top_mm=int(m.get("top", 25)),
+                margin_right_mm=int(m.get("right", 20)),
+                margin_bottom_mm=int(m.get("bottom", 20)),
+                margin_left_mm=int(m.get("left", 25)),
+                zoom=1.0,
+                footer_font_size=10,
+                status_cb=_status_cb,
+                progress_cb=_progress_cb,
+                idle_cb=QApplication.processEvents,
+            )
+
+            ModernDialog.show_success(self, "Başarılı", "PDF oluşturuldu.")
+
+        except Exception as e:
+            ModernDialog.show_error(self, "Hata", str(e))
+
+        finally:
+            try:
+                if hasattr(self, "loader"):
+                    self.loader.stop()
+                    QApplication.processEvents()
+            except Exception:
+                pass
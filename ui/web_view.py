@@ -0,0 +1,84 @@
+"""
+Harita / grafik pencerelerinin ortak web görüntüleyicisi.
+QtWebEngine ilk harita veya grafik penceresi açılınca yüklenir (main.py'de AA_ShareOpenGLContexts verilir).
+"""
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QAction
+from PyQt6.QtWebEngineWidgets import QWebEngineView
+from PyQt6.QtWidgets import QDialog, QMainWindow, QMenu
+
+from security.security import LicenseManager
+from ui.main_window import apply_menu_theme
+
+
+class EvidenceWebEngineView(QWebEngineView):
+    """Sağ tıklandığında 'Rapora Ekle' menüsü açan özel Web Görüntüleyici."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.show_context_menu)
+
+    def show_context_menu(self, pos):
+        menu = QMenu(self)
+        menu = apply_menu_theme(QMenu(self))
+        action_add = QAction("📸 Görüntüyü Delil Olarak Rapora Ekle", self)
+        action_add.triggered.connect(self.capture_evidence)
+        menu.addAction(action_add)
+
+        menu.exec(self.mapToGlobal(pos))
+
+    def capture_evidence(self):
+        if not LicenseManager.require_valid_or_exit(self, "Delil ekleme"):
+            return
+        """
+        Akıllı Yakalama: 
+        - Harita/Detay pencerelerinde -> TÜM PENCEREYİ (Başlık dahil) alır.
+        - Grafik pencerelerinde -> SADECE GRAFİĞİ alır.
+        """
+
+        target_widget = self
+        window_title = "Görsel Analiz"
+
+        curr = self
+        while curr:
+            if isinstance(curr, QDialog) or isinstance(curr, QMainWindow):
+                window_title = curr.windowTitle()
+                c_name = curr.__class__.__name__
+
+                if c_name in [
+                    "MapPreviewDialog", "LocationDetailDialog",
+                    "MapMultiPointDialog", "ProfileMapDialog",
+                    "StalkingAnalysisDialog", "DailyRouteDialog",
+                    "ImeiDetailDialog", "ReciprocalDetailDialog"
+                ]:
+                    target_widget = curr
+
+                break
+            curr = curr.parent()
+
+        pixmap = target_widget.grab()
+
+        # ✅ DailyRouteDialog: üst kontrol şeridini (top_frame) kırp, info kartı + harita kalsın
+        try:
+            if (hasattr(target_widget, "__class__") and target_widget.__class__.__name__ == "DailyRouteDialog"
+                    and hasattr(target_widget, "top_frame") and target_widget.top_frame is not None):
+                g = target_widget.top_frame.geometry()
+                cut_y = max(0, g.bottom() + 1)
+                if 0 < cut_y < pixmap.height():
+                    pixmap = pixmap.copy(0, cut_y, pixmap.width(), pixmap.height() - cut_y)
+        except Exception:
+            pass
+
+        # İşlemeye gönder
+        self._on_pixmap_ready(pixmap, window_title)
+
+    def _on_pixmap_ready(self, pixmap, title):
+        """Ekran görüntüsü alındığında çalışır, AnalysisCenter'a gönderir."""
+        parent = self.parent()
+        while parent:
+            if hasattr(parent, 'main') and hasattr(parent.main.page_analysis, 'add_web_view_evidence'):
+                parent.main.page_analysis.add_web_view_evidence(pixmap, title)
+                return
+            parent = parent.parent()
+            if parent is None:
+                 break
@@ -0,0 +1,60 @@
+import json
+import os
+import threading
+
+from security.security import LicenseManager
+
+
+class AppSettings:
+    """
+    DB açılmadan önce bilinmesi gereken uygulama ayarları (settings.json, AppData altında).
+    Örn: veritabanı yerleşimi (tek dosya / proje başına dosya).
+    """
+
+    FILENAME = "settings.json"
+
+    _lock = threading.Lock()
+    _cache = None
+
+    @staticmethod
+    def path() -> str:
+        return os.path.join(LicenseManager.appdata_dir(), AppSettings.FILENAME)
+
+    @staticmethod
+    def _load() -> dict:
+        if AppSettings._cache is not None:
+            return AppSettings._cache
+
+        data = {}
+        p = AppSettings.path()
+        if os.path.exists(p):
+            try:
+                with open(p, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"⚠️ [AppSettings] Ayar dosyası okunamadı: {e}")
+                data = {}
+        if not isinstance(data, dict):
+            data = {}
+
+        AppSettings._cache = data
+        return data
+
+    @staticmethod
+    def get(key: str, default=None):
+        with AppSettings._lock:
+            return AppSettings._load().get(key, default)
+
+    @staticmethod
+    def set(key: str, value):
+        with AppSettings._lock:
+            data = dict(AppSettings._load())
+            data[key] = value
+
+            p = AppSettings.path()
+            tmp = p + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, p)
+
+            AppSettings._cache = data
@@ -0,0 +1,87 @@
+import time
+
+
+class BatchDeleter:
+    """
+    Büyük silmeleri sınırlı rowid gruplarına böler.
+
+    Her grup ayrı kilit + commit ile çalışır; gruplar arasında kilit bırakılır
+    (GUI sorguları / arka plan bakımı araya girebilir), istenirse iptal edilir.
+    targets: [(tablo, where_sql, params), ...]  -> listedeki sırayla silinir.
+
+    mgr: DatabaseManager (lock() + get_connection()).
+    """
+
+    BATCH_ROWS = 5000
+
+    @staticmethod
+    def count(mgr, targets):
+        """Her hedefin satır sayısı (indexli COUNT, ilerleme toplamı için). Tablo yoksa 0."""
+        out = []
+        with mgr.lock():
+            conn = mgr.get_connection()
+            for table, where, params in targets:
+                try:
+                    n = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", tuple(params)).fetchone()[0]
+                except Exception:
+                    n = 0
+                out.append(int(n or 0))
+        return out
+
+    @staticmethod
+    def run(mgr, targets, progress_cb=None, should_stop=None, batch_rows: int | None = None):
+        """
+        Hedefleri sırayla siler.
+        progress_cb(silinen, toplam, tablo) / should_stop() -> True ise bir sonraki gruptan önce durur.
+        Dönüş: (silinen_satır, iptal_edildi_mi)
+        Bir grup silinemezse iş durur ve RuntimeError yükselir; kalan hedefler silinmez.
+        """
+        n = int(batch_rows or BatchDeleter.BATCH_ROWS)
+        counts = BatchDeleter.count(mgr, targets)
+        total = sum(counts)
+        deleted = 0
+
+        if callable(progress_cb):
+            progress_cb(0, total, "")
+
+        for (table, where, params), expected in zip(targets, counts):
+            if expected <= 0:
+                continue
+
+            sql = (
+                f"DELETE FROM {table} WHERE rowid IN "
+                f"(SELECT rowid FROM {table} WHERE {where} LIMIT ?)"
+            )
+
+            while True:
+                if callable(should_stop) and should_stop():
+                    return deleted, True
+
+                with mgr.lock():
+                    conn = mgr.get_connection()
+                    try:
+                        cur = conn.execute(sql, tuple(params) + (n,))
+                        got = cur.rowcount if cur.rowcount is not None else 0
+                        conn.commit()
+                    except Exception as e:
+                        try:
+                            conn.rollback()
+                        except Exception:
+                            pass
+                        print(f"❌ [BatchDeleter] Tablo '{table}' silinirken hata: {e}")
+                        # sonraki hedefler (ör. katalog satırları) ham veri kalmışken silinmesin
+                        raise RuntimeError(
+                            f"'{table}' silinirken hata: {e}. İşlem durduruldu, sonraki tablolar silinmedi."
+                        ) from e
+
+                deleted += max(0, got)
+                if callable(progress_cb):
+                    progress_cb(min(deleted, total), total, table)
+
+                if got < n:
+                    break
+
+                # diğer iş parçacıkları kilidi alabilsin
+                time.sleep(0.002)
+
+        return deleted, False
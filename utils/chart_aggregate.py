@@ -0,0 +1,82 @@
+from collections import Counter
+
+
+class ChartAggregator:
+    """
+    GenericDatabaseTable grafik verisi: tablonun TÜM satırları (varsa sadece filtreden geçenler) üzerinde
+    kategori -> adet toplamı, en büyük TOP_N kategori.
+
+    Qt modeline dokunmaz (satır listesi + kolon indeksleri ile çalışır) -> arka plan thread'inde çalışabilir.
+    """
+
+    TOP_N = 500
+    EMPTY_VALUES = ("", "None", "---", "nan")
+    EMPTY_NAMES = ("", "None", "Unknown")
+
+    @staticmethod
+    def _fold(text) -> str:
+        return (str(text).upper().replace('İ', 'I').replace('Ğ', 'G').replace('Ü', 'U')
+                .replace('Ş', 'S').replace('Ö', 'O').replace('Ç', 'C'))
+
+    @staticmethod
+    def detect_columns(headers) -> tuple:
+        """Başlıklardan (hedef, adet, isim) kolon indeksleri; bulunamayan -1."""
+        target_col = qty_col = name_col = -1
+        for i, header in enumerate(headers):
+            h = ChartAggregator._fold(header)
+
+            if "BAZ" in h or "KONUM" in h:
+                if target_col == -1: target_col = i
+            elif "KARSI" in h or "DIGER NUMARA" in h or "ARANAN" in h or "GSM NUMARASI" in h:
+                if target_col == -1: target_col = i
+            elif "IMEI" in h:
+                if target_col == -1: target_col = i
+
+            if "ADET" in h or "SINYAL" in h or "SAYI" in h or "KULLANIM" in h:
+                qty_col = i
+
+            if "ISIM" in h or "AD SOYAD" in h or "KISI ADI" in h:
+                name_col = i
+        return target_col, qty_col, name_col
+
+    @staticmethod
+    def aggregate(rows, target_col: int, qty_col: int = -1, name_col: int = -1,
+                  row_ids=None, top_n: int | None = None) -> list:
+        """
+        rows: satır listesi; row_ids: sadece bu satırlar (None -> hepsi).
+        Adet kolonu varsa satırların adetleri etiket bazında toplanır, yoksa satırlar sayılır.
+        Dönüş: [(etiket, adet), ...] adede göre azalan; etikete "(N Adet)" eklenmiş.
+        """
+        top_n = int(top_n or ChartAggregator.TOP_N)
+        it = rows if row_ids is None else (rows[i] for i in row_ids)
+
+        def cell(row, col):
+            return row[col] if 0 <= col < len(row) else None
+
+        counts = Counter()
+        if qty_col != -1:
+            for row in it:
+                target = str(cell(row, target_col))
+                try:
+                    n = int(cell(row, qty_col))
+                except (TypeError, ValueError):
+                    n = 1
+                label = target
+                if name_col != -1:
+                    name = str(cell(row, name_col))
+                    if name and name not in ChartAggregator.EMPTY_NAMES:
+                        label = f"{target}\n{name}"
+                counts[label] += n
+        else:
+            for row in it:
+                val = cell(row, target_col)
+                if not val or str(val).strip() in ChartAggregator.EMPTY_VALUES:
+                    continue
+                if name_col != -1:
+                    name = cell(row, name_col)
+                    name = "" if name is None else str(name)
+                    counts[f"{val}\n{name}" if name else str(val)] += 1
+                else:
+                    counts[str(val)] += 1
+
+        return [(f"{label}\n({cnt} Adet)", cnt) for label, cnt in counts.most_common(top_n)]
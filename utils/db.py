@@ -0,0 +1,924 @@
+"""
+Veritabanı katmanı: şifreli bağlantı (DatabaseManager / DB), şema kurulumu, migration'lar ve
+GSM silme / ortak analiz gibi çekirdek veri işlemleri.
+
+Arayüzden bağımsızdır (modül seviyesinde PyQt import edilmez); hem ui.main_window hem de
+komut satırı aracı (cli.py) buradan kullanır.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from analysis.common import CommonAnalysis
+from security.security import LicenseManager
+from utils.batch_delete import BatchDeleter
+from utils.constants import TABLE_COLUMNS
+from utils.db_maintenance import DbMaintenance
+from utils.db_profile import DbProfile
+from utils.evidence_store import EvidenceStore
+from utils.hts_fts import HtsFullText
+from utils.project_shards import ProjectShards
+from utils.report_cache import ReportRenderCache
+from utils.report_table import table_struct_from_html, table_struct_dumps
+from utils.sql_trace import SqlTrace
+from utils.sqlcipher_migration import PlainToCipherMigrator
+from utils.tip_kodu import TipKodu
+
+
+def ensure_rapor_taslagi_has_id(conn: sqlite3.Connection):
+    """rapor_taslagi tablosunda 'id' yoksa ekler/düzeltir."""
+    c = conn.cursor()
+    tbl = c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='rapor_taslagi'").fetchone()
+    if not tbl: return
+
+    cols_info = c.execute("PRAGMA table_info(rapor_taslagi)").fetchall()
+    col_names = [r[1] for r in cols_info]
+    if "id" in col_names: return
+
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS rapor_taslagi_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, Baslik TEXT, Icerik TEXT, 
+            Tur TEXT, Tarih TEXT, Sira INTEGER, GenislikYuzde INTEGER DEFAULT 100, YukseklikMm INTEGER,
+            Hizalama TEXT DEFAULT 'center', Aciklama TEXT DEFAULT '', HtmlIcerik TEXT, ImagePath TEXT,
+            FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE
+        )
+    """)
+
+    existing = set(col_names)
+    copy_cols = [col for col in [
+        "ProjeID", "GSMNo", "Baslik", "Icerik", "Tur", "Tarih", "Sira",
+        "GenislikYuzde", "YukseklikMm", "Hizalama", "Aciklama",
+        "HtmlIcerik", "BaseHtmlIcerik", "HiddenColsJson", "FmtJson",
+        "ImagePath"
+    ] if col in existing]
+
+    if copy_cols:
+        cols_str = ", ".join(copy_cols)
+        c.execute(f"INSERT INTO rapor_taslagi_new ({cols_str}) SELECT {cols_str} FROM rapor_taslagi")
+
+    c.execute("DROP TABLE rapor_taslagi")
+    c.execute("ALTER TABLE rapor_taslagi_new RENAME TO rapor_taslagi")
+    conn.commit()
+
+
+def ensure_rapor_taslagi_tableprops_columns(conn: sqlite3.Connection):
+    cur = conn.cursor()
+    tbl = cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='rapor_taslagi'").fetchone()
+    if not tbl:
+        return
+
+    cols = [r[1] for r in cur.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
+
+    if "BaseHtmlIcerik" not in cols:
+        cur.execute("ALTER TABLE rapor_taslagi ADD COLUMN BaseHtmlIcerik TEXT")
+    if "HiddenColsJson" not in cols:
+        cur.execute("ALTER TABLE rapor_taslagi ADD COLUMN HiddenColsJson TEXT")
+    if "FmtJson" not in cols:
+        cur.execute("ALTER TABLE rapor_taslagi ADD COLUMN FmtJson TEXT")
+    if "TabloJson" not in cols:
+        cur.execute("ALTER TABLE rapor_taslagi ADD COLUMN TabloJson TEXT")
+
+    conn.commit()
+
+
+def ensure_evidence_store_schema(conn: sqlite3.Connection):
+    """delil_gorselleri (içerik adresli görsel deposu) + rapor_taslagi.GorselID."""
+    EvidenceStore.ensure_schema(conn)
+
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
+    if cols and "GorselID" not in cols:
+        conn.execute("ALTER TABLE rapor_taslagi ADD COLUMN GorselID INTEGER")
+    conn.commit()
+
+
+def migrate_rapor_taslagi_table_struct(conn: sqlite3.Connection):
+    """
+    Eski TABLE delillerini (HTML) yapısal forma (TabloJson) çevirir.
+    - Kaynak: BaseHtmlIcerik varsa o (gizleme/renk uygulanmamış tam tablo), yoksa HtmlIcerik.
+    - Dönüştürülemeyen tablolar '' ile işaretlenir (her açılışta tekrar denenmez, eski HTML yolu kullanılır).
+    """
+    cur = conn.cursor()
+    cols = [r[1] for r in cur.execute("PRAGMA table_info(rapor_taslagi)").fetchall()]
+    if "TabloJson" not in cols:
+        return
+
+    rows = cur.execute(
+        "SELECT id, COALESCE(BaseHtmlIcerik,''), COALESCE(HtmlIcerik,'') FROM rapor_taslagi "
+        "WHERE UPPER(COALESCE(Tur,''))='TABLE' AND TabloJson IS NULL"
+    ).fetchall()
+    if not rows:
+        return
+
+    done = 0
+    for rid, base_html, cur_html in rows:
+        tbl = table_struct_from_html(base_html or cur_html)
+        cur.execute(
+            "UPDATE rapor_taslagi SET TabloJson=? WHERE id=?",
+            (table_struct_dumps(tbl) if tbl else "", rid)
+        )
+        if tbl:
+            done += 1
+
+    conn.commit()
+    print(f"✅ Tablo delilleri yapısal forma çevrildi: {done}/{len(rows)}")
+
+
+def ensure_rapor_meta_ekler_columns(conn):
+    cur = conn.cursor()
+    cols = [r[1] for r in cur.execute("PRAGMA table_info(rapor_meta_ekler)").fetchall()]
+
+    # Raporda dosya adını gizle
+    if "DosyaAdiGizle" not in cols:
+        cur.execute("ALTER TABLE rapor_meta_ekler ADD COLUMN DosyaAdiGizle INTEGER DEFAULT 0")
+
+    # Görsel genişliği (%)
+    if "GenislikYuzde" not in cols:
+        cur.execute("ALTER TABLE rapor_meta_ekler ADD COLUMN GenislikYuzde INTEGER DEFAULT 100")
+
+    conn.commit()
+
+
+def ensure_hts_dosyalari_meta_columns(conn: sqlite3.Connection):
+    """hts_dosyalari tablosuna meta kolonları ekler."""
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(hts_dosyalari)").fetchall()]
+    for col in ["TalepEdenMakam", "SorguBaslangic", "SorguBitis", "Tespit"]:
+        if col not in cols:
+            conn.execute(f"ALTER TABLE hts_dosyalari ADD COLUMN {col} TEXT")
+
+
+def ensure_project_columns(conn: sqlite3.Connection):
+    """projeler tablosuna eksik kolonları ekler."""
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(projeler)").fetchall()]
+    for col in ["suc_tarihi", "gorevlendirme_tarihi", "bilirkisi_adi", "bilirkisi_unvan_sicil"]:
+        if col not in cols:
+            conn.execute(f"ALTER TABLE projeler ADD COLUMN {col} TEXT")
+
+
+def ensure_hash_columns(conn: sqlite3.Connection):
+    """hts_dosyalari tablosuna MD5 ve SHA256 ekler."""
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(hts_dosyalari)").fetchall()]
+    if "MD5" not in cols: conn.execute("ALTER TABLE hts_dosyalari ADD COLUMN MD5 TEXT")
+    if "SHA256" not in cols: conn.execute("ALTER TABLE hts_dosyalari ADD COLUMN SHA256 TEXT")
+
+
+def ensure_performance_indexes(conn: sqlite3.Connection):
+    """
+    Performans indexleri (işlev/mantık değişmez).
+    Amaç: En sık filtrelenen/sıralanan alanlarda taramayı azaltmak.
+    """
+    c = conn.cursor()
+
+    # ham HTS tablolarının indexleri: proje dosyası yerleşiminde shard bağlanırken oluşturulur
+    if not ProjectShards.enabled():
+        create_raw_hts_indexes(conn, "main")
+
+    c.execute("CREATE INDEX IF NOT EXISTS idx_hts_rehber_pid_gsm_adet ON hts_rehber (ProjeID, GSMNo, Adet)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_hts_tum_baz_pid_gsm_sinyal ON hts_tum_baz (ProjeID, GSMNo, Sinyal)")
+
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_rehber_pid_isim_tc_trim
+        ON hts_rehber (ProjeID, Isim, TRIM(TC))
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_rehber_pid_tc_trim_karsi
+        ON hts_rehber (ProjeID, TRIM(TC), KarsiNo)
+    """)
+
+    conn.commit()
+
+    try:
+        c.execute("ANALYZE;")
+        conn.commit()
+    except Exception:
+        pass
+
+
+def _try_open_as_plain_sqlite(db_path: str) -> bool:
+    """
+    DB plain sqlite mı?
+    - plain ise sqlite3 ile açılıp sqlite_master okunabilir.
+    - şifreli SQLCipher ise genelde 'file is not a database' vb. hata verir.
+    """
+    import sqlite3 as _plain_sqlite
+    try:
+        conn = _plain_sqlite.connect(db_path, timeout=3)
+        try:
+            conn.execute("SELECT name FROM sqlite_master LIMIT 1;").fetchone()
+        finally:
+            conn.close()
+        return True
+    except Exception:
+        return False
+
+
+def migrate_plain_sqlite_to_sqlcipher(db_path: str, key: str, sqlcipher_connect, progress_cb=None):
+    """
+    Plain SQLite DB'yi SQLCipher'a çevirir (tablo tablo, parçalı, kesilirse kaldığı yerden devam).
+    ÖNEMLİ: Plain dosyayı SQLCipher ile doğrudan açmıyoruz (file is not a database hatasına düşmemek için);
+    şifreli tmp DB'ye plain DB KEY '' ile attach edilip kopyalanır, doğrulanır, dosyalar rename ile değiştirilir.
+    Ayrıntı: utils/sqlcipher_migration.py
+    """
+    PlainToCipherMigrator.migrate(db_path, key, sqlcipher_connect, progress_cb)
+
+
+def run_blocking_with_progress(title: str, fn):
+    """
+    Açılışta (ana pencere henüz yokken) uzun süren işi ayrı thread'de çalıştırır, modal ilerleme penceresi gösterir.
+    fn(progress_cb) -> progress_cb(done, total, text). Dönüş değeri / hata aynen iletilir.
+    Qt yüklü değilse veya QApplication yoksa (komut satırı) doğrudan çalıştırır.
+    """
+    try:
+        from PyQt6.QtCore import Qt, QEventLoop, QTimer
+        from PyQt6.QtWidgets import QApplication, QProgressDialog
+    except ImportError:
+        return fn(None)
+
+    if QApplication.instance() is None:
+        return fn(None)
+
+    state = {"done": 0, "total": 0, "text": title, "result": None, "error": None}
+
+    def _cb(done, total, text):
+        state["done"], state["total"], state["text"] = done, total, text
+
+    def _run():
+        try:
+            state["result"] = fn(_cb)
+        except BaseException as e:
+            state["error"] = e
+
+    dlg = QProgressDialog(title, None, 0, 100)
+    dlg.setWindowTitle("HTS Mercek")
+    dlg.setWindowModality(Qt.WindowModality.ApplicationModal)
+    dlg.setMinimumDuration(0)
+    dlg.setAutoClose(False)
+    dlg.setAutoReset(False)
+    dlg.setMinimumWidth(460)
+
+    worker = threading.Thread(target=_run, name="HTSMercekStartupTask", daemon=True)
+    loop = QEventLoop()
+    timer = QTimer()
+    timer.setInterval(100)
+
+    def _tick():
+        total = state["total"]
+        if total:
+            dlg.setValue(int(100 * state["done"] / total))
+            dlg.setLabelText(f"{state['text']}\n{state['done']:,} / {total:,} kayıt".replace(",", "."))
+        else:
+            dlg.setLabelText(state["text"])
+        if not worker.is_alive():
+            loop.quit()
+
+    timer.timeout.connect(_tick)
+    worker.start()
+    dlg.show()
+    timer.start()
+    loop.exec()
+    timer.stop()
+    dlg.close()
+
+    if state["error"] is not None:
+        raise state["error"]
+    return state["result"]
+
+
+def ensure_encrypted_db(db_path: str, key: str, sqlcipher_connect):
+    # doğrulanmış ama dosya değişimi yarıda kalmış önceki şifreleme
+    PlainToCipherMigrator.resume_pending_swap(db_path)
+
+    if not os.path.exists(db_path):
+        return
+
+    is_plain = _try_open_as_plain_sqlite(db_path)
+    if is_plain:
+        run_blocking_with_progress(
+            "Veritabanı şifreleniyor (tek seferlik)...",
+            lambda cb: migrate_plain_sqlite_to_sqlcipher(db_path, key=key, sqlcipher_connect=sqlcipher_connect, progress_cb=cb)
+        )
+
+
+# Şema sürümü (PRAGMA user_version). Yeni migration / index eklenince ARTIRILMALI;
+# aksi halde mevcut kurulumlarda çalışmaz (migration'lar + ANALYZE her açılışta değil, sürüm değişince koşar).
+SCHEMA_VERSION = 3
+
+
+def schema_version(conn) -> int:
+    try:
+        row = conn.execute("PRAGMA main.user_version").fetchone()
+        return int(row[0]) if row and row[0] is not None else 0
+    except Exception:
+        return 0
+
+
+def run_all_migrations(conn: sqlite3.Connection) -> bool:
+    try:
+        ensure_project_columns(conn)
+        ensure_hts_dosyalari_meta_columns(conn)
+        ensure_hash_columns(conn)
+        ensure_rapor_taslagi_has_id(conn)
+        ensure_rapor_taslagi_tableprops_columns(conn)
+        migrate_rapor_taslagi_table_struct(conn)
+        ensure_evidence_store_schema(conn)
+        ensure_performance_indexes(conn)
+        ensure_rapor_meta_ekler_columns(conn)
+
+
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"Migration Hatası: {e}")
+        return False
+
+
+def derive_db_key() -> str:
+    info = LicenseManager.ensure_valid_or_raise()
+    fp = LicenseManager.device_fingerprint()
+    raw = f"{info.license_id}|{fp}|HTSMERCEK_DB_KEY_V1"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class DatabaseManager:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    DB_PATH = os.path.join(LicenseManager.appdata_dir(), "htstakip.db")
+
+    try:
+        from pysqlcipher3 import dbapi2 as _sqlcipher
+        _USING_SQLCIPHER = True
+    except Exception:
+        try:
+            from sqlcipher3 import dbapi2 as _sqlcipher  # sqlcipher3-wheels
+            _USING_SQLCIPHER = True
+        except Exception:
+            _sqlcipher = None
+            _USING_SQLCIPHER = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, "_initialized", False):
+            return
+
+        self._db_lock = threading.RLock()
+
+        if not self._USING_SQLCIPHER or self._sqlcipher is None:
+            raise RuntimeError(
+                "SQLCipher aktif değil. Şifreli DB için pysqlcipher3 (veya SQLCipher driver) gerekli."
+            )
+        key = derive_db_key()
+        ensure_encrypted_db(self.DB_PATH, key=key, sqlcipher_connect=self._sqlcipher.connect)
+        self._db_existed = os.path.exists(self.DB_PATH) and os.path.getsize(self.DB_PATH) > 0
+        self._connection = self._sqlcipher.connect(
+            self.DB_PATH,
+            check_same_thread=False,
+            timeout=30
+        )
+
+        self._configure_db(key)
+        self._initialized = True
+
+    def _configure_db(self, key):
+        """
+        Veritabanı bağlantısını ve şifrelemeyi yapılandırır.
+        Eğer şifre anahtarı değişmişse (HWID değişimi vb.) veritabanını sıfırlar.
+        """
+        with self._db_lock:
+            # Mevcut bağlantı üzerinden cursor al
+            cur = self._connection.cursor()
+
+            # Anahtarı ayarla
+            profile = DbProfile.current()
+            fmt = DbProfile.format_for_open(self._db_existed)
+            cur.execute(f"PRAGMA key = '{key}';")
+            cur.execute("PRAGMA cipher_compatibility = 4;")
+            # sayfa boyutu / KDF ilk okumadan önce verilmeli (dosyanın oluşturulduğu değerler)
+            DbProfile.apply_cipher(cur, fmt, profile["memory_security"])
+
+            try:
+                # Test sorgusu: Şifre doğru mu?
+                cur.execute("SELECT count(*) FROM sqlite_master;")
+                cur.fetchone()
+
+                # Başarılıysa performans ayarlarını yap
+                DbMaintenance.configure_connection(cur)
+                cur.execute("PRAGMA journal_mode=WAL;")
+                cur.execute("PRAGMA synchronous=NORMAL;")
+                cur.execute("PRAGMA foreign_keys=ON;")
+                DbProfile.apply_runtime(cur, profile)
+                cur.execute("PRAGMA busy_timeout=5000;")
+                self._connection.commit()
+                if not self._db_existed:
+                    DbProfile.record_format(fmt)
+
+            except Exception as e:
+                # Hata yakalama (pysqlcipher veya sqlite3 hataları)
+                err_str = str(e)
+                err_low = (err_str or "").lower()
+
+                # SADECE gerçekten "anahtar yanlış / db bozuk" durumlarında devreye girsin
+                bad_key_markers = (
+                    "file is not a database",
+                    "not a database",
+                    "bad decrypt",
+                    "wrong key",
+                    "sqlcipher",
+                )
+
+                # settings.json kaybolduysa dosya farklı sayfa/KDF biçimiyle oluşturulmuş olabilir: bilinen biçimleri dene
+                if any(m in err_low for m in bad_key_markers) and self._db_existed and self._reopen_with_known_formats(key, fmt, profile):
+                    return
+
+                if any(m in err_low for m in bad_key_markers):
+                    print("⚠️ Veritabanı anahtarı uyuşmuyor veya DB bozuk. Silmek yerine yedekleniyor...")
+
+                    try:
+                        cur.close()
+                        self._connection.close()
+                    except Exception:
+                        pass
+
+                    # Silmek YOK: Yedekle
+                    try:
+                        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+                        base = self.DB_PATH
+
+                        if os.path.exists(base):
+                            os.replace(base, base + f".badkey_{ts}.bak")
+
+                        if os.path.exists(base + "-wal"):
+                            os.replace(base + "-wal", base + f"-wal.badkey_{ts}.bak")
+
+                        if os.path.exists(base + "-shm"):
+                            os.replace(base + "-shm", base + f"-shm.badkey_{ts}.bak")
+
+                    except Exception as bak_err:
+                        print(f"DB yedekleme hatası: {bak_err}")
+
+                    # Yeni bağlantı oluştur
+                    if self._sqlcipher:
+                        self._connection = self._sqlcipher.connect(
+                            self.DB_PATH,
+                            check_same_thread=False,
+                            timeout=30
+                        )
+                    else:
+                        import sqlite3
+                        self._connection = sqlite3.connect(
+                            self.DB_PATH,
+                            check_same_thread=False,
+                            timeout=30
+                        )
+
+                    cur = self._connection.cursor()
+                    new_fmt = DbProfile.format_for_open(db_exists=False)
+                    cur.execute(f"PRAGMA key = '{key}';")
+                    cur.execute("PRAGMA cipher_compatibility = 4;")
+                    DbProfile.apply_cipher(cur, new_fmt, profile["memory_security"])
+                    DbMaintenance.configure_connection(cur)
+                    cur.execute("PRAGMA journal_mode=WAL;")
+                    DbProfile.apply_runtime(cur, profile)
+                    self._connection.commit()
+                    DbProfile.record_format(new_fmt)
+
+                else:
+                    # Başka bir hataysa (örn: disk dolu) durdur
+                    raise e
+
+    def _reopen_with_known_formats(self, key, tried_fmt, profile) -> bool:
+        """Kayıtlı biçim tutmadıysa profillerdeki diğer sayfa/KDF biçimleriyle açmayı dener."""
+        candidates = [DbProfile.DEFAULT_FORMAT] + [DbProfile.format_of(p) for p in DbProfile.PROFILES.values()]
+        seen = {(tried_fmt["page_size"], tried_fmt["kdf_iter"])}
+
+        for fmt in candidates:
+            sig = (fmt["page_size"], fmt["kdf_iter"])
+            if sig in seen:
+                continue
+            seen.add(sig)
+
+            conn = self._sqlcipher.connect(self.DB_PATH, check_same_thread=False, timeout=30)
+            try:
+                cur = conn.cursor()
+                cur.execute(f"PRAGMA key = '{key}';")
+                cur.execute("PRAGMA cipher_compatibility = 4;")
+                DbProfile.apply_cipher(cur, fmt, profile["memory_security"])
+                cur.execute("SELECT count(*) FROM sqlite_master;").fetchone()
+            except Exception:
+                conn.close()
+                continue
+
+            try:
+                self._connection.close()
+            except Exception:
+                pass
+            self._connection = conn
+
+            DbMaintenance.configure_connection(cur)
+            cur.execute("PRAGMA journal_mode=WAL;")
+            cur.execute("PRAGMA synchronous=NORMAL;")
+            cur.execute("PRAGMA foreign_keys=ON;")
+            DbProfile.apply_runtime(cur, profile)
+            cur.execute("PRAGMA busy_timeout=5000;")
+            conn.commit()
+
+            DbProfile.record_format(fmt)
+            print(f"✅ [DatabaseManager] Veritabanı {fmt['page_size']} B sayfa / {fmt['kdf_iter']} KDF biçimiyle açıldı.")
+            return True
+
+        return False
+
+    def lock(self):
+        # SQL izleme açıksa kilit bekleme süresi ölçülür (SqlTrace; kapalıyken ham kilit)
+        return SqlTrace.wrap_lock(self._db_lock)
+
+    def get_connection(self):
+        return SqlTrace.wrap_connection(self._connection)
+
+    def apply_profile(self, name: str):
+        """Profili kaydeder ve çalışma ayarlarını açık bağlantıya hemen uygular."""
+        DbProfile.set_current(name)
+        with self._db_lock:
+            DbProfile.apply_runtime(self._connection.cursor(), DbProfile.PROFILES[name])
+
+
+class DB:
+    def __init__(self):
+        self.manager = DatabaseManager()
+        self.conn = None
+        self._lock = self.manager.lock()
+
+    def __enter__(self):
+        self._lock.acquire()
+        self.conn = self.manager.get_connection()
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if not self.conn:
+                return False
+
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+                print(f"⚠️ DB Rollback: {exc}")
+
+            return False
+        finally:
+            self._lock.release()
+
+
+RAW_HTS_TABLES = list(TABLE_COLUMNS.keys())
+
+# (index adı, tablo, kolon ifadesi) -> şema önekiyle oluşturulur (main / proj)
+RAW_HTS_INDEXES = [
+    ("idx_hts_gsm_pid_gsmno", "hts_gsm", "ProjeID, GSMNo"),
+    ("idx_hts_gsm_pid_gsmno_diger", "hts_gsm", "ProjeID, GSMNo, DIGER_NUMARA"),
+    ("idx_hts_gsm_pid_imei", "hts_gsm", "ProjeID, IMEI"),
+    ("idx_hts_gsm_pid_tarih", "hts_gsm", "ProjeID, TARIH"),
+
+    ("idx_hts_sms_pid_gsmno", "hts_sms", "ProjeID, GSMNo"),
+    ("idx_hts_sms_pid_gsmno_diger", "hts_sms", "ProjeID, GSMNo, DIGER_NUMARA"),
+    ("idx_hts_sms_pid_tarih", "hts_sms", "ProjeID, TARIH"),
+
+    ("idx_hts_gprs_pid_gsmno", "hts_gprs", "ProjeID, GSMNo"),
+    ("idx_hts_gprs_pid_imei", "hts_gprs", "ProjeID, IMEI"),
+    ("idx_hts_gprs_pid_tarih", "hts_gprs", "ProjeID, TARIH"),
+
+    ("idx_hts_wap_pid_gsmno", "hts_wap", "ProjeID, GSMNo"),
+    ("idx_hts_wap_pid_imei", "hts_wap", "ProjeID, IMEI"),
+    ("idx_hts_wap_pid_tarih", "hts_wap", "ProjeID, TARIH"),
+
+    # GSM silme / GSM bazlı sorgular tam tablo taramasına düşmesin
+    ("idx_hts_abone_pid_gsmno", "hts_abone", "ProjeID, GSMNo"),
+    ("idx_hts_sabit_pid_gsmno", "hts_sabit", "ProjeID, GSMNo"),
+    ("idx_hts_sth_pid_gsmno", "hts_sth", "ProjeID, GSMNo"),
+    ("idx_hts_uluslararasi_pid_gsmno", "hts_uluslararasi", "ProjeID, GSMNo"),
+
+    ("idx_gsm_pid_gsmno_tarih", "hts_gsm", "ProjeID, GSMNo, TARIH"),
+    ("idx_gsm_pid_gsmno_baz", "hts_gsm", "ProjeID, GSMNo, BAZ"),
+    ("idx_gsm_pid_gsmno_diger", "hts_gsm", "ProjeID, GSMNo, DIGER_NUMARA"),
+
+    ("idx_sms_pid_gsmno_tarih", "hts_sms", "ProjeID, GSMNo, TARIH"),
+
+    # yön/tür kodu (TipKodu): yönlü sayımlar indexli GROUP BY olsun
+    ("idx_hts_gsm_pid_diger_tipkodu", "hts_gsm", "ProjeID, DIGER_NUMARA, TipKodu"),
+    ("idx_hts_gsm_pid_gsmno_tipkodu", "hts_gsm", "ProjeID, GSMNo, TipKodu"),
+    ("idx_hts_sms_pid_gsmno_tipkodu", "hts_sms", "ProjeID, GSMNo, TipKodu"),
+    ("idx_sms_pid_gsmno_diger", "hts_sms", "ProjeID, GSMNo, DIGER_NUMARA"),
+
+    ("idx_gprs_pid_gsmno_tarih", "hts_gprs", "ProjeID, GSMNo, TARIH"),
+    ("idx_gprs_pid_gsmno_baz", "hts_gprs", "ProjeID, GSMNo, BAZ"),
+
+    ("idx_wap_pid_gsmno_tarih", "hts_wap", "ProjeID, GSMNo, TARIH"),
+    ("idx_wap_pid_gsmno_baz", "hts_wap", "ProjeID, GSMNo, BAZ"),
+
+    ("idx_gsm_pid_numara_tarih", "hts_gsm", "ProjeID, NUMARA, TARIH"),
+    ("idx_gprs_pid_numara_tarih", "hts_gprs", "ProjeID, NUMARA, TARIH"),
+    ("idx_wap_pid_numara_tarih", "hts_wap", "ProjeID, NUMARA, TARIH"),
+
+    ("idx_hts_gsm_detail_lookup", "hts_gsm", """
+        ProjeID,
+        substr(replace(replace(replace(NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10),
+        substr(replace(replace(replace(DIGER_NUMARA, ' ', ''), '-', ''), '+', ''), -10, 10),
+        (substr(TARIH, 7, 4) || '-' || substr(TARIH, 4, 2) || '-' || substr(TARIH, 1, 2) || substr(TARIH, 11))
+    """),
+]
+
+
+def create_raw_hts_indexes(conn, schema: str = "main"):
+    c = conn.cursor()
+    for name, table, cols in RAW_HTS_INDEXES:
+        c.execute(f"CREATE INDEX IF NOT EXISTS {schema}.{name} ON {table} ({cols})")
+
+
+def create_raw_hts_schema(conn, schema: str = "main"):
+    """
+    Ham HTS tabloları (TABLE_COLUMNS) + Rol/DosyaAdi kolonları + indexler.
+    schema="main": tek dosya yerleşimi (projeler FK'si ile)
+    schema="proj": proje dosyası (ATTACH edilmiş DB'ye FK verilemez)
+    """
+    c = conn.cursor()
+    fk = ", FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE" if schema == "main" else ""
+
+    for table_name, columns in TABLE_COLUMNS.items():
+        cols_def = ", ".join([f"[{col}] TEXT" for col in columns])
+        c.execute(
+            f"CREATE TABLE IF NOT EXISTS {schema}.{table_name} ("
+            f"id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, {cols_def}{fk})"
+        )
+
+        cols = {r[1] for r in c.execute(f"PRAGMA {schema}.table_info({table_name})").fetchall()}
+        if "Rol" not in cols:
+            c.execute(f"ALTER TABLE {schema}.{table_name} ADD COLUMN Rol TEXT")
+        if "DosyaAdi" not in cols:
+            c.execute(f"ALTER TABLE {schema}.{table_name} ADD COLUMN DosyaAdi TEXT")
+        if table_name in TipKodu.TABLES and TipKodu.COLUMN not in cols:
+            c.execute(f"ALTER TABLE {schema}.{table_name} ADD COLUMN {TipKodu.COLUMN} INTEGER")
+            n = TipKodu.backfill(conn, schema, table_name)
+            if n:
+                print(f"✅ {schema}.{table_name}: {n} kayıt için TipKodu dolduruldu.")
+
+    create_raw_hts_indexes(conn, schema)
+
+    # proje geneli arama indeksi (FTS5 trigram; sürücü desteklemiyorsa atlanır)
+    HtsFullText.create(conn, schema)
+
+
+def open_project_shard(pid):
+    """Proje dosyası yerleşiminde projenin veri dosyasını bağlar (tek dosya yerleşiminde no-op)."""
+    if not ProjectShards.enabled():
+        return
+    with DB() as conn:
+        ProjectShards.attach(conn, pid, create_raw_hts_schema)
+
+
+def create_app_schema(conn, sharded: bool | None = None):
+    """
+    Uygulamanın tüm tabloları + migration'lar (setup_database ve DB karşılaştırma aracı kullanır).
+    sharded=None: kayıtlı yerleşim; False: ham HTS tabloları ana DB'de.
+    """
+    if sharded is None:
+        sharded = ProjectShards.enabled()
+
+    c = conn.cursor()
+
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS projeler ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "talep_eden_birim TEXT, dosya_no_tipi TEXT, dosya_no TEXT, suc_bilgisi TEXT, "
+        "suc_tarihi TEXT, gorevlendirme_tarihi TEXT, bilirkisi_adi TEXT, "
+        "bilirkisi_unvan_sicil TEXT, olusturma_tarihi TEXT)"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS taraflar ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "ProjeID INTEGER REFERENCES projeler(id) ON DELETE CASCADE, "
+        "sifat TEXT, ad_soyad TEXT)"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS hts_ozet ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
+        "MinDate TEXT, MaxDate TEXT, UNIQUE(ProjeID, GSMNo))"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS hts_ozet_iletisim ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
+        "KarsiNo TEXT, Adet INTEGER, Sure INTEGER, Isim TEXT)"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS hts_ozet_baz ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
+        "BazAdi TEXT, Sinyal INTEGER)"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS hts_ozet_imei ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
+        "IMEI TEXT, Adet INTEGER, MinDate TEXT, MaxDate TEXT)"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS hts_rehber ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
+        "KarsiNo TEXT, Adet INTEGER, Sure INTEGER, Isim TEXT, TC TEXT)"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS hts_tum_baz ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
+        "BazAdi TEXT, Sinyal INTEGER)"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS hts_ortak_imei ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, IMEI TEXT, "
+        "KullananSayisi INTEGER, Numaralar TEXT, ToplamKullanim INTEGER, "
+        "UNIQUE(ProjeID, IMEI))"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS hts_ortak_isim ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, AdSoyad TEXT, "
+        "HatSayisi INTEGER, Numaralar TEXT, UNIQUE(ProjeID, AdSoyad))"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS hts_ortak_tc ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, TC TEXT, "
+        "HatSayisi INTEGER, Numaralar TEXT, UNIQUE(ProjeID, TC))"
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_rehber ON hts_rehber (ProjeID, GSMNo)")
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS ozel_konumlar ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, "
+        "Lat REAL, Lon REAL, Label TEXT, "
+        "FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS rapor_taslagi ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, Baslik TEXT, Icerik TEXT, "
+        "Tur TEXT, Tarih TEXT, Sira INTEGER, GenislikYuzde INTEGER DEFAULT 100, YukseklikMm INTEGER, "
+        "Hizalama TEXT DEFAULT 'center', Aciklama TEXT DEFAULT '', HtmlIcerik TEXT, ImagePath TEXT, "
+        "FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS hts_dosyalari ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, GSMNo TEXT, Rol TEXT, DosyaAdi TEXT, "
+        "DosyaBoyutu INTEGER, DosyaYolu TEXT, TalepEdenMakam TEXT, SorguBaslangic TEXT, SorguBitis TEXT, "
+        "Tespit TEXT, MD5 TEXT, SHA256 TEXT, YuklenmeTarihi TEXT DEFAULT CURRENT_TIMESTAMP, "
+        "UNIQUE(ProjeID, GSMNo, Rol), FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS rapor_meta ("
+        "ProjeID INTEGER PRIMARY KEY, GorevlendirmeMetni TEXT, DosyaHakkindaMetni TEXT, "
+        "GenelBilgilendirmeMetni TEXT, DegerlendirmeMetni TEXT, SonucMetni TEXT, "
+        "MarginTopMm INTEGER DEFAULT 20, MarginRightMm INTEGER DEFAULT 20, "
+        "MarginBottomMm INTEGER DEFAULT 20, MarginLeftMm INTEGER DEFAULT 20, "
+        "GuncellemeTarihi TEXT DEFAULT CURRENT_TIMESTAMP, "
+        "FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS rapor_meta_ekler ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "ProjeID INTEGER, "
+        "Bolum TEXT, "                      # 'dosya_hakkinda' gibi
+        "DosyaAdi TEXT, "
+        "DosyaYolu TEXT, "                  # evidence_images altında tutulacak
+        "Aciklama TEXT DEFAULT '', "
+        "EklemeTarihi TEXT DEFAULT CURRENT_TIMESTAMP, "
+        "FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_rapor_meta_ekler_pid ON rapor_meta_ekler (ProjeID, Bolum)")
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS manuel_numaralar ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, ProjeID INTEGER, Numara TEXT, "
+        "Aciklama TEXT DEFAULT 'Manuel Giriş', EklemeTarihi TEXT DEFAULT CURRENT_TIMESTAMP, "
+        "FOREIGN KEY(ProjeID) REFERENCES projeler(id) ON DELETE CASCADE)"
+    )
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS baz_kutuphanesi ("
+        "id INTEGER PRIMARY KEY AUTOINCREMENT, CellID TEXT, BazAdi TEXT, "
+        "Lat REAL, Lon REAL, KaynakDosya TEXT, "
+        "OgrenmeTarihi TEXT DEFAULT CURRENT_TIMESTAMP, UNIQUE(CellID, BazAdi))"
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_baz_cell ON baz_kutuphanesi (CellID)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_baz_ad ON baz_kutuphanesi (BazAdi)")
+
+    # ✅ ham HTS tabloları: tek dosya yerleşiminde ana DB'de, proje dosyası yerleşiminde
+    #    açık projenin dosyasında (ATTACH "proj"); proje seçilene kadar boş bellek DB'si bağlı
+    if sharded:
+        ProjectShards.attach(conn, None, create_raw_hts_schema)
+    else:
+        create_raw_hts_schema(conn, "main")
+
+    c.execute("CREATE INDEX IF NOT EXISTS idx_ozet_iletisim_pid_gsm_karsi ON hts_ozet_iletisim (ProjeID, GSMNo, KarsiNo)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_ozet_baz_pid_gsm_baz ON hts_ozet_baz (ProjeID, GSMNo, BazAdi)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_ozet_imei_pid_gsm_imei ON hts_ozet_imei (ProjeID, GSMNo, IMEI)")
+
+    c.execute("CREATE INDEX IF NOT EXISTS idx_manuel_numaralar_pid ON manuel_numaralar (ProjeID)")
+
+    # ✅ migration'lar + ANALYZE sadece şema sürümü değiştiyse (büyük DB'de açılışı bekletmesin)
+    if schema_version(conn) < SCHEMA_VERSION:
+        if run_all_migrations(conn):
+            conn.execute(f"PRAGMA main.user_version = {int(SCHEMA_VERSION)}")
+            conn.commit()
+            print(f"✅ Veritabanı şeması sürüm {SCHEMA_VERSION} olarak güncellendi.")
+
+
+def setup_database():
+    with DB() as conn:
+        create_app_schema(conn)
+
+    # ✅ WAL boyutu / boş sayfa takibi arka planda (stop-the-world VACUUM yok)
+    DbMaintenance.start_scheduler(DatabaseManager(), DatabaseManager.DB_PATH)
+
+
+class AnalysisUtils:
+    """Tüm sınıfların ortak kullandığı ağır analiz işlemleri."""
+
+    @staticmethod
+    def recalculate_common_analysis_core(project_id):
+        try:
+            with DB() as conn:
+                counts = CommonAnalysis.recalculate(conn, project_id)
+            if counts is None:
+                print("ℹ️ Ortak Analiz (Core): Projede veri kalmadığı için hesaplama pas geçildi.")
+                return
+            print(f"✅ Ortak Analiz (Core) başarıyla tamamlandı. (IMEI: {counts['imei']}, İsim: {counts['isim']}, TC: {counts['tc']})")
+
+        except Exception as e:
+            print(f"❌ [recalculate_common_analysis_core] Kritik Hata: {e}")
+
+    # büyük ham tablolar önce, hts_dosyalari en son: iptal edilirse GSM listede kalır, silme tekrarlanabilir
+    GSM_DELETE_TABLES = [
+        "hts_gsm", "hts_gprs", "hts_wap", "hts_sms",
+        "hts_sabit", "hts_sth", "hts_uluslararasi", "hts_abone",
+        "hts_tum_baz", "hts_rehber",
+        "hts_ozet_iletisim", "hts_ozet_baz", "hts_ozet_imei", "hts_ozet",
+        "hts_dosyalari",
+    ]
+
+    @staticmethod
+    def gsm_delete_targets(project_id, gsm_numbers):
+        """BatchDeleter hedefleri: [(tablo, where, params), ...] (GSM sırasıyla)."""
+        targets = []
+        for gsm in gsm_numbers:
+            for t in AnalysisUtils.GSM_DELETE_TABLES:
+                targets.append((t, "ProjeID=? AND GSMNo=?", (project_id, gsm)))
+        return targets
+
+    @staticmethod
+    def delete_gsm_records_core(project_id, gsm_number):
+        """
+        Belirtilen GSM'e ait tüm verileri siler (rowid gruplarıyla; gruplar arasında DB kilidi bırakılır).
+        NOT: ozel_konumlar GSM silmede KESİNLİKLE silinmez (sadece proje silinince silinsin isteği).
+        """
+        try:
+            open_project_shard(project_id)
+            BatchDeleter.run(DatabaseManager(), AnalysisUtils.gsm_delete_targets(project_id, [gsm_number]))
+            ReportRenderCache.invalidate_project(project_id)
+            return True
+        except Exception as e:
+            print(f"❌ [delete_gsm_records_core] Genel Hata: {e}")
+            return False
+
+    @staticmethod
+    def perform_maintenance():
+        """
+        Silme sonrası hafif bakım (GUI'yi bekletmez):
+        1) PASSIVE CHECKPOINT (WAL -> ana db, okuyucuları beklemez)
+        2) Boş sayfaların geri kazanımı arka plan zamanlayıcısına bırakılır (incremental_vacuum adımları)
+        Tam VACUUM yapılmaz; bkz. DbMaintenance.
+        """
+        try:
+            DbMaintenance.checkpoint(DatabaseManager())
+            DbMaintenance.request_reclaim()
+            return True
+
+        except Exception as e:
+            print(f"❌ [perform_maintenance] Bakım Hatası: {e}")
+            return False
+
+    @staticmethod
+    def project_has_any_gsm(project_id: int) -> bool:
+        if not project_id:
+            return False
+
+        try:
+            with DB() as conn:
+                cur = conn.cursor()
+                r = cur.execute("SELECT 1 FROM hts_dosyalari WHERE ProjeID=? LIMIT 1", (project_id,)).fetchone()
+                if r:
+                    return True
+                r = cur.execute("SELECT 1 FROM hts_ozet WHERE ProjeID=? LIMIT 1", (project_id,)).fetchone()
+                if r:
+                    return True
+                r = cur.execute("SELECT 1 FROM hts_gsm WHERE ProjeID=? LIMIT 1", (project_id,)).fetchone()
+                return bool(r)
+        except Exception as e:
+            print(f"project_has_any_gsm hata: {e}")
+            return False
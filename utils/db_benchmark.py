@@ -0,0 +1,366 @@
+"""
+SQLCipher performans profili karşılaştırma aracı.
+
+Her yapılandırma için uygulamanın gerçek şemasıyla (create_app_schema) sentetik, şifreli bir DB kurar;
+içe aktarma hızını ve temsilî sorguları (sekme yükleme, rehber/baz özetleri, tarih aralığı,
+çapraz konum eşleşmesi) ölçer, yapılandırma başına tablo halinde raporlar.
+
+Kullanım:
+    python -m utils.db_benchmark --gsm 6 --rows 50000 --rounds 3
+    python -m utils.db_benchmark --configs standart,yuksek --json sonuc.json
+
+SQLCipher sürücüsü yoksa düz sqlite3 ile çalışır (şifreleme maliyeti ölçülmez, uyarı basılır).
+"""
+import argparse
+import json
+import os
+import random
+import secrets
+import statistics
+import sys
+import tempfile
+import time
+
+from utils.db_profile import DbProfile
+
+
+def _to_iso(col):
+    return f"substr({col}, 7, 4) || '-' || substr({col}, 4, 2) || '-' || substr({col}, 1, 2) || substr({col}, 11)"
+
+
+def _norm10(col):
+    return f"substr(replace(replace(replace({col}, ' ', ''), '-', ''), '+', ''), -10, 10)"
+
+
+class DbBenchmark:
+    IMPORT_CHUNK = 5000
+
+    # profiller + yalnızca ölçüm için ek varyantlar
+    EXTRA_CONFIGS = {
+        "sayfa_8k": {**DbProfile.PROFILES["dengeli"], "label": "Dengeli + 8K sayfa", "cipher_page_size": 8192},
+        "kdf_64k": {**DbProfile.PROFILES["dengeli"], "label": "Dengeli + KDF 64000", "kdf_iter": 64000},
+        "mmap_256": {**DbProfile.PROFILES["dengeli"], "label": "Dengeli + mmap 256 MB", "mmap_mb": 256},
+        "bellek_temizle": {**DbProfile.PROFILES["dengeli"], "label": "Dengeli + cipher_memory_security", "memory_security": True},
+    }
+
+    QUERIES = [
+        ("sekme_gsm", "SELECT * FROM hts_gsm WHERE ProjeID=? AND GSMNo=?", "gsm"),
+        ("sekme_gprs", "SELECT * FROM hts_gprs WHERE ProjeID=? AND GSMNo=?", "gsm"),
+        ("rehber_ozet", """
+            SELECT DIGER_NUMARA, COUNT(*), SUM(CAST(SURE as INTEGER)), MAX(DIGER_ISIM), MAX(DIGER_TC)
+            FROM hts_gsm WHERE ProjeID=? AND GSMNo=? AND DIGER_NUMARA != ?
+            GROUP BY DIGER_NUMARA ORDER BY 2 DESC
+        """, "gsm3"),
+        ("baz_ozet", """
+            SELECT BAZ, COUNT(*) FROM hts_gsm WHERE ProjeID=? AND GSMNo=? AND BAZ != ''
+            GROUP BY BAZ ORDER BY 2 DESC
+        """, "gsm"),
+        ("tarih_araligi", f"""
+            SELECT * FROM hts_gsm WHERE ProjeID=? AND GSMNo=?
+              AND ({_to_iso('TARIH')}) BETWEEN ? AND ?
+        """, "range"),
+        ("capraz_konum", f"""
+            SELECT t1.TARIH, t1.GSMNo, t1.DIGER_NUMARA, t1.BAZ, t2.BAZ
+            FROM hts_gsm t1
+            JOIN hts_gsm t2 ON
+                t1.ProjeID = t2.ProjeID AND
+                {_norm10('t2.NUMARA')} = {_norm10('t1.DIGER_NUMARA')} AND
+                {_norm10('t2.DIGER_NUMARA')} = {_norm10('t1.NUMARA')} AND
+                datetime({_to_iso('t2.TARIH')}) BETWEEN
+                    datetime({_to_iso('t1.TARIH')}, '-3 seconds') AND
+                    datetime({_to_iso('t1.TARIH')}, '+3 seconds')
+            WHERE t1.ProjeID=? AND ({_to_iso('t1.TARIH')}) BETWEEN ? AND ?
+              AND t1.GSMNo != t1.DIGER_NUMARA
+            ORDER BY {_to_iso('t1.TARIH')} DESC
+        """, "cross"),
+    ]
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def configs() -> dict:
+        out = {name: dict(p) for name, p in DbProfile.PROFILES.items()}
+        out.update({name: dict(p) for name, p in DbBenchmark.EXTRA_CONFIGS.items()})
+        return out
+
+    @staticmethod
+    def driver():
+        """(connect, şifreli_mi)"""
+        try:
+            from pysqlcipher3 import dbapi2 as drv
+            return drv.connect, True
+        except Exception:
+            pass
+        try:
+            from sqlcipher3 import dbapi2 as drv
+            return drv.connect, True
+        except Exception:
+            pass
+        import sqlite3
+        return sqlite3.connect, False
+
+    @staticmethod
+    def open(path, key, cfg, connect, encrypted: bool):
+        """Bağlantıyı uygulamanın sırasıyla açar. Dönüş: (conn, ilk_okuma_ms)."""
+        t0 = time.perf_counter()
+        conn = connect(path, check_same_thread=False, timeout=30)
+        cur = conn.cursor()
+        if encrypted:
+            cur.execute(f"PRAGMA key = '{key}';")
+            cur.execute("PRAGMA cipher_compatibility = 4;")
+            DbProfile.apply_cipher(cur, DbProfile.format_of(cfg), cfg["memory_security"])
+        cur.execute("SELECT count(*) FROM sqlite_master;").fetchone()
+        open_ms = (time.perf_counter() - t0) * 1000.0
+
+        cur.execute("PRAGMA journal_mode=WAL;")
+        cur.execute("PRAGMA synchronous=NORMAL;")
+        cur.execute("PRAGMA foreign_keys=ON;")
+        DbProfile.apply_runtime(cur, cfg)
+        conn.commit()
+        return conn, open_ms
+
+    # ------------------------------------------------------------------
+    # sentetik veri
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _gsms(n):
+        return [f"5{random.randint(300000000, 599999999)}" for _ in range(n)]
+
+    @staticmethod
+    def _tarih(ts):
+        return time.strftime("%d.%m.%Y %H:%M:%S", time.gmtime(ts))
+
+    @staticmethod
+    def _rows_for(gsm, targets, n, t_start, bazlar, contacts):
+        """hts_gsm satırları; hedefler arası aramalar karşı tarafa aynı anla aynalanır (çapraz konum eşleşsin)."""
+        own, mirrored = [], []
+        imei = f"35{random.randint(10 ** 12, 10 ** 13 - 1)}"
+        for i in range(n):
+            ts = t_start + i * 37 + random.randint(0, 30)
+            other = random.choice(targets) if random.random() < 0.05 else random.choice(contacts)
+            tip = random.choice(("ARADI", "ARANDI"))
+            baz = random.choice(bazlar)
+            row = (str(i + 1), gsm, tip, other, DbBenchmark._tarih(ts), str(random.randint(1, 900)),
+                   f"KİŞİ {other[-4:]}", str(random.randint(10 ** 10, 10 ** 11 - 1)), imei, baz)
+            own.append(row)
+            if other in targets and other != gsm:
+                mirrored.append((other, (str(i + 1), other, "ARANDI" if tip == "ARADI" else "ARADI", gsm,
+                                         row[4], row[5], "", "", "", random.choice(bazlar))))
+        return own, mirrored
+
+    @staticmethod
+    def build(conn, n_gsm: int, rows_per_gsm: int, seed: int = 42) -> dict:
+        """Şema + sentetik proje. Dönüş: {"rows", "import_s", "rows_per_s", "gsms", "range"}"""
+        from utils.constants import TABLE_COLUMNS
+        from utils.db import create_app_schema
+        from utils.tip_kodu import TipKodu
+
+        random.seed(seed)
+        create_app_schema(conn, sharded=False)
+        conn.commit()
+
+        cur = conn.cursor()
+        cur.execute("INSERT INTO projeler (dosya_no, olusturma_tarihi) VALUES ('BENCH', '01.01.2024')")
+        pid = cur.lastrowid
+        conn.commit()
+
+        gsms = DbBenchmark._gsms(n_gsm)
+        contacts = DbBenchmark._gsms(800)
+        bazlar = [f"İL{random.randint(1, 81)} - İLÇE{random.randint(1, 30)} ({random.randint(10000, 99999)})"
+                  for _ in range(600)]
+        t_start = int(time.mktime((2024, 1, 1, 0, 0, 0, 0, 0, -1)))
+
+        gsm_cols = TABLE_COLUMNS["hts_gsm"]
+        gprs_cols = TABLE_COLUMNS["hts_gprs"]
+        sql_gsm = (f"INSERT INTO hts_gsm (ProjeID, GSMNo, Rol, DosyaAdi, {','.join(gsm_cols)}, TipKodu) "
+                   f"VALUES ({','.join(['?'] * (len(gsm_cols) + 5))})")
+        sql_gprs = (f"INSERT INTO hts_gprs (ProjeID, GSMNo, Rol, DosyaAdi, {','.join(gprs_cols)}, TipKodu) "
+                    f"VALUES ({','.join(['?'] * (len(gprs_cols) + 5))})")
+
+        per_gsm = {g: [] for g in gsms}
+        for g in gsms:
+            own, mirrored = DbBenchmark._rows_for(g, gsms, rows_per_gsm, t_start, bazlar, contacts)
+            per_gsm[g].extend(own)
+            for other, r in mirrored:
+                per_gsm[other].append(r)
+
+        total = 0
+        t0 = time.perf_counter()
+        for g, rows in per_gsm.items():
+            data = [(pid, g, "HEDEF", "bench.xlsx") + r + (TipKodu.classify(r[2], "hts_gsm"),) for r in rows]
+            for i in range(0, len(data), DbBenchmark.IMPORT_CHUNK):
+                conn.executemany(sql_gsm, data[i:i + DbBenchmark.IMPORT_CHUNK])
+                conn.commit()
+            gprs = [(pid, g, "HEDEF", "bench.xlsx", str(i + 1), g, "GPRS", r[4], r[5], r[8],
+                     f"10.0.{i % 255}.{i % 200}", "1024", "4096", r[9], TipKodu.DATA)
+                    for i, r in enumerate(rows[: len(rows) // 2])]
+            for i in range(0, len(gprs), DbBenchmark.IMPORT_CHUNK):
+                conn.executemany(sql_gprs, gprs[i:i + DbBenchmark.IMPORT_CHUNK])
+                conn.commit()
+            total += len(data) + len(gprs)
+        import_s = time.perf_counter() - t0
+
+        conn.execute("ANALYZE;")
+        conn.commit()
+
+        return {
+            "pid": pid,
+            "rows": total,
+            "import_s": import_s,
+            "rows_per_s": total / import_s if import_s > 0 else 0.0,
+            "gsms": gsms,
+            "range": ("2024-01-05 00:00:00", "2024-01-20 23:59:59"),
+        }
+
+    # ------------------------------------------------------------------
+    # ölçüm
+    # ------------------------------------------------------------------
+    @staticmethod
+    def replay(conn, info: dict, rounds: int = 3) -> dict:
+        """Her sorgu için ms medyanı (tüm hedef GSM'ler üzerinde)."""
+        pid = info["pid"]
+        s_date, e_date = info["range"]
+        out = {}
+        for name, sql, kind in DbBenchmark.QUERIES:
+            if kind == "cross":
+                params_list = [(pid, s_date, e_date)]
+            elif kind == "range":
+                params_list = [(pid, g, s_date, e_date) for g in info["gsms"]]
+            elif kind == "gsm3":
+                params_list = [(pid, g, g) for g in info["gsms"]]
+            else:
+                params_list = [(pid, g) for g in info["gsms"]]
+
+            times = []
+            for _ in range(max(1, rounds)):
+                t0 = time.perf_counter()
+                for params in params_list:
+                    conn.execute(sql, params).fetchall()
+                times.append((time.perf_counter() - t0) * 1000.0)
+            out[name] = statistics.median(times)
+        return out
+
+    @staticmethod
+    def run_config(name, cfg, workdir, n_gsm, rows_per_gsm, rounds, connect, encrypted) -> dict:
+        path = os.path.join(workdir, f"bench_{name}.db")
+        for p in (path, path + "-wal", path + "-shm"):
+            if os.path.exists(p):
+                os.remove(p)
+
+        key = secrets.token_hex(32)
+        conn, _ = DbBenchmark.open(path, key, cfg, connect, encrypted)
+        try:
+            info = DbBenchmark.build(conn, n_gsm, rows_per_gsm)
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+        finally:
+            conn.close()
+
+        # soğuk açılış (KDF + ilk sayfa) ve sorgular
+        conn, open_ms = DbBenchmark.open(path, key, cfg, connect, encrypted)
+        try:
+            queries = DbBenchmark.replay(conn, info, rounds)
+        finally:
+            conn.close()
+
+        return {
+            "config": name,
+            "label": cfg.get("label", name),
+            "encrypted": encrypted,
+            "rows": info["rows"],
+            "import_rows_per_s": info["rows_per_s"],
+            "open_ms": open_ms,
+            "db_bytes": os.path.getsize(path) if os.path.exists(path) else 0,
+            "queries_ms": queries,
+        }
+
+    @staticmethod
+    def run(names=None, n_gsm: int = 6, rows_per_gsm: int = 50000, rounds: int = 3, workdir=None,
+            keep: bool = False, progress_cb=None) -> list:
+        connect, encrypted = DbBenchmark.driver()
+        if not encrypted:
+            print("⚠️ [DbBenchmark] SQLCipher sürücüsü bulunamadı; düz sqlite3 ile ölçülüyor (şifreleme maliyeti yok).")
+
+        all_cfgs = DbBenchmark.configs()
+        names = list(names or all_cfgs.keys())
+        unknown = [n for n in names if n not in all_cfgs]
+        if unknown:
+            raise ValueError(f"Bilinmeyen yapılandırma: {', '.join(unknown)}")
+
+        own_dir = workdir is None
+        workdir = workdir or tempfile.mkdtemp(prefix="htsmercek_bench_")
+        results = []
+        try:
+            for i, name in enumerate(names):
+                if callable(progress_cb):
+                    progress_cb(i, len(names), name)
+                results.append(DbBenchmark.run_config(
+                    name, all_cfgs[name], workdir, n_gsm, rows_per_gsm, rounds, connect, encrypted
+                ))
+        finally:
+            if own_dir and not keep:
+                for f in os.listdir(workdir):
+                    try:
+                        os.remove(os.path.join(workdir, f))
+                    except Exception:
+                        pass
+                try:
+                    os.rmdir(workdir)
+                except Exception:
+                    pass
+        return results
+
+    @staticmethod
+    def format_report(results: list) -> str:
+        if not results:
+            return ""
+        qnames = [q[0] for q in DbBenchmark.QUERIES]
+        head = ["yapılandırma", "açılış ms", "içe aktarma satır/s", "boyut MB"] + [f"{q} ms" for q in qnames]
+        rows = []
+        for r in results:
+            rows.append([
+                r["config"],
+                f"{r['open_ms']:.0f}",
+                f"{r['import_rows_per_s']:,.0f}".replace(",", "."),
+                f"{r['db_bytes'] / 1024 ** 2:.1f}",
+            ] + [f"{r['queries_ms'][q]:.1f}" for q in qnames])
+
+        widths = [max(len(str(x)) for x in col) for col in zip(head, *rows)]
+        line = lambda cells: "  ".join(str(c).rjust(w) for c, w in zip(cells, widths))
+        out = [line(head), "  ".join("-" * w for w in widths)] + [line(r) for r in rows]
+        if not results[0].get("encrypted"):
+            out.append("(şifresiz sqlite3 ile ölçüldü)")
+        return "\n".join(out)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="HTS Mercek SQLCipher performans profili karşılaştırması")
+    ap.add_argument("--configs", default="", help="virgülle ayrılmış yapılandırmalar (varsayılan: hepsi)")
+    ap.add_argument("--gsm", type=int, default=6, help="hedef GSM sayısı")
+    ap.add_argument("--rows", type=int, default=50000, help="GSM başına hts_gsm satırı")
+    ap.add_argument("--rounds", type=int, default=3, help="sorgu tekrar sayısı (medyan)")
+    ap.add_argument("--dir", default=None, help="çalışma klasörü (varsayılan: geçici)")
+    ap.add_argument("--keep", action="store_true", help="oluşturulan DB dosyalarını silme")
+    ap.add_argument("--json", default=None, help="sonuçları JSON olarak yaz")
+    ap.add_argument("--list", action="store_true", help="yapılandırmaları listele")
+    args = ap.parse_args(argv)
+
+    if args.list:
+        for name, cfg in DbBenchmark.configs().items():
+            print(f"{name:16s} {cfg['label']}")
+        return 0
+
+    names = [n.strip() for n in args.configs.split(",") if n.strip()] or None
+    results = DbBenchmark.run(
+        names, args.gsm, args.rows, args.rounds, args.dir, args.keep,
+        progress_cb=lambda i, n, name: print(f"[{i + 1}/{n}] {name} ...", flush=True),
+    )
+    print(DbBenchmark.format_report(results))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"✅ Sonuçlar yazıldı: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
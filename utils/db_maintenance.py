@@ -0,0 +1,268 @@
+import os
+import threading
+import time
+
+
+class DbMaintenance:
+    """
+    Dünyayı durdurmayan veritabanı bakımı.
+
+    - Alan geri kazanımı: PRAGMA auto_vacuum=INCREMENTAL + "PRAGMA incremental_vacuum(N)" küçük adımlarla;
+      her adım arasında DB kilidi bırakılır, GUI / import sorguları araya girebilir.
+    - WAL: arka plan zamanlayıcısı WAL dosyası boyutuna bakar; eşik aşılınca PASSIVE checkpoint,
+      WAL tamamen aktarılabildiyse TRUNCATE ile dosyayı küçültür. Kilit meşgulse o tur atlanır.
+    - Tam VACUUM sadece bir kez, auto_vacuum modunu INCREMENTAL'a çevirmek için (kullanıcı onayıyla).
+
+    mgr: DatabaseManager (lock() + get_connection()). Bu modül ui katmanına bağımlı değildir.
+    """
+
+    AUTO_VACUUM_INCREMENTAL = 2
+
+    STEP_PAGES = 2048                      # tek adımda serbest bırakılacak sayfa (~8 MB @4K)
+    WAL_CHECKPOINT_BYTES = 64 * 1024 * 1024
+    JOURNAL_SIZE_LIMIT = 64 * 1024 * 1024
+    SCHEDULER_INTERVAL_S = 20.0
+    BACKGROUND_RECLAIM_STEPS = 4           # zamanlayıcı turu başına en fazla adım
+    BACKGROUND_FREE_RATIO = 0.10           # boş sayfa oranı bunu aşarsa arka planda geri kazan
+    LOCK_WAIT_S = 0.25
+
+    _mgr = None
+    _db_path = None
+    _thread = None
+    _stop = threading.Event()
+    _wake = threading.Event()
+    _reclaim_requested = False
+
+    # ------------------------------------------------------------------
+    # bağlantı ayarı
+    # ------------------------------------------------------------------
+    @staticmethod
+    def configure_connection(cur):
+        """
+        Bağlantı açılışında çağrılır.
+        Yeni (boş) DB'de auto_vacuum=INCREMENTAL hemen geçerli olur; mevcut DB'de ilk tam VACUUM'a kadar etkisizdir.
+        journal_size_limit: checkpoint sonrası WAL dosyası bu boyuta kırpılır.
+        """
+        try:
+            cur.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+        except Exception:
+            pass
+        try:
+            cur.execute(f"PRAGMA journal_size_limit={int(DbMaintenance.JOURNAL_SIZE_LIMIT)};")
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # istatistik
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _pragma_int(cur, name):
+        row = cur.execute(f"PRAGMA {name};").fetchone()
+        return int(row[0]) if row and row[0] is not None else 0
+
+    @staticmethod
+    def stats(mgr, db_path: str) -> dict:
+        """Boyut / boş sayfa / WAL bilgisi (sadece PRAGMA okur, hızlıdır)."""
+        with mgr.lock():
+            cur = mgr.get_connection().cursor()
+            page_size = DbMaintenance._pragma_int(cur, "page_size")
+            page_count = DbMaintenance._pragma_int(cur, "page_count")
+            free_pages = DbMaintenance._pragma_int(cur, "freelist_count")
+            auto_vacuum = DbMaintenance._pragma_int(cur, "auto_vacuum")
+
+        wal_bytes = 0
+        try:
+            wal = db_path + "-wal"
+            if os.path.exists(wal):
+                wal_bytes = os.path.getsize(wal)
+        except Exception:
+            pass
+
+        return {
+            "page_size": page_size,
+            "page_count": page_count,
+            "free_pages": free_pages,
+            "db_bytes": page_size * page_count,
+            "free_bytes": page_size * free_pages,
+            "free_ratio": (free_pages / page_count) if page_count else 0.0,
+            "wal_bytes": wal_bytes,
+            "auto_vacuum": auto_vacuum,
+            "incremental": auto_vacuum == DbMaintenance.AUTO_VACUUM_INCREMENTAL,
+        }
+
+    @staticmethod
+    def format_stats(st: dict) -> str:
+        def mb(b):
+            b = float(b or 0)
+            if b >= 1024 ** 3:
+                return f"{b / 1024 ** 3:.2f} GB"
+            return f"{b / 1024 ** 2:.1f} MB"
+
+        mode = "artımlı" if st.get("incremental") else "kapalı (tek seferlik dönüştürme gerekli)"
+        return (
+            f"DB: {mb(st.get('db_bytes'))}  •  Boş alan: {mb(st.get('free_bytes'))} "
+            f"(%{100.0 * st.get('free_ratio', 0.0):.1f})  •  WAL: {mb(st.get('wal_bytes'))}  •  Oto-sıkıştırma: {mode}"
+        )
+
+    # ------------------------------------------------------------------
+    # adımlar
+    # ------------------------------------------------------------------
+    @staticmethod
+    def checkpoint(mgr, truncate: bool = False, blocking: bool = True):
+        """
+        WAL -> ana DB. PASSIVE beklemez; truncate=True ise TRUNCATE denenir.
+        blocking=False: kilit kısa sürede alınamazsa None döner (zamanlayıcı için).
+        Dönüş: (busy, wal_frames, checkpointed_frames)
+        """
+        lock = mgr.lock()
+        if not lock.acquire(timeout=-1 if blocking else DbMaintenance.LOCK_WAIT_S):
+            return None
+        try:
+            cur = mgr.get_connection().cursor()
+            mode = "TRUNCATE" if truncate else "PASSIVE"
+            row = cur.execute(f"PRAGMA wal_checkpoint({mode});").fetchone()
+            return tuple(int(x) for x in row) if row else None
+        finally:
+            lock.release()
+
+    @staticmethod
+    def incremental_step(mgr, pages: int | None = None, blocking: bool = True):
+        """
+        Tek sınırlı adım: en fazla `pages` boş sayfayı dosyadan geri verir.
+        Dönüş: kalan boş sayfa sayısı; kilit alınamazsa / mod artımlı değilse None.
+        """
+        lock = mgr.lock()
+        if not lock.acquire(timeout=-1 if blocking else DbMaintenance.LOCK_WAIT_S):
+            return None
+        try:
+            conn = mgr.get_connection()
+            cur = conn.cursor()
+            if DbMaintenance._pragma_int(cur, "auto_vacuum") != DbMaintenance.AUTO_VACUUM_INCREMENTAL:
+                return None
+            n = int(pages or DbMaintenance.STEP_PAGES)
+            # pragma her sayfa için bir satır adımlar; fetchall ile sonuna kadar koşturulur
+            cur.execute(f"PRAGMA incremental_vacuum({n});").fetchall()
+            conn.commit()
+            return DbMaintenance._pragma_int(cur, "freelist_count")
+        finally:
+            lock.release()
+
+    @staticmethod
+    def reclaim(mgr, step_pages: int | None = None, progress_cb=None, should_stop=None, max_steps: int | None = None):
+        """
+        Boş sayfaları adım adım geri kazanır (adımlar arasında kilit serbest).
+        progress_cb(done_pages, total_pages) / should_stop() -> True ise durur.
+        Dönüş: geri kazanılan sayfa sayısı (mod artımlı değilse None).
+        """
+        with mgr.lock():
+            cur = mgr.get_connection().cursor()
+            if DbMaintenance._pragma_int(cur, "auto_vacuum") != DbMaintenance.AUTO_VACUUM_INCREMENTAL:
+                return None
+            start_free = DbMaintenance._pragma_int(cur, "freelist_count")
+
+        remaining = start_free
+        steps = 0
+        while remaining > 0:
+            if callable(should_stop) and should_stop():
+                break
+            if max_steps is not None and steps >= max_steps:
+                break
+
+            left = DbMaintenance.incremental_step(mgr, step_pages)
+            if left is None or left >= remaining:
+                break
+            remaining = left
+            steps += 1
+
+            if callable(progress_cb):
+                progress_cb(start_free - remaining, start_free)
+
+            # diğer iş parçacıkları kilidi alabilsin
+            time.sleep(0.005)
+
+        return start_free - remaining
+
+    @staticmethod
+    def convert_to_incremental(mgr):
+        """
+        Mevcut DB'yi auto_vacuum=INCREMENTAL'a çevirir (tek seferlik TAM VACUUM; uzun sürebilir).
+        Sonraki bakımların hepsi artımlıdır.
+        """
+        with mgr.lock():
+            conn = mgr.get_connection()
+            cur = conn.cursor()
+            try:
+                cur.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+            except Exception:
+                cur.execute("PRAGMA wal_checkpoint(FULL);")
+            cur.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+            cur.execute("VACUUM;")
+            return DbMaintenance._pragma_int(cur, "auto_vacuum") == DbMaintenance.AUTO_VACUUM_INCREMENTAL
+
+    # ------------------------------------------------------------------
+    # arka plan zamanlayıcı
+    # ------------------------------------------------------------------
+    @staticmethod
+    def start_scheduler(mgr, db_path: str):
+        cls = DbMaintenance
+        cls._mgr = mgr
+        cls._db_path = db_path
+        if cls._thread is not None and cls._thread.is_alive():
+            return
+
+        cls._stop.clear()
+        cls._thread = threading.Thread(target=cls._scheduler_loop, name="HTSMercekDbMaintenance", daemon=True)
+        cls._thread.start()
+
+    @staticmethod
+    def stop_scheduler():
+        DbMaintenance._stop.set()
+        DbMaintenance._wake.set()
+
+    @staticmethod
+    def request_reclaim():
+        """Büyük silme sonrası: zamanlayıcı bir sonraki turda beklemeden alan geri kazanımına başlar."""
+        DbMaintenance._reclaim_requested = True
+        DbMaintenance._wake.set()
+
+    @staticmethod
+    def _wal_bytes() -> int:
+        try:
+            p = (DbMaintenance._db_path or "") + "-wal"
+            return os.path.getsize(p) if os.path.exists(p) else 0
+        except Exception:
+            return 0
+
+    @staticmethod
+    def _scheduler_loop():
+        cls = DbMaintenance
+        while not cls._stop.is_set():
+            cls._wake.wait(cls.SCHEDULER_INTERVAL_S)
+            cls._wake.clear()
+            if cls._stop.is_set():
+                break
+
+            mgr = cls._mgr
+            if mgr is None:
+                continue
+
+            try:
+                if cls._wal_bytes() > cls.WAL_CHECKPOINT_BYTES:
+                    res = cls.checkpoint(mgr, truncate=False, blocking=False)
+                    # WAL tamamen aktarıldıysa dosyayı da küçült
+                    if res and res[0] == 0 and res[1] >= 0 and res[1] == res[2]:
+                        cls.checkpoint(mgr, truncate=True, blocking=False)
+
+                st = cls.stats(mgr, cls._db_path)
+                if st["incremental"] and st["free_pages"] > 0 and (
+                    cls._reclaim_requested or st["free_ratio"] >= cls.BACKGROUND_FREE_RATIO
+                ):
+                    cls.reclaim(
+                        mgr,
+                        should_stop=cls._stop.is_set,
+                        max_steps=None if cls._reclaim_requested else cls.BACKGROUND_RECLAIM_STEPS,
+                    )
+                cls._reclaim_requested = False
+
+            except Exception as e:
+                print(f"⚠️ [DbMaintenance] Arka plan bakımı atlandı: {e}")
@@ -0,0 +1,140 @@
+from utils.app_settings import AppSettings
+
+
+class DbProfile:
+    """
+    SQLCipher bağlantı performans profili (settings.json'da saklanır, bağlantı açılışında uygulanır).
+
+    İki grup ayar vardır:
+    - Dosya biçimi (cipher_page_size, kdf_iter): DB dosyası hangi değerlerle oluşturulduysa her açılışta
+      aynıları verilmelidir; aksi halde dosya açılamaz. Bu yüzden oluşturma anındaki değerler ayrıca
+      kaydedilir (FORMAT_KEY) ve profil değişse de mevcut dosyada korunur. Yeni profilin biçimi ancak
+      yeni oluşturulan (veya yeniden şifrelenen) dosyada geçerli olur.
+    - Çalışma ayarları (cache_size, mmap_size, temp_store, cipher_memory_security): her an değiştirilebilir.
+
+    Sıra: PRAGMA key -> apply_cipher() -> ilk okuma -> apply_runtime().
+    """
+
+    KEY = "db_profile"
+    FORMAT_KEY = "db_cipher_format"
+    DEFAULT = "dengeli"
+
+    # SQLCipher 4 varsayılanları
+    DEFAULT_FORMAT = {"page_size": 4096, "kdf_iter": 256000}
+
+    PROFILES = {
+        "standart": {
+            "label": "Standart (SQLCipher varsayılanları)",
+            "cache_mb": 2,
+            "mmap_mb": 0,
+            "temp_store": "MEMORY",
+            "cipher_page_size": 4096,
+            "kdf_iter": 256000,
+            "memory_security": True,
+        },
+        "dengeli": {
+            "label": "Dengeli (64 MB önbellek)",
+            "cache_mb": 64,
+            "mmap_mb": 0,
+            "temp_store": "MEMORY",
+            "cipher_page_size": 4096,
+            "kdf_iter": 256000,
+            "memory_security": False,
+        },
+        "yuksek": {
+            "label": "Yüksek Performans (256 MB önbellek, 16K sayfa)",
+            "cache_mb": 256,
+            "mmap_mb": 0,
+            "temp_store": "MEMORY",
+            "cipher_page_size": 16384,
+            "kdf_iter": 256000,
+            "memory_security": False,
+        },
+        "dusuk_bellek": {
+            "label": "Düşük Bellek (16 MB önbellek, geçici tablolar diskte)",
+            "cache_mb": 16,
+            "mmap_mb": 0,
+            "temp_store": "FILE",
+            "cipher_page_size": 4096,
+            "kdf_iter": 256000,
+            "memory_security": False,
+        },
+    }
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def current_name() -> str:
+        name = AppSettings.get(DbProfile.KEY, DbProfile.DEFAULT)
+        return name if name in DbProfile.PROFILES else DbProfile.DEFAULT
+
+    @staticmethod
+    def current() -> dict:
+        return DbProfile.PROFILES[DbProfile.current_name()]
+
+    @staticmethod
+    def set_current(name: str):
+        if name not in DbProfile.PROFILES:
+            raise ValueError(f"Bilinmeyen profil: {name}")
+        AppSettings.set(DbProfile.KEY, name)
+
+    # ------------------------------------------------------------------
+    # dosya biçimi
+    # ------------------------------------------------------------------
+    @staticmethod
+    def format_of(profile: dict) -> dict:
+        return {"page_size": int(profile["cipher_page_size"]), "kdf_iter": int(profile["kdf_iter"])}
+
+    @staticmethod
+    def stored_format() -> dict:
+        """Mevcut DB dosyasının biçimi; kayıt yoksa (eski kurulum) SQLCipher 4 varsayılanları."""
+        fmt = AppSettings.get(DbProfile.FORMAT_KEY)
+        if isinstance(fmt, dict) and fmt.get("page_size") and fmt.get("kdf_iter"):
+            return {"page_size": int(fmt["page_size"]), "kdf_iter": int(fmt["kdf_iter"])}
+        return dict(DbProfile.DEFAULT_FORMAT)
+
+    @staticmethod
+    def format_for_open(db_exists: bool) -> dict:
+        """Açılacak dosya için biçim: yeni dosyada seçili profilinki, mevcut dosyada kayıtlı olan."""
+        if db_exists:
+            return DbProfile.stored_format()
+        return DbProfile.format_of(DbProfile.current())
+
+    @staticmethod
+    def record_format(fmt: dict):
+        AppSettings.set(DbProfile.FORMAT_KEY, {"page_size": int(fmt["page_size"]), "kdf_iter": int(fmt["kdf_iter"])})
+
+    # ------------------------------------------------------------------
+    # uygulama
+    # ------------------------------------------------------------------
+    @staticmethod
+    def apply_cipher(cur, fmt: dict, memory_security: bool | None = None):
+        """PRAGMA key'den hemen sonra, ilk okumadan ÖNCE çağrılmalıdır."""
+        cur.execute(f"PRAGMA cipher_page_size = {int(fmt['page_size'])};")
+        cur.execute(f"PRAGMA kdf_iter = {int(fmt['kdf_iter'])};")
+        if memory_security is not None:
+            try:
+                cur.execute(f"PRAGMA cipher_memory_security = {'ON' if memory_security else 'OFF'};")
+            except Exception:
+                pass
+
+    @staticmethod
+    def apply_runtime(cur, profile: dict):
+        """Çalışma ayarları (bağlantı açıkken de değiştirilebilir)."""
+        cur.execute(f"PRAGMA cache_size = -{int(profile['cache_mb']) * 1024};")
+        cur.execute(f"PRAGMA mmap_size = {int(profile['mmap_mb']) * 1024 * 1024};")
+        cur.execute(f"PRAGMA temp_store = {profile['temp_store']};")
+        try:
+            cur.execute(f"PRAGMA cipher_memory_security = {'ON' if profile['memory_security'] else 'OFF'};")
+        except Exception:
+            pass
+
+    @staticmethod
+    def describe(name: str) -> str:
+        p = DbProfile.PROFILES[name]
+        return (
+            f"{p['label']}\n"
+            f"Önbellek: {p['cache_mb']} MB  •  Geçici tablolar: {p['temp_store']}  •  "
+            f"Bellek temizleme: {'Açık' if p['memory_security'] else 'Kapalı'}\n"
+            f"Şifreli sayfa: {p['cipher_page_size']} B  •  KDF: {p['kdf_iter']} "
+            f"(sayfa/KDF sadece yeni oluşturulan veritabanında geçerlidir)"
+        )
@@ -0,0 +1,327 @@
+import hashlib
+import os
+import re
+import threading
+from datetime import datetime
+
+from security.security import LicenseManager
+
+
+class EvidenceStore:
+    """
+    İçerik adresli (SHA-256) delil görsel deposu.
+
+    - Aynı görüntü aynı türle (Tur: geo_map / chart / delil ...) ikinci kez gelirse yeni dosya yazılmaz,
+      mevcut kayıt (id) döner.
+    - Uygulama içi yakalamalar (put_image) optimize PNG (kayıpsız) yazılır; alfa kanalı olmayan büyük
+      görüntülerde (harita/ekran görüntüsü) yüksek kaliteli JPEG belirgin küçükse o seçilir.
+    - Diskten seçilen dosyalar (put_file) değiştirilmeden, dosya hash'iyle saklanır.
+    - Her görsel için rapor merkezi listesinde kullanılan küçük önizleme (thumbnail) üretilir.
+    - Rapor blokları görsele delil_gorselleri.id ile bağlanır (rapor_taslagi.GorselID);
+      HTML içinde "hts-evidence://<id>" referansı render anında dosya yoluna çözülür.
+
+    DB bağlantısı çağıran taraftan gelir (with DB() as conn).
+    """
+
+    MAX_WIDTH = 2400
+    THUMB_SIZE = (96, 54)
+    JPEG_QUALITY = 90
+    JPEG_MIN_PNG_BYTES = 512 * 1024
+    JPEG_MAX_RATIO = 0.6
+
+    REF_SCHEME = "hts-evidence://"
+    _REF_RE = re.compile(r"hts-evidence://(\d+)")
+
+    _path_cache = {}
+    _kind_cache = {}
+    _lock = threading.RLock()
+
+    @staticmethod
+    def store_dir() -> str:
+        d = os.path.join(LicenseManager.appdata_dir(), "evidence_store")
+        os.makedirs(os.path.join(d, "thumbs"), exist_ok=True)
+        return d
+
+    _CREATE_SQL = """
+        CREATE TABLE IF NOT EXISTS delil_gorselleri (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            Sha256 TEXT,
+            Tur TEXT NOT NULL DEFAULT '',
+            Yol TEXT,
+            ThumbYol TEXT,
+            Genislik INTEGER,
+            Yukseklik INTEGER,
+            Boyut INTEGER,
+            Bicim TEXT,
+            Tarih TEXT,
+            UNIQUE (Sha256, Tur)
+        )
+    """
+    _PREFIX_RE = re.compile(r"^(.+?)_[0-9a-f]{32}\.\w+$")
+
+    @staticmethod
+    def ensure_schema(conn):
+        """
+        Tablo yoksa oluşturur. Eski şemada (Sha256 UNIQUE, Tur yok) tablo yeniden kurulur:
+        id'ler korunur, Tur eski dosya adındaki önekten (geo_map_ / chart_ ...) doldurulur.
+        """
+        cols = [r[1] for r in conn.execute("PRAGMA table_info(delil_gorselleri)").fetchall()]
+        if cols and "Tur" not in cols:
+            rows = conn.execute(
+                "SELECT id, Sha256, Yol, ThumbYol, Genislik, Yukseklik, Boyut, Bicim, Tarih FROM delil_gorselleri"
+            ).fetchall()
+            conn.execute("ALTER TABLE delil_gorselleri RENAME TO delil_gorselleri_eski")
+            conn.execute(EvidenceStore._CREATE_SQL)
+            conn.executemany(
+                "INSERT INTO delil_gorselleri "
+                "(id, Sha256, Tur, Yol, ThumbYol, Genislik, Yukseklik, Boyut, Bicim, Tarih) VALUES (?,?,?,?,?,?,?,?,?,?)",
+                [(r[0], r[1], EvidenceStore._kind_from_path(r[2])) + tuple(r[2:]) for r in rows]
+            )
+            conn.execute("DROP TABLE delil_gorselleri_eski")
+            print(f"✅ [EvidenceStore] delil_gorselleri yeni şemaya taşındı ({len(rows)} kayıt).")
+        else:
+            conn.execute(EvidenceStore._CREATE_SQL)
+
+    @staticmethod
+    def _kind_from_path(path) -> str:
+        m = EvidenceStore._PREFIX_RE.match(os.path.basename(path or ""))
+        return m.group(1) if m else ""
+
+    # ------------------------------------------------------------------
+    # yardımcılar
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _encode(img: "QImage", fmt: str, quality: int = -1) -> bytes:
+        from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+        ba = QByteArray()
+        buf = QBuffer(ba)
+        buf.open(QIODevice.OpenModeFlag.WriteOnly)
+        img.save(buf, fmt, quality)
+        buf.close()
+        return bytes(ba)
+
+    @staticmethod
+    def _optimize_png(data: bytes) -> bytes:
+        """PIL varsa PNG'yi optimize=True ile yeniden sıkıştırır (kayıpsız)."""
+        try:
+            import io
+            from PIL import Image
+            im = Image.open(io.BytesIO(data))
+            out = io.BytesIO()
+            im.save(out, "PNG", optimize=True)
+            opt = out.getvalue()
+            return opt if len(opt) < len(data) else data
+        except Exception:
+            return data
+
+    @staticmethod
+    def _pixel_digest(img: "QImage") -> str:
+        """Kodlamadan bağımsız içerik hash'i (boyut + format + ham piksel)."""
+        from PyQt6.QtGui import QImage
+        img = img.convertToFormat(QImage.Format.Format_RGBA8888)
+        h = hashlib.sha256()
+        h.update(f"{img.width()}x{img.height()}:{img.bytesPerLine()}".encode("ascii"))
+        h.update(img.constBits().asstring(img.sizeInBytes()))
+        return h.hexdigest()
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _make_thumb(img: "QImage", digest: str) -> str:
+        from PyQt6.QtCore import Qt
+        tw, th = EvidenceStore.THUMB_SIZE
+        path = os.path.join(EvidenceStore.store_dir(), "thumbs", f"{digest[:32]}.png")
+        if not os.path.exists(path):
+            thumb = img.scaled(
+                tw, th,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+            EvidenceStore._write_atomic(path, EvidenceStore._encode(thumb, "PNG"))
+        return path
+
+    @staticmethod
+    def _lookup(conn, digest: str, kind: str):
+        """(id, Yol, ThumbYol) -> kayıt var ve dosyası duruyorsa; yoksa None."""
+        row = conn.execute(
+            "SELECT id, Yol, ThumbYol FROM delil_gorselleri WHERE Sha256=? AND Tur=?", (digest, kind)
+        ).fetchone()
+        if row and row[1] and os.path.exists(row[1]):
+            return row
+        return None
+
+    @staticmethod
+    def _save(conn, digest, kind, path, thumb, w, h, size, fmt) -> int:
+        """
+        Yeni içerik -> INSERT. Kayıt var ama dosyası kaybolmuşsa (yeniden yazıldı) satır UPDATE edilir:
+        id değişmez, rapor_taslagi.GorselID ve hts-evidence://<id> referansları geçerli kalır.
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        row = conn.execute(
+            "SELECT id FROM delil_gorselleri WHERE Sha256=? AND Tur=?", (digest, kind)
+        ).fetchone()
+        if row:
+            gid = int(row[0])
+            conn.execute(
+                "UPDATE delil_gorselleri SET Yol=?, ThumbYol=?, Genislik=?, Yukseklik=?, Boyut=?, Bicim=?, Tarih=? "
+                "WHERE id=?",
+                (path, thumb, int(w), int(h), int(size), fmt, now, gid)
+            )
+        else:
+            cur = conn.execute(
+                "INSERT INTO delil_gorselleri "
+                "(Sha256, Tur, Yol, ThumbYol, Genislik, Yukseklik, Boyut, Bicim, Tarih) VALUES (?,?,?,?,?,?,?,?,?)",
+                (digest, kind, path, thumb, int(w), int(h), int(size), fmt, now)
+            )
+            gid = int(cur.lastrowid)
+        with EvidenceStore._lock:
+            EvidenceStore._path_cache[gid] = path
+            EvidenceStore._kind_cache[gid] = kind
+        return gid
+
+    # ------------------------------------------------------------------
+    # public
+    # ------------------------------------------------------------------
+    @staticmethod
+    def put_image(conn, image: "QImage", prefix: str = "delil", max_width: int | None = None):
+        """
+        Uygulama içi yakalamayı (harita / grafik / ikon) depoya yazar. Dönüş: (gorsel_id, dosya_yolu).
+        Hata olursa (None, None). prefix görselin türüdür (Tur kolonu + dosya adı öneki; rapor tarafı
+        "geo_map / event_map / chart" ile sınıflar). Aynı piksel farklı türle ayrı kayıt olur.
+        """
+        try:
+            if image is None or image.isNull():
+                return None, None
+
+            from PyQt6.QtCore import Qt
+
+            mw = int(max_width or EvidenceStore.MAX_WIDTH)
+            if image.width() > mw:
+                image = image.scaledToWidth(mw, Qt.TransformationMode.SmoothTransformation)
+
+            digest = EvidenceStore._pixel_digest(image)
+            hit = EvidenceStore._lookup(conn, digest, prefix)
+            if hit:
+                return int(hit[0]), hit[1]
+
+            data = EvidenceStore._optimize_png(EvidenceStore._encode(image, "PNG"))
+            ext, fmt = ".png", "PNG"
+
+            if (not image.hasAlphaChannel()) and len(data) >= EvidenceStore.JPEG_MIN_PNG_BYTES:
+                jpg = EvidenceStore._encode(image, "JPG", EvidenceStore.JPEG_QUALITY)
+                if jpg and len(jpg) < len(data) * EvidenceStore.JPEG_MAX_RATIO:
+                    data, ext, fmt = jpg, ".jpg", "JPEG"
+
+            path = os.path.join(EvidenceStore.store_dir(), f"{prefix}_{digest[:32]}{ext}")
+            if not os.path.exists(path):
+                EvidenceStore._write_atomic(path, data)
+
+            thumb = EvidenceStore._make_thumb(image, digest)
+            gid = EvidenceStore._save(conn, digest, prefix, path, thumb, image.width(), image.height(), len(data), fmt)
+            return gid, path
+
+        except Exception as e:
+            print(f"❌ [EvidenceStore.put_image] {e}")
+            return None, None
+
+    @staticmethod
+    def put_file(conn, src_path: str, prefix: str = "delil"):
+        """
+        Diskten seçilen resmi depoya alır: dosya bayt bayt (yeniden boyutlandırma / kodlama yok) saklanır,
+        anahtar dosyanın SHA-256'sıdır. Qt'nin açamadığı biçimler de saklanır (thumbnail olmadan).
+        Dönüş: (gorsel_id, dosya_yolu).
+        """
+        try:
+            ext = os.path.splitext(src_path)[1].lower() or ".png"
+            with open(src_path, "rb") as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+
+            hit = EvidenceStore._lookup(conn, digest, prefix)
+            if hit:
+                return int(hit[0]), hit[1]
+
+            path = os.path.join(EvidenceStore.store_dir(), f"{prefix}_{digest[:32]}{ext}")
+            if not os.path.exists(path):
+                EvidenceStore._write_atomic(path, data)
+
+            from PyQt6.QtGui import QImage
+            img = QImage(path)
+            thumb = EvidenceStore._make_thumb(img, digest) if not img.isNull() else None
+            gid = EvidenceStore._save(
+                conn, digest, prefix, path, thumb, max(0, img.width()), max(0, img.height()),
+                len(data), ext.lstrip(".").upper()
+            )
+            return gid, path
+
+        except Exception as e:
+            print(f"❌ [EvidenceStore.put_file] {e}")
+            return None, None
+
+    @staticmethod
+    def path_for_id(conn, gorsel_id):
+        if not gorsel_id:
+            return None
+        try:
+            gid = int(gorsel_id)
+        except Exception:
+            return None
+
+        with EvidenceStore._lock:
+            if gid in EvidenceStore._path_cache:
+                return EvidenceStore._path_cache[gid]
+
+        row = conn.execute("SELECT Yol FROM delil_gorselleri WHERE id=?", (gid,)).fetchone()
+        path = row[0] if row else None
+        with EvidenceStore._lock:
+            EvidenceStore._path_cache[gid] = path
+        return path
+
+    @staticmethod
+    def kind_for_id(conn, gorsel_id) -> str:
+        """Görselin türü (put_image / put_file prefix'i: "geo_map", "event_map", "chart", "delil" ...)."""
+        try:
+            gid = int(gorsel_id)
+        except Exception:
+            return ""
+
+        with EvidenceStore._lock:
+            if gid in EvidenceStore._kind_cache:
+                return EvidenceStore._kind_cache[gid]
+
+        row = conn.execute("SELECT Tur FROM delil_gorselleri WHERE id=?", (gid,)).fetchone()
+        kind = (row[0] or "") if row else ""
+        with EvidenceStore._lock:
+            EvidenceStore._kind_cache[gid] = kind
+        return kind
+
+    @staticmethod
+    def thumb_paths(conn, ids) -> dict:
+        """{gorsel_id: thumb_yolu} (liste ekranı için tek sorgu)."""
+        ids = [int(x) for x in ids if x]
+        if not ids:
+            return {}
+        q = ",".join(["?"] * len(ids))
+        rows = conn.execute(f"SELECT id, ThumbYol FROM delil_gorselleri WHERE id IN ({q})", ids).fetchall()
+        return {int(r[0]): r[1] for r in rows if r[1] and os.path.exists(r[1])}
+
+    @staticmethod
+    def ref(gorsel_id) -> str:
+        return f"{EvidenceStore.REF_SCHEME}{int(gorsel_id)}"
+
+    @staticmethod
+    def resolve_refs(conn, html_content: str, to_uri) -> str:
+        """HTML içindeki hts-evidence://<id> referanslarını to_uri(dosya_yolu) ile değiştirir."""
+        if not html_content or EvidenceStore.REF_SCHEME not in html_content:
+            return html_content
+
+        def _sub(m):
+            p = EvidenceStore.path_for_id(conn, m.group(1))
+            return to_uri(p) if p else ""
+
+        return EvidenceStore._REF_RE.sub(_sub, html_content)
@@ -0,0 +1,213 @@
+from utils.constants import TABLE_COLUMNS
+from utils.search_index import RowSearchIndex
+
+
+class HtsFullText:
+    """
+    Proje geneli arama için FTS5 (trigram) indeksi: tüm ham HTS tablolarının numara / isim / TC /
+    baz / IMEI / IP alanları tek bir sanal tabloda (hts_fts) tutulur.
+
+    - Metin RowSearchIndex.normalize ile katlanarak yazılır (tablo aramasıyla aynı Türkçe/aksan davranışı).
+    - rowid = ham kayıt id * ROWID_MUL + tablo kodu -> isabetten ham satıra rowid ile dönülür.
+    - Ekleme importer'da (index_rows), silme ham tablolardaki AFTER DELETE tetikleyicileriyle yapılır;
+      BatchDeleter / proje silme (CASCADE) gibi tüm silme yolları indeksi kendiliğinden temizler.
+    - Sürücü FTS5/trigram desteklemiyorsa indeks oluşturulmaz, arama kullanılamaz (uygulama çalışmaya devam eder).
+    """
+
+    TABLE = "hts_fts"
+    SQL_FUNC = "HTS_ARAMA_NORM"
+    ROWID_MUL = 16
+    MIN_QUERY = 3
+
+    FIELDS = ("numara", "isim", "tc", "baz", "imei", "ip")
+    FIELD_LABELS = {"numara": "Diğer Numara", "isim": "İsim", "tc": "TC", "baz": "Baz", "imei": "IMEI", "ip": "IP"}
+
+    TABLE_CODES = {
+        "hts_gsm": 1, "hts_sms": 2, "hts_sabit": 3, "hts_uluslararasi": 4,
+        "hts_sth": 5, "hts_gprs": 6, "hts_wap": 7, "hts_abone": 8,
+    }
+
+    # FTS alanı -> ham kolon(lar); tabloda olmayan kolonlar atlanır
+    SOURCES = {
+        "numara": ("DIGER_NUMARA",),
+        "isim": ("DIGER_ISIM",),
+        "tc": ("DIGER_TC",),
+        "baz": ("BAZ",),
+        "imei": ("IMEI",),
+        "ip": ("KAYNAK_IP", "HEDEF_IP"),
+    }
+    SOURCE_OVERRIDES = {
+        "hts_abone": {"numara": (), "isim": ("AD", "SOYAD"), "tc": ("TC_KIMLIK_NO",)},
+    }
+
+    _supported = None
+
+    # ------------------------------------------------------------------
+    _norm_cache = {}
+
+    @staticmethod
+    def _norm(*values) -> str | None:
+        text = " ".join(s for s in (str(v).strip() for v in values if v is not None) if s)
+        if text.isascii():
+            return text.lower() or None
+        # isim / baz gibi Türkçe metinler çok tekrar eder -> NFD yolu bir kez
+        out = HtsFullText._norm_cache.get(text)
+        if out is None:
+            out = RowSearchIndex.normalize(text) or None
+            if len(HtsFullText._norm_cache) < 65536:
+                HtsFullText._norm_cache[text] = out
+        return out
+
+    @staticmethod
+    def register(conn):
+        """Bağlantıya HTS_ARAMA_NORM(...) SQL fonksiyonunu ekler (değerleri boşlukla birleştirip normalize eder)."""
+        try:
+            conn.create_function(HtsFullText.SQL_FUNC, -1, HtsFullText._norm, deterministic=True)
+        except TypeError:
+            conn.create_function(HtsFullText.SQL_FUNC, -1, HtsFullText._norm)
+
+    @staticmethod
+    def supported(conn) -> bool:
+        """SQLite sürücüsü FTS5 + trigram tokenizer destekliyor mu (bir kez denenir)."""
+        if HtsFullText._supported is None:
+            try:
+                conn.execute("CREATE VIRTUAL TABLE temp._hts_fts_probe USING fts5(x, tokenize='trigram')")
+                conn.execute("DROP TABLE temp._hts_fts_probe")
+                HtsFullText._supported = True
+            except Exception as e:
+                print(f"⚠️ [HtsFullText] FTS5/trigram desteklenmiyor, proje geneli arama kapalı: {e}")
+                HtsFullText._supported = False
+        return HtsFullText._supported
+
+    @staticmethod
+    def exists(conn, schema: str | None = None) -> bool:
+        name = f"{schema}.{HtsFullText.TABLE}" if schema else HtsFullText.TABLE
+        try:
+            conn.execute(f"SELECT 1 FROM {name} LIMIT 0")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _field_exprs(table: str) -> list:
+        cols = set(TABLE_COLUMNS.get(table, ()))
+        override = HtsFullText.SOURCE_OVERRIDES.get(table, {})
+        exprs = []
+        for field in HtsFullText.FIELDS:
+            src = [c for c in override.get(field, HtsFullText.SOURCES[field]) if c in cols]
+            exprs.append(f"{HtsFullText.SQL_FUNC}({', '.join(f'[{c}]' for c in src)})" if src else "NULL")
+        return exprs
+
+    # ------------------------------------------------------------------
+    # şema
+    # ------------------------------------------------------------------
+    @staticmethod
+    def create(conn, schema: str = "main"):
+        """
+        hts_fts sanal tablosu + silme tetikleyicileri (create_raw_hts_schema çağırır).
+        Tablo ilk kez oluşturuluyorsa mevcut ham kayıtlar indekslenir.
+        """
+        if not HtsFullText.supported(conn):
+            return False
+
+        is_new = not HtsFullText.exists(conn, schema)
+        if is_new:
+            cols = ", ".join(HtsFullText.FIELDS)
+            conn.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {schema}.{HtsFullText.TABLE} USING fts5("
+                f"{cols}, ProjeID UNINDEXED, GSMNo UNINDEXED, Tablo UNINDEXED, tokenize='trigram')"
+            )
+
+        for table, code in HtsFullText.TABLE_CODES.items():
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {schema}.trg_{table}_fts_del AFTER DELETE ON {table} BEGIN "
+                f"DELETE FROM {HtsFullText.TABLE} WHERE rowid = old.id * {HtsFullText.ROWID_MUL} + {code}; END"
+            )
+
+        if is_new:
+            total = 0
+            for table in HtsFullText.TABLE_CODES:
+                total += HtsFullText.index_rows(conn, table, 0, schema)
+            if total:
+                print(f"✅ {schema}.{HtsFullText.TABLE}: {total} kayıt arama indeksine eklendi.")
+        return True
+
+    @staticmethod
+    def drop(conn, schema: str = "main"):
+        for table in HtsFullText.TABLE_CODES:
+            conn.execute(f"DROP TRIGGER IF EXISTS {schema}.trg_{table}_fts_del")
+        conn.execute(f"DROP TABLE IF EXISTS {schema}.{HtsFullText.TABLE}")
+
+    # ------------------------------------------------------------------
+    # bakım
+    # ------------------------------------------------------------------
+    @staticmethod
+    def last_id(conn, table: str, schema: str | None = None) -> int:
+        name = f"{schema}.{table}" if schema else table
+        row = conn.execute(f"SELECT MAX(id) FROM {name}").fetchone()
+        return int(row[0] or 0) if row else 0
+
+    @staticmethod
+    def index_rows(conn, table: str, after_id: int, schema: str | None = None) -> int:
+        """
+        table içinde id > after_id olan kayıtları indekse ekler (importer her batch'ten sonra çağırır).
+        İndeks yoksa (FTS5 desteklenmiyor) 0 döner.
+        """
+        code = HtsFullText.TABLE_CODES.get(table)
+        if code is None or not HtsFullText.exists(conn, schema):
+            return 0
+
+        HtsFullText.register(conn)
+        pre = f"{schema}." if schema else ""
+        exprs = ", ".join(HtsFullText._field_exprs(table))
+        cur = conn.execute(
+            f"INSERT INTO {pre}{HtsFullText.TABLE} (rowid, {', '.join(HtsFullText.FIELDS)}, ProjeID, GSMNo, Tablo) "
+            f"SELECT id * {HtsFullText.ROWID_MUL} + {code}, {exprs}, ProjeID, GSMNo, '{table}' "
+            f"FROM {pre}{table} WHERE id > ?",
+            (int(after_id),)
+        )
+        return cur.rowcount or 0
+
+    # ------------------------------------------------------------------
+    # arama
+    # ------------------------------------------------------------------
+    @staticmethod
+    def match_expr(text) -> str | None:
+        """Kullanıcı metni -> FTS5 ifade (normalize + tırnaklı ifade); MIN_QUERY'den kısaysa None."""
+        q = RowSearchIndex.normalize(text)
+        if len(q) < HtsFullText.MIN_QUERY:
+            return None
+        return '"' + q.replace('"', '""') + '"'
+
+    @staticmethod
+    def search_groups(conn, project_id, text) -> list:
+        """Eşleşmeler GSM ve tablo bazında: [(GSMNo, tablo, adet), ...]."""
+        expr = HtsFullText.match_expr(text)
+        if expr is None:
+            return []
+        rows = conn.execute(
+            f"SELECT GSMNo, Tablo, COUNT(*) FROM {HtsFullText.TABLE} "
+            f"WHERE {HtsFullText.TABLE} MATCH ? AND ProjeID = ? "
+            f"GROUP BY GSMNo, Tablo ORDER BY GSMNo, Tablo",
+            (expr, int(project_id))
+        ).fetchall()
+        return [(r[0], r[1], int(r[2])) for r in rows]
+
+    @staticmethod
+    def fetch_rows(conn, project_id, text, gsm, table, limit: int = 5000):
+        """Bir (GSM, tablo) grubunun eşleşen ham satırları. Dönüş: (kolonlar, satırlar)."""
+        expr = HtsFullText.match_expr(text)
+        code = HtsFullText.TABLE_CODES.get(table)
+        cols = list(TABLE_COLUMNS.get(table, ()))
+        if expr is None or code is None or not cols:
+            return cols, []
+
+        col_sql = ", ".join(f"t.[{c}]" for c in cols)
+        rows = conn.execute(
+            f"SELECT {col_sql} FROM {HtsFullText.TABLE} f "
+            f"JOIN {table} t ON t.id = (f.rowid - {code}) / {HtsFullText.ROWID_MUL} "
+            f"WHERE f.{HtsFullText.TABLE} MATCH ? AND f.ProjeID = ? AND f.GSMNo = ? AND f.Tablo = ? "
+            f"ORDER BY t.id LIMIT ?",
+            (expr, int(project_id), gsm, table, int(limit))
+        ).fetchall()
+        return cols, [list(r) for r in rows]
@@ -0,0 +1,696 @@
+import hashlib
+import os
+import re
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from analysis.common import CommonAnalysis
+from utils.constants import HEADER_ALIASES, TABLE_COLUMNS
+from utils.hts_fts import HtsFullText
+from utils.report_cache import ReportRenderCache
+from utils.tip_kodu import TipKodu
+from utils.trace_spans import Tracer
+from utils.xlsx_stream import XlsxStreamReader
+
+
+def _norm_header(h):
+    """Başlıkları standart hale getirir (Türkçe, Boşluk, Kare Karakter Temizliği)."""
+    if h is None: return ""
+    s = str(h).strip().upper()
+    s = s.replace("_X000D_", "").replace("\n", "").replace("\r", "")
+    s = s.replace("İ", "I").replace("Ş", "S").replace("Ç", "C").replace("Ö", "O").replace("Ü", "U").replace("Ğ", "G")
+    s = re.sub(r'[^A-Z0-9]', '', s)
+    return s
+
+
+def _normalize_msisdn(val: object) -> str:
+    digits = re.sub(r"\D", "", "" if val is None else str(val))
+    if len(digits) >= 10:
+        return digits[-10:]
+    return digits
+
+
+def _extract_gsm_from_filename(dosya_yolu):
+    filename = os.path.basename(dosya_yolu)
+
+    match = re.search(r"(5\d{9})", filename)
+    if match:
+        return _normalize_msisdn(match.group(1))
+
+    match_gen = re.search(r"(\d{10,})", filename)
+    return _normalize_msisdn(match_gen.group(1)) if match_gen else "BILINMIYOR"
+
+
+def _detect_target_gsm(file_path):
+    found_gsm = None
+    try:
+        xr = XlsxStreamReader(file_path)
+
+        for row in xr.iter_rows(min_row=1, max_row=100):
+            if not row or len(row) < 2:
+                continue
+
+            col_a = str(row[0]).upper().replace("İ", "I") if row[0] else ""
+
+            if "SORGULANAN" in col_a and "NO" in col_a:
+                found_gsm = _normalize_msisdn(row[1])
+                if found_gsm and found_gsm != "BILINMIYOR" and len(found_gsm) >= 10:
+                    break
+
+        xr.close()
+    except Exception as e:
+        print(f"Excel Okuma Hatası: {e}")
+
+    if not found_gsm or found_gsm == "BILINMIYOR":
+        return _extract_gsm_from_filename(file_path)
+
+    return found_gsm
+
+
+def detect_hts_role(path: str) -> tuple[str, str]:
+    xr = XlsxStreamReader(path)
+
+    def norm(x):
+        if x is None:
+            return ""
+        s = str(x).strip().upper()
+        s = s.replace("İ","I").replace("Ş","S").replace("Ç","C") \
+             .replace("Ö","O").replace("Ü","U").replace("Ğ","G")
+        return s
+
+    def norm_space(s: str) -> str:
+        s = norm(s)
+        s = re.sub(r"\s+", " ", s).strip()
+        return s
+
+    sorgulanan_no = None
+
+    for row in xr.iter_rows(min_row=1, max_row=200):
+        if not row or len(row) < 2:
+            continue
+        a = norm(row[0])
+        if "SORGULANAN" in a and "NO" in a:
+            raw = str(row[1]) if row[1] is not None else ""
+            clean = re.sub(r"\D", "", raw)
+            if len(clean) >= 10:
+                sorgulanan_no = clean
+                break
+
+    if not sorgulanan_no:
+        xr.close()
+        raise Exception("Rol tespiti yapılamadı: 'Sorgulanan No:' bulunamadı.")
+
+    header_row_idx = None
+    for i, row in enumerate(xr.iter_rows(min_row=1, max_row=400), start=1):
+        joined = " ".join([norm(c) for c in row if c is not None])
+        if "GSM GORUSME SORGU SONUCLARI" in joined:
+            header_row_idx = i
+            break
+
+    if not header_row_idx:
+        xr.close()
+        raise Exception("Rol tespiti yapılamadı: 'GSM GÖRÜŞME SORGU SONUÇLARI' başlığı bulunamadı.")
+
+    idx_numara = idx_diger = None
+    real_header_idx = None
+    for i, row in enumerate(xr.iter_rows(min_row=header_row_idx, max_row=header_row_idx+5), start=header_row_idx):
+        cells = [norm(c) for c in row]
+        if any(("NUMARA" == c or "NUMARA" in c) for c in cells) and any("DIGER" in c for c in cells):
+            real_header_idx = i
+            for j, c in enumerate(cells):
+                if c == "NUMARA":
+                    idx_numara = j
+                if "DIGER" in c and "NUMARA" in c:
+                    idx_diger = j
+            break
+
+    if real_header_idx is None or idx_numara is None or idx_diger is None:
+        xr.close()
+        raise Exception("Rol tespiti yapılamadı: NUMARA / DİĞER NUMARA sütunları bulunamadı.")
+
+    first_data_row = None
+    for row in xr.iter_rows(min_row=real_header_idx+1, max_row=real_header_idx+50):
+        if not row:
+            continue
+        v_num = re.sub(r"\D", "", str(row[idx_numara])) if row[idx_numara] else ""
+        v_dig = re.sub(r"\D", "", str(row[idx_diger])) if row[idx_diger] else ""
+        if len(v_num) >= 10 or len(v_dig) >= 10:
+            first_data_row = row
+            break
+
+    if not first_data_row:
+        role = None
+
+        hedef_pat = norm_space("İletişimin Tespiti (Arama - Aranma - Mesaj Atma - Mesaj Alma)")
+        karsi_pat = norm_space("İletişimin Tespiti (Aranma - Arama - Mesaj Alma - Mesaj Atma)")
+
+        for row in xr.iter_rows(min_row=1, max_row=120):
+            if not row:
+                continue
+
+            a0 = str(row[0]) if len(row) > 0 and row[0] is not None else ""
+            a1 = str(row[1]) if len(row) > 1 and row[1] is not None else ""
+            raw_join = f"{a0} {a1}".strip()
+
+            n = norm_space(raw_join)
+            if "TESPIT" in n:
+                if hedef_pat in n:
+                    role = "HEDEF"
+                    break
+                if karsi_pat in n:
+                    role = "KARSI"
+                    break
+
+        xr.close()
+
+        if not role:
+            role = "HEDEF"
+
+        return role, sorgulanan_no
+
+    xr.close()
+
+    numara1 = re.sub(r"\D", "", str(first_data_row[idx_numara])) if first_data_row[idx_numara] else ""
+    diger1  = re.sub(r"\D", "", str(first_data_row[idx_diger])) if first_data_row[idx_diger] else ""
+
+    if numara1 == sorgulanan_no:
+        return "HEDEF", sorgulanan_no
+    if diger1 == sorgulanan_no:
+        return "KARSI", sorgulanan_no
+
+    return "HEDEF", sorgulanan_no
+
+
+
+class HtsImporter:
+    """
+    Tek bir HTS Excel dosyasını projeye aktarır (Qt'siz; arayüzde HtsWorker, komut satırında cli.py çalıştırır).
+
+    Akış: dosya imzası (MD5/SHA256) -> meta + hedef GSM + rol -> blok/başlık tespiti -> ham tablolara BATCH_SIZE'lık
+    gruplar halinde yazma -> GSM özetleri -> (istenirse) ortak analiz.
+
+    db: çağrıldığında bağlantı veren context manager üreten fabrika (arayüzde DB).
+    İlerleme / log / GSM tespiti geri çağrımlarla bildirilir; should_stop() True dönerse okuma durur.
+    Proje dosyası yerleşiminde shard'ın bağlanması (ProjectShards.pin + open_project_shard) çağıranın işidir.
+    """
+
+    BATCH_SIZE = 5000
+    PROGRESS_EVERY = 5000
+
+    BLOCK_MAP_KEYS = ["ABONE BILGILERI", "GSM GORUSME", "SABIT TELEFON", "ULUSLARARASI", "MESAJ BILGILERI", "INTERNET BAGLANTI", "STH GORUSME"]
+    BLOCK_MAP = {
+        "ABONE BILGILERI": "hts_abone",
+        "GSM GORUSME SORGU SONUCLARI": "hts_gsm",
+        "SABIT TELEFON GORUSME SORGU SONUCLARI": "hts_sabit",
+        "ULUSLARARASI GORUSME SORGU SONUCLARI": "hts_uluslararasi",
+        "MESAJ BILGILERI": "hts_sms",
+        "INTERNET BAGLANTI (GPRS)": "hts_gprs",
+        "INTERNET BAGLANTI (WAP)": "hts_wap",
+        "STH GORUSME SORGU SONUCLARI": "hts_sth",
+    }
+    SUMMARY_DATE_TABLES = ["hts_gsm", "hts_sms", "hts_gprs", "hts_wap", "hts_sabit", "hts_sth"]
+
+    # blok başlığı tespiti: hücre metni bir kez normalleştirilir, satır tek derlenmiş desenle taranır
+    TR_UPPER = str.maketrans("İŞÇÖÜĞ", "ISCOUG")
+    BLOCK_PATTERN = re.compile("|".join(re.escape(k) for k in BLOCK_MAP))
+    NORM_CACHE_MAX = 200000
+
+    def __init__(self, path, pid, db, on_progress=None, on_log=None, on_gsm=None, should_stop=None,
+                 recalc_common: bool = True):
+        self.path = path
+        self.pid = pid
+        self.db = db
+        self.file_name = os.path.basename(path)
+        self.current_rol = None
+        self.recalc_common = recalc_common
+
+        self._on_progress = on_progress
+        self._on_log = on_log
+        self._on_gsm = on_gsm
+        self._should_stop = should_stop
+
+        self._norm_cache = {}
+
+        # içe aktarma istatistikleri (tablo -> satır, aşama -> saniye)
+        self.row_counts = defaultdict(int)
+        self.timings = defaultdict(float)
+
+    # ------------------------------------------------------------------
+    # bildirimler
+    # ------------------------------------------------------------------
+    def progress(self, value: int):
+        if self._on_progress:
+            self._on_progress(value)
+
+    def log(self, text: str):
+        if self._on_log:
+            self._on_log(text)
+
+    def gsm_detected(self, gsm: str):
+        if self._on_gsm:
+            self._on_gsm(gsm)
+
+    def stopped(self) -> bool:
+        return bool(self._should_stop and self._should_stop())
+
+    @staticmethod
+    def _yield(ms: int):
+        # GIL'i kısa süre bırak: arayüz thread'i (veya diğer işler) nefes alsın
+        time.sleep(ms / 1000.0)
+
+    @staticmethod
+    def clean_cell_data(value):
+        if value is None: return None
+        text = str(value).strip()
+        text = text.replace('_x000D_', ' ').replace('\n', ' ').replace('\r', ' ')
+        text = re.sub(r'\s+', ' ', text)
+        return text.strip()
+
+    def _norm_text(self, text: str) -> str:
+        """Hücre metni -> kırpılmış, büyük harf, Türkçe karakterleri sadeleşmiş (aynı metin bir kez hesaplanır)."""
+        cache = self._norm_cache
+        out = cache.get(text)
+        if out is None:
+            if len(cache) >= self.NORM_CACHE_MAX:
+                cache.clear()
+            out = cache[text] = text.strip().upper().translate(self.TR_UPPER)
+        return out
+
+    def classify_row(self, row):
+        """
+        Satır bir blok başlığıysa (ör. 'GSM GÖRÜŞME SORGU SONUÇLARI') hedef tabloyu, değilse None döner.
+        Yalnız metin hücreleri birleştirilir (sayı / tarih hücreleri başlık içeremez).
+        """
+        norm = self._norm_text
+        text = " ".join([norm(x) for x in row if x.__class__ is str])
+        if not text or not self.BLOCK_PATTERN.search(text):
+            return None
+        for key, tbl in self.BLOCK_MAP.items():
+            if key in text:
+                return tbl
+        return None
+
+    def is_no_record_row(self, row) -> bool:
+        """A sütununda 'KAYIT BULUNAMADI' (boşluklar yok sayılır)."""
+        a = row[0]
+        return a.__class__ is str and "KAYITBULUNAMADI" in self._norm_text(a).replace(" ", "")
+
+    # ------------------------------------------------------------------
+    # içe aktarma
+    # ------------------------------------------------------------------
+    @Tracer.traced("import.run")
+    def run(self) -> str:
+        """Dosyayı aktarır; hedef GSM'i döner. Hatalar (format vb.) istisna olarak yükselir."""
+        t_start = time.perf_counter()
+
+        self.log(f"📂 Dosya Analiz Ediliyor:\n{self.file_name}")
+        md5_hash = hashlib.md5()
+        sha256_hash = hashlib.sha256()
+
+        t0 = time.perf_counter()
+        try:
+            with Tracer.span("import.hash"), open(self.path, "rb") as f:
+                for byte_block in iter(lambda: f.read(65536), b""):
+                    md5_hash.update(byte_block)
+                    sha256_hash.update(byte_block)
+
+            file_md5 = md5_hash.hexdigest()
+            file_sha256 = sha256_hash.hexdigest()
+            self.log("🔒 Dosya İmzaları (Hash) Oluşturuldu.")
+
+        except Exception as hash_err:
+            print(f"Hash hatası: {hash_err}")
+            file_md5 = "HESAPLANAMADI"
+            file_sha256 = "HESAPLANAMADI"
+        self.timings["hash"] += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with Tracer.span("import.open_workbook", file=self.file_name):
+            sheet = XlsxStreamReader(self.path)
+        self.timings["open"] += time.perf_counter() - t0
+
+        try:
+            target_gsm = self._import_sheet(sheet, file_md5, file_sha256)
+        finally:
+            sheet.close()
+
+        self.timings["total"] += time.perf_counter() - t_start
+        self.progress(100)
+        return target_gsm
+
+    def _import_sheet(self, sheet, file_md5, file_sha256) -> str:
+        """Açılmış sayfayı (XlsxStreamReader) okuyup bloklara göre DB'ye yazar; hedef GSM'i döner."""
+        meta_data = {
+            "Talep Eden Makam": "",
+            "Sorgu Başlangıç Tarihi": "",
+            "Sorgu Bitiş Tarihi": "",
+            "Tespit": ""
+        }
+
+        target_gsm = "BILINMIYOR"
+
+        for row in sheet.iter_rows(min_row=1, max_row=50):
+            if not row or len(row) < 2: continue
+            val_a = row[0]; val_b = row[1]
+            if not val_a: continue
+
+            key = str(val_a).strip().upper()
+            key = key.replace("İ", "I").replace("Ş", "S").replace("Ç", "C").replace("Ö", "O").replace("Ü", "U").replace("Ğ", "G").replace(":", "").strip()
+
+            final_value = ""
+            if val_b is not None:
+                if isinstance(val_b, datetime): final_value = val_b.strftime("%d.%m.%Y %H:%M:%S")
+                else: final_value = str(val_b).strip()
+
+            if "TALEP EDEN" in key: meta_data["Talep Eden Makam"] = final_value
+            elif "SORGULANAN NO" in key or "GSM NO" in key:
+                clean_gsm = re.sub(r'\D', '', final_value)
+                if len(clean_gsm) >= 10: target_gsm = clean_gsm
+            elif "BASLANGIC" in key: meta_data["Sorgu Başlangıç Tarihi"] = final_value
+            elif "BITIS" in key: meta_data["Sorgu Bitiş Tarihi"] = final_value
+            elif "TESPIT" in key or "KONU" in key: meta_data["Tespit"] = final_value
+
+        if target_gsm == "BILINMIYOR":
+            target_gsm = _detect_target_gsm(self.path)
+
+        self.gsm_detected(target_gsm)
+        self.log(f"✅ Hedef Numara Tespit Edildi: {target_gsm}\nDosya: {self.file_name}")
+
+        rol, sorgulanan_no = detect_hts_role(self.path)
+        self.current_rol = rol
+
+        with self.db() as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO hts_dosyalari 
+                (ProjeID, GSMNo, Rol, DosyaAdi, DosyaBoyutu, DosyaYolu, 
+                 TalepEdenMakam, SorguBaslangic, SorguBitis, Tespit, MD5, SHA256) 
+                VALUES (?,?,?,?,?,?,?,?,?,?,?,?)
+            """, (self.pid, target_gsm, rol, self.file_name, int(os.path.getsize(self.path)), self.path,
+                  meta_data["Talep Eden Makam"],
+                  meta_data["Sorgu Başlangıç Tarihi"],
+                  meta_data["Sorgu Bitiş Tarihi"],
+                  meta_data["Tespit"],
+                  file_md5, file_sha256))
+
+        is_valid_format = False; has_target_no = False
+
+        for row in sheet.iter_rows(min_row=1, max_row=100):
+            row_text = " ".join([str(x).strip().upper() for x in row if x is not None])
+            row_text = row_text.replace("İ", "I").replace("Ş", "S").replace("Ç", "C").replace("Ö", "O").replace("Ü", "U").replace("Ğ", "G")
+            if "SORGULANAN" in row_text and "NO" in row_text: has_target_no = True
+            for key in self.BLOCK_MAP_KEYS:
+                if key in row_text: is_valid_format = True; break
+
+        if not has_target_no: raise Exception("Hatalı Format: 'Sorgulanan No' satırı bulunamadı.")
+        if not is_valid_format: raise Exception("Hatalı Format: Geçerli HTS başlıkları bulunamadı.")
+
+        current_table = None; state = "SEARCHING"; column_map = {}; batch_data = []
+        row_count = sheet.max_row or 50000
+
+        self.log(f"⏳ Veriler Okunuyor...\n{self.file_name}")
+        t_read = time.perf_counter()
+
+        for r_idx, row in enumerate(sheet.iter_rows(), start=1):
+            if self.stopped(): break
+
+            if r_idx % self.PROGRESS_EVERY == 0:
+                current_prog = int((r_idx / row_count) * 85)
+                self.progress(current_prog)
+                self.log(f"⏳ Okunuyor (%{current_prog})\nDosya: {self.file_name}\nSatır: {r_idx}")
+                self._yield(1)
+
+            if not row: continue
+
+            if target_gsm == "BILINMIYOR" and len(row) > 1:
+                col_a = str(row[0]).upper() if row[0] else ""
+                if "SORGULANAN" in col_a and "NO" in col_a:
+                     clean = re.sub(r'\D', '', str(row[1]))
+                     if clean: target_gsm = clean; self.gsm_detected(target_gsm)
+
+            if self.is_no_record_row(row):
+                if current_table: self._save_batch(current_table, batch_data, target_gsm); batch_data = []; current_table = None; state = "SEARCHING"
+                continue
+
+            tbl = self.classify_row(row)
+            if tbl:
+                if current_table: self._save_batch(current_table, batch_data, target_gsm); batch_data = []
+                if rol == "KARSI" and tbl == "hts_abone":
+                    current_table = None; state = "SEARCHING"
+                else:
+                    current_table = tbl; state = "WAITING_HEADER"
+                continue
+
+            if state == "WAITING_HEADER" and current_table:
+                column_map = {}; alias_map = HEADER_ALIASES.get(current_table, {})
+                for c_idx, cell in enumerate(row):
+                    if not cell: continue
+                    h_clean = _norm_header(str(cell))
+                    for ex_head, db_col in alias_map.items():
+                        if _norm_header(ex_head) == h_clean: column_map[c_idx] = db_col; break
+                if column_map: state = "READING_DATA"
+                continue
+
+            if state == "READING_DATA" and current_table:
+                sira_col = -1
+                for idx, name in column_map.items():
+                    if name == "SIRA_NO": sira_col = idx; break
+                val = row[sira_col] if (sira_col != -1 and sira_col < len(row)) else (row[0] if row else None)
+
+                if val and str(val).strip().isdigit():
+                    entry = {}
+                    for c_idx, db_col in column_map.items():
+                        if c_idx < len(row):
+                            raw_val = row[c_idx]; clean_val = self.clean_cell_data(raw_val)
+                            if db_col == "IMEI" and clean_val:
+                                digits_only = re.sub(r'\D', '', clean_val)
+                                if len(digits_only) < 13: clean_val = None
+                            entry[db_col] = clean_val
+                    if "BAZ" in entry and entry["BAZ"]:
+                        self._store_baz(str(entry["BAZ"]).strip())
+                    entry["GSMNo"] = target_gsm; batch_data.append(entry)
+
+                    if len(batch_data) >= self.BATCH_SIZE:
+                        self.log(f"💾 Veritabanına Yazılıyor...\n{self.file_name}")
+                        self._save_batch(current_table, batch_data, target_gsm)
+                        batch_data = []
+
+        if current_table and batch_data: self._save_batch(current_table, batch_data, target_gsm)
+        self.timings["read"] += time.perf_counter() - t_read
+
+        self.log(f"📊 İstatistikler ve Özetler Hesaplanıyor...\n{target_gsm}")
+        self.progress(86)
+
+        self.calculate_and_save_summary(target_gsm)
+        ReportRenderCache.invalidate_project(self.pid)
+        return target_gsm
+
+    def _store_baz(self, baz_raw: str):
+        """Koordinatlı baz metnini baz kütüphanesine ekler (Türkiye sınırları dışındaki / koordinatsız bazlar atlanır)."""
+        coords = re.findall(r"(\d{2}\.\d{4,})", baz_raw)
+        if len(coords) < 2:
+            return
+        try:
+            lat, lon = float(coords[-2]), float(coords[-1])
+
+            final_lat, final_lon = 0, 0
+            if 35 < lat < 43 and 25 < lon < 46:
+                final_lat, final_lon = lat, lon
+            elif 35 < lon < 43 and 25 < lat < 46:
+                final_lat, final_lon = lon, lat
+
+            if final_lat != 0:
+                cell_id = None
+
+                match_par = re.search(r'\((\d{4,})\)', baz_raw)
+                if match_par:
+                    cell_id = match_par.group(1)
+                else:
+                    nums = re.findall(r'\d+', baz_raw)
+                    candidates = [n for n in nums if n not in coords and len(n) > 3]
+                    if candidates:
+                        cell_id = candidates[0]
+                with self.db() as db_conn:
+                    db_conn.execute("""
+                        INSERT OR IGNORE INTO baz_kutuphanesi 
+                        (CellID, BazAdi, Lat, Lon, KaynakDosya) 
+                        VALUES (?, ?, ?, ?, ?)
+                    """, (cell_id, baz_raw, final_lat, final_lon, self.file_name))
+        except:
+            pass
+
+    def _save_batch(self, table, data, gsm):
+        if not data:
+            return
+
+        t0 = time.perf_counter()
+        cols = TABLE_COLUMNS[table]
+        vals = []
+
+        # Rol + DosyaAdi (kaynak xlsx) bilgisini ham kayıtlara yazacağız
+        rol = self.current_rol or "HEDEF"
+        dosya_adi = self.file_name or ""
+
+        # TIP -> TipKodu bir kez burada hesaplanır (analizler tamsayı karşılaştırır)
+        with_kod = table in TipKodu.TABLES
+        extra_cols = f", {TipKodu.COLUMN}" if with_kod else ""
+
+        for item in data:
+            row = [self.pid, gsm, rol, dosya_adi]
+            for c in cols:
+                row.append(item.get(c, None))
+            if with_kod:
+                row.append(TipKodu.classify(item.get("TIP"), table))
+            vals.append(row)
+
+        with Tracer.span("import.save_batch", table=table, rows=len(vals)), self.db() as conn:
+            last_id = HtsFullText.last_id(conn, table)
+            ph = ",".join(["?"] * (len(cols) + 4 + (1 if with_kod else 0)))
+            conn.executemany(
+                f"INSERT INTO {table} (ProjeID, GSMNo, Rol, DosyaAdi, {','.join(cols)}{extra_cols}) VALUES ({ph})",
+                vals
+            )
+            # yeni satırlar proje geneli arama indeksine (AUTOINCREMENT: id > önceki en büyük id)
+            HtsFullText.index_rows(conn, table, last_id)
+
+        self.row_counts[table] += len(vals)
+        self.timings["save"] += time.perf_counter() - t0
+
+    # ------------------------------------------------------------------
+    # özetler
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _parse_summary_date(text):
+        cln = str(text).strip()
+        fmt = "%d.%m.%Y %H:%M:%S" if "." in cln else "%d/%m/%Y %H:%M:%S"
+        if " " not in cln: fmt = fmt.split(" ")[0]
+        try:
+            return datetime.strptime(cln, fmt)
+        except ValueError:
+            pass
+        try:
+            return datetime.strptime(cln, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return None
+
+    @Tracer.traced("import.summary")
+    def calculate_and_save_summary(self, gsm):
+        t0 = time.perf_counter()
+        try:
+            with self.db() as conn:
+                cur = conn.cursor()
+                all_raw_dates = []
+
+                for t in self.SUMMARY_DATE_TABLES:
+                    try:
+                        res = cur.execute(f"SELECT TARIH FROM {t} WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm)).fetchall()
+                        all_raw_dates.extend([r[0] for r in res if r[0]])
+                    except:
+                        pass
+                    self._yield(5)
+
+                valid_dts = []
+                for idx, t_str in enumerate(all_raw_dates):
+                    if idx % 2000 == 0: self._yield(1)
+                    dt = self._parse_summary_date(t_str)
+                    if dt is not None: valid_dts.append(dt)
+
+                if valid_dts:
+                    min_str = min(valid_dts).strftime("%d.%m.%Y %H:%M:%S")
+                    max_str = max(valid_dts).strftime("%d.%m.%Y %H:%M:%S")
+                    cur.execute("INSERT OR REPLACE INTO hts_ozet (ProjeID, GSMNo, MinDate, MaxDate) VALUES (?, ?, ?, ?)", (self.pid, gsm, min_str, max_str))
+                else:
+                    cur.execute("INSERT OR REPLACE INTO hts_ozet (ProjeID, GSMNo, MinDate, MaxDate) VALUES (?, ?, ?, ?)", (self.pid, gsm, "", ""))
+
+                self.progress(90)
+                self._yield(10)
+                cur.execute("DELETE FROM hts_ozet_iletisim WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm))
+                cur.execute("DELETE FROM hts_rehber WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm))
+                all_contacts = cur.execute("""
+                    SELECT DIGER_NUMARA, COUNT(*), SUM(CAST(SURE as INTEGER)), MAX(DIGER_ISIM), MAX(DIGER_TC)
+                    FROM hts_gsm 
+                    WHERE ProjeID=? 
+                      AND GSMNo=? 
+                      AND DIGER_NUMARA != ? 
+                    GROUP BY DIGER_NUMARA 
+                    ORDER BY 2 DESC
+                """, (self.pid, gsm, gsm)).fetchall()
+
+                if all_contacts:
+                    d_full = [[self.pid, gsm, r[0], r[1], (r[2] if r[2] else 0), r[3], r[4]] for r in all_contacts]
+                    cur.executemany("""
+                        INSERT INTO hts_rehber (ProjeID, GSMNo, KarsiNo, Adet, Sure, Isim, TC) 
+                        VALUES (?,?,?,?,?,?,?)
+                    """, d_full)
+                    top_20_data = [[self.pid, gsm, r[0], r[1], (r[2] if r[2] else 0), r[3]] for r in all_contacts[:20]]
+                    cur.executemany("INSERT INTO hts_ozet_iletisim (ProjeID, GSMNo, KarsiNo, Adet, Sure, Isim) VALUES (?,?,?,?,?,?)", top_20_data)
+
+                self.progress(94)
+                self._yield(10)
+
+                cur.execute("DELETE FROM hts_ozet_imei WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm))
+                cur.execute("DELETE FROM hts_ozet_baz WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm))
+                cur.execute("DELETE FROM hts_tum_baz WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm))
+
+                baz_c = defaultdict(int)
+                imei_stats = defaultdict(lambda: {'count': 0, 'dates': []})
+
+                for t in ["hts_gsm", "hts_gprs", "hts_wap"]:
+                    try:
+                        rows = cur.execute(f"SELECT BAZ, IMEI, TARIH FROM {t} WHERE ProjeID=? AND GSMNo=?", (self.pid, gsm)).fetchall()
+                        for idx, r in enumerate(rows):
+                            if idx % 2000 == 0: self._yield(1)
+                            baz, imei, tarih = r
+
+                            if baz and str(baz).strip():
+                                baz_c[str(baz).strip()] += 1
+
+                            if imei and str(imei).strip():
+                                clean_imei = str(imei).strip()
+                                imei_stats[clean_imei]['count'] += 1
+                                if tarih: imei_stats[clean_imei]['dates'].append(tarih)
+                    except: pass
+
+                sb = sorted(baz_c.items(), key=lambda x:x[1], reverse=True)
+                if sb:
+                    all_baz_data = [[self.pid, gsm, k, v] for k,v in sb]
+                    cur.executemany("INSERT INTO hts_tum_baz (ProjeID, GSMNo, BazAdi, Sinyal) VALUES (?,?,?,?)", all_baz_data)
+                    cur.executemany("INSERT INTO hts_ozet_baz (ProjeID, GSMNo, BazAdi, Sinyal) VALUES (?,?,?,?)", all_baz_data[:20])
+
+                imei_data_to_save = []
+                for idx, (imei, info) in enumerate(imei_stats.items()):
+                    min_d_str = ""; max_d_str = ""
+                    if info['dates']:
+                        try:
+                            info['dates'].sort(key=lambda x: x.split()[0] if x else "")
+                            min_d_str = info['dates'][0]
+                            max_d_str = info['dates'][-1]
+                        except: pass
+
+                    imei_data_to_save.append([self.pid, gsm, imei, info['count'], min_d_str, max_d_str])
+
+                imei_data_to_save.sort(key=lambda x: x[3], reverse=True) # Adete göre sırala
+
+                if imei_data_to_save:
+                    cur.executemany("INSERT INTO hts_ozet_imei (ProjeID, GSMNo, IMEI, Adet, MinDate, MaxDate) VALUES (?,?,?,?,?,?)", imei_data_to_save)
+
+                self.progress(99)
+                conn.commit()
+
+        except Exception as e:
+            print(f"Özet Hesaplama Hatası: {e}")
+        self.timings["summary"] += time.perf_counter() - t0
+
+        if self.recalc_common:
+            self.recalculate_common_analysis()
+
+    def recalculate_common_analysis(self):
+        t0 = time.perf_counter()
+        try:
+            with self.db() as conn:
+                counts = CommonAnalysis.recalculate(conn, self.pid)
+            if counts is not None:
+                print(f"✅ Ortak Analiz tamamlandı. (IMEI: {counts['imei']}, İsim: {counts['isim']}, TC: {counts['tc']})")
+        except Exception as e:
+            print(f"❌ [recalculate_common_analysis] Kritik Hata: {e}")
+        self.timings["common"] += time.perf_counter() - t0
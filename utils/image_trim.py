@@ -0,0 +1,167 @@
+"""
+Delil görselleri (grafik / harita yakalamaları) için boşluk kırpma yardımcıları.
+
+QImage tamponu (pixmap.toImage()'ın verdiği ARGB32 / RGB32 dahil) NumPy ile kopyasız okunur; satır bazında arka plan rengine göre fark alınıp
+"boş satır" maskesi tek seferde hesaplanır. NumPy yoksa aynı kural ham bayt üzerinde
+(QColor üretmeden) saf Python ile uygulanır.
+"""
+import sys
+
+from PyQt6.QtGui import QImage, QPixmap
+
+try:
+    import numpy as np
+except Exception:  # numpy opsiyonel
+    np = None
+
+
+# 4 bayt/piksel biçimler doğrudan (kopyasız) okunur: biçim -> R, G, B bayt konumu.
+# ARGB32 / RGB32 bellekte yerel sıralı 0xAARRGGBB'dir (little-endian'da B, G, R, A).
+_ARGB_IDX = (2, 1, 0) if sys.byteorder == "little" else (1, 2, 3)
+_DIRECT_FORMATS = {
+    QImage.Format.Format_RGB32: _ARGB_IDX,
+    QImage.Format.Format_ARGB32: _ARGB_IDX,
+    QImage.Format.Format_ARGB32_Premultiplied: _ARGB_IDX,
+    QImage.Format.Format_RGBX8888: (0, 1, 2),
+    QImage.Format.Format_RGBA8888: (0, 1, 2),
+    QImage.Format.Format_RGBA8888_Premultiplied: (0, 1, 2),
+}
+
+
+def readable_image(img: QImage):
+    """
+    (görüntü, (r, g, b) bayt konumu). pixmap.toImage() biçimleri (RGB32 / ARGB32) olduğu gibi döner;
+    diğer biçimler bir kez ARGB32'ye çevrilir. Tampon okunurken DÖNEN görüntünün referansı tutulmalıdır.
+    Premultiplied biçimlerde saklanan değerler okunur (opak pikselde fark yok).
+    """
+    idx = _DIRECT_FORMATS.get(img.format())
+    if idx is None:
+        img = img.convertToFormat(QImage.Format.Format_ARGB32)
+        idx = _ARGB_IDX
+    return img, idx
+
+
+def pixel_view(img: QImage):
+    """
+    QImage -> (görüntü, (h, w, 4) uint8 NumPy görünümü, (r, g, b) kanal konumu).
+    Görünüm dönen görüntünün tamponunu kullanır (kopya yok); görüntü, görünüm kullanıldıkça tutulmalıdır
+    (biçim çevrildiyse bu, çağıranın görüntüsü değil yeni bir kopyadır).
+    """
+    if np is None:
+        raise RuntimeError("numpy yok")
+
+    img, idx = readable_image(img)
+    h, w, bpl = img.height(), img.width(), img.bytesPerLine()
+    ptr = img.constBits()
+    ptr.setsize(img.sizeInBytes())
+    buf = np.frombuffer(ptr, dtype=np.uint8).reshape(h, bpl)
+    return img, buf[:, : w * 4].reshape(h, w, 4), idx
+
+
+def _x_range(w: int, inset: int):
+    x0 = min(max(inset, 0), w - 1)
+    x1 = max(x0 + 1, w - inset)
+    step = max(1, (x1 - x0) // 260)
+    return x0, x1, step
+
+
+def empty_row_mask(img: QImage, bg_rgb, tol: int = 18, empty_ratio: float = 0.985, inset: int = 2):
+    """
+    Her satır için "boş mu" listesi/dizisi.
+    Satırda örneklenen piksellerin (her kanal |fark| <= tol) empty_ratio kadarı BG ise boştur.
+    inset: kenar çerçevesi x taramasına girmesin diye sol/sağdan içeri alınır.
+    """
+    img, (ri, gi, bi) = readable_image(img)
+    w, h = img.width(), img.height()
+    if w <= 0 or h <= 0:
+        return []
+
+    x0, x1, step = _x_range(w, inset)
+    max_diff_ratio = 1.0 - empty_ratio
+    br, bgc, bb = (int(v) for v in bg_rgb[:3])
+
+    if np is not None:
+        img, view, _ = pixel_view(img)
+        px = view[:, x0:x1:step, :][:, :, [ri, gi, bi]]
+        bg = np.array([br, bgc, bb], dtype=np.int16)
+        diff = (np.abs(px.astype(np.int16) - bg) > int(tol)).any(axis=2)
+        total = px.shape[1]
+        if total == 0:
+            return np.ones(h, dtype=bool)
+        return (diff.sum(axis=1) / total) <= max_diff_ratio
+
+    # NumPy yok: ham bayt üzerinde aynı kural
+    bpl = img.bytesPerLine()
+    data = img.constBits().asstring(img.sizeInBytes())
+    xs = range(x0 * 4, x1 * 4, step * 4)
+    total = len(xs)
+    out = []
+    for y in range(h):
+        if total == 0:
+            out.append(True)
+            continue
+        base = y * bpl
+        diff = 0
+        for off in xs:
+            i = base + off
+            if (abs(data[i + ri] - br) > tol or
+                    abs(data[i + gi] - bgc) > tol or
+                    abs(data[i + bi] - bb) > tol):
+                diff += 1
+        out.append((diff / total) <= max_diff_ratio)
+    return out
+
+
+def vertical_content_bounds(img: QImage, sample_xy=(6, 6), tol: int = 18,
+                            empty_ratio: float = 0.985, inset: int = 2):
+    """
+    İçeriğin dikey sınırları (top, bottom). BG rengi sample_xy pikselinden alınır.
+    Tamamı boşsa (h, h-1) döner (eski döngüyle aynı sonuç).
+    """
+    img, (ri, gi, bi) = readable_image(img)
+    w, h = img.width(), img.height()
+    if w <= 0 or h <= 0:
+        return 0, h - 1
+
+    # BG rengi tamponla aynı (saklanan) değerlerden okunur
+    sx = min(max(sample_xy[0], 0), w - 1)
+    sy = min(max(sample_xy[1], 0), h - 1)
+    ptr = img.constBits()
+    ptr.setsize(img.sizeInBytes())
+    off = sy * img.bytesPerLine() + sx * 4
+    px = bytes(ptr[off: off + 4])
+    mask = empty_row_mask(img, (px[ri], px[gi], px[bi]), tol, empty_ratio, inset)
+
+    if np is not None:
+        filled = np.flatnonzero(~np.asarray(mask, dtype=bool))
+        if filled.size == 0:
+            return h, h - 1
+        return int(filled[0]), int(filled[-1])
+
+    filled = [y for y, empty in enumerate(mask) if not empty]
+    if not filled:
+        return h, h - 1
+    return filled[0], filled[-1]
+
+
+def trim_pixmap_vertical(pixmap: QPixmap, sample_xy=(6, 6), tol: int = 18, pad: int = 6,
+                         empty_ratio: float = 0.985, inset: int = 2) -> QPixmap:
+    """Üst-alt boşluğu kırpar (pad kadar pay bırakır)."""
+    if pixmap.isNull():
+        return pixmap
+
+    img = pixmap.toImage()
+    w, h = img.width(), img.height()
+    if w <= 0 or h <= 0:
+        return pixmap
+
+    top, bottom = vertical_content_bounds(img, sample_xy, tol, empty_ratio, inset)
+
+    top = max(0, top - pad)
+    bottom = min(h - 1, bottom + pad)
+
+    new_h = bottom - top + 1
+    if new_h <= 0:
+        return pixmap
+
+    return pixmap.copy(0, top, w, new_h)
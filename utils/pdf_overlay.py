@@ -0,0 +1,341 @@
+import io
+import os
+import threading
+
+
+_LOGO_CACHE = {}
+_LOGO_CACHE_LOCK = threading.Lock()
+
+
+def prepare_logo_png(logo_path: str, opacity: float, blur_px: float = 0.0):
+    """
+    Logo -> gri tonlu, saydamlığı ayarlanmış (opsiyonel blur) PNG bytes.
+    (dosya yolu + mtime + parametreler) ile önbelleklenir; her PDF'te PIL blur tekrar edilmez.
+    """
+    if not logo_path or not os.path.exists(logo_path):
+        return None
+
+    try:
+        key = (os.path.abspath(logo_path), os.path.getmtime(logo_path), float(opacity), float(blur_px))
+    except Exception:
+        return None
+
+    with _LOGO_CACHE_LOCK:
+        if key in _LOGO_CACHE:
+            return _LOGO_CACHE[key]
+
+    try:
+        from PIL import Image, ImageFilter, ImageEnhance
+        im = Image.open(logo_path).convert("RGBA")
+        gray = im.convert("L")
+        im = Image.merge("RGBA", (gray, gray, gray, im.split()[-1]))
+        if blur_px and float(blur_px) > 0:
+            im = im.filter(ImageFilter.GaussianBlur(radius=float(blur_px)))
+        r, g, b, a = im.split()
+        a = ImageEnhance.Brightness(a).enhance(float(opacity))
+        im = Image.merge("RGBA", (r, g, b, a))
+
+        buf = io.BytesIO()
+        im.save(buf, "PNG")
+        data = buf.getvalue()
+    except Exception:
+        return None
+
+    with _LOGO_CACHE_LOCK:
+        _LOGO_CACHE[key] = data
+    return data
+
+
+class PdfOverlayStamper:
+    """
+    Chromium çıktısı PDF'e kapak watermark / damga / çerçeve / footer basar.
+
+    - Sabit parçalar (watermark veya damga + çerçeve) sayfa boyutu başına BİR kez çizilir ve
+      Form XObject olarak eklenir; sayfalar sadece "/HtsOv Do" ile referans verir
+      (logo görseli PDF'e bir kez gömülür).
+    - Footer (sayfa no + sağ metin) tek bir reportlab dokümanında tüm sayfalar için üretilir
+      (font bir kez gömülür), yine Form XObject olarak basılır.
+    - Kaynak sayfanın içerik akışı parse edilmez (merge_page yok) -> sayfa sayısıyla doğrusal.
+    - pypdf yoksa / XObject yolu başarısız olursa önbellekli overlay sayfalarıyla merge_page'e düşer.
+    """
+
+    def __init__(
+        self,
+        inset_pt: float,
+        footer_font_name: str = "Helvetica",
+        footer_font_size: int = 10,
+        footer_right_text: str = "",
+        draw_frame: bool = True,
+        frame_radius_pt: float = 8.0,
+        frame_stroke_rgb=(0.90, 0.90, 0.90),
+        frame_line_width: float = 1.3,
+        wm_image=None,
+        wm_size_pt: float = 0.0,
+        stamp_image=None,
+        stamp_size_pt: float = 0.0,
+        stamp_pad_pt: float = 0.0,
+    ):
+        self.inset_pt = float(inset_pt)
+        self.footer_font_name = footer_font_name
+        self.footer_font_size = int(footer_font_size)
+        self.footer_right_text = str(footer_right_text or "")
+        self.draw_frame = bool(draw_frame)
+        self.frame_radius_pt = float(frame_radius_pt)
+        self.frame_stroke_rgb = frame_stroke_rgb
+        self.frame_line_width = float(frame_line_width)
+        # görseller: dosya yolu veya PNG bytes (prepare_logo_png)
+        self.wm_image = wm_image
+        self.wm_size_pt = float(wm_size_pt)
+        self.stamp_image = stamp_image
+        self.stamp_size_pt = float(stamp_size_pt)
+        self.stamp_pad_pt = float(stamp_pad_pt)
+
+        self._img_readers = {}
+        self._static_cache = {}
+
+    # ------------------------------------------------------------------
+    # overlay üretimi
+    # ------------------------------------------------------------------
+    def _image_reader(self, img):
+        from reportlab.lib.utils import ImageReader
+        key = id(img)
+        r = self._img_readers.get(key)
+        if r is None:
+            r = ImageReader(io.BytesIO(img) if isinstance(img, (bytes, bytearray)) else img)
+            self._img_readers[key] = r
+        return r
+
+    def _static_overlay_page(self, w: float, h: float, cover: bool):
+        """(boyut, kapak mı) başına tek overlay sayfası: watermark|damga + çerçeve. Boşsa None."""
+        key = (round(w, 2), round(h, 2), bool(cover))
+        if key in self._static_cache:
+            return self._static_cache[key]
+
+        from reportlab.pdfgen import canvas
+        try:
+            from pypdf import PdfReader
+        except Exception:
+            from PyPDF2 import PdfReader
+
+        inset = self.inset_pt
+        drew = False
+
+        packet = io.BytesIO()
+        c = canvas.Canvas(packet, pagesize=(w, h))
+
+        if cover and self.wm_image:
+            x = (w - self.wm_size_pt) / 2.0
+            y = (h - self.wm_size_pt) / 2.0
+            c.drawImage(
+                self._image_reader(self.wm_image),
+                x, y,
+                width=self.wm_size_pt, height=self.wm_size_pt,
+                preserveAspectRatio=True,
+                mask="auto",
+            )
+            drew = True
+
+        if (not cover) and self.stamp_image:
+            x = inset + self.stamp_pad_pt
+            y = h - inset - self.stamp_pad_pt - self.stamp_size_pt
+            c.drawImage(
+                self._image_reader(self.stamp_image),
+                x, y,
+                width=self.stamp_size_pt, height=self.stamp_size_pt,
+                preserveAspectRatio=True,
+                mask="auto",
+            )
+            drew = True
+
+        if self.draw_frame:
+            c.setLineWidth(self.frame_line_width)
+            rr, gg, bb = self.frame_stroke_rgb
+            c.setStrokeColorRGB(float(rr), float(gg), float(bb))
+            c.roundRect(
+                inset, inset,
+                w - 2 * inset, h - 2 * inset,
+                self.frame_radius_pt,
+                stroke=1, fill=0
+            )
+            drew = True
+
+        c.showPage()
+        c.save()
+
+        page = None
+        if drew:
+            packet.seek(0)
+            page = PdfReader(packet).pages[0]
+
+        self._static_cache[key] = page
+        return page
+
+    def _footer_reader(self, sizes):
+        """Tüm sayfaların footer'ı tek dokümanda (font bir kez gömülür)."""
+        from reportlab.pdfgen import canvas
+        try:
+            from pypdf import PdfReader
+        except Exception:
+            from PyPDF2 import PdfReader
+
+        footer_y = self.inset_pt * 0.55
+        packet = io.BytesIO()
+        c = canvas.Canvas(packet, pagesize=sizes[0] if sizes else (595.0, 842.0))
+
+        for i, (w, h) in enumerate(sizes):
+            c.setPageSize((w, h))
+            c.setFont(self.footer_font_name, self.footer_font_size)
+            c.setFillColorRGB(0.60, 0.63, 0.66)
+            c.drawCentredString(w / 2.0, footer_y, str(i + 1))
+            if self.footer_right_text:
+                c.drawRightString(w - self.inset_pt, footer_y, self.footer_right_text)
+            c.showPage()
+
+        c.save()
+        packet.seek(0)
+        return PdfReader(packet)
+
+    # ------------------------------------------------------------------
+    # Form XObject yardımcıları (pypdf)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _form_xobject(writer, ov_page):
+        from pypdf.generic import NameObject, ArrayObject, FloatObject, DecodedStreamObject, DictionaryObject
+
+        contents = ov_page.get_contents()
+        data = contents.get_data() if contents is not None else b""
+
+        res = ov_page.get("/Resources")
+        res = res.get_object().clone(writer) if res is not None else DictionaryObject()
+
+        form = DecodedStreamObject()
+        form.set_data(data)
+        form.update({
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Form"),
+            NameObject("/BBox"): ArrayObject([FloatObject(float(v)) for v in ov_page.mediabox]),
+            NameObject("/Resources"): res,
+        })
+        return writer._add_object(form)
+
+    @staticmethod
+    def _stream_ref(writer, data: bytes):
+        from pypdf.generic import DecodedStreamObject
+        s = DecodedStreamObject()
+        s.set_data(data)
+        return writer._add_object(s)
+
+    @staticmethod
+    def _draw_forms(writer, wpage, forms, q_ref):
+        """
+        forms: [(ad, form_ref), ...]
+        Sayfa içeriği: [q] + orijinal + [Q + "/Ad Do" ...]  (orijinal grafik durumu sızmasın)
+        """
+        from pypdf.generic import NameObject, ArrayObject, DictionaryObject
+
+        res = wpage.get("/Resources")
+        if res is None:
+            res = DictionaryObject()
+            wpage[NameObject("/Resources")] = res
+        res = res.get_object()
+
+        xo = res.get("/XObject")
+        if xo is None:
+            xo = DictionaryObject()
+            res[NameObject("/XObject")] = xo
+        xo = xo.get_object()
+
+        ops = [b"Q"]
+        for name, ref in forms:
+            xo[NameObject(name)] = ref
+            ops.append(b"q " + name.encode("ascii") + b" Do Q")
+        tail_ref = PdfOverlayStamper._stream_ref(writer, b"\n".join(ops) + b"\n")
+
+        cur = wpage.get("/Contents")
+        parts = ArrayObject([q_ref])
+        if cur is not None:
+            cur_obj = cur.get_object()
+            if isinstance(cur_obj, ArrayObject):
+                parts.extend(cur_obj)
+            else:
+                parts.append(cur)
+        parts.append(tail_ref)
+        wpage[NameObject("/Contents")] = parts
+
+    # ------------------------------------------------------------------
+    def stamp(self, src_path: str, dst_path: str, progress_cb=None):
+        """src_path PDF'ine overlay basıp dst_path'e yazar. progress_cb(0..1)."""
+        try:
+            self._stamp_xobject(src_path, dst_path, progress_cb)
+        except Exception as e:
+            print(f"⚠️ [PdfOverlayStamper] XObject yolu başarısız, merge_page ile devam: {e}")
+            self._stamp_merge(src_path, dst_path, progress_cb)
+
+    def _stamp_xobject(self, src_path, dst_path, progress_cb):
+        from pypdf import PdfReader, PdfWriter
+
+        reader = PdfReader(src_path)
+        writer = PdfWriter()
+
+        sizes = [(float(p.mediabox.width), float(p.mediabox.height)) for p in reader.pages]
+        total = len(sizes)
+        footers = self._footer_reader(sizes)
+
+        q_ref = self._stream_ref(writer, b"q\n")
+        form_cache = {}
+
+        for i, page in enumerate(reader.pages):
+            w, h = sizes[i]
+            wpage = writer.add_page(page)
+
+            forms = []
+            ov = self._static_overlay_page(w, h, cover=(i == 0))
+            if ov is not None:
+                key = id(ov)
+                if key not in form_cache:
+                    form_cache[key] = self._form_xobject(writer, ov)
+                forms.append(("/HtsOv" + ("C" if i == 0 else "B"), form_cache[key]))
+
+            forms.append(("/HtsFt", self._form_xobject(writer, footers.pages[i])))
+            self._draw_forms(writer, wpage, forms, q_ref)
+
+            if callable(progress_cb) and total:
+                progress_cb((i + 1) / total)
+
+        with open(dst_path, "wb") as f:
+            writer.write(f)
+
+    def _stamp_merge(self, src_path, dst_path, progress_cb):
+        try:
+            from pypdf import PdfReader, PdfWriter
+            has_over = True
+        except Exception:
+            from PyPDF2 import PdfReader, PdfWriter
+            has_over = False
+
+        def _merge(page, ov):
+            if has_over:
+                page.merge_page(ov, over=True)
+            else:
+                page.merge_page(ov)
+
+        reader = PdfReader(src_path)
+        writer = PdfWriter()
+
+        sizes = [(float(p.mediabox.width), float(p.mediabox.height)) for p in reader.pages]
+        total = len(sizes)
+        footers = self._footer_reader(sizes)
+
+        for i, page in enumerate(reader.pages):
+            w, h = sizes[i]
+            ov = self._static_overlay_page(w, h, cover=(i == 0))
+            if ov is not None:
+                _merge(page, ov)
+            _merge(page, footers.pages[i])
+            writer.add_page(page)
+
+            if callable(progress_cb) and total:
+                progress_cb((i + 1) / total)
+
+        with open(dst_path, "wb") as f:
+            writer.write(f)
@@ -0,0 +1,318 @@
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+
+
+class RenderServiceUnavailable(RuntimeError):
+    """Render servisi başlatılamadı / bağlantı koptu (çağıran taraf in-process render'a düşebilir)."""
+
+
+def _service_main(conn, browsers_path=None, idle_close_seconds=900):
+    """
+    Ayrı process'te çalışan Chromium render döngüsü.
+    Playwright + Chromium bir kez açılır, istekler arasında sıcak tutulur.
+    Uzun süre istek gelmezse tarayıcı kapatılır (process ayakta kalır, ilk istekte yeniden açılır).
+
+    İstek : {"op": "pdf", "id": n, "url": file_url, "pdf_path": ..., "pdf_options": {...}}
+            {"op": "warm"} / {"op": "quit"}
+    Cevap : {"id": n, "type": "progress", "pct": 0-100, "msg": "..."}
+            {"id": n, "type": "done"} / {"id": n, "type": "error", "error": "..."}
+    """
+    if browsers_path:
+        os.environ["PLAYWRIGHT_BROWSERS_PATH"] = browsers_path
+
+    state = {"pw": None, "browser": None}
+
+    def _close_browser():
+        try:
+            if state["browser"] is not None:
+                state["browser"].close()
+        except Exception:
+            pass
+        state["browser"] = None
+
+    def _ensure_browser():
+        b = state["browser"]
+        if b is not None:
+            try:
+                if b.is_connected():
+                    return b
+            except Exception:
+                pass
+            state["browser"] = None
+
+        if state["pw"] is None:
+            try:
+                from playwright.sync_api import sync_playwright
+            except Exception as e:
+                raise RuntimeError(
+                    "Chromium PDF motoru için Playwright gerekli.\n"
+                    "Kurulum:\n"
+                    "  pip install playwright\n"
+                    "  playwright install chromium\n\n"
+                    f"Detay: {e}"
+                )
+            state["pw"] = sync_playwright().start()
+
+        state["browser"] = state["pw"].chromium.launch()
+        return state["browser"]
+
+    def _send(msg):
+        try:
+            conn.send(msg)
+        except Exception:
+            pass
+
+    try:
+        while True:
+            try:
+                has_req = conn.poll(float(idle_close_seconds))
+            except (EOFError, OSError):
+                break
+
+            if not has_req:
+                # boşta: tarayıcıyı kapat, belleği bırak
+                _close_browser()
+                continue
+
+            try:
+                req = conn.recv()
+            except (EOFError, OSError):
+                break
+
+            if not isinstance(req, dict):
+                continue
+
+            op = req.get("op")
+            rid = req.get("id")
+
+            if op == "quit":
+                break
+
+            if op == "warm":
+                try:
+                    _ensure_browser()
+                except Exception:
+                    pass
+                continue
+
+            if op != "pdf":
+                _send({"id": rid, "type": "error", "error": f"Bilinmeyen işlem: {op}"})
+                continue
+
+            try:
+                _send({"id": rid, "type": "progress", "pct": 5, "msg": "PDF oluşturuluyor... (Chromium hazırlanıyor)"})
+                browser = _ensure_browser()
+
+                page = browser.new_page()
+                try:
+                    _send({"id": rid, "type": "progress", "pct": 25, "msg": "PDF oluşturuluyor... (sayfa yükleniyor)"})
+                    page.goto(req["url"], wait_until="networkidle")
+
+                    _send({"id": rid, "type": "progress", "pct": 50, "msg": "PDF oluşturuluyor... (Chromium render)"})
+                    page.pdf(path=req["pdf_path"], **(req.get("pdf_options") or {}))
+                finally:
+                    try:
+                        page.close()
+                    except Exception:
+                        pass
+
+                _send({"id": rid, "type": "progress", "pct": 100, "msg": "Chromium render tamamlandı."})
+                _send({"id": rid, "type": "done"})
+
+            except Exception as e:
+                # tarayıcı çöktüyse bir sonraki istekte yeniden açılsın
+                try:
+                    if state["browser"] is not None and not state["browser"].is_connected():
+                        state["browser"] = None
+                except Exception:
+                    state["browser"] = None
+                _send({"id": rid, "type": "error", "error": str(e)})
+    finally:
+        _close_browser()
+        try:
+            if state["pw"] is not None:
+                state["pw"].stop()
+        except Exception:
+            pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+class ChromiumRenderService:
+    """
+    Uzun ömürlü (sıcak) Chromium render servisi.
+    - İlk kullanımda ayrı bir process başlatılır (lazy), tarayıcı açık tutulur.
+    - HTML dosya yolu + sayfa seçenekleri local pipe ile gönderilir, ilerleme geri akar.
+    - Bekleme sırasında idle_cb çağrılır (GUI donmasın diye processEvents verilebilir).
+    """
+
+    IDLE_CLOSE_SECONDS = 15 * 60
+    POLL_SECONDS = 0.05
+
+    _lock = threading.Lock()
+    _proc = None
+    _conn = None
+    _req_seq = 0
+    _atexit_registered = False
+
+    @staticmethod
+    def _is_alive() -> bool:
+        p = ChromiumRenderService._proc
+        try:
+            return p is not None and p.is_alive() and ChromiumRenderService._conn is not None
+        except Exception:
+            return False
+
+    @staticmethod
+    def _ensure_process():
+        cls = ChromiumRenderService
+        if cls._is_alive():
+            return
+
+        cls._kill()
+        try:
+            ctx = multiprocessing.get_context("spawn")
+            parent_conn, child_conn = ctx.Pipe(duplex=True)
+            proc = ctx.Process(
+                target=_service_main,
+                args=(child_conn, os.environ.get("PLAYWRIGHT_BROWSERS_PATH"), cls.IDLE_CLOSE_SECONDS),
+                name="HTSMercekRenderService",
+                daemon=True,
+            )
+            proc.start()
+            child_conn.close()
+        except Exception as e:
+            raise RenderServiceUnavailable(f"Render servisi başlatılamadı: {e}")
+
+        cls._proc = proc
+        cls._conn = parent_conn
+
+        if not cls._atexit_registered:
+            atexit.register(ChromiumRenderService.shutdown)
+            cls._atexit_registered = True
+
+    @staticmethod
+    def _kill():
+        cls = ChromiumRenderService
+        conn, proc = cls._conn, cls._proc
+        cls._conn = None
+        cls._proc = None
+        try:
+            if conn is not None:
+                conn.close()
+        except Exception:
+            pass
+        try:
+            if proc is not None and proc.is_alive():
+                proc.terminate()
+                proc.join(2)
+        except Exception:
+            pass
+
+    @staticmethod
+    def warm_up():
+        """Servisi arka planda başlatır ve tarayıcıyı açtırır (bloklamaz, cevap beklemez)."""
+        cls = ChromiumRenderService
+        if not cls._lock.acquire(blocking=False):
+            return
+        try:
+            cls._ensure_process()
+            cls._conn.send({"op": "warm"})
+        except Exception as e:
+            print(f"⚠️ [ChromiumRenderService.warm_up] {e}")
+        finally:
+            cls._lock.release()
+
+    @staticmethod
+    def render_pdf(html_path: str, pdf_path: str, pdf_options: dict,
+                   progress_cb=None, idle_cb=None, timeout_s: float = 600.0):
+        """
+        html_path'teki raporu Chromium ile pdf_path'e basar.
+        progress_cb(pct:int, msg:str) -> render aşaması ilerlemesi (0-100)
+        Servis ayağa kalkmazsa / bağlantı koparsa RenderServiceUnavailable fırlatır.
+        """
+        cls = ChromiumRenderService
+        if not cls._lock.acquire(blocking=False):
+            raise RuntimeError("PDF motoru şu anda başka bir çıktı üretiyor. Lütfen bekleyin.")
+
+        try:
+            file_url = "file:///" + os.path.abspath(html_path).replace("\\", "/")
+            last_err = None
+
+            # bağlantı koptuysa (process ölmüş vb.) bir kez yeniden başlatıp dene
+            for _attempt in range(2):
+                try:
+                    cls._ensure_process()
+                    cls._req_seq += 1
+                    rid = cls._req_seq
+                    cls._conn.send({
+                        "op": "pdf",
+                        "id": rid,
+                        "url": file_url,
+                        "pdf_path": pdf_path,
+                        "pdf_options": dict(pdf_options or {}),
+                    })
+                    cls._wait(rid, progress_cb, idle_cb, timeout_s)
+                    return
+                except (EOFError, BrokenPipeError, ConnectionError, OSError) as e:
+                    last_err = e
+                    cls._kill()
+
+            raise RenderServiceUnavailable(f"Render servisi bağlantısı koptu: {last_err}")
+        finally:
+            cls._lock.release()
+
+    @staticmethod
+    def _wait(rid, progress_cb, idle_cb, timeout_s):
+        cls = ChromiumRenderService
+        deadline = time.monotonic() + float(timeout_s)
+
+        while True:
+            if cls._conn.poll(cls.POLL_SECONDS):
+                msg = cls._conn.recv()
+                # önceki (zaman aşımına uğramış) isteklerden kalan mesajları yut
+                if not isinstance(msg, dict) or msg.get("id") != rid:
+                    continue
+
+                t = msg.get("type")
+                if t == "progress":
+                    if callable(progress_cb):
+                        try:
+                            progress_cb(int(msg.get("pct", 0)), str(msg.get("msg", "")))
+                        except Exception:
+                            pass
+                elif t == "done":
+                    return
+                elif t == "error":
+                    raise RuntimeError(msg.get("error") or "Chromium render hatası")
+                continue
+
+            if not (cls._proc and cls._proc.is_alive()):
+                raise EOFError("render process sonlandı")
+
+            if time.monotonic() > deadline:
+                cls._kill()
+                raise RuntimeError("Chromium render zaman aşımına uğradı.")
+
+            if callable(idle_cb):
+                try:
+                    idle_cb()
+                except Exception:
+                    pass
+
+    @staticmethod
+    def shutdown():
+        cls = ChromiumRenderService
+        try:
+            if cls._conn is not None:
+                cls._conn.send({"op": "quit"})
+            if cls._proc is not None:
+                cls._proc.join(3)
+        except Exception:
+            pass
+        cls._kill()
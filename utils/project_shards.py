@@ -0,0 +1,337 @@
+import os
+import threading
+
+from security.security import LicenseManager
+from utils.app_settings import AppSettings
+from utils.hts_fts import HtsFullText
+
+
+class ProjectShards:
+    """
+    Proje başına ayrı (SQLCipher) veri dosyası.
+
+    Yerleşim "sharded" iken ham HTS tabloları ana DB'de bulunmaz; açık projenin dosyası
+    "proj" adıyla ATTACH edilir. SQLite nitelendirilmemiş tablo adlarını ana DB'de bulamayınca
+    eklenen DB'de aradığı için mevcut sorgular (SELECT/INSERT/DELETE/ALTER) değişmeden shard'a gider.
+
+    - Ana DB: proje kataloğu, rapor tabloları, özet tabloları, baz_kutuphanesi.
+    - Proje silme = dosya silme; yedek / vacuum / önbellek projenin boyutuyla ölçeklenir.
+    - KEY verilmeden ATTACH edilen DB, SQLCipher'da ana DB ile aynı anahtarı kullanır.
+    - Hiçbir proje açık değilken boş bir bellek içi DB eklenir (sorgular "no such table" vermesin).
+
+    Tüm çağrılar DB kilidi altında (with DB() as conn) yapılmalıdır.
+    """
+
+    ALIAS = "proj"
+    LAYOUT_KEY = "db_layout"
+    LAYOUT_SINGLE = "single"
+    LAYOUT_SHARDED = "sharded"
+
+    _active = None          # ATTACH edilmiş proje id (None = boş bellek DB'si / hiçbiri)
+    _attached = False
+    _pins = {}              # {pid: sayaç} import sürerken başka projeye geçilmesin
+    _pin_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def enabled() -> bool:
+        return AppSettings.get(ProjectShards.LAYOUT_KEY, ProjectShards.LAYOUT_SINGLE) == ProjectShards.LAYOUT_SHARDED
+
+    @staticmethod
+    def set_enabled(flag: bool):
+        AppSettings.set(
+            ProjectShards.LAYOUT_KEY,
+            ProjectShards.LAYOUT_SHARDED if flag else ProjectShards.LAYOUT_SINGLE
+        )
+
+    @staticmethod
+    def shard_dir() -> str:
+        d = os.path.join(LicenseManager.appdata_dir(), "projects")
+        os.makedirs(d, exist_ok=True)
+        return d
+
+    @staticmethod
+    def shard_path(pid) -> str:
+        return os.path.join(ProjectShards.shard_dir(), f"proje_{int(pid)}.db")
+
+    @staticmethod
+    def active_project():
+        return ProjectShards._active
+
+    # ------------------------------------------------------------------
+    # pin (import sırasında shard değişmesin)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def pin(pid):
+        with ProjectShards._pin_lock:
+            k = int(pid)
+            ProjectShards._pins[k] = ProjectShards._pins.get(k, 0) + 1
+
+    @staticmethod
+    def unpin(pid):
+        with ProjectShards._pin_lock:
+            k = int(pid)
+            n = ProjectShards._pins.get(k, 0) - 1
+            if n > 0:
+                ProjectShards._pins[k] = n
+            else:
+                ProjectShards._pins.pop(k, None)
+
+    @staticmethod
+    def _pinned_other(pid) -> bool:
+        with ProjectShards._pin_lock:
+            return any(k != pid and n > 0 for k, n in ProjectShards._pins.items())
+
+    # ------------------------------------------------------------------
+    # attach / detach
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _is_attached(conn) -> bool:
+        try:
+            return any(r[1] == ProjectShards.ALIAS for r in conn.execute("PRAGMA database_list").fetchall())
+        except Exception:
+            return False
+
+    @staticmethod
+    def detach(conn):
+        cls = ProjectShards
+        if cls._is_attached(conn):
+            try:
+                conn.commit()
+            except Exception:
+                pass
+            conn.execute(f"DETACH DATABASE {cls.ALIAS}")
+        cls._attached = False
+        cls._active = None
+
+    @staticmethod
+    def attach(conn, pid, schema_fn, force: bool = False):
+        """
+        pid projesinin dosyasını ATTACH eder (gerekirse oluşturur) ve schema_fn(conn, "proj") ile tabloları hazırlar.
+        pid None ise boş bellek DB'si eklenir. Yerleşim tek dosya ise hiçbir şey yapmaz.
+        """
+        cls = ProjectShards
+        if not cls.enabled():
+            return False
+
+        pid = int(pid) if pid else None
+        if (not force) and cls._attached and cls._active == pid and cls._is_attached(conn):
+            return True
+
+        if pid is not None and cls._pinned_other(pid):
+            raise RuntimeError("Başka bir projeye veri yükleniyor. Yükleme bitmeden proje değiştirilemez.")
+
+        cls.detach(conn)
+
+        target = cls.shard_path(pid) if pid is not None else ":memory:"
+        is_new = (pid is None) or (not os.path.exists(target))
+
+        conn.execute(f"ATTACH DATABASE ? AS {cls.ALIAS}", (target,))
+        cur = conn.cursor()
+        if is_new:
+            # yeni dosyada tablo oluşmadan önce verilmeli
+            cur.execute(f"PRAGMA {cls.ALIAS}.auto_vacuum=INCREMENTAL;")
+        if pid is not None:
+            cur.execute(f"PRAGMA {cls.ALIAS}.journal_mode=WAL;")
+            cur.execute(f"PRAGMA {cls.ALIAS}.synchronous=NORMAL;")
+
+        schema_fn(conn, cls.ALIAS)
+        conn.commit()
+
+        cls._attached = True
+        cls._active = pid
+        if pid is not None:
+            print(f"✅ [ProjectShards] Proje {pid} veri dosyası bağlandı.")
+        return True
+
+    @staticmethod
+    def delete_shard(conn, pid, schema_fn):
+        """Projenin veri dosyasını siler (açıksa önce boş DB'ye geçilir)."""
+        cls = ProjectShards
+        pid = int(pid)
+        if cls._active == pid:
+            cls.attach(conn, None, schema_fn, force=True)
+
+        base = cls.shard_path(pid)
+        for p in (base, base + "-wal", base + "-shm"):
+            try:
+                if os.path.exists(p):
+                    os.remove(p)
+            except Exception as e:
+                print(f"⚠️ [ProjectShards.delete_shard] {p}: {e}")
+
+    # ------------------------------------------------------------------
+    # yerleşim dönüştürme
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _common_columns(conn, src_schema, dst_schema, table):
+        src = [r[1] for r in conn.execute(f"PRAGMA {src_schema}.table_info({table})").fetchall()]
+        dst = {r[1] for r in conn.execute(f"PRAGMA {dst_schema}.table_info({table})").fetchall()}
+        return [c for c in src if c in dst and c != "id"]
+
+    @staticmethod
+    def _copy(conn, src_schema, dst_schema, table, pid=None):
+        cols = ProjectShards._common_columns(conn, src_schema, dst_schema, table)
+        if not cols:
+            return 0
+        col_sql = ", ".join(f"[{c}]" for c in cols)
+        where = " WHERE ProjeID=?" if pid is not None else ""
+        params = (int(pid),) if pid is not None else ()
+        last_id = HtsFullText.last_id(conn, table, dst_schema)
+        cur = conn.execute(
+            f"INSERT INTO {dst_schema}.{table} ({col_sql}) SELECT {col_sql} FROM {src_schema}.{table}{where}",
+            params
+        )
+        # kopyalanan satırlar yeni id aldı -> hedefin arama indeksine eklenir
+        HtsFullText.index_rows(conn, table, last_id, dst_schema)
+        return cur.rowcount or 0
+
+    @staticmethod
+    def _table_exists(conn, schema, table) -> bool:
+        return conn.execute(
+            f"SELECT 1 FROM {schema}.sqlite_master WHERE type='table' AND name=?", (table,)
+        ).fetchone() is not None
+
+    @staticmethod
+    def _verify_counts(conn, pid, raw_tables, note: str = ""):
+        """Ana DB'deki (ProjeID=pid) satır sayıları ekli proje dosyasındakiyle aynı mı (değilse RuntimeError)."""
+        cls = ProjectShards
+        for t in raw_tables:
+            n_shard = n_main = 0
+            if cls._table_exists(conn, cls.ALIAS, t):
+                n_shard = conn.execute(f"SELECT COUNT(*) FROM {cls.ALIAS}.{t}").fetchone()[0]
+            if cls._table_exists(conn, "main", t):
+                n_main = conn.execute(f"SELECT COUNT(*) FROM main.{t} WHERE ProjeID=?", (int(pid),)).fetchone()[0]
+            if n_shard != n_main:
+                raise RuntimeError(
+                    f"Proje {pid} / {t}: satır sayısı uyuşmuyor (dosya {n_shard}, ana DB {n_main}). {note}".strip()
+                )
+
+    @staticmethod
+    def _verify_no_orphans(conn, pids, raw_tables, note: str = ""):
+        """main.<ham tablo> içinde pids dışında (kataloğu olmayan) proje satırı var mı (varsa RuntimeError)."""
+        cls = ProjectShards
+        ph = ",".join("?" * len(pids)) or "NULL"
+        for t in raw_tables:
+            if not cls._table_exists(conn, "main", t):
+                continue
+            n = conn.execute(
+                f"SELECT COUNT(*) FROM main.{t} WHERE ProjeID IS NULL OR ProjeID NOT IN ({ph})", tuple(pids)
+            ).fetchone()[0]
+            if n:
+                raise RuntimeError(f"{t}: projesi olmayan {n} satır var, proje dosyasına taşınamaz. {note}".strip())
+
+    @staticmethod
+    def convert(mgr, to_sharded: bool, project_ids, raw_tables, schema_fn, progress_cb=None):
+        """
+        Tek dosya <-> proje dosyaları dönüşümü. Her (proje, tablo) adımı ayrı kilit/commit ile yürür.
+        to_sharded=True : main.<ham tablo> -> proje_<id>.db, sonra ana DB'deki ham tablolar DROP edilir
+        to_sharded=False: proje dosyaları -> main (ham tablolar yeniden oluşturulur), dosyalar silinir
+        progress_cb(done, total)
+        """
+        cls = ProjectShards
+        pids = [int(p) for p in project_ids]
+        total = max(1, len(pids) * len(raw_tables))
+        done = 0
+
+        if to_sharded:
+            # ayar önce yazılır ki attach shard'ı gerçekten bağlasın; hata olursa geri alınır
+            cls.set_enabled(True)
+            try:
+                for pid in pids:
+                    with mgr.lock():
+                        conn = mgr.get_connection()
+                        cls.attach(conn, pid, schema_fn, force=True)
+                        # yarım kalmış önceki denemeden satır kalmışsa temizle
+                        for t in raw_tables:
+                            conn.execute(f"DELETE FROM {cls.ALIAS}.{t}")
+                        conn.commit()
+
+                    for t in raw_tables:
+                        with mgr.lock():
+                            conn = mgr.get_connection()
+                            cls._copy(conn, "main", cls.ALIAS, t, pid)
+                            conn.commit()
+                        done += 1
+                        if callable(progress_cb):
+                            progress_cb(done, total)
+
+                # DROP öncesi tek kilit altında doğrulama: kilit bırakılan adımlar arasında main'e yazılan
+                # ya da kataloğu olmayan satır varsa ham tablolar silinmez (hata -> yerleşim geri alınır)
+                note = "Ana DB'deki veriler silinmedi."
+                with mgr.lock():
+                    conn = mgr.get_connection()
+                    cls._verify_no_orphans(conn, pids, raw_tables, note)
+                    for pid in pids:
+                        cls.attach(conn, pid, schema_fn, force=True)
+                        cls._verify_counts(conn, pid, raw_tables, note)
+                    cls.attach(conn, None, schema_fn, force=True)
+                    for t in raw_tables:
+                        conn.execute(f"DROP TABLE IF EXISTS main.{t}")
+                    HtsFullText.drop(conn, "main")
+                    conn.commit()
+            except Exception:
+                cls.set_enabled(False)
+                with mgr.lock():
+                    cls.detach(mgr.get_connection())
+                raise
+            return True
+
+        # proje dosyaları -> tek dosya
+        # Bir kopya veya sayım doğrulaması başarısız olursa yerleşim "sharded" kalır, ana DB'ye kopyalanan
+        # ham tablolar geri alınır ve hiçbir proje dosyası silinmez (hata çağırana yükselir).
+        with mgr.lock():
+            conn = mgr.get_connection()
+            cls.detach(conn)
+            schema_fn(conn, "main")
+            conn.commit()
+
+        try:
+            for pid in pids:
+                path = cls.shard_path(pid)
+                if not os.path.exists(path):
+                    done += len(raw_tables)
+                    continue
+
+                with mgr.lock():
+                    conn = mgr.get_connection()
+                    conn.execute(f"ATTACH DATABASE ? AS {cls.ALIAS}", (path,))
+                try:
+                    for t in raw_tables:
+                        with mgr.lock():
+                            conn = mgr.get_connection()
+                            try:
+                                cls._copy(conn, cls.ALIAS, "main", t)
+                                conn.commit()
+                            except Exception as e:
+                                conn.rollback()
+                                raise RuntimeError(f"Proje {pid} / {t} kopyalanamadı: {e}") from e
+                        done += 1
+                        if callable(progress_cb):
+                            progress_cb(done, total)
+
+                    with mgr.lock():
+                        cls._verify_counts(mgr.get_connection(), pid, raw_tables, "Proje dosyaları silinmedi.")
+                finally:
+                    with mgr.lock():
+                        cls.detach(mgr.get_connection())
+        except Exception:
+            # ana DB'deki yarım kopya kaldırılır: "sharded" yerleşimde ham tablolar ana DB'de olmamalı
+            with mgr.lock():
+                conn = mgr.get_connection()
+                for t in raw_tables:
+                    conn.execute(f"DROP TABLE IF EXISTS main.{t}")
+                HtsFullText.drop(conn, "main")
+                conn.commit()
+            raise
+
+        cls.set_enabled(False)
+        for pid in pids:
+            base = cls.shard_path(pid)
+            for p in (base, base + "-wal", base + "-shm"):
+                try:
+                    if os.path.exists(p):
+                        os.remove(p)
+                except Exception as e:
+                    print(f"⚠️ [ProjectShards.convert] {p}: {e}")
+        return True
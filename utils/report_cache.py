@@ -0,0 +1,97 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class ReportRenderCache:
+    """
+    Rapor Merkezi önizlemesi için bellek içi (LRU) render önbelleği.
+
+    - Delil blokları: anahtar = içerik hash'i (Tur + Başlık + HTML + gizli kolonlar + format).
+      Açıklama değişince blok yeniden render edilmez.
+    - Otomatik bölümler (Genel Bilgilendirme, HTS Dosya/Abone): anahtar = proje veri imzası +
+      proje nesli (import / GSM silme / proje silme sonrası invalidate_project ile artırılır).
+
+    Anahtarlar içerik hash'i olduğu için eski kayıtlar zamanla LRU ile düşer; ayrıca silmeye gerek yok.
+    """
+
+    MAX_ENTRIES = 600
+    MAX_CHARS = 64 * 1024 * 1024  # ~64M karakter (kabaca bellek sınırı)
+
+    _lock = threading.RLock()
+    _entries = OrderedDict()
+    _total_chars = 0
+    _generations = {}
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        h = hashlib.sha1()
+        for p in parts:
+            if p is None:
+                b = b"\x00N"
+            elif isinstance(p, bytes):
+                b = p
+            else:
+                b = str(p).encode("utf-8", "surrogatepass")
+            # uzunluk öneki: ("ab","c") ile ("a","bc") aynı anahtarı üretmesin
+            h.update(len(b).to_bytes(8, "little"))
+            h.update(b)
+        return h.hexdigest()
+
+    @staticmethod
+    def get(key):
+        with ReportRenderCache._lock:
+            val = ReportRenderCache._entries.get(key)
+            if val is not None:
+                ReportRenderCache._entries.move_to_end(key)
+            return val
+
+    @staticmethod
+    def put(key, value: str):
+        if not isinstance(value, str):
+            return
+        cls = ReportRenderCache
+        with cls._lock:
+            old = cls._entries.pop(key, None)
+            if old is not None:
+                cls._total_chars -= len(old)
+
+            # tek başına bütçeyi aşan içerik önbelleğe alınmaz
+            if len(value) > cls.MAX_CHARS:
+                return
+
+            cls._entries[key] = value
+            cls._total_chars += len(value)
+
+            while cls._entries and (len(cls._entries) > cls.MAX_ENTRIES or cls._total_chars > cls.MAX_CHARS):
+                _, dropped = cls._entries.popitem(last=False)
+                cls._total_chars -= len(dropped)
+
+    @staticmethod
+    def get_or_render(key, render_fn):
+        """Önbellekte varsa döner, yoksa render_fn() çalıştırıp saklar."""
+        cached = ReportRenderCache.get(key)
+        if cached is not None:
+            return cached
+
+        val = render_fn()
+        ReportRenderCache.put(key, val)
+        return val
+
+    @staticmethod
+    def project_generation(project_id) -> int:
+        with ReportRenderCache._lock:
+            return ReportRenderCache._generations.get(str(project_id), 0)
+
+    @staticmethod
+    def invalidate_project(project_id):
+        """Projenin ham verisi değişti (import/silme): otomatik bölümler yeniden hesaplanır."""
+        with ReportRenderCache._lock:
+            k = str(project_id)
+            ReportRenderCache._generations[k] = ReportRenderCache._generations.get(k, 0) + 1
+
+    @staticmethod
+    def clear():
+        with ReportRenderCache._lock:
+            ReportRenderCache._entries.clear()
+            ReportRenderCache._total_chars = 0
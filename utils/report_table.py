@@ -0,0 +1,291 @@
+"""
+Rapor delili (TABLE) için yapısal tablo formatı.
+
+rapor_taslagi.TabloJson içinde saklanır:
+    {"v": 1, "cls": ["meta-table"], "h": [<th iç html>, ...], "r": [[<td iç html>, ...], ...]}
+
+- Hücreler iç HTML olarak tutulur (ikon <img data:...> + escape edilmiş metin kaybolmaz).
+- Gizli kolonlar (HiddenColsJson) ve renklendirme (FmtJson) ayrı kolonlarda kalır;
+  render_table_html bunları tek geçişte uygular (BeautifulSoup parse/serialize yok).
+- HTML -> yapı dönüşümü sadece bir kez yapılır (migration / delil ekleme anında).
+"""
+import html
+import json
+import re
+
+
+TABLE_STRUCT_VERSION = 1
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _cell_text(cell_html: str) -> str:
+    """Hücre iç HTML'inden düz metin (bs4 get_text(" ", strip=True) karşılığı)."""
+    s = str(cell_html or "")
+    if "<" in s:
+        s = _TAG_RE.sub(" ", s)
+    if "&" in s:
+        s = html.unescape(s)
+    return " ".join(s.split())
+
+
+def table_struct_from_rows(headers, rows, cls=None, escape: bool = True) -> dict:
+    """
+    Uygulama içinden üretilen tablo verisinden yapı oluşturur.
+    escape=True ise hücreler düz metin kabul edilip escape edilir; False ise hazır iç HTML'dir.
+    """
+    def conv(v):
+        v = "" if v is None else str(v)
+        return html.escape(v) if escape else v
+
+    return {
+        "v": TABLE_STRUCT_VERSION,
+        "cls": list(cls or []),
+        "h": [conv(h) for h in (headers or [])],
+        "r": [[conv(c) for c in (row or [])] for row in (rows or [])],
+    }
+
+
+def table_struct_from_html(table_html: str):
+    """
+    Tek ve sade (<table> + tr/th/td, hücrede attribute yok) tablo HTML'ini yapıya çevirir.
+    Dönüştürülemeyen içerikte None döner (eski HTML yolu kullanılmaya devam eder).
+    """
+    if not table_html or "<table" not in str(table_html).lower():
+        return None
+
+    try:
+        from bs4 import BeautifulSoup, Tag
+    except Exception:
+        return None
+
+    try:
+        soup = BeautifulSoup(table_html, "html.parser")
+        tables = soup.find_all("table")
+        if len(tables) != 1:
+            return None
+        table = tables[0]
+
+        # tablo dışında anlamlı içerik varsa (metin / başka etiket) dokunma
+        for node in soup.contents:
+            if node is table:
+                continue
+            if isinstance(node, Tag) or str(node).strip():
+                return None
+
+        if set(table.attrs.keys()) - {"class"}:
+            return None
+
+        def _children(tag):
+            out = []
+            for ch in tag.children:
+                if isinstance(ch, Tag):
+                    out.append(ch)
+                elif str(ch).strip():
+                    raise ValueError("metin")
+            return out
+
+        trs = []
+        for ch in _children(table):
+            if ch.name in ("thead", "tbody"):
+                if ch.attrs:
+                    return None
+                for tr in _children(ch):
+                    if tr.name != "tr":
+                        return None
+                    trs.append(tr)
+            elif ch.name == "tr":
+                trs.append(ch)
+            else:
+                return None
+
+        if not trs:
+            return None
+
+        grid = []
+        for tr in trs:
+            if tr.attrs:
+                return None
+            cells = _children(tr)
+            if any(c.name not in ("th", "td") or c.attrs for c in cells):
+                return None
+            grid.append(cells)
+
+        # header: ilk satırda th olmalı (editor/format indeksleri buna göre)
+        if not grid[0] or not any(c.name == "th" for c in grid[0]):
+            return None
+
+        cls = table.get("class", [])
+        if isinstance(cls, str):
+            cls = cls.split()
+
+        return {
+            "v": TABLE_STRUCT_VERSION,
+            "cls": [c for c in cls if c != "report-table"],
+            "h": [c.decode_contents() for c in grid[0]],
+            "r": [[c.decode_contents() for c in cells] for cells in grid[1:]],
+        }
+    except Exception:
+        return None
+
+
+def table_struct_dumps(tbl: dict) -> str:
+    return json.dumps(tbl, ensure_ascii=False, separators=(",", ":"))
+
+
+def table_struct_loads(raw):
+    """TabloJson -> dict; boş / bozuk / bilinmeyen sürümde None."""
+    if not raw:
+        return None
+    if isinstance(raw, dict):
+        tbl = raw
+    else:
+        try:
+            tbl = json.loads(raw)
+        except Exception:
+            return None
+    if not isinstance(tbl, dict) or tbl.get("v") != TABLE_STRUCT_VERSION:
+        return None
+    if not isinstance(tbl.get("h"), list) or not isinstance(tbl.get("r"), list):
+        return None
+    return tbl
+
+
+def _hidden_index_set(header_texts, hidden_headers) -> set:
+    hidden = {str(x).strip() for x in (hidden_headers or []) if str(x).strip()}
+    if not hidden:
+        return set()
+    return {i for i, h in enumerate(header_texts) if h in hidden}
+
+
+def table_struct_headers_rows(tbl: dict, hidden_headers=None):
+    """
+    Editor / ayar diyalogları için düz metin (headers, rows).
+    hidden_headers verilirse o kolonlar çıkarılmış hali döner.
+    """
+    header_texts = [_cell_text(h) for h in (tbl.get("h") or [])]
+    hide_idx = _hidden_index_set(header_texts, hidden_headers)
+
+    headers = [h for i, h in enumerate(header_texts) if i not in hide_idx]
+    rows = [
+        [_cell_text(c) for i, c in enumerate(row) if i not in hide_idx]
+        for row in (tbl.get("r") or [])
+    ]
+    return headers, rows
+
+
+def _parse_fmt(fmt):
+    if isinstance(fmt, str):
+        try:
+            fmt = json.loads(fmt) if fmt else {}
+        except Exception:
+            fmt = {}
+    if not isinstance(fmt, dict):
+        fmt = {}
+
+    def _int_map(d):
+        out = {}
+        if not isinstance(d, dict):
+            return out
+        for k, v in d.items():
+            try:
+                out[int(k)] = v
+            except Exception:
+                continue
+        return out
+
+    cells = {}
+    raw_cells = fmt.get("cells") or {}
+    if isinstance(raw_cells, dict):
+        for k, v in raw_cells.items():
+            try:
+                r_s, c_s = str(k).split(",", 1)
+                cells[(int(r_s.strip()), int(c_s.strip()))] = v
+            except Exception:
+                continue
+
+    return _int_map(fmt.get("cols")), _int_map(fmt.get("rows")), cells
+
+
+def render_table_html(tbl: dict, hidden_headers=None, fmt=None,
+                      report: bool = False, drop_empty_headers: bool = False) -> str:
+    """
+    Yapısal tabloyu tek geçişte HTML'e basar.
+
+    Sıra, eski zincirle aynıdır:
+      1) gizli kolonlar (header metnine göre) çıkarılır
+      2) fmt uygulanır (indeksler görünür kolonlara göre; rows/cells header HARİÇ; öncelik cell > row > col)
+      3) report=True ise _postprocess_report_tables karşılığı: report-table sınıfı, THEAD,
+         uzun tek parça değerlerde cell-break-anywhere; drop_empty_headers ile boş başlıklı kolon atılır
+    """
+    headers = tbl.get("h") or []
+    rows = tbl.get("r") or []
+
+    header_texts = [_cell_text(h) for h in headers]
+    hide_idx = _hidden_index_set(header_texts, hidden_headers)
+
+    # görünür (fmt indeksli) kolonlar içinde, çıktıdan atılacak boş başlıklılar
+    drop_vis = set()
+    if drop_empty_headers:
+        vis = 0
+        for i, t in enumerate(header_texts):
+            if i in hide_idx:
+                continue
+            if not t:
+                drop_vis.add(vis)
+            vis += 1
+
+    cols_c, rows_c, cells_c = _parse_fmt(fmt)
+
+    def _attrs(color, extra_cls=None):
+        out = ""
+        if extra_cls:
+            out += f' class="{extra_cls}"'
+        if color:
+            out += f' style="background-color: {html.escape(str(color), quote=True)};"'
+        return out
+
+    cls = list(tbl.get("cls") or [])
+    if report and "report-table" not in cls:
+        cls.append("report-table")
+    cls_attr = f' class="{html.escape(" ".join(cls), quote=True)}"' if cls else ""
+
+    parts = [f"<table{cls_attr}>"]
+
+    # header
+    if headers:
+        parts.append("<thead><tr>" if report else "<tr>")
+        vis = 0
+        for i, h in enumerate(headers):
+            if i in hide_idx:
+                continue
+            if vis not in drop_vis:
+                parts.append(f"<th{_attrs(cols_c.get(vis))}>{h}</th>")
+            vis += 1
+        parts.append("</tr></thead>" if report else "</tr>")
+
+    if report:
+        parts.append("<tbody>")
+
+    for ri, row in enumerate(rows):
+        parts.append("<tr>")
+        row_color = rows_c.get(ri)
+        vis = 0
+        for i, cell in enumerate(row):
+            if i in hide_idx:
+                continue
+            if vis not in drop_vis:
+                color = cells_c.get((ri, vis)) or row_color or cols_c.get(vis)
+                brk = None
+                if report:
+                    text = _cell_text(cell)
+                    if text and max((len(x) for x in text.split()), default=0) >= 26:
+                        brk = "cell-break-anywhere"
+                parts.append(f"<td{_attrs(color, brk)}>{cell}</td>")
+            vis += 1
+        parts.append("</tr>")
+
+    if report:
+        parts.append("</tbody>")
+    parts.append("</table>")
+    return "".join(parts)
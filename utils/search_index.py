@@ -0,0 +1,101 @@
+import re
+import unicodedata
+from bisect import bisect_right
+
+
+class RowSearchIndex:
+    """
+    Tablo satırlarının normalize edilmiş (Türkçe karakter + aksan katlanmış, küçük harf) metin indeksi.
+
+    Tüm satırlar tek bir metinde birleştirilir (hücre ayırıcı \\x1f, satır ayırıcı \\x1e); arama
+    satır satır Python döngüsü yerine str.find ile C hızında yapılır, bulunan konum bisect ile
+    satır numarasına çevrilir. Ayırıcılar sorguda bulunamadığı için eşleşme hücre sınırını aşmaz
+    (hücre bazlı "içeriyor mu" ile aynı sonuç).
+
+    Model verisi değişmedikçe bir kez kurulur; son sorguların sonuçları küçük bir önbellekte tutulur.
+    """
+
+    CELL_SEP = "\x1f"
+    ROW_SEP = "\x1e"
+    MAX_CACHED_QUERIES = 16
+
+    # str.translate büyük metinde karakter başına sözlük araması yapar; ardışık replace çok daha hızlı
+    _TR_PAIRS = (
+        ("İ", "i"), ("I", "i"), ("ı", "i"), ("Ş", "s"), ("ş", "s"), ("Ğ", "g"), ("ğ", "g"),
+        ("Ü", "u"), ("ü", "u"), ("Ö", "o"), ("ö", "o"), ("Ç", "c"), ("ç", "c"),
+    )
+    _NON_ASCII = re.compile(r"[^\x00-\x7f]")
+
+    def __init__(self, rows, col_count: int):
+        sep = RowSearchIndex.CELL_SEP
+        parts = []
+        for row in rows:
+            cells = row[:col_count] if col_count >= 0 else row
+            parts.append(sep.join("" if v is None else str(v) for v in cells))
+
+        blob = RowSearchIndex.normalize(RowSearchIndex.ROW_SEP.join(parts), strip=False)
+
+        # satır başlangıç konumları (normalize uzunluğu değiştirebilir -> ayırıcılardan hesaplanır)
+        starts = []
+        pos = 0
+        for part in blob.split(RowSearchIndex.ROW_SEP):
+            starts.append(pos)
+            pos += len(part) + 1
+
+        self._blob = blob
+        self._starts = starts if parts else []
+        self._row_count = len(parts)
+        self._cache = {}
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def normalize(text, strip: bool = True) -> str:
+        """
+        Türkçe karakterleri katlar, aksanları (Unicode kategori M*) atar, küçük harfe çevirir.
+        ASCII metinde NFD atlanır; aksanlar metinde geçen farklı işaret karakterleri kadar replace ile silinir.
+        """
+        if not text:
+            return ""
+        text = str(text)
+        if not text.isascii():
+            for k, v in RowSearchIndex._TR_PAIRS:
+                text = text.replace(k, v)
+        text = text.lower()
+        if not text.isascii():
+            text = unicodedata.normalize("NFD", text)
+            marks = {c for c in set(RowSearchIndex._NON_ASCII.findall(text)) if unicodedata.category(c).startswith("M")}
+            for c in marks:
+                text = text.replace(c, "")
+            text = text.lower()
+        return text.strip() if strip else text
+
+    # ------------------------------------------------------------------
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    def match_rows(self, query: str) -> bytearray:
+        """query (normalize edilmiş) -> satır başına 1/0. Boş sorguda tüm satırlar eşleşir."""
+        n = self._row_count
+        if not query:
+            return bytearray(b"\x01") * n
+
+        hit = self._cache.get(query)
+        if hit is not None:
+            return hit
+
+        out = bytearray(n)
+        if RowSearchIndex.CELL_SEP not in query and RowSearchIndex.ROW_SEP not in query:
+            blob, starts, end = self._blob, self._starts, len(self._blob)
+            find = blob.find
+            pos = find(query)
+            while pos != -1:
+                r = bisect_right(starts, pos) - 1
+                out[r] = 1
+                nxt = starts[r + 1] if r + 1 < n else end
+                pos = find(query, nxt)
+
+        if len(self._cache) >= RowSearchIndex.MAX_CACHED_QUERIES:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[query] = out
+        return out
@@ -0,0 +1,127 @@
+import calendar
+import re
+from datetime import date, datetime
+
+
+class ColumnKeys:
+    """
+    Tablo kolonları için tipli sıralama / tarih anahtarları (bir kez hesaplanır, karşılaştırmada parse yok).
+
+    Hücre anahtarı (grup, değer) çiftidir; gruplar farklı tipleri ayırır ki sıralama hiç TypeError vermesin:
+      (0, sayı)   -> sayı veya tarih (tarih kolonunda epoch saniye; dd.MM.yyyy kronolojik sıralanır)
+      (1, metin)  -> casefold edilmiş metin
+      (2, "")     -> boş hücre (ColumnKeys.order ile artan ve azalan sıralamada en sonda)
+    Tarih epoch'u saat dilimsiz (calendar.timegm) hesaplanır; filtre sınırları da aynı yolla çevrilir.
+    """
+
+    DATE_SAMPLE = 200
+    DATE_RATIO = 0.8
+
+    _DMY = re.compile(r"^\s*(\d{1,2})[./-](\d{1,2})[./-](\d{4})(?:[ T]+(\d{1,2}):(\d{2})(?::(\d{2}))?)?")
+    _YMD = re.compile(r"^\s*(\d{4})-(\d{1,2})-(\d{1,2})(?:[ T]+(\d{1,2}):(\d{2})(?::(\d{2}))?)?")
+
+    EMPTY = (2, "")
+
+    @staticmethod
+    def epoch(y, mo, d, h=0, mi=0, s=0) -> int | None:
+        if not (1 <= mo <= 12 and 1 <= d <= 31 and 0 <= h <= 23 and 0 <= mi <= 59 and 0 <= s <= 60):
+            return None
+        return calendar.timegm((y, mo, d, h, mi, s, 0, 0, 0))
+
+    @staticmethod
+    def date_epoch(value) -> int | None:
+        """'dd.MM.yyyy[ HH:mm[:ss]]', 'dd/MM/yyyy ...', 'yyyy-MM-dd ...' veya datetime/date -> epoch saniye."""
+        if value is None:
+            return None
+        if isinstance(value, datetime):
+            return ColumnKeys.epoch(value.year, value.month, value.day, value.hour, value.minute, value.second)
+        if isinstance(value, date):
+            return ColumnKeys.epoch(value.year, value.month, value.day)
+
+        text = str(value)
+        m = ColumnKeys._DMY.match(text)
+        if m:
+            d, mo, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        else:
+            m = ColumnKeys._YMD.match(text)
+            if not m:
+                return None
+            y, mo, d = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        h = int(m.group(4) or 0); mi = int(m.group(5) or 0); s = int(m.group(6) or 0)
+        return ColumnKeys.epoch(y, mo, d, h, mi, s)
+
+    @staticmethod
+    def qdatetime_epoch(qdt) -> int:
+        """QDateTime / QDate -> date_epoch ile aynı (saat dilimsiz) ölçekte epoch."""
+        if hasattr(qdt, "time"):
+            d, t = qdt.date(), qdt.time()
+            return calendar.timegm((d.year(), d.month(), d.day(), t.hour(), t.minute(), t.second(), 0, 0, 0))
+        return calendar.timegm((qdt.year(), qdt.month(), qdt.day(), 0, 0, 0, 0, 0, 0))
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _number(value):
+        if isinstance(value, bool):
+            return float(value)
+        if isinstance(value, (int, float)):
+            return value if value == value else None
+        try:
+            f = float(str(value).strip())
+        except (ValueError, TypeError):
+            return None
+        return f if f == f else None
+
+    @staticmethod
+    def is_date_column(values) -> bool:
+        """İlk DATE_SAMPLE dolu hücrenin çoğunluğu tarih ise kolon tarih kolonudur."""
+        seen = hit = 0
+        for v in values:
+            if v is None or v == "":
+                continue
+            seen += 1
+            if ColumnKeys.date_epoch(v) is not None:
+                hit += 1
+            if seen >= ColumnKeys.DATE_SAMPLE:
+                break
+        return seen > 0 and hit >= seen * ColumnKeys.DATE_RATIO
+
+    @staticmethod
+    def column(rows, col: int):
+        """
+        Bir kolonun sıralama anahtarları. Dönüş: (is_date, keys)
+        is_date: kolon tarih olarak algılandı mı (keys[i][0] == 0 olanlar epoch)
+        """
+        values = [row[col] if col < len(row) else None for row in rows]
+        is_date = ColumnKeys.is_date_column(values)
+
+        keys = []
+        append = keys.append
+        date_epoch = ColumnKeys.date_epoch
+        number = ColumnKeys._number
+        for v in values:
+            if v is None or v == "":
+                append(ColumnKeys.EMPTY)
+                continue
+            k = date_epoch(v) if is_date else None
+            if k is None:
+                k = number(v)
+            append((0, k) if k is not None else (1, str(v).casefold()))
+        return is_date, keys
+
+    @staticmethod
+    def order(row_ids, keys, descending: bool = False) -> list:
+        """
+        row_ids'i keys[row] ile kararlı sıralar; boş hücreler (EMPTY) her iki yönde de sona,
+        kendi aralarında verilen sırayla kalır.
+        """
+        empty = ColumnKeys.EMPTY
+        filled = [r for r in row_ids if keys[r] != empty]
+        blanks = [r for r in row_ids if keys[r] == empty]
+        filled.sort(key=keys.__getitem__, reverse=descending)
+        return filled + blanks
+
+    @staticmethod
+    def date_keys(rows, col: int) -> list:
+        """Satır başına epoch (tarih çözülemezse None) — tarih filtresi için."""
+        date_epoch = ColumnKeys.date_epoch
+        return [date_epoch(row[col]) if col < len(row) else None for row in rows]
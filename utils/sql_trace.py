@@ -0,0 +1,423 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from security.security import LicenseManager
+from utils.app_settings import AppSettings
+
+
+class SqlTrace:
+    """
+    İsteğe bağlı SQL izleme (varsayılan kapalı; ayar veya HTSMERCEK_SQL_TRACE=1 ile açılır).
+
+    Açıkken DatabaseManager.get_connection() bağlantıyı, lock() DB kilidini ince bir sarmalayıcıyla döndürür:
+      - ifade başına süre (execute + fetch), dönen satır sayısı (DML'de etkilenen satır) ve çağıran satır
+      - DB kilidi için bekleme süresi (çağırana göre)
+      - eşiği aşan ifadelerde EXPLAIN QUERY PLAN + AppData altında dönen (rotating) slow_queries.log
+    Kapalıyken ham bağlantı/kilit döner, ek maliyet yoktur.
+
+    Bir SELECT'in süresi sonuç tamamen okunduğunda (fetchall / tükenen iterasyon) ya da
+    kilit bırakılırken (with DB() çıkışı) kesinleşir.
+    """
+
+    ENABLE_KEY = "sql_trace"
+    SLOW_MS_KEY = "sql_trace_slow_ms"
+    ENV = "HTSMERCEK_SQL_TRACE"
+
+    DEFAULT_SLOW_MS = 100
+    LOG_NAME = "slow_queries.log"
+    LOG_MAX_BYTES = 1024 * 1024
+    LOG_BACKUPS = 3
+
+    MAX_STATEMENTS = 500
+    MAX_SQL_LEN = 300
+    RECENT_SLOW = 200
+    OTHER_KEY = "(diğer ifadeler)"
+    PLAN_VERBS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+    _enabled = None
+    _slow_ms = None
+    _lock = threading.Lock()
+    _local = threading.local()
+    _stmts = {}          # sql -> [adet, toplam_ms, max_ms, satır]
+    _lock_waits = {}     # çağıran -> [adet, toplam_ms, max_ms]
+    _slow = deque(maxlen=RECENT_SLOW)
+    _plans = {}
+    _logger = None
+    _since = time.time()
+
+    # ------------------------------------------------------------------
+    # ayarlar
+    # ------------------------------------------------------------------
+    @staticmethod
+    def enabled() -> bool:
+        if SqlTrace._enabled is None:
+            env = os.environ.get(SqlTrace.ENV, "").strip() in ("1", "true", "yes")
+            SqlTrace._enabled = env or bool(AppSettings.get(SqlTrace.ENABLE_KEY, False))
+        return SqlTrace._enabled
+
+    @staticmethod
+    def set_enabled(flag: bool):
+        AppSettings.set(SqlTrace.ENABLE_KEY, bool(flag))
+        SqlTrace._enabled = bool(flag)
+
+    @staticmethod
+    def slow_ms() -> float:
+        if SqlTrace._slow_ms is None:
+            try:
+                SqlTrace._slow_ms = float(AppSettings.get(SqlTrace.SLOW_MS_KEY, SqlTrace.DEFAULT_SLOW_MS))
+            except (TypeError, ValueError):
+                SqlTrace._slow_ms = float(SqlTrace.DEFAULT_SLOW_MS)
+        return SqlTrace._slow_ms
+
+    @staticmethod
+    def set_slow_ms(ms):
+        SqlTrace._slow_ms = max(1.0, float(ms))
+        AppSettings.set(SqlTrace.SLOW_MS_KEY, SqlTrace._slow_ms)
+
+    @staticmethod
+    def log_path() -> str:
+        return os.path.join(LicenseManager.appdata_dir(), SqlTrace.LOG_NAME)
+
+    # ------------------------------------------------------------------
+    # sarmalayıcılar
+    # ------------------------------------------------------------------
+    @staticmethod
+    def wrap_connection(conn):
+        if conn is None or not SqlTrace.enabled():
+            return conn
+        return _TracedConnection(conn)
+
+    @staticmethod
+    def wrap_lock(lock):
+        if not SqlTrace.enabled():
+            return lock
+        return _TracedLock(lock)
+
+    # ------------------------------------------------------------------
+    # kayıt
+    # ------------------------------------------------------------------
+    @staticmethod
+    def caller() -> str:
+        """İzleme katmanı ve __enter__/__exit__ dışındaki ilk çağıran: 'dosya:satır fonksiyon'."""
+        f = sys._getframe(1)
+        this = __file__
+        while f is not None:
+            code = f.f_code
+            if code.co_filename != this and code.co_name not in ("__enter__", "__exit__"):
+                return f"{os.path.basename(code.co_filename)}:{f.f_lineno} {code.co_name}"
+            f = f.f_back
+        return "?"
+
+    @staticmethod
+    def _sql_key(sql) -> str:
+        return " ".join(str(sql).split())[: SqlTrace.MAX_SQL_LEN]
+
+    @staticmethod
+    def _pending() -> list:
+        p = getattr(SqlTrace._local, "pending", None)
+        if p is None:
+            p = SqlTrace._local.pending = []
+        return p
+
+    @staticmethod
+    def begin(conn, sql, params, many: bool = False) -> "_Statement":
+        rec = _Statement(conn, sql, params, many, SqlTrace.caller())
+        SqlTrace._pending().append(rec)
+        return rec
+
+    @staticmethod
+    def finish(rec: "_Statement"):
+        if rec is None or rec.done:
+            return
+        rec.done = True
+        try:
+            SqlTrace._pending().remove(rec)
+        except ValueError:
+            pass
+
+        total = rec.exec_ms + rec.fetch_ms
+        key = SqlTrace._sql_key(rec.sql)
+        with SqlTrace._lock:
+            st = SqlTrace._stmts.get(key)
+            if st is None:
+                if len(SqlTrace._stmts) >= SqlTrace.MAX_STATEMENTS:
+                    key = SqlTrace.OTHER_KEY
+                    st = SqlTrace._stmts.get(key)
+                if st is None:
+                    st = SqlTrace._stmts[key] = [0, 0.0, 0.0, 0]
+            st[0] += 1
+            st[1] += total
+            st[2] = max(st[2], total)
+            st[3] += max(0, rec.rows)
+
+        if total >= SqlTrace.slow_ms():
+            plan = SqlTrace._explain(rec)
+            item = (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), total, rec.exec_ms, rec.fetch_ms,
+                    rec.rows, rec.caller, key, plan)
+            with SqlTrace._lock:
+                SqlTrace._slow.append(item)
+            SqlTrace._log(
+                f"{total:.1f} ms (execute {rec.exec_ms:.1f} + fetch {rec.fetch_ms:.1f}) | satır {rec.rows} | "
+                f"{rec.caller} | {key}" + (f"\n    PLAN: {plan}" if plan else "")
+            )
+
+    @staticmethod
+    def flush():
+        """Bu thread'de sonucu tam okunmamış ifadeleri kesinleştirir (kilit bırakılırken çağrılır)."""
+        for rec in list(SqlTrace._pending()):
+            SqlTrace.finish(rec)
+
+    @staticmethod
+    def record_lock_wait(ms: float, caller: str):
+        with SqlTrace._lock:
+            st = SqlTrace._lock_waits.get(caller)
+            if st is None:
+                st = SqlTrace._lock_waits[caller] = [0, 0.0, 0.0]
+            st[0] += 1
+            st[1] += ms
+            st[2] = max(st[2], ms)
+        if ms >= SqlTrace.slow_ms():
+            SqlTrace._log(f"KİLİT BEKLEME {ms:.1f} ms | {caller}")
+
+    @staticmethod
+    def _explain(rec) -> str:
+        verb = str(rec.sql).lstrip().split(None, 1)[0].upper() if str(rec.sql).strip() else ""
+        if verb not in SqlTrace.PLAN_VERBS:
+            return ""
+        key = SqlTrace._sql_key(rec.sql)
+        plan = SqlTrace._plans.get(key)
+        if plan is not None:
+            return plan
+
+        params = rec.params
+        if rec.many:
+            params = params[0] if isinstance(params, (list, tuple)) and params else None
+            if params is None:
+                return ""
+        try:
+            rows = rec.conn.execute("EXPLAIN QUERY PLAN " + str(rec.sql), params if params is not None else ()).fetchall()
+            plan = " ; ".join(str(r[-1]) for r in rows)
+        except Exception as e:
+            plan = f"(plan alınamadı: {e})"
+        if len(SqlTrace._plans) < SqlTrace.MAX_STATEMENTS:
+            SqlTrace._plans[key] = plan
+        return plan
+
+    @staticmethod
+    def _log(line: str):
+        try:
+            if SqlTrace._logger is None:
+                logger = logging.getLogger("htsmercek.sql")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                h = RotatingFileHandler(
+                    SqlTrace.log_path(), maxBytes=SqlTrace.LOG_MAX_BYTES,
+                    backupCount=SqlTrace.LOG_BACKUPS, encoding="utf-8"
+                )
+                h.setFormatter(logging.Formatter("%(asctime)s | %(message)s"))
+                logger.addHandler(h)
+                SqlTrace._logger = logger
+            SqlTrace._logger.info(line)
+        except Exception as e:
+            print(f"⚠️ [SqlTrace] Log yazılamadı: {e}")
+
+    # ------------------------------------------------------------------
+    # rapor
+    # ------------------------------------------------------------------
+    @staticmethod
+    def snapshot() -> dict:
+        """Tanılama ekranı için: ifadeler (toplam süreye göre), kilit beklemeleri, son yavaş ifadeler."""
+        with SqlTrace._lock:
+            stmts = [(k, v[0], v[1], v[1] / v[0] if v[0] else 0.0, v[2], v[3]) for k, v in SqlTrace._stmts.items()]
+            waits = [(k, v[0], v[1], v[1] / v[0] if v[0] else 0.0, v[2]) for k, v in SqlTrace._lock_waits.items()]
+            slow = list(SqlTrace._slow)
+        stmts.sort(key=lambda r: r[2], reverse=True)
+        waits.sort(key=lambda r: r[2], reverse=True)
+        slow.reverse()
+        return {"since": SqlTrace._since, "statements": stmts, "lock_waits": waits, "slow": slow}
+
+    @staticmethod
+    def reset():
+        with SqlTrace._lock:
+            SqlTrace._stmts.clear()
+            SqlTrace._lock_waits.clear()
+            SqlTrace._slow.clear()
+            SqlTrace._plans.clear()
+            SqlTrace._since = time.time()
+
+
+class _Statement:
+    __slots__ = ("conn", "sql", "params", "many", "caller", "exec_ms", "fetch_ms", "rows", "done")
+
+    def __init__(self, conn, sql, params, many, caller):
+        self.conn = conn
+        self.sql = sql
+        self.params = params
+        self.many = many
+        self.caller = caller
+        self.exec_ms = 0.0
+        self.fetch_ms = 0.0
+        self.rows = 0
+        self.done = False
+
+
+class _TracedCursor:
+    """sqlite3 / SQLCipher cursor sarmalayıcısı (bilinmeyen öznitelikler asıl cursor'a gider)."""
+
+    def __init__(self, cur, conn):
+        self._cur = cur
+        self._conn = conn
+        self._rec = None
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+    def _close_rec(self):
+        if self._rec is not None:
+            SqlTrace.finish(self._rec)
+            self._rec = None
+
+    def _run(self, method, sql, args, many):
+        self._close_rec()
+        rec = SqlTrace.begin(self._conn, sql, args[0] if args else None, many)
+        t = time.perf_counter()
+        try:
+            method(sql, *args)
+        finally:
+            rec.exec_ms = (time.perf_counter() - t) * 1000
+        if self._cur.description is None:
+            # DML / DDL: sonuç kümesi yok -> etkilenen satır
+            rec.rows = self._cur.rowcount if (self._cur.rowcount or 0) > 0 else 0
+            SqlTrace.finish(rec)
+        else:
+            self._rec = rec
+        return self
+
+    def execute(self, sql, *args):
+        return self._run(self._cur.execute, sql, args, False)
+
+    def executemany(self, sql, *args):
+        return self._run(self._cur.executemany, sql, args, True)
+
+    def executescript(self, script):
+        return self._run(self._cur.executescript, script, (), False)
+
+    def fetchone(self):
+        rec = self._rec
+        if rec is None:
+            return self._cur.fetchone()
+        t = time.perf_counter()
+        row = self._cur.fetchone()
+        rec.fetch_ms += (time.perf_counter() - t) * 1000
+        if row is None:
+            self._close_rec()
+        else:
+            rec.rows += 1
+        return row
+
+    def fetchmany(self, *args):
+        rec = self._rec
+        if rec is None:
+            return self._cur.fetchmany(*args)
+        t = time.perf_counter()
+        rows = self._cur.fetchmany(*args)
+        rec.fetch_ms += (time.perf_counter() - t) * 1000
+        rec.rows += len(rows)
+        size = args[0] if args else self._cur.arraysize
+        if len(rows) < size:
+            self._close_rec()
+        return rows
+
+    def fetchall(self):
+        rec = self._rec
+        if rec is None:
+            return self._cur.fetchall()
+        t = time.perf_counter()
+        rows = self._cur.fetchall()
+        rec.fetch_ms += (time.perf_counter() - t) * 1000
+        rec.rows += len(rows)
+        self._close_rec()
+        return rows
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._close_rec()
+        self._cur.close()
+
+
+class _TracedConnection:
+    """Bağlantı sarmalayıcısı: execute/executemany/cursor izlenir, geri kalan her şey asıl bağlantıya gider."""
+
+    __slots__ = ("_conn",)
+
+    def __init__(self, conn):
+        object.__setattr__(self, "_conn", conn)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+    def cursor(self, *args):
+        return _TracedCursor(self._conn.cursor(*args), self._conn)
+
+    def execute(self, sql, *args):
+        return self.cursor().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        return self.cursor().executemany(sql, *args)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+
+class _TracedLock:
+    """DB kilidi sarmalayıcısı: acquire bekleme süresi ölçülür, release öncesi açık ifadeler kesinleşir."""
+
+    __slots__ = ("_lock",)
+
+    def __init__(self, lock):
+        self._lock = lock
+
+    def acquire(self, *args, **kwargs):
+        t = time.perf_counter()
+        ok = self._lock.acquire(*args, **kwargs)
+        if ok:
+            SqlTrace.record_lock_wait((time.perf_counter() - t) * 1000, SqlTrace.caller())
+        return ok
+
+    def release(self):
+        try:
+            SqlTrace.flush()
+        finally:
+            self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
@@ -0,0 +1,341 @@
+import json
+import os
+import shutil
+import time
+
+from utils.db_profile import DbProfile
+
+
+class PlainToCipherMigrator:
+    """
+    Şifresiz (eski) SQLite DB -> SQLCipher, tablo tablo ve rowid parçalarıyla.
+
+    - Hedef: <db>.enc_tmp (şifreli). Kaynak dosya iş bitene kadar yerinde ve değişmeden durur.
+    - Her parça ayrı commit; kesilirse bir sonraki açılışta hedefteki MAX(rowid)'den devam edilir
+      (ilerleme bilgisi verinin kendisiyle aynı işlemde yazıldığı için ayrı kayıt tutarsız kalamaz).
+    - Durum dosyası (<db>.migrate.json) sadece kaynağın imzasını, şifre biçimini ve aşamayı tutar;
+      kaynak değişmişse yarım hedef atılır ve baştan başlanır.
+    - Indexler / trigger / view veriden SONRA oluşturulur (toplu yükleme daha hızlı).
+    - Doğrulama: tablo başına satır sayısı, rowid aralığı ve eşit aralıklı örnek satırların birebir karşılaştırması.
+    - Dosya değişimi: kaynak -> <db>.plain_backup, hedef -> <db>. Bu adım yarıda kalırsa ("verified")
+      sonraki açılışta tamamlanır.
+
+    progress_cb(done_rows, total_rows, text)
+    """
+
+    CHUNK_ROWS = 20000
+    VERIFY_SAMPLES = 64
+    FREE_SPACE_MARGIN = 1.10
+
+    PHASE_COPY = "copy"
+    PHASE_VERIFIED = "verified"
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def tmp_path(db_path):
+        return db_path + ".enc_tmp"
+
+    @staticmethod
+    def state_path(db_path):
+        return db_path + ".migrate.json"
+
+    @staticmethod
+    def backup_path(db_path):
+        return db_path + ".plain_backup"
+
+    @staticmethod
+    def _signature(db_path) -> dict:
+        st = os.stat(db_path)
+        return {"size": int(st.st_size), "mtime": int(st.st_mtime)}
+
+    @staticmethod
+    def _load_state(db_path) -> dict:
+        p = PlainToCipherMigrator.state_path(db_path)
+        if not os.path.exists(p):
+            return {}
+        try:
+            with open(p, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _save_state(db_path, state: dict):
+        p = PlainToCipherMigrator.state_path(db_path)
+        tmp = p + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, p)
+
+    @staticmethod
+    def _remove(*paths):
+        for p in paths:
+            try:
+                if os.path.exists(p):
+                    os.remove(p)
+            except Exception:
+                pass
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def checkpoint_plain(db_path):
+        """Kaynağın WAL'ını ana dosyaya aktar (imza ve kopya WAL'sız dosya üzerinden yapılsın)."""
+        try:
+            import sqlite3 as _plain_sqlite
+            conn = _plain_sqlite.connect(db_path, isolation_level=None, timeout=30)
+            try:
+                cur = conn.cursor()
+                try:
+                    cur.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+                except Exception:
+                    cur.execute("PRAGMA wal_checkpoint(FULL);")
+            finally:
+                conn.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def require_free_space(db_path, already_written: int = 0):
+        """Kalan kopya için yer: kaynak boyutu - yazılmış hedef + pay (kaynak silinmez, yeniden adlandırılır)."""
+        size = os.path.getsize(db_path)
+        need = int(max(0, size * PlainToCipherMigrator.FREE_SPACE_MARGIN - already_written))
+        free = shutil.disk_usage(os.path.dirname(os.path.abspath(db_path)) or ".").free
+        if free < need:
+            raise RuntimeError(
+                f"DB şifreleme için yeterli boş alan yok.\n"
+                f"Gereken ~{need / 1024 ** 3:.2f} GB, boş ~{free / 1024 ** 3:.2f} GB."
+            )
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _open_target(path, key, connect, fmt):
+        conn = connect(path, timeout=30, check_same_thread=False)
+        cur = conn.cursor()
+        # KEY parametre bağlamayı her driver kabul etmediği için literal veriyoruz (sha256 hex).
+        cur.execute(f"PRAGMA key = '{key}';")
+        cur.execute("PRAGMA cipher_compatibility = 4;")
+        DbProfile.apply_cipher(cur, fmt)
+        cur.execute("SELECT count(*) FROM sqlite_master;").fetchone()
+        cur.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+        cur.execute("PRAGMA journal_mode=WAL;")
+        cur.execute("PRAGMA synchronous=NORMAL;")
+        cur.execute("PRAGMA foreign_keys=OFF;")
+        cur.execute("PRAGMA cache_size=-65536;")
+        return conn
+
+    @staticmethod
+    def _objects(conn, schema, types):
+        ph = ",".join("?" * len(types))
+        return conn.execute(
+            f"SELECT type, name, tbl_name, sql FROM {schema}.sqlite_master "
+            f"WHERE type IN ({ph}) AND name NOT LIKE 'sqlite_%' AND sql IS NOT NULL ORDER BY rowid",
+            tuple(types)
+        ).fetchall()
+
+    @staticmethod
+    def _columns(conn, schema, table):
+        return [r[1] for r in conn.execute(f"PRAGMA {schema}.table_info([{table}])").fetchall()]
+
+    @staticmethod
+    def _has_rowid(conn, schema, table) -> bool:
+        try:
+            conn.execute(f"SELECT rowid FROM {schema}.[{table}] LIMIT 1").fetchall()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _max_rowid(conn, schema, table):
+        r = conn.execute(f"SELECT MAX(rowid) FROM {schema}.[{table}]").fetchone()
+        return r[0] if r and r[0] is not None else None
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _copy_table(conn, table, progress):
+        cls = PlainToCipherMigrator
+        cols = cls._columns(conn, "plain", table)
+        col_sql = ", ".join(f"[{c}]" for c in cols)
+
+        if not cls._has_rowid(conn, "plain", table):
+            # WITHOUT ROWID: parçalanamaz, tek seferde (bu şemada yok; güvenlik için)
+            if conn.execute(f"SELECT COUNT(*) FROM main.[{table}]").fetchone()[0] == 0:
+                n = conn.execute(f"INSERT INTO main.[{table}] ({col_sql}) SELECT {col_sql} FROM plain.[{table}]").rowcount
+                conn.commit()
+                progress(max(0, n or 0), table)
+            return
+
+        # rowid açıkça taşınır: IPK'sız tablolarda da aynı rowid'ler korunur, devam noktası tutarlı olur
+        last = cls._max_rowid(conn, "main", table)
+        sql = (
+            f"INSERT INTO main.[{table}] (rowid, {col_sql}) "
+            f"SELECT rowid, {col_sql} FROM plain.[{table}] WHERE rowid > ? ORDER BY rowid LIMIT ?"
+        )
+        while True:
+            start = last if last is not None else -(2 ** 63)
+            n = conn.execute(sql, (start, cls.CHUNK_ROWS)).rowcount or 0
+            conn.commit()
+            if n <= 0:
+                break
+            progress(n, table)
+            last = cls._max_rowid(conn, "main", table)
+            if n < cls.CHUNK_ROWS:
+                break
+
+    @staticmethod
+    def verify(conn, tables):
+        """Tablo başına sayım + rowid aralığı + örnek satır karşılaştırması. Uyuşmazlıkta RuntimeError."""
+        cls = PlainToCipherMigrator
+        for t in tables:
+            a = conn.execute(f"SELECT COUNT(*) FROM plain.[{t}]").fetchone()[0]
+            b = conn.execute(f"SELECT COUNT(*) FROM main.[{t}]").fetchone()[0]
+            if a != b:
+                raise RuntimeError(f"Doğrulama hatası: {t} satır sayısı {a} != {b}")
+            if a == 0 or not cls._has_rowid(conn, "plain", t):
+                continue
+
+            ra = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM plain.[{t}]").fetchone()
+            rb = conn.execute(f"SELECT MIN(rowid), MAX(rowid) FROM main.[{t}]").fetchone()
+            if tuple(ra) != tuple(rb):
+                raise RuntimeError(f"Doğrulama hatası: {t} rowid aralığı {tuple(ra)} != {tuple(rb)}")
+
+            cols = ", ".join(f"[{c}]" for c in cls._columns(conn, "plain", t))
+            step = max(1, a // cls.VERIFY_SAMPLES)
+            sample = conn.execute(
+                f"SELECT rowid FROM plain.[{t}] WHERE (rowid % ?) = 0 OR rowid IN (?, ?) LIMIT ?",
+                (step, ra[0], ra[1], cls.VERIFY_SAMPLES + 2)
+            ).fetchall()
+            for (rid,) in sample:
+                x = conn.execute(f"SELECT {cols} FROM plain.[{t}] WHERE rowid=?", (rid,)).fetchone()
+                y = conn.execute(f"SELECT {cols} FROM main.[{t}] WHERE rowid=?", (rid,)).fetchone()
+                if tuple(x or ()) != tuple(y or ()):
+                    raise RuntimeError(f"Doğrulama hatası: {t} rowid={rid} içerik farklı")
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def finish_swap(db_path):
+        """Doğrulanmış hedefi asıl dosya yapar (yarıda kalmış değişimi de tamamlar)."""
+        cls = PlainToCipherMigrator
+        tmp = cls.tmp_path(db_path)
+        backup = cls.backup_path(db_path)
+
+        if os.path.exists(db_path):
+            cls._remove(backup)
+            os.replace(db_path, backup)
+
+        # plain'in WAL/SHM kalıntıları
+        cls._remove(db_path + "-wal", db_path + "-shm", db_path + ".wal", db_path + ".shm")
+        os.replace(tmp, db_path)
+        cls._remove(tmp + "-wal", tmp + "-shm", cls.state_path(db_path))
+
+    @staticmethod
+    def resume_pending_swap(db_path) -> bool:
+        """Önceki çalıştırma doğrulamadan sonra kesildiyse değişimi tamamlar."""
+        cls = PlainToCipherMigrator
+        state = cls._load_state(db_path)
+        if state.get("phase") != cls.PHASE_VERIFIED or not os.path.exists(cls.tmp_path(db_path)):
+            return False
+        cls.finish_swap(db_path)
+        if state.get("fmt"):
+            DbProfile.record_format(state["fmt"])
+        print("✅ [PlainToCipherMigrator] Yarım kalan dosya değişimi tamamlandı.")
+        return True
+
+    @staticmethod
+    def migrate(db_path, key, connect, progress_cb=None):
+        cls = PlainToCipherMigrator
+        if not os.path.exists(db_path):
+            return
+
+        cls.checkpoint_plain(db_path)
+
+        tmp = cls.tmp_path(db_path)
+        sig = cls._signature(db_path)
+        state = cls._load_state(db_path)
+
+        if state.get("source") != sig or not os.path.exists(tmp) or not state.get("fmt"):
+            # kaynak değişmiş / ilk çalıştırma: baştan
+            cls._remove(tmp, tmp + "-wal", tmp + "-shm")
+            state = {"source": sig, "fmt": DbProfile.format_for_open(db_exists=False), "phase": cls.PHASE_COPY}
+            cls._save_state(db_path, state)
+        else:
+            print("✅ [PlainToCipherMigrator] Önceki şifreleme kaldığı yerden sürdürülüyor.")
+
+        written = os.path.getsize(tmp) if os.path.exists(tmp) else 0
+        cls.require_free_space(db_path, written)
+
+        fmt = state["fmt"]
+        conn = cls._open_target(tmp, key, connect, fmt)
+        try:
+            conn.execute("ATTACH DATABASE ? AS plain KEY '';", (db_path,))
+
+            # 1) tablolar (index/trigger/view sonra)
+            existing = {r[0] for r in conn.execute(
+                "SELECT name FROM main.sqlite_master WHERE type='table'").fetchall()}
+            tables = []
+            for _type, name, _tbl, sql in cls._objects(conn, "plain", ("table",)):
+                tables.append(name)
+                if name not in existing:
+                    conn.execute(sql)
+            conn.commit()
+
+            # 2) veri (parçalı, devam edilebilir)
+            totals = {t: conn.execute(f"SELECT COUNT(*) FROM plain.[{t}]").fetchone()[0] for t in tables}
+            total = sum(totals.values())
+            done = sum(conn.execute(f"SELECT COUNT(*) FROM main.[{t}]").fetchone()[0] for t in tables)
+            last_emit = [0.0]
+
+            def _progress(n, table):
+                nonlocal done
+                done += n
+                now = time.monotonic()
+                if callable(progress_cb) and (now - last_emit[0] >= 0.1 or done >= total):
+                    last_emit[0] = now
+                    progress_cb(min(done, total), total, f"Şifreleniyor: {table}")
+
+            if callable(progress_cb):
+                progress_cb(min(done, total), total, "Şifreleniyor...")
+
+            for t in tables:
+                if conn.execute(f"SELECT COUNT(*) FROM main.[{t}]").fetchone()[0] >= totals[t]:
+                    continue
+                cls._copy_table(conn, t, _progress)
+
+            # 3) sqlite_sequence / user_version
+            has_seq = conn.execute(
+                "SELECT 1 FROM plain.sqlite_master WHERE name='sqlite_sequence'").fetchone()
+            has_seq_main = conn.execute(
+                "SELECT 1 FROM main.sqlite_master WHERE name='sqlite_sequence'").fetchone()
+            if has_seq and has_seq_main:
+                conn.execute("DELETE FROM main.sqlite_sequence")
+                conn.execute("INSERT INTO main.sqlite_sequence (name, seq) SELECT name, seq FROM plain.sqlite_sequence")
+            uv = conn.execute("PRAGMA plain.user_version").fetchone()[0]
+            conn.execute(f"PRAGMA main.user_version = {int(uv or 0)}")
+            conn.commit()
+
+            # 4) index / trigger / view
+            if callable(progress_cb):
+                progress_cb(total, total, "İndeksler oluşturuluyor...")
+            have = {r[0] for r in conn.execute("SELECT name FROM main.sqlite_master").fetchall()}
+            for _type, name, _tbl, sql in cls._objects(conn, "plain", ("index", "trigger", "view")):
+                if name not in have:
+                    conn.execute(sql)
+            conn.commit()
+
+            # 5) doğrulama
+            if callable(progress_cb):
+                progress_cb(total, total, "Doğrulanıyor...")
+            cls.verify(conn, tables)
+
+            conn.execute("DETACH DATABASE plain;")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+            conn.commit()
+        finally:
+            conn.close()
+
+        state["phase"] = cls.PHASE_VERIFIED
+        cls._save_state(db_path, state)
+
+        cls.finish_swap(db_path)
+        DbProfile.record_format(fmt)
+        print(f"✅ [PlainToCipherMigrator] {total} satır şifreli veritabanına taşındı.")
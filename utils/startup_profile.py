@@ -0,0 +1,114 @@
+"""
+Açılış süresi raporu (ilk pencereye kadar geçen süre).
+
+main.py en başta içe aktarır; aşamalar mark() ile işaretlenir, ilk pencere gösterilince finish()
+raporu AppData altındaki startup_report.txt dosyasına yazar ve konsola basar.
+HTSMERCEK_IMPORT_PROFILE=1 ile ilk kez yüklenen üst düzey paketlerin (kümülatif) import süreleri de ölçülür.
+
+Bu modül açılışta ilk yüklenen modüllerdendir: sadece standart kütüphane kullanır.
+"""
+import builtins
+import os
+import sys
+import time
+
+
+class StartupProfiler:
+    ENV_IMPORTS = "HTSMERCEK_IMPORT_PROFILE"
+    REPORT_NAME = "startup_report.txt"
+    TOP_IMPORTS = 25
+
+    # açılışta yüklenmemesi gereken ağır bağımlılıklar (raporda "yüklü mü" olarak gösterilir)
+    HEAVY_MODULES = (
+        "folium", "branca", "jinja2", "openpyxl", "bs4", "reportlab", "playwright",
+        "PyQt6.QtWebEngineWidgets", "pypdf", "numpy",
+    )
+
+    _t0 = time.perf_counter()
+    _marks = []
+    _imports = {}
+    _orig_import = None
+    _depth = 0
+    _done = False
+
+    @staticmethod
+    def mark(name: str):
+        StartupProfiler._marks.append((name, time.perf_counter()))
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def install_from_env():
+        if os.environ.get(StartupProfiler.ENV_IMPORTS, "").strip() in ("1", "true", "yes"):
+            StartupProfiler.enable_import_timing()
+
+    @staticmethod
+    def enable_import_timing():
+        """builtins.__import__ sarılır; sadece ilk kez yüklenen üst düzey paketin dıştaki importu ölçülür."""
+        cls = StartupProfiler
+        if cls._orig_import is not None:
+            return
+        cls._orig_import = builtins.__import__
+
+        def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            top = name.partition(".")[0]
+            if level != 0 or cls._depth > 0 or not top or top in sys.modules:
+                return cls._orig_import(name, globals, locals, fromlist, level)
+
+            cls._depth += 1
+            t = time.perf_counter()
+            try:
+                return cls._orig_import(name, globals, locals, fromlist, level)
+            finally:
+                cls._depth -= 1
+                cls._imports[top] = cls._imports.get(top, 0.0) + (time.perf_counter() - t)
+
+        builtins.__import__ = _timed_import
+
+    @staticmethod
+    def disable_import_timing():
+        cls = StartupProfiler
+        if cls._orig_import is not None:
+            builtins.__import__ = cls._orig_import
+            cls._orig_import = None
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def report() -> str:
+        cls = StartupProfiler
+        lines = ["HTS Mercek açılış raporu", "=" * 40]
+        prev = cls._t0
+        for name, t in cls._marks:
+            lines.append(f"{(t - cls._t0) * 1000:9.0f} ms  (+{(t - prev) * 1000:7.0f})  {name}")
+            prev = t
+
+        loaded = [m for m in cls.HEAVY_MODULES if m in sys.modules]
+        lines.append("")
+        lines.append("Açılışta yüklenen ağır modüller: " + (", ".join(loaded) if loaded else "yok"))
+
+        if cls._imports:
+            lines.append("")
+            lines.append("İlk yükleme süreleri (kümülatif, üst düzey paket):")
+            top = sorted(cls._imports.items(), key=lambda kv: kv[1], reverse=True)[: cls.TOP_IMPORTS]
+            for name, sec in top:
+                lines.append(f"{sec * 1000:9.1f} ms  {name}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def finish(label: str = "İlk pencere gösterildi"):
+        """Son işareti koyar, raporu yazar (bir kez)."""
+        cls = StartupProfiler
+        if cls._done:
+            return
+        cls._done = True
+        cls.mark(label)
+        cls.disable_import_timing()
+
+        text = cls.report()
+        print(text)
+        try:
+            from security.security import LicenseManager
+            path = os.path.join(LicenseManager.appdata_dir(), cls.REPORT_NAME)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+        except Exception as e:
+            print(f"⚠️ [StartupProfiler] Rapor yazılamadı: {e}")
@@ -0,0 +1,122 @@
+class TipKodu:
+    """
+    HTS 'TIP' metninin (Aradı / Arandı / Mesaj Attı / Mesaj Aldı / GPRS ...) sayısal karşılığı.
+
+    İçe aktarmada bir kez hesaplanıp ham tablolardaki TipKodu kolonuna yazılır; analizler
+    TIP LIKE '%Aradı%' OR ... zincirleri yerine indexli tamsayı karşılaştırması yapar.
+    Kolon sonradan eklenen kurulumlarda mevcut satırlar backfill() ile doldurulur.
+    """
+
+    COLUMN = "TipKodu"
+    SQL_FUNC = "HTS_TIP_KODU"
+
+    DIGER = 0
+    ARAMA_GIDEN = 1
+    ARAMA_GELEN = 2
+    SMS_GIDEN = 3
+    SMS_GELEN = 4
+    DATA = 5
+
+    GIDEN = (ARAMA_GIDEN, SMS_GIDEN)
+    GELEN = (ARAMA_GELEN, SMS_GELEN)
+
+    # TIP kolonu olan ham tablolar
+    TABLES = ("hts_gsm", "hts_sms", "hts_sabit", "hts_uluslararasi", "hts_sth", "hts_gprs", "hts_wap")
+    DATA_TABLES = ("hts_gprs", "hts_wap")
+
+    # TipIconDelegate'in beklediği kısa kodlar
+    LABELS = {ARAMA_GIDEN: "CALL_OUT", ARAMA_GELEN: "CALL_IN", SMS_GIDEN: "SMS_OUT", SMS_GELEN: "SMS_IN"}
+
+    _FOLD = str.maketrans({
+        "İ": "i", "I": "i", "ı": "i", "Ş": "s", "ş": "s", "Ğ": "g", "ğ": "g",
+        "Ü": "u", "ü": "u", "Ö": "o", "ö": "o", "Ç": "c", "ç": "c",
+    })
+
+    _OUT_WORDS = ("aradi", "giden", "gonder", "atti", "cikis", "outgoing")
+    _IN_WORDS = ("arandi", "gelen", "aldi", "giris", "incoming")
+    _SMS_WORDS = ("mesaj", "sms", "mms")
+    _DATA_WORDS = ("gprs", "wap", "data", "internet")
+
+    _cache = {}
+
+    @staticmethod
+    def _fold(text: str) -> str:
+        return str(text).translate(TipKodu._FOLD).lower()
+
+    @staticmethod
+    def classify(tip, table: str | None = None) -> int:
+        """TIP metni (+ kaynak tablo) -> kod. Aynı metinler tekrar ettiği için sonuç önbelleklenir."""
+        key = (tip, table)
+        code = TipKodu._cache.get(key)
+        if code is not None:
+            return code
+
+        code = TipKodu._classify(tip, table)
+        if len(TipKodu._cache) < 4096:
+            TipKodu._cache[key] = code
+        return code
+
+    @staticmethod
+    def _classify(tip, table) -> int:
+        if table in TipKodu.DATA_TABLES:
+            return TipKodu.DATA
+        if tip is None or not str(tip).strip():
+            return TipKodu.DIGER
+
+        s = TipKodu._fold(tip)
+        words = set(s.replace("-", " ").replace("/", " ").replace("(", " ").replace(")", " ").split())
+
+        if any(w in s for w in TipKodu._OUT_WORDS) or "out" in words:
+            direction = 1
+        elif any(w in s for w in TipKodu._IN_WORDS) or "in" in words:
+            direction = 2
+        else:
+            direction = 0
+
+        is_sms = table == "hts_sms" or any(w in s for w in TipKodu._SMS_WORDS)
+        if direction:
+            if is_sms:
+                return TipKodu.SMS_GIDEN if direction == 1 else TipKodu.SMS_GELEN
+            return TipKodu.ARAMA_GIDEN if direction == 1 else TipKodu.ARAMA_GELEN
+
+        if any(w in s for w in TipKodu._DATA_WORDS):
+            return TipKodu.DATA
+        return TipKodu.DIGER
+
+    @staticmethod
+    def is_outgoing(code) -> bool:
+        return code in TipKodu.GIDEN
+
+    @staticmethod
+    def is_incoming(code) -> bool:
+        return code in TipKodu.GELEN
+
+    @staticmethod
+    def label(code) -> str:
+        return TipKodu.LABELS.get(code, "OTHER")
+
+    @staticmethod
+    def sql_in(codes) -> str:
+        """SQL IN listesi (sabit tamsayılar; parametre gerekmez)."""
+        return "(" + ",".join(str(int(c)) for c in codes) + ")"
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def register(conn):
+        """Bağlantıya HTS_TIP_KODU(TIP, tablo) SQL fonksiyonunu ekler (backfill için)."""
+        try:
+            conn.create_function(TipKodu.SQL_FUNC, 2, TipKodu.classify, deterministic=True)
+        except TypeError:
+            # eski sürücüler deterministic parametresini tanımıyor
+            conn.create_function(TipKodu.SQL_FUNC, 2, TipKodu.classify)
+
+    @staticmethod
+    def backfill(conn, schema: str, table: str) -> int:
+        """TipKodu boş satırları TIP metninden doldurur. Dönüş: güncellenen satır sayısı."""
+        TipKodu.register(conn)
+        cur = conn.execute(
+            f"UPDATE {schema}.{table} SET {TipKodu.COLUMN} = {TipKodu.SQL_FUNC}(TIP, ?) "
+            f"WHERE {TipKodu.COLUMN} IS NULL",
+            (table,)
+        )
+        return cur.rowcount or 0
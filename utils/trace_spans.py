@@ -0,0 +1,210 @@
+import cProfile
+import functools
+import inspect
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from security.security import LicenseManager
+from utils.app_settings import AppSettings
+
+
+class Tracer:
+    """
+    Hafif zaman çizelgesi (span) kaydı: import / analiz / rapor hatlarının nerede vakit harcadığını görmek için.
+
+    with Tracer.span("import.save_batch", table="hts_gsm"): ...   veya   @Tracer.traced("report.build_html")
+    Span'lar thread başına iç içe kaydedilir; export_chrome() Chrome trace-event JSON yazar
+    (chrome://tracing veya ui.perfetto.dev ile alev grafiği olarak açılır).
+
+    Profil modu açıksa her thread'in en dıştaki span'ı cProfile ile örneklenir; .prof dosyası
+    AppData/profiles altına yazılır ve yolu span'ın args'ına eklenir (snakeviz vb. ile açılır).
+
+    Kapalıyken (varsayılan) span() paylaşılan boş bir context manager döndürür.
+    Açmak için: ayar ("trace_spans") veya HTSMERCEK_TRACE=1.
+    """
+
+    ENABLE_KEY = "trace_spans"
+    PROFILE_KEY = "trace_profile"
+    ENV = "HTSMERCEK_TRACE"
+    PROFILE_DIR = "profiles"
+    MAX_EVENTS = 200000
+
+    _enabled = None
+    _profile = None
+    _events = deque(maxlen=MAX_EVENTS)
+    _threads = {}
+    _local = threading.local()
+    _t0 = time.perf_counter()
+    _pid = os.getpid()
+
+    # ------------------------------------------------------------------
+    # ayarlar
+    # ------------------------------------------------------------------
+    @staticmethod
+    def enabled() -> bool:
+        if Tracer._enabled is None:
+            env = os.environ.get(Tracer.ENV, "").strip() in ("1", "true", "yes")
+            Tracer._enabled = env or bool(AppSettings.get(Tracer.ENABLE_KEY, False))
+        return Tracer._enabled
+
+    @staticmethod
+    def set_enabled(flag: bool):
+        AppSettings.set(Tracer.ENABLE_KEY, bool(flag))
+        Tracer._enabled = bool(flag)
+
+    @staticmethod
+    def profiling() -> bool:
+        if Tracer._profile is None:
+            Tracer._profile = bool(AppSettings.get(Tracer.PROFILE_KEY, False))
+        return Tracer._profile
+
+    @staticmethod
+    def set_profiling(flag: bool):
+        AppSettings.set(Tracer.PROFILE_KEY, bool(flag))
+        Tracer._profile = bool(flag)
+
+    @staticmethod
+    def profile_dir() -> str:
+        d = os.path.join(LicenseManager.appdata_dir(), Tracer.PROFILE_DIR)
+        os.makedirs(d, exist_ok=True)
+        return d
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    @staticmethod
+    def span(name: str, **args):
+        if not Tracer.enabled():
+            return _NOOP
+        return _Span(name, args)
+
+    @staticmethod
+    def traced(name: str | None = None):
+        """
+        Metodu/fonksiyonu span ile sarar. Qt sinyalleri (clicked(bool) vb.) yuvaya fazladan argüman
+        gönderebildiği için sarmalanan fonksiyonun alabileceğinden fazla konumsal argüman kırpılır.
+        """
+        def deco(fn):
+            code = fn.__code__
+            max_pos = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount
+            span_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if max_pos is not None and len(args) > max_pos:
+                    args = args[:max_pos]
+                if not Tracer.enabled():
+                    return fn(*args, **kwargs)
+                with _Span(span_name, {}):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    @staticmethod
+    def event_count() -> int:
+        return len(Tracer._events)
+
+    @staticmethod
+    def clear():
+        Tracer._events.clear()
+
+    @staticmethod
+    def export_chrome(path: str) -> int:
+        """Kayıtlı span'ları Chrome trace-event JSON olarak yazar. Dönüş: olay sayısı."""
+        events = list(Tracer._events)
+        meta = [
+            {"name": "thread_name", "ph": "M", "pid": Tracer._pid, "tid": tid, "args": {"name": tname}}
+            for tid, tname in list(Tracer._threads.items())
+        ]
+        meta.append({"name": "process_name", "ph": "M", "pid": Tracer._pid, "tid": 0, "args": {"name": "HTS Mercek"}})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms"}, f, ensure_ascii=False, default=str)
+        return len(events)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _stack() -> list:
+        s = getattr(Tracer._local, "stack", None)
+        if s is None:
+            s = Tracer._local.stack = []
+        return s
+
+
+class _Span:
+    __slots__ = ("name", "args", "t", "prof")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.t = 0.0
+        self.prof = None
+
+    def __enter__(self):
+        stack = Tracer._stack()
+        if not stack and Tracer.profiling():
+            prof = cProfile.Profile()
+            try:
+                prof.enable()
+                self.prof = prof
+            except ValueError:
+                # aynı thread'de başka bir profiler etkin
+                self.prof = None
+        stack.append(self)
+        self.t = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        stack = Tracer._stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+
+        args = dict(self.args)
+        if exc_type is not None:
+            args["error"] = f"{exc_type.__name__}: {exc}"[:200]
+
+        if self.prof is not None:
+            self.prof.disable()
+            try:
+                safe = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.name)
+                path = os.path.join(Tracer.profile_dir(), f"{safe}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.prof")
+                self.prof.dump_stats(path)
+                args["profile"] = path
+            except Exception as e:
+                print(f"⚠️ [Tracer] Profil yazılamadı: {e}")
+            self.prof = None
+
+        th = threading.current_thread()
+        tid = threading.get_ident()
+        if tid not in Tracer._threads:
+            Tracer._threads[tid] = th.name
+
+        Tracer._events.append({
+            "name": self.name,
+            "cat": self.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": round((self.t - Tracer._t0) * 1e6, 1),
+            "dur": round((end - self.t) * 1e6, 1),
+            "pid": Tracer._pid,
+            "tid": tid,
+            "args": args,
+        })
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
@@ -0,0 +1,281 @@
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+from security.security import LicenseManager
+from utils.app_settings import AppSettings
+
+
+class UiWatchdog:
+    """
+    GUI olay döngüsü donma izleyicisi.
+
+    Ana thread'de HEARTBEAT_MS aralıklı bir QTimer nabız (zaman damgası) atar; yardımcı thread nabzın
+    STALL_MS'den uzun gecikmesini görünce ana thread'in Python yığınını (sys._current_frames) alır ve
+    donma sürerken SAMPLE_MS aralıkla en içteki satırı örnekler. Donmanın gerçek süresi nabız geri
+    geldiğinde zamanlayıcı kaymasından ölçülür.
+
+    Donmalar "işleyici"ye göre toplanır: olay döngüsünün doğrudan çağırdığı Python fonksiyonu
+    (buton slotu, zamanlayıcı vb.). Son nabızdaki yığın derinliği olay döngüsünün seviyesini verir;
+    iç içe exec()/processEvents() döngülerinde de doğru seviyedeki işleyici bulunur.
+
+    Varsayılan açık (maliyeti bir QTimer + uyuyan bir thread); "ui_watchdog" ayarı veya
+    HTSMERCEK_UI_WATCHDOG=0 ile kapatılır. Donmalar AppData altındaki ui_stalls.log'a da yazılır.
+    """
+
+    ENABLE_KEY = "ui_watchdog"
+    STALL_MS_KEY = "ui_watchdog_stall_ms"
+    ENV = "HTSMERCEK_UI_WATCHDOG"
+
+    HEARTBEAT_MS = 100
+    POLL_MS = 50
+    SAMPLE_MS = 200
+    DEFAULT_STALL_MS = 500
+    MAX_STACK_FRAMES = 25
+    RECENT = 100
+    MAX_HANDLERS = 300
+
+    LOG_NAME = "ui_stalls.log"
+    LOG_MAX_BYTES = 1024 * 1024
+    LOG_BACKUPS = 3
+
+    NATIVE = "(Qt / yerel kod)"
+
+    _timer = None
+    _thread = None
+    _running = False
+    _lock = threading.Lock()
+    _main_ident = None
+    _last_beat = 0.0
+    _base_depth = 0
+    _stall_ms = None
+    _pending = None
+    _handlers = {}      # işleyici -> [adet, toplam_ms, maks_ms]
+    _recent = deque(maxlen=RECENT)
+    _logger = None
+
+    # ------------------------------------------------------------------
+    # ayarlar
+    # ------------------------------------------------------------------
+    @staticmethod
+    def enabled() -> bool:
+        env = os.environ.get(UiWatchdog.ENV, "").strip()
+        if env:
+            return env not in ("0", "false", "no")
+        return bool(AppSettings.get(UiWatchdog.ENABLE_KEY, True))
+
+    @staticmethod
+    def set_enabled(flag: bool, parent=None):
+        AppSettings.set(UiWatchdog.ENABLE_KEY, bool(flag))
+        if flag:
+            UiWatchdog.start(parent)
+        else:
+            UiWatchdog.stop()
+
+    @staticmethod
+    def stall_ms() -> float:
+        if UiWatchdog._stall_ms is None:
+            try:
+                UiWatchdog._stall_ms = float(AppSettings.get(UiWatchdog.STALL_MS_KEY, UiWatchdog.DEFAULT_STALL_MS))
+            except (TypeError, ValueError):
+                UiWatchdog._stall_ms = float(UiWatchdog.DEFAULT_STALL_MS)
+        return UiWatchdog._stall_ms
+
+    @staticmethod
+    def set_stall_ms(ms):
+        UiWatchdog._stall_ms = max(50.0, float(ms))
+        AppSettings.set(UiWatchdog.STALL_MS_KEY, UiWatchdog._stall_ms)
+
+    @staticmethod
+    def is_running() -> bool:
+        return UiWatchdog._running
+
+    @staticmethod
+    def log_path() -> str:
+        return os.path.join(LicenseManager.appdata_dir(), UiWatchdog.LOG_NAME)
+
+    # ------------------------------------------------------------------
+    # başlat / durdur (ana thread'den, QApplication oluşturulduktan sonra)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def start(parent=None):
+        cls = UiWatchdog
+        if cls._running or not cls.enabled():
+            return False
+        from PyQt6.QtCore import QCoreApplication, QTimer
+
+        cls._main_ident = threading.get_ident()
+        cls._last_beat = time.perf_counter()
+        cls._timer = QTimer(parent or QCoreApplication.instance())
+        cls._timer.setInterval(cls.HEARTBEAT_MS)
+        cls._timer.timeout.connect(cls._beat)
+        cls._timer.start()
+
+        cls._running = True
+        cls._thread = threading.Thread(target=cls._watch, name="HTSMercekUiWatchdog", daemon=True)
+        cls._thread.start()
+        return True
+
+    @staticmethod
+    def stop():
+        cls = UiWatchdog
+        cls._running = False
+        if cls._timer is not None:
+            try:
+                cls._timer.stop()
+            except RuntimeError:
+                pass
+            cls._timer = None
+
+    # ------------------------------------------------------------------
+    # ana thread: nabız
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _beat():
+        cls = UiWatchdog
+        now = time.perf_counter()
+        prev = cls._last_beat
+
+        # olay döngüsü seviyesi: bu fonksiyonun çerçevesi döngünün çağırdığı işleyici seviyesindedir
+        depth = 0
+        f = sys._getframe()
+        while f is not None:
+            depth += 1
+            f = f.f_back
+
+        lag_ms = (now - prev) * 1000 - cls.HEARTBEAT_MS
+        if lag_ms >= cls.stall_ms():
+            with cls._lock:
+                p = cls._pending if cls._pending is not None and cls._pending["beat"] == prev else None
+                cls._pending = None
+            cls._record(lag_ms, p)
+
+        cls._base_depth = depth - 1
+        cls._last_beat = now
+
+    # ------------------------------------------------------------------
+    # yardımcı thread: gecikme tespiti + yığın örnekleme
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _watch():
+        cls = UiWatchdog
+        while cls._running:
+            time.sleep(cls.POLL_MS / 1000.0)
+            try:
+                last = cls._last_beat
+                now = time.perf_counter()
+                if (now - last) * 1000 - cls.HEARTBEAT_MS < cls.stall_ms():
+                    continue
+
+                frame = sys._current_frames().get(cls._main_ident)
+                if frame is None:
+                    continue
+                with cls._lock:
+                    p = cls._pending
+                    if p is None or p["beat"] != last:
+                        handler, stack = cls._describe(frame, cls._base_depth)
+                        cls._pending = {
+                            "beat": last, "handler": handler, "stack": stack,
+                            "samples": Counter(), "last_sample": now,
+                        }
+                        cls._pending["samples"][cls._where(frame)] += 1
+                    elif (now - p["last_sample"]) * 1000 >= cls.SAMPLE_MS:
+                        p["samples"][cls._where(frame)] += 1
+                        p["last_sample"] = now
+                del frame
+            except Exception as e:
+                print(f"⚠️ [UiWatchdog] {e}")
+
+    @staticmethod
+    def _label(code, lineno=None) -> str:
+        name = getattr(code, "co_qualname", code.co_name)
+        line = code.co_firstlineno if lineno is None else lineno
+        return f"{os.path.basename(code.co_filename)}:{line} {name}"
+
+    @staticmethod
+    def _where(frame) -> str:
+        return UiWatchdog._label(frame.f_code, frame.f_lineno)
+
+    @staticmethod
+    def _describe(frame, base_depth: int):
+        """(işleyici, yığın metni). Yığın en dıştan en içe; işleyici base_depth seviyesindeki çerçeve."""
+        frames = []
+        f = frame
+        while f is not None:
+            frames.append(f)
+            f = f.f_back
+        frames.reverse()
+
+        if 0 <= base_depth < len(frames):
+            handler = UiWatchdog._label(frames[base_depth].f_code)
+        else:
+            # olay döngüsü seviyesinin üstünde Python çerçevesi yok -> Qt içinde (çizim, yerleşim vb.)
+            handler = UiWatchdog.NATIVE
+
+        stack = "".join(traceback.format_stack(frame, limit=UiWatchdog.MAX_STACK_FRAMES))
+        return handler, stack
+
+    # ------------------------------------------------------------------
+    # kayıt / rapor
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _record(lag_ms: float, pending):
+        cls = UiWatchdog
+        handler = pending["handler"] if pending else cls.NATIVE
+        stack = pending["stack"] if pending else ""
+        hot = pending["samples"].most_common(3) if pending else []
+
+        with cls._lock:
+            st = cls._handlers.get(handler)
+            if st is None and len(cls._handlers) < cls.MAX_HANDLERS:
+                st = cls._handlers[handler] = [0, 0.0, 0.0]
+            if st is not None:
+                st[0] += 1
+                st[1] += lag_ms
+                st[2] = max(st[2], lag_ms)
+            cls._recent.append((datetime.now().strftime("%Y-%m-%d %H:%M:%S"), lag_ms, handler, hot, stack))
+
+        print(f"⚠️ [UiWatchdog] Arayüz {lag_ms:.0f} ms dondu: {handler}")
+        hot_txt = ", ".join(f"{w} x{n}" for w, n in hot)
+        cls._log(f"DONMA {lag_ms:.0f} ms | {handler}" + (f" | sıcak: {hot_txt}" if hot_txt else "") +
+                 (f"\n{stack}" if stack else ""))
+
+    @staticmethod
+    def _log(text: str):
+        try:
+            if UiWatchdog._logger is None:
+                logger = logging.getLogger("htsmercek.ui_stall")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                h = RotatingFileHandler(
+                    UiWatchdog.log_path(), maxBytes=UiWatchdog.LOG_MAX_BYTES,
+                    backupCount=UiWatchdog.LOG_BACKUPS, encoding="utf-8"
+                )
+                h.setFormatter(logging.Formatter("%(asctime)s | %(message)s"))
+                logger.addHandler(h)
+                UiWatchdog._logger = logger
+            UiWatchdog._logger.info(text)
+        except Exception as e:
+            print(f"⚠️ [UiWatchdog] Log yazılamadı: {e}")
+
+    @staticmethod
+    def snapshot() -> dict:
+        """İşleyici bazında toplam (toplam süreye göre) + son donmalar (yeniden eskiye)."""
+        with UiWatchdog._lock:
+            handlers = [(k, v[0], v[1], v[1] / v[0] if v[0] else 0.0, v[2]) for k, v in UiWatchdog._handlers.items()]
+            recent = list(UiWatchdog._recent)
+        handlers.sort(key=lambda r: r[2], reverse=True)
+        recent.reverse()
+        return {"handlers": handlers, "recent": recent}
+
+    @staticmethod
+    def reset():
+        with UiWatchdog._lock:
+            UiWatchdog._handlers.clear()
+            UiWatchdog._recent.clear()
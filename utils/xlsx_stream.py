@@ -0,0 +1,478 @@
+import html
+import posixpath
+import re
+import sys
+import zipfile
+from datetime import datetime, timedelta
+from xml.etree.ElementTree import fromstring, parse
+
+
+class XlsxStreamReader:
+    """
+    HTS dışa aktarımları için akışlı (streaming) XLSX okuyucu.
+
+    openpyxl'in hücre nesnelerini kurmadan aktif sayfanın XML'ini (xl/worksheets/sheetN.xml) parça parça açar:
+    sıkıştırılmış akıştan okunan tampon son tamamlanmış </row> etiketinden bölünür, satır grubu tek seferde işlenir.
+    Öneksiz (Excel'in yazdığı) sayfalarda hücreler derlenmiş düzenli ifadelerle taranır (eleman nesnesi kurulmaz);
+    önekli ad alanı vb. durumlarda grup ElementTree.fromstring ile kurulur. Satırlar openpyxl read_only +
+    data_only + values_only ile aynı tipte değer tuple'ı olarak döner (str / int / float / bool / datetime /
+    time / timedelta / None).
+
+    - Paylaşılan metinler (sharedStrings.xml) ihtiyaç oldukça artımlı okunur ve sys.intern ile tekilleştirilir:
+      dosyanın ilk satırlarını okuyan rol / GSM tespiti tüm metin tablosunu yüklemez.
+    - Tarih biçimli sayısal hücreler (styles.xml) openpyxl'deki gibi datetime'a çevrilir (1900 / 1904 epoch).
+    - Satırlar sayfa genişliğine (dimension) None ile tamamlanır; atlanmış satırlar boş satır olarak döner.
+      openpyxl'den tek fark: dimension'dan uzun satırlar kırpılmaz (hatalı dimension yazan araçlarda veri kaybolmaz).
+
+    Kullanım:
+        with XlsxStreamReader(path) as xr:
+            for row in xr.iter_rows(max_row=100): ...
+    """
+
+    MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    STRICT_NS = "http://purl.oclc.org/ooxml/spreadsheetml/main"
+    REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    STRICT_REL_NS = "http://purl.oclc.org/ooxml/officeDocument/relationships"
+    PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+    DEFAULT_SHEET = "xl/worksheets/sheet1.xml"
+
+    # openpyxl.styles.numbers ile aynı kurallar (yalnızca tarih / süre biçimleri gerekli)
+    BUILTIN_DATE_FORMATS = {
+        14: "mm-dd-yy", 15: "d-mmm-yy", 16: "d-mmm", 17: "mmm-yy",
+        18: "h:mm AM/PM", 19: "h:mm:ss AM/PM", 20: "h:mm", 21: "h:mm:ss", 22: "m/d/yy h:mm",
+        45: "mm:ss", 46: "[h]:mm:ss", 47: "mmss.0",
+    }
+    _STRIP_RE = re.compile(r'".*?"|\[(?!hh?\]|mm?\]|ss?\])[^\]]*\]')
+    _DATE_RE = re.compile(r"(?<![_\\])[dmhysDMHYS]")
+    _TIMEDELTA_RE = re.compile(r"\[hh?\](:mm(:ss(\.0*)?)?)?|\[mm?\](:ss(\.0*)?)?|\[ss?\](\.0*)?", re.I)
+    _DIM_RE = re.compile(r"([A-Z]+)(\d+)$")
+    _XMLNS_RE = re.compile(rb'\sxmlns(?::[\w.-]+)?\s*=\s*"[^"]*"')
+    _DIM_TAG_RE = re.compile(rb'<(?:[\w.-]+:)?dimension\s[^>]*?ref\s*=\s*"([^"]*)"')
+
+    # <c r="B12" s="3" t="s"><v>17</v></c> -> (sütun harfleri, stil, tip, sıra dışı öznitelikler, yalın <v>, diğer iç XML)
+    _ROW_RE = re.compile(r'<row\b([^>]*?)(?:/>|>(.*?)</row>)', re.S)
+    _ROW_R_RE = re.compile(r'\br\s*=\s*"(\d+)"')
+    _CELL_RE = re.compile(
+        r'<c(?: r="([A-Z]{1,3})\d+")?(?: s="(\d+)")?(?: t="(\w+)")?(\s[^>]*?)?\s*'
+        r'(?:/>|><v>([^<]*)</v></c>|>([^<]*(?:<(?!/c>)[^<]*)*)</c>)'
+    )
+    _SI_RE = re.compile(r'<si>(?:<t(?: xml:space="preserve")?>([^<]*)</t></si>|(.*?)</si>)', re.S)
+    _ATTR_RE = re.compile(r'([\w:]+)\s*=\s*"([^"]*)"')
+    _V_RE = re.compile(r'<v(?:\s[^>]*)?>([^<]*)</v>')
+    _T_RE = re.compile(r'<t(?:\s[^>]*)?>([^<]*)</t>')
+
+    CHUNK = 1 << 20
+
+    EPOCH_1900 = datetime(1899, 12, 30)
+    EPOCH_1904 = datetime(1904, 1, 1)
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        self._ns = self.MAIN_NS
+        self.sheet_path, self.epoch = self._read_workbook()
+        self._date_styles, self._timedelta_styles = self._read_styles()
+
+        self._t_tag, self._r_tag = self._tag("t"), self._tag("r")
+        self._strings = []
+        self._strings_iter = self._iter_shared_strings()
+        self._col_cache = {}
+
+        self.max_row, self.max_column = self._read_dimension()
+
+    def close(self):
+        self._strings_iter.close()
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # çalışma kitabı / stiller
+    # ------------------------------------------------------------------
+    def _tag(self, name):
+        return f"{{{self._ns}}}{name}"
+
+    def _read_workbook(self):
+        """(aktif sayfanın zip içindeki yolu, tarih epoch'u)."""
+        names = set(self._zip.namelist())
+        if "xl/workbook.xml" not in names:
+            return self.DEFAULT_SHEET, self.EPOCH_1900
+
+        root = parse(self._zip.open("xl/workbook.xml")).getroot()
+        if root.tag.startswith(f"{{{self.STRICT_NS}}}"):
+            self._ns = self.STRICT_NS
+
+        epoch = self.EPOCH_1900
+        pr = root.find(self._tag("workbookPr"))
+        if pr is not None and pr.get("date1904") in ("1", "true"):
+            epoch = self.EPOCH_1904
+
+        active = 0
+        view = root.find(f"{self._tag('bookViews')}/{self._tag('workbookView')}")
+        if view is not None:
+            try:
+                active = int(view.get("activeTab", 0))
+            except ValueError:
+                active = 0
+
+        sheets = root.findall(f"{self._tag('sheets')}/{self._tag('sheet')}")
+        if not sheets or "xl/_rels/workbook.xml.rels" not in names:
+            return self.DEFAULT_SHEET, epoch
+        sheet = sheets[active] if 0 <= active < len(sheets) else sheets[0]
+        rid = sheet.get(f"{{{self.REL_NS}}}id") or sheet.get(f"{{{self.STRICT_REL_NS}}}id")
+
+        rels = parse(self._zip.open("xl/_rels/workbook.xml.rels")).getroot()
+        for rel in rels.iter(f"{{{self.PKG_REL_NS}}}Relationship"):
+            if rel.get("Id") == rid:
+                target = rel.get("Target", "")
+                path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+                if path in names:
+                    return path, epoch
+        return self.DEFAULT_SHEET, epoch
+
+    @classmethod
+    def is_date_format(cls, fmt) -> bool:
+        if fmt is None:
+            return False
+        fmt = cls._STRIP_RE.sub("", fmt.split(";")[0])
+        return cls._DATE_RE.search(fmt) is not None
+
+    @classmethod
+    def is_timedelta_format(cls, fmt) -> bool:
+        if fmt is None:
+            return False
+        return cls._TIMEDELTA_RE.search(fmt.split(";")[0]) is not None
+
+    def _read_styles(self):
+        """(tarih biçimli stil indeksleri, süre biçimli stil indeksleri)."""
+        try:
+            root = parse(self._zip.open("xl/styles.xml")).getroot()
+        except KeyError:
+            return frozenset(), frozenset()
+
+        custom = {}
+        num_fmts = root.find(self._tag("numFmts"))
+        if num_fmts is not None:
+            for nf in num_fmts.findall(self._tag("numFmt")):
+                try:
+                    custom[int(nf.get("numFmtId"))] = nf.get("formatCode")
+                except (TypeError, ValueError):
+                    pass
+
+        dates, deltas = set(), set()
+        xfs = root.find(self._tag("cellXfs"))
+        if xfs is not None:
+            for idx, xf in enumerate(xfs.findall(self._tag("xf"))):
+                try:
+                    fmt_id = int(xf.get("numFmtId", 0))
+                except ValueError:
+                    continue
+                fmt = custom.get(fmt_id) or self.BUILTIN_DATE_FORMATS.get(fmt_id)
+                if self.is_date_format(fmt):
+                    dates.add(idx)
+                if self.is_timedelta_format(fmt):
+                    deltas.add(idx)
+        return frozenset(dates), frozenset(deltas)
+
+    def _read_dimension(self):
+        """<dimension ref="A1:J12345"> -> (max_row, max_column); yoksa (None, None). Yalnızca sayfa başı okunur."""
+        with self._zip.open(self.sheet_path) as f:
+            head = self._read_head(f, "sheetData")[0]
+        m = self._DIM_TAG_RE.search(head)
+        if m:
+            m = self._DIM_RE.match(m.group(1).decode("ascii", "ignore").split(":")[-1])
+        if m:
+            return int(m.group(2)), self._column_index(m.group(1))
+        return None, None
+
+    # ------------------------------------------------------------------
+    # parça parça ayrıştırma
+    # ------------------------------------------------------------------
+    def _read_head(self, f, container: str):
+        """
+        Kapsayıcı elemanın (sheetData / sst) açılış etiketine kadar okur.
+        Dönüş: (baştaki bayt, kalan tampon, önek, boş_mu); kapsayıcı yoksa kalan tampon None.
+        """
+        pattern = re.compile(rb"<(?:([\w.-]+):)?" + container.encode() + rb"\b[^>]*?(/?)>")
+        buf = b""
+        while True:
+            m = pattern.search(buf)
+            if m:
+                prefix = m.group(1) or b""
+                return buf[:m.end()], buf[m.end():], prefix, bool(m.group(2))
+            chunk = f.read(self.CHUNK)
+            if not chunk:
+                return buf, None, b"", True
+            buf += chunk
+
+    def _iter_blocks(self, f, container: str, item: str):
+        """
+        Kapsayıcı altındaki tamamlanmış <item> gruplarını ham bayt olarak üretir: (önek, sarmalayıcı açılış, grup).
+        Tampon her seferinde son kapanan </item> etiketinden bölünür; açılış etiketi baştaki xmlns tanımlarını taşır.
+        """
+        head, buf, prefix, empty = self._read_head(f, container)
+        if buf is None or empty:
+            return
+
+        pfx = prefix + b":" if prefix else b""
+        close_item = b"</" + pfx + item.encode() + b">"
+        close_container = b"</" + pfx + container.encode() + b">"
+        opening = b"<_blk" + b"".join(self._XMLNS_RE.findall(head)) + b">"
+
+        while True:
+            end = buf.find(close_container)
+            if end != -1:
+                if buf[:end].strip():
+                    yield prefix, opening, buf[:end]
+                return
+            chunk = f.read(self.CHUNK)
+            if not chunk:
+                raise ValueError(f"Bozuk XLSX: '{container}' kapanışı bulunamadı.")
+            cut = buf.rfind(close_item)
+            if cut != -1:
+                cut += len(close_item)
+                yield prefix, opening, buf[:cut]
+                buf = buf[cut:]
+            buf += chunk
+
+    def _iter_elements(self, f, container: str, item: str):
+        """_iter_blocks gruplarını tek fromstring çağrısıyla kurup <item> elemanlarını sırayla üretir."""
+        for _prefix, opening, block in self._iter_blocks(f, container, item):
+            yield from fromstring(opening + block + b"</_blk>")
+
+    # ------------------------------------------------------------------
+    # paylaşılan metinler
+    # ------------------------------------------------------------------
+    def _si_text(self, si) -> str:
+        # düz <t> + zengin metin <r><t> parçaları (fonetik <rPh> hariç), openpyxl Text.content gibi
+        t_tag = self._t_tag
+        text = si.findtext(t_tag) or ""
+        runs = si.findall(self._r_tag)
+        if runs:
+            text += "".join(r.findtext(t_tag) or "" for r in runs)
+        return text
+
+    def _iter_shared_strings(self):
+        try:
+            f = self._zip.open("xl/sharedStrings.xml")
+        except KeyError:
+            return
+        intern = sys.intern
+        xml_text = self._xml_text
+        with f:
+            for prefix, opening, block in self._iter_blocks(f, "sst", "si"):
+                if prefix:
+                    for si in fromstring(opening + block + b"</_blk>"):
+                        yield intern(self._si_text(si).replace("x005F_", ""))
+                    continue
+                # yalın <si><t>..</t></si> düzenli ifadeyle; zengin metin / fonetik içerenler ElementTree ile
+                for plain, rich in self._SI_RE.findall(block.decode("utf-8")):
+                    if rich:
+                        text = self._si_text(fromstring(f'<si xmlns="{self._ns}">{rich}</si>'))
+                    else:
+                        text = xml_text(plain)
+                    yield intern(text.replace("x005F_", ""))
+
+    def shared_string(self, idx: int) -> str:
+        strings = self._strings
+        while idx >= len(strings):
+            try:
+                strings.append(next(self._strings_iter))
+            except StopIteration:
+                raise IndexError(f"Paylaşılan metin bulunamadı: {idx}")
+        return strings[idx]
+
+    # ------------------------------------------------------------------
+    # hücre değerleri
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _column_index(letters: str) -> int:
+        n = 0
+        for ch in letters:
+            n = n * 26 + (ord(ch) - 64)
+        return n
+
+    def _from_excel(self, value, as_timedelta: bool):
+        """openpyxl.utils.datetime.from_excel ile aynı dönüşüm."""
+        if as_timedelta:
+            td = timedelta(days=value)
+            if td.microseconds:
+                td = timedelta(seconds=td.total_seconds() // 1, microseconds=round(td.microseconds, -3))
+            return td
+        day, fraction = divmod(value, 1)
+        diff = timedelta(milliseconds=round(fraction * 86400 * 1000))
+        if 0 <= value < 1 and diff.days == 0:
+            return (datetime.min + diff).time()
+        if 0 < value < 60 and self.epoch == self.EPOCH_1900:
+            day += 1
+        return self.epoch + timedelta(days=day) + diff
+
+    @staticmethod
+    def _xml_text(text: str) -> str:
+        """Düzenli ifadeyle alınan metin: XML satır sonu normalleştirmesi + varlık (&amp; / &#10;) çözümü."""
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        if "&" in text:
+            text = html.unescape(text)
+        return text
+
+    def _convert(self, t, s, text):
+        """Ham <v> metni -> openpyxl data_only değeri (t: hücre tipi, s: stil indeksi metni)."""
+        if not text:
+            return None
+        if t is None or t == "n":
+            value = float(text) if ("." in text or "E" in text or "e" in text) else int(text)
+            if s and int(s) in self._date_styles:
+                try:
+                    return self._from_excel(value, int(s) in self._timedelta_styles)
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return value
+        if t == "s":
+            return self.shared_string(int(text))
+        if t == "b":
+            return bool(int(text))
+        if t == "d":
+            try:
+                return datetime.fromisoformat(text.rstrip("Z"))
+            except ValueError:
+                return text
+        # "str" (formül sonucu metin) ve "e" (hata: #N/A ...)
+        return text
+
+    def _cell_value(self, c, v_tag, is_tag):
+        t = c.get("t")
+        if t == "inlineStr":
+            node = c.find(is_tag)
+            return sys.intern(self._si_text(node)) if node is not None else None
+        return self._convert(t, c.get("s"), c.findtext(v_tag))
+
+    def _inner_value(self, t, s, inner):
+        """Düzenli ifade yolunda <c> iç XML'inden değer (formül <f> atlanır, satır içi metin <is> birleştirilir)."""
+        if t == "inlineStr":
+            if "<is" not in inner:
+                return None
+            if "<rPh" in inner or "<![CDATA[" in inner:
+                node = fromstring(f'<is xmlns="{self._ns}">' + inner[inner.index(">", inner.index("<is")) + 1:])
+                return sys.intern(self._si_text(node))
+            return sys.intern(self._xml_text("".join(self._T_RE.findall(inner))))
+        m = self._V_RE.search(inner)
+        if not m:
+            return None
+        text = m.group(1)
+        if t == "str" or t == "e" or t == "d":
+            text = self._xml_text(text)
+        return self._convert(t, s, text)
+
+    # ------------------------------------------------------------------
+    # satırlar
+    # ------------------------------------------------------------------
+    def _fill_from_xml(self, values, body):
+        """Düzenli ifade yolu: satır iç XML'indeki hücreleri values listesine yazar (gerekirse uzatır)."""
+        n = len(values)
+        col = 0
+        col_cache = self._col_cache
+        strings = self._strings
+        date_styles = self._date_styles
+        for letters, s, t, extra, text, inner in self._CELL_RE.findall(body):
+            if extra:
+                # beklenmeyen sıra / ek öznitelikler (cm, vm, ph ...)
+                for k, v in self._ATTR_RE.findall(extra):
+                    if k == "r":
+                        letters = v.rstrip("0123456789")
+                    elif k == "s":
+                        s = v
+                    elif k == "t":
+                        t = v
+            if letters:
+                col = col_cache.get(letters)
+                if col is None:
+                    col = col_cache[letters] = self._column_index(letters)
+            else:
+                col += 1
+            if col > n:
+                values.extend([None] * (col - n))
+                n = col
+
+            if text:
+                # sık görülen iki durum (paylaşılan metin / tarih biçimsiz sayı) doğrudan
+                if t == "s":
+                    i = int(text)
+                    values[col - 1] = strings[i] if i < len(strings) else self.shared_string(i)
+                elif not t and not (s and date_styles):
+                    values[col - 1] = float(text) if ("." in text or "E" in text or "e" in text) else int(text)
+                else:
+                    if t in ("str", "e", "d"):
+                        text = self._xml_text(text)
+                    values[col - 1] = self._convert(t or None, s, text)
+            elif inner:
+                values[col - 1] = self._inner_value(t or None, s, inner)
+        return values
+
+    def _fill_from_element(self, values, el):
+        """ElementTree yolu (önekli ad alanı vb.): <row> elemanındaki hücreleri values listesine yazar."""
+        c_tag, v_tag, is_tag = self._tag("c"), self._tag("v"), self._tag("is")
+        n = len(values)
+        col = 0
+        for c in el.iter(c_tag):
+            ref = c.get("r")
+            if ref:
+                letters = ref.rstrip("0123456789")
+                col = self._col_cache.get(letters)
+                if col is None:
+                    col = self._col_cache[letters] = self._column_index(letters)
+            else:
+                col += 1
+            if col > n:
+                values.extend([None] * (col - n))
+                n = col
+            values[col - 1] = self._cell_value(c, v_tag, is_tag)
+        return values
+
+    def _iter_raw_rows(self, f):
+        """(satır no metni veya None, öznitelik/eleman, gövde) -> sayfa sırasıyla; yol bloğa göre seçilir."""
+        for prefix, opening, block in self._iter_blocks(f, "sheetData", "row"):
+            if prefix:
+                for el in fromstring(opening + block + b"</_blk>"):
+                    yield el.get("r"), el, None
+                continue
+            for attrs, body in self._ROW_RE.findall(block.decode("utf-8")):
+                m = self._ROW_R_RE.search(attrs)
+                yield (m.group(1) if m else None), None, body
+
+    def iter_rows(self, min_row: int = 1, max_row: int | None = None):
+        """
+        min_row..max_row arasındaki satırları (1 tabanlı) sırayla değer tuple'ı olarak üretir.
+        Sayfada hiç yazılmamış satırlar da (boş) döner, böylece enumerate ile satır numarası korunur.
+        """
+        empty_row = (None,) * (self.max_column or 0)
+        fill_xml = self._fill_from_xml
+        fill_el = self._fill_from_element
+
+        counter = 0
+        with self._zip.open(self.sheet_path) as f:
+            for r, el, body in self._iter_raw_rows(f):
+                idx = int(r) if r else counter + 1
+                if max_row is not None and idx > max_row:
+                    break
+
+                # atlanmış satırlar
+                while counter + 1 < idx:
+                    counter += 1
+                    if counter >= min_row:
+                        yield empty_row
+                counter = idx
+                if idx < min_row:
+                    continue
+
+                if el is not None:
+                    yield tuple(fill_el(list(empty_row), el))
+                elif body:
+                    yield tuple(fill_xml(list(empty_row), body))
+                else:
+                    yield empty_row